@@ -13,10 +13,14 @@ from models.base import Base
 
 # Import all models to register them with Base.metadata
 from models import (  # noqa: F401
+    CandleRowCount,
     CandlestickRecord,
     MLModelPerformance,
     MLPredictionRecord,
+    PortfolioSnapshot,
     SensorState,
+    SignalRecord,
+    SignalStatsRecord,
     TraditionalAssetRecord,
 )
 
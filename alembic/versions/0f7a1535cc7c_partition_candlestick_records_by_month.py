@@ -0,0 +1,140 @@
+"""partition_candlestick_records_by_month
+
+Revision ID: 0f7a1535cc7c
+Revises: 183ce9add2ba
+Create Date: 2026-10-18 14:02:17.904611
+
+"""
+import time
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+from alembic import context, op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0f7a1535cc7c'
+down_revision: str | None = '183ce9add2ba'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COLUMNS = (
+    'exchange, symbol, interval, timestamp, open_price, high_price, low_price, close_price, '
+    'volume, quote_volume, trades_count, loaded_at, fetch_time_ms, source_raw, is_complete'
+)
+COVERING_COLUMNS = [
+    'open_price',
+    'high_price',
+    'low_price',
+    'close_price',
+    'volume',
+    'quote_volume',
+    'trades_count',
+    'loaded_at',
+]
+MONTHS_AHEAD = 2
+
+
+def _month_start(ts_ms: int) -> datetime:
+    dt = datetime.fromtimestamp(ts_ms / 1000, tz=UTC)
+    return datetime(dt.year, dt.month, 1, tzinfo=UTC)
+
+
+def _next_month(month: datetime) -> datetime:
+    return datetime(month.year + month.month // 12, month.month % 12 + 1, 1, tzinfo=UTC)
+
+
+def _ms(dt: datetime) -> int:
+    return int(dt.timestamp() * 1000)
+
+
+def _create_read_indexes() -> None:
+    op.create_index(
+        'ix_candlestick_symbol_interval_ts',
+        'candlestick_records',
+        ['symbol', 'interval', sa.text('timestamp DESC'), 'exchange'],
+        unique=False,
+        postgresql_include=COVERING_COLUMNS,
+    )
+    op.create_index('ix_candlestick_timestamp', 'candlestick_records', ['timestamp'], unique=False)
+    op.create_index('ix_candlestick_loaded_at', 'candlestick_records', ['loaded_at'], unique=False)
+
+
+def upgrade() -> None:
+    op.create_table('candle_row_counts',
+    sa.Column('month', sa.BigInteger(), nullable=False, comment='Month start as Unix timestamp in milliseconds (UTC)'),
+    sa.Column('symbol', sa.String(length=50), nullable=False),
+    sa.Column('interval', sa.String(length=10), nullable=False),
+    sa.Column('row_count', sa.BigInteger(), nullable=False),
+    sa.Column('min_timestamp', sa.BigInteger(), nullable=True),
+    sa.Column('max_timestamp', sa.BigInteger(), nullable=True),
+    sa.Column('counted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False, comment='When the month was last counted'),
+    sa.PrimaryKeyConstraint('month', 'symbol', 'interval')
+    )
+
+    # Prefix of the primary key, never chosen by the planner
+    op.drop_index('ix_candlestick_exchange_symbol_interval', table_name='candlestick_records')
+
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite keeps a single table; retention and VACUUM run in candle_maintenance_job
+        return
+
+    # Rebuild as a partitioned table: PostgreSQL cannot partition in place
+    op.execute('ALTER TABLE candlestick_records RENAME TO candlestick_records_legacy')
+    op.execute('ALTER TABLE candlestick_records_legacy RENAME CONSTRAINT candlestick_records_pkey TO candlestick_records_legacy_pkey')
+    for index in ('ix_candlestick_symbol_interval_ts', 'ix_candlestick_timestamp', 'ix_candlestick_loaded_at'):
+        op.drop_index(index, table_name='candlestick_records_legacy')
+
+    op.execute(
+        'CREATE TABLE candlestick_records '
+        '(LIKE candlestick_records_legacy INCLUDING DEFAULTS INCLUDING COMMENTS) '
+        'PARTITION BY RANGE (timestamp)'
+    )
+    op.create_primary_key('candlestick_records_pkey', 'candlestick_records', ['exchange', 'symbol', 'interval', 'timestamp'])
+
+    now = int(time.time() * 1000)
+    first = now
+    if not context.is_offline_mode():
+        oldest = op.get_bind().execute(sa.text('SELECT MIN(timestamp) FROM candlestick_records_legacy')).scalar()
+        first = min(oldest, now) if oldest is not None else now
+
+    month = _month_start(first)
+    last = _month_start(now)
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        end = _next_month(month)
+        op.execute(
+            f'CREATE TABLE candlestick_records_p{month:%Y%m} PARTITION OF candlestick_records '
+            f'FOR VALUES FROM ({_ms(month)}) TO ({_ms(end)})'
+        )
+        month = end
+    op.execute('CREATE TABLE candlestick_records_default PARTITION OF candlestick_records DEFAULT')
+
+    op.execute(f'INSERT INTO candlestick_records ({COLUMNS}) SELECT {COLUMNS} FROM candlestick_records_legacy')
+    op.drop_table('candlestick_records_legacy')
+
+    _create_read_indexes()
+    op.execute('ANALYZE candlestick_records')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ALTER TABLE candlestick_records RENAME TO candlestick_records_partitioned')
+        op.execute('ALTER TABLE candlestick_records_partitioned RENAME CONSTRAINT candlestick_records_pkey TO candlestick_records_partitioned_pkey')
+        for index in ('ix_candlestick_symbol_interval_ts', 'ix_candlestick_timestamp', 'ix_candlestick_loaded_at'):
+            op.drop_index(index, table_name='candlestick_records_partitioned')
+
+        op.execute(
+            'CREATE TABLE candlestick_records '
+            '(LIKE candlestick_records_partitioned INCLUDING DEFAULTS INCLUDING COMMENTS)'
+        )
+        op.create_primary_key('candlestick_records_pkey', 'candlestick_records', ['exchange', 'symbol', 'interval', 'timestamp'])
+        op.execute(f'INSERT INTO candlestick_records ({COLUMNS}) SELECT {COLUMNS} FROM candlestick_records_partitioned')
+        # Dropping the parent drops all monthly partitions
+        op.drop_table('candlestick_records_partitioned')
+        _create_read_indexes()
+
+    op.create_index('ix_candlestick_exchange_symbol_interval', 'candlestick_records', ['exchange', 'symbol', 'interval'], unique=False)
+    op.drop_table('candle_row_counts')
@@ -0,0 +1,54 @@
+"""add_candlestick_covering_read_index
+
+Revision ID: 183ce9add2ba
+Revises: 80d9d02135d1
+Create Date: 2026-10-18 11:20:41.512304
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '183ce9add2ba'
+down_revision: str | None = '80d9d02135d1'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COVERING_COLUMNS = [
+    'open_price',
+    'high_price',
+    'low_price',
+    'close_price',
+    'volume',
+    'quote_volume',
+    'trades_count',
+    'loaded_at',
+]
+
+
+def upgrade() -> None:
+    # Built concurrently: candlestick_records is large and written every minute
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_candlestick_symbol_interval_ts',
+            'candlestick_records',
+            ['symbol', 'interval', sa.text('timestamp DESC'), 'exchange'],
+            unique=False,
+            postgresql_include=COVERING_COLUMNS,
+            postgresql_concurrently=True,
+        )
+        # Leading column of the new index
+        op.drop_index('ix_candlestick_symbol', table_name='candlestick_records', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_candlestick_symbol', 'candlestick_records', ['symbol'], unique=False, postgresql_concurrently=True
+        )
+        op.drop_index(
+            'ix_candlestick_symbol_interval_ts', table_name='candlestick_records', postgresql_concurrently=True
+        )
@@ -0,0 +1,32 @@
+"""add_portfolio_snapshots_table
+
+Revision ID: 4e2b9c7d1a36
+Revises: d0eeb64840ed
+Create Date: 2026-10-18 23:40:12.518204
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e2b9c7d1a36'
+down_revision: str | None = 'd0eeb64840ed'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table('portfolio_snapshots',
+    sa.Column('day', sa.BigInteger(), nullable=False, comment='UTC day start as Unix timestamp in milliseconds'),
+    sa.Column('total_value', sa.Double(), nullable=False, comment='Portfolio value in USDT (latest of the day)'),
+    sa.Column('holdings', sa.Text(), nullable=False, comment='JSON object of holding values in USDT by symbol'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False, comment='When the snapshot was last written'),
+    sa.PrimaryKeyConstraint('day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('portfolio_snapshots')
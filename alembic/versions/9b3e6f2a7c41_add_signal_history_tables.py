@@ -0,0 +1,85 @@
+"""add_signal_history_tables
+
+Revision ID: 9b3e6f2a7c41
+Revises: 4e2b9c7d1a36
+Create Date: 2026-10-19 09:12:47.308115
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3e6f2a7c41'
+down_revision: str | None = '4e2b9c7d1a36'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table('signal_records',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False, comment='Signal number (public id is sig_<number>)'),
+    sa.Column('symbol', sa.String(length=20), nullable=False, comment='Base asset symbol (e.g., BTC)'),
+    sa.Column('signal_type', sa.String(length=20), nullable=False, comment='buy, sell, strong_buy, strong_sell or neutral'),
+    sa.Column('source', sa.String(length=20), nullable=False, comment='Signal source (divergence, pattern, indicator, ...)'),
+    sa.Column('created_at', sa.BigInteger(), nullable=False, comment='Signal time as Unix timestamp in milliseconds'),
+    sa.Column('price_at_signal', sa.Double(), nullable=False, comment='Price when the signal was generated'),
+    sa.Column('confidence', sa.Integer(), nullable=False, comment='Signal confidence (0-100)'),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('description_ru', sa.Text(), nullable=False),
+    sa.Column('outcome_24h', sa.String(length=10), server_default='pending', nullable=False, comment='pending, win, loss or neutral after 24h'),
+    sa.Column('outcome_7d', sa.String(length=10), server_default='pending', nullable=False, comment='pending, win, loss or neutral after 7d'),
+    sa.Column('price_after_24h', sa.Double(), nullable=True),
+    sa.Column('price_after_7d', sa.Double(), nullable=True),
+    sa.Column('pnl_24h_pct', sa.Double(), nullable=True),
+    sa.Column('pnl_7d_pct', sa.Double(), nullable=True),
+    sa.Column('effective_pnl', sa.Double(), nullable=True, comment='7d P&L if resolved, else 24h P&L (best/worst signal ranking)'),
+    sa.PrimaryKeyConstraint('id'),
+    comment='Trading signals with 24h/7d outcome tracking'
+    )
+    op.create_index('ix_signal_symbol_created_outcome', 'signal_records', ['symbol', 'created_at', 'outcome_7d'], unique=False)
+    op.create_index('ix_signal_created_at', 'signal_records', ['created_at'], unique=False)
+    op.create_index('ix_signal_effective_pnl', 'signal_records', ['effective_pnl'], unique=False)
+    op.create_index(
+        'ix_signal_pending_24h',
+        'signal_records',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("outcome_24h = 'pending'"),
+        sqlite_where=sa.text("outcome_24h = 'pending'"),
+    )
+    op.create_index(
+        'ix_signal_pending_7d',
+        'signal_records',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("outcome_7d = 'pending'"),
+        sqlite_where=sa.text("outcome_7d = 'pending'"),
+    )
+    op.create_table('signal_stats',
+    sa.Column('source', sa.String(length=20), nullable=False),
+    sa.Column('signal_type', sa.String(length=20), nullable=False),
+    sa.Column('recorded', sa.BigInteger(), server_default='0', nullable=False, comment='Signals recorded'),
+    sa.Column('resolved_24h', sa.BigInteger(), server_default='0', nullable=False, comment='Signals with a 24h outcome'),
+    sa.Column('wins_24h', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('losses_24h', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('sum_pnl_24h', sa.Double(), server_default='0', nullable=False, comment='Sum of 24h P&L percentages'),
+    sa.Column('resolved_7d', sa.BigInteger(), server_default='0', nullable=False, comment='Signals with a 7d outcome'),
+    sa.Column('wins_7d', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('losses_7d', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('sum_pnl_7d', sa.Double(), server_default='0', nullable=False, comment='Sum of 7d P&L percentages'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('source', 'signal_type')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('signal_stats')
+    op.drop_index('ix_signal_pending_7d', table_name='signal_records')
+    op.drop_index('ix_signal_pending_24h', table_name='signal_records')
+    op.drop_index('ix_signal_effective_pnl', table_name='signal_records')
+    op.drop_index('ix_signal_created_at', table_name='signal_records')
+    op.drop_index('ix_signal_symbol_created_outcome', table_name='signal_records')
+    op.drop_table('signal_records')
@@ -0,0 +1,92 @@
+"""ml_performance_running_aggregates
+
+Revision ID: d0eeb64840ed
+Revises: 0f7a1535cc7c
+Create Date: 2026-10-18 16:48:03.271945
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0eeb64840ed'
+down_revision: str | None = '0f7a1535cc7c'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+AGGREGATES = [
+    ('error_count', sa.BigInteger(), 'Resolved predictions with an absolute error'),
+    ('sum_abs_error', sa.Double(), 'Sum of absolute errors'),
+    ('sum_sq_error', sa.Double(), 'Sum of squared errors'),
+    ('pct_error_count', sa.BigInteger(), 'Resolved predictions with a percentage error'),
+    ('sum_abs_pct_error', sa.Double(), 'Sum of absolute percentage errors'),
+    ('direction_count', sa.BigInteger(), 'Resolved predictions with a direction outcome'),
+    ('direction_hits', sa.BigInteger(), 'Resolved predictions with the correct direction'),
+    ('sum_confidence', sa.Double(), 'Sum of confidence percentages of resolved predictions'),
+]
+
+
+def upgrade() -> None:
+    op.add_column('ml_prediction_records', sa.Column('reference_price', sa.Numeric(precision=30, scale=10), nullable=True, comment='Last context price when the prediction was made (direction baseline)'))
+    for name, type_, comment in AGGREGATES:
+        op.add_column('ml_model_performance', sa.Column(name, type_, server_default='0', nullable=False, comment=comment))
+    op.create_index(
+        'ix_ml_prediction_unresolved',
+        'ml_prediction_records',
+        ['prediction_timestamp'],
+        unique=False,
+        postgresql_where=sa.text('actual_price IS NULL'),
+        sqlite_where=sa.text('actual_price IS NULL'),
+    )
+
+    # Direction baseline: last element of the stored context JSON array
+    if op.get_bind().dialect.name == 'postgresql':
+        last_context = "(context_prices::jsonb ->> -1)::numeric"
+    else:
+        last_context = "CAST(json_extract(context_prices, '$[#-1]') AS NUMERIC)"
+    op.execute(f"""
+        UPDATE ml_prediction_records SET reference_price = {last_context}
+        WHERE context_prices IS NOT NULL AND context_prices NOT IN ('', '[]')
+    """)
+
+    # Seed running aggregates from already evaluated predictions
+    op.execute("""
+        INSERT INTO ml_model_performance
+        (symbol, model_name, interval, total_predictions, evaluated_predictions,
+         error_count, sum_abs_error, sum_sq_error, pct_error_count, sum_abs_pct_error,
+         direction_count, direction_hits, sum_confidence)
+        SELECT symbol, model_name, interval, COUNT(*),
+               COUNT(actual_price),
+               COUNT(absolute_error),
+               COALESCE(SUM(ABS(absolute_error)), 0),
+               COALESCE(SUM(absolute_error * absolute_error), 0),
+               COUNT(percentage_error),
+               COALESCE(SUM(ABS(percentage_error)), 0),
+               COUNT(direction_correct),
+               COALESCE(SUM(CASE WHEN direction_correct THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN actual_price IS NOT NULL THEN confidence_percentage END), 0)
+        FROM ml_prediction_records
+        WHERE TRUE
+        GROUP BY symbol, model_name, interval
+        ON CONFLICT (symbol, model_name, interval) DO UPDATE SET
+            total_predictions = EXCLUDED.total_predictions,
+            evaluated_predictions = EXCLUDED.evaluated_predictions,
+            error_count = EXCLUDED.error_count,
+            sum_abs_error = EXCLUDED.sum_abs_error,
+            sum_sq_error = EXCLUDED.sum_sq_error,
+            pct_error_count = EXCLUDED.pct_error_count,
+            sum_abs_pct_error = EXCLUDED.sum_abs_pct_error,
+            direction_count = EXCLUDED.direction_count,
+            direction_hits = EXCLUDED.direction_hits,
+            sum_confidence = EXCLUDED.sum_confidence
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ml_prediction_unresolved', table_name='ml_prediction_records')
+    for name, _, _ in reversed(AGGREGATES):
+        op.drop_column('ml_model_performance', name)
+    op.drop_column('ml_prediction_records', 'reference_price')
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+SQLite sustained write benchmark.
+
+Runs the same workload twice against a scratch SQLite file:
+
+- legacy: default pragmas (rollback journal, synchronous=FULL), every
+  producer opens its own session and commits, "database is locked"
+  errors are retried with backoff like CandleBuffer did
+- profile: WAL + tuned pragmas, every write goes through the
+  single-writer queue (models.writer.WriteQueue)
+
+Producers issue small upserts (sensor-state sized) while readers keep
+querying the table, which is the app's typical mix.
+
+Usage:
+    python scripts/benchmark_sqlite_writes.py [--producers 20] [--writes 200] [--readers 4]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from models.session import configure_sqlite_engine  # noqa: E402
+from models.writer import WriteQueue  # noqa: E402
+
+UPSERT = text("""
+    INSERT INTO bench_state (key, value, updated_at) VALUES (:key, :value, :updated_at)
+    ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = EXCLUDED.updated_at
+""")
+READ = text("SELECT COUNT(*), MAX(updated_at) FROM bench_state")
+
+MAX_RETRIES = 3
+
+
+async def create_schema(url: str) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TABLE IF EXISTS bench_state"))
+        await conn.execute(text("CREATE TABLE bench_state (key TEXT PRIMARY KEY, value TEXT, updated_at REAL)"))
+    await engine.dispose()
+
+
+async def run_readers(maker, stop: asyncio.Event, count: int) -> int:
+    reads = 0
+
+    async def reader() -> None:
+        nonlocal reads
+        while not stop.is_set():
+            try:
+                async with maker() as session:
+                    await session.execute(READ)
+                reads += 1
+            except Exception:
+                pass
+            await asyncio.sleep(0.005)
+
+    await asyncio.gather(*(reader() for _ in range(count)))
+    return reads
+
+
+async def legacy(url: str, producers: int, writes: int, readers: int) -> dict:
+    engine = create_async_engine(url, pool_size=5, max_overflow=10)
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    errors = 0
+    failed = 0
+
+    async def producer(p: int) -> None:
+        nonlocal errors, failed
+        for k in range(writes):
+            params = {"key": f"sensor_{p}_{k % 20}", "value": str(k), "updated_at": time.time()}
+            for attempt in range(MAX_RETRIES):
+                try:
+                    async with maker() as session:
+                        await session.execute(UPSERT, params)
+                        await session.commit()
+                    break
+                except Exception:
+                    errors += 1
+                    if attempt == MAX_RETRIES - 1:
+                        failed += 1
+                    else:
+                        await asyncio.sleep((2**attempt) * 0.05)
+
+    stop = asyncio.Event()
+    read_task = asyncio.create_task(run_readers(maker, stop, readers))
+    started = time.perf_counter()
+    await asyncio.gather(*(producer(p) for p in range(producers)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    reads = await read_task
+    await engine.dispose()
+    return {"elapsed": elapsed, "errors": errors, "failed": failed, "reads": reads}
+
+
+async def profile(url: str, producers: int, writes: int, readers: int) -> dict:
+    read_engine = create_async_engine(url, pool_size=5, max_overflow=10)
+    configure_sqlite_engine(read_engine)
+    write_engine = create_async_engine(url, pool_size=1, max_overflow=0)
+    configure_sqlite_engine(write_engine, begin="BEGIN IMMEDIATE")
+    maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    queue = WriteQueue(write_engine)
+    failed = 0
+
+    async def producer(p: int) -> None:
+        nonlocal failed
+        for k in range(writes):
+            params = {"key": f"sensor_{p}_{k % 20}", "value": str(k), "updated_at": time.time()}
+            try:
+                await queue.submit(lambda session, params=params: session.execute(UPSERT, params))
+            except Exception:
+                failed += 1
+
+    stop = asyncio.Event()
+    read_task = asyncio.create_task(run_readers(maker, stop, readers))
+    started = time.perf_counter()
+    await asyncio.gather(*(producer(p) for p in range(producers)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    reads = await read_task
+    stats = queue.get_stats()
+    await queue.close()
+    await read_engine.dispose()
+    await write_engine.dispose()
+    return {"elapsed": elapsed, "errors": stats["batch_errors"], "failed": failed, "reads": reads, **stats}
+
+
+def remove_db(path: str) -> None:
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="/tmp/sqlite_write_bench.db")
+    parser.add_argument("--producers", type=int, default=20)
+    parser.add_argument("--writes", type=int, default=200, help="Writes per producer")
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    url = f"sqlite+aiosqlite:///{args.path}"
+    total = args.producers * args.writes
+    results = {}
+    for name, run in (("legacy", legacy), ("wal + single writer", profile)):
+        remove_db(args.path)
+        await create_schema(url)
+        results[name] = await run(url, args.producers, args.writes, args.readers)
+    remove_db(args.path)
+
+    print(f"{args.producers} producers x {args.writes} writes, {args.readers} readers")
+    print(f"  {'mode':<22} {'writes/s':>10} {'lock errors':>12} {'lost':>6} {'reads':>8}")
+    for name, r in results.items():
+        print(
+            f"  {name:<22} {(total - r['failed']) / r['elapsed']:>10.0f} {r['errors']:>12} "
+            f"{r['failed']:>6} {r['reads']:>8}"
+        )
+    batched = results["wal + single writer"]
+    print(f"  writer batches: {batched['batches']}, avg size {batched['avg_batch_size']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
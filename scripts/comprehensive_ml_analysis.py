@@ -17,13 +17,11 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from sqlalchemy import text
-
 from core.constants import DEFAULT_SYMBOLS, MLDefaults
 from models.models.ml_predictions import MLPredictionRecord
 from models.repositories.ml_predictions import MLPredictionRepository
 from models.session import async_session_maker
-from service.candlestick import CandleInterval, fetch_candlesticks
+from service.candlestick import CandleInterval, fetch_candlesticks, load_history
 from service.ml.backtester import ForecastBacktester
 from service.ml.forecaster import PriceForecaster
 
@@ -79,6 +77,13 @@ class ComprehensiveMLAnalyzer:
             end_time = int(datetime.now().timestamp() * 1000)
             start_time = int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
 
+            # Stored history first (memory-mapped archive + recent DB rows)
+            history = await load_history(symbol, interval, start_time, end_time)
+            if len(history):
+                prices = history.close.tolist()
+                logger.info(f"Loaded {len(prices)} stored candles for {symbol}")
+                return prices
+
             candles = await fetch_candlesticks(
                 symbol=symbol,
                 interval=CandleInterval(interval),
@@ -181,32 +186,16 @@ class ComprehensiveMLAnalyzer:
         async with async_session_maker() as session:
             repo = MLPredictionRepository(session)
 
-            # Get predictions made at the specified timestamp
-            stmt = """
-                SELECT id FROM ml_prediction_records
-                WHERE symbol = :symbol
-                AND interval = :interval
-                AND prediction_timestamp = :prediction_timestamp
-                AND actual_price IS NULL
-            """
-
-            result = await session.execute(
-                text(stmt), {"symbol": symbol, "interval": interval, "prediction_timestamp": prediction_timestamp}
+            # Resolve every model's prediction made at this timestamp in one UPDATE
+            resolved = await repo.resolve_predictions(
+                symbol, interval, prediction_timestamp, actual_price, actual_timestamp
             )
 
-            prediction_ids = [row[0] for row in result.fetchall()]
-
-            if not prediction_ids:
+            if not resolved:
                 logger.warning(f"No unresolved predictions found for {symbol} at {prediction_timestamp}")
                 return
 
-            # Update each prediction with actual price
-            for pred_id in prediction_ids:
-                try:
-                    await repo.update_actual_price(pred_id, actual_price, actual_timestamp)
-                    logger.info(f"Updated prediction {pred_id} with actual price {actual_price}")
-                except Exception as e:
-                    logger.error(f"Failed to update prediction {pred_id}: {e}")
+            logger.info(f"Resolved {resolved} predictions with actual price {actual_price}")
 
     async def calculate_performance_statistics(self, symbol: str, interval: str):
         """Calculate and update performance statistics for all models."""
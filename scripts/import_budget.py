@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Import-time budget report.
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter and
+reports the slowest top-level packages. Fails (exit code 1) if the total
+import time exceeds the budget or a forbidden heavy package is imported
+eagerly at startup.
+
+Usage:
+    python scripts/import_budget.py [--budget-ms 2000] [--top 15]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+# Heavy stacks that must stay behind core.lazy_import at startup
+FORBIDDEN_AT_STARTUP = (
+    "torch",
+    "chronos",
+    "statsforecast",
+    "neuralprophet",
+    "optuna",
+    "plotly",
+    "yfinance",
+    "pandas",
+)
+
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure(module: str) -> list[tuple[str, int, int]]:
+    """Import module in a fresh interpreter, return (name, self_us, cumulative_us)."""
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        raise SystemExit(f"Importing {module} failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import-time budget report")
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--budget-ms", type=float, default=2000.0, help="Max total import time")
+    parser.add_argument("--top", type=int, default=15, help="Number of packages to show")
+    args = parser.parse_args()
+
+    rows = measure(args.module)
+    by_package: dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+
+    total_ms = next((cum for name, _, cum in rows if name == args.module), 0) / 1000
+    imported = {name.split(".")[0] for name, _, _ in rows}
+
+    print(f"Import of '{args.module}': {total_ms:.0f}ms (budget {args.budget_ms:.0f}ms)\n")
+    print(f"{'package':<30} {'self ms':>10}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"{package:<30} {self_us / 1000:>10.1f}")
+
+    failed = False
+    eager = sorted(imported.intersection(FORBIDDEN_AT_STARTUP))
+    if eager:
+        print(f"\nHeavy packages imported at startup: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"\nImport time {total_ms:.0f}ms exceeds budget {args.budget_ms:.0f}ms")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
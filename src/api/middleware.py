@@ -144,8 +144,10 @@ async def _notify_critical_error(error_message: str, context: str = "") -> None:
         context: Additional context
     """
     try:
-        from service.ha_integration import notify_error
-        await notify_error(error_message=error_message, context=context)
+        from service.alerts.notification_bus import publish_error
+        from service.alerts.notification_manager import AlertPriority
+
+        await publish_error(error_message=error_message, context=context, priority=AlertPriority.CRITICAL)
     except ImportError:
         logger.debug("HA integration not available")
     except Exception as e:
@@ -4,7 +4,9 @@ Backtest API Routes.
 Endpoints for DCA backtesting:
 - GET /api/backtest/dca - Run DCA backtest
 - GET /api/backtest/compare - Compare strategies
+- GET /api/backtest/sweep - Sweep amount/frequency/F&G parameters
 - GET /api/backtest/risk - Risk analysis
+- GET /api/backtest/risk/monte-carlo - Monte Carlo VaR/CVaR and drawdowns
 """
 
 import logging
@@ -28,6 +30,26 @@ def set_backtest_services(backtester, risk_analyzer):
     _risk_analyzer = risk_analyzer
 
 
+def _get_backtester():
+    """Get the backtester set from main.py, or the global one."""
+    if _backtester is not None:
+        return _backtester
+
+    from service.analysis.backtest import get_backtester
+
+    return get_backtester()
+
+
+def _normalize_symbol(symbol: str) -> str:
+    """Normalize symbol to stored format (BTC -> BTC/USDT)."""
+    symbol = symbol.upper()
+    return symbol if "/" in symbol else f"{symbol}/USDT"
+
+
+def _split(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
 @router.get("/dca")
 async def backtest_dca(
     symbol: str = Query(default="BTC/USDT", description="Trading pair"),
@@ -36,43 +58,23 @@ async def backtest_dca(
     strategy: str = Query(default="fixed", description="Strategy: fixed, smart, lump_sum"),
 ) -> dict[str, Any]:
     """
-    Run DCA backtest.
+    Run DCA backtest on stored daily candles.
 
     Strategies:
     - fixed: Regular weekly purchases
     - smart: Fear & Greed adjusted purchases
     - lump_sum: Single purchase at start
     """
-    if not _backtester:
-        raise HTTPException(status_code=503, detail="Backtest service not available")
-
-    # Get candle data (mock for now - in production, fetch from DB)
-    candles = await _get_historical_candles(symbol, years)
-
-    if not candles:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No historical data available for {symbol}",
-        )
-
-    try:
-        if strategy == "fixed":
-            result = await _backtester.backtest_fixed_dca(symbol, candles, amount, "weekly", years)
-        elif strategy == "smart":
-            result = await _backtester.backtest_smart_dca(symbol, candles, amount, years)
-        elif strategy == "lump_sum":
-            total = amount * 52 * years
-            result = await _backtester.backtest_lump_sum(symbol, candles, total, years)
-        else:
-            raise HTTPException(status_code=400, detail=f"Unknown strategy: {strategy}")
-
-        return result.to_dict()
-
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Backtest failed: {e}")
+    strategies = {"fixed": "fixed_dca", "smart": "smart_dca", "lump_sum": "lump_sum"}
+    if strategy not in strategies:
+        raise HTTPException(status_code=400, detail=f"Unknown strategy: {strategy}")
+
+    # All strategies come from one cached vectorized pass
+    comparison = await _compare_stored(_normalize_symbol(symbol), amount, years)
+    result = comparison["strategies"].get(strategies[strategy])
+    if result is None:
         raise HTTPException(status_code=500, detail="Backtest failed")
+    return result
 
 
 @router.get("/compare")
@@ -82,26 +84,64 @@ async def compare_strategies(
     years: int = Query(default=5, ge=1, le=10, description="Years to compare"),
 ) -> dict[str, Any]:
     """
-    Compare all DCA strategies.
+    Compare all DCA strategies on stored daily candles.
 
     Returns comparison of Fixed DCA, Smart DCA, and Lump Sum.
     """
-    if not _backtester:
-        raise HTTPException(status_code=503, detail="Backtest service not available")
+    return await _compare_stored(_normalize_symbol(symbol), amount, years)
+
+
+@router.get("/sweep")
+async def sweep_parameters(
+    symbol: str = Query(default="BTC/USDT", description="Trading pair"),
+    amounts: str = Query(default="50,100,250", description="Comma-separated amounts per purchase"),
+    frequencies: str = Query(default="daily,weekly,monthly", description="Comma-separated: daily, weekly, monthly"),
+    fg_schemes: str = Query(
+        default="none,mild,standard,aggressive",
+        description="Comma-separated F&G multiplier schemes: none, mild, standard, aggressive",
+    ),
+    years: int = Query(default=5, ge=1, le=10, description="Years to backtest"),
+) -> dict[str, Any]:
+    """
+    Sweep DCA parameters on stored daily candles.
 
-    candles = await _get_historical_candles(symbol, years)
+    Simulates every amount/frequency/F&G scheme combination in one pass
+    and returns scenarios sorted by total return.
+    """
+    try:
+        amount_values = [float(a) for a in _split(amounts)]
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid amounts: {amounts}")
+    if not amount_values or not _split(frequencies) or not _split(fg_schemes):
+        raise HTTPException(status_code=400, detail="amounts, frequencies and fg_schemes must not be empty")
 
-    if not candles:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No historical data available for {symbol}",
+    symbol = _normalize_symbol(symbol)
+    try:
+        result = await _get_backtester().sweep_stored(
+            symbol, amount_values, _split(frequencies), _split(fg_schemes), years
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Parameter sweep failed: {e}")
+        raise HTTPException(status_code=503, detail="Historical data not available")
+
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No historical data available for {symbol}")
+    return result
 
+
+async def _compare_stored(symbol: str, amount: float, years: int) -> dict[str, Any]:
+    """Run the cached strategy comparison, mapping failures to HTTP errors."""
     try:
-        return await _backtester.compare_strategies(symbol, candles, amount, years)
+        result = await _get_backtester().compare_stored(symbol, amount, years)
     except Exception as e:
         logger.error(f"Strategy comparison failed: {e}")
-        raise HTTPException(status_code=500, detail="Comparison failed")
+        raise HTTPException(status_code=503, detail="Historical data not available")
+
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No historical data available for {symbol}")
+    return result
 
 
 @router.get("/risk")
@@ -117,8 +157,12 @@ async def get_risk_metrics(
         raise HTTPException(status_code=503, detail="Risk service not available")
 
     try:
-        # Generate sample portfolio history for demo
-        # In production, this would come from actual portfolio tracking
+        # Persisted daily portfolio snapshots
+        if await _risk_analyzer.load_history() >= 7:
+            metrics = await _risk_analyzer.calculate_risk_metrics(current_value=portfolio_value)
+            return metrics.to_dict()
+
+        # Generate sample portfolio history for demo until snapshots accumulate
         import random
 
         portfolio_values = [portfolio_value]
@@ -158,6 +202,37 @@ async def stress_test(
         raise HTTPException(status_code=500, detail="Stress test failed")
 
 
+@router.get("/risk/monte-carlo")
+async def monte_carlo(
+    horizon_days: int = Query(default=30, ge=1, le=365, description="Days simulated per path"),
+    paths: int = Query(default=100_000, ge=1_000, le=200_000, description="Number of simulated paths"),
+    method: str = Query(default="bootstrap", description="Sampling: bootstrap or covariance"),
+) -> dict[str, Any]:
+    """
+    Simulate the tracked portfolio's risk distribution.
+
+    Multi-asset Monte Carlo on stored daily returns of the holdings:
+    horizon VaR/CVaR, max drawdown distribution and time to recovery.
+    Results are cached until new daily candles arrive.
+    """
+    from service.analysis.risk_engine import SimulationMethod, get_risk_engine, portfolio_holdings
+
+    if method not in {m.value for m in SimulationMethod}:
+        raise HTTPException(status_code=400, detail=f"Unknown method: {method}")
+
+    try:
+        result = await get_risk_engine().simulate(
+            portfolio_holdings(), horizon_days=horizon_days, paths=paths, method=method
+        )
+    except Exception as e:
+        logger.error(f"Monte Carlo simulation failed: {e}")
+        raise HTTPException(status_code=500, detail="Monte Carlo simulation failed")
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="No holdings with stored daily history")
+    return result.to_dict()
+
+
 @router.get("/risk/summary")
 async def get_risk_summary() -> dict[str, Any]:
     """Get risk summary with recommendations."""
@@ -180,10 +255,9 @@ async def get_backtest_sensors() -> dict[str, Any]:
         "backtest_best_strategy": "N/A",
     }
 
-    if _backtester:
-        cached = _backtester.get_cached_result("BTC/USDT")
-        if cached:
-            result["backtest_dca_roi"] = f"{cached.total_return_pct:.1f}%"
+    cached = _get_backtester().get_cached_result("BTC/USDT")
+    if cached:
+        result["backtest_dca_roi"] = f"{cached.total_return_pct:.1f}%"
 
     if _risk_analyzer and _risk_analyzer.last_metrics:
         m = _risk_analyzer.last_metrics
@@ -192,48 +266,3 @@ async def get_backtest_sensors() -> dict[str, Any]:
         result["risk_status"] = m.risk_status
 
     return result
-
-
-async def _get_historical_candles(symbol: str, years: int) -> list[dict]:
-    """
-    Get historical candle data.
-
-    In production, this fetches from the database.
-    For demo, generates synthetic data.
-    """
-    import random
-    from datetime import datetime, timedelta
-
-    # Generate synthetic daily candles for demo
-    candles = []
-    base_price = 50000 if "BTC" in symbol else 3000
-
-    current_price = base_price * 0.3  # Start lower in the past
-    start_date = datetime.now() - timedelta(days=years * 365)
-
-    for i in range(years * 365):
-        date = start_date + timedelta(days=i)
-
-        # Random walk with slight upward bias
-        change = random.uniform(-0.03, 0.035)
-        current_price *= 1 + change
-
-        # Add some volatility spikes
-        if random.random() < 0.02:
-            current_price *= random.uniform(0.9, 1.15)
-
-        high = current_price * random.uniform(1.0, 1.02)
-        low = current_price * random.uniform(0.98, 1.0)
-
-        candles.append(
-            {
-                "timestamp": int(date.timestamp() * 1000),
-                "open": current_price * random.uniform(0.99, 1.01),
-                "high": high,
-                "low": low,
-                "close": current_price,
-                "volume": random.uniform(1000, 10000) * base_price,
-            }
-        )
-
-    return candles
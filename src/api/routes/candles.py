@@ -28,49 +28,30 @@ async def get_available_symbols() -> dict[str, Any]:
     Returns:
         Available symbols and intervals
     """
-    try:
-        async with async_session_maker() as session:
-            # Get unique symbols
-            symbols_result = await session.execute(
-                text("SELECT DISTINCT symbol FROM candlestick_records ORDER BY symbol")
-            )
-            symbols = [row[0] for row in symbols_result.fetchall()]
-
-            # Get unique intervals
-            intervals_result = await session.execute(
-                text("SELECT DISTINCT interval FROM candlestick_records ORDER BY interval")
-            )
-            intervals = [row[0] for row in intervals_result.fetchall()]
-
-            # Get count per symbol/interval
-            stats_result = await session.execute(
-                text("""
-                    SELECT symbol, interval, COUNT(*) as count,
-                           MIN(timestamp) as oldest,
-                           MAX(timestamp) as newest
-                    FROM candlestick_records
-                    GROUP BY symbol, interval
-                    ORDER BY symbol, interval
-                """)
-            )
+    from service.candlestick.maintenance import get_candle_storage
 
-            stats = []
-            for row in stats_result.fetchall():
-                stats.append(
-                    {
-                        "symbol": row[0],
-                        "interval": row[1],
-                        "count": row[2],
-                        "oldest": datetime.fromtimestamp(row[3] / 1000).isoformat() if row[3] else None,
-                        "newest": datetime.fromtimestamp(row[4] / 1000).isoformat() if row[4] else None,
-                    }
-                )
-
-            return {
-                "symbols": symbols,
-                "intervals": intervals,
-                "stats": stats,
+    try:
+        # Served from maintained row counters (no full-table GROUP BY)
+        storage = get_candle_storage()
+        await storage.refresh_counts()
+        series = await storage.series_counts()
+
+        stats = [
+            {
+                "symbol": row["symbol"],
+                "interval": row["interval"],
+                "count": row["count"],
+                "oldest": datetime.fromtimestamp(row["oldest"] / 1000).isoformat() if row["oldest"] else None,
+                "newest": datetime.fromtimestamp(row["newest"] / 1000).isoformat() if row["newest"] else None,
             }
+            for row in series
+        ]
+
+        return {
+            "symbols": sorted({row["symbol"] for row in series}),
+            "intervals": sorted({row["interval"] for row in series}),
+            "stats": stats,
+        }
 
     except Exception as e:
         logger.error(f"Error fetching available data: {e}")
@@ -3,6 +3,7 @@ import logging
 from typing import Any
 
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,17 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@router.get("/api/health/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """Scheduler job and event-loop metrics in Prometheus text format."""
+    from core.scheduler.telemetry import get_scheduler_telemetry
+
+    return PlainTextResponse(
+        get_scheduler_telemetry().render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 @router.get("/api/debug/sensors")
 async def get_all_sensor_states() -> dict[str, Any]:
     """Get all cached sensor states for debugging."""
@@ -26,6 +38,170 @@ async def get_all_sensor_states() -> dict[str, Any]:
     }
 
 
+@router.get("/api/debug/market-facts")
+async def get_market_fact_stats() -> dict[str, Any]:
+    """Get shared market fact cache hit/miss statistics."""
+    from service.analysis.market_facts import get_market_fact_store
+
+    return {"facts": get_market_fact_store().get_stats()}
+
+
+@router.get("/api/debug/esphome")
+async def get_esphome_client_stats() -> dict[str, Any]:
+    """Get ESPHome API per-client send queue and latency statistics."""
+    from service.esphome_api import get_esphome_server, get_state_bridge
+
+    clients = get_esphome_server().get_client_stats()
+    bridge = get_state_bridge()
+    return {
+        "clients": clients,
+        "total": len(clients),
+        "state_bridge": bridge.get_stats() if bridge else None,
+    }
+
+
+@router.get("/api/debug/scheduler")
+async def get_scheduler_stats() -> dict[str, Any]:
+    """Get per-job run telemetry and event-loop lag."""
+    from core.scheduler.telemetry import get_scheduler_telemetry
+
+    return get_scheduler_telemetry().get_stats()
+
+
+@router.get("/api/debug/candle-rollups")
+async def get_candle_rollup_stats() -> dict[str, Any]:
+    """Get candlestick rollup counters and exchange verification results."""
+    from service.candlestick.rollup import get_rollup_engine
+
+    return get_rollup_engine().get_stats()
+
+
+@router.get("/api/debug/candle-store")
+async def get_candle_store_stats() -> dict[str, Any]:
+    """Get candle read path statistics (DB hits vs exchange fetches)."""
+    from service.candlestick.store import get_candle_store
+
+    return get_candle_store().get_stats()
+
+
+@router.get("/api/debug/candle-storage")
+async def get_candle_storage_stats() -> dict[str, Any]:
+    """Get candle retention, partition and compaction statistics."""
+    from service.candlestick.maintenance import get_candle_storage
+
+    return get_candle_storage().get_stats()
+
+
+@router.get("/api/debug/db-writer")
+async def get_db_writer_stats() -> dict[str, Any]:
+    """Get SQLite single-writer queue statistics."""
+    from models.session import IS_SQLITE
+    from models.writer import get_write_queue
+
+    queue = get_write_queue()
+    return {"sqlite": IS_SQLITE, **(queue.get_stats() if queue else {})}
+
+
+@router.get("/api/debug/notifications")
+async def get_notification_bus_stats() -> dict[str, Any]:
+    """Get notification bus counters (dedup, rate limits, digests)."""
+    from service.alerts.notification_bus import get_notification_bus
+
+    return get_notification_bus().get_stats()
+
+
+@router.get("/api/debug/candle-archive")
+async def get_candle_archive_stats() -> dict[str, Any]:
+    """Get columnar candle archive statistics."""
+    from service.candlestick.archive import get_candle_archive
+
+    return get_candle_archive().get_stats()
+
+
+@router.get("/api/debug/forecast-cache")
+async def get_forecast_cache_stats() -> dict[str, Any]:
+    """Get ML forecast cache statistics."""
+    from service.ml.forecast_cache import get_forecast_cache
+
+    return get_forecast_cache().get_stats()
+
+
+@router.get("/api/debug/http")
+async def get_http_gateway_stats() -> dict[str, Any]:
+    """Get outbound HTTP gateway cache and per-host statistics."""
+    from core.http_gateway import get_http_gateway
+
+    return get_http_gateway().get_stats()
+
+
+@router.get("/api/debug/coin-markets")
+async def get_coin_markets_stats() -> dict[str, Any]:
+    """Get CoinGecko bulk market snapshot statistics."""
+    from service.analysis.coin_markets import get_coin_market_loader
+
+    return get_coin_market_loader().get_stats()
+
+
+@router.get("/api/debug/price-book")
+async def get_price_book_stats() -> dict[str, Any]:
+    """Get live price book statistics and quotes."""
+    from service.candlestick.price_book import get_price_book
+
+    book = get_price_book()
+    return {
+        **book.get_stats(),
+        "quotes": {symbol: quote.to_dict() for symbol, quote in book.snapshot().items()},
+    }
+
+
+@router.get("/api/debug/pivots")
+async def get_pivot_stats() -> dict[str, Any]:
+    """Get shared swing pivot index statistics."""
+    from service.analysis.pivots import get_pivot_store
+
+    return get_pivot_store().get_stats()
+
+
+@router.get("/api/debug/scan")
+async def get_scan_stats(results: bool = False) -> dict[str, Any]:
+    """Get multi-timeframe scan engine statistics (and the last results)."""
+    from service.analysis.scanner import get_scan_engine
+
+    engine = get_scan_engine()
+    stats = engine.get_stats()
+    if results and engine.last_report is not None:
+        stats["results"] = [r.to_dict() for r in engine.last_report.results]
+    return stats
+
+
+@router.get("/api/debug/ai")
+async def get_ai_stats() -> dict[str, Any]:
+    """Get AI service counters, provider health and per-prompt token/latency stats."""
+    from service.ai.analyzer import get_market_analyzer
+    from service.ai.providers import get_ai_service
+
+    context = get_market_analyzer().last_context
+    return {
+        **get_ai_service().get_stats(),
+        "context": context.to_dict() if context else None,
+    }
+
+
+@router.get("/api/debug/boot")
+async def get_boot_stats() -> dict[str, Any]:
+    """Get boot stage timings, startup job report and deferred import costs."""
+    from core.boot import get_boot_timeline
+    from core.lazy_import import get_import_timings
+    from core.scheduler import get_startup_report
+
+    report = get_startup_report()
+    return {
+        "boot": get_boot_timeline().to_dict(),
+        "startup_jobs": report.to_dict() if report else None,
+        "deferred_imports_ms": get_import_timings(),
+    }
+
+
 @router.post("/api/jobs/run-all")
 async def run_all_jobs() -> dict[str, Any]:
     """Run all scheduler jobs manually and return results."""
@@ -51,7 +51,7 @@ async def list_signals(
 
     since = datetime.now() - timedelta(hours=hours)
 
-    signals = manager.get_signals(
+    signals = await manager.get_signals(
         symbol=symbol,
         source=signal_source,
         since=since,
@@ -69,7 +69,7 @@ async def list_signals(
 async def get_signal_stats() -> dict[str, Any]:
     """Get signal statistics."""
     manager = get_signal_manager()
-    stats = manager.get_stats()
+    stats = await manager.get_stats()
     return stats.to_dict()
 
 
@@ -82,7 +82,7 @@ async def record_signal(request: RecordSignalRequest) -> dict[str, Any]:
     """
     try:
         manager = get_signal_manager()
-        signal = manager.record_signal(
+        signal = await manager.record_signal(
             symbol=request.symbol,
             signal_type=request.signal_type,
             source=request.source,
@@ -106,7 +106,7 @@ async def record_signal(request: RecordSignalRequest) -> dict[str, Any]:
 async def get_signal(signal_id: str) -> dict[str, Any]:
     """Get a specific signal by ID."""
     manager = get_signal_manager()
-    signal = manager.get_signal(signal_id)
+    signal = await manager.get_signal(signal_id)
 
     if not signal:
         raise HTTPException(status_code=404, detail=f"Signal {signal_id} not found")
@@ -121,7 +121,7 @@ async def get_signals_by_symbol(
 ) -> dict[str, Any]:
     """Get signals for a specific symbol."""
     manager = get_signal_manager()
-    signals = manager.get_signals(symbol=symbol, limit=limit)
+    signals = await manager.get_signals(symbol=symbol, limit=limit)
 
     return {
         "symbol": symbol.upper(),
@@ -134,7 +134,7 @@ async def get_signals_by_symbol(
 async def get_signals_summary() -> dict[str, Any]:
     """Get signals summary for dashboard."""
     manager = get_signal_manager()
-    stats = manager.get_stats()
+    stats = await manager.get_stats()
 
     return {
         "win_rate_24h": round(stats.win_rate_24h, 1),
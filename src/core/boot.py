@@ -0,0 +1,101 @@
+"""
+Boot timeline.
+
+Records how long each startup stage takes and when the first real
+sensor value is published, so time-to-first-sensor can be tracked
+across releases.
+"""
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Reference point for all boot measurements (set when main imports this module)
+BOOT_STARTED = time.monotonic()
+
+
+@dataclass
+class BootStage:
+    """Timing of a single boot stage."""
+
+    name: str
+    started_at: float  # Seconds since boot
+    duration: float | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "started_at_s": round(self.started_at, 3),
+            "duration_ms": round(self.duration * 1000, 1) if self.duration is not None else None,
+            "error": self.error,
+        }
+
+
+@dataclass
+class BootTimeline:
+    """Startup stages and time-to-first-sensor."""
+
+    started: float = BOOT_STARTED
+    stages: list[BootStage] = field(default_factory=list)
+    ready_at: float | None = None
+    first_sensor_at: float | None = None
+    first_sensor_id: str | None = None
+
+    def elapsed(self) -> float:
+        """Seconds since boot."""
+        return time.monotonic() - self.started
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[BootStage]:
+        """Time a boot stage."""
+        stage = BootStage(name=name, started_at=self.elapsed())
+        self.stages.append(stage)
+        started = time.monotonic()
+        try:
+            yield stage
+        except Exception as e:
+            stage.error = str(e)
+            raise
+        finally:
+            stage.duration = time.monotonic() - started
+            logger.info(f"Boot stage '{name}' took {stage.duration * 1000:.0f}ms")
+
+    def mark_ready(self) -> None:
+        """Mark application as ready to serve requests."""
+        if self.ready_at is None:
+            self.ready_at = self.elapsed()
+            logger.info(f"Application ready in {self.ready_at:.2f}s")
+
+    def mark_first_sensor(self, sensor_id: str) -> None:
+        """Record the first real sensor value published after boot."""
+        if self.first_sensor_at is None:
+            self.first_sensor_at = self.elapsed()
+            self.first_sensor_id = sensor_id
+            logger.info(f"Time to first sensor: {self.first_sensor_at:.2f}s ({sensor_id})")
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "uptime_s": round(self.elapsed(), 1),
+            "ready_s": round(self.ready_at, 3) if self.ready_at is not None else None,
+            "time_to_first_sensor_s": round(self.first_sensor_at, 3) if self.first_sensor_at is not None else None,
+            "first_sensor": self.first_sensor_id,
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+
+# Global timeline
+_boot_timeline: BootTimeline | None = None
+
+
+def get_boot_timeline() -> BootTimeline:
+    """Get global boot timeline."""
+    global _boot_timeline
+    if _boot_timeline is None:
+        _boot_timeline = BootTimeline()
+    return _boot_timeline
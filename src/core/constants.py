@@ -262,6 +262,16 @@ COINGECKO_ID_MAP = {
     "NEAR": "near",
     "INJ": "injective-protocol",
     "NIGHT": "night-token",
+    "XRP": "ripple",
+    "ADA": "cardano",
+    "DOGE": "dogecoin",
+    "DOT": "polkadot",
+    "LINK": "chainlink",
+    "AVAX": "avalanche-2",
+    "MATIC": "polygon",
+    "UNI": "uniswap",
+    "ATOM": "cosmos",
+    "LTC": "litecoin",
 }
 
 
@@ -65,21 +65,18 @@ class CryptoInspectError(Exception):
     async def send_ha_notification(self) -> bool:
         """Send notification to Home Assistant.
         
-        Sends a persistent notification to HA if notify_ha is True.
-        Uses notify_error from ha_integration.
+        Publishes the error on the notification bus if notify_ha is True.
         
         Returns:
-            True if notification was sent successfully
+            True if the notification was queued (not deduplicated or rate limited)
         """
         if not self.notify_ha:
             return False
             
         try:
-            from service.ha_integration import notify_error
-            return await notify_error(
-                error_message=self.message,
-                context=self.context,
-            )
+            from service.alerts.notification_bus import publish_error
+
+            return await publish_error(error_message=self.message, context=self.context)
         except ImportError:
             logger.warning("HA integration not available for error notification")
             return False
@@ -10,12 +10,12 @@ All external API calls should use this client to handle:
 
 import asyncio
 import logging
-import time
 from dataclasses import dataclass
-from typing import Any
 
 import httpx
 
+from core.http_gateway import GatewayClient, get_http_gateway
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,26 +31,15 @@ class RetryConfig:
     retry_on_status: tuple[int, ...] = (429, 500, 502, 503, 504)
 
 
-@dataclass
-class RateLimitConfig:
-    """Configuration for rate limiting."""
-
-    requests_per_minute: int = 30  # CoinGecko free tier: ~30/min
-    min_request_interval: float = 2.0  # Minimum seconds between requests
-
-
-@dataclass
-class CacheEntry:
-    """Cache entry with TTL."""
-
-    data: Any
-    expires_at: float
-
-
 class ResilientHttpClient:
     """
     HTTP client with built-in retry, backoff, rate limiting, and caching.
-    
+
+    Requests go through the shared HTTP gateway (core.http_gateway), which
+    owns the connection pool, the per-host token bucket and the bounded
+    response cache; this class adds retries with backoff on top. Host
+    rate limits are declared in core.http_gateway.HOST_LIMITS.
+
     Features:
     - Exponential backoff on 429/5xx errors
     - Rate limiting to stay within API limits
@@ -63,82 +52,23 @@ class ResilientHttpClient:
         base_url: str = "",
         timeout: float = 30.0,
         retry_config: RetryConfig | None = None,
-        rate_limit_config: RateLimitConfig | None = None,
         cache_ttl: int = 300,  # Cache for 5 minutes by default
     ):
         self._base_url = base_url
         self._timeout = timeout
         self._retry_config = retry_config or RetryConfig()
-        self._rate_limit_config = rate_limit_config or RateLimitConfig()
         self._cache_ttl = cache_ttl
-        self._client: httpx.AsyncClient | None = None
-        self._last_request_time: float = 0
-        self._cache: dict[str, CacheEntry] = {}
-        self._request_count = 0
-        self._rate_limit_window_start = time.time()
+        self._client: GatewayClient | None = None
 
-    async def _get_client(self) -> httpx.AsyncClient:
+    async def _get_client(self) -> GatewayClient:
         """Get or create HTTP client."""
         if self._client is None:
-            self._client = httpx.AsyncClient(
-                base_url=self._base_url,
-                timeout=self._timeout,
-                headers={
-                    "Accept": "application/json",
-                    "User-Agent": "crypto-inspect/1.0",
-                },
-            )
+            self._client = get_http_gateway().client(base_url=self._base_url, timeout=self._timeout)
         return self._client
 
     async def close(self) -> None:
-        """Close HTTP client."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
-
-    def _get_cache_key(self, method: str, url: str, params: dict | None) -> str:
-        """Generate cache key from request details."""
-        params_str = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
-        return f"{method}:{url}?{params_str}"
-
-    def _get_cached(self, cache_key: str) -> Any | None:
-        """Get cached response if valid."""
-        entry = self._cache.get(cache_key)
-        if entry and time.time() < entry.expires_at:
-            logger.debug(f"Cache hit: {cache_key[:50]}...")
-            return entry.data
-        return None
-
-    def _set_cached(self, cache_key: str, data: Any, ttl: int | None = None) -> None:
-        """Cache response data."""
-        expires_at = time.time() + (ttl or self._cache_ttl)
-        self._cache[cache_key] = CacheEntry(data=data, expires_at=expires_at)
-
-    async def _wait_for_rate_limit(self) -> None:
-        """Wait if necessary to respect rate limits."""
-        now = time.time()
-        
-        # Reset counter every minute
-        if now - self._rate_limit_window_start > 60:
-            self._request_count = 0
-            self._rate_limit_window_start = now
-        
-        # Check if we've hit the rate limit
-        if self._request_count >= self._rate_limit_config.requests_per_minute:
-            wait_time = 60 - (now - self._rate_limit_window_start)
-            if wait_time > 0:
-                logger.warning(f"Rate limit reached, waiting {wait_time:.1f}s")
-                await asyncio.sleep(wait_time)
-                self._request_count = 0
-                self._rate_limit_window_start = time.time()
-        
-        # Enforce minimum interval between requests
-        elapsed = now - self._last_request_time
-        if elapsed < self._rate_limit_config.min_request_interval:
-            await asyncio.sleep(self._rate_limit_config.min_request_interval - elapsed)
-        
-        self._last_request_time = time.time()
-        self._request_count += 1
+        """Release HTTP client (connections belong to the gateway)."""
+        self._client = None
 
     def _calculate_backoff(self, attempt: int) -> float:
         """Calculate backoff delay with jitter."""
@@ -172,23 +102,14 @@ class ResilientHttpClient:
         Returns:
             JSON response or None on failure
         """
-        cache_key = self._get_cache_key("GET", url, params)
-        
-        # Check cache first
-        if use_cache:
-            cached = self._get_cached(cache_key)
-            if cached is not None:
-                return cached
-        
+        ttl = (cache_ttl or self._cache_ttl) if use_cache else 0
         client = await self._get_client()
         last_error: Exception | None = None
         
         for attempt in range(self._retry_config.max_retries):
             try:
-                # Respect rate limits
-                await self._wait_for_rate_limit()
-                
-                response = await client.get(url, params=params)
+                # Rate limits and caching are handled by the gateway
+                response = await client.get(url, params=params, cache_ttl=ttl)
                 
                 # Handle rate limiting
                 if response.status_code == 429:
@@ -212,13 +133,7 @@ class ResilientHttpClient:
                     continue
                 
                 response.raise_for_status()
-                data = response.json()
-                
-                # Cache successful response
-                if use_cache:
-                    self._set_cached(cache_key, data, cache_ttl)
-                
-                return data
+                return response.json()
                 
             except httpx.HTTPStatusError as e:
                 last_error = e
@@ -251,15 +166,12 @@ class ResilientHttpClient:
         return None
 
     def clear_cache(self) -> None:
-        """Clear all cached responses."""
-        self._cache.clear()
+        """Clear all cached responses of this API."""
+        get_http_gateway().invalidate(self._base_url)
 
     def invalidate_cache(self, pattern: str = "") -> int:
-        """Invalidate cache entries matching pattern."""
-        keys_to_remove = [k for k in self._cache if pattern in k]
-        for key in keys_to_remove:
-            del self._cache[key]
-        return len(keys_to_remove)
+        """Invalidate cached responses whose URL contains pattern."""
+        return get_http_gateway().invalidate(pattern)
 
 
 # CoinGecko-specific client with appropriate rate limits
@@ -267,7 +179,7 @@ class CoinGeckoClient(ResilientHttpClient):
     """
     CoinGecko API client with proper rate limiting.
     
-    Free tier limits:
+    Free tier limits (api.coingecko.com in HOST_LIMITS):
     - 10-30 requests per minute
     - No API key required
     """
@@ -282,10 +194,6 @@ class CoinGeckoClient(ResilientHttpClient):
                 max_delay=120.0,  # Up to 2 minutes
                 exponential_base=2.0,
             ),
-            rate_limit_config=RateLimitConfig(
-                requests_per_minute=10,  # Conservative for free tier
-                min_request_interval=6.0,  # ~10 requests per minute
-            ),
             cache_ttl=300,  # 5 minute cache
         )
 
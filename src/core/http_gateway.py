@@ -0,0 +1,604 @@
+"""
+Outbound HTTP gateway.
+
+One place for every external GET made by the analyzers:
+
+- Per-host connection pools (one httpx.AsyncClient per host, bounded)
+- Per-host async token buckets; a 429 with Retry-After pauses the host
+  for every caller instead of each analyzer backing off on its own
+- Single-flight: identical in-flight GETs share one request
+- Size-bounded LRU/TTL response cache; expired entries that carry an
+  ETag or Last-Modified are revalidated with a conditional request and
+  served from cache on 304
+- Per-host metrics (/api/debug/http)
+- httpx event hooks on every pool (e.g. scheduler telemetry counting
+  requests per job)
+
+Analyzers keep their ``_get_client()`` shape and receive a
+:class:`GatewayClient`, which mimics the part of ``httpx.AsyncClient``
+they use (``get``/``post`` returning ``httpx.Response``), so their
+status and error handling is unchanged.
+
+Usage:
+    from core.http_gateway import get_http_gateway
+
+    client = get_http_gateway().client(timeout=15.0, cache_ttl=60)
+    response = await client.get("https://api.example.com/data", params={"a": 1})
+    response.raise_for_status()
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "crypto-inspect/1.0"
+DEFAULT_TIMEOUT = 30.0
+
+# Requests per second and burst size per host; other hosts use DEFAULT_HOST_LIMIT
+HOST_LIMITS: dict[str, tuple[float, int]] = {
+    "api.coingecko.com": (10 / 60, 3),  # Free tier: 10-30 requests per minute
+    "api.alternative.me": (1.0, 2),
+    "mempool.space": (2.0, 4),
+    "api.blockchain.info": (1.0, 2),
+    "blockchain.info": (1.0, 2),
+    "api.whale-alert.io": (10 / 60, 2),
+    "api.etherscan.io": (5.0, 5),
+    "query1.finance.yahoo.com": (5.0, 6),
+    "query2.finance.yahoo.com": (5.0, 6),
+    "api.binance.com": (20.0, 40),
+    "fapi.binance.com": (20.0, 40),
+    "api.bybit.com": (10.0, 20),
+    "www.okx.com": (10.0, 20),
+}
+DEFAULT_HOST_LIMIT: tuple[float, int] = (10.0, 20)
+
+MAX_CONNECTIONS_PER_HOST = 8
+MAX_CACHE_ENTRIES = 512
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+MAX_CACHED_BODY_BYTES = 4 * 1024 * 1024
+# Longest Retry-After honoured before giving the 429 back to the caller
+MAX_RETRY_AFTER = 120.0
+
+# Request headers that do not change the response (left out of the cache key)
+_KEY_HEADERS_IGNORED = {"user-agent", "accept", "accept-encoding", "connection"}
+_WIRE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class _LeaderCancelled(Exception):
+    """The request a GET was coalesced onto was cancelled; the waiter retries."""
+
+
+class TokenBucket:
+    """Async token bucket; waiters are served in arrival order."""
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst
+            clock: Monotonic clock
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds`` (server asked us to back off)."""
+        self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+        self._tokens = 0.0
+
+    async def acquire(self) -> float:
+        """
+        Take one token, sleeping until it is available.
+
+        Returns:
+            Seconds waited
+        """
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+@dataclass
+class HostStats:
+    """Per-host request counters."""
+
+    requests: int = 0
+    cache_hits: int = 0
+    revalidated: int = 0
+    shared: int = 0
+    errors: int = 0
+    throttled: int = 0
+    throttle_wait: float = 0.0
+    latency: float = 0.0
+    status: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "revalidated": self.revalidated,
+            "shared": self.shared,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "throttle_wait_s": round(self.throttle_wait, 2),
+            "avg_latency_ms": round(self.latency / self.requests * 1000, 1) if self.requests else None,
+            "status": dict(sorted(self.status.items())),
+        }
+
+
+@dataclass
+class CachedResponse:
+    """Stored GET response."""
+
+    url: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    expires_at: float
+
+    @property
+    def etag(self) -> str | None:
+        return self._header("etag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self._header("last-modified")
+
+    def _header(self, name: str) -> str | None:
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+    def to_response(self) -> httpx.Response:
+        """Build a fresh httpx.Response (each caller gets its own)."""
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=httpx.Request("GET", self.url),
+        )
+
+
+class ResponseCache:
+    """LRU cache bounded by entry count and total body size."""
+
+    def __init__(
+        self,
+        max_entries: int = MAX_CACHE_ENTRIES,
+        max_bytes: int = MAX_CACHE_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> tuple[CachedResponse | None, bool]:
+        """
+        Look up a response.
+
+        Returns:
+            (entry, fresh); expired entries are returned only when they can
+            be revalidated, otherwise dropped
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        self._entries.move_to_end(key)
+        if self._clock() < entry.expires_at:
+            return entry, True
+        if entry.etag or entry.last_modified:
+            return entry, False
+        self._remove(key)
+        return None, False
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        if len(entry.content) > MAX_CACHED_BODY_BYTES:
+            return
+        self._remove(key)
+        self._entries[key] = entry
+        self._bytes += len(entry.content)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def touch(self, key: str, ttl: float) -> None:
+        """Extend a revalidated entry."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.expires_at = self._clock() + ttl
+
+    def invalidate(self, pattern: str = "") -> int:
+        keys = [k for k, e in self._entries.items() if pattern in e.url]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.content)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+
+def _cache_key(url: str, headers: dict[str, str]) -> str:
+    """Key of a GET: full URL plus headers that can change the response (e.g. API keys)."""
+    relevant = sorted((k.lower(), v) for k, v in headers.items() if k.lower() not in _KEY_HEADERS_IGNORED)
+    if not relevant:
+        return url
+    digest = hashlib.blake2b(repr(relevant).encode(), digest_size=8).hexdigest()
+    return f"{url}#{digest}"
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_AFTER)
+    except ValueError:
+        return None
+
+
+class HttpGateway:
+    """Shared outbound HTTP layer (pools, rate limits, single-flight, cache)."""
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self._clock = clock
+        self._transport = transport
+        self._event_hooks: dict[str, list[Callable]] = {"request": [], "response": []}
+        self._pools: dict[str, httpx.AsyncClient] = {}
+        self._buckets: dict[str, TokenBucket] = {}
+        self._limits: dict[str, tuple[float, int]] = dict(HOST_LIMITS)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._stats: dict[str, HostStats] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.cache = ResponseCache(clock=clock)
+
+    def client(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        headers: dict[str, str] | None = None,
+        cache_ttl: float = 0,
+        base_url: str = "",
+    ) -> "GatewayClient":
+        """Get a lightweight client view with its own defaults."""
+        return GatewayClient(self, timeout=timeout, headers=headers, cache_ttl=cache_ttl, base_url=base_url)
+
+    def set_host_limit(self, host: str, rate: float, burst: int) -> None:
+        """Override the token bucket of a host."""
+        self._limits[host] = (rate, burst)
+        self._buckets.pop(host, None)
+
+    def add_event_hook(self, event: str, hook: Callable[..., Awaitable[None]]) -> None:
+        """
+        Register an httpx event hook on every pool, current and future.
+
+        Args:
+            event: "request" or "response"
+            hook: Coroutine receiving the httpx.Request / httpx.Response
+        """
+        hooks = self._event_hooks[event]
+        if hook in hooks:
+            return
+        hooks.append(hook)
+        for pool in self._pools.values():
+            pool.event_hooks = self._event_hooks
+
+    def _ensure_loop(self) -> None:
+        """Pools, locks and futures belong to one event loop; start over on a new one."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._pools:
+                # Their connections are bound to the old loop and cannot be
+                # closed from this one; they are released when collected
+                logger.info(f"[HTTP] Event loop changed, dropping {len(self._pools)} connection pools")
+            self._loop = loop
+            self._pools.clear()
+            self._buckets.clear()
+            self._inflight.clear()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self._limits.get(host, DEFAULT_HOST_LIMIT)
+            bucket = self._buckets[host] = TokenBucket(rate, burst, self._clock)
+        return bucket
+
+    def _pool(self, host: str) -> httpx.AsyncClient:
+        pool = self._pools.get(host)
+        if pool is None or pool.is_closed:
+            pool = self._pools[host] = httpx.AsyncClient(
+                headers={"User-Agent": USER_AGENT, "Accept": "application/json"},
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS_PER_HOST, max_keepalive_connections=4),
+                follow_redirects=True,
+                event_hooks=self._event_hooks,
+                transport=self._transport,
+            )
+        return pool
+
+    def _host_stats(self, host: str) -> HostStats:
+        stats = self._stats.get(host)
+        if stats is None:
+            stats = self._stats[host] = HostStats()
+        return stats
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache_ttl: float = 0,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request through the gateway.
+
+        GETs are deduplicated while in flight and, with ``cache_ttl`` > 0,
+        successful responses are cached. Other methods are only rate
+        limited and pooled.
+
+        Raises:
+            httpx.HTTPError: transport errors (status errors are left to the caller)
+        """
+        self._ensure_loop()
+        headers = headers or {}
+        if method.upper() != "GET":
+            return await self._send(method, url, params, headers, timeout, **kwargs)
+
+        full_url = str(httpx.URL(url, params=params)) if params else url
+        host = urlsplit(full_url).hostname or ""
+        key = _cache_key(full_url, headers)
+        stats = self._host_stats(host)
+
+        entry, fresh = self.cache.get(key) if cache_ttl > 0 else (None, False)
+        if fresh:
+            stats.cache_hits += 1
+            return entry.to_response()
+
+        inflight = self._inflight.get(key)
+        while inflight is not None:
+            stats.shared += 1
+            try:
+                return (await asyncio.shield(inflight)).to_response()
+            except _LeaderCancelled:
+                # Only the leading caller was cancelled: the first waiter to get here takes the lead
+                stats.shared -= 1
+                inflight = self._inflight.get(key)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fetch(full_url, headers, timeout, cache_ttl, key, entry, stats)
+        except BaseException as e:
+            future.set_exception(_LeaderCancelled() if isinstance(e, asyncio.CancelledError) else e)
+            future.exception()  # Retrieved by waiters, if any
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        future.set_result(result)
+        return result.to_response()
+
+    async def _fetch(
+        self,
+        url: str,
+        headers: dict[str, str],
+        timeout: float,
+        cache_ttl: float,
+        key: str,
+        stale: CachedResponse | None,
+        stats: HostStats,
+    ) -> CachedResponse:
+        """Fetch (or revalidate) one GET and update the cache."""
+        request_headers = dict(headers)
+        if stale is not None:
+            if stale.etag:
+                request_headers["If-None-Match"] = stale.etag
+            if stale.last_modified:
+                request_headers["If-Modified-Since"] = stale.last_modified
+
+        response = await self._send("GET", url, None, request_headers, timeout)
+        if response.status_code == 304 and stale is not None:
+            stats.revalidated += 1
+            self.cache.touch(key, cache_ttl)
+            return stale
+
+        result = CachedResponse(
+            url=url,
+            status_code=response.status_code,
+            # Body is stored decoded: drop the encoding headers that describe the wire format
+            headers=[(k, v) for k, v in response.headers.multi_items() if k.lower() not in _WIRE_HEADERS],
+            content=response.content,
+            expires_at=self._clock() + cache_ttl,
+        )
+        if cache_ttl > 0 and response.status_code == 200:
+            self.cache.put(key, result)
+        return result
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: dict | None,
+        headers: dict[str, str],
+        timeout: float,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        host = urlsplit(url).hostname or ""
+        stats = self._host_stats(host)
+        bucket = self._bucket(host)
+
+        waited = await bucket.acquire()
+        if waited > 0:
+            stats.throttled += 1
+            stats.throttle_wait += waited
+
+        started = time.perf_counter()
+        try:
+            response = await self._pool(host).request(
+                method, url, params=params, headers=headers, timeout=timeout, **kwargs
+            )
+        except httpx.HTTPError:
+            stats.errors += 1
+            raise
+        finally:
+            stats.requests += 1
+            stats.latency += time.perf_counter() - started
+
+        status = f"{response.status_code // 100}xx" if response.status_code != 429 else "429"
+        stats.status[status] = stats.status.get(status, 0) + 1
+        if response.status_code == 429:
+            retry_after = _retry_after(response)
+            if retry_after:
+                logger.warning(f"[HTTP] {host} rate limited, pausing host for {retry_after:.0f}s")
+                bucket.pause(retry_after)
+        return response
+
+    def invalidate(self, pattern: str = "") -> int:
+        """Drop cached responses whose URL contains ``pattern``."""
+        return self.cache.invalidate(pattern)
+
+    def get_stats(self) -> dict:
+        """Get cache and per-host statistics."""
+        return {
+            "cache": {
+                "entries": len(self.cache),
+                "bytes": self.cache.size_bytes,
+                "evictions": self.cache.evictions,
+            },
+            "inflight": len(self._inflight),
+            "hosts": {host: stats.to_dict() for host, stats in sorted(self._stats.items())},
+        }
+
+    async def close(self) -> None:
+        """Close all connection pools."""
+        for pool in self._pools.values():
+            try:
+                await pool.aclose()
+            except Exception as e:
+                logger.debug(f"HTTP pool close error: {e}")
+        self._pools.clear()
+
+
+class GatewayClient:
+    """
+    ``httpx.AsyncClient``-shaped view of the gateway.
+
+    Holds per-caller defaults (timeout, headers, cache TTL, base URL);
+    connections and limits belong to the gateway, so closing it is a no-op.
+    """
+
+    def __init__(
+        self,
+        gateway: HttpGateway,
+        timeout: float = DEFAULT_TIMEOUT,
+        headers: dict[str, str] | None = None,
+        cache_ttl: float = 0,
+        base_url: str = "",
+    ):
+        self._gateway = gateway
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.cache_ttl = cache_ttl
+        self.base_url = base_url.rstrip("/")
+
+    @property
+    def is_closed(self) -> bool:
+        return False
+
+    def _url(self, url: str) -> str:
+        return f"{self.base_url}{url}" if self.base_url and url.startswith("/") else url
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        cache_ttl: float | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        return await self._gateway.request(
+            method,
+            self._url(url),
+            params=params,
+            headers={**self.headers, **(headers or {})},
+            timeout=timeout or self.timeout,
+            cache_ttl=self.cache_ttl if cache_ttl is None else cache_ttl,
+            **kwargs,
+        )
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Connections are owned by the gateway."""
+
+
+# Global instance
+_http_gateway: HttpGateway | None = None
+
+
+def get_http_gateway() -> HttpGateway:
+    """Get global HTTP gateway instance."""
+    global _http_gateway
+    if _http_gateway is None:
+        _http_gateway = HttpGateway()
+    return _http_gateway
+
+
+async def close_http_gateway() -> None:
+    """Close global HTTP gateway connection pools."""
+    global _http_gateway
+    if _http_gateway is not None:
+        await _http_gateway.close()
+        _http_gateway = None
@@ -0,0 +1,101 @@
+"""
+Lazy module imports.
+
+Heavy optional stacks (torch, chronos, statsforecast, neuralprophet,
+pandas) cost seconds to import on an HA host. Modules that only
+need them inside methods bind a LazyModule proxy instead, so the real
+import happens on first attribute access - usually in a background job,
+not at application start.
+"""
+
+import importlib
+import importlib.util
+import logging
+import threading
+import time
+import types
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# module name -> seconds spent in the deferred import
+_import_timings: dict[str, float] = {}
+_import_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is not None:
+            return module
+        with _import_lock:
+            module = self.__dict__["_lazy_module"]
+            if module is None:
+                started = time.perf_counter()
+                module = importlib.import_module(self.__name__)
+                elapsed = time.perf_counter() - started
+                _import_timings[self.__name__] = elapsed
+                logger.debug(f"Deferred import of {self.__name__} took {elapsed * 1000:.0f}ms")
+                self.__dict__["_lazy_module"] = module
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the real module has been imported."""
+        return self.__dict__["_lazy_module"] is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Get a lazy proxy for a module.
+
+    Args:
+        name: Absolute module name (e.g. "torch", "statsforecast.models")
+
+    Returns:
+        LazyModule that imports ``name`` on first attribute access
+    """
+    return LazyModule(name)
+
+
+def module_available(*names: str) -> bool:
+    """
+    Check whether modules are installed without importing them.
+
+    Args:
+        names: Top-level module names
+
+    Returns:
+        True if every module can be found
+    """
+    for name in names:
+        try:
+            if importlib.util.find_spec(name) is None:
+                return False
+        except (ImportError, ValueError):
+            return False
+    return True
+
+
+def get_import_timings() -> dict[str, float]:
+    """Get deferred import durations in milliseconds, slowest first."""
+    return {
+        name: round(seconds * 1000, 1)
+        for name, seconds in sorted(_import_timings.items(), key=lambda item: item[1], reverse=True)
+    }
@@ -8,16 +8,23 @@ integrated with FastAPI's lifespan events.
 import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from dataclasses import replace
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from fastapi import FastAPI
 
+from core.scheduler.startup import StartupJob, StartupJobRunner, StartupReport
+from core.scheduler.telemetry import get_scheduler_telemetry
+
 logger = logging.getLogger(__name__)
 
 # Global scheduler instance
 scheduler: AsyncIOScheduler | None = None
 
+# Result of the last startup job run
+_startup_report: StartupReport | None = None
+
 
 def get_scheduler() -> AsyncIOScheduler:
     """Get the global scheduler instance."""
@@ -56,6 +63,7 @@ def _register_jobs(sched: AsyncIOScheduler) -> None:
         backtest_job,
         briefing_job,
         bybit_sync_job,
+        candle_maintenance_job,
         candlestick_sync_job,
         correlation_job,
         currency_list_monitor_job,
@@ -71,6 +79,7 @@ def _register_jobs(sched: AsyncIOScheduler) -> None:
         portfolio_job,
         price_alerts_job,
         profit_taking_job,
+        scheduler_telemetry_job,
         signal_history_job,
         stablecoin_job,
         traditional_backfill_job,
@@ -335,6 +344,17 @@ def _register_jobs(sched: AsyncIOScheduler) -> None:
         coalesce=True,
     )
 
+    # Candle storage maintenance - partitions, retention, compaction at 03:30
+    sched.add_job(
+        candle_maintenance_job,
+        trigger=CronTrigger(hour=3, minute=30),
+        id="candle_maintenance_job",
+        name="Candle Maintenance Job",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+
     # AI Analysis job - runs based on AI_ANALYSIS_INTERVAL_HOURS (default: every 24 hours at 08:00)
     sched.add_job(
         ai_analysis_job,
@@ -390,7 +410,18 @@ def _register_jobs(sched: AsyncIOScheduler) -> None:
         coalesce=True,
     )
 
-    logger.info("Registered scheduled jobs (27 total)")
+    # Scheduler telemetry - publishes loop lag diagnostic sensor every minute
+    sched.add_job(
+        scheduler_telemetry_job,
+        trigger=CronTrigger(minute="*"),
+        id="scheduler_telemetry_job",
+        name="Scheduler Telemetry Job",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+
+    logger.info("Registered scheduled jobs (29 total)")
 
 
 @asynccontextmanager
@@ -407,24 +438,32 @@ async def scheduler_lifespan(app: FastAPI) -> AsyncGenerator[None]:
     Yields:
         None
     """
-    sched = setup_scheduler()
+    from core.boot import get_boot_timeline
 
-    # Start the scheduler
-    sched.start()
-    logger.info("Scheduler started")
+    with get_boot_timeline().stage("scheduler"):
+        sched = setup_scheduler()
 
-    # Log all registered jobs
-    jobs = sched.get_jobs()
-    for job in jobs:
-        logger.info(f"  Job registered: {job.name} (id={job.id}, trigger={job.trigger})")
+        # Instrument jobs (durations, overlaps, HTTP/DB calls) and sample loop lag
+        telemetry = get_scheduler_telemetry()
+        telemetry.start(sched)
 
-    # Run initial jobs to populate sensors (avoid 'unknown' state)
-    await _run_startup_jobs()
+        # Start the scheduler
+        sched.start()
+        logger.info("Scheduler started")
+
+        # Log all registered jobs
+        jobs = sched.get_jobs()
+        for job in jobs:
+            logger.info(f"  Job registered: {job.name} (id={job.id}, trigger={job.trigger})")
+
+        # Run initial jobs to populate sensors (avoid 'unknown' state)
+        await _run_startup_jobs()
 
     yield
 
     # Shutdown the scheduler
     sched.shutdown(wait=False)
+    await telemetry.stop()
     logger.info("Scheduler shutdown")
 
 
@@ -455,115 +494,121 @@ async def _run_startup_jobs() -> None:
 async def _run_critical_startup_jobs() -> None:
     """
     Run critical jobs to populate sensors with real data after startup.
-    
-    Runs in background to not block application startup.
+
+    Runs in background to not block application startup. Independent jobs
+    run concurrently; ordering constraints are expressed as dependencies.
     """
+    global _startup_report
     import asyncio
     from core.config import settings
-    
+
     logger.info("Starting critical startup jobs to populate sensor data...")
-    
+
     # Small delay to ensure HA connection is established
     await asyncio.sleep(2)
-    
+
+    from core.boot import get_boot_timeline
+    from service.ha import get_ha_manager
+
+    # Placeholders are already published; the next publish is real data
+    ha_manager = get_ha_manager()
+    timeline = get_boot_timeline()
+
+    def on_first_sensor(sensor_id: str, value) -> None:
+        timeline.mark_first_sensor(sensor_id)
+        ha_manager.remove_state_listener(on_first_sensor)
+
+    ha_manager.add_state_listener(on_first_sensor)
+
     try:
-        from core.scheduler.jobs import (
-            investor_analysis_job,
-            bybit_sync_job,
-            gas_tracker_job,
-            altseason_job,
-            currency_list_monitor_job,
-            divergence_job,
-            correlation_job,
-            ai_analysis_job,
-            briefing_job,
-            portfolio_job,
-            liquidation_job,
-            exchange_flow_job,
-            volatility_job,
-            stablecoin_job,
-            macro_job,
-            traditional_finance_job,
-            ml_prediction_job,
-            backtest_job,
-            profit_taking_job,
+        # Startup runs are timed and counted like scheduled runs
+        telemetry = get_scheduler_telemetry()
+        jobs = [
+            replace(job, func=telemetry.wrap(f"startup:{job.name}", job.func))
+            for job in _build_startup_jobs(settings)
+        ]
+        runner = StartupJobRunner(jobs, concurrency=settings.STARTUP_JOB_CONCURRENCY)
+        _startup_report = await runner.run()
+        logger.info(
+            f"Critical startup jobs completed in {_startup_report.total_duration:.1f}s "
+            f"({len(_startup_report.failed)} failed)"
         )
-        
-        jobs_to_run = []
-        
-        # Currency list and unified sensors - most critical
-        jobs_to_run.append(("currency_list_monitor", currency_list_monitor_job))
-        
-        # Always run investor analysis to populate market data
-        jobs_to_run.append(("investor_analysis", investor_analysis_job))
-        
-        # Run Bybit sync if configured
-        if settings.has_bybit_credentials():
-            jobs_to_run.append(("bybit_sync", bybit_sync_job))
-        
-        # Always run gas tracker - it's fast
-        jobs_to_run.append(("gas_tracker", gas_tracker_job))
-        
-        # Altseason index
-        jobs_to_run.append(("altseason", altseason_job))
-        
-        # Technical analysis (RSI, MACD, trends)
-        jobs_to_run.append(("divergence", divergence_job))
-        
-        # Correlation analysis
-        jobs_to_run.append(("correlation", correlation_job))
-        
-        # Volatility tracker - updates volatility_30d, adaptive_volatilities
-        jobs_to_run.append(("volatility", volatility_job))
-        
-        # Liquidation levels
-        jobs_to_run.append(("liquidation", liquidation_job))
-        
-        # Exchange flow (netflows)
-        jobs_to_run.append(("exchange_flow", exchange_flow_job))
-        
-        # Stablecoin flow
-        jobs_to_run.append(("stablecoin", stablecoin_job))
-        
-        # Macro calendar
-        jobs_to_run.append(("macro", macro_job))
-        
-        # Traditional finance (gold, indices, forex)
-        jobs_to_run.append(("traditional_finance", traditional_finance_job))
-        
-        # AI analysis if enabled
-        if settings.AI_ENABLED:
-            jobs_to_run.append(("ai_analysis", ai_analysis_job))
-        
-        # Briefing sensors
-        jobs_to_run.append(("briefing", briefing_job))
-        
-        # Portfolio tracker - always run to update portfolio values
-        jobs_to_run.append(("portfolio", portfolio_job))
-        
-        # ML predictions - critical for ml_* and price_predictions sensors
-        jobs_to_run.append(("ml_prediction", ml_prediction_job))
-        
-        # Profit taking - updates tp_levels and greed_level
-        jobs_to_run.append(("profit_taking", profit_taking_job))
-        
-        # Backtest - updates backtest_* sensors (normally weekly, but run at startup)
-        jobs_to_run.append(("backtest", backtest_job))
-        
-        for name, job in jobs_to_run:
-            try:
-                logger.info(f"Startup job: Running {name}...")
-                await job()
-                logger.info(f"Startup job: {name} completed")
-            except Exception as e:
-                logger.warning(f"Startup job {name} failed: {e}")
-            # Small delay between jobs
-            await asyncio.sleep(1)
-        
-        logger.info("Critical startup jobs completed")
-        
     except Exception as e:
         logger.error(f"Error running critical startup jobs: {e}")
+    finally:
+        ha_manager.remove_state_listener(on_first_sensor)
+
+
+def _build_startup_jobs(settings) -> list[StartupJob]:
+    """
+    Build the startup job graph.
+
+    Fast sensor jobs have no dependencies and run first, in parallel.
+    ML and backtest jobs are CPU-heavy, so they wait for all light jobs
+    to finish instead of competing with them.
+    """
+    from core.scheduler.jobs import (
+        investor_analysis_job,
+        bybit_sync_job,
+        gas_tracker_job,
+        altseason_job,
+        currency_list_monitor_job,
+        divergence_job,
+        correlation_job,
+        ai_analysis_job,
+        briefing_job,
+        portfolio_job,
+        liquidation_job,
+        exchange_flow_job,
+        volatility_job,
+        stablecoin_job,
+        macro_job,
+        traditional_finance_job,
+        ml_prediction_job,
+        backtest_job,
+        profit_taking_job,
+    )
+
+    jobs = [
+        # Currency list and unified sensors - most critical
+        StartupJob("currency_list_monitor", currency_list_monitor_job),
+        # Warms the shared market fact store for AI and briefing jobs
+        StartupJob("investor_analysis", investor_analysis_job),
+        StartupJob("gas_tracker", gas_tracker_job),
+        StartupJob("altseason", altseason_job),
+        StartupJob("divergence", divergence_job),
+        StartupJob("correlation", correlation_job),
+        StartupJob("volatility", volatility_job),
+        StartupJob("liquidation", liquidation_job),
+        StartupJob("exchange_flow", exchange_flow_job),
+        StartupJob("stablecoin", stablecoin_job),
+        StartupJob("macro", macro_job),
+        StartupJob("traditional_finance", traditional_finance_job),
+        StartupJob("briefing", briefing_job, depends_on=("investor_analysis",)),
+        StartupJob("profit_taking", profit_taking_job),
+    ]
+
+    if settings.has_bybit_credentials():
+        jobs.append(StartupJob("bybit_sync", bybit_sync_job))
+        jobs.append(StartupJob("portfolio", portfolio_job, depends_on=("bybit_sync",)))
+    else:
+        jobs.append(StartupJob("portfolio", portfolio_job))
+
+    if settings.AI_ENABLED:
+        jobs.append(StartupJob("ai_analysis", ai_analysis_job, depends_on=("investor_analysis",)))
+
+    light = tuple(job.name for job in jobs)
+    # ML predictions - critical for ml_* and price_predictions sensors
+    jobs.append(StartupJob("ml_prediction", ml_prediction_job, depends_on=light))
+    # Backtest - updates backtest_* sensors (normally weekly, but run at startup)
+    jobs.append(StartupJob("backtest", backtest_job, depends_on=light))
+
+    return jobs
+
+
+def get_startup_report() -> StartupReport | None:
+    """Get report of the last startup job run (None while still running)."""
+    return _startup_report
 
 
 async def _set_initial_sensor_values() -> None:
@@ -684,6 +729,7 @@ async def _set_initial_sensor_values() -> None:
         ("api_status", "running"),
         ("database_status", "connected"),
         ("scheduler_status", "running"),
+        ("scheduler_loop_lag", 0),
         ("last_sync", "—"),
         ("sync_status", "idle"),
         ("candles_count", 0),
@@ -9,6 +9,7 @@ import logging
 import os
 import time
 from datetime import UTC, datetime
+from decimal import Decimal
 
 from core.config import settings
 from core.constants import (
@@ -17,6 +18,7 @@ from core.constants import (
     PriceDefaults,
     SyncDefaults,
 )
+from core.scheduler.telemetry import record_job_failure
 
 logger = logging.getLogger(__name__)
 
@@ -134,10 +136,71 @@ def get_intervals_to_fetch(now: datetime) -> list[str]:
     return intervals
 
 
+async def save_candlesticks(result) -> None:
+    """
+    Save fetched candlesticks to the database.
+
+    Exchange data replaces any rollup-derived row for the same key.
+
+    Args:
+        result: FetchResult from the candlestick fetcher.
+    """
+    # Raw SQL to avoid circular imports
+    from sqlalchemy import text
+
+    from models.writer import run_write
+
+    if not result.candlesticks:
+        return
+
+    stmt = text("""
+        INSERT INTO candlestick_records
+        (exchange, symbol, interval, timestamp, open_price, high_price,
+         low_price, close_price, volume, quote_volume, trades_count,
+         fetch_time_ms, is_complete, loaded_at)
+        VALUES (:exchange, :symbol, :interval, :timestamp, :open_price,
+                :high_price, :low_price, :close_price, :volume,
+                :quote_volume, :trades_count, :fetch_time_ms,
+                :is_complete, :loaded_at)
+        ON CONFLICT (exchange, symbol, interval, timestamp)
+        DO UPDATE SET
+            open_price = EXCLUDED.open_price,
+            high_price = EXCLUDED.high_price,
+            low_price = EXCLUDED.low_price,
+            close_price = EXCLUDED.close_price,
+            volume = EXCLUDED.volume,
+            is_complete = EXCLUDED.is_complete,
+            source_raw = NULL,
+            loaded_at = EXCLUDED.loaded_at
+    """)
+    loaded_at = datetime.now(UTC)
+    rows = [
+        {
+            "exchange": result.exchange,
+            "symbol": result.symbol,
+            "interval": result.interval.value,
+            "timestamp": candle.timestamp,
+            "open_price": float(candle.open_price),
+            "high_price": float(candle.high_price),
+            "low_price": float(candle.low_price),
+            "close_price": float(candle.close_price),
+            "volume": float(candle.volume),
+            "quote_volume": float(candle.quote_volume) if candle.quote_volume else None,
+            "trades_count": candle.trades_count,
+            "fetch_time_ms": result.fetch_time_ms,
+            "is_complete": True,
+            "loaded_at": loaded_at,
+        }
+        for candle in result.candlesticks
+    ]
+    await run_write(lambda session: session.execute(stmt, rows))
+
+
 async def fetch_and_save_candlesticks(
     symbol: str,
     interval_str: str,
     retry_count: int = 0,
+    verify_rollup: bool = False,
 ) -> bool:
     """
     Fetch candlesticks for a symbol/interval and save to database.
@@ -146,6 +209,7 @@ async def fetch_and_save_candlesticks(
         symbol: Trading pair symbol.
         interval_str: Interval string (e.g., "1h").
         retry_count: Current retry attempt.
+        verify_rollup: Compare the fetched candles with stored rollups before saving.
 
     Returns:
         True if successful, False otherwise.
@@ -169,53 +233,13 @@ async def fetch_and_save_candlesticks(
             logger.warning(f"No candlesticks returned for {symbol} {interval_str}")
             return False
 
-        # Save to database using raw SQL to avoid circular imports
-        from sqlalchemy import text
+        if verify_rollup:
+            from service.candlestick.rollup import get_rollup_engine
 
-        from models.session import async_session_maker
+            await get_rollup_engine().verify(result)
 
-        async with async_session_maker() as session:
-            for candle in result.candlesticks:
-                stmt = text("""
-                    INSERT INTO candlestick_records
-                    (exchange, symbol, interval, timestamp, open_price, high_price,
-                     low_price, close_price, volume, quote_volume, trades_count,
-                     fetch_time_ms, is_complete, loaded_at)
-                    VALUES (:exchange, :symbol, :interval, :timestamp, :open_price,
-                            :high_price, :low_price, :close_price, :volume,
-                            :quote_volume, :trades_count, :fetch_time_ms,
-                            :is_complete, :loaded_at)
-                    ON CONFLICT (exchange, symbol, interval, timestamp)
-                    DO UPDATE SET
-                        open_price = EXCLUDED.open_price,
-                        high_price = EXCLUDED.high_price,
-                        low_price = EXCLUDED.low_price,
-                        close_price = EXCLUDED.close_price,
-                        volume = EXCLUDED.volume,
-                        is_complete = EXCLUDED.is_complete,
-                        loaded_at = EXCLUDED.loaded_at
-                """)
-                await session.execute(
-                    stmt,
-                    {
-                        "exchange": result.exchange,
-                        "symbol": result.symbol,
-                        "interval": result.interval.value,
-                        "timestamp": candle.timestamp,
-                        "open_price": float(candle.open_price),
-                        "high_price": float(candle.high_price),
-                        "low_price": float(candle.low_price),
-                        "close_price": float(candle.close_price),
-                        "volume": float(candle.volume),
-                        "quote_volume": float(candle.quote_volume) if candle.quote_volume else None,
-                        "trades_count": candle.trades_count,
-                        "fetch_time_ms": result.fetch_time_ms,
-                        "is_complete": True,
-                        "loaded_at": datetime.now(UTC),
-                    },
-                )
-            await session.commit()
-            logger.debug(f"Saved {len(result.candlesticks)} candlesticks for {symbol} {interval_str}")
+        await save_candlesticks(result)
+        logger.debug(f"Saved {len(result.candlesticks)} candlesticks for {symbol} {interval_str}")
 
         return True
 
@@ -229,7 +253,7 @@ async def fetch_and_save_candlesticks(
                 f"(attempt {retry_count + 1}/{settings.MAX_RETRIES})"
             )
             await asyncio.sleep(settings.RETRY_DELAY_SECONDS)
-            return await fetch_and_save_candlesticks(symbol, interval_str, retry_count + 1)
+            return await fetch_and_save_candlesticks(symbol, interval_str, retry_count + 1, verify_rollup)
 
         logger.error(f"Failed to fetch {symbol} {interval_str} after {settings.MAX_RETRIES} retries")
         return False
@@ -243,7 +267,8 @@ async def candlestick_sync_job() -> None:
     symbols and appropriate intervals based on current time.
     Sends notifications to Home Assistant on completion.
     """
-    from service.ha_integration import notify_error, notify_sync_complete
+    from service.alerts.notification_bus import publish_error, publish_notification
+    from service.alerts.notification_manager import AlertCategory
 
     start_time = time.time()
     now = datetime.now()
@@ -262,21 +287,55 @@ async def candlestick_sync_job() -> None:
     success_count = 0
     failure_count = 0
 
-    # Fetch candlesticks for each symbol and interval
-    for symbol in symbols:
-        for interval in intervals:
-            try:
+    # Higher intervals are rolled up from stored base candles;
+    # only base intervals (and failed rollups) hit the exchanges
+    derived = []
+    verify_interval = None
+    if settings.CANDLE_ROLLUPS_ENABLED:
+        from service.candlestick.rollup import get_rollup_engine, is_derivable
+
+        rollups = get_rollup_engine()
+        derived = [i for i in intervals if is_derivable(i)]
+        verify_interval = rollups.next_verification(derived)
+    base = [i for i in intervals if i not in derived]
+
+    async def fetch(symbol: str, interval: str) -> None:
+        nonlocal success_count, failure_count
+        try:
+            if interval == verify_interval:
+                success = await fetch_and_save_candlesticks(symbol, interval, verify_rollup=True)
+            else:
                 success = await fetch_and_save_candlesticks(symbol, interval)
-                if success:
-                    success_count += 1
-                else:
-                    failure_count += 1
-            except Exception as e:
-                logger.error(f"Unexpected error for {symbol} {interval}: {e}")
+            if success:
+                success_count += 1
+            else:
                 failure_count += 1
+        except Exception as e:
+            logger.error(f"Unexpected error for {symbol} {interval}: {e}")
+            failure_count += 1
+
+        # Small delay between requests to avoid rate limiting
+        await asyncio.sleep(0.5)
+
+    # Fetch candlesticks for each symbol and interval
+    for symbol in symbols:
+        for interval in base:
+            await fetch(symbol, interval)
+
+        if not derived:
+            continue
 
-            # Small delay between requests to avoid rate limiting
-            await asyncio.sleep(0.5)
+        # Roll up from the freshly stored base candles; fetch what could not be derived
+        try:
+            fallback = await rollups.rollup_symbol(symbol, derived)
+        except Exception as e:
+            logger.warning(f"Rollup failed for {symbol}, fetching from exchange: {e}")
+            fallback = list(derived)
+        if verify_interval and verify_interval not in fallback:
+            fallback.append(verify_interval)
+
+        for interval in fallback:
+            await fetch(symbol, interval)
 
     # Calculate duration
     duration = time.time() - start_time
@@ -289,21 +348,28 @@ async def candlestick_sync_job() -> None:
         f"duration: {duration:.1f}s"
     )
 
-    # Send notification to Home Assistant
+    # Send notification to Home Assistant (runs every minute: the bus dedups repeats by id)
     try:
         if failure_count > 0:
             # Notify about errors
-            await notify_error(
+            await publish_error(
                 error_message=f"{failure_count} fetch operations failed",
                 context=f"Sync job at {current_time}",
+                notification_id="crypto_inspect_sync_error",
             )
         else:
             # Notify success (only for significant syncs, e.g., hourly)
             if "1h" in intervals or "1d" in intervals:
-                await notify_sync_complete(
-                    success_count=success_count,
-                    failure_count=failure_count,
-                    duration_seconds=duration,
+                await publish_notification(
+                    message=(
+                        f"Sync completed\n"
+                        f"✓ Success: {success_count}/{total}\n"
+                        f"✗ Failed: {failure_count}\n"
+                        f"⏱ Duration: {duration:.1f}s"
+                    ),
+                    title="Crypto Inspect - Sync",
+                    notification_id="crypto_inspect_sync",
+                    category=AlertCategory.SYSTEM,
                 )
     except Exception as e:
         logger.warning(f"Failed to send HA notification: {e}")
@@ -323,15 +389,12 @@ async def candlestick_sync_job() -> None:
         from core.translations import t
         await sensors.publish_sensor("sync_status", t("completed") if failure_count == 0 else t("partial"))
         
-        # Update candles count from database
+        # Update candles count from maintained counters
         try:
-            from sqlalchemy import text
-            from models.session import async_session_maker
-            
-            async with async_session_maker() as session:
-                result = await session.execute(text("SELECT COUNT(*) FROM candlestick_records"))
-                count = result.scalar() or 0
-                await sensors.publish_sensor("candles_count", count)
+            from service.candlestick.maintenance import get_candle_storage
+
+            count = await get_candle_storage().total_rows()
+            await sensors.publish_sensor("candles_count", count)
         except Exception as e:
             logger.debug(f"Failed to get candles count: {e}")
             
@@ -354,14 +417,11 @@ async def market_analysis_job() -> None:
     Runs every 4 hours to fetch on-chain metrics, derivatives data,
     and calculate composite scores. Sends alerts for significant signals.
     """
-    from service.analysis import (
-        CycleDetector,
-        DerivativesAnalyzer,
-        OnChainAnalyzer,
-        ScoringEngine,
-    )
+    from service.alerts.notification_bus import publish_notification
+    from service.alerts.notification_manager import AlertCategory
+    from service.analysis import CycleDetector, ScoringEngine
+    from service.analysis.market_facts import get_derivatives, get_onchain_metrics
     from service.ha import get_sensors_manager
-    from service.ha_integration import notify
 
     start_time = time.time()
     now = datetime.now()
@@ -374,92 +434,88 @@ async def market_analysis_job() -> None:
 
     results = {}
     scores = {}  # Track scores for market_pulse_confidence
-    onchain = OnChainAnalyzer()
-    derivatives = DerivativesAnalyzer()
     scoring = ScoringEngine()
     cycles = CycleDetector()
     sensors = get_sensors_manager()
 
+    # Fetch Fear & Greed
+    fg_value = None
     try:
-        # Fetch Fear & Greed
-        fg_value = None
-        try:
-            onchain_data = await onchain.analyze()
-            if onchain_data.fear_greed:
-                fg_value = onchain_data.fear_greed.value
-                results["fear_greed"] = {
-                    "value": fg_value,
-                    "classification": onchain_data.fear_greed.classification,
-                }
-                logger.info(f"Fear & Greed: {fg_value} ({onchain_data.fear_greed.classification})")
-        except Exception as e:
-            logger.warning(f"On-chain fetch failed: {e}")
+        onchain_data = await get_onchain_metrics()
+        if onchain_data and onchain_data.fear_greed:
+            fg_value = onchain_data.fear_greed.value
+            results["fear_greed"] = {
+                "value": fg_value,
+                "classification": onchain_data.fear_greed.classification,
+            }
+            logger.info(f"Fear & Greed: {fg_value} ({onchain_data.fear_greed.classification})")
+    except Exception as e:
+        logger.warning(f"On-chain fetch failed: {e}")
 
-        # Analyze each symbol
-        for symbol in base_symbols:
+    # Analyze each symbol
+    for symbol in base_symbols:
+        try:
+            # Fetch derivatives (shared TTL cache)
+            deriv_data = None
+            deriv_result = None
             try:
-                # Fetch derivatives
-                deriv_data = None
-                try:
-                    deriv_result = await derivatives.analyze(symbol)
+                deriv_result = await get_derivatives(symbol)
+                if deriv_result:
                     deriv_data = {
                         "funding_rate": deriv_result.funding.rate if deriv_result.funding else None,
                         "long_short_ratio": (
                             deriv_result.long_short.long_short_ratio if deriv_result.long_short else None
                         ),
                     }
-                except Exception as e:
-                    logger.warning(f"Derivatives fetch failed for {symbol}: {e}")
-
-                # Cycle data for BTC
-                cycle_data = None
-                if symbol == "BTC":
-                    current_price = PriceDefaults.PLACEHOLDER_BTC
-                    if deriv_result and deriv_result.funding:
-                        current_price = deriv_result.funding.mark_price
-                    cycle_info = cycles.detect_cycle(current_price)
-                    cycle_data = {
-                        "phase": cycle_info.phase.value,
-                        "phase_name_ru": cycle_info.phase_name_ru,
-                        "days_since_halving": cycle_info.days_since_halving,
-                        "distance_from_ath_pct": cycle_info.distance_from_ath_pct,
-                    }
-
-                # Calculate score
-                score = scoring.calculate(
-                    symbol=symbol,
-                    fg_value=fg_value,
-                    deriv_data=deriv_data,
-                    cycle_data=cycle_data,
-                )
-
-                results[symbol] = {
-                    "score": score.total_score,
-                    "signal": score.signal,
-                    "action": score.action,
+            except Exception as e:
+                logger.warning(f"Derivatives fetch failed for {symbol}: {e}")
+
+            # Cycle data for BTC
+            cycle_data = None
+            if symbol == "BTC":
+                current_price = PriceDefaults.PLACEHOLDER_BTC
+                if deriv_result and deriv_result.funding:
+                    current_price = deriv_result.funding.mark_price
+                cycle_info = cycles.detect_cycle(current_price)
+                cycle_data = {
+                    "phase": cycle_info.phase.value,
+                    "phase_name_ru": cycle_info.phase_name_ru,
+                    "days_since_halving": cycle_info.days_since_halving,
+                    "distance_from_ath_pct": cycle_info.distance_from_ath_pct,
                 }
-                scores[symbol] = score.total_score  # Track for market_pulse_confidence
-
-                logger.info(f"{symbol}: Score={score.total_score:.0f}, Signal={score.signal}, Action={score.action}")
 
-                # Alert on strong signals
-                if score.action in ["strong_buy", "strong_sell"]:
-                    await notify(
-                        message=(
-                            f"{symbol} {score.signal_ru}\nScore: {score.total_score:.0f}/100\n{score.recommendation_ru}"
-                        ),
-                        title=f"Crypto Alert - {symbol}",
-                        notification_id=f"crypto_alert_{symbol.lower()}",
-                    )
+            # Calculate score
+            score = scoring.calculate(
+                symbol=symbol,
+                fg_value=fg_value,
+                deriv_data=deriv_data,
+                cycle_data=cycle_data,
+            )
 
-            except Exception as e:
-                logger.error(f"Analysis error for {symbol}: {e}")
+            results[symbol] = {
+                "score": score.total_score,
+                "signal": score.signal,
+                "action": score.action,
+            }
+            scores[symbol] = score.total_score  # Track for market_pulse_confidence
+
+            logger.info(f"{symbol}: Score={score.total_score:.0f}, Signal={score.signal}, Action={score.action}")
+
+            # Alert on strong signals
+            if score.action in ["strong_buy", "strong_sell"]:
+                await publish_notification(
+                    message=(
+                        f"{symbol} {score.signal_ru}\nScore: {score.total_score:.0f}/100\n{score.recommendation_ru}"
+                    ),
+                    title=f"Crypto Alert - {symbol}",
+                    notification_id=f"crypto_alert_{symbol.lower()}",
+                    category=AlertCategory.OPPORTUNITY,
+                )
 
-            await asyncio.sleep(0.5)  # Rate limiting
+        except Exception as e:
+            logger.error(f"Analysis error for {symbol}: {e}")
 
-    finally:
-        await onchain.close()
-        await derivatives.close()
+        await asyncio.sleep(0.5)  # Rate limiting
 
     # Calculate and publish market_pulse_confidence
     if scores:
@@ -479,14 +535,11 @@ async def investor_analysis_job() -> None:
     - Update HA sensors for Home Assistant
     - Send alerts if critical conditions detected
     """
-    from service.analysis import (
-        CycleDetector,
-        DerivativesAnalyzer,
-        OnChainAnalyzer,
-        get_investor_analyzer,
-    )
+    from service.alerts.notification_bus import publish_notification
+    from service.alerts.notification_manager import AlertCategory, AlertPriority
+    from service.analysis import CycleDetector, get_investor_analyzer
+    from service.analysis.market_facts import get_btc_dominance, get_derivatives, get_fear_greed
     from service.ha import get_sensors_manager
-    from service.ha_integration import notify
 
     start_time = time.time()
     now = datetime.now()
@@ -495,176 +548,167 @@ async def investor_analysis_job() -> None:
     logger.info(f"[{current_time}] Starting investor analysis job")
 
     analyzer = get_investor_analyzer()
-    onchain = OnChainAnalyzer()
-    derivatives = DerivativesAnalyzer()
     cycles = CycleDetector()
     sensors = get_sensors_manager()
 
+    # Gather data
+    fear_greed = None
+    btc_dominance = None
+    funding_rate = None
+    long_short_ratio = None
+    btc_price = None
+    btc_price_avg_6m = None
+    rsi = None
+    cycle_phase = None
+    days_since_halving = None
+
+    # Fetch Fear & Greed (shared TTL cache)
     try:
-        # Gather data
-        fear_greed = None
-        btc_dominance = None
-        funding_rate = None
-        long_short_ratio = None
-        btc_price = None
-        btc_price_avg_6m = None
-        rsi = None
-        cycle_phase = None
-        days_since_halving = None
-
-        # Fetch on-chain data
-        try:
-            onchain_data = await onchain.analyze()
-            if onchain_data.fear_greed:
-                fear_greed = onchain_data.fear_greed.value
-                # Publish fear_greed_alert with classification
-                fg_classification = onchain_data.fear_greed.classification
-                await sensors.publish_sensor(
-                    "fear_greed_alert", 
-                    f"F&G: {fear_greed} ({fg_classification})"
-                )
-            logger.info(f"On-chain: F&G={fear_greed}")
-        except Exception as e:
-            logger.warning(f"On-chain fetch failed: {e}")
-
-        # Fetch BTC dominance from CoinGecko global
-        try:
-            import httpx
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get("https://api.coingecko.com/api/v3/global")
-                if resp.status_code == 200:
-                    data = resp.json()
-                    btc_dominance = data.get("data", {}).get("market_cap_percentage", {}).get("btc")
-                    if btc_dominance:
-                        btc_dominance = round(btc_dominance, 2)
-                        logger.info(f"BTC dominance: {btc_dominance}%")
-        except Exception as e:
-            logger.warning(f"BTC dominance fetch failed: {e}")
+        fg_data = await get_fear_greed()
+        if fg_data:
+            fear_greed = fg_data.value
+            # Publish fear_greed_alert with classification
+            await sensors.publish_sensor(
+                "fear_greed_alert",
+                f"F&G: {fear_greed} ({fg_data.classification})"
+            )
+        logger.info(f"On-chain: F&G={fear_greed}")
+    except Exception as e:
+        logger.warning(f"On-chain fetch failed: {e}")
 
-        # Fetch derivatives data
-        try:
-            deriv_data = await derivatives.analyze("BTC")
-            if deriv_data.funding:
-                funding_rate = deriv_data.funding.rate
-                btc_price = deriv_data.funding.mark_price
-            if deriv_data.long_short:
-                long_short_ratio = deriv_data.long_short.long_short_ratio
-            logger.info(f"Derivatives: funding={funding_rate}, L/S={long_short_ratio}, price={btc_price}")
-        except Exception as e:
-            logger.warning(f"Derivatives fetch failed: {e}")
+    # Fetch BTC dominance from CoinGecko global
+    try:
+        btc_dominance = await get_btc_dominance()
+        if btc_dominance:
+            logger.info(f"BTC dominance: {btc_dominance}%")
+    except Exception as e:
+        logger.warning(f"BTC dominance fetch failed: {e}")
 
-        # Get cycle info
-        try:
-            if btc_price:
-                cycle_info = cycles.detect_cycle(btc_price)
-                cycle_phase = cycle_info.phase.value
-                days_since_halving = cycle_info.days_since_halving
-                logger.info(f"Cycle: phase={cycle_phase}, days_since_halving={days_since_halving}")
-        except Exception as e:
-            logger.warning(f"Cycle detection failed: {e}")
+    # Fetch derivatives data
+    try:
+        deriv_data = await get_derivatives("BTC")
+        if deriv_data and deriv_data.funding:
+            funding_rate = deriv_data.funding.rate
+            btc_price = deriv_data.funding.mark_price
+        if deriv_data and deriv_data.long_short:
+            long_short_ratio = deriv_data.long_short.long_short_ratio
+        logger.info(f"Derivatives: funding={funding_rate}, L/S={long_short_ratio}, price={btc_price}")
+    except Exception as e:
+        logger.warning(f"Derivatives fetch failed: {e}")
 
-        # Calculate 6-month average (simplified - use historical data in production)
+    # Get cycle info
+    try:
         if btc_price:
-            btc_price_avg_6m = btc_price * 0.95  # Placeholder
+            cycle_info = cycles.detect_cycle(btc_price)
+            cycle_phase = cycle_info.phase.value
+            days_since_halving = cycle_info.days_since_halving
+            logger.info(f"Cycle: phase={cycle_phase}, days_since_halving={days_since_halving}")
+    except Exception as e:
+        logger.warning(f"Cycle detection failed: {e}")
+
+    # Calculate 6-month average (simplified - use historical data in production)
+    if btc_price:
+        btc_price_avg_6m = btc_price * 0.95  # Placeholder
+
+    # Analyze investor status
+    status = await analyzer.analyze(
+        fear_greed=fear_greed,
+        btc_price=btc_price,
+        btc_price_avg_6m=btc_price_avg_6m,
+        funding_rate=funding_rate,
+        long_short_ratio=long_short_ratio,
+        btc_dominance=btc_dominance,
+        rsi=rsi,
+        cycle_phase=cycle_phase,
+        days_since_halving=days_since_halving,
+    )
+
+    logger.info(
+        f"Investor status: do_nothing_ok={status.do_nothing_ok}, "
+        f"phase={status.phase.value}, calm={status.calm_score}, "
+        f"tension={status.tension_score}, red_flags={len(status.red_flags)}"
+    )
 
-        # Analyze investor status
-        status = await analyzer.analyze(
+    # Update HA sensors
+    try:
+        status_dict = status.to_dict()
+        await sensors.update_investor_status(status_dict)
+
+        # Also update market data sensors
+        derivatives_dict = None
+        if funding_rate is not None or long_short_ratio is not None:
+            derivatives_dict = {
+                "funding_rate": funding_rate,
+                "long_short_ratio": long_short_ratio,
+            }
+        await sensors.update_market_data(
             fear_greed=fear_greed,
-            btc_price=btc_price,
-            btc_price_avg_6m=btc_price_avg_6m,
-            funding_rate=funding_rate,
-            long_short_ratio=long_short_ratio,
             btc_dominance=btc_dominance,
-            rsi=rsi,
-            cycle_phase=cycle_phase,
-            days_since_halving=days_since_halving,
+            derivatives_data=derivatives_dict,
         )
 
-        logger.info(
-            f"Investor status: do_nothing_ok={status.do_nothing_ok}, "
-            f"phase={status.phase.value}, calm={status.calm_score}, "
-            f"tension={status.tension_score}, red_flags={len(status.red_flags)}"
-        )
+        # Update smart summary sensors
+        phase_name = status._get_phase_name_ru()
+        action = "Держать" if status.do_nothing_ok else "Внимание"
+        priority = "low" if status.do_nothing_ok else "high"
+
+        smart_summary = {
+            "pulse": phase_name,
+            "pulse_ru": phase_name,
+            "action": action,
+            "action_ru": action,
+            "action_priority": priority,
+            "outlook": f"Фаза: {phase_name}",
+            "outlook_ru": f"Фаза: {phase_name}",
+        }
+        await sensors.update_smart_summary(smart_summary)
+
+        logger.info("Updated HA sensors")
+    except Exception as e:
+        logger.warning(f"Failed to update HA sensors: {e}")
 
-        # Update HA sensors
+    # Check for alerts
+    alert = analyzer.get_alert_if_needed(status)
+    if alert:
+        logger.warning(f"Alert triggered: {alert['title']} - {alert['message']}")
         try:
-            status_dict = status.to_dict()
-            await sensors.update_investor_status(status_dict)
-
-            # Also update market data sensors
-            derivatives_dict = None
-            if funding_rate is not None or long_short_ratio is not None:
-                derivatives_dict = {
-                    "funding_rate": funding_rate,
-                    "long_short_ratio": long_short_ratio,
-                }
-            await sensors.update_market_data(
-                fear_greed=fear_greed,
-                btc_dominance=btc_dominance,
-                derivatives_data=derivatives_dict,
+            await publish_notification(
+                message=alert["message"],
+                title=alert["title"],
+                notification_id=alert["notification_id"],
+                category=AlertCategory.RISK,
             )
-
-            # Update smart summary sensors
-            phase_name = status._get_phase_name_ru()
-            action = "Держать" if status.do_nothing_ok else "Внимание"
-            priority = "low" if status.do_nothing_ok else "high"
-
-            smart_summary = {
-                "pulse": phase_name,
-                "pulse_ru": phase_name,
-                "action": action,
-                "action_ru": action,
-                "action_priority": priority,
-                "outlook": f"Фаза: {phase_name}",
-                "outlook_ru": f"Фаза: {phase_name}",
-            }
-            await sensors.update_smart_summary(smart_summary)
-
-            logger.info("Updated HA sensors")
+            logger.info(f"Sent alert notification: {alert['notification_id']}")
         except Exception as e:
-            logger.warning(f"Failed to update HA sensors: {e}")
+            logger.error(f"Failed to send alert notification: {e}")
 
-        # Check for alerts
-        alert = analyzer.get_alert_if_needed(status)
-        if alert:
-            logger.warning(f"Alert triggered: {alert['title']} - {alert['message']}")
-            try:
-                await notify(
-                    message=alert["message"],
-                    title=alert["title"],
-                    notification_id=alert["notification_id"],
-                )
-                logger.info(f"Sent alert notification: {alert['notification_id']}")
-            except Exception as e:
-                logger.error(f"Failed to send alert notification: {e}")
-
-        # Send critical alerts for dangerous conditions
-        if len(status.red_flags) >= AlertThresholds.RED_FLAGS_CRITICAL:
-            try:
-                flags_text = "\n".join([f"⚠️ {f.name_ru}" for f in status.red_flags])
-                await notify(
-                    message=f"Внимание! Множественные предупреждения:\n{flags_text}",
-                    title="🚨 Crypto: Много красных флагов",
-                    notification_id="crypto_multiple_flags",
-                )
-            except Exception as e:
-                logger.error(f"Failed to send multi-flag alert: {e}")
+    # Send critical alerts for dangerous conditions
+    if len(status.red_flags) >= AlertThresholds.RED_FLAGS_CRITICAL:
+        try:
+            flags_text = "\n".join([f"⚠️ {f.name_ru}" for f in status.red_flags])
+            await publish_notification(
+                message=f"Внимание! Множественные предупреждения:\n{flags_text}",
+                title="🚨 Crypto: Много красных флагов",
+                notification_id="crypto_multiple_flags",
+                category=AlertCategory.RISK,
+                priority=AlertPriority.CRITICAL,
+            )
+        except Exception as e:
+            logger.error(f"Failed to send multi-flag alert: {e}")
 
-        # Alert on phase transitions to extreme phases
-        if status.phase.value in ["euphoria", "capitulation"]:
-            try:
-                phase_msg = f"Рынок в фазе: {status._get_phase_name_ru()}\n{status.phase_description_ru}"
-                await notify(
-                    message=phase_msg,
-                    title=f"📉 Crypto: {status._get_phase_name_ru()}",
-                    notification_id=f"crypto_phase_{status.phase.value}",
-                )
-            except Exception as e:
-                logger.error(f"Failed to send phase alert: {e}")
+    # Alert on phase transitions to extreme phases
+    if status.phase.value in ["euphoria", "capitulation"]:
+        try:
+            phase_msg = f"Рынок в фазе: {status._get_phase_name_ru()}\n{status.phase_description_ru}"
+            await publish_notification(
+                message=phase_msg,
+                title=f"📉 Crypto: {status._get_phase_name_ru()}",
+                notification_id=f"crypto_phase_{status.phase.value}",
+                category=AlertCategory.RISK,
+            )
+        except Exception as e:
+            logger.error(f"Failed to send phase alert: {e}")
 
-    finally:
-        await onchain.close()
-        await derivatives.close()
 
     duration = time.time() - start_time
     logger.info(f"[{current_time}] Investor analysis completed in {duration:.1f}s")
@@ -704,6 +748,7 @@ async def altseason_job() -> None:
         raise
     except Exception as e:
         logger.error(f"Altseason job FAILED: {e}")
+        record_job_failure(e)
         raise
     finally:
         await analyzer.close()
@@ -743,6 +788,7 @@ async def stablecoin_job() -> None:
         raise
     except Exception as e:
         logger.error(f"Stablecoin job FAILED: {e}")
+        record_job_failure(e)
         raise
     finally:
         await analyzer.close()
@@ -780,6 +826,7 @@ async def gas_tracker_job() -> None:
 
     except Exception as e:
         logger.error(f"Gas tracker job failed: {e}")
+        record_job_failure(e)
     finally:
         await tracker.close()
 
@@ -791,9 +838,10 @@ async def whale_monitor_job() -> None:
     Runs every 15 minutes to fetch large transactions
     and update HA sensors.
     """
+    from service.alerts.notification_bus import publish_notification
+    from service.alerts.notification_manager import AlertCategory
     from service.analysis.whales import WhaleTracker
     from service.ha import get_sensors_manager
-    from service.ha_integration import notify
 
     current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     logger.info(f"[{current_time}] Starting whale monitor job")
@@ -814,17 +862,19 @@ async def whale_monitor_job() -> None:
 
         # Alert on significant whale activity
         if data.transactions_24h > 50:
-            await notify(
+            await publish_notification(
                 message=(
                     f"Активность китов: {data.transactions_24h} транзакций за 24ч\n"
                     f"{data._format_usd(data.net_flow_usd)}"
                 ),
                 title="🐋 Высокая активность китов",
                 notification_id="whale_high_activity",
+                category=AlertCategory.WHALE,
             )
 
     except Exception as e:
         logger.error(f"Whale monitor job failed: {e}")
+        record_job_failure(e)
     finally:
         await tracker.close()
 
@@ -836,9 +886,10 @@ async def exchange_flow_job() -> None:
     Runs every 4 hours to track BTC/ETH exchange flows
     and update HA sensors for all currencies.
     """
+    from service.alerts.notification_bus import publish_notification
+    from service.alerts.notification_manager import AlertCategory
     from service.analysis.exchange_flow import get_exchange_flow_analyzer
     from service.ha import get_sensors_manager
-    from service.ha_integration import notify
 
     current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     logger.info(f"[{current_time}] Starting exchange flow job")
@@ -865,14 +916,16 @@ async def exchange_flow_job() -> None:
         # Alert on significant outflows (bullish signal)
         btc_flow = data.btc_flow
         if btc_flow and btc_flow.net_flow_24h < -5000:
-            await notify(
+            await publish_notification(
                 message=f"BTC отток с бирж: {abs(btc_flow.net_flow_24h):.0f} BTC\nСигнал: {data.overall_signal.value}",
                 title="📈 Сильный отток BTC с бирж",
                 notification_id="exchange_outflow_alert",
+                category=AlertCategory.WHALE,
             )
 
     except Exception as e:
         logger.error(f"Exchange flow job failed: {e}")
+        record_job_failure(e)
     finally:
         await analyzer.close()
 
@@ -884,9 +937,10 @@ async def liquidation_job() -> None:
     Runs every hour to fetch liquidation clusters
     and update HA sensors for all crypto symbols.
     """
+    from service.alerts.notification_bus import publish_notification
+    from service.alerts.notification_manager import AlertCategory
     from service.analysis.liquidations import LiquidationTracker
     from service.ha import get_sensors_manager
-    from service.ha_integration import notify
 
     current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     logger.info(f"[{current_time}] Starting liquidation analysis job")
@@ -936,14 +990,16 @@ async def liquidation_job() -> None:
 
         # Alert on high risk
         if highest_risk in ["high", "extreme"]:
-            await notify(
+            await publish_notification(
                 message=f"Высокий риск ликвидаций на рынке! Уровень: {highest_risk}",
                 title="⚠️ Высокий риск ликвидаций",
                 notification_id="liquidation_high_risk",
+                category=AlertCategory.RISK,
             )
 
     except Exception as e:
         logger.error(f"Liquidation job failed: {e}")
+        record_job_failure(e)
     finally:
         await tracker.close()
 
@@ -956,6 +1012,7 @@ async def portfolio_job() -> None:
     and HA sensors. Also updates goal progress if goal is enabled.
     """
     from core.config import settings
+    from service.analysis.risk_engine import get_risk_engine
     from service.ha import get_sensors_manager
     from service.portfolio import get_portfolio_manager
 
@@ -974,6 +1031,11 @@ async def portfolio_job() -> None:
         status = await portfolio.calculate()
         logger.info(f"Portfolio: value={status.total_value:.2f}, pnl={status.total_pnl_percent:.2f}%")
 
+        # Daily value history for risk metrics and Monte Carlo runs
+        await get_risk_engine().save_snapshot(
+            status.total_value, {h.symbol: h.current_value for h in status.holdings}
+        )
+
         # Update HA sensors
         await sensors.publish_sensor("portfolio_value", round(status.total_value, 2))
         await sensors.publish_sensor("portfolio_pnl", round(status.total_pnl_percent, 2))
@@ -1019,27 +1081,25 @@ async def portfolio_job() -> None:
 
     except Exception as e:
         logger.error(f"Portfolio job failed: {e}")
+        record_job_failure(e)
 
 
 async def divergence_job() -> None:
     """
     Divergence Detection job.
 
-    Runs every hour to detect RSI/MACD divergences,
-    calculate support/resistance levels, technical indicators and update HA sensors.
+    Runs every hour: scans all tracked symbols on every scan timeframe for
+    RSI/MACD divergences, chart patterns, support/resistance levels and
+    technical indicators, and updates HA sensors (indicators from the 4h series).
     """
-    from service.analysis.divergences import DivergenceDetector
-    from service.analysis.technical import TechnicalAnalyzer
-    from service.candlestick import fetch_candlesticks
-    from service.candlestick.models import CandleInterval
+    from service.alerts.notification_bus import publish_notification
+    from service.alerts.notification_manager import AlertCategory
+    from service.analysis.scanner import get_scan_engine
     from service.ha import get_sensors_manager
-    from service.ha_integration import notify
 
     current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     logger.info(f"[{current_time}] Starting divergence detection job")
 
-    detector = DivergenceDetector()
-    ta = TechnicalAnalyzer()
     sensors = get_sensors_manager()
     symbols = await get_currency_list_async()  # Dynamic with Bybit
     base_symbols = [s.split("/")[0] for s in symbols]  # BTC/USDT -> BTC
@@ -1064,181 +1124,17 @@ async def divergence_job() -> None:
         highs_data: dict[str, float] = {}
         lows_data: dict[str, float] = {}
 
-        for symbol in base_symbols:
-            try:
-                # Fetch candle data for 4h timeframe (most useful for divergences)
-                candles = await fetch_candlesticks(
-                    symbol=f"{symbol}/USDT",
-                    interval=CandleInterval.HOUR_4,
-                    limit=100,
-                )
+        report = await get_scan_engine().scan(base_symbols)
+        primary = report.by_timeframe("4h" if "4h" in report.timeframes else report.timeframes[0])
 
-                if len(candles) < 50:
-                    divergence_data[symbol] = "Insufficient data"
-                    support_data[symbol] = None
-                    resistance_data[symbol] = None
-                    rsi_data[symbol] = None
-                    macd_data[symbol] = "—"
-                    trend_data[symbol] = "—"
-                    bb_position_data[symbol] = "—"
-                    signal_data[symbol] = "—"
-                    continue
-
-                # Convert to list of close prices and calculate indicators
-                closes = [float(c.close_price) for c in candles]
-                highs = [float(c.high_price) for c in candles]
-                lows = [float(c.low_price) for c in candles]
-                volumes = [float(c.volume) for c in candles]
-                rsi_values = []
-                macd_values = []
-                
-                # Calculate 24h high/low/volume (last 6 candles = 24h for 4h timeframe)
-                last_24h_candles = 6
-                highs_data[symbol] = max(highs[-last_24h_candles:]) if len(highs) >= last_24h_candles else max(highs)
-                lows_data[symbol] = min(lows[-last_24h_candles:]) if len(lows) >= last_24h_candles else min(lows)
-                volumes_data[symbol] = sum(volumes[-last_24h_candles:]) if len(volumes) >= last_24h_candles else sum(volumes)
-
-                # Calculate RSI and MACD for each candle (rolling window)
-                for i in range(14, len(closes)):
-                    rsi = ta.calc_rsi(closes[: i + 1])
-                    if rsi is not None:
-                        rsi_values.append(rsi)
-
-                for i in range(35, len(closes)):  # MACD needs 26+9 bars
-                    _, _, hist = ta.calc_macd(closes[: i + 1])
-                    if hist is not None:
-                        macd_values.append(hist)
-                
-                # Get current price and calculate change
-                current_price = closes[-1]
-                price_24h_ago = closes[-6] if len(closes) >= 6 else closes[0]  # 4h * 6 = 24h
-                change_24h = ((current_price - price_24h_ago) / price_24h_ago) * 100 if price_24h_ago else 0
-                
-                prices_data[symbol] = current_price
-                changes_data[symbol] = round(change_24h, 2)
-                
-                # Current RSI
-                current_rsi = ta.calc_rsi(closes)
-                rsi_data[symbol] = round(current_rsi, 1) if current_rsi else None
-                
-                # Current MACD signal
-                macd_line, signal_line, _ = ta.calc_macd(closes)
-                if macd_line is not None and signal_line is not None:
-                    if macd_line > signal_line:
-                        macd_data[symbol] = "Bullish"
-                    elif macd_line < signal_line:
-                        macd_data[symbol] = "Bearish"
-                    else:
-                        macd_data[symbol] = "Neutral"
-                else:
-                    macd_data[symbol] = "—"
-                
-                # Trend direction based on SMA
-                sma_20 = sum(closes[-20:]) / 20 if len(closes) >= 20 else None
-                sma_50 = sum(closes[-50:]) / 50 if len(closes) >= 50 else None
-                if sma_20 and sma_50:
-                    if current_price > sma_20 > sma_50:
-                        trend_data[symbol] = "Uptrend"
-                    elif current_price < sma_20 < sma_50:
-                        trend_data[symbol] = "Downtrend"
-                    else:
-                        trend_data[symbol] = "Sideways"
-                else:
-                    trend_data[symbol] = "—"
-                
-                # Bollinger Band position
-                # calc_bollinger_bands returns tuple (upper, middle, lower, position)
-                bb_result = ta.calc_bollinger_bands(closes)
-                if bb_result and bb_result[0] is not None:
-                    bb_upper, bb_middle, bb_lower, _ = bb_result
-                    
-                    if current_price >= bb_upper:
-                        bb_position_data[symbol] = "Above Upper"
-                    elif current_price <= bb_lower:
-                        bb_position_data[symbol] = "Below Lower"
-                    elif current_price > bb_middle:
-                        bb_position_data[symbol] = "Upper Half"
-                    else:
-                        bb_position_data[symbol] = "Lower Half"
+        for symbol in base_symbols:
+            result = primary.get(symbol)
+            if result is None or not result.ok:
+                if result is not None and result.error != "Insufficient data":
+                    logger.warning(f"Failed to analyze {symbol}: {result.error}")
+                    divergence_data[symbol] = "—"
                 else:
-                    bb_position_data[symbol] = "—"
-                
-                # Generate trading signal
-                signal = "HOLD"
-                if current_rsi and current_rsi < 30 and macd_data[symbol] == "Bullish":
-                    signal = "BUY"
-                elif current_rsi and current_rsi > 70 and macd_data[symbol] == "Bearish":
-                    signal = "SELL"
-                signal_data[symbol] = signal
-
-                # Align arrays for divergence detection
-                min_len = min(len(closes) - 35, len(rsi_values), len(macd_values))
-                if min_len < 20:
                     divergence_data[symbol] = "Insufficient data"
-                    support_data[symbol] = None
-                    resistance_data[symbol] = None
-                    continue
-
-                aligned_prices = closes[-min_len:]
-                aligned_rsi = rsi_values[-min_len:]
-                aligned_macd = macd_values[-min_len:]
-
-                # Detect divergences
-                divergences = detector.detect(
-                    symbol=symbol,
-                    prices=aligned_prices,
-                    rsi_values=aligned_rsi,
-                    macd_values=aligned_macd,
-                    timeframe="4h",
-                )
-                active_count += len(divergences)
-
-                # Find most significant divergence for this symbol
-                if divergences:
-                    # Prioritize by strength using mapping
-                    strength_order = {"weak": 1, "moderate": 2, "strong": 3}
-                    best = max(divergences, key=lambda d: strength_order.get(d.strength.value, 0))
-                    sensor_value = f"{best.div_type.value} {best.timeframe}"
-
-                    # Notify on significant divergences (MODERATE or STRONG)
-                    if best.strength.value in ("moderate", "strong"):
-                        await notify(
-                            message=(
-                                f"{symbol}: {best.div_type.value} дивергенция на {best.timeframe}\n"
-                                f"Индикатор: {best.indicator}\n"
-                                f"Сила: {best.strength.value}"
-                            ),
-                            title=f"Дивергенция {symbol}",
-                            notification_id=f"divergence_{symbol.lower()}_{best.timeframe}",
-                        )
-                else:
-                    sensor_value = "Нет"
-
-                # Add to dictionary
-                divergence_data[symbol] = sensor_value
-
-                # Calculate support/resistance levels
-                candle_dicts = [
-                    {
-                        "open": float(c.open_price),
-                        "high": float(c.high_price),
-                        "low": float(c.low_price),
-                        "close": float(c.close_price),
-                    }
-                    for c in candles
-                ]
-                sr = ta.find_support_resistance(candle_dicts)
-                support_data[symbol] = sr.nearest_support["level"] if sr.nearest_support else None
-                resistance_data[symbol] = sr.nearest_resistance["level"] if sr.nearest_resistance else None
-
-                logger.debug(
-                    f"{symbol}: divergences={len(divergences)}, RSI={rsi_data[symbol]}, "
-                    f"MACD={macd_data[symbol]}, trend={trend_data[symbol]}"
-                )
-
-            except Exception as e:
-                logger.warning(f"Failed to analyze {symbol}: {e}")
-                divergence_data[symbol] = "—"
                 support_data[symbol] = None
                 resistance_data[symbol] = None
                 rsi_data[symbol] = None
@@ -1246,6 +1142,55 @@ async def divergence_job() -> None:
                 trend_data[symbol] = "—"
                 bb_position_data[symbol] = "—"
                 signal_data[symbol] = "—"
+                continue
+
+            # 24h stats and TA indicators from the 4h series
+            prices_data[symbol] = result.price
+            changes_data[symbol] = result.change_24h
+            highs_data[symbol] = result.high_24h
+            lows_data[symbol] = result.low_24h
+            volumes_data[symbol] = result.volume_24h
+            rsi_data[symbol] = round(result.rsi, 1) if result.rsi else None
+            macd_data[symbol] = result.macd_signal
+            trend_data[symbol] = result.trend
+            bb_position_data[symbol] = result.bb_position
+            signal_data[symbol] = result.signal
+            support_data[symbol] = result.support
+            resistance_data[symbol] = result.resistance
+
+            # Divergences from every scanned timeframe
+            divergences = [d for tf in report.timeframes if (r := report.get(symbol, tf)) for d in r.divergences]
+            active_count += len(divergences)
+
+            # Find most significant divergence for this symbol
+            if divergences:
+                # Prioritize by strength using mapping
+                strength_order = {"weak": 1, "moderate": 2, "strong": 3}
+                best = max(divergences, key=lambda d: strength_order.get(d.strength.value, 0))
+                sensor_value = f"{best.div_type.value} {best.timeframe}"
+
+                # Notify on significant divergences (MODERATE or STRONG)
+                if best.strength.value in ("moderate", "strong"):
+                    await publish_notification(
+                        message=(
+                            f"{symbol}: {best.div_type.value} дивергенция на {best.timeframe}\n"
+                            f"Индикатор: {best.indicator}\n"
+                            f"Сила: {best.strength.value}"
+                        ),
+                        title=f"Дивергенция {symbol}",
+                        notification_id=f"divergence_{symbol.lower()}_{best.timeframe}",
+                        category=AlertCategory.OPPORTUNITY,
+                    )
+            else:
+                sensor_value = "Нет"
+
+            # Add to dictionary
+            divergence_data[symbol] = sensor_value
+
+            logger.debug(
+                f"{symbol}: divergences={len(divergences)}, RSI={rsi_data[symbol]}, "
+                f"MACD={macd_data[symbol]}, trend={trend_data[symbol]}"
+            )
 
         # Update divergence sensors (with translations)
         await sensors.publish_sensor("divergences", td(divergence_data))
@@ -1262,9 +1207,12 @@ async def divergence_job() -> None:
         await sensors.publish_sensor("ta_bb_position", td(bb_position_data))
         await sensors.publish_sensor("ta_signal", td(signal_data))
         
-        # Update MTF trend sensor (use 4h trend as primary)
-        # Format: {"BTC": {"4h": "Uptrend"}, "ETH": {"4h": "Downtrend"}}
-        ta_trend_mtf = {symbol: {"4h": trend} for symbol, trend in trend_data.items() if trend != "—"}
+        # Update MTF trend sensor with every scanned timeframe
+        # Format: {"BTC": {"1h": "Sideways", "4h": "Uptrend", "1d": "Uptrend"}}
+        ta_trend_mtf: dict[str, dict[str, str]] = {}
+        for result in report.results:
+            if result.trend != "—":
+                ta_trend_mtf.setdefault(result.symbol, {})[result.timeframe] = result.trend
         await sensors.publish_sensor("ta_trend_mtf", td(ta_trend_mtf))
         
         # Calculate overall confluence score
@@ -1306,21 +1254,23 @@ async def divergence_job() -> None:
 
         logger.info(
             f"Divergence job complete: {active_count} divergences, "
-            f"TA indicators for {len(rsi_data)} symbols"
+            f"TA indicators for {len(rsi_data)} symbols, scan {report.total_duration:.1f}s"
         )
 
     except Exception as e:
         logger.error(f"Divergence job failed: {e}")
+        record_job_failure(e)
 
 
 async def signal_history_job() -> None:
     """
     Signal History Update job.
 
-    Runs every hour to update signal outcomes
-    and recalculate win rates.
+    Runs every hour to resolve due signal outcomes (stored candles, live
+    prices for symbols without candles) and publish win rates.
     """
     from service.analysis.signal_history import get_signal_manager
+    from service.candlestick.price_book import get_price_book
     from service.ha import get_sensors_manager
 
     current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -1330,10 +1280,13 @@ async def signal_history_job() -> None:
     sensors = get_sensors_manager()
 
     try:
-        # Get stats (update_outcomes is not async, get_stats is sync)
-        stats = tracker.get_stats()
+        book = get_price_book()
+        prices = {quote.symbol: quote.price for quote in book.get_many(book.snapshot()).values()}
+        resolved = await tracker.update_outcomes(prices)
+
+        stats = await tracker.get_stats()
         logger.info(
-            f"Signals: total={stats.total_signals}, "
+            f"Signals: total={stats.total_signals}, resolved={resolved}, "
             f"win_rate_24h={stats.win_rate_24h:.1f}%"
         )
 
@@ -1343,6 +1296,7 @@ async def signal_history_job() -> None:
 
     except Exception as e:
         logger.error(f"Signal history job failed: {e}")
+        record_job_failure(e)
 
 
 async def price_alerts_job() -> None:
@@ -1353,21 +1307,29 @@ async def price_alerts_job() -> None:
     and trigger notifications.
     """
     from service.alerts import get_alert_manager
+    from service.alerts.notification_bus import publish_notification
+    from service.alerts.notification_manager import AlertCategory
+    from service.alerts.price_alerts import AlertStatus
+    from service.candlestick.price_book import get_price_book
     from service.ha import get_sensors_manager
-    from service.ha_integration import notify
 
     logger.debug("Checking price alerts")
 
     alerts_manager = get_alert_manager()
     sensors = get_sensors_manager()
+    book = get_price_book()
 
     try:
-        # Get current prices from cache
+        # Live prices from the price book, published sensor values as fallback
+        symbols = {alert.symbol for alert in alerts_manager.get_alerts(status=AlertStatus.ACTIVE)}
+        symbols.update(["BTC", "ETH", "SOL", "TON", "AR"])
         prices = {}
-        for symbol in ["BTC", "ETH", "SOL", "TON", "AR"]:
-            cached = sensors._cache.get(f"price_{symbol.lower()}")
-            if cached:
-                prices[symbol] = cached
+        for symbol in symbols:
+            price = book.get_price(symbol)
+            if price is None:
+                price = sensors._cache.get(f"price_{symbol.lower()}")
+            if price:
+                prices[symbol] = price
 
         if not prices:
             logger.debug("No cached prices available for alerts")
@@ -1384,15 +1346,17 @@ async def price_alerts_job() -> None:
         # Send notifications for triggered alerts
         for alert, price in triggered:
             notification = alerts_manager.generate_notification(alert, price)
-            await notify(
+            await publish_notification(
                 message=notification["message"],
                 title=notification["title"],
                 notification_id=notification["notification_id"],
+                category=AlertCategory.PRICE,
             )
             logger.info(f"Price alert triggered: {alert.symbol} at {price}")
 
     except Exception as e:
         logger.error(f"Price alerts job failed: {e}")
+        record_job_failure(e)
 
 
 async def bybit_sync_job() -> None:
@@ -1460,6 +1424,7 @@ async def bybit_sync_job() -> None:
 
     except Exception as e:
         logger.error(f"Bybit sync job failed: {e}")
+        record_job_failure(e)
 
 
 async def dca_job() -> None:
@@ -1488,6 +1453,7 @@ async def dca_job() -> None:
 
     except Exception as e:
         logger.error(f"DCA job failed: {e}")
+        record_job_failure(e)
     finally:
         await calculator.close()
 
@@ -1582,6 +1548,7 @@ async def correlation_job() -> None:
 
     except Exception as e:
         logger.error(f"Correlation job failed: {e}")
+        record_job_failure(e)
     finally:
         await tracker.close()
 
@@ -1593,6 +1560,7 @@ async def volatility_job() -> None:
     Runs every hour to track market volatility
     and update HA sensors for all currencies including adaptive notifications data.
     """
+    from service.analysis.coin_markets import get_coin_market_loader
     from service.analysis.volatility import get_volatility_tracker
     from service.ha import get_sensors_manager
 
@@ -1604,6 +1572,9 @@ async def volatility_job() -> None:
     base_symbols = [s.split("/")[0] for s in symbols]
 
     try:
+        # Histories not cached yet are fetched together
+        await get_coin_market_loader().get_histories(base_symbols, 90)
+
         volatility_data: dict[str, float] = {}
         adaptive_volatilities: dict[str, str] = {}  # Level: High, Medium, Low
         adaptive_factors: dict[str, float] = {}  # Adaptation factor 0.5-2.5
@@ -1658,6 +1629,7 @@ async def volatility_job() -> None:
 
     except Exception as e:
         logger.error(f"Volatility job failed: {e}")
+        record_job_failure(e)
     finally:
         await tracker.close()
 
@@ -1669,9 +1641,10 @@ async def unlocks_job() -> None:
     Runs every 6 hours to track token unlock events
     and update HA sensors.
     """
+    from service.alerts.notification_bus import publish_notification
+    from service.alerts.notification_manager import AlertCategory
     from service.analysis.unlocks import get_unlock_tracker
     from service.ha import get_sensors_manager
-    from service.ha_integration import notify
 
     logger.info("Starting unlock tracker job")
 
@@ -1691,16 +1664,18 @@ async def unlocks_job() -> None:
         # Alert on high-risk unlocks
         high_risk = [u for u in analysis.unlocks if u.risk.value == "high" and u.days_until <= 3]
         for unlock in high_risk:
-            await notify(
+            await publish_notification(
                 message=f"{unlock.token}: разлок {unlock._format_usd(unlock.value_usd)} через {unlock.days_until} дн.",
                 title=f"⚠️ Крупный разлок {unlock.token}",
                 notification_id=f"unlock_{unlock.token}",
+                category=AlertCategory.RISK,
             )
 
         logger.info(f"Unlocks: {analysis.next_7d_count} in next 7 days")
 
     except Exception as e:
         logger.error(f"Unlocks job failed: {e}")
+        record_job_failure(e)
 
 
 async def macro_job() -> None:
@@ -1710,10 +1685,11 @@ async def macro_job() -> None:
     Runs every 12 hours to track economic events
     and update HA sensors.
     """
+    from service.alerts.notification_bus import publish_notification
+    from service.alerts.notification_manager import AlertCategory, AlertPriority
     from service.analysis.macro import get_macro_calendar
     from service.economic_calendar import EconomicCalendar
     from service.ha import get_sensors_manager
-    from service.ha_integration import notify
 
     logger.info("Starting macro calendar job")
 
@@ -1751,16 +1727,19 @@ async def macro_job() -> None:
 
         # Alert before FOMC
         if analysis.days_to_fomc <= 2:
-            await notify(
+            await publish_notification(
                 message=f"Заседание FOMC через {analysis.days_to_fomc} дней. Ожидайте волатильность.",
                 title="📅 FOMC Meeting Soon",
                 notification_id="fomc_reminder",
+                category=AlertCategory.INFO,
+                priority=AlertPriority.INFO,
             )
 
         logger.info(f"Macro: days_to_fomc={analysis.days_to_fomc}, risk={analysis.week_risk.value}")
 
     except Exception as e:
         logger.error(f"Macro job failed: {e}")
+        record_job_failure(e)
 
 
 async def arbitrage_job() -> None:
@@ -1770,9 +1749,10 @@ async def arbitrage_job() -> None:
     Runs every 2 minutes to scan for arbitrage opportunities
     and update HA sensors for all currencies.
     """
+    from service.alerts.notification_bus import publish_notification
+    from service.alerts.notification_manager import AlertCategory
     from service.analysis.arbitrage import get_arbitrage_scanner
     from service.ha import get_sensors_manager
-    from service.ha_integration import notify
 
     logger.debug("Running arbitrage scanner")
 
@@ -1804,14 +1784,16 @@ async def arbitrage_job() -> None:
 
         # Alert on good opportunities
         if analysis.overall_opportunity.value in ["good", "excellent"]:
-            await notify(
+            await publish_notification(
                 message=analysis._get_summary_ru(),
                 title="💰 Арбитражная возможность",
                 notification_id="arb_opportunity",
+                category=AlertCategory.OPPORTUNITY,
             )
 
     except Exception as e:
         logger.error(f"Arbitrage job failed: {e}")
+        record_job_failure(e)
     finally:
         await scanner.close()
 
@@ -1823,9 +1805,11 @@ async def profit_taking_job() -> None:
     Runs every hour to calculate take profit levels
     and update HA sensors for all currencies.
     """
+    from service.alerts.notification_bus import publish_notification
+    from service.alerts.notification_manager import AlertCategory
+    from service.analysis.coin_markets import get_coin_market_loader
     from service.analysis.profit_taking import get_profit_advisor
     from service.ha import get_sensors_manager
-    from service.ha_integration import notify
 
     logger.info("Starting profit taking advisor job")
 
@@ -1835,6 +1819,9 @@ async def profit_taking_job() -> None:
     base_symbols = [s.split("/")[0] for s in symbols]
 
     try:
+        # One bulk CoinGecko request for every symbol analyzed below
+        await get_coin_market_loader().get_markets(base_symbols)
+
         tp_levels_data: dict[str, dict[str, float]] = {}
         best_action = None
         max_greed = 0
@@ -1869,10 +1856,11 @@ async def profit_taking_job() -> None:
 
             # Alert on scale out signals
             if best_action.action.value in ["scale_out_50", "take_profit"]:
-                await notify(
+                await publish_notification(
                     message=best_action._get_recommendation_ru(),
                     title=f"💰 {best_action.action.name_ru}",
                     notification_id="profit_taking_signal",
+                    category=AlertCategory.PORTFOLIO,
                 )
 
             logger.info(f"Profit taking: action={best_action.action.value}, greed={best_action.greed_level.value}")
@@ -1881,6 +1869,7 @@ async def profit_taking_job() -> None:
 
     except Exception as e:
         logger.error(f"Profit taking job failed: {e}")
+        record_job_failure(e)
     finally:
         await advisor.close()
 
@@ -1925,6 +1914,7 @@ async def currency_list_monitor_job() -> None:
 
     except Exception as e:
         logger.error(f"Currency list monitor job failed: {e}")
+        record_job_failure(e)
 
 
 async def traditional_finance_job() -> None:
@@ -1952,9 +1942,9 @@ async def traditional_finance_job() -> None:
 
         # Metals
         if status.gold:
-            await sensors.publish_sensor("gold_price", round(status.gold.price, 2))
-            await sensors._publish_attributes(
+            await sensors.publish_sensor(
                 "gold_price",
+                round(status.gold.price, 2),
                 {
                     "change_24h": status.gold.change_percent,
                     "high": status.gold.high_24h,
@@ -1962,9 +1952,9 @@ async def traditional_finance_job() -> None:
                 },
             )
         if status.silver:
-            await sensors.publish_sensor("silver_price", round(status.silver.price, 2))
-            await sensors._publish_attributes(
+            await sensors.publish_sensor(
                 "silver_price",
+                round(status.silver.price, 2),
                 {
                     "change_24h": status.silver.change_percent,
                 },
@@ -1974,41 +1964,41 @@ async def traditional_finance_job() -> None:
 
         # Indices
         if status.sp500:
-            await sensors.publish_sensor("sp500_price", round(status.sp500.price, 2))
-            await sensors._publish_attributes(
+            await sensors.publish_sensor(
                 "sp500_price",
+                round(status.sp500.price, 2),
                 {
                     "change_24h": status.sp500.change_percent,
                 },
             )
         if status.nasdaq:
-            await sensors.publish_sensor("nasdaq_price", round(status.nasdaq.price, 2))
-            await sensors._publish_attributes(
+            await sensors.publish_sensor(
                 "nasdaq_price",
+                round(status.nasdaq.price, 2),
                 {
                     "change_24h": status.nasdaq.change_percent,
                 },
             )
         if status.dji:
-            await sensors.publish_sensor("dji_price", round(status.dji.price, 2))
-            await sensors._publish_attributes(
+            await sensors.publish_sensor(
                 "dji_price",
+                round(status.dji.price, 2),
                 {
                     "change_24h": status.dji.change_percent,
                 },
             )
         if status.dax:
-            await sensors.publish_sensor("dax_price", round(status.dax.price, 2))
-            await sensors._publish_attributes(
+            await sensors.publish_sensor(
                 "dax_price",
+                round(status.dax.price, 2),
                 {
                     "change_24h": status.dax.change_percent,
                 },
             )
         if status.vix:
-            await sensors.publish_sensor("vix_index", round(status.vix.price, 2))
-            await sensors._publish_attributes(
+            await sensors.publish_sensor(
                 "vix_index",
+                round(status.vix.price, 2),
                 {
                     "change_24h": status.vix.change_percent,
                 },
@@ -2016,9 +2006,9 @@ async def traditional_finance_job() -> None:
 
         # Forex
         if status.eur_usd:
-            await sensors.publish_sensor("eur_usd", round(status.eur_usd.price, 4))
-            await sensors._publish_attributes(
+            await sensors.publish_sensor(
                 "eur_usd",
+                round(status.eur_usd.price, 4),
                 {
                     "change_24h": status.eur_usd.change_percent,
                 },
@@ -2026,9 +2016,9 @@ async def traditional_finance_job() -> None:
         if status.gbp_usd:
             await sensors.publish_sensor("gbp_usd", round(status.gbp_usd.price, 4))
         if status.dxy:
-            await sensors.publish_sensor("dxy_index", round(status.dxy.price, 2))
-            await sensors._publish_attributes(
+            await sensors.publish_sensor(
                 "dxy_index",
+                round(status.dxy.price, 2),
                 {
                     "change_24h": status.dxy.change_percent,
                 },
@@ -2036,9 +2026,9 @@ async def traditional_finance_job() -> None:
 
         # Commodities
         if status.oil_brent:
-            await sensors.publish_sensor("oil_brent", round(status.oil_brent.price, 2))
-            await sensors._publish_attributes(
+            await sensors.publish_sensor(
                 "oil_brent",
+                round(status.oil_brent.price, 2),
                 {
                     "change_24h": status.oil_brent.change_percent,
                 },
@@ -2050,17 +2040,17 @@ async def traditional_finance_job() -> None:
 
         # Treasury Bonds
         if status.treasury_2y:
-            await sensors.publish_sensor("treasury_yield_2y", round(status.treasury_2y.price, 2))
-            await sensors._publish_attributes(
+            await sensors.publish_sensor(
                 "treasury_yield_2y",
+                round(status.treasury_2y.price, 2),
                 {
                     "change_24h": status.treasury_2y.change_percent,
                 },
             )
         if status.treasury_10y:
-            await sensors.publish_sensor("treasury_yield_10y", round(status.treasury_10y.price, 2))
-            await sensors._publish_attributes(
+            await sensors.publish_sensor(
                 "treasury_yield_10y",
+                round(status.treasury_10y.price, 2),
                 {
                     "change_24h": status.treasury_10y.change_percent,
                 },
@@ -2077,8 +2067,7 @@ async def traditional_finance_job() -> None:
 
     except Exception as e:
         logger.error(f"Traditional finance job failed: {e}")
-    finally:
-        await tracker.close()
+        record_job_failure(e)
 
 
 async def traditional_backfill_job() -> None:
@@ -2123,11 +2112,17 @@ async def ai_analysis_job() -> None:
 
     Runs periodically (default: every 24 hours) to generate AI-powered
     market analysis using Ollama or OpenAI.
+
+    The daily summary, the sentiment prompt and the per-symbol ML
+    predictions run concurrently. The summary is streamed and its sensor is
+    updated as soon as enough text arrived.
     """
-    from service.ai.analyzer import MarketAnalyzer, collect_market_data
-    from service.ai.providers import create_ai_service
+    from service.ai.analyzer import collect_market_data, get_market_analyzer
+    from service.ai.prompts import format_ai_response_for_ha
+    from service.ai.providers import get_ai_service
+    from service.alerts.notification_bus import publish_notification
+    from service.alerts.notification_manager import AlertCategory, AlertPriority
     from service.ha import get_sensors_manager
-    from service.ha_integration import notify
 
     current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     logger.info(f"[{current_time}] Starting AI analysis job")
@@ -2139,16 +2134,10 @@ async def ai_analysis_job() -> None:
 
     sensors = get_sensors_manager()
 
-    # Create AI service
-    ai_service = create_ai_service(
-        ai_enabled=settings.AI_ENABLED,
-        ai_provider=settings.AI_PROVIDER,
-        openai_api_key=settings.OPENAI_API_KEY,
-        ollama_host=settings.OLLAMA_HOST,
-        ollama_model=settings.OLLAMA_MODEL,
-    )
+    # Shared AI service: provider health and cached responses persist between runs
+    ai_service = get_ai_service()
 
-    # Check if service is available
+    # Check if service is available (cached, probes only after the health TTL)
     is_available = await ai_service.is_available()
     if not is_available:
         from core.translations import t
@@ -2158,14 +2147,23 @@ async def ai_analysis_job() -> None:
         await sensors.publish_sensor("ai_provider", settings.AI_PROVIDER)
         return
 
-    analyzer = MarketAnalyzer(ai_service)
+    analyzer = get_market_analyzer()
 
-    try:
-        # Collect market data from various services
-        from service.analysis import OnChainAnalyzer, DerivativesAnalyzer
+    async def predict(symbol: str) -> tuple[str, object]:
+        from service.trend_analyzer import get_trend_analyzer
 
-        onchain = OnChainAnalyzer()
-        derivatives = DerivativesAnalyzer()
+        try:
+            return symbol, await get_trend_analyzer().analyze_trend(symbol)
+        except Exception as e:
+            logger.debug(f"ML prediction failed for {symbol}: {e}")
+            return symbol, None
+
+    async def publish_partial(text: str) -> None:
+        await sensors.publish_sensor("ai_daily_summary", format_ai_response_for_ha(text))
+
+    try:
+        # Collect market data from the shared fact store
+        from service.analysis.market_facts import get_derivatives, get_fear_greed
 
         # Gather data
         fear_greed_data = None
@@ -2173,29 +2171,27 @@ async def ai_analysis_job() -> None:
         btc_price = None
         btc_change = 0.0
 
-        try:
-            onchain_data = await onchain.analyze()
-            if onchain_data.fear_greed:
-                fear_greed_data = {
-                    "value": onchain_data.fear_greed.value,
-                    "label": onchain_data.fear_greed.classification,
-                }
-        except Exception as e:
-            logger.warning(f"Failed to get on-chain data for AI: {e}")
+        fg_data, btc_deriv = await asyncio.gather(
+            get_fear_greed(), get_derivatives("BTC"), return_exceptions=True
+        )
 
-        try:
-            btc_deriv = await derivatives.analyze("BTC")
+        if isinstance(fg_data, Exception):
+            logger.warning(f"Failed to get on-chain data for AI: {fg_data}")
+        elif fg_data:
+            fear_greed_data = {
+                "value": fg_data.value,
+                "label": fg_data.classification,
+            }
+
+        if isinstance(btc_deriv, Exception):
+            logger.warning(f"Failed to get derivatives data for AI: {btc_deriv}")
+        elif btc_deriv:
             if btc_deriv.funding:
                 btc_price = btc_deriv.funding.mark_price
             deriv_data = {
                 "funding_rate": btc_deriv.funding.rate if btc_deriv.funding else None,
                 "long_short_ratio": btc_deriv.long_short.long_short_ratio if btc_deriv.long_short else None,
             }
-        except Exception as e:
-            logger.warning(f"Failed to get derivatives data for AI: {e}")
-
-        await onchain.close()
-        await derivatives.close()
 
         # Collect market data
         market_data = await collect_market_data(
@@ -2204,77 +2200,74 @@ async def ai_analysis_job() -> None:
             fear_greed=fear_greed_data,
         )
 
-        # Generate daily summary
+        symbols = await get_currency_list_async()
+        base_symbols = [s.split("/")[0] for s in symbols][:5]  # Limit for performance
+
+        # Summary, sentiment and ML predictions concurrently
         language = settings.AI_LANGUAGE
-        result = await analyzer.generate_daily_summary(market_data, language=language)
+        result, sentiment, *predictions = await asyncio.gather(
+            analyzer.generate_daily_summary(market_data, language=language, on_partial=publish_partial),
+            analyzer.get_sentiment(market_data, language=language),
+            *(predict(symbol) for symbol in base_symbols),
+        )
 
         if result:
             # Update sensors
             await sensors.publish_sensor("ai_daily_summary", analyzer.get_summary_for_sensor())
-            await sensors.publish_sensor("ai_market_sentiment", analyzer.get_sentiment_for_sensor())
+            await sensors.publish_sensor(
+                "ai_market_sentiment",
+                sentiment.sentiment if sentiment and sentiment.sentiment else analyzer.get_sentiment_for_sensor(),
+            )
             await sensors.publish_sensor("ai_recommendation", analyzer.get_recommendation_for_sensor())
             await sensors.publish_sensor("ai_last_analysis", analyzer.get_last_analysis_time())
             await sensors.publish_sensor("ai_provider", f"{result.provider}/{result.model}")
 
             # Update AI trend sensors for all currencies
             await sensors.update_ai_trend_sensors()
-            
+
             # Update ML prediction sensors
             try:
-                from service.trend_analyzer import get_trend_analyzer
-                from service.ml.forecaster import PriceForecaster
-                
                 ml_predictions = {}
                 price_predictions = {}
-                forecaster = PriceForecaster()
-                symbols = await get_currency_list_async()
-                base_symbols = [s.split("/")[0] for s in symbols]
-                
-                for symbol in base_symbols[:5]:  # Limit for performance
-                    try:
-                        trend_analyzer = get_trend_analyzer()
-                        trend_result = await trend_analyzer.analyze_trend(symbol)
-                        
-                        if trend_result:
-                            ml_predictions[symbol] = {
-                                "direction": trend_result.direction.value if hasattr(trend_result, 'direction') else "neutral",
-                                "confidence": round(trend_result.confidence, 1) if hasattr(trend_result, 'confidence') else 50,
-                                "price_24h": round(trend_result.predicted_price_24h, 2) if hasattr(trend_result, 'predicted_price_24h') else None,
-                            }
-                            
-                            if hasattr(trend_result, 'predicted_price_24h') and trend_result.predicted_price_24h:
-                                price_predictions[symbol] = round(trend_result.predicted_price_24h, 2)
-                                
-                    except Exception as e:
-                        logger.debug(f"ML prediction failed for {symbol}: {e}")
-                
+
+                for symbol, trend_result in predictions:
+                    if trend_result:
+                        ml_predictions[symbol] = {
+                            "direction": trend_result.direction.value if hasattr(trend_result, 'direction') else "neutral",
+                            "confidence": round(trend_result.confidence, 1) if hasattr(trend_result, 'confidence') else 50,
+                            "price_24h": round(trend_result.predicted_price_24h, 2) if hasattr(trend_result, 'predicted_price_24h') else None,
+                        }
+
+                        if hasattr(trend_result, 'predicted_price_24h') and trend_result.predicted_price_24h:
+                            price_predictions[symbol] = round(trend_result.predicted_price_24h, 2)
+
                 if ml_predictions:
                     await sensors.publish_sensor("ml_latest_predictions", ml_predictions)
                     await sensors.publish_sensor("ml_system_status", f"Active ({len(ml_predictions)} symbols)")
-                    
+
                 if price_predictions:
                     await sensors.publish_sensor("price_predictions", price_predictions)
-                    
+
                 # Calculate overall ML confidence
                 if ml_predictions:
                     avg_confidence = sum(p.get("confidence", 50) for p in ml_predictions.values()) / len(ml_predictions)
                     await sensors.publish_sensor("ml_market_confidence", round(avg_confidence, 0))
-                    
+
                 # Stop loss recommendation based on market volatility and trend
                 bullish_count = sum(1 for p in ml_predictions.values() if p.get("direction") == "bullish")
                 bearish_count = sum(1 for p in ml_predictions.values() if p.get("direction") == "bearish")
-                
+
                 if bearish_count > bullish_count:
                     stop_loss_rec = "Рекомендуется подтянуть стоп-лоссы на 2-3%"
                 elif fear_greed_data and fear_greed_data.get("value", 50) > 70:
                     stop_loss_rec = "Рынок жадный - рассмотрите защитные стопы"
                 else:
                     stop_loss_rec = "Стандартные уровни стоп-лосс"
-                    
+
                 await sensors.publish_sensor("stop_loss_recommendation", stop_loss_rec)
-                
+
                 logger.info(f"ML sensors updated: {len(ml_predictions)} predictions")
-                
+
             except Exception as e:
                 logger.warning(f"Failed to update ML sensors: {e}")
 
@@ -2285,10 +2278,12 @@ async def ai_analysis_job() -> None:
 
             # Send notification with AI summary
             if result.recommendation and result.recommendation not in ["N/A", "HOLD"]:
-                await notify(
+                await publish_notification(
                     message=analyzer.get_summary_for_sensor(max_length=500),
                     title=f"🤖 AI: {result.sentiment or 'Analysis'}",
                     notification_id="ai_daily_summary",
+                    category=AlertCategory.INFO,
+                    priority=AlertPriority.INFO,
                 )
         else:
             logger.warning("AI analysis returned no result")
@@ -2296,9 +2291,8 @@ async def ai_analysis_job() -> None:
 
     except Exception as e:
         logger.error(f"AI analysis job failed: {e}")
+        record_job_failure(e)
         await sensors.publish_sensor("ai_daily_summary", f"Ошибка: {str(e)[:50]}")
-    finally:
-        await ai_service.close()
 
 
 async def briefing_job() -> None:
@@ -2309,6 +2303,7 @@ async def briefing_job() -> None:
     and update HA sensors.
     """
     from service.analysis.briefing import BriefingService
+    from service.analysis.market_facts import get_derivatives, get_fear_greed
     from service.ha import get_sensors_manager
 
     current_time = datetime.now()
@@ -2329,16 +2324,29 @@ async def briefing_job() -> None:
         elif 18 <= current_hour < 24:
             briefing_type = "evening"
         
+        # Market facts from the shared cache (usually already warm from other jobs)
+        fear_greed = None
+        btc_price = None
+        if briefing_type:
+            fg_data = await get_fear_greed()
+            fear_greed = fg_data.value if fg_data else None
+            btc_deriv = await get_derivatives("BTC")
+            if btc_deriv and btc_deriv.funding:
+                btc_price = Decimal(str(btc_deriv.funding.mark_price))
+
         if briefing_type == "morning":
             # Generate morning briefing
-            briefing = await briefing_service.generate_morning_briefing()
+            briefing = await briefing_service.generate_morning_briefing(
+                btc_price=btc_price,
+                fear_greed=fear_greed,
+            )
             message = briefing.format_message("ru")
             await sensors.publish_sensor("morning_briefing", message[:500] if len(message) > 500 else message)
             logger.info("Morning briefing generated")
             
         elif briefing_type == "evening":
             # Generate evening briefing
-            briefing = await briefing_service.generate_evening_briefing()
+            briefing = await briefing_service.generate_evening_briefing(btc_price=btc_price)
             message = briefing.format_message("ru")
             await sensors.publish_sensor("evening_briefing", message[:500] if len(message) > 500 else message)
             logger.info("Evening briefing generated")
@@ -2354,6 +2362,7 @@ async def briefing_job() -> None:
 
     except Exception as e:
         logger.error(f"Briefing job failed: {e}")
+        record_job_failure(e)
 
 
 async def ml_prediction_job() -> None:
@@ -2469,8 +2478,18 @@ async def ml_prediction_job() -> None:
 
     except Exception as e:
         logger.error(f"ML prediction job failed: {e}")
+        record_job_failure(e)
         await sensors.publish_sensor("ml_system_status", f"Error: {str(e)[:30]}")
 
+    # Resolve stored predictions whose target candle has closed (one set-based UPDATE)
+    try:
+        from models.repositories.ml_predictions import MLPredictionRepository
+        from models.writer import run_write
+
+        await run_write(lambda session: MLPredictionRepository(session).resolve_due_predictions())
+    except Exception as e:
+        logger.warning(f"Failed to resolve due ML predictions: {e}")
+
     # Update database size (system metric)
     try:
         from models.session import async_session_maker
@@ -2493,7 +2512,8 @@ async def backtest_job() -> None:
     Runs once a week to perform backtesting on BTC
     and update HA sensors with results.
     """
-    from service.analysis.backtest import DCABacktester
+    from service.analysis.backtest import get_backtester
+    from service.analysis.backtest_engine import get_backtest_engine
     from service.analysis.risk import RiskAnalyzer
     from service.ha import get_sensors_manager
 
@@ -2501,84 +2521,65 @@ async def backtest_job() -> None:
     logger.info(f"[{current_time}] Starting weekly backtest job")
 
     sensors = get_sensors_manager()
-    backtester = DCABacktester()
+    backtester = get_backtester()
     risk_analyzer = RiskAnalyzer()
 
+    symbol = "BTC/USDT"
+    years = 5
+    amount = 100.0  # Weekly DCA amount
+
     try:
-        # Get historical candles from database
-        from service.candlestick import fetch_candlesticks
-        from service.candlestick.models import CandleInterval
+        # Daily closes from the candle store (cached by data version)
+        series = await get_backtest_engine().get_series(symbol)
+        if series is not None and len(series) >= 100:
+            comparison = await backtester.compare_stored(symbol, amount, years)
+            closes = series.closes[-90:].tolist()
+        else:
+            # Candle store not backfilled yet - fetch from the exchange
+            from service.candlestick import fetch_candlesticks
+            from service.candlestick.models import CandleInterval
+
+            candles = await fetch_candlesticks(
+                symbol=symbol,
+                interval=CandleInterval.DAY_1,
+                limit=years * 365,
+            )
 
-        symbol = "BTC/USDT"
-        years = 5
-        
-        # Fetch daily candles for backtest
-        candles = await fetch_candlesticks(
-            symbol=symbol,
-            interval=CandleInterval.DAY_1,
-            limit=years * 365,
-        )
+            if len(candles) < 100:
+                logger.warning(f"Insufficient candles for backtest: {len(candles)}")
+                await sensors.publish_sensor("backtest_best_strategy", "Недостаточно данных")
+                return
 
-        if len(candles) < 100:
-            logger.warning(f"Insufficient candles for backtest: {len(candles)}")
+            candle_data = [{"timestamp": c.timestamp, "close": float(c.close_price)} for c in candles]
+            comparison = await backtester.compare_strategies(symbol, candle_data, amount, years)
+            closes = [c["close"] for c in candle_data[-90:]]
+
+        strategies = comparison["strategies"] if comparison else {}
+        if not all(strategies.get(name) for name in ("fixed_dca", "smart_dca", "lump_sum")):
+            logger.warning("Backtest produced no results")
             await sensors.publish_sensor("backtest_best_strategy", "Недостаточно данных")
             return
 
-        # Convert to backtest format
-        candle_data = [
-            {
-                "timestamp": c.timestamp,  # Already in ms
-                "open": float(c.open_price),
-                "high": float(c.high_price),
-                "low": float(c.low_price),
-                "close": float(c.close_price),
-                "volume": float(c.volume),
-            }
-            for c in candles
-        ]
-
-        amount = 100.0  # Weekly DCA amount
-
-        # Run backtests
-        fixed_result = await backtester.backtest_fixed_dca(
-            symbol=symbol,
-            candles=candle_data,
-            amount=amount,
-            frequency="weekly",
-            years=years,
-        )
-        
-        smart_result = await backtester.backtest_smart_dca(
-            symbol=symbol,
-            candles=candle_data,
-            base_amount=amount,
-            years=years,
-        )
-        
-        lump_sum_result = await backtester.backtest_lump_sum(
-            symbol=symbol,
-            candles=candle_data,
-            total_amount=amount * 52 * years,
-            years=years,
-        )
+        fixed_roi = strategies["fixed_dca"]["total_return_pct"]
+        smart_roi = strategies["smart_dca"]["total_return_pct"]
+        lump_roi = strategies["lump_sum"]["total_return_pct"]
 
         # Update sensors
-        await sensors.publish_sensor("backtest_dca_roi", round(fixed_result.total_return_pct, 1))
-        await sensors.publish_sensor("backtest_smart_dca_roi", round(smart_result.total_return_pct, 1))
-        await sensors.publish_sensor("backtest_lump_sum_roi", round(lump_sum_result.total_return_pct, 1))
+        await sensors.publish_sensor("backtest_dca_roi", round(fixed_roi, 1))
+        await sensors.publish_sensor("backtest_smart_dca_roi", round(smart_roi, 1))
+        await sensors.publish_sensor("backtest_lump_sum_roi", round(lump_roi, 1))
 
         # Determine best strategy
         results = [
-            ("Fixed DCA", fixed_result.total_return_pct),
-            ("Smart DCA", smart_result.total_return_pct),
-            ("Lump Sum", lump_sum_result.total_return_pct),
+            ("Fixed DCA", fixed_roi),
+            ("Smart DCA", smart_roi),
+            ("Lump Sum", lump_roi),
         ]
         best = max(results, key=lambda x: x[1])
         await sensors.publish_sensor("backtest_best_strategy", f"{best[0]} ({best[1]:.1f}%)")
 
         # Risk metrics
         try:
-            closes = [c["close"] for c in candle_data[-90:]]
             metrics = await risk_analyzer.calculate_risk_metrics(
                 portfolio_values=closes,
                 current_value=closes[-1],
@@ -2592,11 +2593,50 @@ async def backtest_job() -> None:
         except Exception as e:
             logger.warning(f"Risk metrics calculation failed: {e}")
 
-        logger.info(f"Backtest completed: fixed={fixed_result.total_return_pct:.1f}%, "
-                    f"smart={smart_result.total_return_pct:.1f}%, lump={lump_sum_result.total_return_pct:.1f}%")
+        logger.info(f"Backtest completed: fixed={fixed_roi:.1f}%, smart={smart_roi:.1f}%, lump={lump_roi:.1f}%")
 
     except Exception as e:
         logger.error(f"Backtest job failed: {e}")
+        record_job_failure(e)
         await sensors.publish_sensor("backtest_best_strategy", f"Ошибка: {str(e)[:30]}")
 
 
+async def scheduler_telemetry_job() -> None:
+    """
+    Scheduler Telemetry job.
+
+    Runs every minute to publish the max event-loop lag of the last window
+    with slowest jobs, overlaps and stall suspects as attributes.
+    """
+    from core.scheduler.telemetry import get_scheduler_telemetry
+    from service.ha import get_sensors_manager
+
+    try:
+        lag_ms, attributes = get_scheduler_telemetry().get_sensor_payload()
+        await get_sensors_manager().publish_sensor("scheduler_loop_lag", lag_ms, attributes)
+    except Exception as e:
+        logger.error(f"Scheduler telemetry job failed: {e}")
+        record_job_failure(e)
+
+
+async def candle_maintenance_job() -> None:
+    """
+    Candle Storage Maintenance job.
+
+    Runs daily: creates upcoming monthly partitions, archives closed
+    months, applies retention tiers, vacuums touched partitions and
+    refreshes row counters.
+    """
+    from service.candlestick.maintenance import get_candle_storage
+
+    try:
+        result = await get_candle_storage().run()
+        logger.info(
+            f"Candle maintenance: archived {sum(result['archived'].values())} months, "
+            f"deleted {result['deleted']}, "
+            f"dropped partitions {result['dropped_partitions']}, "
+            f"took {result['last_duration_ms']}ms"
+        )
+    except Exception as e:
+        logger.error(f"Candle maintenance job failed: {e}")
+        record_job_failure(e)
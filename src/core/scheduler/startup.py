@@ -0,0 +1,158 @@
+"""
+Dependency-ordered startup job runner.
+
+Startup jobs populate sensors right after boot. Independent jobs run
+concurrently (bounded by a semaphore); a job with ``depends_on`` starts
+only after all its dependencies have finished. Dependencies express
+ordering only - a failed dependency does not cancel its dependents,
+matching the scheduled jobs which log and carry on.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Default number of startup jobs running at the same time
+DEFAULT_STARTUP_CONCURRENCY = 4
+
+
+@dataclass
+class StartupJob:
+    """A job run once at startup."""
+
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass
+class StartupJobResult:
+    """Outcome of a startup job."""
+
+    name: str
+    started_at: float  # Seconds since runner start
+    duration: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "started_at_s": round(self.started_at, 3),
+            "duration_ms": round(self.duration * 1000, 1),
+            "ok": self.ok,
+            "error": self.error,
+        }
+
+
+@dataclass
+class StartupReport:
+    """Summary of a startup run."""
+
+    results: list[StartupJobResult] = field(default_factory=list)
+    total_duration: float = 0.0
+
+    @property
+    def failed(self) -> list[str]:
+        return [r.name for r in self.results if not r.ok]
+
+    def to_dict(self) -> dict:
+        return {
+            "total_duration_ms": round(self.total_duration * 1000, 1),
+            "jobs": len(self.results),
+            "failed": self.failed,
+            "results": [r.to_dict() for r in self.results],
+        }
+
+
+class StartupJobRunner:
+    """Run startup jobs concurrently in dependency order."""
+
+    def __init__(self, jobs: Iterable[StartupJob], concurrency: int = DEFAULT_STARTUP_CONCURRENCY):
+        """
+        Initialize runner.
+
+        Args:
+            jobs: Jobs to run
+            concurrency: Max jobs running at the same time
+
+        Raises:
+            ValueError: On duplicate names, unknown dependencies or cycles
+        """
+        self.jobs: dict[str, StartupJob] = {}
+        for job in jobs:
+            if job.name in self.jobs:
+                raise ValueError(f"Duplicate startup job: {job.name}")
+            self.jobs[job.name] = job
+        self.concurrency = max(1, concurrency)
+        self._validate()
+
+    def _validate(self) -> None:
+        """Check dependencies exist and form a DAG."""
+        for job in self.jobs.values():
+            for dep in job.depends_on:
+                if dep not in self.jobs:
+                    raise ValueError(f"Startup job {job.name} depends on unknown job {dep}")
+
+        visiting: set[str] = set()
+        done: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Startup job dependency cycle at {name}")
+            visiting.add(name)
+            for dep in self.jobs[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.jobs:
+            visit(name)
+
+    async def run(self) -> StartupReport:
+        """Run all jobs and return timings."""
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        finished: dict[str, asyncio.Event] = {name: asyncio.Event() for name in self.jobs}
+        report = StartupReport()
+
+        async def run_job(job: StartupJob) -> None:
+            try:
+                for dep in job.depends_on:
+                    await finished[dep].wait()
+                async with semaphore:
+                    job_started = time.monotonic()
+                    error = None
+                    logger.info(f"Startup job: Running {job.name}...")
+                    try:
+                        await job.func()
+                    except Exception as e:
+                        error = str(e) or type(e).__name__
+                        logger.warning(f"Startup job {job.name} failed: {e}")
+                    duration = time.monotonic() - job_started
+                    report.results.append(
+                        StartupJobResult(
+                            name=job.name,
+                            started_at=job_started - started,
+                            duration=duration,
+                            error=error,
+                        )
+                    )
+                    if error is None:
+                        logger.info(f"Startup job: {job.name} completed in {duration:.1f}s")
+            finally:
+                finished[job.name].set()
+
+        await asyncio.gather(*(run_job(job) for job in self.jobs.values()))
+        report.total_duration = time.monotonic() - started
+        return report
@@ -0,0 +1,447 @@
+"""
+Scheduler job telemetry.
+
+Instruments APScheduler jobs and startup jobs by wrapping them:
+- Per-job duration histograms and ok/error run counts; jobs that log and
+  swallow their errors mark the run failed with record_job_failure()
+- Overlap (skipped: max_instances reached) and missed-run counts
+- Outbound HTTP requests (HTTP gateway event hook) and DB statements
+  (SQLAlchemy event) per run, attributed to the running job through a
+  context variable
+- Event-loop lag sampling; stalls are charged to the jobs running at the
+  time, which narrows down which job blocks the loop
+
+Exposed in Prometheus text format and as a diagnostic HA sensor.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, JobEvent
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "crypto_inspect"
+
+# Job duration buckets in seconds (jobs range from sub-second to minutes)
+JOB_DURATION_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Event-loop lag buckets in seconds
+LOOP_LAG_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+DEFAULT_LAG_INTERVAL = 0.5
+DEFAULT_STALL_THRESHOLD = 0.25
+
+
+@dataclass
+class Histogram:
+    """Cumulative histogram with Prometheus-style buckets."""
+
+    buckets: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Approximate quantile (upper bucket bound)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        for bound, cumulative in zip(self.buckets, self.counts, strict=True):
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+
+@dataclass
+class JobMetrics:
+    """Counters for one scheduler job."""
+
+    job_id: str
+    durations: Histogram = field(default_factory=lambda: Histogram(JOB_DURATION_BUCKETS))
+    runs_ok: int = 0
+    runs_error: int = 0
+    skipped_overlap: int = 0
+    missed: int = 0
+    http_requests: int = 0
+    db_statements: int = 0
+    loop_stalls: int = 0
+    running: int = 0
+    last_error: str | None = None
+    last_duration: float | None = None
+    max_duration: float = 0.0
+    last_http_requests: int = 0
+    last_db_statements: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "runs_ok": self.runs_ok,
+            "runs_error": self.runs_error,
+            "skipped_overlap": self.skipped_overlap,
+            "missed": self.missed,
+            "running": self.running,
+            "last_error": self.last_error,
+            "last_duration_s": round(self.last_duration, 3) if self.last_duration is not None else None,
+            "max_duration_s": round(self.max_duration, 3),
+            "p95_duration_s": self.durations.quantile(0.95),
+            "http_requests": self.http_requests,
+            "db_statements": self.db_statements,
+            "last_http_requests": self.last_http_requests,
+            "last_db_statements": self.last_db_statements,
+            "loop_stalls": self.loop_stalls,
+        }
+
+
+@dataclass
+class _RunContext:
+    """Counters of the job run owning the current task."""
+
+    job_id: str
+    http_requests: int = 0
+    db_statements: int = 0
+    error: str | None = None
+
+
+_current_run: ContextVar[_RunContext | None] = ContextVar("scheduler_job_run", default=None)
+
+
+class LoopLagMonitor:
+    """Measures event-loop lag by timing a periodic sleep."""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_LAG_INTERVAL,
+        stall_threshold: float = DEFAULT_STALL_THRESHOLD,
+        on_stall: Callable[[float], None] | None = None,
+    ):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.on_stall = on_stall
+        self.lag = Histogram(LOOP_LAG_BUCKETS)
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.window_max_lag = 0.0  # Reset by take_window_max()
+        self.stalls = 0
+        self._task: asyncio.Task | None = None
+
+    def record(self, lag: float) -> None:
+        """Record one lag sample."""
+        lag = max(0.0, lag)
+        self.lag.observe(lag)
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.window_max_lag = max(self.window_max_lag, lag)
+        if lag >= self.stall_threshold:
+            self.stalls += 1
+            if self.on_stall:
+                self.on_stall(lag)
+
+    def take_window_max(self) -> float:
+        """Get max lag since the previous call and start a new window."""
+        value, self.window_max_lag = self.window_max_lag, 0.0
+        return value
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(loop.time() - expected)
+
+
+class SchedulerTelemetry:
+    """Collects job and event-loop metrics for the scheduler."""
+
+    def __init__(
+        self,
+        lag_interval: float = DEFAULT_LAG_INTERVAL,
+        stall_threshold: float = DEFAULT_STALL_THRESHOLD,
+    ):
+        self.jobs: dict[str, JobMetrics] = {}
+        self.loop_monitor = LoopLagMonitor(lag_interval, stall_threshold, on_stall=self._on_stall)
+        self.http_requests_untracked = 0
+        self.db_statements_untracked = 0
+        self._db_engines: set[int] = set()
+
+    def _metrics(self, job_id: str) -> JobMetrics:
+        metrics = self.jobs.get(job_id)
+        if metrics is None:
+            metrics = self.jobs[job_id] = JobMetrics(job_id)
+        return metrics
+
+    # === Job instrumentation ===
+
+    def wrap(self, job_id: str, func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """Wrap a coroutine job function with run accounting."""
+        if getattr(func, "__telemetry_job_id__", None):
+            return func
+
+        @functools.wraps(func)
+        async def instrumented(*args, **kwargs):
+            metrics = self._metrics(job_id)
+            run = _RunContext(job_id)
+            token = _current_run.set(run)
+            metrics.running += 1
+            started = time.monotonic()
+            try:
+                result = await func(*args, **kwargs)
+                if run.error is None:
+                    metrics.runs_ok += 1
+                else:
+                    metrics.runs_error += 1
+                    metrics.last_error = run.error
+                return result
+            except Exception as e:
+                metrics.runs_error += 1
+                metrics.last_error = str(e) or type(e).__name__
+                raise
+            finally:
+                duration = time.monotonic() - started
+                metrics.running -= 1
+                metrics.durations.observe(duration)
+                metrics.last_duration = duration
+                metrics.max_duration = max(metrics.max_duration, duration)
+                metrics.http_requests += run.http_requests
+                metrics.db_statements += run.db_statements
+                metrics.last_http_requests = run.http_requests
+                metrics.last_db_statements = run.db_statements
+                _current_run.reset(token)
+
+        instrumented.__telemetry_job_id__ = job_id
+        return instrumented
+
+    def attach(self, sched) -> None:
+        """Wrap all registered jobs and listen for skipped/missed runs."""
+        for job in sched.get_jobs():
+            if asyncio.iscoroutinefunction(job.func):
+                job.modify(func=self.wrap(job.id, job.func))
+                self._metrics(job.id)
+        sched.add_listener(self._on_scheduler_event, EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED)
+
+    def _on_scheduler_event(self, event: JobEvent) -> None:
+        metrics = self._metrics(event.job_id)
+        if event.code == EVENT_JOB_MAX_INSTANCES:
+            metrics.skipped_overlap += 1
+            logger.warning(f"Job {event.job_id} skipped: previous run still active")
+        elif event.code == EVENT_JOB_MISSED:
+            metrics.missed += 1
+            logger.warning(f"Job {event.job_id} missed its run time")
+
+    def _on_stall(self, lag: float) -> None:
+        running = [m.job_id for m in self.jobs.values() if m.running]
+        for job_id in running:
+            self.jobs[job_id].loop_stalls += 1
+        logger.warning(f"Event loop stalled for {lag * 1000:.0f}ms (running jobs: {', '.join(running) or 'none'})")
+
+    # === HTTP / DB hooks ===
+
+    def record_http_request(self) -> None:
+        run = _current_run.get()
+        if run is None:
+            self.http_requests_untracked += 1
+        else:
+            run.http_requests += 1
+
+    def record_db_statement(self) -> None:
+        run = _current_run.get()
+        if run is None:
+            self.db_statements_untracked += 1
+        else:
+            run.db_statements += 1
+
+    async def _on_http_request(self, request) -> None:
+        self.record_http_request()
+
+    def install_http_hook(self, gateway=None) -> None:
+        """Count requests sent through the HTTP gateway (defaults to the global one)."""
+        if gateway is None:
+            from core.http_gateway import get_http_gateway
+
+            gateway = get_http_gateway()
+        gateway.add_event_hook("request", self._on_http_request)
+
+    def install_db_hook(self, engine) -> None:
+        """Count statements executed on an async SQLAlchemy engine."""
+        if id(engine) in self._db_engines:
+            return
+        from sqlalchemy import event
+
+        def before_cursor_execute(*args) -> None:
+            self.record_db_statement()
+
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        self._db_engines.add(id(engine))
+
+    # === Lifecycle ===
+
+    def start(self, sched) -> None:
+        """Instrument scheduler, HTTP and DB, and start lag sampling."""
+        self.attach(sched)
+        self.install_http_hook()
+        try:
+            from models.session import engine, write_engine
+
+            self.install_db_hook(engine)
+            # SQLite profile: run_write statements execute on the writer's engine
+            self.install_db_hook(write_engine)
+        except Exception as e:
+            logger.debug(f"DB telemetry not installed: {e}")
+        self.loop_monitor.start()
+
+    async def stop(self) -> None:
+        await self.loop_monitor.stop()
+
+    # === Export ===
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get telemetry as a JSON-friendly dict."""
+        monitor = self.loop_monitor
+        return {
+            "event_loop": {
+                "last_lag_ms": round(monitor.last_lag * 1000, 1),
+                "max_lag_ms": round(monitor.max_lag * 1000, 1),
+                "p99_lag_s": monitor.lag.quantile(0.99),
+                "stalls": monitor.stalls,
+                "samples": monitor.lag.count,
+            },
+            "http_requests_untracked": self.http_requests_untracked,
+            "db_statements_untracked": self.db_statements_untracked,
+            "jobs": {job_id: m.to_dict() for job_id, m in sorted(self.jobs.items())},
+        }
+
+    def get_sensor_payload(self) -> tuple[float, dict[str, Any]]:
+        """Get diagnostic sensor state (max loop lag ms in window) and attributes."""
+        window_max = self.loop_monitor.take_window_max()
+        slowest = sorted(self.jobs.values(), key=lambda m: m.max_duration, reverse=True)[:5]
+        stalling = sorted((m for m in self.jobs.values() if m.loop_stalls), key=lambda m: m.loop_stalls, reverse=True)
+        attributes = {
+            "loop_stalls": self.loop_monitor.stalls,
+            "max_lag_ms_total": round(self.loop_monitor.max_lag * 1000, 1),
+            "slowest_jobs": {m.job_id: round(m.max_duration, 2) for m in slowest if m.max_duration},
+            "stall_suspects": {m.job_id: m.loop_stalls for m in stalling[:5]},
+            "overlaps": {m.job_id: m.skipped_overlap for m in self.jobs.values() if m.skipped_overlap},
+            "missed": {m.job_id: m.missed for m in self.jobs.values() if m.missed},
+            "failed_runs": {m.job_id: m.runs_error for m in self.jobs.values() if m.runs_error},
+        }
+        return round(window_max * 1000, 1), attributes
+
+    def render_prometheus(self) -> str:
+        """Render metrics in Prometheus text exposition format."""
+        p = METRIC_PREFIX
+        lines: list[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+
+        def histogram(name: str, hist: Histogram, labels: str = "") -> None:
+            sep = "," if labels else ""
+            for bound, count in zip(hist.buckets, hist.counts, strict=True):
+                lines.append(f'{p}_{name}_bucket{{{labels}{sep}le="{bound}"}} {count}')
+            lines.append(f'{p}_{name}_bucket{{{labels}{sep}le="+Inf"}} {hist.count}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{p}_{name}_sum{suffix} {hist.total:.6f}")
+            lines.append(f"{p}_{name}_count{suffix} {hist.count}")
+
+        jobs = sorted(self.jobs.items())
+
+        header("job_duration_seconds", "histogram", "Scheduler job run duration")
+        for job_id, m in jobs:
+            histogram("job_duration_seconds", m.durations, f'job="{job_id}"')
+
+        header("job_runs_total", "counter", "Scheduler job runs by status")
+        for job_id, m in jobs:
+            lines.append(f'{p}_job_runs_total{{job="{job_id}",status="ok"}} {m.runs_ok}')
+            lines.append(f'{p}_job_runs_total{{job="{job_id}",status="error"}} {m.runs_error}')
+
+        header("job_skipped_total", "counter", "Scheduler job runs not executed")
+        for job_id, m in jobs:
+            lines.append(f'{p}_job_skipped_total{{job="{job_id}",reason="overlap"}} {m.skipped_overlap}')
+            lines.append(f'{p}_job_skipped_total{{job="{job_id}",reason="missed"}} {m.missed}')
+
+        header("job_running", "gauge", "Scheduler job instances currently running")
+        for job_id, m in jobs:
+            lines.append(f'{p}_job_running{{job="{job_id}"}} {m.running}')
+
+        header("job_http_requests_total", "counter", "Outbound HTTP requests made by job runs")
+        for job_id, m in jobs:
+            lines.append(f'{p}_job_http_requests_total{{job="{job_id}"}} {m.http_requests}')
+        lines.append(f'{p}_job_http_requests_total{{job=""}} {self.http_requests_untracked}')
+
+        header("job_db_statements_total", "counter", "DB statements executed by job runs")
+        for job_id, m in jobs:
+            lines.append(f'{p}_job_db_statements_total{{job="{job_id}"}} {m.db_statements}')
+        lines.append(f'{p}_job_db_statements_total{{job=""}} {self.db_statements_untracked}')
+
+        header("job_loop_stalls_total", "counter", "Event loop stalls observed while the job was running")
+        for job_id, m in jobs:
+            lines.append(f'{p}_job_loop_stalls_total{{job="{job_id}"}} {m.loop_stalls}')
+
+        monitor = self.loop_monitor
+        header("event_loop_lag_seconds", "histogram", "Event loop scheduling lag")
+        histogram("event_loop_lag_seconds", monitor.lag)
+        header("event_loop_lag_max_seconds", "gauge", "Max event loop lag since start")
+        lines.append(f"{p}_event_loop_lag_max_seconds {monitor.max_lag:.6f}")
+        header("event_loop_stalls_total", "counter", "Event loop lag samples above the stall threshold")
+        lines.append(f"{p}_event_loop_stalls_total {monitor.stalls}")
+
+        return "\n".join(lines) + "\n"
+
+
+def record_job_failure(error: BaseException | str) -> None:
+    """
+    Count the running job's run as failed.
+
+    For jobs that catch and log their own errors: the wrapper only sees
+    exceptions that propagate. No-op outside an instrumented run.
+    """
+    run = _current_run.get()
+    if run is not None:
+        run.error = str(error) or type(error).__name__
+
+
+# Global telemetry instance
+_telemetry: SchedulerTelemetry | None = None
+
+
+def get_scheduler_telemetry() -> SchedulerTelemetry:
+    """Get global scheduler telemetry instance."""
+    global _telemetry
+    if _telemetry is None:
+        from core.config import settings
+
+        _telemetry = SchedulerTelemetry(
+            lag_interval=settings.LOOP_LAG_SAMPLE_INTERVAL,
+            stall_threshold=settings.LOOP_STALL_THRESHOLD,
+        )
+    return _telemetry
@@ -2,6 +2,7 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import asyncio
 import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
@@ -14,6 +15,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 from api.middleware import setup_exception_handlers
 from api.router import api_router
+from core.boot import get_boot_timeline
 from core.config import settings
 from core.logging_config import setup_logging
 
@@ -52,6 +54,7 @@ async def start_websocket_streaming() -> None:
 
     from service.candlestick.buffer import get_candle_buffer, init_candle_buffer
     from service.candlestick.models import CandleInterval
+    from service.candlestick.price_book import warm_up_price_book
     from service.candlestick.websocket import init_stream_manager
 
     # Initialize candle buffer for DB writes
@@ -63,6 +66,9 @@ async def start_websocket_streaming() -> None:
     interval = interval_map.get(settings.STREAMING_INTERVAL, CandleInterval.MINUTE_1)
     interval_str = settings.STREAMING_INTERVAL
 
+    # Prefill rolling 24h stats of the price book from stored candles
+    await warm_up_price_book(symbols, interval_str)
+
     async def on_candle(symbol: str, candle, is_closed: bool, source: str) -> None:
         """Handle received candle."""
         if is_closed:
@@ -107,7 +113,7 @@ async def stop_websocket_streaming() -> None:
 async def start_mcp_server() -> None:
     """Start MCP server if enabled."""
     if not settings.MCP_ENABLED:
-        logger.debug("MCP server disabled by configuration")
+        logger.info("MCP server disabled by configuration")
         return
 
     try:
@@ -138,6 +144,7 @@ async def start_esphome_api_server() -> None:
         from service.esphome_api import (
             setup_esphome_api,
             start_esphome_api,
+            start_state_bridge,
             get_esphome_server,
         )
         from service.ha.core.registry import SensorRegistry
@@ -171,6 +178,9 @@ async def start_esphome_api_server() -> None:
 
         success = await start_esphome_api()
         if success:
+            # Push sensor changes to ESPHome clients in coalesced batches
+            bridge = await start_state_bridge(server, settings.ESPHOME_STATE_PUSH_INTERVAL)
+            ha_manager.add_state_listener(bridge.on_sensor_change)
             logger.info(
                 "ESPHome API started on port %d (%d sensors)",
                 settings.ESPHOME_API_PORT,
@@ -185,7 +195,12 @@ async def start_esphome_api_server() -> None:
 async def stop_esphome_api_server() -> None:
     """Stop ESPHome API server."""
     try:
-        from service.esphome_api import stop_esphome_api
+        from service.esphome_api import get_state_bridge, stop_esphome_api
+        from service.ha import get_ha_manager
+
+        bridge = get_state_bridge()
+        if bridge:
+            get_ha_manager().remove_state_listener(bridge.on_sensor_change)
         await stop_esphome_api()
     except ImportError:
         pass
@@ -237,11 +252,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     else:
         logger.info("All optional services disabled")
 
+    boot = get_boot_timeline()
+
     # Check HA Supervisor connection with retries
     from service.ha_integration import get_supervisor_client
 
-    supervisor_client = get_supervisor_client()
-    ha_connected = await supervisor_client.check_connection()
+    with boot.stage("ha_connect"):
+        supervisor_client = get_supervisor_client()
+        ha_connected = await supervisor_client.check_connection()
 
     if not ha_connected:
         if settings.API_ENABLED or settings.MCP_ENABLED:
@@ -253,43 +271,41 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
 
     # Initialize HA entities only if connected
     if ha_connected:
-        try:
-            from service.ha_init import initialize_ha_entities
+        with boot.stage("ha_entities"):
+            try:
+                from service.ha_init import initialize_ha_entities
 
-            await initialize_ha_entities()
-        except ImportError:
-            logger.warning("ha_init module not available, skipping entity initialization")
-        except Exception as e:
-            logger.error(f"Error initializing HA entities: {e}")
+                await initialize_ha_entities()
+            except ImportError:
+                logger.warning("ha_init module not available, skipping entity initialization")
+            except Exception as e:
+                logger.error(f"Error initializing HA entities: {e}")
 
-        # Register HA sensors from new modular system
-        from service.ha import get_ha_manager
+            # Register HA sensors from new modular system
+            from service.ha import get_ha_manager
 
-        ha_manager = get_ha_manager()
-        await ha_manager.register_sensors()
+            ha_manager = get_ha_manager()
+            await ha_manager.register_sensors()
     else:
         logger.info("Skipping HA entity initialization (not connected)")
 
-    # Start WebSocket streaming
-    await start_websocket_streaming()
-
-    # Start MCP server (conditional)
-    if settings.MCP_ENABLED:
-        await start_mcp_server()
-    else:
-        logger.info("MCP server disabled by configuration")
-
-    # Start ESPHome Native API (for HA auto-discovery)
-    if settings.ESPHOME_API_ENABLED:
-        await start_esphome_api_server()
-    else:
+    if not settings.ESPHOME_API_ENABLED:
         logger.info("ESPHome API disabled by configuration")
 
+    # Streaming, MCP and ESPHome API are independent - start them together
+    with boot.stage("services"):
+        await asyncio.gather(
+            start_websocket_streaming(),
+            start_mcp_server(),
+            start_esphome_api_server() if settings.ESPHOME_API_ENABLED else asyncio.sleep(0),
+        )
+
     # Run initial backfill (background task)
     await run_initial_backfill()
 
     # Start scheduler
     async with scheduler_lifespan(app):
+        boot.mark_ready()
         yield
 
     # Stop services
@@ -299,6 +315,32 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
         await stop_mcp_server()
     await stop_websocket_streaming()
 
+    # Deliver notifications still waiting for their digest
+    from service.alerts.notification_bus import close_notification_bus
+
+    await close_notification_bus()
+
+    from service.analysis.market_facts import close_market_fact_store
+
+    await close_market_fact_store()
+
+    from service.ai.providers import close_ai_service
+
+    await close_ai_service()
+
+    from core.http_gateway import close_http_gateway
+
+    await close_http_gateway()
+
+    from service.ml.forecast_cache import close_forecast_cache
+
+    close_forecast_cache()
+
+    # Commit writes still queued for the SQLite writer
+    from models.writer import close_write_queue
+
+    await close_write_queue()
+
     logger.info(f"{settings.APP_NAME} shutdown complete")
 
 
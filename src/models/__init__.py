@@ -7,10 +7,12 @@ Contains:
 """
 
 from models.base import Base
-from models.candlestick import CandlestickRecord
+from models.candlestick import CandleRowCount, CandlestickRecord
 from models.ml_predictions import MLModelPerformance, MLPredictionRecord
+from models.portfolio_snapshot import PortfolioSnapshot
 from models.sensor_state import SensorState
 from models.session import async_session_maker, engine, get_db
+from models.signal import SignalRecord, SignalStatsRecord
 from models.traditional import TraditionalAssetRecord
 
 __all__ = [
@@ -22,8 +24,12 @@ __all__ = [
     "get_db",
     # Models
     "CandlestickRecord",
+    "CandleRowCount",
     "TraditionalAssetRecord",
     "MLPredictionRecord",
     "MLModelPerformance",
     "SensorState",
+    "PortfolioSnapshot",
+    "SignalRecord",
+    "SignalStatsRecord",
 ]
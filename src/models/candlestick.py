@@ -3,11 +3,23 @@
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import BigInteger, DateTime, Index, Numeric, String, func
+from sqlalchemy import BigInteger, DateTime, Index, Numeric, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from models.base import Base
 
+# Columns stored in the read index so latest-candle queries are index-only scans
+COVERING_COLUMNS = [
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+    "volume",
+    "quote_volume",
+    "trades_count",
+    "loaded_at",
+]
+
 
 class CandlestickRecord(Base):
     """
@@ -104,15 +116,25 @@ class CandlestickRecord(Base):
 
     # === Indexes for common query patterns ===
     __table_args__ = (
-        # Index for querying by symbol across all exchanges
-        Index("ix_candlestick_symbol", "symbol"),
+        # Covering index for "latest N candles of symbol/interval" reads
+        Index(
+            "ix_candlestick_symbol_interval_ts",
+            "symbol",
+            "interval",
+            text("timestamp DESC"),
+            "exchange",
+            postgresql_include=COVERING_COLUMNS,
+        ),
         # Index for time range queries
         Index("ix_candlestick_timestamp", "timestamp"),
-        # Index for fetching latest candles per exchange/symbol
-        Index("ix_candlestick_exchange_symbol_interval", "exchange", "symbol", "interval"),
         # Index for loaded_at to track recent inserts
         Index("ix_candlestick_loaded_at", "loaded_at"),
-        {"comment": "Stores historical candlestick (OHLCV) data from various exchanges"},
+        {
+            "comment": "Stores historical candlestick (OHLCV) data from various exchanges",
+            # Monthly partitions (candlestick_records_pYYYYMM) are managed by
+            # service.candlestick.maintenance
+            "postgresql_partition_by": "RANGE (timestamp)",
+        },
     )
 
     def __repr__(self) -> str:
@@ -125,3 +147,41 @@ class CandlestickRecord(Base):
             f"close={self.close_price}"
             f")>"
         )
+
+
+class CandleRowCount(Base):
+    """
+    Maintained row counters for candlestick_records.
+
+    One row per (month, symbol, interval); refreshed for months that
+    received writes so totals never need a full-table COUNT.
+    """
+
+    __tablename__ = "candle_row_counts"
+
+    month: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        comment="Month start as Unix timestamp in milliseconds (UTC)",
+    )
+    symbol: Mapped[str] = mapped_column(String(50), primary_key=True)
+    interval: Mapped[str] = mapped_column(String(10), primary_key=True)
+    row_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    min_timestamp: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    max_timestamp: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    counted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="When the month was last counted",
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<CandleRowCount("
+            f"month={self.month}, "
+            f"symbol={self.symbol!r}, "
+            f"interval={self.interval!r}, "
+            f"rows={self.row_count}"
+            f")>"
+        )
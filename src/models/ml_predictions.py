@@ -3,7 +3,7 @@
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import BigInteger, DateTime, Index, Numeric, String, Text, func
+from sqlalchemy import BigInteger, DateTime, Double, Index, Integer, Numeric, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from models.base import Base
@@ -21,7 +21,8 @@ class MLPredictionRecord(Base):
 
     # === Primary Key ===
     id: Mapped[int] = mapped_column(
-        BigInteger,
+        # SQLite only autoincrements INTEGER PRIMARY KEY
+        BigInteger().with_variant(Integer, "sqlite"),
         primary_key=True,
         autoincrement=True,
         comment="Unique identifier for each prediction record",
@@ -77,6 +78,11 @@ class MLPredictionRecord(Base):
         nullable=True,
         comment="Historical prices used for context (JSON array)",
     )
+    reference_price: Mapped[Decimal | None] = mapped_column(
+        Numeric(precision=30, scale=10),
+        nullable=True,
+        comment="Last context price when the prediction was made (direction baseline)",
+    )
 
     # === Confidence Metrics ===
     confidence_percentage: Mapped[float] = mapped_column(
@@ -155,6 +161,13 @@ class MLPredictionRecord(Base):
         Index("ix_ml_prediction_created_at", "created_at"),
         # Composite index for backtesting queries
         Index("ix_ml_prediction_symbol_model_timestamp", "symbol", "model_name", "prediction_timestamp"),
+        # Partial index for resolving due predictions
+        Index(
+            "ix_ml_prediction_unresolved",
+            "prediction_timestamp",
+            postgresql_where=text("actual_price IS NULL"),
+            sqlite_where=text("actual_price IS NULL"),
+        ),
         {"comment": "Stores ML prediction results for backtesting and performance analysis"},
     )
 
@@ -244,6 +257,65 @@ class MLModelPerformance(Base):
         comment="Calculated confidence coefficient (0-1)",
     )
 
+    # === Running Aggregates ===
+    # Updated incrementally as predictions resolve; the metrics above are derived from them
+    error_count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="Resolved predictions with an absolute error",
+    )
+    sum_abs_error: Mapped[float] = mapped_column(
+        Double,
+        nullable=False,
+        default=0.0,
+        server_default="0",
+        comment="Sum of absolute errors",
+    )
+    sum_sq_error: Mapped[float] = mapped_column(
+        Double,
+        nullable=False,
+        default=0.0,
+        server_default="0",
+        comment="Sum of squared errors",
+    )
+    pct_error_count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="Resolved predictions with a percentage error",
+    )
+    sum_abs_pct_error: Mapped[float] = mapped_column(
+        Double,
+        nullable=False,
+        default=0.0,
+        server_default="0",
+        comment="Sum of absolute percentage errors",
+    )
+    direction_count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="Resolved predictions with a direction outcome",
+    )
+    direction_hits: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="Resolved predictions with the correct direction",
+    )
+    sum_confidence: Mapped[float] = mapped_column(
+        Double,
+        nullable=False,
+        default=0.0,
+        server_default="0",
+        comment="Sum of confidence percentages of resolved predictions",
+    )
+
     # === Timestamps ===
     first_prediction_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True),
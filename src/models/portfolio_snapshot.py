@@ -0,0 +1,46 @@
+"""SQLAlchemy model for daily portfolio snapshots."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Double, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+class PortfolioSnapshot(Base):
+    """
+    Database model for daily portfolio value snapshots.
+
+    One row per UTC day holding the latest portfolio value of that day,
+    so the rows form a daily close series for risk metrics that survives
+    restarts.
+    """
+
+    __tablename__ = "portfolio_snapshots"
+
+    day: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        comment="UTC day start as Unix timestamp in milliseconds",
+    )
+    total_value: Mapped[float] = mapped_column(
+        Double,
+        nullable=False,
+        comment="Portfolio value in USDT (latest of the day)",
+    )
+    holdings: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        default="{}",
+        comment="JSON object of holding values in USDT by symbol",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="When the snapshot was last written",
+    )
+
+    def __repr__(self) -> str:
+        return f"<PortfolioSnapshot(day={self.day}, total_value={self.total_value})>"
@@ -4,14 +4,17 @@ Provides data access layer with:
 - BaseRepository with common CRUD operations
 - CandlestickRepository for OHLCV data
 - MLPredictionRepository for ML predictions
+- SignalRepository for trading signal history
 """
 
 from models.repositories.base import BaseRepository
 from models.repositories.candlestick import CandlestickRepository
 from models.repositories.ml_predictions import MLPredictionRepository
+from models.repositories.signals import SignalRepository
 
 __all__ = [
     "BaseRepository",
     "CandlestickRepository",
     "MLPredictionRepository",
+    "SignalRepository",
 ]
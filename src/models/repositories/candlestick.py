@@ -56,6 +56,7 @@ class CandlestickRepository:
                     "quote_volume": candle.quote_volume,
                     "trades_count": candle.trades_count,
                     "fetch_time_ms": result.fetch_time_ms,
+                    "source_raw": None,
                     "is_complete": is_complete,
                     "loaded_at": datetime.now(UTC),
                 }
@@ -77,6 +78,7 @@ class CandlestickRepository:
                     "quote_volume": stmt.excluded.quote_volume,
                     "trades_count": stmt.excluded.trades_count,
                     "fetch_time_ms": stmt.excluded.fetch_time_ms,
+                    "source_raw": stmt.excluded.source_raw,
                     "is_complete": stmt.excluded.is_complete,
                     "loaded_at": stmt.excluded.loaded_at,
                 },
@@ -95,6 +97,7 @@ class CandlestickRepository:
                     "quote_volume": stmt.excluded.quote_volume,
                     "trades_count": stmt.excluded.trades_count,
                     "fetch_time_ms": stmt.excluded.fetch_time_ms,
+                    "source_raw": stmt.excluded.source_raw,
                     "is_complete": stmt.excluded.is_complete,
                     "loaded_at": stmt.excluded.loaded_at,
                 },
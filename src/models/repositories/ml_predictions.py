@@ -2,10 +2,13 @@
 
 import json
 import logging
+import math
+import time
+from collections import defaultdict
 from datetime import UTC, datetime
 from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.ml_predictions import MLModelPerformance, MLPredictionRecord
@@ -13,6 +16,40 @@ from service.ml.models import ForecastResult
 
 logger = logging.getLogger(__name__)
 
+# Fixed-length intervals predictions can be resolved against (calendar months are not)
+RESOLVABLE_INTERVALS_MS: dict[str, int] = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "6h": 21_600_000,
+    "8h": 28_800_000,
+    "12h": 43_200_000,
+    "1d": 86_400_000,
+    "3d": 259_200_000,
+    "1w": 604_800_000,
+}
+
+# Error columns computed from the realized price (:actual / :actual_ts are bound per statement)
+RESOLVE_SET = """
+    actual_price = {actual},
+    actual_timestamp = {actual_ts},
+    absolute_error = ABS({actual} - predicted_price),
+    percentage_error = CASE WHEN {actual} <> 0
+        THEN ({actual} - predicted_price) / {actual} * 100 END,
+    direction_correct = CASE WHEN reference_price IS NOT NULL
+        THEN (predicted_price > reference_price) = ({actual} > reference_price) END
+"""
+
+RESOLVE_RETURNING = """
+    RETURNING symbol, interval, model_name, absolute_error, percentage_error,
+              direction_correct, confidence_percentage
+"""
+
 
 class MLPredictionRepository:
     """Repository for ML prediction CRUD operations."""
@@ -60,9 +97,18 @@ class MLPredictionRepository:
             confidence_low=Decimal(str(forecast.confidence_low[-1])) if forecast.confidence_low else None,
             confidence_high=Decimal(str(forecast.confidence_high[-1])) if forecast.confidence_high else None,
             direction_prediction=forecast.direction,
+            reference_price=Decimal(str(context_prices[-1])) if context_prices else None,
         )
 
         self.session.add(record)
+        performance = await self._get_performance(symbol, interval, model_name)
+        performance.total_predictions = (performance.total_predictions or 0) + 1
+        made_at = datetime.fromtimestamp(prediction_timestamp / 1000, tz=UTC)
+        if performance.first_prediction_at is None or made_at < _aware(performance.first_prediction_at):
+            performance.first_prediction_at = made_at
+        if performance.last_prediction_at is None or made_at > _aware(performance.last_prediction_at):
+            performance.last_prediction_at = made_at
+
         await self.session.commit()
         await self.session.refresh(record)
 
@@ -90,45 +136,168 @@ class MLPredictionRepository:
         Returns:
             Updated MLPredictionRecord
         """
-        stmt = select(MLPredictionRecord).where(MLPredictionRecord.id == prediction_id)
-        result = await self.session.execute(stmt)
-        record = result.scalar_one_or_none()
+        resolved = await self._resolve(
+            "id = :prediction_id AND actual_price IS NULL",
+            {"prediction_id": prediction_id, "actual": actual_price, "actual_ts": actual_timestamp},
+        )
 
+        record = await self.session.get(MLPredictionRecord, prediction_id, populate_existing=True)
         if not record:
             raise ValueError(f"Prediction record {prediction_id} not found")
 
-        # Update actual values
-        record.actual_price = Decimal(str(actual_price))
-        record.actual_timestamp = actual_timestamp
-
-        # Calculate errors
-        if record.predicted_price and record.actual_price:
-            record.absolute_error = abs(record.actual_price - record.predicted_price)
-            if record.actual_price != 0:
-                record.percentage_error = (record.actual_price - record.predicted_price) / record.actual_price * 100
-
-        # Determine direction accuracy
-        if record.context_prices and record.actual_price:
-            try:
-                context_prices = json.loads(record.context_prices)
-                if context_prices:
-                    last_context_price = Decimal(str(context_prices[-1]))
-                    predicted_direction = record.predicted_price > last_context_price
-                    actual_direction = record.actual_price > last_context_price
-                    record.direction_correct = predicted_direction == actual_direction
-            except (json.JSONDecodeError, IndexError):
-                record.direction_correct = None
-
-        await self.session.commit()
-        await self.session.refresh(record)
-
         logger.info(
             f"Updated prediction {prediction_id}: actual {actual_price}, "
             f"error {record.absolute_error}, direction_correct {record.direction_correct}"
+            + ("" if resolved else " (already resolved)")
         )
 
         return record
 
+    async def resolve_predictions(
+        self,
+        symbol: str,
+        interval: str,
+        prediction_timestamp: int,
+        actual_price: float,
+        actual_timestamp: int,
+    ) -> int:
+        """
+        Resolve every unresolved prediction made at a timestamp with one UPDATE.
+
+        Returns:
+            Number of predictions resolved
+        """
+        return await self._resolve(
+            """
+            symbol = :symbol AND interval = :interval
+              AND prediction_timestamp = :prediction_timestamp AND actual_price IS NULL
+            """,
+            {
+                "symbol": symbol,
+                "interval": interval,
+                "prediction_timestamp": prediction_timestamp,
+                "actual": actual_price,
+                "actual_ts": actual_timestamp,
+            },
+        )
+
+    async def resolve_due_predictions(self, now_ms: int | None = None) -> int:
+        """
+        Resolve all predictions whose target candle has closed.
+
+        The target is the candle containing prediction_timestamp +
+        horizon * interval; its close (first exchange alphabetically) is
+        the realized price. Resolution, error columns and direction are
+        set by one UPDATE joined against candlestick_records; model
+        aggregates are then advanced by the resolved rows only.
+
+        Args:
+            now_ms: Current time in ms
+
+        Returns:
+            Number of predictions resolved
+        """
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        intervals = ", ".join(f"('{name}', {ms})" for name, ms in RESOLVABLE_INTERVALS_MS.items())
+        statement = f"""
+            WITH iv (name, ms) AS (VALUES {intervals}),
+            due AS (
+                SELECT pid, actual, actual_ts FROM (
+                    SELECT p.id AS pid,
+                           p.prediction_timestamp + p.prediction_horizon * iv.ms AS actual_ts,
+                           (SELECT c.close_price FROM candlestick_records c
+                            WHERE c.symbol = p.symbol AND c.interval = p.interval
+                              AND c.timestamp > p.prediction_timestamp + (p.prediction_horizon - 1) * iv.ms
+                              AND c.timestamp <= p.prediction_timestamp + p.prediction_horizon * iv.ms
+                            ORDER BY c.timestamp DESC, c.exchange
+                            LIMIT 1) AS actual
+                    FROM ml_prediction_records p
+                    JOIN iv ON iv.name = p.interval
+                    WHERE p.actual_price IS NULL
+                      AND p.prediction_timestamp + (p.prediction_horizon + 1) * iv.ms <= :now
+                ) candidates
+                WHERE actual IS NOT NULL
+            )
+            UPDATE ml_prediction_records
+            SET {RESOLVE_SET.format(actual="due.actual", actual_ts="due.actual_ts")}
+            FROM due
+            WHERE ml_prediction_records.id = due.pid
+            {RESOLVE_RETURNING}
+        """
+        result = await self.session.execute(text(statement), {"now": now_ms})
+        resolved = await self._apply_resolved(result.fetchall())
+        if resolved:
+            logger.info(f"Resolved {resolved} due ML predictions")
+        return resolved
+
+    async def _resolve(self, where: str, params: dict) -> int:
+        """Resolve predictions matching a filter with an explicit actual price."""
+        statement = f"""
+            UPDATE ml_prediction_records
+            SET {RESOLVE_SET.format(actual="CAST(:actual AS NUMERIC)", actual_ts=":actual_ts")}
+            WHERE {where}
+            {RESOLVE_RETURNING}
+        """
+        result = await self.session.execute(text(statement), params)
+        return await self._apply_resolved(result.fetchall())
+
+    async def _apply_resolved(self, rows: list) -> int:
+        """
+        Advance model aggregates by newly resolved predictions and commit.
+
+        Args:
+            rows: (symbol, interval, model_name, absolute_error, percentage_error,
+                   direction_correct, confidence_percentage) of resolved rows
+        """
+        groups: dict[tuple[str, str, str], list] = defaultdict(list)
+        for row in rows:
+            groups[(row[0], row[1], row[2])].append(row)
+
+        now = datetime.now(UTC)
+        for (symbol, interval, model_name), resolved in groups.items():
+            performance = await self._get_performance(symbol, interval, model_name)
+            performance.evaluated_predictions = (performance.evaluated_predictions or 0) + len(resolved)
+            for _, _, _, abs_error, pct_error, direction, confidence in resolved:
+                if abs_error is not None:
+                    performance.error_count = (performance.error_count or 0) + 1
+                    performance.sum_abs_error = (performance.sum_abs_error or 0.0) + float(abs_error)
+                    performance.sum_sq_error = (performance.sum_sq_error or 0.0) + float(abs_error) ** 2
+                if pct_error is not None:
+                    performance.pct_error_count = (performance.pct_error_count or 0) + 1
+                    performance.sum_abs_pct_error = (performance.sum_abs_pct_error or 0.0) + abs(float(pct_error))
+                if direction is not None:
+                    performance.direction_count = (performance.direction_count or 0) + 1
+                    performance.direction_hits = (performance.direction_hits or 0) + int(bool(direction))
+                if confidence is not None:
+                    performance.sum_confidence = (performance.sum_confidence or 0.0) + float(confidence)
+            _refresh_metrics(performance)
+            performance.last_evaluation_at = now
+
+        await self.session.commit()
+        return len(rows)
+
+    async def _get_performance(self, symbol: str, interval: str, model_name: str) -> MLModelPerformance:
+        """Get the performance row of a model, creating an empty one."""
+        performance = await self.session.get(MLModelPerformance, (symbol, model_name, interval))
+        if performance is None:
+            performance = MLModelPerformance(
+                symbol=symbol,
+                model_name=model_name,
+                interval=interval,
+                total_predictions=0,
+                evaluated_predictions=0,
+                error_count=0,
+                sum_abs_error=0.0,
+                sum_sq_error=0.0,
+                pct_error_count=0,
+                sum_abs_pct_error=0.0,
+                direction_count=0,
+                direction_hits=0,
+                sum_confidence=0.0,
+            )
+            self.session.add(performance)
+        return performance
+
     async def get_unresolved_predictions(
         self,
         symbol: str | None = None,
@@ -203,9 +372,13 @@ class MLPredictionRepository:
         symbol: str,
         interval: str,
         model_name: str,
-    ) -> MLModelPerformance:
+    ) -> MLModelPerformance | None:
         """
-        Calculate and update performance statistics for a model.
+        Rebuild performance statistics for a model from its predictions.
+
+        Aggregates are normally advanced incrementally as predictions
+        resolve; this recomputes them with one aggregate query (e.g. after
+        predictions were edited or deleted).
 
         Args:
             symbol: Trading pair symbol
@@ -213,108 +386,69 @@ class MLPredictionRepository:
             model_name: ML model name
 
         Returns:
-            Updated MLModelPerformance record
+            Updated MLModelPerformance record, None if no prediction is evaluated yet
         """
-        # Get all evaluated predictions
-        predictions = await self.get_predictions_for_backtesting(
-            symbol=symbol,
-            interval=interval,
-            model_name=model_name,
-        )
-
-        if not predictions:
+        p = MLPredictionRecord
+        resolved = p.actual_price.isnot(None)
+        stmt = select(
+            func.count(),
+            func.count().filter(resolved),
+            func.count(p.absolute_error),
+            func.sum(func.abs(p.absolute_error)),
+            func.sum(p.absolute_error * p.absolute_error),
+            func.count(p.percentage_error),
+            func.sum(func.abs(p.percentage_error)),
+            func.count(p.direction_correct),
+            func.count().filter(p.direction_correct.is_(True)),
+            func.sum(p.confidence_percentage).filter(resolved),
+            func.min(p.prediction_timestamp),
+            func.max(p.prediction_timestamp),
+        ).where(p.symbol == symbol, p.interval == interval, p.model_name == model_name)
+        (
+            total,
+            evaluated,
+            error_count,
+            sum_abs,
+            sum_sq,
+            pct_count,
+            sum_pct,
+            direction_count,
+            hits,
+            sum_confidence,
+            first_ts,
+            last_ts,
+        ) = (await self.session.execute(stmt)).one()
+
+        if not evaluated:
             logger.warning(f"No evaluated predictions for {symbol} {interval} {model_name}")
             return None
 
-        # Calculate metrics
-        total_predictions = len(predictions)
-        evaluated_predictions = len([p for p in predictions if p.actual_price is not None])
-
-        if evaluated_predictions == 0:
-            logger.warning("No evaluated predictions with actual prices")
-            return None
-
-        # Error calculations
-        absolute_errors = [float(p.absolute_error) for p in predictions if p.absolute_error is not None]
-        percentage_errors = [float(p.percentage_error) for p in predictions if p.percentage_error is not None]
-        direction_correct = [p.direction_correct for p in predictions if p.direction_correct is not None]
-
-        mean_absolute_error = Decimal(str(sum(absolute_errors) / len(absolute_errors))) if absolute_errors else None
-        mean_percentage_error = (
-            Decimal(str(sum(percentage_errors) / len(percentage_errors))) if percentage_errors else None
-        )
-        direction_accuracy = (
-            Decimal(str(sum(direction_correct) / len(direction_correct) * 100)) if direction_correct else None
-        )
-
-        # RMSE calculation
-        squared_errors = [e**2 for e in absolute_errors]
-        rmse = Decimal(str((sum(squared_errors) / len(squared_errors)) ** 0.5)) if squared_errors else None
-
-        # MAPE calculation (avoid division by zero)
-        abs_percentage_errors = [abs(e) for e in percentage_errors]
-        mape = Decimal(str(sum(abs_percentage_errors) / len(abs_percentage_errors))) if abs_percentage_errors else None
-
-        # Confidence statistics
-        confidences = [p.confidence_percentage for p in predictions if p.confidence_percentage is not None]
-        avg_confidence = Decimal(str(sum(confidences) / len(confidences))) if confidences else None
-
-        # Calculate confidence coefficient (0-1 scale)
-        # Based on accuracy, direction accuracy, and error magnitude
-        if mean_absolute_error and direction_accuracy:
-            # Normalize MAE (assuming typical crypto price ranges)
-            normalized_mae = float(mean_absolute_error) / 1000  # Adjust based on typical price scales
-            error_score = 1 / (1 + normalized_mae)
-            accuracy_score = float(direction_accuracy) / 100
-            confidence_coefficient = Decimal(str(0.7 * error_score + 0.3 * accuracy_score))
-        else:
-            confidence_coefficient = None
-
-        # Get timing information
-        first_pred = min(predictions, key=lambda p: p.prediction_timestamp)
-        last_pred = max(predictions, key=lambda p: p.prediction_timestamp)
-
-        # Upsert performance record
-        stmt = select(MLModelPerformance).where(
-            MLModelPerformance.symbol == symbol,
-            MLModelPerformance.model_name == model_name,
-            MLModelPerformance.interval == interval,
-        )
-
-        result = await self.session.execute(stmt)
-        performance_record = result.scalar_one_or_none()
-
-        if performance_record is None:
-            performance_record = MLModelPerformance(
-                symbol=symbol,
-                model_name=model_name,
-                interval=interval,
-            )
-            self.session.add(performance_record)
-
-        # Update all fields
-        performance_record.total_predictions = total_predictions
-        performance_record.evaluated_predictions = evaluated_predictions
-        performance_record.mean_absolute_error = mean_absolute_error
-        performance_record.root_mean_square_error = rmse
-        performance_record.mean_absolute_percentage_error = mape
-        performance_record.direction_accuracy = direction_accuracy
-        performance_record.average_confidence = avg_confidence
-        performance_record.confidence_coefficient = confidence_coefficient
-        performance_record.first_prediction_at = datetime.fromtimestamp(first_pred.prediction_timestamp / 1000, tz=UTC)
-        performance_record.last_prediction_at = datetime.fromtimestamp(last_pred.prediction_timestamp / 1000, tz=UTC)
-        performance_record.last_evaluation_at = datetime.now(UTC)
+        performance = await self._get_performance(symbol, interval, model_name)
+        performance.total_predictions = total
+        performance.evaluated_predictions = evaluated
+        performance.error_count = error_count
+        performance.sum_abs_error = float(sum_abs or 0)
+        performance.sum_sq_error = float(sum_sq or 0)
+        performance.pct_error_count = pct_count
+        performance.sum_abs_pct_error = float(sum_pct or 0)
+        performance.direction_count = direction_count
+        performance.direction_hits = hits
+        performance.sum_confidence = float(sum_confidence or 0)
+        _refresh_metrics(performance)
+        performance.first_prediction_at = datetime.fromtimestamp(first_ts / 1000, tz=UTC)
+        performance.last_prediction_at = datetime.fromtimestamp(last_ts / 1000, tz=UTC)
+        performance.last_evaluation_at = datetime.now(UTC)
 
         await self.session.commit()
-        await self.session.refresh(performance_record)
+        await self.session.refresh(performance)
 
         logger.info(
             f"Updated performance for {symbol} {interval} {model_name}: "
-            f"MAE={mean_absolute_error}, Direction Acc={direction_accuracy}%, "
-            f"Confidence Coeff={confidence_coefficient}"
+            f"MAE={performance.mean_absolute_error}, Direction Acc={performance.direction_accuracy}%, "
+            f"Confidence Coeff={performance.confidence_coefficient}"
         )
 
-        return performance_record
+        return performance
 
     async def get_model_rankings(
         self,
@@ -390,3 +524,35 @@ class MLPredictionRepository:
 
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
+
+
+def _aware(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; treat them as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+def _refresh_metrics(performance: MLModelPerformance) -> None:
+    """Derive the stored metrics from a model's running aggregates."""
+    errors = performance.error_count or 0
+    mae = performance.sum_abs_error / errors if errors else None
+    performance.mean_absolute_error = Decimal(str(mae)) if mae is not None else None
+    performance.root_mean_square_error = (
+        Decimal(str(math.sqrt(performance.sum_sq_error / errors))) if errors else None
+    )
+    pct = performance.pct_error_count or 0
+    performance.mean_absolute_percentage_error = (
+        Decimal(str(performance.sum_abs_pct_error / pct)) if pct else None
+    )
+    directions = performance.direction_count or 0
+    accuracy = performance.direction_hits / directions * 100 if directions else None
+    performance.direction_accuracy = Decimal(str(accuracy)) if accuracy is not None else None
+    evaluated = performance.evaluated_predictions or 0
+    performance.average_confidence = Decimal(str(performance.sum_confidence / evaluated)) if evaluated else None
+
+    # Confidence coefficient (0-1): error magnitude and direction accuracy
+    if mae and accuracy:
+        # Normalize MAE (assuming typical crypto price ranges)
+        error_score = 1 / (1 + mae / 1000)
+        performance.confidence_coefficient = Decimal(str(0.7 * error_score + 0.3 * accuracy / 100))
+    else:
+        performance.confidence_coefficient = None
@@ -0,0 +1,302 @@
+"""Repository for trading signal history."""
+
+import logging
+import time
+from collections import defaultdict
+from datetime import UTC, datetime
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.signal import SignalRecord, SignalStatsRecord
+
+logger = logging.getLogger(__name__)
+
+HOUR_MS = 3_600_000
+
+# Outcome horizons: column suffix -> milliseconds after the signal
+OUTCOME_HORIZONS_MS: dict[str, int] = {
+    "24h": 24 * HOUR_MS,
+    "7d": 7 * 24 * HOUR_MS,
+}
+
+# Realized price: close of the stored candle containing signal time + horizon
+OUTCOME_CANDLE_INTERVAL = "1h"
+OUTCOME_CANDLE_MS = HOUR_MS
+QUOTE_CURRENCY = "USDT"
+
+# Current prices only stand in for horizons that ended within the last run
+# of signal_history_job (hourly); older signals are no longer priced fairly
+OUTCOME_PRICE_WINDOW_MS = HOUR_MS
+
+# Move (%) in the predicted direction counted as a win, against it as a loss
+OUTCOME_THRESHOLD_PCT = 2.0
+
+OUTCOME_CASE = f"""
+    CASE
+        WHEN signal_type IN ('buy', 'strong_buy') THEN
+            CASE WHEN {{pnl}} >= {OUTCOME_THRESHOLD_PCT} THEN 'win'
+                 WHEN {{pnl}} <= -{OUTCOME_THRESHOLD_PCT} THEN 'loss' ELSE 'neutral' END
+        WHEN signal_type IN ('sell', 'strong_sell') THEN
+            CASE WHEN {{pnl}} <= -{OUTCOME_THRESHOLD_PCT} THEN 'win'
+                 WHEN {{pnl}} >= {OUTCOME_THRESHOLD_PCT} THEN 'loss' ELSE 'neutral' END
+        ELSE 'neutral'
+    END
+"""
+
+
+def _resolve_set(horizon: str, price: str) -> str:
+    """SET clause resolving one horizon from a realized price expression."""
+    pnl = f"(({price}) - price_at_signal) / price_at_signal * 100"
+    # The other horizon's column is read before the update (old row values)
+    effective = pnl if horizon == "7d" else f"COALESCE(pnl_7d_pct, {pnl})"
+    return f"""
+        price_after_{horizon} = {price},
+        pnl_{horizon}_pct = {pnl},
+        outcome_{horizon} = {OUTCOME_CASE.format(pnl=pnl)},
+        effective_pnl = {effective}
+    """
+
+
+class SignalRepository:
+    """Repository for signal records and their running statistics."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(
+        self,
+        symbol: str,
+        signal_type: str,
+        source: str,
+        created_at: int,
+        price: float,
+        confidence: int,
+        description: str,
+        description_ru: str,
+    ) -> SignalRecord:
+        """Insert a signal and count it in the running statistics."""
+        record = SignalRecord(
+            symbol=symbol,
+            signal_type=signal_type,
+            source=source,
+            created_at=created_at,
+            price_at_signal=price,
+            confidence=confidence,
+            description=description,
+            description_ru=description_ru,
+            outcome_24h="pending",
+            outcome_7d="pending",
+        )
+        self.session.add(record)
+        await self.session.flush()
+
+        await self.session.execute(
+            text("""
+                INSERT INTO signal_stats (source, signal_type, recorded, updated_at)
+                VALUES (:source, :signal_type, 1, :now)
+                ON CONFLICT (source, signal_type) DO UPDATE SET
+                    recorded = signal_stats.recorded + 1,
+                    updated_at = excluded.updated_at
+            """),
+            {"source": source, "signal_type": signal_type, "now": datetime.now(UTC)},
+        )
+        await self.session.commit()
+        return record
+
+    async def get(self, record_id: int) -> SignalRecord | None:
+        """Get signal by number."""
+        return await self.session.get(SignalRecord, record_id)
+
+    async def find(
+        self,
+        symbol: str | None = None,
+        source: str | None = None,
+        since: int | None = None,
+        limit: int = 50,
+    ) -> list[SignalRecord]:
+        """Newest signals first, filtered on indexed columns."""
+        stmt = select(SignalRecord)
+        if symbol:
+            stmt = stmt.where(SignalRecord.symbol == symbol)
+        if source:
+            stmt = stmt.where(SignalRecord.source == source)
+        if since is not None:
+            stmt = stmt.where(SignalRecord.created_at >= since)
+        stmt = stmt.order_by(SignalRecord.created_at.desc(), SignalRecord.id.desc()).limit(limit)
+
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def count_since(self, since: int) -> int:
+        """Number of signals recorded since a timestamp (ms)."""
+        result = await self.session.execute(
+            select(func.count()).select_from(SignalRecord).where(SignalRecord.created_at >= since)
+        )
+        return int(result.scalar() or 0)
+
+    async def get_stats_rows(self) -> list[SignalStatsRecord]:
+        """Running statistics of every (source, signal type)."""
+        result = await self.session.execute(select(SignalStatsRecord))
+        return list(result.scalars().all())
+
+    async def best_and_worst(self) -> tuple[SignalRecord | None, SignalRecord | None]:
+        """Signals with the highest and lowest effective P&L."""
+        ranked = select(SignalRecord).where(SignalRecord.effective_pnl.is_not(None)).limit(1)
+        best = (await self.session.execute(ranked.order_by(SignalRecord.effective_pnl.desc()))).scalar()
+        worst = (await self.session.execute(ranked.order_by(SignalRecord.effective_pnl.asc()))).scalar()
+        return best, worst
+
+    async def resolve_from_candles(self, now_ms: int | None = None) -> int:
+        """
+        Resolve due outcomes from stored candles.
+
+        For every horizon one UPDATE joins the pending signals whose target
+        candle has closed against candlestick_records; running statistics
+        are then advanced by the resolved rows only.
+
+        Args:
+            now_ms: Current time in ms
+
+        Returns:
+            Number of outcomes resolved
+        """
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        resolved = 0
+        for horizon, horizon_ms in OUTCOME_HORIZONS_MS.items():
+            statement = f"""
+                WITH due AS (
+                    SELECT sid, price FROM (
+                        SELECT s.id AS sid,
+                               (SELECT c.close_price FROM candlestick_records c
+                                WHERE c.symbol = s.symbol || '/{QUOTE_CURRENCY}'
+                                  AND c.interval = '{OUTCOME_CANDLE_INTERVAL}'
+                                  AND c.timestamp > s.created_at + {horizon_ms - OUTCOME_CANDLE_MS}
+                                  AND c.timestamp <= s.created_at + {horizon_ms}
+                                ORDER BY c.timestamp DESC, c.exchange
+                                LIMIT 1) AS price
+                        FROM signal_records s
+                        WHERE s.outcome_{horizon} = 'pending' AND s.price_at_signal > 0
+                          AND s.created_at <= :cutoff
+                    ) candidates
+                    WHERE price IS NOT NULL
+                )
+                UPDATE signal_records
+                SET {_resolve_set(horizon, "CAST(due.price AS DOUBLE PRECISION)")}
+                FROM due
+                WHERE signal_records.id = due.sid
+                RETURNING source, signal_type, outcome_{horizon}, pnl_{horizon}_pct
+            """
+            cutoff = now_ms - horizon_ms - OUTCOME_CANDLE_MS
+            result = await self.session.execute(text(statement), {"cutoff": cutoff})
+            resolved += await self._apply_resolved(horizon, result.fetchall())
+
+        await self.session.commit()
+        if resolved:
+            logger.info(f"Resolved {resolved} signal outcomes from candles")
+        return resolved
+
+    async def resolve_from_prices(
+        self,
+        prices: dict[str, float],
+        now_ms: int | None = None,
+        window_ms: int = OUTCOME_PRICE_WINDOW_MS,
+    ) -> int:
+        """
+        Resolve due outcomes of symbols without stored candles from current prices.
+
+        Symbols with 1h candles are left to resolve_from_candles even when a
+        candle is missing, and only horizons that ended within the last
+        window are resolved: the current price is not the realized price of
+        a horizon that ended long ago.
+
+        Args:
+            prices: Current prices by base symbol
+            now_ms: Current time in ms
+            window_ms: Resolve horizons that ended within this window (ms)
+
+        Returns:
+            Number of outcomes resolved
+        """
+        prices = {symbol.upper(): price for symbol, price in prices.items() if price and price > 0}
+        if not prices:
+            return 0
+
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        params: dict = {}
+        values = []
+        for i, (symbol, price) in enumerate(prices.items()):
+            values.append(f"(CAST(:s{i} AS VARCHAR(20)), CAST(:p{i} AS DOUBLE PRECISION))")
+            params[f"s{i}"] = symbol
+            params[f"p{i}"] = price
+
+        resolved = 0
+        for horizon, horizon_ms in OUTCOME_HORIZONS_MS.items():
+            statement = f"""
+                WITH px (symbol, price) AS (VALUES {", ".join(values)})
+                UPDATE signal_records
+                SET {_resolve_set(horizon, "px.price")}
+                FROM px
+                WHERE signal_records.symbol = px.symbol
+                  AND signal_records.outcome_{horizon} = 'pending'
+                  AND signal_records.price_at_signal > 0
+                  AND signal_records.created_at <= :cutoff
+                  AND signal_records.created_at > :cutoff - :window
+                  AND NOT EXISTS (
+                      SELECT 1 FROM candlestick_records c
+                      WHERE c.symbol = signal_records.symbol || '/{QUOTE_CURRENCY}'
+                        AND c.interval = '{OUTCOME_CANDLE_INTERVAL}'
+                  )
+                RETURNING source, signal_type, outcome_{horizon}, pnl_{horizon}_pct
+            """
+            cutoff = now_ms - horizon_ms - OUTCOME_CANDLE_MS
+            result = await self.session.execute(text(statement), {**params, "cutoff": cutoff, "window": window_ms})
+            resolved += await self._apply_resolved(horizon, result.fetchall())
+
+        await self.session.commit()
+        if resolved:
+            logger.info(f"Resolved {resolved} signal outcomes from current prices")
+        return resolved
+
+    async def _apply_resolved(self, horizon: str, rows: list) -> int:
+        """
+        Advance running statistics by newly resolved outcomes.
+
+        Args:
+            horizon: "24h" or "7d"
+            rows: (source, signal_type, outcome, pnl) of resolved rows
+        """
+        groups: dict[tuple[str, str], list[int | float]] = defaultdict(lambda: [0, 0, 0, 0.0])
+        for source, signal_type, outcome, pnl in rows:
+            group = groups[(source, signal_type)]
+            group[0] += 1
+            group[1] += outcome == "win"
+            group[2] += outcome == "loss"
+            group[3] += float(pnl or 0.0)
+
+        now = datetime.now(UTC)
+        for (source, signal_type), (count, wins, losses, sum_pnl) in groups.items():
+            await self.session.execute(
+                text(f"""
+                    INSERT INTO signal_stats
+                        (source, signal_type, resolved_{horizon}, wins_{horizon},
+                         losses_{horizon}, sum_pnl_{horizon}, updated_at)
+                    VALUES (:source, :signal_type, :count, :wins, :losses, :sum_pnl, :now)
+                    ON CONFLICT (source, signal_type) DO UPDATE SET
+                        resolved_{horizon} = signal_stats.resolved_{horizon} + excluded.resolved_{horizon},
+                        wins_{horizon} = signal_stats.wins_{horizon} + excluded.wins_{horizon},
+                        losses_{horizon} = signal_stats.losses_{horizon} + excluded.losses_{horizon},
+                        sum_pnl_{horizon} = signal_stats.sum_pnl_{horizon} + excluded.sum_pnl_{horizon},
+                        updated_at = excluded.updated_at
+                """),
+                {
+                    "source": source,
+                    "signal_type": signal_type,
+                    "count": count,
+                    "wins": wins,
+                    "losses": losses,
+                    "sum_pnl": sum_pnl,
+                    "now": now,
+                },
+            )
+        return len(rows)
@@ -1,22 +1,89 @@
 from collections.abc import AsyncGenerator
 
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 
 from core.config import settings
 
-# Create async engine with connection pool settings optimized for long-running app
-# pool_pre_ping: Check connection validity before using (handles stale connections)
-# pool_recycle: Recycle connections after N seconds (avoid stale connections)
-# For PgBouncer: use NullPool to let PgBouncer handle pooling
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,  # Check connection before using
-    pool_recycle=300,  # Recycle connections every 5 minutes
-    pool_size=5,  # Base pool size
-    max_overflow=10,  # Allow up to 10 additional connections
-)
+IS_SQLITE = make_url(settings.DATABASE_URL).get_backend_name() == "sqlite"
+
+
+def sqlite_pragmas() -> dict[str, str | int]:
+    """
+    Connection pragmas of the SQLite performance profile.
+
+    WAL lets readers run alongside the single writer, synchronous=NORMAL
+    only fsyncs at checkpoints (safe in WAL mode), and mmap/cache keep
+    hot pages out of read() calls.
+    """
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+        "mmap_size": settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_MB * 1024,  # negative = KiB
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+
+
+def configure_sqlite_engine(engine, begin: str = "BEGIN") -> None:
+    """
+    Apply the SQLite profile to an engine.
+
+    pysqlite/aiosqlite open transactions lazily and break SAVEPOINT; the
+    driver's own transaction handling is disabled and BEGIN is emitted
+    explicitly instead. The writer engine uses BEGIN IMMEDIATE so the write
+    lock is taken up front instead of failing on a read-to-write upgrade.
+    """
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _on_begin(conn) -> None:
+        conn.exec_driver_sql(begin)
+
+
+if IS_SQLITE:
+    # Read pool; writes should go through models.writer (single writer task)
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        pool_size=5,
+        max_overflow=10,
+    )
+    configure_sqlite_engine(engine)
+
+    # One connection: every write transaction is serialized here
+    write_engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        pool_size=1,
+        max_overflow=0,
+    )
+    configure_sqlite_engine(write_engine, begin="BEGIN IMMEDIATE")
+else:
+    # Create async engine with connection pool settings optimized for long-running app
+    # pool_pre_ping: Check connection validity before using (handles stale connections)
+    # pool_recycle: Recycle connections after N seconds (avoid stale connections)
+    # For PgBouncer: use NullPool to let PgBouncer handle pooling
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        pool_pre_ping=True,  # Check connection before using
+        pool_recycle=300,  # Recycle connections every 5 minutes
+        pool_size=5,  # Base pool size
+        max_overflow=10,  # Allow up to 10 additional connections
+    )
+    write_engine = engine
 
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -0,0 +1,158 @@
+"""SQLAlchemy models for trading signal history."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Double, Index, Integer, String, Text, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+class SignalRecord(Base):
+    """
+    Database model for recorded trading signals and their outcomes.
+
+    Outcomes are resolved in bulk against stored candles 24h and 7d after
+    the signal; partial indexes keep the pending rows cheap to find.
+    """
+
+    __tablename__ = "signal_records"
+
+    # === Primary Key ===
+    id: Mapped[int] = mapped_column(
+        # SQLite only autoincrements INTEGER PRIMARY KEY
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+        comment="Signal number (public id is sig_<number>)",
+    )
+
+    # === Signal ===
+    symbol: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        comment="Base asset symbol (e.g., BTC)",
+    )
+    signal_type: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        comment="buy, sell, strong_buy, strong_sell or neutral",
+    )
+    source: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        comment="Signal source (divergence, pattern, indicator, ...)",
+    )
+    created_at: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="Signal time as Unix timestamp in milliseconds",
+    )
+    price_at_signal: Mapped[float] = mapped_column(
+        Double,
+        nullable=False,
+        comment="Price when the signal was generated",
+    )
+    confidence: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=50,
+        comment="Signal confidence (0-100)",
+    )
+    description: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    description_ru: Mapped[str] = mapped_column(Text, nullable=False, default="")
+
+    # === Outcomes ===
+    outcome_24h: Mapped[str] = mapped_column(
+        String(10),
+        nullable=False,
+        default="pending",
+        server_default="pending",
+        comment="pending, win, loss or neutral after 24h",
+    )
+    outcome_7d: Mapped[str] = mapped_column(
+        String(10),
+        nullable=False,
+        default="pending",
+        server_default="pending",
+        comment="pending, win, loss or neutral after 7d",
+    )
+    price_after_24h: Mapped[float | None] = mapped_column(Double, nullable=True)
+    price_after_7d: Mapped[float | None] = mapped_column(Double, nullable=True)
+    pnl_24h_pct: Mapped[float | None] = mapped_column(Double, nullable=True)
+    pnl_7d_pct: Mapped[float | None] = mapped_column(Double, nullable=True)
+    effective_pnl: Mapped[float | None] = mapped_column(
+        Double,
+        nullable=True,
+        comment="7d P&L if resolved, else 24h P&L (best/worst signal ranking)",
+    )
+
+    __table_args__ = (
+        # Per-symbol history and outcome filters
+        Index("ix_signal_symbol_created_outcome", "symbol", "created_at", "outcome_7d"),
+        # Time range queries across symbols
+        Index("ix_signal_created_at", "created_at"),
+        # Best/worst signal
+        Index("ix_signal_effective_pnl", "effective_pnl"),
+        # Partial indexes for resolving due outcomes
+        Index(
+            "ix_signal_pending_24h",
+            "created_at",
+            postgresql_where=text("outcome_24h = 'pending'"),
+            sqlite_where=text("outcome_24h = 'pending'"),
+        ),
+        Index(
+            "ix_signal_pending_7d",
+            "created_at",
+            postgresql_where=text("outcome_7d = 'pending'"),
+            sqlite_where=text("outcome_7d = 'pending'"),
+        ),
+        {"comment": "Trading signals with 24h/7d outcome tracking"},
+    )
+
+    def __repr__(self) -> str:
+        return f"<SignalRecord(id={self.id}, symbol={self.symbol!r}, type={self.signal_type!r})>"
+
+
+class SignalStatsRecord(Base):
+    """
+    Running signal statistics per source and signal type.
+
+    Advanced when signals are recorded and when outcomes resolve, so win
+    rates and average P&L never require a scan of the history.
+    """
+
+    __tablename__ = "signal_stats"
+
+    source: Mapped[str] = mapped_column(String(20), primary_key=True)
+    signal_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+
+    recorded: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0", comment="Signals recorded"
+    )
+    resolved_24h: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0", comment="Signals with a 24h outcome"
+    )
+    wins_24h: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    losses_24h: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    sum_pnl_24h: Mapped[float] = mapped_column(
+        Double, nullable=False, default=0.0, server_default="0", comment="Sum of 24h P&L percentages"
+    )
+    resolved_7d: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0", comment="Signals with a 7d outcome"
+    )
+    wins_7d: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    losses_7d: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    sum_pnl_7d: Mapped[float] = mapped_column(
+        Double, nullable=False, default=0.0, server_default="0", comment="Sum of 7d P&L percentages"
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<SignalStatsRecord(source={self.source!r}, type={self.signal_type!r}, recorded={self.recorded})>"
@@ -0,0 +1,299 @@
+"""
+Single-writer queue for database writes.
+
+SQLite allows one writer at a time. With many tasks opening their own
+write sessions (candle buffer, sync jobs, sensor state saves, ML
+predictions, backfill) they contend for the lock and fail with
+"database is locked". In the SQLite profile every write submitted here
+runs on one dedicated connection from one task, and queued writes are
+grouped into a single transaction:
+
+- repository code that calls session.commit() keeps working: the commit
+  is deferred to the batch, which commits once, so one fsync covers many
+  writes
+- if any write in a batch fails (or rolls back), nothing of the batch is
+  committed and each write is re-run in its own transaction, so one bad
+  write never discards the others; write functions must therefore only
+  touch the database
+- each write function runs in a copy of its submitter's context, so
+  context variables (e.g. the scheduler job counting DB statements) see
+  the write as part of the task that submitted it
+
+On PostgreSQL concurrent writers are fine and writes run directly in
+their own session.
+
+Usage:
+    from models.writer import run_write
+
+    async def save(session):
+        await SensorStateRepository(session).upsert(unique_id, name, value)
+
+    await run_write(save)
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+WriteFn = Callable[[AsyncSession], Awaitable[Any]]
+
+# Writes grouped into one transaction at most
+MAX_BATCH_SIZE = 200
+
+
+@dataclass
+class WriterStats:
+    """Write queue counters."""
+
+    writes: int = 0
+    failed: int = 0
+    batches: int = 0
+    batch_errors: int = 0
+    batch_retries: int = 0
+    largest_batch: int = 0
+    total_wait_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "writes": self.writes,
+            "failed": self.failed,
+            "batches": self.batches,
+            "batch_errors": self.batch_errors,
+            "batch_retries": self.batch_retries,
+            "largest_batch": self.largest_batch,
+            "avg_batch_size": round(self.writes / self.batches, 2) if self.batches else 0,
+            "avg_wait_ms": round(self.total_wait_ms / self.writes, 2) if self.writes else 0,
+        }
+
+
+class _BatchAborted(Exception):
+    """A write in a batch failed or rolled back the shared transaction."""
+
+
+@dataclass
+class _Job:
+    fn: WriteFn
+    future: asyncio.Future
+    queued_at: float
+    context: contextvars.Context = field(default_factory=contextvars.copy_context)
+
+    async def run(self, session: AsyncSession) -> Any:
+        """Run the write in the submitter's context rather than the writer task's."""
+        return await asyncio.get_running_loop().create_task(self.fn(session), context=self.context)
+
+
+class WriteQueue:
+    """Serializes writes on one connection and batches them into transactions."""
+
+    def __init__(self, engine, max_batch_size: int = MAX_BATCH_SIZE):
+        """
+        Initialize queue.
+
+        Args:
+            engine: Async engine of the writer connection
+            max_batch_size: Writes grouped into one transaction at most
+        """
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.stats = WriterStats()
+        self._queue: asyncio.Queue[_Job] | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            # Empty context: the writer must not inherit the first submitter's context variables
+            self._task = loop.create_task(self._run(self._queue), name="db-writer", context=contextvars.Context())
+        return self._queue
+
+    @property
+    def pending(self) -> int:
+        """Writes waiting in the queue."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, fn: WriteFn) -> Any:
+        """
+        Queue a write and wait for its batch to commit.
+
+        Args:
+            fn: Coroutine function receiving the session; must not keep
+                references to the session after returning
+
+        Returns:
+            Whatever fn returned
+
+        Raises:
+            Exception raised by fn, or the batch commit error
+        """
+        queue = self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put(_Job(fn, future, time.perf_counter()))
+        return await future
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.max_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._write_batch(batch)
+            except Exception as e:
+                self.stats.batch_errors += 1
+                logger.error(f"[Writer] Batch of {len(batch)} writes failed: {e}")
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _execute(self, jobs: list[_Job], strict: bool) -> list[Any]:
+        """
+        Run jobs in one transaction and commit it.
+
+        Sessions join the transaction in rollback_only mode: a job's
+        session.commit() is deferred to the batch commit, its rollback()
+        rolls back the whole transaction.
+
+        Args:
+            jobs: Writes to run
+            strict: Raise _BatchAborted if any job fails or rolls back
+
+        Returns:
+            Job results in order
+        """
+        results = []
+        async with self.engine.connect() as conn:
+            transaction = await conn.begin()
+            try:
+                for job in jobs:
+                    async with AsyncSession(
+                        bind=conn, expire_on_commit=False, join_transaction_mode="rollback_only"
+                    ) as session:
+                        try:
+                            results.append(await job.run(session))
+                            await session.commit()
+                        except Exception as e:
+                            if strict:
+                                raise _BatchAborted() from e
+                            raise
+                    if not transaction.is_active:
+                        if strict:
+                            raise _BatchAborted()
+                        # The job handled its own error and rolled back (e.g. repository upsert)
+                        return results
+                await transaction.commit()
+            except BaseException:
+                if transaction.is_active:
+                    await transaction.rollback()
+                raise
+        return results
+
+    async def _write_batch(self, batch: list[_Job]) -> None:
+        started = time.perf_counter()
+        outcomes: list[tuple[_Job, Any, BaseException | None]] = []
+
+        if len(batch) > 1:
+            try:
+                results = await self._execute(batch, strict=True)
+                outcomes = [(job, result, None) for job, result in zip(batch, results, strict=True)]
+                self.stats.batches += 1
+            except _BatchAborted:
+                # Nothing was committed: run each write on its own below
+                self.stats.batch_retries += 1
+
+        if not outcomes:
+            for job in batch:
+                try:
+                    outcomes.append((job, (await self._execute([job], strict=False))[0], None))
+                except Exception as e:
+                    outcomes.append((job, None, e))
+                self.stats.batches += 1
+
+        self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+        for job, result, error in outcomes:
+            self.stats.writes += 1
+            self.stats.total_wait_ms += (started - job.queued_at) * 1000
+            if job.future.done():
+                continue
+            if error is not None:
+                self.stats.failed += 1
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+
+    async def drain(self) -> None:
+        """Wait until every queued write has committed."""
+        if self._queue is not None and self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Drain and stop the writer task."""
+        await self.drain()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> dict:
+        """Get writer statistics."""
+        return {"pending": self.pending, **self.stats.to_dict()}
+
+
+# Global instance
+_write_queue: WriteQueue | None = None
+
+
+def get_write_queue() -> WriteQueue | None:
+    """Get global write queue (None unless the database is SQLite)."""
+    global _write_queue
+    from models import session as db
+
+    if _write_queue is None and db.IS_SQLITE:
+        _write_queue = WriteQueue(db.write_engine)
+    return _write_queue
+
+
+async def run_write(fn: WriteFn) -> Any:
+    """
+    Run a database write.
+
+    SQLite: queued on the single writer and batched with other writes.
+    Otherwise: executed in its own session, committed afterwards.
+
+    Args:
+        fn: Coroutine function receiving an AsyncSession
+
+    Returns:
+        Whatever fn returned
+    """
+    queue = get_write_queue()
+    if queue is not None:
+        return await queue.submit(fn)
+
+    from models import session as db
+
+    async with db.async_session_maker() as session:
+        result = await fn(session)
+        await session.commit()
+        return result
+
+
+async def close_write_queue() -> None:
+    """Flush pending writes and stop the writer (application shutdown)."""
+    if _write_queue is not None:
+        await _write_queue.close()
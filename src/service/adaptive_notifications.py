@@ -6,17 +6,23 @@ frequency to reduce spam during high volatility and increase alerts during
 important market movements.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any
 
-from service.candlestick import CandleInterval, fetch_candlesticks
-from service.ha_integration import get_supervisor_client
+from service.alerts.notification_bus import publish_notification
+from service.alerts.notification_manager import AlertCategory
+from service.alerts.notification_manager import AlertPriority as NotificationPriority
+from service.candlestick import CandleInterval, Candlestick, read_candlesticks
 
 logger = logging.getLogger(__name__)
 
+# Hourly candles per volatility profile (48 hours)
+PROFILE_CANDLES = 48
+
 
 class AlertPriority(Enum):
     """Alert priority levels."""
@@ -27,6 +33,15 @@ class AlertPriority(Enum):
     CRITICAL = "critical"
 
 
+# Rule priority -> notification bus priority (critical skips batching)
+BUS_PRIORITY = {
+    AlertPriority.LOW: NotificationPriority.INFO,
+    AlertPriority.NORMAL: NotificationPriority.IMPORTANT,
+    AlertPriority.HIGH: NotificationPriority.IMPORTANT,
+    AlertPriority.CRITICAL: NotificationPriority.CRITICAL,
+}
+
+
 class MarketVolatility(Enum):
     """Market volatility levels."""
 
@@ -107,7 +122,6 @@ class AdaptiveNotificationsManager:
         """Initialize adaptive notifications manager."""
         self.rules: list[AdaptiveNotificationRule] = []
         self.volatility_profiles: dict[str, VolatilityProfile] = {}
-        self._supervisor_client = get_supervisor_client()
         self._notification_history: list[dict[str, Any]] = []
         self._max_history_size = 1000
 
@@ -155,32 +169,42 @@ class AdaptiveNotificationsManager:
         logger.info(f"Initialized {len(self.rules)} adaptive notification rules")
 
     async def update_volatility_profiles(self) -> None:
-        """Update volatility profiles for all tracked symbols."""
-        symbols = [rule.symbol for rule in self.rules]
-        unique_symbols = list(set(symbols))
+        """
+        Update volatility profiles for all tracked symbols.
+
+        Candles of every rule symbol are read in one concurrent batch from
+        the shared candle store (DB-first, exchanges only for the missing
+        tail), then all profiles are computed from that batch.
+        """
+        unique_symbols = list(dict.fromkeys(rule.symbol for rule in self.rules))
+        if not unique_symbols:
+            return
+
+        results = await asyncio.gather(
+            *(
+                read_candlesticks(symbol=symbol, interval=CandleInterval("1h"), limit=PROFILE_CANDLES)
+                for symbol in unique_symbols
+            ),
+            return_exceptions=True,
+        )
 
-        for symbol in unique_symbols:
+        for symbol, candles in zip(unique_symbols, results, strict=True):
             try:
-                profile = await self._calculate_volatility_profile(symbol)
+                if isinstance(candles, Exception):
+                    raise candles
+                profile = self._calculate_volatility_profile(symbol, candles)
                 self.volatility_profiles[symbol] = profile
                 logger.debug(f"Updated volatility profile for {symbol}: {profile.volatility_level.value}")
             except Exception as e:
                 logger.error(f"Failed to update volatility profile for {symbol}: {e}")
 
-    async def _calculate_volatility_profile(self, symbol: str) -> VolatilityProfile:
-        """Calculate volatility profile for a symbol."""
-        # Fetch recent candle data
-        candles = await fetch_candlesticks(
-            symbol=symbol,
-            interval=CandleInterval("1h"),
-            limit=48,  # 48 hours of hourly data
-        )
-
+    def _calculate_volatility_profile(self, symbol: str, candles: list[Candlestick]) -> VolatilityProfile:
+        """Calculate volatility profile for a symbol from hourly candles."""
         if len(candles) < 10:
             raise ValueError(f"Insufficient data for {symbol}: {len(candles)} candles")
 
         # Calculate price changes
-        prices = [float(c.close) for c in candles]
+        prices = [float(c.close_price) for c in candles]
         returns = [(prices[i] - prices[i - 1]) / prices[i - 1] * 100 for i in range(1, len(prices))]
 
         # Calculate current volatility (standard deviation of returns)
@@ -191,14 +215,14 @@ class AdaptiveNotificationsManager:
         price_change_1h = ((prices[-1] - prices[-2]) / prices[-2] * 100) if len(prices) >= 2 else 0
 
         # Calculate volume change
-        volumes = [float(c.volume) for c in candles]
+        volumes = [float(c.volume or 0) for c in candles]
         volume_change = (
             ((sum(volumes[-5:]) - sum(volumes[-10:-5])) / sum(volumes[-10:-5]) * 100) if len(volumes) >= 10 else 0
         )
 
         # Calculate ATR (Average True Range) approximation
-        highs = [float(c.high) for c in candles]
-        lows = [float(c.low) for c in candles]
+        highs = [float(c.high_price) for c in candles]
+        lows = [float(c.low_price) for c in candles]
 
         tr_values = []
         for i in range(1, len(prices)):
@@ -273,7 +297,7 @@ class AdaptiveNotificationsManager:
                 logger.error(f"Error checking rule {rule.name}: {e}")
 
         if sent_notifications:
-            logger.info(f"Sent {len(sent_notifications)} adaptive notifications")
+            logger.info(f"Queued {len(sent_notifications)} adaptive notifications")
 
         return sent_notifications
 
@@ -310,47 +334,33 @@ class AdaptiveNotificationsManager:
     async def _send_notification(
         self, rule: AdaptiveNotificationRule, profile: VolatilityProfile, timestamp: datetime
     ) -> dict[str, Any] | None:
-        """Send notification via Home Assistant."""
-        if not self._supervisor_client.is_available:
-            logger.warning("Supervisor API not available, cannot send notification")
-            return None
-
+        """Publish notification on the notification bus."""
         try:
-            # Create notification message
             message = self._format_notification_message(rule, profile)
-            title = f"📈 Adaptive Alert: {rule.symbol}"
 
-            # Send via persistent notification (can be extended to other services)
-            http_client = await self._supervisor_client._get_client()
+            queued = await publish_notification(
+                message=message,
+                title=f"📈 Adaptive Alert: {rule.symbol}",
+                notification_id=f"adaptive_{rule.name}",
+                category=AlertCategory.PRICE,
+                priority=BUS_PRIORITY[rule.priority],
+            )
+            if not queued:
+                logger.debug(f"Adaptive notification {rule.name} suppressed by the notification bus")
+                return None
 
-            notification_data = {
-                "title": title,
+            logger.info(f"Queued adaptive notification: {rule.name} for {rule.symbol}")
+            return {
+                "rule_name": rule.name,
+                "symbol": rule.symbol,
+                "priority": rule.priority.value,
                 "message": message,
-                "notification_id": f"adaptive_{rule.name}_{int(timestamp.timestamp())}",
+                "volatility_level": profile.volatility_level.value,
+                "adaptation_factor": profile.get_adaptation_factor(),
+                "timestamp": timestamp.isoformat(),
+                "success": True,
             }
 
-            response = await http_client.post(
-                "/core/api/services/persistent_notification/create", json=notification_data
-            )
-
-            if response.status_code == 200:
-                notification_record = {
-                    "rule_name": rule.name,
-                    "symbol": rule.symbol,
-                    "priority": rule.priority.value,
-                    "message": message,
-                    "volatility_level": profile.volatility_level.value,
-                    "adaptation_factor": profile.get_adaptation_factor(),
-                    "timestamp": timestamp.isoformat(),
-                    "success": True,
-                }
-
-                logger.info(f"Sent adaptive notification: {rule.name} for {rule.symbol}")
-                return notification_record
-            else:
-                logger.error(f"Failed to send notification: {response.status_code}")
-                return None
-
         except Exception as e:
             logger.error(f"Error sending notification for {rule.name}: {e}")
             return None
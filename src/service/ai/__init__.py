@@ -12,12 +12,15 @@ Features:
 - Risk assessment
 """
 
-from service.ai.analyzer import MarketAnalyzer
-from service.ai.providers import AIService, OllamaProvider, OpenAIProvider
+from service.ai.analyzer import MarketAnalyzer, get_market_analyzer
+from service.ai.providers import AIService, OllamaProvider, OpenAIProvider, close_ai_service, get_ai_service
 
 __all__ = [
     "AIService",
     "OpenAIProvider",
     "OllamaProvider",
     "MarketAnalyzer",
+    "close_ai_service",
+    "get_ai_service",
+    "get_market_analyzer",
 ]
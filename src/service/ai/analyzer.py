@@ -2,17 +2,26 @@
 AI Market Analyzer.
 
 Orchestrates AI analysis by collecting market data and generating insights.
+
+Each request sends the shared system prompt (common prefix plus the compact
+market context) and a user prompt made of the role guidance and the task.
 """
 
 import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from datetime import datetime
 
 from service.ai.prompts import (
+    CONTEXT_TOKEN_BUDGET,
     SYSTEM_PROMPT_ANALYST,
     SYSTEM_PROMPT_DCA,
     SYSTEM_PROMPT_RISK,
     MarketData,
+    PromptContext,
+    build_context,
+    build_system_prompt,
     extract_recommendation_from_response,
     extract_sentiment_from_response,
     format_ai_response_for_ha,
@@ -23,7 +32,7 @@ from service.ai.prompts import (
     get_risk_assessment_prompt,
     get_weekly_report_prompt,
 )
-from service.ai.providers import AIService
+from service.ai.providers import AIResponse, AIService
 
 logger = logging.getLogger(__name__)
 
@@ -61,10 +70,20 @@ class MarketAnalyzer:
     Collects data from various services and generates AI insights.
     """
 
-    def __init__(self, ai_service: AIService):
+    def __init__(self, ai_service: AIService, context_budget: int = CONTEXT_TOKEN_BUDGET):
+        """
+        Initialize analyzer.
+
+        Args:
+            ai_service: AI service used for all prompts
+            context_budget: Token budget of the compact market context
+        """
         self.ai_service = ai_service
+        self.context_budget = context_budget
         self._last_analysis: AnalysisResult | None = None
-        self._analysis_history: list[AnalysisResult] = []
+        self._analysis_history: deque[AnalysisResult] = deque(maxlen=50)
+        self._context: PromptContext | None = None
+        self._context_data: MarketData | None = None
 
     @property
     def last_analysis(self) -> AnalysisResult | None:
@@ -72,12 +91,48 @@ class MarketAnalyzer:
 
     @property
     def analysis_history(self) -> list[AnalysisResult]:
-        return self._analysis_history[-50:]  # Keep last 50
+        return list(self._analysis_history)  # Keeps last 50
+
+    @property
+    def last_context(self) -> PromptContext | None:
+        return self._context
+
+    def _system_prompt(self, market_data: MarketData) -> str:
+        """Shared system prompt, built once per market snapshot."""
+        if self._context is None or self._context_data is not market_data:
+            self._context = build_context(market_data, self.context_budget)
+            self._context_data = market_data
+            if self._context.dropped:
+                logger.debug(
+                    f"AI context over {self.context_budget} tokens, dropped: {', '.join(self._context.dropped)}"
+                )
+        return build_system_prompt(self._context)
+
+    async def _ask(
+        self,
+        market_data: MarketData,
+        role: str,
+        task: str,
+        label: str,
+        temperature: float,
+        max_tokens: int,
+        on_partial: Callable[[str], Awaitable[None]] | None = None,
+    ) -> AIResponse | None:
+        """Send one prompt with the shared system prompt."""
+        return await self.ai_service.generate(
+            prompt=f"{role}\n{task}",
+            system=self._system_prompt(market_data),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            on_partial=on_partial,
+            label=label,
+        )
 
     async def generate_daily_summary(
         self,
         market_data: MarketData,
         language: str = "en",
+        on_partial: Callable[[str], Awaitable[None]] | None = None,
     ) -> AnalysisResult | None:
         """
         Generate daily market summary.
@@ -85,17 +140,20 @@ class MarketAnalyzer:
         Args:
             market_data: Current market data
             language: Response language ("en" or "ru")
+            on_partial: Streams the response and receives the text so far
+                as soon as it fills a sensor state
 
         Returns:
             AnalysisResult or None if AI unavailable
         """
-        prompt = get_daily_summary_prompt(market_data, language)
-
-        response = await self.ai_service.generate(
-            prompt=prompt,
-            system=SYSTEM_PROMPT_ANALYST,
+        response = await self._ask(
+            market_data,
+            SYSTEM_PROMPT_ANALYST,
+            get_daily_summary_prompt(language),
+            label="daily_summary",
             temperature=0.7,
             max_tokens=500,
+            on_partial=on_partial,
         )
 
         if not response:
@@ -132,11 +190,11 @@ class MarketAnalyzer:
         Returns:
             AnalysisResult or None
         """
-        prompt = get_weekly_report_prompt(market_data, language)
-
-        response = await self.ai_service.generate(
-            prompt=prompt,
-            system=SYSTEM_PROMPT_ANALYST,
+        response = await self._ask(
+            market_data,
+            SYSTEM_PROMPT_ANALYST,
+            get_weekly_report_prompt(language),
+            label="weekly_report",
             temperature=0.7,
             max_tokens=800,
         )
@@ -177,11 +235,11 @@ class MarketAnalyzer:
         Returns:
             AnalysisResult or None
         """
-        prompt = get_opportunity_prompt(symbol, market_data, language)
-
-        response = await self.ai_service.generate(
-            prompt=prompt,
-            system=SYSTEM_PROMPT_ANALYST,
+        response = await self._ask(
+            market_data,
+            SYSTEM_PROMPT_ANALYST,
+            get_opportunity_prompt(symbol, language),
+            label="opportunity",
             temperature=0.5,
             max_tokens=400,
         )
@@ -221,11 +279,11 @@ class MarketAnalyzer:
         Returns:
             AnalysisResult or None
         """
-        prompt = get_dca_recommendation_prompt(market_data, base_amount, language)
-
-        response = await self.ai_service.generate(
-            prompt=prompt,
-            system=SYSTEM_PROMPT_DCA,
+        response = await self._ask(
+            market_data,
+            SYSTEM_PROMPT_DCA,
+            get_dca_recommendation_prompt(base_amount, language),
+            label="dca_recommendation",
             temperature=0.3,
             max_tokens=300,
         )
@@ -264,11 +322,11 @@ class MarketAnalyzer:
         Returns:
             AnalysisResult or None
         """
-        prompt = get_risk_assessment_prompt(market_data, portfolio_allocation, language)
-
-        response = await self.ai_service.generate(
-            prompt=prompt,
-            system=SYSTEM_PROMPT_RISK,
+        response = await self._ask(
+            market_data,
+            SYSTEM_PROMPT_RISK,
+            get_risk_assessment_prompt(portfolio_allocation, language),
+            label="risk_assessment",
             temperature=0.3,
             max_tokens=400,
         )
@@ -304,11 +362,11 @@ class MarketAnalyzer:
         Returns:
             AnalysisResult with sentiment
         """
-        prompt = get_market_sentiment_prompt(market_data, language)
-
-        response = await self.ai_service.generate(
-            prompt=prompt,
-            system=SYSTEM_PROMPT_ANALYST,
+        response = await self._ask(
+            market_data,
+            SYSTEM_PROMPT_ANALYST,
+            get_market_sentiment_prompt(language),
+            label="sentiment",
             temperature=0.3,
             max_tokens=200,
         )
@@ -358,6 +416,21 @@ class MarketAnalyzer:
         return self._last_analysis.timestamp.strftime("%Y-%m-%d %H:%M")
 
 
+# Global instance
+_market_analyzer: MarketAnalyzer | None = None
+
+
+def get_market_analyzer() -> MarketAnalyzer:
+    """Get global market analyzer on the shared AI service."""
+    global _market_analyzer
+    if _market_analyzer is None:
+        from core.config import settings
+        from service.ai.providers import get_ai_service
+
+        _market_analyzer = MarketAnalyzer(get_ai_service(), context_budget=settings.AI_CONTEXT_TOKEN_BUDGET)
+    return _market_analyzer
+
+
 # =============================================================================
 # Helper to collect market data from services
 # =============================================================================
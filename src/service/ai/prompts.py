@@ -7,9 +7,17 @@ Contains structured prompts for different analysis types:
 - Risk assessment
 - Trading opportunity analysis
 - DCA recommendation
+
+Every prompt shares one system prefix holding the compact market context
+(see build_context), so consecutive requests of a run start with the same
+tokens and provider-side prompt caching can reuse them. The templates
+below only carry the task.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+# Default token budget for the compact market context
+CONTEXT_TOKEN_BUDGET = 160
 
 
 @dataclass
@@ -123,11 +131,134 @@ class MarketData:
 
         return "\n".join(lines)
 
+    def context_fields(self) -> list["ContextField"]:
+        """Fields of the compact context, most salient first."""
+        fields = [
+            ContextField("btc", f"BTC {self.btc_price:.0f} {self.btc_change_24h:+.2f}%", 100),
+            ContextField("fear_greed", f"F&G {self.fear_greed} {self.fear_greed_label}", 95),
+            ContextField("eth", f"ETH {self.eth_price:.0f} {self.eth_change_24h:+.2f}%", 90),
+        ]
+        if self.btc_rsi is not None:
+            fields.append(ContextField("btc_rsi", f"RSI BTC {self.btc_rsi:.1f}", 80))
+        if self.btc_trend:
+            fields.append(ContextField("btc_trend", f"trend {self.btc_trend}", 78))
+        if self.btc_support and self.btc_resistance:
+            fields.append(ContextField("btc_levels", f"S/R {self.btc_support:.0f}/{self.btc_resistance:.0f}", 75))
+        if self.portfolio_value:
+            fields.append(
+                ContextField(
+                    "portfolio", f"portfolio {self.portfolio_value:.2f} {self.portfolio_pnl_24h or 0:+.2f}%", 70
+                )
+            )
+        fields.append(ContextField("btc_dominance", f"BTC.D {self.btc_dominance:.1f}%", 60))
+        if self.volatility_30d:
+            fields.append(
+                ContextField("volatility", f"vol30d {self.volatility_30d:.1f}% {self.volatility_status or 'N/A'}", 55)
+            )
+        if self.next_macro_event:
+            fields.append(ContextField("macro", f"next {self.next_macro_event}", 50))
+        if self.days_to_fomc is not None:
+            fields.append(ContextField("fomc", f"FOMC {self.days_to_fomc}d", 45))
+        if self.exchange_flow:
+            fields.append(ContextField("exchange_flow", f"flow {self.exchange_flow}", 40))
+        fields.append(ContextField("altseason", f"ALT {self.altseason_index}", 35))
+        if self.eth_rsi:
+            fields.append(ContextField("eth_rsi", f"RSI ETH {self.eth_rsi:.1f}", 30))
+        if self.whale_activity:
+            fields.append(ContextField("whales", f"whales {self.whale_activity}", 25))
+        return fields
+
+
+# =============================================================================
+# CONTEXT COMPACTION
+# =============================================================================
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a text.
+
+    Roughly 4 characters per token for ASCII and 2 for other scripts
+    (Cyrillic, emoji), which errs on the high side for both tokenizers.
+    """
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return (len(text) - non_ascii + 3) // 4 + (non_ascii + 1) // 2
+
+
+@dataclass
+class ContextField:
+    """One field of the compact market context."""
+
+    name: str
+    text: str
+    salience: int  # Higher is kept longer under a tight budget
+
+
+@dataclass
+class PromptContext:
+    """Compact market context rendered under a token budget."""
+
+    text: str
+    tokens: int
+    budget: int
+    dropped: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "tokens": self.tokens,
+            "budget": self.budget,
+            "dropped": self.dropped,
+        }
+
+
+# Fields that are never dropped, whatever the budget
+REQUIRED_SALIENCE = 90
+
+
+def build_context(data: MarketData, budget: int = CONTEXT_TOKEN_BUDGET) -> PromptContext:
+    """
+    Render market data as a dense single-line table under a token budget.
+
+    Fields are joined with " | " in salience order. While the estimate
+    exceeds the budget, the least salient field is dropped; prices and
+    Fear & Greed are always kept.
+    """
+    fields = data.context_fields()
+    dropped: list[str] = []
+
+    def render() -> str:
+        return "MARKET " + " | ".join(f.text for f in fields)
+
+    text = render()
+    while estimate_tokens(text) > budget and fields[-1].salience < REQUIRED_SALIENCE:
+        dropped.append(fields.pop().name)
+        text = render()
+
+    return PromptContext(text=text, tokens=estimate_tokens(text), budget=budget, dropped=dropped)
+
 
 # =============================================================================
 # SYSTEM PROMPTS
 # =============================================================================
 
+SYSTEM_PREFIX = """You are an assistant for a long-term cryptocurrency investor.
+The market snapshot below is current. Prices are in USD, changes are 24h,
+F&G is the Fear & Greed Index, BTC.D is Bitcoin dominance, S/R are BTC
+support and resistance, ALT is the altseason index.
+"""
+
+
+def build_system_prompt(context: PromptContext | str) -> str:
+    """
+    Shared system prompt: the common prefix followed by the market context.
+
+    Identical for every prompt of a run, so providers that cache prompt
+    prefixes (OpenAI, the Ollama KV cache) reuse it between requests.
+    """
+    text = context.text if isinstance(context, PromptContext) else context
+    return f"{SYSTEM_PREFIX}\n{text}"
+
+
 SYSTEM_PROMPT_ANALYST = """You are an expert cryptocurrency market analyst with deep knowledge of:
 - Technical analysis (RSI, MACD, support/resistance, trends)
 - On-chain metrics (exchange flows, whale activity)
@@ -180,14 +311,10 @@ Be specific with numbers and percentages.
 # =============================================================================
 
 
-def get_daily_summary_prompt(data: MarketData, language: str = "en") -> str:
+def get_daily_summary_prompt(language: str = "en") -> str:
     """Generate daily market summary prompt."""
-    context = data.to_context()
-
     if language == "ru":
-        return f"""Проанализируй текущую рыночную ситуацию и дай краткую сводку.
-
-{context}
+        return """Проанализируй текущую рыночную ситуацию и дай краткую сводку.
 
 Структура ответа:
 1. 📊 **Общая картина** (2-3 предложения)
@@ -197,9 +324,7 @@ def get_daily_summary_prompt(data: MarketData, language: str = "en") -> str:
 
 Будь кратким, максимум 200 слов."""
 
-    return f"""Analyze the current market situation and provide a brief summary.
-
-{context}
+    return """Analyze the current market situation and provide a brief summary.
 
 Response structure:
 1. 📊 **Market Overview** (2-3 sentences)
@@ -210,14 +335,10 @@ Response structure:
 Be concise, maximum 200 words."""
 
 
-def get_weekly_report_prompt(data: MarketData, language: str = "en") -> str:
+def get_weekly_report_prompt(language: str = "en") -> str:
     """Generate weekly analysis report prompt."""
-    context = data.to_context()
-
     if language == "ru":
-        return f"""Подготовь еженедельный отчет по крипторынку.
-
-{context}
+        return """Подготовь еженедельный отчет по крипторынку.
 
 Структура отчета:
 1. 📈 **Итоги недели** - что произошло
@@ -229,9 +350,7 @@ def get_weekly_report_prompt(data: MarketData, language: str = "en") -> str:
 
 Максимум 400 слов."""
 
-    return f"""Prepare a weekly crypto market report.
-
-{context}
+    return """Prepare a weekly crypto market report.
 
 Report structure:
 1. 📈 **Week Summary** - what happened
@@ -244,15 +363,11 @@ Report structure:
 Maximum 400 words."""
 
 
-def get_opportunity_prompt(symbol: str, data: MarketData, language: str = "en") -> str:
+def get_opportunity_prompt(symbol: str, language: str = "en") -> str:
     """Generate trading opportunity analysis prompt."""
-    context = data.to_context()
-
     if language == "ru":
         return f"""Проанализируй возможность для {symbol}.
 
-{context}
-
 Ответь на вопросы:
 1. Это хорошее время для покупки {symbol}?
 2. Какие ключевые уровни?
@@ -264,8 +379,6 @@ def get_opportunity_prompt(symbol: str, data: MarketData, language: str = "en")
 
     return f"""Analyze the opportunity for {symbol}.
 
-{context}
-
 Answer these questions:
 1. Is this a good time to buy {symbol}?
 2. What are the key levels?
@@ -276,15 +389,11 @@ Answer these questions:
 Brief answer, maximum 150 words."""
 
 
-def get_dca_recommendation_prompt(data: MarketData, base_amount: float, language: str = "en") -> str:
+def get_dca_recommendation_prompt(base_amount: float, language: str = "en") -> str:
     """Generate DCA recommendation prompt."""
-    context = data.to_context()
-
     if language == "ru":
         return f"""Дай рекомендацию по DCA на этой неделе.
 
-{context}
-
 Базовая сумма: €{base_amount}
 
 Ответь:
@@ -297,8 +406,6 @@ def get_dca_recommendation_prompt(data: MarketData, base_amount: float, language
 
     return f"""Give DCA recommendation for this week.
 
-{context}
-
 Base amount: €{base_amount}
 
 Answer:
@@ -311,13 +418,10 @@ Brief answer in 3-4 sentences."""
 
 
 def get_risk_assessment_prompt(
-    data: MarketData,
     portfolio_allocation: dict[str, float] | None = None,
     language: str = "en",
 ) -> str:
     """Generate risk assessment prompt."""
-    context = data.to_context()
-
     allocation_str = ""
     if portfolio_allocation:
         allocation_str = "\nPortfolio allocation:\n"
@@ -326,8 +430,6 @@ def get_risk_assessment_prompt(
 
     if language == "ru":
         return f"""Оцени текущие риски портфеля.
-
-{context}
 {allocation_str}
 
 Оцени:
@@ -339,8 +441,6 @@ def get_risk_assessment_prompt(
 Краткий ответ."""
 
     return f"""Assess current portfolio risks.
-
-{context}
 {allocation_str}
 
 Evaluate:
@@ -352,21 +452,15 @@ Evaluate:
 Brief answer."""
 
 
-def get_market_sentiment_prompt(data: MarketData, language: str = "en") -> str:
+def get_market_sentiment_prompt(language: str = "en") -> str:
     """Generate market sentiment analysis prompt."""
-    context = data.to_context()
-
     if language == "ru":
-        return f"""Проанализируй текущий сентимент рынка.
-
-{context}
+        return """Проанализируй текущий сентимент рынка.
 
 Одним словом опиши сентимент: Bullish, Bearish, или Neutral.
 Затем кратко объясни почему (2-3 предложения)."""
 
-    return f"""Analyze current market sentiment.
-
-{context}
+    return """Analyze current market sentiment.
 
 Describe sentiment in one word: Bullish, Bearish, or Neutral.
 Then briefly explain why (2-3 sentences)."""
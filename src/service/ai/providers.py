@@ -4,16 +4,47 @@ AI Provider implementations.
 Supports multiple AI backends:
 - OpenAI (GPT-4, GPT-3.5)
 - Ollama (local models like llama3.2, mistral, etc.)
+
+AIService adds on top of the providers:
+- Cached provider health with circuit-breaker semantics: a good probe or
+  response is trusted for HEALTH_TTL, failures open the circuit with an
+  exponential cooldown and the provider is skipped without probing
+- A response cache keyed by a hash of the full prompt (which embeds the
+  MarketData context), so an identical market snapshot is not billed twice
+- A concurrency limit for requests sent to the providers
+- Streaming, reporting the partial text once STREAM_PARTIAL_CHARS arrived
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, replace
+from typing import Any
 
 import httpx
 
+from service.ai.prompts import estimate_tokens
+
 logger = logging.getLogger(__name__)
 
+# A successful probe or response is trusted this long (seconds)
+HEALTH_TTL = 300.0
+# Circuit open time after the n-th consecutive failure: BASE * 2^(n-1), capped
+BREAKER_BASE_COOLDOWN = 30.0
+BREAKER_MAX_COOLDOWN = 900.0
+# Identical prompts within this window reuse the response (seconds)
+RESPONSE_CACHE_TTL = 6 * 3600.0
+RESPONSE_CACHE_SIZE = 128
+# Requests sent to providers at the same time
+DEFAULT_MAX_CONCURRENCY = 2
+# Streamed text length reported early (HA sensor state limit)
+STREAM_PARTIAL_CHARS = 255
+
 
 @dataclass
 class AIResponse:
@@ -24,6 +55,9 @@ class AIResponse:
     provider: str
     tokens_used: int | None = None
     finish_reason: str | None = None
+    cached: bool = False
+    prompt_tokens: int | None = None  # Reported by the provider, else estimated
+    latency_s: float | None = None
 
 
 class AIProvider(ABC):
@@ -62,6 +96,32 @@ class AIProvider(ABC):
         """Check if provider is available."""
         ...
 
+    async def stream(
+        self,
+        prompt: str,
+        system: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        final: dict[str, Any] | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream the response text in chunks.
+
+        The default implementation yields the whole response at once.
+
+        Args:
+            final: Filled with tokens_used/prompt_tokens/finish_reason once
+                the stream ends
+        """
+        response = await self.generate(prompt=prompt, system=system, temperature=temperature, max_tokens=max_tokens)
+        if final is not None:
+            final.update(
+                tokens_used=response.tokens_used,
+                prompt_tokens=response.prompt_tokens,
+                finish_reason=response.finish_reason,
+            )
+        yield response.content
+
 
 class OpenAIProvider(AIProvider):
     """OpenAI (ChatGPT) provider."""
@@ -127,6 +187,7 @@ class OpenAIProvider(AIProvider):
                 provider=self.name,
                 tokens_used=data.get("usage", {}).get("total_tokens"),
                 finish_reason=data["choices"][0].get("finish_reason"),
+                prompt_tokens=data.get("usage", {}).get("prompt_tokens"),
             )
         except httpx.HTTPError as e:
             logger.error(f"OpenAI API error: {e}")
@@ -135,6 +196,52 @@ class OpenAIProvider(AIProvider):
             logger.error(f"OpenAI response parsing error: {e}")
             raise
 
+    async def stream(
+        self,
+        prompt: str,
+        system: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        final: dict[str, Any] | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream response text from the OpenAI API (server-sent events)."""
+        client = await self._get_client()
+
+        messages: list[dict[str, str]] = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+
+        async with client.stream(
+            "POST",
+            "/chat/completions",
+            json={
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "stream": True,
+                "stream_options": {"include_usage": True},
+            },
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+                data = json.loads(payload)
+                if final is not None and data.get("usage"):
+                    final["tokens_used"] = data["usage"].get("total_tokens")
+                    final["prompt_tokens"] = data["usage"].get("prompt_tokens")
+                for choice in data.get("choices", []):
+                    if final is not None and choice.get("finish_reason"):
+                        final["finish_reason"] = choice["finish_reason"]
+                    text = (choice.get("delta") or {}).get("content")
+                    if text:
+                        yield text
+
     async def is_available(self) -> bool:
         """Check if OpenAI API is accessible."""
         if not self.api_key:
@@ -210,6 +317,7 @@ class OllamaProvider(AIProvider):
                 provider=self.name,
                 tokens_used=data.get("eval_count"),
                 finish_reason="stop" if data.get("done") else None,
+                prompt_tokens=data.get("prompt_eval_count"),
             )
         except httpx.HTTPError as e:
             logger.error(f"Ollama API error: {e}")
@@ -218,6 +326,47 @@ class OllamaProvider(AIProvider):
             logger.error(f"Ollama response parsing error: {e}")
             raise
 
+    async def stream(
+        self,
+        prompt: str,
+        system: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        final: dict[str, Any] | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream response text from Ollama (one JSON object per line)."""
+        client = await self._get_client()
+
+        async with client.stream(
+            "POST",
+            "/api/generate",
+            json={
+                "model": self.model,
+                "prompt": prompt,
+                "system": system or "",
+                "stream": True,
+                "options": {
+                    "temperature": temperature,
+                    "num_predict": max_tokens,
+                },
+            },
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if data.get("response"):
+                    yield data["response"]
+                if data.get("done"):
+                    if final is not None:
+                        final.update(
+                            tokens_used=data.get("eval_count"),
+                            prompt_tokens=data.get("prompt_eval_count"),
+                            finish_reason="stop",
+                        )
+                    break
+
     async def is_available(self) -> bool:
         """Check if Ollama is running and model is available."""
         try:
@@ -239,63 +388,341 @@ class OllamaProvider(AIProvider):
             self._client = None
 
 
+@dataclass
+class ProviderHealth:
+    """Cached availability of a provider (circuit breaker state)."""
+
+    provider: str
+    available_until: float = 0.0  # Trusted healthy until (monotonic)
+    open_until: float = 0.0  # Circuit open (provider skipped) until
+    failures: int = 0  # Consecutive failures
+    probes: int = 0
+    last_error: str | None = None
+
+    def state(self, now: float) -> str:
+        if now < self.open_until:
+            return "open"
+        if now < self.available_until:
+            return "healthy"
+        return "half_open" if self.failures else "unknown"
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "provider": self.provider,
+            "state": self.state(now),
+            "failures": self.failures,
+            "probes": self.probes,
+            "retry_in_s": round(max(0.0, self.open_until - now), 1),
+            "last_error": self.last_error,
+        }
+
+
+@dataclass
+class AIServiceStats:
+    """AI service counters."""
+
+    requests: int = 0
+    cache_hits: int = 0
+    provider_calls: int = 0
+    skipped_open: int = 0
+    failures: int = 0
+    streamed: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "provider_calls": self.provider_calls,
+            "skipped_open": self.skipped_open,
+            "failures": self.failures,
+            "streamed": self.streamed,
+        }
+
+
+@dataclass
+class PromptStats:
+    """Token and latency stats of one prompt type."""
+
+    label: str
+    calls: int = 0
+    cache_hits: int = 0
+    prompt_tokens: int = 0
+    tokens_used: int = 0
+    latency_s: float = 0.0
+    last_prompt_tokens: int | None = None
+    last_latency_s: float | None = None
+
+    def record(self, response: AIResponse) -> None:
+        if response.cached:
+            self.cache_hits += 1
+            return
+        self.calls += 1
+        self.prompt_tokens += response.prompt_tokens or 0
+        self.tokens_used += response.tokens_used or 0
+        self.latency_s += response.latency_s or 0.0
+        self.last_prompt_tokens = response.prompt_tokens
+        self.last_latency_s = response.latency_s
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "avg_prompt_tokens": round(self.prompt_tokens / self.calls) if self.calls else None,
+            "avg_tokens_used": round(self.tokens_used / self.calls) if self.calls else None,
+            "avg_latency_s": round(self.latency_s / self.calls, 2) if self.calls else None,
+            "last_prompt_tokens": self.last_prompt_tokens,
+            "last_latency_s": round(self.last_latency_s, 2) if self.last_latency_s is not None else None,
+        }
+
+
 class AIService:
     """
     AI Service with fallback support.
 
-    Tries providers in order until one succeeds.
+    Tries providers in order until one succeeds, skipping providers whose
+    circuit is open. Responses are cached by prompt hash.
     """
 
-    def __init__(self, providers: list[AIProvider] | None = None):
+    def __init__(
+        self,
+        providers: list[AIProvider] | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        cache_ttl: float = RESPONSE_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize AI service.
+
+        Args:
+            providers: Providers in order of preference
+            max_concurrency: Requests sent to providers at the same time
+            cache_ttl: Response cache lifetime in seconds (0 disables)
+            clock: Monotonic clock
+        """
         self.providers = providers or []
         self._available_provider: AIProvider | None = None
+        self._clock = clock
+        self._health: dict[int, ProviderHealth] = {}
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._cache_ttl = cache_ttl
+        self._cache: OrderedDict[str, tuple[float, AIResponse]] = OrderedDict()
+        self.stats = AIServiceStats()
+        self.prompt_stats: dict[str, PromptStats] = {}
 
     def add_provider(self, provider: AIProvider):
         """Add a provider to the list."""
         self.providers.append(provider)
 
+    # ------------------------------------------------------------------
+    # Provider health
+    # ------------------------------------------------------------------
+
+    def _health_of(self, provider: AIProvider) -> ProviderHealth:
+        health = self._health.get(id(provider))
+        if health is None:
+            health = self._health[id(provider)] = ProviderHealth(provider=provider.name)
+        return health
+
+    def _record_success(self, provider: AIProvider) -> None:
+        health = self._health_of(provider)
+        health.failures = 0
+        health.open_until = 0.0
+        health.available_until = self._clock() + HEALTH_TTL
+        health.last_error = None
+
+    def _record_failure(self, provider: AIProvider, error: str) -> None:
+        health = self._health_of(provider)
+        health.failures += 1
+        health.available_until = 0.0
+        cooldown = min(BREAKER_MAX_COOLDOWN, BREAKER_BASE_COOLDOWN * 2 ** (health.failures - 1))
+        health.open_until = self._clock() + cooldown
+        health.last_error = error
+        logger.warning(f"AI provider {provider.name} unavailable, retry in {cooldown:.0f}s: {error}")
+
+    async def _is_healthy(self, provider: AIProvider) -> bool:
+        """Cached availability; probes only when the cached state expired."""
+        health = self._health_of(provider)
+        state = health.state(self._clock())
+        if state == "open":
+            self.stats.skipped_open += 1
+            return False
+        if state == "healthy":
+            return True
+
+        health.probes += 1
+        try:
+            available = await provider.is_available()
+        except Exception as e:
+            available = False
+            logger.debug(f"AI provider {provider.name} probe failed: {e}")
+        if available:
+            # Trusted for a while, but only a real response resets the failure count
+            health.open_until = 0.0
+            health.available_until = self._clock() + HEALTH_TTL
+        else:
+            self._record_failure(provider, "probe failed")
+        return available
+
     async def get_available_provider(self) -> AIProvider | None:
         """Get first available provider."""
         for provider in self.providers:
-            if await provider.is_available():
+            if await self._is_healthy(provider):
                 return provider
         return None
 
+    # ------------------------------------------------------------------
+    # Response cache
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def response_key(prompt: str, system: str | None, temperature: float, max_tokens: int) -> str:
+        """Hash of everything that determines a response."""
+        payload = json.dumps([prompt, system or "", temperature, max_tokens])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> AIResponse | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if self._clock() - stored_at > self._cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return replace(response, cached=True)
+
+    def _cache_put(self, key: str, response: AIResponse) -> None:
+        if self._cache_ttl <= 0:
+            return
+        self._cache[key] = (self._clock(), response)
+        self._cache.move_to_end(key)
+        while len(self._cache) > RESPONSE_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------------
+
+    async def _stream(
+        self,
+        provider: AIProvider,
+        prompt: str,
+        system: str | None,
+        temperature: float,
+        max_tokens: int,
+        on_partial: Callable[[str], Awaitable[None]],
+    ) -> AIResponse:
+        """Collect a streamed response, reporting the text once it is long enough."""
+        chunks: list[str] = []
+        length = 0
+        reported = False
+        final: dict[str, Any] = {}
+        async for chunk in provider.stream(prompt, system, temperature, max_tokens, final=final):
+            chunks.append(chunk)
+            length += len(chunk)
+            if not reported and length >= STREAM_PARTIAL_CHARS:
+                reported = True
+                try:
+                    await on_partial("".join(chunks))
+                except Exception as e:
+                    logger.debug(f"Partial AI response callback failed: {e}")
+        self.stats.streamed += 1
+        return AIResponse(
+            content="".join(chunks),
+            model=getattr(provider, "model", provider.name),
+            provider=provider.name,
+            tokens_used=final.get("tokens_used"),
+            finish_reason=final.get("finish_reason"),
+            prompt_tokens=final.get("prompt_tokens"),
+        )
+
     async def generate(
         self,
         prompt: str,
         system: str | None = None,
         temperature: float = 0.7,
         max_tokens: int = 2000,
+        use_cache: bool = True,
+        on_partial: Callable[[str], Awaitable[None]] | None = None,
+        label: str = "default",
     ) -> AIResponse | None:
         """
         Generate AI response using available provider.
 
         Tries providers in order until one succeeds.
 
+        Args:
+            prompt: User prompt
+            system: System prompt (optional)
+            temperature: Creativity (0-1)
+            max_tokens: Maximum response tokens
+            use_cache: Reuse the response of an identical earlier request
+            on_partial: Stream the response and call this with the text
+                received so far once it reaches STREAM_PARTIAL_CHARS
+            label: Prompt type for the per-prompt token and latency stats
+
         Returns:
             AIResponse or None if no provider available
         """
+        self.stats.requests += 1
+        key = self.response_key(prompt, system, temperature, max_tokens)
+        if use_cache:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self.stats.cache_hits += 1
+                self._prompt_stats(label).record(cached)
+                logger.debug(f"AI response for {label} served from cache ({cached.provider})")
+                return cached
+
         for provider in self.providers:
-            try:
-                if not await provider.is_available():
-                    logger.debug(f"Provider {provider.name} not available, skipping")
-                    continue
+            if not await self._is_healthy(provider):
+                logger.debug(f"Provider {provider.name} not available, skipping")
+                continue
 
+            try:
                 logger.info(f"Using AI provider: {provider.name}")
-                return await provider.generate(
-                    prompt=prompt,
-                    system=system,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                )
+                async with self._semaphore:
+                    self.stats.provider_calls += 1
+                    started = time.perf_counter()
+                    if on_partial is not None:
+                        response = await self._stream(
+                            provider, prompt, system, temperature, max_tokens, on_partial
+                        )
+                    else:
+                        response = await provider.generate(
+                            prompt=prompt,
+                            system=system,
+                            temperature=temperature,
+                            max_tokens=max_tokens,
+                        )
+                    latency = time.perf_counter() - started
             except Exception as e:
-                logger.warning(f"Provider {provider.name} failed: {e}")
+                self.stats.failures += 1
+                self._record_failure(provider, str(e) or type(e).__name__)
                 continue
 
+            if response.prompt_tokens is None:
+                response.prompt_tokens = estimate_tokens(f"{system or ''}\n{prompt}")
+            response.latency_s = latency
+            self._prompt_stats(label).record(response)
+            logger.info(
+                f"AI {label}: {response.prompt_tokens} prompt tokens, "
+                f"{response.tokens_used or '?'} used, {latency:.2f}s ({provider.name})"
+            )
+
+            self._record_success(provider)
+            self._cache_put(key, response)
+            return response
+
         logger.error("No AI provider available")
         return None
 
+    def _prompt_stats(self, label: str) -> PromptStats:
+        stats = self.prompt_stats.get(label)
+        if stats is None:
+            stats = self.prompt_stats[label] = PromptStats(label=label)
+        return stats
+
     async def close(self):
         """Close all providers."""
         for provider in self.providers:
@@ -312,6 +739,16 @@ class AIService:
         provider = await self.get_available_provider()
         return provider is not None
 
+    def get_stats(self) -> dict:
+        """Get request counters, cache size, provider health and per-prompt stats."""
+        now = self._clock()
+        return {
+            **self.stats.to_dict(),
+            "cached_responses": len(self._cache),
+            "providers": [self._health_of(p).to_dict(now) for p in self.providers],
+            "prompts": {label: stats.to_dict() for label, stats in self.prompt_stats.items()},
+        }
+
 
 def create_ai_service(
     ai_enabled: bool = False,
@@ -320,6 +757,7 @@ def create_ai_service(
     ollama_host: str = "http://localhost:11434",
     ollama_model: str = "llama3.2",
     openai_model: str = "gpt-4o-mini",
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
 ) -> AIService:
     """
     Factory function to create AI service from config.
@@ -331,11 +769,12 @@ def create_ai_service(
         ollama_host: Ollama server URL
         ollama_model: Ollama model name
         openai_model: OpenAI model name
+        max_concurrency: Requests sent to providers at the same time
 
     Returns:
         Configured AIService
     """
-    service = AIService()
+    service = AIService(max_concurrency=max_concurrency)
 
     if not ai_enabled:
         return service
@@ -353,3 +792,36 @@ def create_ai_service(
             service.add_provider(OpenAIProvider(api_key=openai_api_key, model=openai_model))
 
     return service
+
+
+# Global instance
+_ai_service: AIService | None = None
+
+
+def get_ai_service() -> AIService:
+    """
+    Get global AI service instance built from settings.
+
+    Shared across job runs so provider health and cached responses persist.
+    """
+    global _ai_service
+    if _ai_service is None:
+        from core.config import settings
+
+        _ai_service = create_ai_service(
+            ai_enabled=settings.AI_ENABLED,
+            ai_provider=settings.AI_PROVIDER,
+            openai_api_key=settings.OPENAI_API_KEY,
+            ollama_host=settings.OLLAMA_HOST,
+            ollama_model=settings.OLLAMA_MODEL,
+            max_concurrency=settings.AI_MAX_CONCURRENCY,
+        )
+    return _ai_service
+
+
+async def close_ai_service() -> None:
+    """Close global AI service and its providers' HTTP clients."""
+    global _ai_service
+    if _ai_service is not None:
+        await _ai_service.close()
+        _ai_service = None
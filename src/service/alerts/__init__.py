@@ -1,5 +1,11 @@
-"""Price alerts service."""
+"""Price alerts and notification delivery."""
 
+from service.alerts.notification_bus import (
+    NotificationBus,
+    get_notification_bus,
+    publish_error,
+    publish_notification,
+)
 from service.alerts.price_alerts import (
     PriceAlert,
     PriceAlertManager,
@@ -10,4 +16,8 @@ __all__ = [
     "PriceAlertManager",
     "PriceAlert",
     "get_alert_manager",
+    "NotificationBus",
+    "get_notification_bus",
+    "publish_error",
+    "publish_notification",
 ]
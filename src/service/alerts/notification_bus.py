@@ -0,0 +1,383 @@
+"""
+Notification Bus.
+
+Every Home Assistant notification raised by jobs and alert managers is
+published here and delivered by one worker task:
+
+- per-category dedup window: a repeat of the same topic (notification_id,
+  else title + message) inside the window is dropped
+- per-category rate limit: at most N alerts per category and hour,
+  critical alerts are exempt
+- batching: non-critical alerts arriving within the digest window are
+  merged into one persistent notification; critical alerts go out at once
+
+Publishing never waits for the Supervisor API.
+
+Usage:
+    from service.alerts.notification_bus import publish_notification
+
+    await publish_notification(
+        message="...",
+        title="🐋 Whale activity",
+        notification_id="whale_high_activity",
+        category=AlertCategory.WHALE,
+    )
+
+    await publish_error("3 fetch operations failed", context="Sync job", notification_id="sync_error")
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from service.alerts.notification_manager import (
+    CATEGORIES,
+    CATEGORY_EMOJI,
+    AlertCategory,
+    AlertPriority,
+)
+
+logger = logging.getLogger(__name__)
+
+Sender = Callable[[str, str, str | None], Awaitable[bool]]
+
+# Non-critical alerts arriving within this window are delivered as one digest
+DEFAULT_DIGEST_SECONDS = 10.0
+
+# Rate limits count alerts over this sliding window
+RATE_WINDOW_SECONDS = 3600.0
+
+# Alerts listed per category in a digest
+DIGEST_ITEMS_PER_CATEGORY = 5
+
+DIGEST_TITLE = "Crypto Inspect - Digest"
+DIGEST_NOTIFICATION_ID = "crypto_inspect_digest"
+
+
+@dataclass(frozen=True)
+class CategoryPolicy:
+    """Dedup window and rate limit of one alert category."""
+
+    dedup_seconds: float
+    max_per_hour: int
+
+
+CATEGORY_POLICIES: dict[AlertCategory, CategoryPolicy] = {
+    AlertCategory.PRICE: CategoryPolicy(dedup_seconds=15 * 60, max_per_hour=12),
+    AlertCategory.RISK: CategoryPolicy(dedup_seconds=30 * 60, max_per_hour=6),
+    AlertCategory.OPPORTUNITY: CategoryPolicy(dedup_seconds=60 * 60, max_per_hour=6),
+    AlertCategory.WHALE: CategoryPolicy(dedup_seconds=60 * 60, max_per_hour=4),
+    AlertCategory.PORTFOLIO: CategoryPolicy(dedup_seconds=60 * 60, max_per_hour=4),
+    AlertCategory.GOAL: CategoryPolicy(dedup_seconds=6 * 3600, max_per_hour=4),
+    AlertCategory.SYSTEM: CategoryPolicy(dedup_seconds=10 * 60, max_per_hour=10),
+    AlertCategory.INFO: CategoryPolicy(dedup_seconds=6 * 3600, max_per_hour=4),
+}
+
+
+@dataclass
+class Notification:
+    """Alert waiting for delivery."""
+
+    message: str
+    title: str
+    notification_id: str | None
+    category: AlertCategory
+    priority: AlertPriority
+    published_at: float
+
+    @property
+    def key(self) -> str:
+        """Dedup key: the notification id, else a hash of title and message."""
+        if self.notification_id:
+            return self.notification_id
+        return hashlib.sha1(f"{self.title}\n{self.message}".encode()).hexdigest()
+
+
+@dataclass
+class BusStats:
+    """Notification bus counters."""
+
+    published: int = 0
+    deduplicated: int = 0
+    rate_limited: int = 0
+    delivered: int = 0
+    deliveries: int = 0
+    digests: int = 0
+    failed: int = 0
+    last_delivery: datetime | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "published": self.published,
+            "deduplicated": self.deduplicated,
+            "rate_limited": self.rate_limited,
+            "delivered": self.delivered,
+            "deliveries": self.deliveries,
+            "digests": self.digests,
+            "failed": self.failed,
+            "alerts_per_delivery": round(self.delivered / self.deliveries, 2) if self.deliveries else 0,
+            "last_delivery": self.last_delivery.isoformat() if self.last_delivery else None,
+        }
+
+
+def format_digest(batch: list[Notification]) -> str:
+    """Render alerts as one digest message grouped by category."""
+    lines = []
+    for category in AlertCategory:
+        alerts = [n for n in batch if n.category is category]
+        if not alerts:
+            continue
+
+        lines.append(f"{CATEGORY_EMOJI.get(category, '📌')} {CATEGORIES[category.value]['en']} ({len(alerts)})")
+        for alert in alerts[:DIGEST_ITEMS_PER_CATEGORY]:
+            lines.append(f"**{alert.title}**")
+            lines.append(alert.message)
+        if len(alerts) > DIGEST_ITEMS_PER_CATEGORY:
+            lines.append(f"... and {len(alerts) - DIGEST_ITEMS_PER_CATEGORY} more")
+        lines.append("")
+
+    return "\n".join(lines).rstrip()
+
+
+async def _send_to_supervisor(message: str, title: str, notification_id: str | None) -> bool:
+    """Create a persistent notification in Home Assistant."""
+    from service.ha_integration import get_supervisor_client, notify
+
+    if not get_supervisor_client().is_available:
+        logger.debug(f"[Notifications] Supervisor API not available, dropping '{title}'")
+        return False
+    return await notify(message=message, title=title, notification_id=notification_id)
+
+
+class NotificationBus:
+    """Filters, batches and delivers notifications from one worker task."""
+
+    def __init__(
+        self,
+        sender: Sender | None = None,
+        digest_seconds: float = DEFAULT_DIGEST_SECONDS,
+        policies: dict[AlertCategory, CategoryPolicy] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize bus.
+
+        Args:
+            sender: Coroutine (message, title, notification_id) -> success;
+                defaults to a Home Assistant persistent notification
+            digest_seconds: Window merging non-critical alerts into a digest
+            policies: Dedup window and rate limit per category
+            clock: Monotonic time source for dedup and rate limits
+        """
+        self.sender = sender or _send_to_supervisor
+        self.digest_seconds = digest_seconds
+        self.policies = {**CATEGORY_POLICIES, **(policies or {})}
+        self.clock = clock
+        self.stats = BusStats()
+        self._last_seen: dict[tuple[AlertCategory, str], float] = {}
+        self._recent: dict[AlertCategory, deque[float]] = defaultdict(deque)
+        self._queue: asyncio.Queue[Notification] | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run(self._queue), name="notification-bus")
+        return self._queue
+
+    @property
+    def pending(self) -> int:
+        """Alerts waiting for delivery."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _admit(self, notification: Notification) -> bool:
+        """Apply the category dedup window and rate limit."""
+        policy = self.policies.get(notification.category, CATEGORY_POLICIES[AlertCategory.SYSTEM])
+        now = notification.published_at
+
+        dedup_key = (notification.category, notification.key)
+        last_seen = self._last_seen.get(dedup_key)
+        if last_seen is not None and now - last_seen < policy.dedup_seconds:
+            self.stats.deduplicated += 1
+            return False
+
+        recent = self._recent[notification.category]
+        while recent and now - recent[0] >= RATE_WINDOW_SECONDS:
+            recent.popleft()
+        if notification.priority is not AlertPriority.CRITICAL and len(recent) >= policy.max_per_hour:
+            self.stats.rate_limited += 1
+            logger.debug(f"[Notifications] Rate limit of {notification.category.value} reached, dropping")
+            return False
+
+        self._last_seen[dedup_key] = now
+        recent.append(now)
+        if len(self._last_seen) > 1000:
+            longest = max(p.dedup_seconds for p in self.policies.values())
+            self._last_seen = {k: t for k, t in self._last_seen.items() if now - t < longest}
+        return True
+
+    async def publish(
+        self,
+        message: str,
+        title: str = "Crypto Inspect",
+        notification_id: str | None = None,
+        category: AlertCategory = AlertCategory.SYSTEM,
+        priority: AlertPriority = AlertPriority.IMPORTANT,
+    ) -> bool:
+        """
+        Queue a notification for delivery.
+
+        Args:
+            message: Notification message
+            title: Notification title
+            notification_id: Topic id; also the dedup key
+            category: Category selecting the dedup window and rate limit
+            priority: CRITICAL is delivered at once, others are batched
+
+        Returns:
+            True if queued, False if dropped as duplicate or over the rate limit
+        """
+        notification = Notification(
+            message=message,
+            title=title,
+            notification_id=notification_id,
+            category=category,
+            priority=priority,
+            published_at=self.clock(),
+        )
+        if not self._admit(notification):
+            return False
+
+        self.stats.published += 1
+        self._ensure_started().put_nowait(notification)
+        return True
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch = [await queue.get()]
+            try:
+                if batch[0].priority is not AlertPriority.CRITICAL:
+                    await self._collect(queue, batch)
+                await self._deliver(batch)
+            except Exception as e:
+                logger.error(f"[Notifications] Delivery of {len(batch)} alerts failed: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _collect(self, queue: asyncio.Queue, batch: list[Notification]) -> None:
+        """Add alerts arriving within the digest window; critical ones go out at once."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.digest_seconds
+        while (timeout := deadline - loop.time()) > 0:
+            try:
+                notification = await asyncio.wait_for(queue.get(), timeout)
+            except TimeoutError:
+                break
+
+            if notification.priority is AlertPriority.CRITICAL:
+                try:
+                    await self._deliver([notification])
+                finally:
+                    queue.task_done()
+            else:
+                batch.append(notification)
+
+    async def _deliver(self, batch: list[Notification]) -> None:
+        """Send one alert as-is, several as a digest."""
+        if len(batch) == 1:
+            message, title, notification_id = batch[0].message, batch[0].title, batch[0].notification_id
+        else:
+            message = format_digest(batch)
+            title = f"{DIGEST_TITLE} ({len(batch)})"
+            notification_id = f"{DIGEST_NOTIFICATION_ID}_{int(time.time())}"
+
+        try:
+            sent = await self.sender(message, title, notification_id)
+        except Exception as e:
+            logger.error(f"[Notifications] Failed to send '{title}': {e}")
+            sent = False
+
+        if not sent:
+            self.stats.failed += len(batch)
+            return
+
+        self.stats.deliveries += 1
+        self.stats.delivered += len(batch)
+        self.stats.digests += len(batch) > 1
+        self.stats.last_delivery = datetime.now(UTC)
+        logger.info(f"[Notifications] Delivered '{title}' ({len(batch)} alerts)")
+
+    async def drain(self) -> None:
+        """Wait until every queued notification has been delivered."""
+        if self._queue is not None and self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Deliver queued notifications and stop the worker."""
+        await self.drain()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> dict:
+        """Get bus statistics."""
+        return {"pending": self.pending, "digest_seconds": self.digest_seconds, **self.stats.to_dict()}
+
+
+# Global instance
+_notification_bus: NotificationBus | None = None
+
+
+def get_notification_bus() -> NotificationBus:
+    """Get or create global notification bus."""
+    global _notification_bus
+    if _notification_bus is None:
+        from core.config import settings
+
+        _notification_bus = NotificationBus(digest_seconds=settings.NOTIFICATION_DIGEST_SECONDS)
+    return _notification_bus
+
+
+async def publish_notification(
+    message: str,
+    title: str = "Crypto Inspect",
+    notification_id: str | None = None,
+    category: AlertCategory = AlertCategory.SYSTEM,
+    priority: AlertPriority = AlertPriority.IMPORTANT,
+) -> bool:
+    """Queue a notification on the global bus."""
+    return await get_notification_bus().publish(message, title, notification_id, category, priority)
+
+
+async def publish_error(
+    error_message: str,
+    context: str = "",
+    notification_id: str = "crypto_inspect_error",
+    priority: AlertPriority = AlertPriority.IMPORTANT,
+) -> bool:
+    """Queue a system error notification; repeats of the same id are deduplicated."""
+    message = f"❌ Error: {error_message}"
+    if context:
+        message += f"\n📍 Context: {context}"
+    return await publish_notification(
+        message, "Crypto Inspect - Error", notification_id, AlertCategory.SYSTEM, priority
+    )
+
+
+async def close_notification_bus() -> None:
+    """Deliver queued notifications and stop the bus (application shutdown)."""
+    if _notification_bus is not None:
+        await _notification_bus.close()
@@ -348,6 +348,9 @@ class NotificationManager:
         """
         Add alert and determine if it should be sent immediately.
 
+        Alerts sent now are published on the notification bus, which
+        applies the category dedup window and rate limit and batches them.
+
         Returns True if alert should be sent now, False if added to digest.
         """
         self.pending_alerts.append(alert)
@@ -355,9 +358,18 @@ class NotificationManager:
         should_send = await self.should_notify_now(alert)
 
         if should_send:
+            from service.alerts.notification_bus import publish_notification
+
             alert.sent = True
             self.sent_alerts.append(alert)
             self.pending_alerts.remove(alert)
+            await publish_notification(
+                message=f"{alert.message}\n{alert.message_ru}",
+                title=alert.title,
+                notification_id=f"smart_{alert.category.value}_{(alert.symbol or alert.title).lower()}",
+                category=alert.category,
+                priority=alert.priority,
+            )
 
         return should_send
 
@@ -18,7 +18,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
-import httpx
+from core.http_gateway import GatewayClient, get_http_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -167,14 +167,15 @@ class ArbitrageScanner:
     SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
 
     def __init__(self, timeout: float = 15.0):
-        self._client: httpx.AsyncClient | None = None
+        self._client: GatewayClient | None = None
         self._timeout = timeout
 
-    async def _get_client(self) -> httpx.AsyncClient:
+    async def _get_client(self) -> GatewayClient:
         if self._client is None:
-            self._client = httpx.AsyncClient(
+            self._client = get_http_gateway().client(
                 timeout=self._timeout,
                 headers={"Accept": "application/json"},
+                cache_ttl=10,
             )
         return self._client
 
@@ -227,7 +228,7 @@ class ArbitrageScanner:
             overall_opportunity=overall,
         )
 
-    async def _fetch_bybit_prices(self, client: httpx.AsyncClient) -> dict[str, float]:
+    async def _fetch_bybit_prices(self, client: GatewayClient) -> dict[str, float]:
         """Fetch prices from Bybit."""
         try:
             url = f"{BYBIT_API}/v5/market/tickers"
@@ -249,7 +250,7 @@ class ArbitrageScanner:
             logger.warning(f"Failed to fetch Bybit prices: {e}")
             return {}
 
-    async def _fetch_binance_prices(self, client: httpx.AsyncClient) -> dict[str, float]:
+    async def _fetch_binance_prices(self, client: GatewayClient) -> dict[str, float]:
         """Fetch prices from Binance."""
         try:
             url = f"{BINANCE_API}/api/v3/ticker/price"
@@ -270,7 +271,7 @@ class ArbitrageScanner:
             logger.warning(f"Failed to fetch Binance prices: {e}")
             return {}
 
-    async def _fetch_okx_prices(self, client: httpx.AsyncClient) -> dict[str, float]:
+    async def _fetch_okx_prices(self, client: GatewayClient) -> dict[str, float]:
         """Fetch prices from OKX."""
         try:
             url = f"{OKX_API}/api/v5/market/tickers"
@@ -357,7 +358,7 @@ class ArbitrageScanner:
 
         return spreads
 
-    async def _fetch_funding_arbitrage(self, client: httpx.AsyncClient) -> list[FundingArbitrage]:
+    async def _fetch_funding_arbitrage(self, client: GatewayClient) -> list[FundingArbitrage]:
         """Fetch funding rates for arbitrage analysis."""
         arbs = []
 
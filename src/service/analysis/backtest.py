@@ -6,6 +6,9 @@ Backtests different investment strategies:
 - Smart DCA (Fear & Greed adjusted)
 - Lump Sum
 - Comparison analysis
+- Parameter sweeps (amount / frequency / F&G multipliers)
+
+Simulation runs on numpy arrays via service.analysis.backtest_engine.
 """
 
 import logging
@@ -13,6 +16,21 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any
 
+import numpy as np
+
+from service.analysis.backtest_engine import (
+    FG_SCHEMES,
+    FREQUENCY_DAYS,
+    PriceSeries,
+    SimulationResult,
+    align_fear_greed,
+    fg_multipliers,
+    get_backtest_engine,
+    monthly_average_prices,
+    schedule_mask,
+    simulate,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -88,6 +106,7 @@ class DCABacktester:
     def __init__(self):
         self._cache: dict[str, BacktestResult] = {}
         self._historical_fg: list[dict] = []  # Historical Fear & Greed data
+        self._fg_version = 0  # Bumped on new F&G history, part of result cache keys
 
     def set_fear_greed_history(self, data: list[dict]) -> None:
         """
@@ -97,6 +116,7 @@ class DCABacktester:
             data: List of {"date": datetime, "value": int}
         """
         self._historical_fg = data
+        self._fg_version += 1
 
     def _get_fg_for_date(self, date: datetime) -> int:
         """Get Fear & Greed value for a specific date."""
@@ -118,6 +138,25 @@ class DCABacktester:
         else:
             return self.FG_MULTIPLIERS["extreme_greed"]
 
+    def _fg_table(self) -> tuple[float, ...]:
+        """Get F&G multipliers as a bucket table for the vectorized engine."""
+        return tuple(
+            self.FG_MULTIPLIERS[bucket] for bucket in ("extreme_fear", "fear", "neutral", "greed", "extreme_greed")
+        )
+
+    def _window(self, symbol: str, candles: list[dict], years: int) -> tuple[PriceSeries, datetime, datetime]:
+        """Convert candles to a price series limited to the backtest period."""
+        if not candles:
+            raise ValueError("No candle data provided")
+
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=years * 365)
+        series = PriceSeries.from_candles(symbol, candles).since(int(start_date.timestamp() * 1000))
+
+        if not len(series):
+            raise ValueError("No data in the specified period")
+        return series, start_date, end_date
+
     async def backtest_fixed_dca(
         self,
         symbol: str,
@@ -139,65 +178,11 @@ class DCABacktester:
         Returns:
             BacktestResult
         """
-        if not candles:
-            raise ValueError("No candle data provided")
-
-        # Calculate days between purchases
-        freq_days = {"daily": 1, "weekly": 7, "monthly": 30}
-        interval = freq_days.get(frequency, 7)
-
-        # Filter candles for the period
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=years * 365)
-
-        filtered = [c for c in candles if datetime.fromtimestamp(c.get("timestamp", 0) / 1000) >= start_date]
-
-        if not filtered:
-            raise ValueError("No data in the specified period")
-
-        # Simulate DCA
-        trades = []
-        total_invested = 0.0
-        total_coins = 0.0
-        portfolio_values = []
-
-        for i, candle in enumerate(filtered):
-            if i % interval == 0:
-                price = float(candle.get("close", 0))
-                if price > 0:
-                    coins = amount / price
-                    total_coins += coins
-                    total_invested += amount
-                    trades.append(
-                        {
-                            "date": datetime.fromtimestamp(candle.get("timestamp", 0) / 1000).isoformat(),
-                            "price": price,
-                            "amount": amount,
-                            "coins": coins,
-                        }
-                    )
-
-            # Track portfolio value
-            current_price = float(candle.get("close", 0))
-            portfolio_values.append(total_coins * current_price)
-
-        # Calculate metrics
-        final_price = float(filtered[-1].get("close", 0))
-        current_value = total_coins * final_price
-        avg_buy_price = total_invested / total_coins if total_coins > 0 else 0
-
-        return self._create_result(
-            strategy="Fixed DCA",
-            symbol=symbol,
-            start_date=start_date,
-            end_date=end_date,
-            total_invested=total_invested,
-            current_value=current_value,
-            total_coins=total_coins,
-            avg_buy_price=avg_buy_price,
-            portfolio_values=portfolio_values,
-            trades=trades,
+        series, start_date, end_date = self._window(symbol, candles, years)
+        results = self._run_strategies(
+            series, start_date, end_date, amount, frequency=frequency, include=("fixed_dca",)
         )
+        return results["fixed_dca"]
 
     async def backtest_smart_dca(
         self,
@@ -211,155 +196,334 @@ class DCABacktester:
 
         Invests more during fear, less during greed.
         """
-        if not candles:
-            raise ValueError("No candle data provided")
+        series, start_date, end_date = self._window(symbol, candles, years)
+        results = self._run_strategies(series, start_date, end_date, base_amount, include=("smart_dca",))
+        return results["smart_dca"]
 
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=years * 365)
+    async def backtest_lump_sum(
+        self,
+        symbol: str,
+        candles: list[dict],
+        total_amount: float = 10000.0,
+        years: int = 5,
+    ) -> BacktestResult:
+        """
+        Backtest lump sum investment (invest all at start).
+        """
+        series, start_date, end_date = self._window(symbol, candles, years)
+        results = self._run_strategies(
+            series, start_date, end_date, lump_sum_amount=total_amount, include=("lump_sum",)
+        )
+        return results["lump_sum"]
 
-        filtered = [c for c in candles if datetime.fromtimestamp(c.get("timestamp", 0) / 1000) >= start_date]
+    async def compare_strategies(
+        self,
+        symbol: str,
+        candles: list[dict],
+        amount: float = 100.0,
+        years: int = 5,
+    ) -> dict[str, Any]:
+        """
+        Compare all strategies.
 
-        if not filtered:
-            raise ValueError("No data in the specified period")
+        Returns comparison data for all strategies.
+        """
+        try:
+            series, start_date, end_date = self._window(symbol, candles, years)
+            results = self._run_strategies(series, start_date, end_date, amount, lump_sum_amount=amount * years * 52)
+        except Exception as e:
+            logger.error(f"Strategy backtest failed: {e}")
+            results = {}
 
-        # Weekly DCA with F&G multiplier
-        trades = []
-        total_invested = 0.0
-        total_coins = 0.0
-        portfolio_values = []
-
-        for i, candle in enumerate(filtered):
-            if i % 7 == 0:  # Weekly
-                price = float(candle.get("close", 0))
-                if price > 0:
-                    candle_date = datetime.fromtimestamp(candle.get("timestamp", 0) / 1000)
-                    fg_value = self._get_fg_for_date(candle_date)
-                    multiplier = self._get_fg_multiplier(fg_value)
-
-                    adjusted_amount = base_amount * multiplier
-                    coins = adjusted_amount / price
-
-                    total_coins += coins
-                    total_invested += adjusted_amount
-
-                    trades.append(
-                        {
-                            "date": candle_date.isoformat(),
-                            "price": price,
-                            "amount": adjusted_amount,
-                            "coins": coins,
-                            "fear_greed": fg_value,
-                            "multiplier": multiplier,
-                        }
-                    )
-
-            current_price = float(candle.get("close", 0))
-            portfolio_values.append(total_coins * current_price)
-
-        final_price = float(filtered[-1].get("close", 0))
-        current_value = total_coins * final_price
-        avg_buy_price = total_invested / total_coins if total_coins > 0 else 0
+        return await self._finish_comparison(symbol, results, amount, years)
 
-        return self._create_result(
-            strategy="Smart DCA",
-            symbol=symbol,
-            start_date=start_date,
-            end_date=end_date,
-            total_invested=total_invested,
-            current_value=current_value,
-            total_coins=total_coins,
-            avg_buy_price=avg_buy_price,
-            portfolio_values=portfolio_values,
-            trades=trades,
+    async def compare_stored(self, symbol: str, amount: float = 100.0, years: int = 5) -> dict[str, Any] | None:
+        """
+        Compare all strategies on daily candles stored in the database.
+
+        Results are cached by data version, so repeated calls only cost
+        one aggregate query until new candles are loaded.
+
+        Returns:
+            Comparison dict (see compare_strategies), or None if no data is stored
+        """
+        engine = get_backtest_engine()
+        series = await engine.get_series(symbol)
+        if series is None:
+            return None
+
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=years * 365)
+        window = series.since(int(start_date.timestamp() * 1000))
+        if not len(window):
+            return None
+
+        key = ("compare", symbol, series.version, self._fg_version, amount, years, end_date.date())
+        results = engine.cached(
+            key,
+            lambda: self._run_strategies(window, start_date, end_date, amount, lump_sum_amount=amount * years * 52),
         )
+        return await self._finish_comparison(symbol, results, amount, years)
 
-    async def backtest_lump_sum(
+    async def sweep_stored(
         self,
         symbol: str,
-        candles: list[dict],
-        total_amount: float = 10000.0,
+        amounts: list[float],
+        frequencies: list[str],
+        fg_schemes: list[str],
         years: int = 5,
-    ) -> BacktestResult:
+    ) -> dict[str, Any] | None:
         """
-        Backtest lump sum investment (invest all at start).
+        Run a parameter sweep on daily candles stored in the database.
+
+        Every combination of amount, frequency and F&G multiplier scheme
+        is simulated in one batch.
+
+        Returns:
+            Sweep dict (see sweep), or None if no data is stored
         """
-        if not candles:
-            raise ValueError("No candle data provided")
+        engine = get_backtest_engine()
+        series = await engine.get_series(symbol)
+        if series is None:
+            return None
 
         end_date = datetime.now()
         start_date = end_date - timedelta(days=years * 365)
+        window = series.since(int(start_date.timestamp() * 1000))
+        if not len(window):
+            return None
+
+        key = (
+            "sweep",
+            symbol,
+            series.version,
+            self._fg_version,
+            tuple(amounts),
+            tuple(frequencies),
+            tuple(fg_schemes),
+            years,
+            end_date.date(),
+        )
+        return engine.cached(key, lambda: self.sweep(window, amounts, frequencies, fg_schemes, years))
 
-        filtered = [c for c in candles if datetime.fromtimestamp(c.get("timestamp", 0) / 1000) >= start_date]
+    def sweep(
+        self,
+        series: PriceSeries,
+        amounts: list[float],
+        frequencies: list[str],
+        fg_schemes: list[str],
+        years: int = 5,
+    ) -> dict[str, Any]:
+        """
+        Simulate a grid of DCA parameters on a price series.
+
+        Return, drawdown and Sharpe ratio do not depend on the purchase
+        amount, so each frequency/scheme pair is simulated once per unit
+        amount and scaled for every amount.
 
-        if not filtered:
+        Args:
+            series: Daily closes for the backtest period
+            amounts: Amounts per purchase
+            frequencies: "daily", "weekly", "monthly"
+            fg_schemes: Names from FG_SCHEMES ("none" is plain DCA)
+            years: Backtest period, used for the annualized return
+
+        Returns:
+            Dict with scenario rows sorted by total return and the best scenario
+        """
+        if not len(series):
             raise ValueError("No data in the specified period")
+        unknown = [name for name in fg_schemes if name not in FG_SCHEMES]
+        if unknown:
+            raise ValueError(f"Unknown F&G schemes: {', '.join(unknown)}")
+        unknown = [name for name in frequencies if name not in FREQUENCY_DAYS]
+        if unknown:
+            raise ValueError(f"Unknown frequencies: {', '.join(unknown)}")
+
+        days = len(series)
+        fg_values = align_fear_greed(series.timestamps, self._historical_fg)
+        combos = [(frequency, scheme) for frequency in frequencies for scheme in fg_schemes]
+        weights = np.vstack(
+            [
+                schedule_mask(days, FREQUENCY_DAYS[frequency]) * fg_multipliers(fg_values, FG_SCHEMES[scheme])
+                for frequency, scheme in combos
+            ]
+        )
+        sim = simulate(series.closes, weights)
+
+        scale = np.asarray(amounts, dtype=np.float64)[:, None]
+        invested = scale * sim.total_invested
+        value = scale * sim.current_value
+        with np.errstate(divide="ignore", invalid="ignore"):
+            annualized = np.where(invested > 0, ((value / invested) ** (1 / years) - 1) * 100, 0.0)
+
+        rows = []
+        for a, amount in enumerate(amounts):
+            for c, (frequency, scheme) in enumerate(combos):
+                rows.append(
+                    {
+                        "amount": amount,
+                        "frequency": frequency,
+                        "fg_scheme": scheme,
+                        "total_invested": round(float(invested[a, c]), 2),
+                        "current_value": round(float(value[a, c]), 2),
+                        "total_return_pct": round(float(sim.total_return_pct[c]), 2),
+                        "annualized_return": round(float(annualized[a, c]), 2),
+                        "max_drawdown": round(float(sim.max_drawdown[c]), 2),
+                        "sharpe_ratio": round(float(sim.sharpe_ratio[c]), 2),
+                        "buy_count": int(sim.buy_count[c]),
+                    }
+                )
+        rows.sort(key=lambda row: row["total_return_pct"], reverse=True)
 
-        # Buy everything at start
-        entry_price = float(filtered[0].get("close", 0))
-        total_coins = total_amount / entry_price if entry_price > 0 else 0
+        return {
+            "symbol": series.symbol,
+            "period_years": years,
+            "days": days,
+            "scenarios": len(rows),
+            "best": rows[0] if rows else None,
+            "results": rows,
+        }
 
-        trades = [
-            {
-                "date": start_date.isoformat(),
-                "price": entry_price,
-                "amount": total_amount,
-                "coins": total_coins,
+    def _run_strategies(
+        self,
+        series: PriceSeries,
+        start_date: datetime,
+        end_date: datetime,
+        amount: float = 100.0,
+        frequency: str = "weekly",
+        lump_sum_amount: float = 0.0,
+        include: tuple[str, ...] = ("fixed_dca", "smart_dca", "lump_sum"),
+    ) -> dict[str, BacktestResult]:
+        """
+        Simulate strategies on a price series in one vectorized pass.
+
+        Fixed DCA buys every frequency period, Smart DCA buys weekly with the
+        F&G multiplier of the purchase day, lump sum buys once on the first day.
+        """
+        days = len(series)
+        fg_values = align_fear_greed(series.timestamps, self._historical_fg) if "smart_dca" in include else None
+
+        rows: dict[str, np.ndarray] = {}
+        if "fixed_dca" in include:
+            rows["fixed_dca"] = schedule_mask(days, FREQUENCY_DAYS.get(frequency, 7)) * amount
+        if "smart_dca" in include:
+            rows["smart_dca"] = schedule_mask(days, 7) * fg_multipliers(fg_values, self._fg_table()) * amount
+        if "lump_sum" in include:
+            lump = np.zeros(days)
+            lump[0] = lump_sum_amount
+            rows["lump_sum"] = lump
+
+        sim = simulate(series.closes, np.vstack(list(rows.values())))
+
+        results = {}
+        for row, name in enumerate(rows):
+            if name == "lump_sum":
+                results[name] = self._lump_sum_result(series, start_date, end_date, lump_sum_amount, sim, row)
+            else:
+                results[name] = self._dca_result(series, start_date, end_date, name, sim, row, fg_values)
+        return results
+
+    def _dca_result(
+        self,
+        series: PriceSeries,
+        start_date: datetime,
+        end_date: datetime,
+        name: str,
+        sim: SimulationResult,
+        row: int,
+        fg_values: np.ndarray | None,
+    ) -> BacktestResult:
+        """Build a DCA BacktestResult from one simulation row."""
+        weights = sim.weights[row]
+        buys = np.flatnonzero(weights > 0)
+        prices = series.closes[buys]
+        total_invested = float(sim.total_invested[row])
+        total_coins = float(sim.total_coins[row])
+
+        # Only the last trades are kept on the result
+        trades = []
+        for i in buys[-10:]:
+            trade = {
+                "date": datetime.fromtimestamp(series.timestamps[i] / 1000).isoformat(),
+                "price": float(series.closes[i]),
+                "amount": float(weights[i]),
+                "coins": float(weights[i] / series.closes[i]),
             }
-        ]
+            if name == "smart_dca":
+                trade["fear_greed"] = int(fg_values[i])
+                trade["multiplier"] = self._get_fg_multiplier(int(fg_values[i]))
+            trades.append(trade)
 
-        # Track portfolio value
-        portfolio_values = [total_coins * float(c.get("close", 0)) for c in filtered]
+        months, averages = monthly_average_prices(series.timestamps[buys], prices)
 
-        final_price = float(filtered[-1].get("close", 0))
-        current_value = total_coins * final_price
+        return self._create_result(
+            strategy="Smart DCA" if name == "smart_dca" else "Fixed DCA",
+            symbol=series.symbol,
+            start_date=start_date,
+            end_date=end_date,
+            total_invested=total_invested,
+            current_value=float(sim.current_value[row]),
+            total_coins=total_coins,
+            avg_buy_price=total_invested / total_coins if total_coins > 0 else 0,
+            max_drawdown=float(sim.max_drawdown[row]),
+            sharpe_ratio=float(sim.sharpe_ratio[row]),
+            buy_count=len(buys),
+            best_month=self._month_summary(months, averages, int(np.argmin(averages))) if months else {},
+            worst_month=self._month_summary(months, averages, int(np.argmax(averages))) if months else {},
+            trades=trades,
+        )
+
+    def _lump_sum_result(
+        self,
+        series: PriceSeries,
+        start_date: datetime,
+        end_date: datetime,
+        total_amount: float,
+        sim: SimulationResult,
+        row: int,
+    ) -> BacktestResult:
+        """Build a lump sum BacktestResult from one simulation row."""
+        entry_price = float(series.closes[0])
+        total_coins = float(sim.total_coins[row])
+        month = {"month": start_date.isoformat()[:7], "avg_price": round(entry_price, 2)}
 
         return self._create_result(
             strategy="Lump Sum",
-            symbol=symbol,
+            symbol=series.symbol,
             start_date=start_date,
             end_date=end_date,
             total_invested=total_amount,
-            current_value=current_value,
+            current_value=float(sim.current_value[row]),
             total_coins=total_coins,
             avg_buy_price=entry_price,
-            portfolio_values=portfolio_values,
-            trades=trades,
+            max_drawdown=float(sim.max_drawdown[row]),
+            sharpe_ratio=float(sim.sharpe_ratio[row]),
+            buy_count=1,
+            best_month=month,
+            worst_month=month if entry_price > 0 else {},
+            trades=[
+                {
+                    "date": start_date.isoformat(),
+                    "price": entry_price,
+                    "amount": total_amount,
+                    "coins": total_coins,
+                }
+            ],
         )
 
-    async def compare_strategies(
+    @staticmethod
+    def _month_summary(months: list[str], averages: np.ndarray, index: int) -> dict:
+        return {"month": months[index], "avg_price": round(float(averages[index]), 2)}
+
+    async def _finish_comparison(
         self,
         symbol: str,
-        candles: list[dict],
-        amount: float = 100.0,
-        years: int = 5,
+        results: dict[str, BacktestResult],
+        amount: float,
+        years: int,
     ) -> dict[str, Any]:
-        """
-        Compare all strategies.
-
-        Returns comparison data for all strategies.
-        """
-        # Calculate equivalent lump sum
-        weeks_in_period = years * 52
-        lump_sum_amount = amount * weeks_in_period
-
-        results = {}
-
-        try:
-            results["fixed_dca"] = await self.backtest_fixed_dca(symbol, candles, amount, "weekly", years)
-        except Exception as e:
-            logger.error(f"Fixed DCA backtest failed: {e}")
-
-        try:
-            results["smart_dca"] = await self.backtest_smart_dca(symbol, candles, amount, years)
-        except Exception as e:
-            logger.error(f"Smart DCA backtest failed: {e}")
-
-        try:
-            results["lump_sum"] = await self.backtest_lump_sum(symbol, candles, lump_sum_amount, years)
-        except Exception as e:
-            logger.error(f"Lump sum backtest failed: {e}")
-
-        # Determine best strategy
+        """Pick the best strategy, cache and publish results."""
         best_strategy = None
         best_return = float("-inf")
 
@@ -392,10 +556,14 @@ class DCABacktester:
         current_value: float,
         total_coins: float,
         avg_buy_price: float,
-        portfolio_values: list[float],
+        max_drawdown: float,
+        sharpe_ratio: float,
+        buy_count: int,
+        best_month: dict,
+        worst_month: dict,
         trades: list[dict],
     ) -> BacktestResult:
-        """Create BacktestResult with calculated metrics."""
+        """Create BacktestResult with calculated returns."""
         # Calculate return
         total_return = (current_value - total_invested) / total_invested * 100 if total_invested > 0 else 0
 
@@ -407,15 +575,6 @@ class DCABacktester:
         else:
             annualized = 0
 
-        # Max drawdown
-        max_dd = self._calculate_max_drawdown(portfolio_values)
-
-        # Sharpe ratio (simplified)
-        sharpe = self._calculate_sharpe(portfolio_values)
-
-        # Best/worst month
-        best_month, worst_month = self._find_best_worst_months(trades)
-
         return BacktestResult(
             strategy=strategy,
             symbol=symbol,
@@ -426,90 +585,15 @@ class DCABacktester:
             total_coins=total_coins,
             total_return_pct=total_return,
             annualized_return=annualized,
-            max_drawdown=max_dd,
-            sharpe_ratio=sharpe,
-            buy_count=len(trades),
+            max_drawdown=max_drawdown,
+            sharpe_ratio=sharpe_ratio,
+            buy_count=buy_count,
             avg_buy_price=avg_buy_price,
             best_month=best_month,
             worst_month=worst_month,
-            trades=trades[-10:],  # Keep last 10 trades
+            trades=trades,
         )
 
-    def _calculate_max_drawdown(self, values: list[float]) -> float:
-        """Calculate maximum drawdown percentage."""
-        if len(values) < 2:
-            return 0.0
-
-        peak = values[0]
-        max_dd = 0.0
-
-        for value in values:
-            if value > peak:
-                peak = value
-            if peak > 0:
-                dd = (peak - value) / peak * 100
-                max_dd = max(max_dd, dd)
-
-        return max_dd
-
-    def _calculate_sharpe(self, values: list[float]) -> float:
-        """Calculate simplified Sharpe ratio."""
-        if len(values) < 30:
-            return 0.0
-
-        returns = []
-        for i in range(1, len(values)):
-            if values[i - 1] > 0:
-                returns.append((values[i] - values[i - 1]) / values[i - 1])
-
-        if not returns:
-            return 0.0
-
-        mean_return = sum(returns) / len(returns)
-        variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
-        std_dev = variance**0.5
-
-        if std_dev == 0:
-            return 0.0
-
-        # Annualized (assuming daily values)
-        risk_free = 0.04 / 365
-        sharpe = ((mean_return - risk_free) / std_dev) * (365**0.5)
-
-        return sharpe
-
-    def _find_best_worst_months(self, trades: list[dict]) -> tuple[dict, dict]:
-        """Find best and worst months based on entry prices."""
-        if not trades:
-            return {}, {}
-
-        monthly_data = {}
-
-        for trade in trades:
-            date_str = trade.get("date", "")[:7]  # YYYY-MM
-            if date_str not in monthly_data:
-                monthly_data[date_str] = {"prices": [], "amount": 0}
-
-            monthly_data[date_str]["prices"].append(trade.get("price", 0))
-            monthly_data[date_str]["amount"] += trade.get("amount", 0)
-
-        best_month = {}
-        worst_month = {}
-        best_avg = float("inf")
-        worst_avg = 0
-
-        for month, data in monthly_data.items():
-            if data["prices"]:
-                avg = sum(data["prices"]) / len(data["prices"])
-                if avg < best_avg:
-                    best_avg = avg
-                    best_month = {"month": month, "avg_price": round(avg, 2)}
-                if avg > worst_avg:
-                    worst_avg = avg
-                    worst_month = {"month": month, "avg_price": round(avg, 2)}
-
-        return best_month, worst_month
-
     async def _publish_to_ha(
         self,
         results: dict[str, BacktestResult],
@@ -522,3 +606,15 @@ class DCABacktester:
     def get_cached_result(self, symbol: str) -> BacktestResult | None:
         """Get cached backtest result."""
         return self._cache.get(symbol)
+
+
+# Global instance
+_backtester: DCABacktester | None = None
+
+
+def get_backtester() -> DCABacktester:
+    """Get global DCA backtester instance."""
+    global _backtester
+    if _backtester is None:
+        _backtester = DCABacktester()
+    return _backtester
@@ -0,0 +1,355 @@
+"""
+Vectorized Backtest Engine.
+
+Array-based simulation core for DCA backtests:
+- Daily closes loaded from candlestick_records as numpy arrays
+- Every strategy is a row of per-day investment weights, so fixed DCA,
+  Smart DCA (Fear & Greed adjusted), lump sum and whole parameter grids
+  are simulated together with one cumulative sum
+- Price series and results cached by data version (row count, last
+  candle, last load time), so repeated queries skip the database scan
+"""
+
+import logging
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+DAY_MS = 86_400_000
+
+# Days between purchases
+FREQUENCY_DAYS = {"daily": 1, "weekly": 7, "monthly": 30}
+
+# Fear & Greed bucket edges: <20 extreme fear, <40 fear, <60 neutral, <80 greed, else extreme greed
+FG_BUCKET_EDGES = np.array([20, 40, 60, 80])
+FG_NEUTRAL = 50
+
+# Multiplier tables per F&G bucket (extreme_fear, fear, neutral, greed, extreme_greed)
+FG_SCHEMES: dict[str, tuple[float, float, float, float, float]] = {
+    "none": (1.0, 1.0, 1.0, 1.0, 1.0),
+    "mild": (1.5, 1.25, 1.0, 0.75, 0.5),
+    "standard": (2.0, 1.5, 1.0, 0.5, 0.25),
+    "aggressive": (3.0, 2.0, 1.0, 0.25, 0.0),
+}
+
+RISK_FREE_DAILY = 0.04 / 365
+SHARPE_MIN_POINTS = 30
+
+RESULT_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class PriceSeries:
+    """Daily close prices for one symbol."""
+
+    symbol: str
+    timestamps: np.ndarray  # int64, ms, ascending
+    closes: np.ndarray  # float64
+    version: str = ""
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_candles(cls, symbol: str, candles: list[dict], version: str = "") -> "PriceSeries":
+        """Build a series from candle dicts ({"timestamp": ms, "close": price})."""
+        count = len(candles)
+        timestamps = np.fromiter((c.get("timestamp", 0) for c in candles), dtype=np.int64, count=count)
+        closes = np.fromiter((float(c.get("close", 0)) for c in candles), dtype=np.float64, count=count)
+        return cls(symbol, timestamps, closes, version)
+
+    def since(self, start_ms: int) -> "PriceSeries":
+        """Get the days at or after start_ms."""
+        keep = self.timestamps >= start_ms
+        return PriceSeries(self.symbol, self.timestamps[keep], self.closes[keep], self.version)
+
+
+@dataclass
+class SimulationResult:
+    """Per-scenario metrics of a simulation batch (one array element per row)."""
+
+    weights: np.ndarray  # (scenarios, days) amount invested per day
+    coins: np.ndarray  # (scenarios, days) cumulative coins held
+    total_invested: np.ndarray
+    total_coins: np.ndarray
+    current_value: np.ndarray
+    total_return_pct: np.ndarray
+    max_drawdown: np.ndarray
+    sharpe_ratio: np.ndarray
+    buy_count: np.ndarray
+
+
+# =============================================================================
+# Vectorized primitives
+# =============================================================================
+
+
+def schedule_mask(days: int, frequency_days: int) -> np.ndarray:
+    """Get boolean mask of purchase days (every frequency_days, starting at day 0)."""
+    return np.arange(days) % max(frequency_days, 1) == 0
+
+
+def align_fear_greed(timestamps: np.ndarray, history: list[dict]) -> np.ndarray:
+    """
+    Align Fear & Greed history to series days.
+
+    Args:
+        timestamps: Series timestamps in ms
+        history: List of {"date": datetime, "value": int}; first entry per day wins
+
+    Returns:
+        int array of F&G values per day (neutral where history has no entry)
+    """
+    values = np.full(len(timestamps), FG_NEUTRAL, dtype=np.int64)
+    if not history or not len(timestamps):
+        return values
+
+    by_day: dict[int, int] = {}
+    for entry in history:
+        date = entry.get("date")
+        if date:
+            by_day.setdefault(date.date().toordinal(), entry.get("value", FG_NEUTRAL))
+
+    # Local calendar day of each candle, as proleptic ordinal
+    epoch_ordinal = datetime(1970, 1, 1).toordinal()
+    offset_ms = int(datetime.now().astimezone().utcoffset().total_seconds() * 1000)
+    series_days = (timestamps + offset_ms) // DAY_MS + epoch_ordinal
+
+    hist_days = np.fromiter(by_day.keys(), dtype=np.int64, count=len(by_day))
+    hist_values = np.fromiter(by_day.values(), dtype=np.int64, count=len(by_day))
+    order = np.argsort(hist_days)
+    hist_days, hist_values = hist_days[order], hist_values[order]
+
+    pos = np.clip(np.searchsorted(hist_days, series_days), 0, len(hist_days) - 1)
+    matched = hist_days[pos] == series_days
+    values[matched] = hist_values[pos[matched]]
+    return values
+
+
+def fg_multipliers(fg_values: np.ndarray, table: tuple[float, ...]) -> np.ndarray:
+    """Map F&G values to purchase multipliers via a 5-bucket table."""
+    buckets = np.searchsorted(FG_BUCKET_EDGES, fg_values, side="right")
+    return np.asarray(table, dtype=np.float64)[buckets]
+
+
+def simulate(closes: np.ndarray, weights: np.ndarray) -> SimulationResult:
+    """
+    Simulate a batch of strategies in one pass.
+
+    Args:
+        closes: (days,) close prices
+        weights: (scenarios, days) amount invested on each day
+
+    Returns:
+        SimulationResult with per-scenario metrics
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    tradable = closes > 0
+    weights = np.where(tradable, weights, 0.0)
+    safe_closes = np.where(tradable, closes, 1.0)
+
+    coins = np.cumsum(weights / safe_closes, axis=1)
+    values = coins * closes
+
+    total_invested = weights.sum(axis=1)
+    total_coins = coins[:, -1]
+    current_value = values[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total_return = np.where(total_invested > 0, (current_value - total_invested) / total_invested * 100, 0.0)
+
+    return SimulationResult(
+        weights=weights,
+        coins=coins,
+        total_invested=total_invested,
+        total_coins=total_coins,
+        current_value=current_value,
+        total_return_pct=total_return,
+        max_drawdown=max_drawdown(values),
+        sharpe_ratio=sharpe_ratio(values),
+        buy_count=(weights > 0).sum(axis=1),
+    )
+
+
+def max_drawdown(values: np.ndarray) -> np.ndarray:
+    """Get max drawdown percentage per row of a (scenarios, days) value matrix."""
+    values = np.atleast_2d(values)
+    if values.shape[1] < 2:
+        return np.zeros(values.shape[0])
+    peaks = np.maximum.accumulate(values, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdowns = np.where(peaks > 0, (peaks - values) / peaks * 100, 0.0)
+    return drawdowns.max(axis=1)
+
+
+def sharpe_ratio(values: np.ndarray) -> np.ndarray:
+    """Get annualized Sharpe ratio of daily value changes per row."""
+    values = np.atleast_2d(values)
+    if values.shape[1] < SHARPE_MIN_POINTS:
+        return np.zeros(values.shape[0])
+
+    prev, cur = values[:, :-1], values[:, 1:]
+    valid = prev > 0
+    count = valid.sum(axis=1)
+    returns = np.where(valid, (cur - prev) / np.where(valid, prev, 1.0), 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = returns.sum(axis=1) / count
+        variance = np.where(valid, (returns - mean[:, None]) ** 2, 0.0).sum(axis=1) / count
+        std = np.sqrt(variance)
+        sharpe = (mean - RISK_FREE_DAILY) / std * np.sqrt(365)
+    return np.where((count > 0) & (std > 0), sharpe, 0.0)
+
+
+def monthly_average_prices(timestamps: np.ndarray, prices: np.ndarray) -> tuple[list[str], np.ndarray]:
+    """
+    Average prices by local calendar month.
+
+    Returns:
+        (["YYYY-MM", ...] in chronological order, average price per month)
+    """
+    if not len(timestamps):
+        return [], np.zeros(0)
+    offset_ms = int(datetime.now().astimezone().utcoffset().total_seconds() * 1000)
+    months = (timestamps + offset_ms).astype("datetime64[ms]").astype("datetime64[M]")
+    keys, inverse = np.unique(months, return_inverse=True)
+    averages = np.bincount(inverse, weights=prices) / np.bincount(inverse)
+    return [str(key) for key in keys], averages
+
+
+# =============================================================================
+# Data loading and caching
+# =============================================================================
+
+
+async def get_data_version(symbol: str) -> str | None:
+    """
+    Get data version of stored daily candles.
+
+    Changes whenever daily candles are added or reloaded.
+
+    Returns:
+        Version string, or None if no daily candles are stored
+    """
+    from models.session import async_session_maker
+
+    async with async_session_maker() as session:
+        result = await session.execute(
+            text(
+                """
+                SELECT COUNT(*), MAX(timestamp), MAX(loaded_at)
+                FROM candlestick_records
+                WHERE symbol = :symbol AND interval = '1d'
+                """
+            ),
+            {"symbol": symbol},
+        )
+        count, last_ts, last_loaded = result.one()
+
+    if not count:
+        return None
+    return f"{count}:{last_ts}:{last_loaded}"
+
+
+async def load_daily_closes(symbol: str, version: str = "") -> PriceSeries:
+    """
+    Load daily closes for a symbol.
+
+    Closed months come memory-mapped from the candle archive, newer days
+    from candlestick_records. If several exchanges store the same day,
+    the first exchange alphabetically wins.
+    """
+    from service.candlestick.archive import load_history
+
+    history = await load_history(symbol, "1d")
+    return PriceSeries(symbol, history.timestamps, history.close, version)
+
+
+class BacktestEngine:
+    """
+    Cache front for DB-backed backtests.
+
+    Price series and computed results are keyed by the data version of
+    the symbol's daily candles, so they stay valid until new candles land.
+    """
+
+    def __init__(self, cache_size: int = RESULT_CACHE_SIZE):
+        self._series: dict[str, PriceSeries] = {}
+        self._results: OrderedDict[tuple, Any] = OrderedDict()
+        self._cache_size = cache_size
+        self._hits = 0
+        self._misses = 0
+
+    async def get_series(self, symbol: str) -> PriceSeries | None:
+        """
+        Get daily closes for a symbol, reloading only when the data version changed.
+
+        Returns:
+            PriceSeries, or None if no daily candles are stored
+        """
+        version = await get_data_version(symbol)
+        if version is None:
+            return None
+
+        cached = self._series.get(symbol)
+        if cached is not None and cached.version == version:
+            return cached
+
+        series = await load_daily_closes(symbol, version)
+        self._series[symbol] = series
+        logger.debug(f"Loaded {len(series)} daily closes for {symbol} (version {version})")
+        return series
+
+    def cached(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Get a cached result or compute and store it.
+
+        Args:
+            key: Cache key; must include the series version
+            compute: Zero-argument function producing the result
+        """
+        if key in self._results:
+            self._results.move_to_end(key)
+            self._hits += 1
+            return self._results[key]
+
+        self._misses += 1
+        value = compute()
+        self._results[key] = value
+        if len(self._results) > self._cache_size:
+            self._results.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop all cached series and results."""
+        self._series.clear()
+        self._results.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        total = self._hits + self._misses
+        return {
+            "series": {symbol: {"days": len(s), "version": s.version} for symbol, s in self._series.items()},
+            "results_cached": len(self._results),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / total, 3) if total else None,
+        }
+
+
+# Global instance
+_backtest_engine: BacktestEngine | None = None
+
+
+def get_backtest_engine() -> BacktestEngine:
+    """Get global backtest engine instance."""
+    global _backtest_engine
+    if _backtest_engine is None:
+        _backtest_engine = BacktestEngine()
+    return _backtest_engine
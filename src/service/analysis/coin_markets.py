@@ -0,0 +1,281 @@
+"""
+CoinGecko Market Snapshot.
+
+Bulk loader for CoinGecko market data shared by the per-symbol analyzers
+(DCA, profit taking, volatility, portfolio):
+
+- Prices, 24h range/change and ATH for every tracked coin come from one
+  ``/coins/markets`` request per 250 coins instead of one ``/coins/{id}``
+  request per symbol
+- Daily price history (``/market_chart``, one coin per request on
+  CoinGecko) is cached locally for hours; missing histories are fetched
+  together and spaced by the gateway's CoinGecko rate limit
+
+Every symbol an analyzer asks for becomes tracked, so the next refresh
+covers all of them in the same request.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from core.constants import COINGECKO_ID_MAP
+from core.http_gateway import GatewayClient, get_http_gateway
+
+logger = logging.getLogger(__name__)
+
+COINGECKO_API = "https://api.coingecko.com/api/v3"
+
+# CoinGecko refreshes market data about once a minute
+SNAPSHOT_TTL = 120.0
+# Daily history barely changes within a few hours
+HISTORY_TTL = 6 * 3600.0
+# /coins/markets page size limit
+PAGE_SIZE = 250
+
+
+def coin_id(symbol: str) -> str:
+    """CoinGecko id for a ticker ("BTC", "btc/usdt") or an id passed through ("bitcoin")."""
+    base = symbol.split("/")[0]
+    return COINGECKO_ID_MAP.get(base.upper(), base.lower())
+
+
+@dataclass
+class CoinMarket:
+    """Market data of one coin from /coins/markets."""
+
+    coin_id: str
+    price: float
+    high_24h: float
+    low_24h: float
+    change_24h_pct: float
+    ath: float
+    market_cap: float
+    volume_24h: float
+    updated_at: datetime
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "coin_id": self.coin_id,
+            "price": self.price,
+            "high_24h": self.high_24h,
+            "low_24h": self.low_24h,
+            "change_24h_pct": round(self.change_24h_pct, 2),
+            "ath": self.ath,
+            "market_cap": self.market_cap,
+            "volume_24h": self.volume_24h,
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+@dataclass
+class LoaderStats:
+    """Request counters."""
+
+    snapshot_requests: int = 0
+    snapshot_refreshes: int = 0
+    history_requests: int = 0
+    history_hits: int = 0
+    errors: int = 0
+    last_refresh: datetime | None = None
+    missing: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "snapshot_requests": self.snapshot_requests,
+            "snapshot_refreshes": self.snapshot_refreshes,
+            "history_requests": self.history_requests,
+            "history_hits": self.history_hits,
+            "errors": self.errors,
+            "last_refresh": self.last_refresh.isoformat() if self.last_refresh else None,
+            "missing": self.missing,
+        }
+
+
+def _number(value: Any) -> float:
+    return float(value) if value is not None else 0.0
+
+
+class CoinMarketLoader:
+    """Shared, bulk-refreshed CoinGecko market snapshot and history cache."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._client: GatewayClient | None = None
+        self._tracked: set[str] = set()
+        self._markets: dict[str, CoinMarket] = {}
+        self._snapshot_at: float | None = None
+        self._histories: dict[tuple[str, int], tuple[float, list[float]]] = {}
+        self.stats = LoaderStats()
+
+    def _get_client(self) -> GatewayClient:
+        if self._client is None:
+            self._client = get_http_gateway().client(timeout=30.0)
+        return self._client
+
+    def track(self, symbols: list[str]) -> None:
+        """Add symbols to the bulk refresh."""
+        self._tracked.update(coin_id(s) for s in symbols)
+
+    def _is_fresh(self) -> bool:
+        return self._snapshot_at is not None and self._clock() - self._snapshot_at < SNAPSHOT_TTL
+
+    async def get_markets(self, symbols: list[str], force_refresh: bool = False) -> dict[str, CoinMarket]:
+        """
+        Get market data for symbols.
+
+        Refreshes the whole tracked set in bulk when the snapshot is stale
+        or a symbol has not been loaded yet.
+
+        Args:
+            symbols: Tickers or CoinGecko ids
+            force_refresh: Ignore the snapshot TTL
+
+        Returns:
+            {symbol: CoinMarket} for the symbols CoinGecko returned
+        """
+        ids = {symbol: coin_id(symbol) for symbol in symbols}
+        self.track(symbols)
+
+        new_ids = set(ids.values()) - self._markets.keys() - set(self.stats.missing)
+        if force_refresh or not self._is_fresh() or new_ids:
+            await self.refresh()
+
+        return {symbol: self._markets[cg_id] for symbol, cg_id in ids.items() if cg_id in self._markets}
+
+    async def get_market(self, symbol: str) -> CoinMarket | None:
+        """Get market data for one symbol."""
+        return (await self.get_markets([symbol])).get(symbol)
+
+    async def refresh(self) -> int:
+        """
+        Reload /coins/markets for all tracked coins.
+
+        Returns:
+            Number of coins loaded. If a page fails, the pages already
+            fetched are kept and the remaining coins keep their previous data
+        """
+        ids = sorted(self._tracked)
+        if not ids:
+            return 0
+
+        client = self._get_client()
+        loaded: dict[str, CoinMarket] = {}
+        fetched: set[str] = set()
+        now = datetime.now()
+        for start in range(0, len(ids), PAGE_SIZE):
+            chunk = ids[start : start + PAGE_SIZE]
+            self.stats.snapshot_requests += 1
+            try:
+                response = await client.get(
+                    f"{COINGECKO_API}/coins/markets",
+                    params={
+                        "vs_currency": "usd",
+                        "ids": ",".join(chunk),
+                        "per_page": PAGE_SIZE,
+                        "page": 1,
+                        "price_change_percentage": "24h",
+                    },
+                )
+                if response.status_code == 429:
+                    logger.warning("CoinGecko rate limited, keeping previous data for the remaining coins")
+                    self.stats.errors += 1
+                    break
+                response.raise_for_status()
+                rows = response.json()
+            except Exception as e:
+                logger.warning(f"CoinGecko markets fetch failed: {e}")
+                self.stats.errors += 1
+                break
+
+            fetched.update(chunk)
+            for row in rows:
+                loaded[row["id"]] = CoinMarket(
+                    coin_id=row["id"],
+                    price=_number(row.get("current_price")),
+                    high_24h=_number(row.get("high_24h")),
+                    low_24h=_number(row.get("low_24h")),
+                    change_24h_pct=_number(row.get("price_change_percentage_24h")),
+                    ath=_number(row.get("ath")),
+                    market_cap=_number(row.get("market_cap")),
+                    volume_24h=_number(row.get("total_volume")),
+                    updated_at=now,
+                )
+
+        if not fetched:
+            return 0
+
+        # Partial snapshots advance the timestamp too, so a rate limit is not retried before the TTL
+        self._markets.update(loaded)
+        self._snapshot_at = self._clock()
+        self.stats.snapshot_refreshes += 1
+        self.stats.last_refresh = now
+        self.stats.missing = sorted(fetched - loaded.keys())
+        if self.stats.missing:
+            logger.debug(f"CoinGecko returned no market data for: {', '.join(self.stats.missing)}")
+        return len(loaded)
+
+    async def get_history(self, symbol: str, days: int) -> list[float]:
+        """
+        Get cached daily prices (oldest first) from /market_chart.
+
+        Returns:
+            Prices, empty if CoinGecko is unavailable
+        """
+        key = (coin_id(symbol), days)
+        cached = self._histories.get(key)
+        if cached is not None and self._clock() - cached[0] < HISTORY_TTL:
+            self.stats.history_hits += 1
+            return cached[1]
+
+        self.stats.history_requests += 1
+        try:
+            response = await self._get_client().get(
+                f"{COINGECKO_API}/coins/{key[0]}/market_chart",
+                params={"vs_currency": "usd", "days": days},
+            )
+            if response.status_code == 429:
+                logger.warning(f"CoinGecko rate limited for {symbol} history")
+                self.stats.errors += 1
+                return cached[1] if cached else []
+            response.raise_for_status()
+            prices = [p[1] for p in response.json().get("prices", [])]
+        except Exception as e:
+            logger.error(f"Failed to fetch prices for {symbol}: {e}")
+            self.stats.errors += 1
+            return cached[1] if cached else []
+
+        self._histories[key] = (self._clock(), prices)
+        return prices
+
+    async def get_histories(self, symbols: list[str], days: int) -> dict[str, list[float]]:
+        """Get histories of many symbols; only uncached ones hit CoinGecko."""
+        prices = await asyncio.gather(*(self.get_history(s, days) for s in symbols))
+        return dict(zip(symbols, prices, strict=True))
+
+    def get_stats(self) -> dict:
+        """Get loader statistics."""
+        age = self._clock() - self._snapshot_at if self._snapshot_at is not None else None
+        return {
+            "tracked": len(self._tracked),
+            "loaded": len(self._markets),
+            "snapshot_age_s": round(age, 1) if age is not None else None,
+            "cached_histories": len(self._histories),
+            **self.stats.to_dict(),
+        }
+
+
+# Global instance
+_coin_market_loader: CoinMarketLoader | None = None
+
+
+def get_coin_market_loader() -> CoinMarketLoader:
+    """Get global CoinGecko market loader instance."""
+    global _coin_market_loader
+    if _coin_market_loader is None:
+        _coin_market_loader = CoinMarketLoader()
+    return _coin_market_loader
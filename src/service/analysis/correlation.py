@@ -20,7 +20,7 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any
 
-import httpx
+from core.http_gateway import GatewayClient, get_http_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -159,17 +159,18 @@ class CorrelationTracker:
     """
 
     def __init__(self, timeout: float = 30.0):
-        self._client: httpx.AsyncClient | None = None
+        self._client: GatewayClient | None = None
         self._timeout = timeout
 
-    async def _get_client(self) -> httpx.AsyncClient:
+    async def _get_client(self) -> GatewayClient:
         if self._client is None:
-            self._client = httpx.AsyncClient(
+            self._client = get_http_gateway().client(
                 timeout=self._timeout,
                 headers={
                     "Accept": "application/json",
                     "User-Agent": "Mozilla/5.0",
                 },
+                cache_ttl=3600,
             )
         return self._client
 
@@ -233,7 +234,7 @@ class CorrelationTracker:
             pairs=pairs,
         )
 
-    async def _fetch_crypto_prices(self, client: httpx.AsyncClient, coin_id: str, days: int) -> list[float]:
+    async def _fetch_crypto_prices(self, client: GatewayClient, coin_id: str, days: int) -> list[float]:
         """Fetch crypto prices from CoinGecko."""
         try:
             url = f"{COINGECKO_API}/coins/{coin_id}/market_chart"
@@ -250,7 +251,7 @@ class CorrelationTracker:
             logger.warning(f"Failed to fetch {coin_id} prices: {e}")
             return []
 
-    async def _fetch_yahoo_prices(self, client: httpx.AsyncClient, symbol: str, days: int) -> list[float]:
+    async def _fetch_yahoo_prices(self, client: GatewayClient, symbol: str, days: int) -> list[float]:
         """Fetch prices from Yahoo Finance."""
         try:
             end_time = int(datetime.now().timestamp())
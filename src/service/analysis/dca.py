@@ -18,11 +18,12 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
-import httpx
+from core.http_gateway import GatewayClient, get_http_gateway
+from service.analysis.coin_markets import get_coin_market_loader
+from service.candlestick.price_book import get_price_book
 
 logger = logging.getLogger(__name__)
 
-COINGECKO_API = "https://api.coingecko.com/api/v3"
 BYBIT_API = "https://api.bybit.com"
 
 
@@ -140,14 +141,15 @@ class DCACalculator:
     FIB_LEVELS = [0.236, 0.382, 0.5, 0.618, 0.786]
 
     def __init__(self, timeout: float = 30.0):
-        self._client: httpx.AsyncClient | None = None
+        self._client: GatewayClient | None = None
         self._timeout = timeout
 
-    async def _get_client(self) -> httpx.AsyncClient:
+    async def _get_client(self) -> GatewayClient:
         if self._client is None:
-            self._client = httpx.AsyncClient(
+            self._client = get_http_gateway().client(
                 timeout=self._timeout,
                 headers={"Accept": "application/json"},
+                cache_ttl=300,
             )
         return self._client
 
@@ -230,68 +232,50 @@ class DCACalculator:
             risk_score=risk_score,
         )
 
-    async def _fetch_price_data(self, client: httpx.AsyncClient, symbol: str) -> dict[str, float]:
-        """Fetch price data from CoinGecko."""
-        symbol_map = {
-            "BTC": "bitcoin",
-            "ETH": "ethereum",
-            "SOL": "solana",
-            "XRP": "ripple",
-            "ADA": "cardano",
-        }
-
-        cg_id = symbol_map.get(symbol.upper(), symbol.lower())
+    async def _fetch_price_data(self, client: GatewayClient, symbol: str) -> dict[str, float]:
+        """Fetch price data: live price from the price book, range and ATH from the CoinGecko snapshot."""
+        quote = get_price_book().get(symbol)
+        market = await get_coin_market_loader().get_market(symbol)
+        if market is not None and market.price > 0:
+            return {
+                "current_price": quote.price if quote is not None else market.price,
+                "high_52w": market.high_24h * 1.5,  # Estimate
+                "low_52w": market.low_24h * 0.5,  # Estimate
+                "ath": market.ath,
+            }
+        if quote is not None:
+            return {
+                "current_price": quote.price,
+                "high_52w": quote.price * 1.3,  # Estimate
+                "low_52w": quote.price * 0.7,  # Estimate
+                "ath": quote.price * 1.5,  # Estimate
+            }
 
+        logger.warning(f"CoinGecko market data unavailable for {symbol}, trying Bybit")
+        # Fallback to Bybit
         try:
-            url = f"{COINGECKO_API}/coins/{cg_id}"
-            params = {
-                "localization": "false",
-                "tickers": "false",
-                "community_data": "false",
-                "developer_data": "false",
-            }
+            bybit_symbol = f"{symbol.upper()}USDT"
+            url = f"{BYBIT_API}/v5/market/tickers"
+            params = {"category": "linear", "symbol": bybit_symbol}
 
             response = await client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
 
-            market_data = data.get("market_data", {})
-
-            return {
-                "current_price": market_data.get("current_price", {}).get("usd", 0),
-                "high_52w": market_data.get("high_24h", {}).get("usd", 0) * 1.5,  # Estimate
-                "low_52w": market_data.get("low_24h", {}).get("usd", 0) * 0.5,  # Estimate
-                "ath": market_data.get("ath", {}).get("usd", 0),
-                "ath_date": market_data.get("ath_date", {}).get("usd", ""),
-            }
-
+            tickers = data.get("result", {}).get("list", [])
+            if tickers:
+                ticker = tickers[0]
+                price = float(ticker.get("lastPrice", 0))
+                return {
+                    "current_price": price,
+                    "high_52w": price * 1.3,  # Estimate
+                    "low_52w": price * 0.7,  # Estimate
+                    "ath": price * 1.5,  # Estimate
+                }
         except Exception as e:
-            logger.warning(f"CoinGecko fetch failed: {e}, trying Bybit")
+            logger.error(f"Bybit fallback failed: {e}")
 
-            # Fallback to Bybit
-            try:
-                bybit_symbol = f"{symbol.upper()}USDT"
-                url = f"{BYBIT_API}/v5/market/tickers"
-                params = {"category": "linear", "symbol": bybit_symbol}
-
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-
-                tickers = data.get("result", {}).get("list", [])
-                if tickers:
-                    ticker = tickers[0]
-                    price = float(ticker.get("lastPrice", 0))
-                    return {
-                        "current_price": price,
-                        "high_52w": price * 1.3,  # Estimate
-                        "low_52w": price * 0.7,  # Estimate
-                        "ath": price * 1.5,  # Estimate
-                    }
-            except Exception as e2:
-                logger.error(f"Bybit fallback failed: {e2}")
-
-            return {}
+        return {}
 
     def _determine_zone(
         self,
@@ -340,6 +324,9 @@ class DCACalculator:
         if symbols is None:
             symbols = ["BTC", "ETH"]
 
+        # One bulk snapshot request for all symbols
+        await get_coin_market_loader().get_markets(symbols)
+
         result = {}
         for symbol in symbols:
             try:
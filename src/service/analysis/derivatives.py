@@ -14,6 +14,8 @@ from datetime import datetime
 
 import httpx
 
+from core.http_gateway import GatewayClient, get_http_gateway
+
 logger = logging.getLogger(__name__)
 
 # API URLs
@@ -146,13 +148,14 @@ class DerivativesAnalyzer:
 
     def __init__(self, timeout: float = 15.0):
         self.timeout = timeout
-        self._client: httpx.AsyncClient | None = None
+        self._client: GatewayClient | None = None
 
-    async def _get_client(self) -> httpx.AsyncClient:
+    async def _get_client(self) -> GatewayClient:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
+            self._client = get_http_gateway().client(
                 timeout=self.timeout,
                 headers={"User-Agent": "CryptoInspect/1.0"},
+                cache_ttl=60,
             )
         return self._client
 
@@ -9,10 +9,13 @@ Timeframes: 1h, 4h, 1d
 """
 
 import logging
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+from service.analysis.pivots import PivotIndex, find_pivots, get_pivot_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -171,6 +174,7 @@ class DivergenceDetector:
         rsi_values: list[float] | None = None,
         macd_values: list[float] | None = None,  # MACD histogram
         timeframe: str = "1h",
+        timestamps: list[int] | None = None,
     ) -> list[Divergence]:
         """
         Detect divergences in price data.
@@ -181,19 +185,32 @@ class DivergenceDetector:
             rsi_values: List of RSI values (same length as prices)
             macd_values: List of MACD histogram values
             timeframe: Timeframe string
+            timestamps: Candle open times of prices; when given, price swings
+                come from the shared pivot index and only new bars are scanned
 
         Returns:
             List of detected divergences
         """
         divergences = []
 
-        if rsi_values and len(rsi_values) == len(prices):
-            rsi_divs = self._find_divergences(symbol, prices, rsi_values, "rsi", timeframe)
-            divergences.extend(rsi_divs)
+        pivots = None
+        if timestamps and len(timestamps) == len(prices):
+            pivots = get_pivot_store().get(symbol, timeframe, window=5, strict=False)
+
+        # Scan workers share the index: hold its lock from update through the reads
+        with pivots.lock if pivots is not None else nullcontext():
+            if pivots is not None:
+                pivots.update(
+                    [{"timestamp": ts, "high": p, "low": p} for ts, p in zip(timestamps, prices, strict=True)]
+                )
 
-        if macd_values and len(macd_values) == len(prices):
-            macd_divs = self._find_divergences(symbol, prices, macd_values, "macd", timeframe)
-            divergences.extend(macd_divs)
+            if rsi_values and len(rsi_values) == len(prices):
+                rsi_divs = self._find_divergences(symbol, prices, rsi_values, "rsi", timeframe, pivots)
+                divergences.extend(rsi_divs)
+
+            if macd_values and len(macd_values) == len(prices):
+                macd_divs = self._find_divergences(symbol, prices, macd_values, "macd", timeframe, pivots)
+                divergences.extend(macd_divs)
 
         return divergences
 
@@ -204,6 +221,7 @@ class DivergenceDetector:
         indicator: list[float],
         indicator_name: str,
         timeframe: str,
+        pivots: PivotIndex | None = None,
     ) -> list[Divergence]:
         """Find divergences between price and indicator."""
         divergences = []
@@ -213,12 +231,16 @@ class DivergenceDetector:
         recent_prices = prices[-lookback:]
         recent_indicator = indicator[-lookback:]
 
-        # Find swing lows (for bullish divergence)
-        price_lows = self._find_swing_lows(recent_prices)
+        # Find swing lows (for bullish divergence) and swing highs (for bearish divergence)
+        if pivots is not None:
+            # Shared index positions, shifted to the recent window
+            offset = len(pivots) - lookback
+            price_lows = [(i - offset, v) for i, v in pivots.troughs(offset)]
+            price_highs = [(i - offset, v) for i, v in pivots.peaks(offset)]
+        else:
+            price_lows = self._find_swing_lows(recent_prices)
+            price_highs = self._find_swing_highs(recent_prices)
         ind_lows = self._find_swing_lows(recent_indicator)
-
-        # Find swing highs (for bearish divergence)
-        price_highs = self._find_swing_highs(recent_prices)
         ind_highs = self._find_swing_highs(recent_indicator)
 
         # Check for bullish divergence (price lower low, indicator higher low)
@@ -322,30 +344,12 @@ class DivergenceDetector:
         return divergences
 
     def _find_swing_lows(self, data: list[float], window: int = 5) -> list[tuple[int, float]]:
-        """Find swing lows in data."""
-        lows = []
-        for i in range(window, len(data) - window):
-            is_low = True
-            for j in range(i - window, i + window + 1):
-                if j != i and data[j] < data[i]:
-                    is_low = False
-                    break
-            if is_low:
-                lows.append((i, data[i]))
-        return lows
+        """Find swing lows in data (ties with neighbours count)."""
+        return find_pivots(data, window, kind="low", strict=False)
 
     def _find_swing_highs(self, data: list[float], window: int = 5) -> list[tuple[int, float]]:
-        """Find swing highs in data."""
-        highs = []
-        for i in range(window, len(data) - window):
-            is_high = True
-            for j in range(i - window, i + window + 1):
-                if j != i and data[j] > data[i]:
-                    is_high = False
-                    break
-            if is_high:
-                highs.append((i, data[i]))
-        return highs
+        """Find swing highs in data (ties with neighbours count)."""
+        return find_pivots(data, window, kind="high", strict=False)
 
     def _calculate_strength(
         self,
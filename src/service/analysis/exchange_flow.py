@@ -21,7 +21,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
-import httpx
+from core.http_gateway import GatewayClient, get_http_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -160,16 +160,17 @@ class ExchangeFlowAnalyzer:
         cryptoquant_api_key: str | None = None,
         timeout: float = 30.0,
     ):
-        self._client: httpx.AsyncClient | None = None
+        self._client: GatewayClient | None = None
         self._timeout = timeout
         self._cq_key = cryptoquant_api_key or os.environ.get("CRYPTOQUANT_API_KEY")
 
-    async def _get_client(self) -> httpx.AsyncClient:
+    async def _get_client(self) -> GatewayClient:
         """Get or create HTTP client."""
         if self._client is None:
-            self._client = httpx.AsyncClient(
+            self._client = get_http_gateway().client(
                 timeout=self._timeout,
                 headers={"Accept": "application/json"},
+                cache_ttl=300,
             )
         return self._client
 
@@ -219,7 +220,7 @@ class ExchangeFlowAnalyzer:
             data_source=data_source,
         )
 
-    async def _fetch_cryptoquant(self, client: httpx.AsyncClient, symbol: str) -> ExchangeFlowData:
+    async def _fetch_cryptoquant(self, client: GatewayClient, symbol: str) -> ExchangeFlowData:
         """
         Fetch exchange flow data from CryptoQuant.
 
@@ -18,7 +18,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
-import httpx
+from core.http_gateway import GatewayClient, get_http_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -131,17 +131,18 @@ class GasTracker:
     """
 
     def __init__(self, etherscan_api_key: str | None = None, timeout: float = 15.0):
-        self._client: httpx.AsyncClient | None = None
+        self._client: GatewayClient | None = None
         self._timeout = timeout
         # Support both ENV formats: ETHERSCAN_API_KEY and etherscan_api_key
         self._etherscan_key = etherscan_api_key or os.environ.get("ETHERSCAN_API_KEY") or os.environ.get("etherscan_api_key")
 
-    async def _get_client(self) -> httpx.AsyncClient:
+    async def _get_client(self) -> GatewayClient:
         """Get or create HTTP client."""
         if self._client is None:
-            self._client = httpx.AsyncClient(
+            self._client = get_http_gateway().client(
                 timeout=self._timeout,
                 headers={"Accept": "application/json"},
+                cache_ttl=30,
             )
         return self._client
 
@@ -186,7 +187,7 @@ class GasTracker:
         logger.info("Using default gas values")
         return self._create_default_result()
 
-    async def _fetch_etherscan(self, client: httpx.AsyncClient) -> GasData:
+    async def _fetch_etherscan(self, client: GatewayClient) -> GasData:
         """Fetch gas prices from Etherscan."""
         params = {
             "module": "gastracker",
@@ -222,7 +223,7 @@ class GasTracker:
             source="etherscan",
         )
 
-    async def _fetch_public_api(self, client: httpx.AsyncClient) -> GasData:
+    async def _fetch_public_api(self, client: GatewayClient) -> GasData:
         """Fetch from public API (no key required)."""
         # Try Beaconcha.in first (most reliable free API)
         try:
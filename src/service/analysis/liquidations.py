@@ -18,7 +18,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
-import httpx
+from core.http_gateway import GatewayClient, get_http_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -153,16 +153,17 @@ class LiquidationTracker:
         coinglass_api_key: str | None = None,
         timeout: float = 30.0,
     ):
-        self._client: httpx.AsyncClient | None = None
+        self._client: GatewayClient | None = None
         self._timeout = timeout
         self._cg_key = coinglass_api_key or os.environ.get("COINGLASS_API_KEY")
 
-    async def _get_client(self) -> httpx.AsyncClient:
+    async def _get_client(self) -> GatewayClient:
         """Get or create HTTP client."""
         if self._client is None:
-            self._client = httpx.AsyncClient(
+            self._client = get_http_gateway().client(
                 timeout=self._timeout,
                 headers={"Accept": "application/json"},
+                cache_ttl=60,
             )
         return self._client
 
@@ -197,7 +198,7 @@ class LiquidationTracker:
         # Fallback to simulated data
         return self._generate_simulated_data(symbol, current_price)
 
-    async def _get_current_price(self, client: httpx.AsyncClient, symbol: str) -> float:
+    async def _get_current_price(self, client: GatewayClient, symbol: str) -> float:
         """Get current price from Binance."""
         try:
             url = f"{BINANCE_FUTURES_API}/ticker/price"
@@ -212,7 +213,7 @@ class LiquidationTracker:
             prices = {"BTC": 95000, "ETH": 3500, "SOL": 180}
             return prices.get(symbol, 100)
 
-    async def _fetch_coinglass(self, client: httpx.AsyncClient, symbol: str, current_price: float) -> LiquidationData:
+    async def _fetch_coinglass(self, client: GatewayClient, symbol: str, current_price: float) -> LiquidationData:
         """Fetch liquidation data from Coinglass."""
         url = f"{COINGLASS_API}/liquidation_info"
         headers = {"coinglassSecret": self._cg_key}
@@ -0,0 +1,337 @@
+"""
+Market Fact Store.
+
+Shared TTL cache for external market signals used by many jobs:
+- Fear & Greed Index (Alternative.me)
+- BTC dominance (CoinGecko /global)
+- On-chain metrics (mempool.space)
+- Derivatives metrics per symbol (Binance Futures)
+
+Features:
+- Per-fact TTLs
+- Single-flight: concurrent readers of a missing fact share one refresh
+- Stale-while-revalidate: expired values are served while a background
+  refresh runs, up to a max-stale window
+- Hit/miss/stale/error counters per fact
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from core.http_gateway import get_http_gateway
+from service.analysis.derivatives import DerivativesAnalyzer, DerivativesMetrics
+from service.analysis.onchain import FearGreedData, OnChainAnalyzer, OnChainMetrics
+
+logger = logging.getLogger(__name__)
+
+COINGECKO_GLOBAL_URL = "https://api.coingecko.com/api/v3/global"
+
+# Fact names
+FACT_FEAR_GREED = "fear_greed"
+FACT_BTC_DOMINANCE = "btc_dominance"
+FACT_ONCHAIN = "onchain"
+FACT_DERIVATIVES = "derivatives"
+
+
+class _LeaderCancelled(Exception):
+    """The refresh a reader was coalesced onto was cancelled; the reader retries."""
+
+
+@dataclass
+class FactSpec:
+    """Definition of a cached fact."""
+
+    name: str
+    loader: Callable[..., Awaitable[Any]]
+    ttl: float  # Seconds a value is considered fresh
+    max_stale: float = 0.0  # Extra seconds an expired value may still be served
+
+
+@dataclass
+class FactEntry:
+    """Cached fact value."""
+
+    value: Any
+    fetched_at: float
+    expires_at: float
+    stale_until: float
+
+
+@dataclass
+class FactStats:
+    """Per-fact access counters."""
+
+    hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    refreshes: int = 0
+    errors: int = 0
+    last_refresh_duration: float | None = None
+
+    def to_dict(self) -> dict:
+        total = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "hit_ratio": round((self.hits + self.stale_hits) / total, 3) if total else None,
+            "last_refresh_duration_ms": (
+                round(self.last_refresh_duration * 1000, 1) if self.last_refresh_duration is not None else None
+            ),
+        }
+
+
+class MarketFactStore:
+    """
+    Central TTL store for external market facts.
+
+    Loaders return ``None`` on failure (the analyzers' convention);
+    ``None`` results are never cached so the next reader retries.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._specs: dict[str, FactSpec] = {}
+        self._entries: dict[tuple[str, str], FactEntry] = {}
+        self._inflight: dict[tuple[str, str], asyncio.Future] = {}
+        self._stats: dict[str, FactStats] = {}
+        self._background: set[asyncio.Task] = set()
+        self._closers: list[Callable[[], Awaitable[None]]] = []
+
+    def add_closer(self, closer: Callable[[], Awaitable[None]]) -> None:
+        """Register a coroutine function called on close (e.g. HTTP client cleanup)."""
+        self._closers.append(closer)
+
+    def register(self, spec: FactSpec) -> None:
+        """Register (or replace) a fact definition."""
+        self._specs[spec.name] = spec
+        self._stats.setdefault(spec.name, FactStats())
+
+    async def get(self, name: str, key: str = "", force_refresh: bool = False) -> Any:
+        """
+        Get a fact value.
+
+        Args:
+            name: Registered fact name
+            key: Optional sub-key (e.g. symbol) passed to the loader
+            force_refresh: Ignore cached value and refresh now
+
+        Returns:
+            Fact value or None if unavailable
+        """
+        spec = self._specs.get(name)
+        if spec is None:
+            raise KeyError(f"Unknown market fact: {name}")
+
+        stats = self._stats[name]
+        cache_key = (name, key)
+        entry = self._entries.get(cache_key)
+        now = self._clock()
+
+        if entry is not None and not force_refresh:
+            if now < entry.expires_at:
+                stats.hits += 1
+                return entry.value
+            if now < entry.stale_until:
+                stats.stale_hits += 1
+                self._refresh_in_background(spec, key)
+                return entry.value
+
+        stats.misses += 1
+        return await self._refresh(spec, key)
+
+    def peek(self, name: str, key: str = "") -> Any:
+        """Get cached value without triggering a refresh (may be stale)."""
+        entry = self._entries.get((name, key))
+        return entry.value if entry else None
+
+    def invalidate(self, name: str | None = None) -> int:
+        """Drop cached values for a fact (or all facts)."""
+        keys = [k for k in self._entries if name is None or k[0] == name]
+        for k in keys:
+            del self._entries[k]
+        return len(keys)
+
+    def _refresh_in_background(self, spec: FactSpec, key: str) -> None:
+        """Schedule a refresh unless one is already running."""
+        if (spec.name, key) in self._inflight:
+            return
+        task = asyncio.create_task(self._refresh(spec, key))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _refresh(self, spec: FactSpec, key: str) -> Any:
+        """Load a fact, sharing the result with concurrent callers."""
+        cache_key = (spec.name, key)
+        inflight = self._inflight.get(cache_key)
+        while inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except _LeaderCancelled:
+                # Only the leading caller was cancelled: the first waiter to get here takes the lead
+                inflight = self._inflight.get(cache_key)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        stats = self._stats[spec.name]
+        started = self._clock()
+
+        try:
+            value = await (spec.loader(key) if key else spec.loader())
+        except asyncio.CancelledError:
+            del self._inflight[cache_key]
+            future.set_exception(_LeaderCancelled())
+            future.exception()  # Retrieved by waiters, if any
+            raise
+        except Exception as e:
+            stats.errors += 1
+            logger.warning(f"Market fact '{spec.name}{':' + key if key else ''}' refresh failed: {e}")
+            value = None
+        self._inflight.pop(cache_key, None)
+
+        stats.refreshes += 1
+        stats.last_refresh_duration = self._clock() - started
+
+        if value is None:
+            # Keep serving the previous value within its stale window
+            entry = self._entries.get(cache_key)
+            if entry is not None and self._clock() < entry.stale_until:
+                value = entry.value
+        else:
+            now = self._clock()
+            self._entries[cache_key] = FactEntry(
+                value=value,
+                fetched_at=now,
+                expires_at=now + spec.ttl,
+                stale_until=now + spec.ttl + spec.max_stale,
+            )
+
+        future.set_result(value)
+        return value
+
+    def get_stats(self) -> dict[str, dict]:
+        """Get access counters per fact."""
+        now = self._clock()
+        result = {}
+        for name, stats in self._stats.items():
+            data = stats.to_dict()
+            ages = [now - e.fetched_at for (n, _), e in self._entries.items() if n == name]
+            data["cached_keys"] = len(ages)
+            data["oldest_age_s"] = round(max(ages), 1) if ages else None
+            result[name] = data
+        return result
+
+    async def close(self) -> None:
+        """Cancel pending background refreshes and release resources."""
+        for task in list(self._background):
+            task.cancel()
+        self._background.clear()
+        for closer in self._closers:
+            try:
+                await closer()
+            except Exception as e:
+                logger.debug(f"Market fact store close error: {e}")
+
+
+# =============================================================================
+# Default facts
+# =============================================================================
+
+
+class _MarketFactLoaders:
+    """Loaders backed by one shared set of analyzers and HTTP client."""
+
+    def __init__(self, timeout: float = 15.0):
+        self.onchain = OnChainAnalyzer(timeout=timeout)
+        self.derivatives = DerivativesAnalyzer(timeout=timeout)
+        self.client = get_http_gateway().client(timeout=timeout)
+
+    async def fear_greed(self) -> FearGreedData | None:
+        return await self.onchain.fetch_fear_greed()
+
+    async def onchain_metrics(self) -> OnChainMetrics | None:
+        return await self.onchain.analyze()
+
+    async def btc_dominance(self) -> float | None:
+        try:
+            response = await self.client.get(COINGECKO_GLOBAL_URL)
+            response.raise_for_status()
+            value = response.json().get("data", {}).get("market_cap_percentage", {}).get("btc")
+            return round(value, 2) if value else None
+        except httpx.HTTPError as e:
+            logger.warning(f"BTC dominance API error: {e}")
+            return None
+
+    async def derivatives_metrics(self, symbol: str) -> DerivativesMetrics | None:
+        return await self.derivatives.analyze(symbol)
+
+    async def close(self) -> None:
+        await self.onchain.close()
+        await self.derivatives.close()
+
+
+def create_default_fact_store() -> MarketFactStore:
+    """Create a store with the standard market facts registered."""
+    loaders = _MarketFactLoaders()
+    store = MarketFactStore()
+    store.add_closer(loaders.close)
+    # Alternative.me updates F&G once a day
+    store.register(FactSpec(FACT_FEAR_GREED, loaders.fear_greed, ttl=1800, max_stale=6 * 3600))
+    store.register(FactSpec(FACT_BTC_DOMINANCE, loaders.btc_dominance, ttl=600, max_stale=3600))
+    store.register(FactSpec(FACT_ONCHAIN, loaders.onchain_metrics, ttl=600, max_stale=1800))
+    # Funding/long-short move faster; keep them short-lived
+    store.register(FactSpec(FACT_DERIVATIVES, loaders.derivatives_metrics, ttl=300, max_stale=900))
+    return store
+
+
+# Global instance
+_market_fact_store: MarketFactStore | None = None
+
+
+def get_market_fact_store() -> MarketFactStore:
+    """Get global market fact store instance."""
+    global _market_fact_store
+    if _market_fact_store is None:
+        _market_fact_store = create_default_fact_store()
+    return _market_fact_store
+
+
+async def close_market_fact_store() -> None:
+    """Close global market fact store and its HTTP clients."""
+    global _market_fact_store
+    if _market_fact_store is not None:
+        await _market_fact_store.close()
+        _market_fact_store = None
+
+
+# =============================================================================
+# Convenience accessors
+# =============================================================================
+
+
+async def get_fear_greed() -> FearGreedData | None:
+    """Get cached Fear & Greed Index."""
+    return await get_market_fact_store().get(FACT_FEAR_GREED)
+
+
+async def get_btc_dominance() -> float | None:
+    """Get cached BTC dominance percentage."""
+    return await get_market_fact_store().get(FACT_BTC_DOMINANCE)
+
+
+async def get_onchain_metrics() -> OnChainMetrics | None:
+    """Get cached combined on-chain metrics."""
+    return await get_market_fact_store().get(FACT_ONCHAIN)
+
+
+async def get_derivatives(symbol: str) -> DerivativesMetrics | None:
+    """Get cached derivatives metrics for a symbol (e.g. 'BTC')."""
+    return await get_market_fact_store().get(FACT_DERIVATIVES, symbol.upper())
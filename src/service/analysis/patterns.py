@@ -15,6 +15,7 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 
+from service.analysis.pivots import PivotIndex, get_pivot_store
 from service.analysis.technical import CandleDict, TechnicalAnalyzer
 
 logger = logging.getLogger(__name__)
@@ -282,7 +283,11 @@ class PatternDetector:
             )
 
         # 6. Double Top / Double Bottom
-        double_pattern = self._detect_double_pattern(candles[-30:])
+        pivots = get_pivot_store().get(symbol, timeframe)
+        # Scan workers share the index: hold its lock from update through the reads
+        with pivots.lock:
+            pivots.update(candles)
+            double_pattern = self._detect_double_pattern(candles[-30:], pivots)
         if double_pattern:
             patterns.append(self._create_pattern(double_pattern, current_price, current_ts, 70))
 
@@ -354,50 +359,30 @@ class PatternDetector:
                 count = 0
         return count
 
-    def _detect_double_pattern(self, candles: list[CandleDict]) -> PatternType | None:
+    def _detect_double_pattern(self, candles: list[CandleDict], pivots: PivotIndex | None = None) -> PatternType | None:
         """
         Detect double top or double bottom pattern.
 
         Looks for two peaks/troughs at similar levels.
+
+        Args:
+            candles: Candles to search
+            pivots: Pivot index whose last bars are these candles
+                (built on the fly if not given)
         """
         if len(candles) < 10:
             return None
 
-        highs = [float(c["high"]) for c in candles]
-        lows = [float(c["low"]) for c in candles]
-
-        # Find local maxima for double top
-        peaks = []
-        for i in range(2, len(highs) - 2):
-            if (
-                highs[i] > highs[i - 1]
-                and highs[i] > highs[i - 2]
-                and highs[i] > highs[i + 1]
-                and highs[i] > highs[i + 2]
-            ):
-                peaks.append((i, highs[i]))
-
-        # Check for double top (two peaks at similar level)
-        if len(peaks) >= 2:
-            for i in range(len(peaks) - 1):
-                for j in range(i + 1, len(peaks)):
-                    if abs(peaks[i][1] - peaks[j][1]) / peaks[i][1] < 0.02:  # Within 2%
-                        if peaks[j][0] - peaks[i][0] >= 5:  # At least 5 candles apart
-                            return PatternType.DOUBLE_TOP
-
-        # Find local minima for double bottom
-        troughs = []
-        for i in range(2, len(lows) - 2):
-            if lows[i] < lows[i - 1] and lows[i] < lows[i - 2] and lows[i] < lows[i + 1] and lows[i] < lows[i + 2]:
-                troughs.append((i, lows[i]))
-
-        # Check for double bottom
-        if len(troughs) >= 2:
-            for i in range(len(troughs) - 1):
-                for j in range(i + 1, len(troughs)):
-                    if abs(troughs[i][1] - troughs[j][1]) / troughs[i][1] < 0.02:
-                        if troughs[j][0] - troughs[i][0] >= 5:
-                            return PatternType.DOUBLE_BOTTOM
+        if pivots is None:
+            pivots = PivotIndex.from_candles(candles)
+        start = len(pivots) - len(candles)
+
+        # Two peaks within 2% at least 5 candles apart
+        if pivots.find_similar("high", tolerance=0.02, min_distance=5, start=start):
+            return PatternType.DOUBLE_TOP
+
+        if pivots.find_similar("low", tolerance=0.02, min_distance=5, start=start):
+            return PatternType.DOUBLE_BOTTOM
 
         return None
 
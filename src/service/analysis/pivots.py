@@ -0,0 +1,352 @@
+"""
+Swing Pivot Index.
+
+Shared swing high/low detection for divergences, chart patterns and
+support/resistance:
+
+- A bar is a pivot when it is the extreme of the ``window`` bars on each
+  side. Both sides are read from one sliding-window extreme array kept
+  with a monotonic deque, so detection is O(n) instead of O(n·window)
+- The index is appended to as candles close; the last (possibly still
+  forming) candle is replaced in place, so repeated analyses of the same
+  (symbol, interval) only process new bars
+- Pivots are stored by bar position; range queries use bisection and
+  "peaks within X% of each other" sweeps pivots sorted by value instead
+  of comparing all pairs
+
+Usage:
+    from service.analysis.pivots import get_pivot_store
+
+    index = get_pivot_store().get("BTC", "4h")
+    index.update(candles)
+    peaks = index.peaks(start=len(index) - 30)
+    pair = index.find_similar("high", tolerance=0.02, min_distance=5, start=len(index) - 30)
+"""
+
+import logging
+import threading
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from collections.abc import Sequence
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 2
+# Bars kept per index; older bars are dropped when twice as many accumulate
+MAX_BARS = 2000
+MAX_INDEXES = 1024
+
+
+class _SwingSeries:
+    """Pivots of one value series (maxima of signed values)."""
+
+    __slots__ = ("window", "strict", "sign", "values", "window_max", "pivots", "_deque")
+
+    def __init__(self, window: int, strict: bool, sign: int):
+        self.window = window
+        self.strict = strict
+        self.sign = sign  # +1 for highs, -1 for lows
+        self.values: list[float] = []  # signed values
+        self.window_max: list[float] = []  # window_max[k] = max(values[k : k + window])
+        self.pivots: list[int] = []
+        self._deque: deque[int] = deque()
+
+    def append(self, value: float) -> None:
+        w = self.window
+        i = len(self.values)
+        v = self.sign * value
+        self.values.append(v)
+
+        dq = self._deque
+        while dq and self.values[dq[-1]] <= v:
+            dq.pop()
+        dq.append(i)
+        if dq[0] <= i - w:
+            dq.popleft()
+        if i >= w - 1:
+            self.window_max.append(self.values[dq[0]])
+
+        # Bar i - w now has `window` bars on both sides
+        c = i - w
+        if c >= w:
+            x = self.values[c]
+            left, right = self.window_max[c - w], self.window_max[c + 1]
+            if (x > left and x > right) if self.strict else (x >= left and x >= right):
+                self.pivots.append(c)
+
+    def truncate(self, size: int) -> None:
+        """Drop bars from position size on."""
+        w = self.window
+        del self.values[size:]
+        del self.window_max[max(size - w + 1, 0) :]
+        while self.pivots and self.pivots[-1] > size - 1 - w:
+            self.pivots.pop()
+        self._deque.clear()
+        for i in range(max(size - w, 0), size):
+            while self._deque and self.values[self._deque[-1]] <= self.values[i]:
+                self._deque.pop()
+            self._deque.append(i)
+
+    def between(self, start: int, end: int) -> list[tuple[int, float]]:
+        """Pivots at positions [start, end) as (position, value)."""
+        lo = bisect_left(self.pivots, start)
+        hi = bisect_left(self.pivots, end)
+        return [(i, self.sign * self.values[i]) for i in self.pivots[lo:hi]]
+
+
+def find_pivots(
+    values: Sequence[float], window: int = DEFAULT_WINDOW, kind: str = "high", strict: bool = True
+) -> list[tuple[int, float]]:
+    """
+    Swing points of a plain value series in linear time.
+
+    Args:
+        values: Series, oldest first
+        window: Bars required on each side
+        kind: "high" for maxima, "low" for minima
+        strict: Pivot must be strictly above/below its neighbours
+            (otherwise ties count as pivots)
+
+    Returns:
+        [(position, value)] of pivots, ascending
+    """
+    series = _SwingSeries(window, strict, 1 if kind == "high" else -1)
+    for value in values:
+        series.append(float(value))
+    return series.between(0, len(values))
+
+
+class PivotIndex:
+    """Incrementally maintained swing highs/lows of one candle series."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW, strict: bool = True, max_bars: int = MAX_BARS):
+        """
+        Initialize pivot index.
+
+        Args:
+            window: Bars required on each side of a pivot
+            strict: Pivots must be strictly above/below their neighbours
+            max_bars: Bars kept (older ones are dropped)
+        """
+        self.window = window
+        self.strict = strict
+        self.max_bars = max_bars
+        self.timestamps: list[int] = []
+        self._highs = _SwingSeries(window, strict, 1)
+        self._lows = _SwingSeries(window, strict, -1)
+        self.appended = 0
+        self.rebuilds = 0
+        # Shared indexes are updated from scan worker threads; hold it across update + reads
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_candles(cls, candles: Sequence[Any], window: int = DEFAULT_WINDOW, strict: bool = True) -> "PivotIndex":
+        """Build a one-off index from candle dicts."""
+        index = cls(window, strict, max_bars=max(len(candles), 1))
+        index.update(candles)
+        return index
+
+    def append(self, timestamp: int, high: float, low: float) -> None:
+        """Append a closed bar."""
+        self.timestamps.append(timestamp)
+        self._highs.append(high)
+        self._lows.append(low)
+        self.appended += 1
+
+    def reset(self) -> None:
+        self.timestamps.clear()
+        self._highs = _SwingSeries(self.window, self.strict, 1)
+        self._lows = _SwingSeries(self.window, self.strict, -1)
+
+    def _truncate(self, size: int) -> None:
+        del self.timestamps[size:]
+        self._highs.truncate(size)
+        self._lows.truncate(size)
+
+    def update(self, candles: Sequence[Any]) -> int:
+        """
+        Bring the index up to date with a candle list (oldest first).
+
+        Candles after the last indexed one are appended; the last indexed
+        candle is re-applied if its values changed (it may have been still
+        forming). Lists without timestamps, or that do not overlap the
+        index, rebuild it.
+
+        Args:
+            candles: CandleDicts with timestamp, high and low
+
+        Returns:
+            Number of bars appended
+        """
+        with self.lock:
+            return self._update(candles)
+
+    def _update(self, candles: Sequence[Any]) -> int:
+        if not candles:
+            return 0
+
+        timestamps = [c.get("timestamp") for c in candles]
+        start = 0
+        if self.timestamps and None not in timestamps:
+            last = self.timestamps[-1]
+            pos = len(timestamps) - 1
+            while pos >= 0 and timestamps[pos] > last:
+                pos -= 1
+            if pos >= 0 and timestamps[pos] == last:
+                c = candles[pos]
+                if (
+                    float(c["high"]) != self._highs.sign * self._highs.values[-1]
+                    or float(c["low"]) != self._lows.sign * self._lows.values[-1]
+                ):
+                    self._truncate(len(self) - 1)
+                    start = pos
+                else:
+                    start = pos + 1
+            else:
+                self.reset()
+                self.rebuilds += 1
+        elif self.timestamps:
+            self.reset()
+            self.rebuilds += 1
+
+        before = self.appended
+        for ts, c in zip(timestamps[start:], candles[start:], strict=True):
+            self.append(ts if ts is not None else 0, float(c["high"]), float(c["low"]))
+
+        if len(self) > 2 * self.max_bars:
+            self._rebuild_tail(self.max_bars)
+        return self.appended - before
+
+    def _rebuild_tail(self, size: int) -> None:
+        """Keep only the newest size bars (linear rebuild, amortized O(1) per bar)."""
+        timestamps = self.timestamps[-size:]
+        highs = [self._highs.sign * v for v in self._highs.values[-size:]]
+        lows = [self._lows.sign * v for v in self._lows.values[-size:]]
+        self.reset()
+        for ts, high, low in zip(timestamps, highs, lows, strict=True):
+            self.append(ts, high, low)
+        self.appended -= size
+
+    def _series(self, kind: str) -> _SwingSeries:
+        return self._highs if kind == "high" else self._lows
+
+    def pivots(self, kind: str, start: int = 0, end: int | None = None) -> list[tuple[int, float]]:
+        """
+        Pivots whose whole window lies in bars [start, end).
+
+        Args:
+            kind: "high" or "low"
+            start: First bar position (e.g. len(index) - lookback)
+            end: End bar position (default: all bars)
+
+        Returns:
+            [(position, value)] ascending by position
+        """
+        end = len(self) if end is None else end
+        return self._series(kind).between(max(start, 0) + self.window, end - self.window)
+
+    def peaks(self, start: int = 0, end: int | None = None) -> list[tuple[int, float]]:
+        """Swing highs in bars [start, end)."""
+        return self.pivots("high", start, end)
+
+    def troughs(self, start: int = 0, end: int | None = None) -> list[tuple[int, float]]:
+        """Swing lows in bars [start, end)."""
+        return self.pivots("low", start, end)
+
+    def similar_pairs(
+        self, kind: str, tolerance: float, min_distance: int = 1, start: int = 0
+    ) -> list[tuple[tuple[int, float], tuple[int, float]]]:
+        """
+        Pivot pairs at similar levels.
+
+        A pair (a, b) with a before b matches when |b - a| / a < tolerance
+        and they are at least min_distance bars apart. Pivots are swept in
+        value order, so only neighbours within the tolerance band are
+        compared.
+
+        Returns:
+            Matching pairs ordered by (first position, second position)
+        """
+        points = self.pivots(kind, start)
+        by_value = sorted(points, key=lambda p: p[1])
+        # |b - a| / a < tol with a the larger value means (hi - lo) / lo < tol / (1 - tol)
+        band = tolerance / (1 - tolerance) if tolerance < 1 else float("inf")
+
+        pairs = []
+        for k, lo in enumerate(by_value):
+            for hi in by_value[k + 1 :]:
+                if lo[1] <= 0 or (hi[1] - lo[1]) / lo[1] >= band:
+                    break
+                first, second = (lo, hi) if lo[0] < hi[0] else (hi, lo)
+                if second[0] - first[0] >= min_distance and abs(second[1] - first[1]) / first[1] < tolerance:
+                    pairs.append((first, second))
+        return sorted(pairs, key=lambda p: (p[0][0], p[1][0]))
+
+    def find_similar(
+        self, kind: str, tolerance: float, min_distance: int = 1, start: int = 0
+    ) -> tuple[tuple[int, float], tuple[int, float]] | None:
+        """First pivot pair at a similar level, or None."""
+        pairs = self.similar_pairs(kind, tolerance, min_distance, start)
+        return pairs[0] if pairs else None
+
+
+class PivotStore:
+    """
+    Pivot indexes per (symbol, interval, window, strict), LRU-bounded.
+
+    Lookups are locked so scan workers can share the store; each index
+    has its own lock for updates and reads.
+    """
+
+    def __init__(self, max_indexes: int = MAX_INDEXES):
+        self._indexes: OrderedDict[tuple, PivotIndex] = OrderedDict()
+        self._max_indexes = max_indexes
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, interval: str, window: int = DEFAULT_WINDOW, strict: bool = True) -> PivotIndex:
+        """Get (or create) the index of a candle series."""
+        key = (symbol.upper(), interval, window, strict)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = self._indexes[key] = PivotIndex(window, strict)
+                if len(self._indexes) > self._max_indexes:
+                    self._indexes.popitem(last=False)
+            else:
+                self._indexes.move_to_end(key)
+            return index
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get per-index statistics."""
+        return {
+            "indexes": len(self._indexes),
+            "series": {
+                f"{symbol}:{interval}:w{window}{'' if strict else 'n'}": {
+                    "bars": len(index),
+                    "appended": index.appended,
+                    "rebuilds": index.rebuilds,
+                    "peaks": len(index._highs.pivots),
+                    "troughs": len(index._lows.pivots),
+                }
+                for (symbol, interval, window, strict), index in self._indexes.items()
+            },
+        }
+
+
+# Global instance
+_pivot_store: PivotStore | None = None
+
+
+def get_pivot_store() -> PivotStore:
+    """Get global pivot store instance."""
+    global _pivot_store
+    if _pivot_store is None:
+        _pivot_store = PivotStore()
+    return _pivot_store
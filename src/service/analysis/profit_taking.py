@@ -19,11 +19,12 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
-import httpx
+from core.http_gateway import GatewayClient, get_http_gateway
+from service.analysis.coin_markets import get_coin_market_loader
+from service.candlestick.price_book import get_price_book
 
 logger = logging.getLogger(__name__)
 
-COINGECKO_API = "https://api.coingecko.com/api/v3"
 BYBIT_API = "https://api.bybit.com"
 
 
@@ -181,14 +182,15 @@ class ProfitTakingAdvisor:
     FIB_EXTENSIONS = [1.618, 2.618, 4.236]
 
     def __init__(self, timeout: float = 30.0):
-        self._client: httpx.AsyncClient | None = None
+        self._client: GatewayClient | None = None
         self._timeout = timeout
 
-    async def _get_client(self) -> httpx.AsyncClient:
+    async def _get_client(self) -> GatewayClient:
         if self._client is None:
-            self._client = httpx.AsyncClient(
+            self._client = get_http_gateway().client(
                 timeout=self._timeout,
                 headers={"Accept": "application/json"},
+                cache_ttl=60,
             )
         return self._client
 
@@ -281,67 +283,63 @@ class ProfitTakingAdvisor:
             swing_low=swing_low,
         )
 
-    async def _fetch_market_data(self, client: httpx.AsyncClient, symbol: str) -> dict[str, float]:
-        """Fetch market data from CoinGecko."""
-        symbol_map = {
-            "BTC": "bitcoin",
-            "ETH": "ethereum",
-            "SOL": "solana",
-        }
+    async def _fetch_market_data(self, client: GatewayClient, symbol: str) -> dict[str, float]:
+        """
+        Fetch market data.
 
-        cg_id = symbol_map.get(symbol.upper(), symbol.lower())
+        The live price book supplies the price and, once its window covers
+        a full day, the 24h range; ATH comes from the CoinGecko snapshot.
+        """
+        quote = get_price_book().get(symbol)
+        market = await get_coin_market_loader().get_market(symbol)
+        if market is not None and market.price > 0:
+            data = {
+                "current_price": market.price,
+                "ath": market.ath,
+                "high_24h": market.high_24h,
+                "low_24h": market.low_24h,
+            }
+            if quote is not None:
+                data["current_price"] = quote.price
+                if quote.is_full_day:
+                    data["high_24h"] = quote.high_24h
+                    data["low_24h"] = quote.low_24h
+            return data
+        if quote is not None:
+            return {
+                "current_price": quote.price,
+                "ath": quote.price * 1.5,  # Estimate
+                "high_24h": quote.high_24h,
+                "low_24h": quote.low_24h,
+            }
 
+        logger.warning(f"CoinGecko market data unavailable for {symbol}, trying Bybit")
+        # Fallback to Bybit
         try:
-            url = f"{COINGECKO_API}/coins/{cg_id}"
-            params = {
-                "localization": "false",
-                "tickers": "false",
-                "community_data": "false",
-                "developer_data": "false",
-            }
+            bybit_symbol = f"{symbol.upper()}USDT"
+            url = f"{BYBIT_API}/v5/market/tickers"
+            params = {"category": "linear", "symbol": bybit_symbol}
 
             response = await client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
 
-            market_data = data.get("market_data", {})
-
-            return {
-                "current_price": market_data.get("current_price", {}).get("usd", 0),
-                "ath": market_data.get("ath", {}).get("usd", 0),
-                "high_24h": market_data.get("high_24h", {}).get("usd", 0),
-                "low_24h": market_data.get("low_24h", {}).get("usd", 0),
-            }
-
+            tickers = data.get("result", {}).get("list", [])
+            if tickers:
+                ticker = tickers[0]
+                price = float(ticker.get("lastPrice", 0))
+                high = float(ticker.get("highPrice24h", price * 1.05))
+                low = float(ticker.get("lowPrice24h", price * 0.95))
+                return {
+                    "current_price": price,
+                    "ath": price * 1.5,  # Estimate
+                    "high_24h": high,
+                    "low_24h": low,
+                }
         except Exception as e:
-            logger.warning(f"CoinGecko fetch failed: {e}")
+            logger.error(f"Bybit fallback failed: {e}")
 
-            # Fallback to Bybit
-            try:
-                bybit_symbol = f"{symbol.upper()}USDT"
-                url = f"{BYBIT_API}/v5/market/tickers"
-                params = {"category": "linear", "symbol": bybit_symbol}
-
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-
-                tickers = data.get("result", {}).get("list", [])
-                if tickers:
-                    ticker = tickers[0]
-                    price = float(ticker.get("lastPrice", 0))
-                    high = float(ticker.get("highPrice24h", price * 1.05))
-                    low = float(ticker.get("lowPrice24h", price * 0.95))
-                    return {
-                        "current_price": price,
-                        "ath": price * 1.5,  # Estimate
-                        "high_24h": high,
-                        "low_24h": low,
-                    }
-            except Exception as e2:
-                logger.error(f"Bybit fallback failed: {e2}")
-
-            return {}
+        return {}
 
     def _calculate_greed_score(
         self,
@@ -427,6 +425,9 @@ class ProfitTakingAdvisor:
         if symbols is None:
             symbols = ["BTC", "ETH"]
 
+        # One bulk snapshot request for all symbols
+        await get_coin_market_loader().get_markets(symbols)
+
         result = {}
         for symbol in symbols:
             try:
@@ -7,6 +7,10 @@ Advanced risk metrics for portfolio analysis:
 - Maximum Drawdown
 - Value at Risk (VaR)
 - Volatility analysis
+- Monte Carlo VaR/CVaR, drawdown and recovery (see risk_engine)
+
+Daily portfolio values are persisted in portfolio_snapshots and reloaded
+when the in-memory history is empty (e.g. after a restart).
 """
 
 import logging
@@ -15,6 +19,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
+from service.analysis.risk_engine import MonteCarloResult, SimulationMethod, get_risk_engine, portfolio_holdings
+
 logger = logging.getLogger(__name__)
 
 
@@ -109,6 +115,18 @@ class RiskAnalyzer:
         cutoff = datetime.now() - timedelta(days=365)
         self._portfolio_history = [s for s in self._portfolio_history if s["timestamp"] > cutoff]
 
+    async def load_history(self, days: int = 365) -> int:
+        """
+        Replace the in-memory history with persisted daily snapshots.
+
+        Returns:
+            Number of snapshots loaded
+        """
+        snapshots = await get_risk_engine().load_snapshots(days)
+        if snapshots:
+            self._portfolio_history = snapshots
+        return len(snapshots)
+
     def set_btc_returns(self, returns: list[float]) -> None:
         """Set BTC daily returns for beta calculation."""
         self._btc_returns = returns
@@ -128,10 +146,12 @@ class RiskAnalyzer:
         Returns:
             RiskMetrics object
         """
-        # Use provided values or internal history
+        # Use provided values or internal history (reloaded from the database after restarts)
         if portfolio_values:
             values = portfolio_values
         else:
+            if len(self._portfolio_history) < 7:
+                await self.load_history()
             values = [s["value"] for s in self._portfolio_history]
 
         if len(values) < 7:
@@ -397,10 +417,37 @@ class RiskAnalyzer:
         else:
             return "Low"
 
+    async def monte_carlo(
+        self,
+        holdings: dict[str, float] | None = None,
+        horizon_days: int = 30,
+        paths: int = 100_000,
+        method: SimulationMethod | str = SimulationMethod.BOOTSTRAP,
+    ) -> MonteCarloResult | None:
+        """
+        Simulate the portfolio's risk distribution.
+
+        Args:
+            holdings: {symbol: value in USDT}, defaults to the tracked portfolio
+            horizon_days: Days simulated per path
+            paths: Number of simulated paths
+            method: "bootstrap" (historical days) or "covariance" (fitted normal)
+
+        Returns:
+            MonteCarloResult, or None without holdings or daily history
+        """
+        return await get_risk_engine().simulate(
+            holdings if holdings is not None else portfolio_holdings(),
+            horizon_days=horizon_days,
+            paths=paths,
+            method=method,
+        )
+
     async def stress_test(
         self,
         portfolio_value: float,
         scenario: str = "2022_crash",
+        holdings: dict[str, float] | None = None,
     ) -> dict[str, Any]:
         """
         Perform stress test simulation.
@@ -409,6 +456,10 @@ class RiskAnalyzer:
         - 2022_crash: -75% drawdown like 2022
         - black_swan: -50% sudden drop
         - moderate: -30% correction
+
+        With holdings (or a tracked portfolio) and stored daily candles, a
+        Monte Carlo run over the scenario's duration adds how likely such a
+        drawdown is and the simulated tail losses.
         """
         scenarios = {
             "2022_crash": {
@@ -444,7 +495,7 @@ class RiskAnalyzer:
         projected_value = portfolio_value * (1 + s["drawdown"] / 100)
         loss_amount = portfolio_value - projected_value
 
-        return {
+        result = {
             "scenario": s["name"],
             "description": s["description"],
             "drawdown_pct": s["drawdown"],
@@ -455,6 +506,25 @@ class RiskAnalyzer:
             "survival_probability": self._estimate_survival(s["drawdown"]),
         }
 
+        try:
+            simulation = await self.monte_carlo(holdings, horizon_days=s["duration_days"])
+        except Exception as e:
+            logger.warning(f"Monte Carlo stress test failed: {e}")
+            simulation = None
+
+        if simulation is not None:
+            result["monte_carlo"] = {
+                "probability_pct": round(simulation.prob_drawdown_pct[str(-s["drawdown"])], 2),
+                "var_99_pct": round(simulation.var_pct["99"], 2),
+                "cvar_99_pct": round(simulation.cvar_pct["99"], 2),
+                "cvar_99_usd": round(simulation.cvar_pct["99"] / 100 * portfolio_value, 2),
+                "drawdown_p99_pct": round(simulation.drawdown_pct["p99"], 2),
+                "paths": simulation.paths,
+                "method": simulation.method,
+            }
+
+        return result
+
     def _estimate_survival(self, drawdown: float) -> str:
         """Estimate portfolio survival probability."""
         if drawdown > -30:
@@ -0,0 +1,494 @@
+"""
+Monte Carlo Risk Engine.
+
+Vectorized multi-asset simulation of portfolio risk:
+- Daily returns of the actual holdings come from stored daily candles
+  (via the backtest engine's version-cached price series), aligned on
+  common days
+- Paths are drawn either by bootstrapping whole historical days (keeps
+  fat tails and cross-asset correlation) or from the fitted mean vector
+  and covariance matrix
+- VaR/CVaR of the horizon return, max drawdown distribution and
+  time-to-recovery are computed on the whole (paths, days) matrix at once
+- Results are cached by holdings and the data versions of every series,
+  so they stay valid until new candles land
+- Daily portfolio values are persisted in portfolio_snapshots, so risk
+  metrics survive restarts
+
+Weights are held constant over the horizon (daily rebalanced). Under
+that assumption the portfolio return of a day is w·r, so the covariance
+method samples N(wᵀμ, wᵀΣw) directly instead of per-asset draws.
+"""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime
+from enum import StrEnum
+from typing import Any
+
+import numpy as np
+from sqlalchemy import text
+
+from service.analysis.backtest_engine import DAY_MS, PriceSeries, get_backtest_engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATHS = 100_000
+DEFAULT_HORIZON_DAYS = 30
+# Path-days simulated per run at most; long horizons get fewer paths
+MAX_PATH_DAYS = 6_000_000
+MIN_PATHS = 1_000
+
+# Daily returns used for fitting/bootstrapping
+LOOKBACK_DAYS = 365
+MIN_HISTORY_DAYS = 30
+
+CONFIDENCE_LEVELS = (0.95, 0.99)
+DRAWDOWN_THRESHOLDS = (10, 20, 30, 50, 75)
+
+RESULT_CACHE_SIZE = 32
+QUOTE = "USDT"
+
+
+class SimulationMethod(StrEnum):
+    """How daily portfolio returns are drawn."""
+
+    BOOTSTRAP = "bootstrap"
+    COVARIANCE = "covariance"
+
+
+@dataclass
+class MonteCarloResult:
+    """Risk distribution of a portfolio over a horizon."""
+
+    method: str
+    paths: int
+    horizon_days: int
+    history_days: int
+    weights: dict[str, float]
+    excluded: list[str]
+    portfolio_value: float
+    expected_return_pct: float
+    prob_loss_pct: float
+    var_pct: dict[str, float]  # horizon loss not exceeded at confidence level
+    cvar_pct: dict[str, float]  # mean loss beyond VaR
+    daily_var_pct: dict[str, float]  # historical one-day VaR
+    drawdown_pct: dict[str, float]  # max drawdown distribution (mean, p50, p95, p99)
+    prob_drawdown_pct: dict[str, float]  # P(max drawdown >= threshold)
+    recovery: dict[str, float | None]
+    elapsed_ms: float
+    calculated_at: datetime = field(default_factory=datetime.now)
+
+    def to_dict(self) -> dict[str, Any]:
+        value = self.portfolio_value
+        return {
+            "method": self.method,
+            "paths": self.paths,
+            "horizon_days": self.horizon_days,
+            "history_days": self.history_days,
+            "weights": {s: round(w, 4) for s, w in self.weights.items()},
+            "excluded": self.excluded,
+            "portfolio_value": round(value, 2),
+            "expected_return_pct": round(self.expected_return_pct, 2),
+            "prob_loss_pct": round(self.prob_loss_pct, 1),
+            "var_pct": {k: round(v, 2) for k, v in self.var_pct.items()},
+            "var_usd": {k: round(v / 100 * value, 2) for k, v in self.var_pct.items()},
+            "cvar_pct": {k: round(v, 2) for k, v in self.cvar_pct.items()},
+            "cvar_usd": {k: round(v / 100 * value, 2) for k, v in self.cvar_pct.items()},
+            "daily_var_pct": {k: round(v, 2) for k, v in self.daily_var_pct.items()},
+            "drawdown_pct": {k: round(v, 2) for k, v in self.drawdown_pct.items()},
+            "prob_drawdown_pct": {k: round(v, 1) for k, v in self.prob_drawdown_pct.items()},
+            "recovery": {k: round(v, 1) if v is not None else None for k, v in self.recovery.items()},
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "calculated_at": self.calculated_at.isoformat(),
+        }
+
+
+# =============================================================================
+# Vectorized primitives
+# =============================================================================
+
+
+def align_returns(series: list[PriceSeries], lookback_days: int = LOOKBACK_DAYS) -> np.ndarray:
+    """
+    Daily simple returns of several series on their common days.
+
+    Returns:
+        (days, assets) matrix, oldest first, at most lookback_days rows
+    """
+    common = series[0].timestamps
+    for s in series[1:]:
+        common = np.intersect1d(common, s.timestamps, assume_unique=True)
+    common = common[-(lookback_days + 1) :]
+
+    closes = np.column_stack([s.closes[np.searchsorted(s.timestamps, common)] for s in series])
+    prev, cur = closes[:-1], closes[1:]
+    valid = (prev > 0).all(axis=1) & (cur > 0).all(axis=1)
+    return (cur[valid] / prev[valid] - 1.0).reshape(-1, len(series))
+
+
+def sample_returns(
+    returns: np.ndarray,
+    weights: np.ndarray,
+    method: SimulationMethod,
+    paths: int,
+    horizon: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Draw daily portfolio returns.
+
+    Args:
+        returns: (days, assets) historical daily returns
+        weights: (assets,) portfolio weights summing to 1
+        method: Bootstrap whole days or sample the fitted normal
+        paths: Number of paths
+        horizon: Days per path
+
+    Returns:
+        (paths, horizon) float32 daily returns, floored at -99%
+    """
+    portfolio = returns @ weights
+    if method == SimulationMethod.BOOTSTRAP:
+        days = rng.integers(0, len(portfolio), size=(paths, horizon))
+        sampled = portfolio.astype(np.float32)[days]
+    else:
+        mean = float(returns.mean(axis=0) @ weights)
+        cov = np.atleast_2d(np.cov(returns, rowvar=False))
+        std = float(np.sqrt(max(weights @ cov @ weights, 0.0)))
+        sampled = rng.standard_normal((paths, horizon), dtype=np.float32)
+        sampled *= std
+        sampled += mean
+    return np.maximum(sampled, -0.99, out=sampled)
+
+
+def path_statistics(daily: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Per-path horizon return, max drawdown and recovery time.
+
+    Args:
+        daily: (paths, horizon) daily returns
+
+    Returns:
+        {"terminal": horizon return, "max_drawdown": fraction,
+         "recovery_days": days from the deepest trough back to its prior
+         peak (-1 if not recovered within the horizon)}
+    """
+    paths, horizon = daily.shape
+    wealth = np.cumprod(1.0 + daily, axis=1)
+    # Peaks include the starting value 1.0
+    peaks = np.maximum(np.maximum.accumulate(wealth, axis=1), 1.0)
+    drawdown = 1.0 - wealth / peaks
+
+    trough = drawdown.argmax(axis=1)
+    rows = np.arange(paths)
+    max_drawdown = drawdown[rows, trough]
+
+    # First day after the trough that is back at the trough's peak
+    after = np.arange(horizon)[None, :] > trough[:, None]
+    recovered = after & (wealth >= peaks[rows, trough][:, None])
+    recovery_days = np.where(recovered.any(axis=1), recovered.argmax(axis=1) - trough, -1)
+
+    return {
+        "terminal": wealth[:, -1] - 1.0,
+        "max_drawdown": max_drawdown,
+        "recovery_days": recovery_days,
+    }
+
+
+def tail_risk(returns: np.ndarray, levels: tuple[float, ...] = CONFIDENCE_LEVELS) -> tuple[dict, dict]:
+    """
+    VaR and CVaR of a return sample as positive loss percentages.
+
+    Returns:
+        ({"95": var, ...}, {"95": cvar, ...})
+    """
+    var, cvar = {}, {}
+    for level in levels:
+        key = f"{level * 100:.0f}"
+        cutoff = np.quantile(returns, 1.0 - level)
+        tail = returns[returns <= cutoff]
+        var[key] = max(-float(cutoff) * 100, 0.0)
+        cvar[key] = max(-float(tail.mean()) * 100, 0.0) if len(tail) else var[key]
+    return var, cvar
+
+
+def run_simulation(
+    returns: np.ndarray,
+    weights: np.ndarray,
+    method: SimulationMethod = SimulationMethod.BOOTSTRAP,
+    paths: int = DEFAULT_PATHS,
+    horizon: int = DEFAULT_HORIZON_DAYS,
+    seed: int | None = None,
+) -> dict[str, Any]:
+    """
+    Simulate and summarize a portfolio's return distribution.
+
+    Returns:
+        Summary fields of MonteCarloResult (without metadata)
+    """
+    paths = max(min(paths, MAX_PATH_DAYS // max(horizon, 1)), MIN_PATHS)
+    rng = np.random.default_rng(seed)
+    stats = path_statistics(sample_returns(returns, weights, method, paths, horizon, rng))
+
+    terminal = stats["terminal"]
+    var, cvar = tail_risk(terminal)
+    daily_var, _ = tail_risk(returns @ weights)
+
+    max_dd = stats["max_drawdown"] * 100
+    p50, p95, p99 = np.percentile(max_dd, [50, 95, 99])
+
+    recovery_days = stats["recovery_days"]
+    in_drawdown = max_dd > 1e-6
+    recovered = in_drawdown & (recovery_days >= 0)
+    recovered_days = recovery_days[recovered]
+    drawdown_paths = int(in_drawdown.sum())
+
+    return {
+        "paths": paths,
+        "expected_return_pct": float(terminal.mean()) * 100,
+        "prob_loss_pct": float((terminal < 0).mean()) * 100,
+        "var_pct": var,
+        "cvar_pct": cvar,
+        "daily_var_pct": daily_var,
+        "drawdown_pct": {"mean": float(max_dd.mean()), "p50": float(p50), "p95": float(p95), "p99": float(p99)},
+        "prob_drawdown_pct": {str(t): float((max_dd >= t).mean()) * 100 for t in DRAWDOWN_THRESHOLDS},
+        "recovery": {
+            "recovered_pct": float(recovered.sum()) / drawdown_paths * 100 if drawdown_paths else None,
+            "median_days": float(np.median(recovered_days)) if len(recovered_days) else None,
+            "p95_days": float(np.percentile(recovered_days, 95)) if len(recovered_days) else None,
+        },
+    }
+
+
+# =============================================================================
+# Portfolio snapshots
+# =============================================================================
+
+
+def day_start_ms(timestamp: datetime) -> int:
+    """UTC day start of a timestamp in milliseconds."""
+    ms = int(timestamp.timestamp() * 1000)
+    return ms - ms % DAY_MS
+
+
+async def save_snapshot(session, value: float, holdings: dict[str, float], timestamp: datetime) -> None:
+    """Upsert the day's portfolio snapshot (the latest value of a day wins)."""
+    await session.execute(
+        text("""
+            INSERT INTO portfolio_snapshots (day, total_value, holdings, updated_at)
+            VALUES (:day, :value, :holdings, :updated_at)
+            ON CONFLICT (day) DO UPDATE SET
+                total_value = excluded.total_value,
+                holdings = excluded.holdings,
+                updated_at = excluded.updated_at
+        """),
+        {
+            "day": day_start_ms(timestamp),
+            "value": value,
+            "holdings": json.dumps(holdings),
+            "updated_at": timestamp.astimezone(UTC),
+        },
+    )
+    await session.commit()
+
+
+async def load_snapshots(session, days: int = LOOKBACK_DAYS) -> list[dict]:
+    """
+    Load daily portfolio snapshots.
+
+    Returns:
+        [{"value": float, "timestamp": datetime}] oldest first
+    """
+    start = day_start_ms(datetime.now(UTC)) - days * DAY_MS
+    result = await session.execute(
+        text("""
+            SELECT day, total_value FROM portfolio_snapshots
+            WHERE day >= :start
+            ORDER BY day
+        """),
+        {"start": start},
+    )
+    return [
+        {"value": float(row.total_value), "timestamp": datetime.fromtimestamp(row.day / 1000)}
+        for row in result.fetchall()
+    ]
+
+
+# =============================================================================
+# Engine
+# =============================================================================
+
+
+class RiskEngine:
+    """
+    Cache front for Monte Carlo risk runs on stored candles.
+
+    Results are keyed by holdings weights, simulation parameters and the
+    data versions of every asset series.
+    """
+
+    def __init__(self, cache_size: int = RESULT_CACHE_SIZE):
+        self._results: OrderedDict[tuple, MonteCarloResult] = OrderedDict()
+        self._cache_size = cache_size
+        self._hits = 0
+        self._misses = 0
+        self._snapshot_errors = 0
+
+    async def _load_series(self, symbols: list[str]) -> tuple[list[PriceSeries], list[str]]:
+        """Daily series of holdings; symbols without stored candles are excluded."""
+        engine = get_backtest_engine()
+        series, excluded = [], []
+        for symbol in symbols:
+            try:
+                s = await engine.get_series(f"{symbol}/{QUOTE}")
+            except Exception as e:
+                logger.warning(f"Failed to load daily candles for {symbol}: {e}")
+                s = None
+            if s is None or len(s) < MIN_HISTORY_DAYS + 1:
+                excluded.append(symbol)
+            else:
+                series.append(s)
+        return series, excluded
+
+    async def simulate(
+        self,
+        holdings: dict[str, float],
+        horizon_days: int = DEFAULT_HORIZON_DAYS,
+        paths: int = DEFAULT_PATHS,
+        method: SimulationMethod | str = SimulationMethod.BOOTSTRAP,
+        seed: int | None = 0,
+    ) -> MonteCarloResult | None:
+        """
+        Run (or reuse) a Monte Carlo simulation of the holdings.
+
+        Args:
+            holdings: {symbol: value in USDT}; stablecoins and symbols
+                without stored daily candles are excluded
+            horizon_days: Days simulated per path
+            paths: Number of paths (reduced for long horizons)
+            method: "bootstrap" or "covariance"
+            seed: RNG seed (fixed by default so cached and fresh runs agree)
+
+        Returns:
+            MonteCarloResult, or None without enough history
+        """
+        method = SimulationMethod(method)
+        positive = {s.upper(): v for s, v in holdings.items() if v > 0}
+        total = sum(positive.values())
+        risky = sorted(s for s in positive if s != QUOTE)
+        if total <= 0 or not risky:
+            return None
+
+        series, excluded = await self._load_series(risky)
+        if not series:
+            return None
+
+        symbols = [s.symbol.split("/")[0] for s in series]
+        excluded = excluded + ([QUOTE] if QUOTE in positive else [])
+        covered = sum(positive[s] for s in symbols)
+        weights = np.array([positive[s] / covered for s in symbols])
+        key = (
+            tuple(symbols),
+            tuple(np.round(weights, 3)),
+            horizon_days,
+            paths,
+            method.value,
+            seed,
+            tuple(s.version for s in series),
+        )
+
+        cached = self._results.get(key)
+        if cached is not None:
+            self._results.move_to_end(key)
+            self._hits += 1
+            # The key only holds weights, so USD figures follow the current value
+            return replace(cached, portfolio_value=total, excluded=excluded)
+
+        self._misses += 1
+        returns = align_returns(series)
+        if len(returns) < MIN_HISTORY_DAYS:
+            logger.warning(f"Only {len(returns)} common days of returns for {symbols}, skipping simulation")
+            return None
+
+        started = time.perf_counter()
+        summary = run_simulation(returns, weights, method, paths, horizon_days, seed)
+        result = MonteCarloResult(
+            method=method.value,
+            horizon_days=horizon_days,
+            history_days=len(returns),
+            weights=dict(zip(symbols, weights.tolist(), strict=True)),
+            excluded=excluded,
+            portfolio_value=total,
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+            **summary,
+        )
+        logger.debug(
+            f"Monte Carlo {method.value} {result.paths}x{horizon_days} for {symbols}: {result.elapsed_ms:.0f}ms"
+        )
+
+        self._results[key] = result
+        if len(self._results) > self._cache_size:
+            self._results.popitem(last=False)
+        return result
+
+    async def save_snapshot(
+        self, value: float, holdings: dict[str, float] | None = None, timestamp: datetime | None = None
+    ) -> None:
+        """Persist the day's portfolio value (best-effort)."""
+        from models.writer import run_write
+
+        timestamp = timestamp or datetime.now(UTC)
+        try:
+            await run_write(lambda session: save_snapshot(session, value, holdings or {}, timestamp))
+        except Exception as e:
+            self._snapshot_errors += 1
+            logger.warning(f"Failed to save portfolio snapshot: {e}")
+
+    async def load_snapshots(self, days: int = LOOKBACK_DAYS) -> list[dict]:
+        """Load persisted daily portfolio values (empty on database errors)."""
+        from models.session import async_session_maker
+
+        try:
+            async with async_session_maker() as session:
+                return await load_snapshots(session, days)
+        except Exception as e:
+            logger.warning(f"Failed to load portfolio snapshots: {e}")
+            return []
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._results.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        total = self._hits + self._misses
+        return {
+            "results_cached": len(self._results),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / total, 3) if total else None,
+            "snapshot_errors": self._snapshot_errors,
+        }
+
+
+def portfolio_holdings() -> dict[str, float]:
+    """Current holding values from the portfolio manager ({symbol: USDT})."""
+    from service.portfolio import get_portfolio_manager
+
+    return {h.symbol: h.current_value or h.amount * h.avg_price for h in get_portfolio_manager().get_holdings()}
+
+
+# Global instance
+_risk_engine: RiskEngine | None = None
+
+
+def get_risk_engine() -> RiskEngine:
+    """Get global risk engine instance."""
+    global _risk_engine
+    if _risk_engine is None:
+        _risk_engine = RiskEngine()
+    return _risk_engine
@@ -0,0 +1,414 @@
+"""
+Multi-Timeframe Scan Engine.
+
+Scans the symbol universe on several timeframes (1h, 4h, 1d by default)
+in two stages:
+
+1. Fetch - every (symbol, timeframe) candle read runs concurrently through
+   the candle store, bounded by a semaphore
+2. Compute - indicators, divergences, chart patterns and support/resistance
+   of each series run in a thread pool so the event loop stays responsive.
+   Indicator series are computed in one pass (not per prefix) and price
+   pivots come from the shared pivot store
+
+The result is one :class:`ScanReport` with a :class:`ScanResult` per
+(symbol, timeframe) and per-stage timings.
+
+Usage:
+    from service.analysis.scanner import get_scan_engine
+
+    report = await get_scan_engine().scan(["BTC", "ETH"])
+    btc_4h = report.get("BTC", "4h")
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from service.analysis.divergences import Divergence, DivergenceDetector
+from service.analysis.patterns import DetectedPattern, PatternDetector
+from service.analysis.pivots import get_pivot_store
+from service.analysis.technical import CandleDict, TechnicalAnalyzer
+from service.candlestick.models import CandleInterval, Candlestick
+from service.candlestick.rollup import DAY_MS, INTERVAL_MS
+
+logger = logging.getLogger(__name__)
+
+SCAN_TIMEFRAMES = (CandleInterval.HOUR_1, CandleInterval.HOUR_4, CandleInterval.DAY_1)
+# 200-bar SMA and its previous value (golden/death cross)
+DEFAULT_LIMIT = 201
+DEFAULT_FETCH_CONCURRENCY = 8
+DEFAULT_WORKERS = 4
+MIN_CANDLES = 50
+# Bars of aligned price/RSI/MACD needed for divergence detection
+MIN_ALIGNED_BARS = 20
+# MACD histogram starts after slow (26) + signal (9) bars
+MACD_WARMUP = 35
+
+STAGES = ("indicators", "divergences", "patterns", "levels")
+
+
+@dataclass
+class ScanResult:
+    """Analysis of one (symbol, timeframe) series."""
+
+    symbol: str
+    timeframe: str
+    candles: int = 0
+    price: float | None = None
+    change_24h: float | None = None
+    high_24h: float | None = None
+    low_24h: float | None = None
+    volume_24h: float | None = None
+    rsi: float | None = None
+    macd_signal: str = "—"  # "Bullish", "Bearish", "Neutral"
+    trend: str = "—"  # "Uptrend", "Downtrend", "Sideways"
+    bb_position: str = "—"  # "Above Upper", "Upper Half", "Lower Half", "Below Lower"
+    signal: str = "—"  # "BUY", "SELL", "HOLD"
+    support: float | None = None
+    resistance: float | None = None
+    divergences: list[Divergence] = field(default_factory=list)
+    patterns: list[DetectedPattern] = field(default_factory=list)
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict:
+        return {
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "candles": self.candles,
+            "price": self.price,
+            "change_24h": self.change_24h,
+            "high_24h": self.high_24h,
+            "low_24h": self.low_24h,
+            "volume_24h": self.volume_24h,
+            "rsi": self.rsi,
+            "macd_signal": self.macd_signal,
+            "trend": self.trend,
+            "bb_position": self.bb_position,
+            "signal": self.signal,
+            "support": self.support,
+            "resistance": self.resistance,
+            "divergences": [d.to_dict() for d in self.divergences],
+            "patterns": [p.to_dict() for p in self.patterns],
+            "error": self.error,
+        }
+
+
+@dataclass
+class ScanReport:
+    """Consolidated result of a scan."""
+
+    started_at: datetime
+    timeframes: list[str]
+    results: list[ScanResult] = field(default_factory=list)
+    fetch_duration: float = 0.0  # Wall time of the fetch stage
+    compute_duration: float = 0.0  # Wall time of the compute stage
+    total_duration: float = 0.0
+
+    def get(self, symbol: str, timeframe: str) -> ScanResult | None:
+        """Result of one series."""
+        for result in self.results:
+            if result.symbol == symbol and result.timeframe == timeframe:
+                return result
+        return None
+
+    def by_timeframe(self, timeframe: str) -> dict[str, ScanResult]:
+        """Results of one timeframe keyed by symbol."""
+        return {r.symbol: r for r in self.results if r.timeframe == timeframe}
+
+    @property
+    def divergences(self) -> list[Divergence]:
+        return [d for r in self.results for d in r.divergences]
+
+    @property
+    def failed(self) -> list[str]:
+        return [f"{r.symbol}:{r.timeframe}" for r in self.results if not r.ok]
+
+    def stage_totals(self) -> dict[str, float]:
+        """Compute time per stage summed over all series (seconds)."""
+        totals = dict.fromkeys(STAGES, 0.0)
+        for result in self.results:
+            for stage, seconds in result.stage_seconds.items():
+                totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+    def to_dict(self, include_results: bool = True) -> dict:
+        data: dict[str, Any] = {
+            "started_at": self.started_at.isoformat(),
+            "timeframes": self.timeframes,
+            "series": len(self.results),
+            "divergences": len(self.divergences),
+            "patterns": sum(len(r.patterns) for r in self.results),
+            "failed": self.failed,
+            "timings_ms": {
+                "fetch": round(self.fetch_duration * 1000, 1),
+                "compute": round(self.compute_duration * 1000, 1),
+                "total": round(self.total_duration * 1000, 1),
+                "stages": {stage: round(s * 1000, 1) for stage, s in self.stage_totals().items()},
+            },
+        }
+        if include_results:
+            data["results"] = [r.to_dict() for r in self.results]
+        return data
+
+
+def _candle_dicts(candles: list[Candlestick]) -> list[CandleDict]:
+    return [
+        {
+            "timestamp": c.timestamp,
+            "open": float(c.open_price),
+            "high": float(c.high_price),
+            "low": float(c.low_price),
+            "close": float(c.close_price),
+            "volume": float(c.volume),
+        }
+        for c in candles
+    ]
+
+
+def analyze_series(symbol: str, timeframe: str, candles: list[CandleDict]) -> ScanResult:
+    """
+    Compute indicators, divergences, patterns and levels of one series.
+
+    CPU-only; runs in a scan worker thread.
+
+    Args:
+        symbol: Base symbol ("BTC")
+        timeframe: Candle interval ("4h")
+        candles: Candles, oldest first (the last one may be forming)
+
+    Returns:
+        ScanResult (with error set when there is not enough data)
+    """
+    result = ScanResult(symbol=symbol, timeframe=timeframe, candles=len(candles))
+    if len(candles) < MIN_CANDLES:
+        result.error = "Insufficient data"
+        return result
+
+    ta = TechnicalAnalyzer()
+    stage_started = time.perf_counter()
+
+    def lap(stage: str) -> None:
+        nonlocal stage_started
+        now = time.perf_counter()
+        result.stage_seconds[stage] = now - stage_started
+        stage_started = now
+
+    closes = [c["close"] for c in candles]
+    highs = [c["high"] for c in candles]
+    lows = [c["low"] for c in candles]
+    volumes = [c.get("volume", 0.0) for c in candles]
+
+    # 24h window in bars of this timeframe
+    day_bars = max(1, DAY_MS // INTERVAL_MS.get(timeframe, DAY_MS))
+    current_price = closes[-1]
+    price_24h_ago = closes[-day_bars - 1] if len(closes) > day_bars else closes[0]
+    result.price = current_price
+    result.change_24h = round((current_price - price_24h_ago) / price_24h_ago * 100, 2) if price_24h_ago else 0.0
+    result.high_24h = max(highs[-day_bars:])
+    result.low_24h = min(lows[-day_bars:])
+    result.volume_24h = sum(volumes[-day_bars:])
+
+    rsi_values = ta.calc_rsi_series(closes)
+    macd_values = ta.calc_macd_histogram_series(closes)
+    result.rsi = rsi_values[-1] if rsi_values else None
+
+    macd_line, signal_line, _ = ta.calc_macd(closes)
+    if macd_line is not None and signal_line is not None:
+        if macd_line > signal_line:
+            result.macd_signal = "Bullish"
+        elif macd_line < signal_line:
+            result.macd_signal = "Bearish"
+        else:
+            result.macd_signal = "Neutral"
+
+    sma_20 = ta.calc_sma(closes, 20)
+    sma_50 = ta.calc_sma(closes, 50)
+    if sma_20 and sma_50:
+        if current_price > sma_20 > sma_50:
+            result.trend = "Uptrend"
+        elif current_price < sma_20 < sma_50:
+            result.trend = "Downtrend"
+        else:
+            result.trend = "Sideways"
+
+    bb_upper, bb_middle, bb_lower, _ = ta.calc_bollinger_bands(closes)
+    if bb_upper is not None:
+        if current_price >= bb_upper:
+            result.bb_position = "Above Upper"
+        elif current_price <= bb_lower:
+            result.bb_position = "Below Lower"
+        elif current_price > bb_middle:
+            result.bb_position = "Upper Half"
+        else:
+            result.bb_position = "Lower Half"
+
+    result.signal = "HOLD"
+    if result.rsi and result.rsi < 30 and result.macd_signal == "Bullish":
+        result.signal = "BUY"
+    elif result.rsi and result.rsi > 70 and result.macd_signal == "Bearish":
+        result.signal = "SELL"
+    lap("indicators")
+
+    # Align price/RSI/MACD on their common tail
+    aligned = min(len(closes) - MACD_WARMUP, len(rsi_values), len(macd_values))
+    if aligned >= MIN_ALIGNED_BARS:
+        result.divergences = DivergenceDetector().detect(
+            symbol=symbol,
+            prices=closes[-aligned:],
+            rsi_values=rsi_values[-aligned:],
+            macd_values=macd_values[-aligned:],
+            timeframe=timeframe,
+            timestamps=[c["timestamp"] for c in candles[-aligned:]],
+        )
+    lap("divergences")
+
+    result.patterns = PatternDetector().detect_all(symbol, candles, timeframe)
+    lap("patterns")
+
+    pivots = get_pivot_store().get(symbol, timeframe)
+    # Another worker may be scanning the same series
+    with pivots.lock:
+        pivots.update(candles)
+        levels = ta.find_support_resistance(candles, pivots=pivots)
+    result.support = levels.nearest_support["level"] if levels.nearest_support else None
+    result.resistance = levels.nearest_resistance["level"] if levels.nearest_resistance else None
+    lap("levels")
+
+    return result
+
+
+def _analyze_candles(symbol: str, timeframe: str, candles: list[Candlestick]) -> ScanResult:
+    try:
+        return analyze_series(symbol, timeframe, _candle_dicts(candles))
+    except Exception as e:
+        logger.warning(f"Scan failed for {symbol} {timeframe}: {e}")
+        return ScanResult(symbol=symbol, timeframe=timeframe, candles=len(candles), error=str(e) or type(e).__name__)
+
+
+class ScanEngine:
+    """Concurrent symbol × timeframe scanner."""
+
+    def __init__(
+        self,
+        timeframes: tuple[CandleInterval, ...] = SCAN_TIMEFRAMES,
+        limit: int = DEFAULT_LIMIT,
+        fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+        workers: int = DEFAULT_WORKERS,
+    ):
+        """
+        Initialize scan engine.
+
+        Args:
+            timeframes: Intervals scanned for every symbol
+            limit: Candles read per series
+            fetch_concurrency: Candle reads in flight
+            workers: Compute threads
+        """
+        self.timeframes = tuple(timeframes)
+        self.limit = limit
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="scan")
+        self.last_report: ScanReport | None = None
+        self.scans = 0
+
+    async def _fetch_all(self, symbols: list[str]) -> list[tuple[str, CandleInterval, list[Candlestick] | Exception]]:
+        """Read the candles of every (symbol, timeframe) concurrently."""
+        from service.candlestick import read_candlesticks
+
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+
+        async def fetch(symbol: str, interval: CandleInterval) -> list[Candlestick] | Exception:
+            async with semaphore:
+                try:
+                    return await read_candlesticks(symbol=f"{symbol}/USDT", interval=interval, limit=self.limit)
+                except Exception as e:
+                    logger.warning(f"Scan fetch failed for {symbol} {interval.value}: {e}")
+                    return e
+
+        pairs = [(symbol, interval) for symbol in symbols for interval in self.timeframes]
+        candles = await asyncio.gather(*(fetch(symbol, interval) for symbol, interval in pairs))
+        return [(symbol, interval, c) for (symbol, interval), c in zip(pairs, candles, strict=True)]
+
+    async def scan(self, symbols: list[str]) -> ScanReport:
+        """
+        Scan symbols on all timeframes.
+
+        Args:
+            symbols: Base symbols ("BTC") or pairs ("BTC/USDT")
+
+        Returns:
+            ScanReport with one result per (symbol, timeframe)
+        """
+        started = time.monotonic()
+        report = ScanReport(started_at=datetime.now(), timeframes=[tf.value for tf in self.timeframes])
+        base_symbols = list(dict.fromkeys(s.split("/")[0].upper() for s in symbols))
+
+        fetched = await self._fetch_all(base_symbols)
+        report.fetch_duration = time.monotonic() - started
+
+        compute_started = time.monotonic()
+        loop = asyncio.get_running_loop()
+
+        async def failed(symbol: str, timeframe: str, error: Exception) -> ScanResult:
+            return ScanResult(symbol=symbol, timeframe=timeframe, error=str(error) or type(error).__name__)
+
+        report.results = list(
+            await asyncio.gather(
+                *(
+                    failed(symbol, interval.value, candles)
+                    if isinstance(candles, Exception)
+                    else loop.run_in_executor(self._executor, _analyze_candles, symbol, interval.value, candles)
+                    for symbol, interval, candles in fetched
+                )
+            )
+        )
+        report.compute_duration = time.monotonic() - compute_started
+
+        report.total_duration = time.monotonic() - started
+        self.last_report = report
+        self.scans += 1
+        logger.info(
+            f"Scan: {len(base_symbols)} symbols x {len(self.timeframes)} timeframes, "
+            f"{len(report.divergences)} divergences, fetch {report.fetch_duration:.2f}s, "
+            f"compute {report.compute_duration:.2f}s"
+        )
+        return report
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get engine statistics and the last report summary."""
+        return {
+            "scans": self.scans,
+            "timeframes": [tf.value for tf in self.timeframes],
+            "limit": self.limit,
+            "fetch_concurrency": self.fetch_concurrency,
+            "last": self.last_report.to_dict(include_results=False) if self.last_report else None,
+        }
+
+
+# Global instance
+_scan_engine: ScanEngine | None = None
+
+
+def get_scan_engine() -> ScanEngine:
+    """Get global scan engine instance."""
+    global _scan_engine
+    if _scan_engine is None:
+        from core.config import settings
+
+        timeframes = tuple(CandleInterval(tf.strip()) for tf in settings.SCAN_TIMEFRAMES.split(",") if tf.strip())
+        _scan_engine = ScanEngine(
+            timeframes=timeframes or SCAN_TIMEFRAMES,
+            fetch_concurrency=settings.SCAN_FETCH_CONCURRENCY,
+            workers=settings.SCAN_WORKERS,
+        )
+    return _scan_engine
@@ -5,12 +5,19 @@ Stores and tracks trading signals:
 - Record all generated signals
 - Track outcomes (price after 24h/7d)
 - Calculate win rates and statistics
+
+Signals are persisted in the signal_records table. Outcomes are resolved
+in bulk against stored candles (current prices for symbols without
+candles), and win rates and P&L come from running aggregates in
+signal_stats, so the history can grow for years at constant query cost.
 """
 
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +95,27 @@ class Signal:
             "age_hours": self._get_age_hours(),
         }
 
+    @classmethod
+    def from_record(cls, record: Any) -> "Signal":
+        """Build from a SignalRecord row."""
+        return cls(
+            id=f"sig_{record.id:06d}",
+            symbol=record.symbol,
+            signal_type=SignalType(record.signal_type),
+            source=SignalSource(record.source),
+            created_at=datetime.fromtimestamp(record.created_at / 1000),
+            price_at_signal=record.price_at_signal,
+            confidence=record.confidence,
+            description=record.description,
+            description_ru=record.description_ru,
+            outcome_24h=SignalOutcome(record.outcome_24h),
+            outcome_7d=SignalOutcome(record.outcome_7d),
+            price_after_24h=record.price_after_24h,
+            price_after_7d=record.price_after_7d,
+            pnl_24h_pct=record.pnl_24h_pct,
+            pnl_7d_pct=record.pnl_7d_pct,
+        )
+
     def _get_age_hours(self) -> float:
         """Get signal age in hours."""
         return (datetime.now() - self.created_at).total_seconds() / 3600
@@ -188,16 +216,11 @@ class SignalHistoryManager:
     """
     Signal history manager.
 
-    Tracks signals and calculates statistics.
-    Note: In production, this should persist to database.
+    Persists signals, resolves their outcomes and reads statistics from
+    the running aggregates.
     """
 
-    def __init__(self, max_signals: int = 1000):
-        self._signals: dict[str, Signal] = {}
-        self._max_signals = max_signals
-        self._signal_counter = 0
-
-    def record_signal(
+    async def record_signal(
         self,
         symbol: str,
         signal_type: SignalType | str,
@@ -222,40 +245,52 @@ class SignalHistoryManager:
         Returns:
             Created signal
         """
+        from models.repositories.signals import SignalRepository
+        from models.writer import run_write
+
         if isinstance(signal_type, str):
             signal_type = SignalType(signal_type)
         if isinstance(source, str):
             source = SignalSource(source)
 
-        self._signal_counter += 1
-        signal_id = f"sig_{self._signal_counter:06d}"
-
-        signal = Signal(
-            id=signal_id,
-            symbol=symbol.upper(),
-            signal_type=signal_type,
-            source=source,
-            created_at=datetime.now(),
-            price_at_signal=price,
-            confidence=confidence,
-            description=description or f"{signal_type.value} signal for {symbol}",
-            description_ru=description_ru or f"Сигнал {signal_type.value} для {symbol}",
+        base = symbol.upper().split("/")[0]
+        record = await run_write(
+            lambda session: SignalRepository(session).add(
+                symbol=base,
+                signal_type=signal_type.value,
+                source=source.value,
+                created_at=int(time.time() * 1000),
+                price=price,
+                confidence=confidence,
+                description=description or f"{signal_type.value} signal for {symbol}",
+                description_ru=description_ru or f"Сигнал {signal_type.value} для {symbol}",
+            )
         )
+        signal = Signal.from_record(record)
 
-        self._signals[signal_id] = signal
-
-        # Cleanup old signals if over limit
-        self._cleanup_old_signals()
-
-        logger.info(f"Recorded signal {signal_id}: {symbol} {signal_type.value}")
+        logger.info(f"Recorded signal {signal.id}: {symbol} {signal_type.value}")
 
         return signal
 
-    def get_signal(self, signal_id: str) -> Signal | None:
+    async def get_signal(self, signal_id: str) -> Signal | None:
         """Get signal by ID."""
-        return self._signals.get(signal_id)
-
-    def get_signals(
+        from models.repositories.signals import SignalRepository
+        from models.session import async_session_maker
+
+        try:
+            record_id = int(signal_id.removeprefix("sig_"))
+        except ValueError:
+            return None
+
+        try:
+            async with async_session_maker() as session:
+                record = await SignalRepository(session).get(record_id)
+        except Exception as e:
+            logger.warning(f"Failed to load signal {signal_id}: {e}")
+            return None
+        return Signal.from_record(record) if record else None
+
+    async def get_signals(
         self,
         symbol: str | None = None,
         source: SignalSource | None = None,
@@ -272,132 +307,103 @@ class SignalHistoryManager:
             limit: Maximum number of signals
 
         Returns:
-            List of matching signals
+            List of matching signals, newest first (empty on database errors)
         """
-        signals = list(self._signals.values())
-
-        if symbol:
-            signals = [s for s in signals if s.symbol == symbol.upper()]
-
-        if source:
-            signals = [s for s in signals if s.source == source]
-
-        if since:
-            signals = [s for s in signals if s.created_at >= since]
-
-        # Sort by creation time (newest first)
-        signals.sort(key=lambda x: x.created_at, reverse=True)
-
-        return signals[:limit]
-
-    def update_outcomes(self, prices: dict[str, float]) -> int:
+        from models.repositories.signals import SignalRepository
+        from models.session import async_session_maker
+
+        try:
+            async with async_session_maker() as session:
+                records = await SignalRepository(session).find(
+                    symbol=symbol.upper().split("/")[0] if symbol else None,
+                    source=source.value if source else None,
+                    since=int(since.timestamp() * 1000) if since else None,
+                    limit=limit,
+                )
+        except Exception as e:
+            logger.warning(f"Failed to load signals: {e}")
+            return []
+        return [Signal.from_record(record) for record in records]
+
+    async def update_outcomes(self, prices: dict[str, float] | None = None) -> int:
         """
-        Update outcomes for all pending signals.
+        Resolve outcomes of all due signals.
+
+        Stored candles give the price at signal time + 24h / 7d; signals
+        whose symbol has no candles fall back to the current price once
+        their horizon has just ended (within the last job interval).
 
         Args:
             prices: Current prices by symbol
 
         Returns:
-            Number of signals updated
+            Number of outcomes resolved
         """
-        updated = 0
+        from models.repositories.signals import SignalRepository
+        from models.writer import run_write
 
-        for signal in self._signals.values():
-            if signal.symbol in prices:
-                old_24h = signal.outcome_24h
-                old_7d = signal.outcome_7d
+        async def resolve(session) -> int:
+            repository = SignalRepository(session)
+            resolved = await repository.resolve_from_candles()
+            if prices:
+                resolved += await repository.resolve_from_prices(
+                    {symbol.split("/")[0]: price for symbol, price in prices.items()}
+                )
+            return resolved
 
-                signal.update_outcome(prices[signal.symbol])
+        return await run_write(resolve)
 
-                if signal.outcome_24h != old_24h or signal.outcome_7d != old_7d:
-                    updated += 1
+    async def get_stats(self) -> SignalStats:
+        """Get signal statistics from the running aggregates (empty on database errors)."""
+        from models.repositories.signals import SignalRepository
+        from models.session import async_session_maker
 
-        return updated
-
-    def get_stats(self) -> SignalStats:
-        """Calculate signal statistics."""
         now = datetime.now()
-        day_ago = now - timedelta(hours=24)
-
-        all_signals = list(self._signals.values())
-        signals_24h = [s for s in all_signals if s.created_at >= day_ago]
-
-        # Calculate win rates
-        completed_24h = [s for s in all_signals if s.outcome_24h != SignalOutcome.PENDING]
-        completed_7d = [s for s in all_signals if s.outcome_7d != SignalOutcome.PENDING]
-
-        wins_24h = len([s for s in completed_24h if s.outcome_24h == SignalOutcome.WIN])
-        wins_7d = len([s for s in completed_7d if s.outcome_7d == SignalOutcome.WIN])
-
-        win_rate_24h = (wins_24h / len(completed_24h) * 100) if completed_24h else 0
-        win_rate_7d = (wins_7d / len(completed_7d) * 100) if completed_7d else 0
+        day_ago_ms = int((now - timedelta(hours=24)).timestamp() * 1000)
 
-        # Average P&L
-        pnls_24h = [s.pnl_24h_pct for s in all_signals if s.pnl_24h_pct is not None]
-        pnls_7d = [s.pnl_7d_pct for s in all_signals if s.pnl_7d_pct is not None]
+        try:
+            async with async_session_maker() as session:
+                repository = SignalRepository(session)
+                rows = await repository.get_stats_rows()
+                signals_24h = await repository.count_since(day_ago_ms)
+                best, worst = await repository.best_and_worst()
+        except Exception as e:
+            logger.warning(f"Failed to load signal statistics: {e}")
+            rows, signals_24h, best, worst = [], 0, None, None
 
-        avg_pnl_24h = sum(pnls_24h) / len(pnls_24h) if pnls_24h else 0
-        avg_pnl_7d = sum(pnls_7d) / len(pnls_7d) if pnls_7d else 0
+        def win_rate(wins: int, resolved: int) -> float:
+            return wins / resolved * 100 if resolved else 0
 
-        # Find best/worst
-        signals_with_pnl = [s for s in all_signals if s.pnl_7d_pct is not None or s.pnl_24h_pct is not None]
+        resolved_24h = sum(r.resolved_24h for r in rows)
+        resolved_7d = sum(r.resolved_7d for r in rows)
 
-        best_signal = None
-        worst_signal = None
-        if signals_with_pnl:
-            sorted_by_pnl = sorted(
-                signals_with_pnl,
-                key=lambda x: x.pnl_7d_pct or x.pnl_24h_pct or 0,
-                reverse=True,
-            )
-            best_signal = sorted_by_pnl[0]
-            worst_signal = sorted_by_pnl[-1]
-
-        # Stats by source
+        # Stats by source / type (24h outcomes)
         by_source: dict[str, dict] = {}
-        for source in SignalSource:
-            source_signals = [s for s in completed_24h if s.source == source]
-            if source_signals:
-                source_wins = len([s for s in source_signals if s.outcome_24h == SignalOutcome.WIN])
-                by_source[source.value] = {
-                    "count": len(source_signals),
-                    "win_rate": round(source_wins / len(source_signals) * 100, 1),
-                }
-
-        # Stats by type
         by_type: dict[str, dict] = {}
-        for sig_type in SignalType:
-            type_signals = [s for s in completed_24h if s.signal_type == sig_type]
-            if type_signals:
-                type_wins = len([s for s in type_signals if s.outcome_24h == SignalOutcome.WIN])
-                by_type[sig_type.value] = {
-                    "count": len(type_signals),
-                    "win_rate": round(type_wins / len(type_signals) * 100, 1),
-                }
+        for groups, key in ((by_source, "source"), (by_type, "signal_type")):
+            totals: dict[str, list[int]] = {}
+            for row in rows:
+                if row.resolved_24h:
+                    total = totals.setdefault(getattr(row, key), [0, 0])
+                    total[0] += row.resolved_24h
+                    total[1] += row.wins_24h
+            for name, (count, wins) in totals.items():
+                groups[name] = {"count": count, "win_rate": round(win_rate(wins, count), 1)}
 
         return SignalStats(
             timestamp=now,
-            total_signals=len(all_signals),
-            signals_24h=len(signals_24h),
-            win_rate_24h=win_rate_24h,
-            win_rate_7d=win_rate_7d,
-            avg_pnl_24h=avg_pnl_24h,
-            avg_pnl_7d=avg_pnl_7d,
-            best_signal=best_signal,
-            worst_signal=worst_signal,
+            total_signals=sum(r.recorded for r in rows),
+            signals_24h=signals_24h,
+            win_rate_24h=win_rate(sum(r.wins_24h for r in rows), resolved_24h),
+            win_rate_7d=win_rate(sum(r.wins_7d for r in rows), resolved_7d),
+            avg_pnl_24h=sum(r.sum_pnl_24h for r in rows) / resolved_24h if resolved_24h else 0,
+            avg_pnl_7d=sum(r.sum_pnl_7d for r in rows) / resolved_7d if resolved_7d else 0,
+            best_signal=Signal.from_record(best) if best else None,
+            worst_signal=Signal.from_record(worst) if worst else None,
             by_source=by_source,
             by_type=by_type,
         )
 
-    def _cleanup_old_signals(self) -> None:
-        """Remove old signals if over limit."""
-        if len(self._signals) > self._max_signals:
-            # Remove oldest signals
-            sorted_signals = sorted(self._signals.items(), key=lambda x: x[1].created_at)
-            to_remove = len(self._signals) - self._max_signals
-            for signal_id, _ in sorted_signals[:to_remove]:
-                del self._signals[signal_id]
-
 
 # Global instance
 _signal_manager: SignalHistoryManager | None = None
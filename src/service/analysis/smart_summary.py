@@ -13,10 +13,9 @@ from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
 from service.analysis.dca import DCAZone, get_dca_calculator
-from service.analysis.derivatives import DerivativesAnalyzer
 from service.analysis.exchange_flow import FlowDirection, get_exchange_flow_analyzer
 from service.analysis.macro import MacroRisk, get_macro_calendar
-from service.analysis.onchain import OnChainAnalyzer
+from service.analysis.market_facts import get_derivatives, get_fear_greed
 from service.analysis.risk import RiskAnalyzer
 from service.analysis.unlocks import get_unlock_tracker
 
@@ -217,9 +216,7 @@ class SmartSummaryService:
         self._cache: dict = {}
         self._cache_ttl = 300  # 5 minutes
 
-        # Initialize service instances
-        self._onchain_analyzer = OnChainAnalyzer()
-        self._derivatives_analyzer = DerivativesAnalyzer()
+        # Initialize service instances (F&G and funding come from the shared fact store)
         self._risk_analyzer = RiskAnalyzer()
 
     async def get_market_pulse(self) -> MarketPulse:
@@ -603,9 +600,9 @@ class SmartSummaryService:
     # =========================================================================
 
     async def _get_fear_greed(self) -> int:
-        """Get Fear & Greed Index value from OnChainAnalyzer."""
+        """Get Fear & Greed Index value from the market fact store."""
         try:
-            fg_data = await self._onchain_analyzer.fetch_fear_greed()
+            fg_data = await get_fear_greed()
             if fg_data:
                 return fg_data.value
         except Exception as e:
@@ -653,10 +650,10 @@ class SmartSummaryService:
         """Get RSI value for symbol from TechnicalAnalyzer."""
         try:
             from service.analysis.technical import TechnicalAnalyzer
-            from service.candlestick import fetch_candlesticks
+            from service.candlestick import read_candlesticks
             from service.candlestick.models import CandleInterval
 
-            candles = await fetch_candlesticks(
+            candles = await read_candlesticks(
                 symbol=symbol,
                 interval=CandleInterval.HOUR_4,
                 limit=50,
@@ -692,11 +689,11 @@ class SmartSummaryService:
         return "neutral"
 
     async def _get_funding_rate(self) -> float:
-        """Get BTC funding rate from DerivativesAnalyzer."""
+        """Get BTC funding rate from the market fact store."""
         try:
-            funding_data = await self._derivatives_analyzer.fetch_funding_rate("BTC")
-            if funding_data:
-                return funding_data.rate
+            deriv_data = await get_derivatives("BTC")
+            if deriv_data and deriv_data.funding:
+                return deriv_data.funding.rate
         except Exception as e:
             logger.warning(f"Failed to fetch funding rate: {e}")
         return 0.01  # Default neutral value
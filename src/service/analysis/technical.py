@@ -16,6 +16,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import TypedDict
 
+from service.analysis.pivots import PivotIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -259,6 +261,85 @@ class TechnicalAnalyzer:
             round(histogram, 4) if histogram else None,
         )
 
+    @staticmethod
+    def calc_rsi_series(prices: list[float], period: int = 14) -> list[float]:
+        """
+        RSI of every price prefix in one pass.
+
+        Element k equals calc_rsi(prices[: period + 1 + k]).
+
+        Args:
+            prices: Close prices
+            period: RSI period (default 14)
+
+        Returns:
+            List of RSI values (len(prices) - period items)
+        """
+        if len(prices) < period + 1:
+            return []
+
+        changes = [prices[i] - prices[i - 1] for i in range(1, len(prices))]
+        gains = [max(0, c) for c in changes]
+        losses = [abs(min(0, c)) for c in changes]
+
+        avg_gain = sum(gains[:period]) / period
+        avg_loss = sum(losses[:period]) / period
+
+        series = []
+        for i in range(period, len(gains) + 1):
+            if i > period:
+                avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
+                avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+            if avg_loss == 0:
+                series.append(100)
+            else:
+                series.append(round(100 - (100 / (1 + avg_gain / avg_loss)), 2))
+
+        return series
+
+    @staticmethod
+    def calc_macd_histogram_series(
+        prices: list[float],
+        fast: int = 12,
+        slow: int = 26,
+        signal: int = 9,
+    ) -> list[float]:
+        """
+        MACD histogram of every price prefix in one pass.
+
+        Element k equals calc_macd(prices[: slow + signal + k])[2]
+        (a zero histogram is returned as 0.0 instead of None).
+
+        Args:
+            prices: Price list
+            fast: Fast EMA period
+            slow: Slow EMA period
+            signal: Signal line period
+
+        Returns:
+            List of histogram values (len(prices) - slow - signal + 1 items)
+        """
+        if len(prices) < slow + signal:
+            return []
+
+        ema_fast = TechnicalAnalyzer.calc_ema_series(prices, fast)
+        ema_slow = TechnicalAnalyzer.calc_ema_series(prices, slow)
+        offset = slow - fast
+        macd_line_series = [ema_fast[i + offset] - ema_slow[i] for i in range(len(ema_slow))]
+
+        # Signal line as in calc_ema: seeded with the first MACD value
+        multiplier = 2 / (signal + 1)
+        signal_line = macd_line_series[0]
+        series = []
+        for count, macd_line in enumerate(macd_line_series[1:], start=2):
+            signal_line = (macd_line * multiplier) + (signal_line * (1 - multiplier))
+            if count < signal + 1:
+                continue
+            histogram = macd_line - signal_line if signal_line else None
+            series.append(round(histogram, 4) if histogram else 0.0)
+
+        return series
+
     @staticmethod
     def calc_bollinger_bands(
         prices: list[float],
@@ -345,6 +426,7 @@ class TechnicalAnalyzer:
         candles: list[CandleDict],
         lookback: int = 50,
         threshold_pct: float = 0.02,
+        pivots: PivotIndex | None = None,
     ) -> SupportResistance:
         """
         Find support and resistance levels.
@@ -353,6 +435,8 @@ class TechnicalAnalyzer:
             candles: List of candles
             lookback: Period for search
             threshold_pct: Clustering threshold (2%)
+            pivots: Shared pivot index whose last bars are these candles
+                (built on the fly if not given)
 
         Returns:
             SupportResistance with levels
@@ -360,30 +444,12 @@ class TechnicalAnalyzer:
         if len(candles) < lookback:
             lookback = len(candles)
 
-        recent_candles = candles[-lookback:]
-
         # Find local highs and lows
-        highs = []
-        lows = []
-
-        for i in range(2, len(recent_candles) - 2):
-            # Local maximum
-            if (
-                recent_candles[i]["high"] > recent_candles[i - 1]["high"]
-                and recent_candles[i]["high"] > recent_candles[i - 2]["high"]
-                and recent_candles[i]["high"] > recent_candles[i + 1]["high"]
-                and recent_candles[i]["high"] > recent_candles[i + 2]["high"]
-            ):
-                highs.append(recent_candles[i]["high"])
-
-            # Local minimum
-            if (
-                recent_candles[i]["low"] < recent_candles[i - 1]["low"]
-                and recent_candles[i]["low"] < recent_candles[i - 2]["low"]
-                and recent_candles[i]["low"] < recent_candles[i + 1]["low"]
-                and recent_candles[i]["low"] < recent_candles[i + 2]["low"]
-            ):
-                lows.append(recent_candles[i]["low"])
+        if pivots is None:
+            pivots = PivotIndex.from_candles(candles[-lookback:])
+        start = len(pivots) - lookback
+        highs = [value for _, value in pivots.peaks(start)]
+        lows = [value for _, value in pivots.troughs(start)]
 
         def cluster_levels(levels: list[float], threshold: float) -> list[dict]:
             if not levels:
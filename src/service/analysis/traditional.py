@@ -10,14 +10,22 @@ Traditional Finance Tracker.
 - Нефть (Brent, WTI)
 
 Источник: Yahoo Finance API (yfinance)
+
+Все активы запрашиваются пакетно (Yahoo spark, до 20 тикеров за запрос);
+тикеры, не вернувшиеся в пакете, догружаются параллельно через chart API.
+Полученные дневные бары сохраняются в traditional_asset_records.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
+from typing import Any
+
+from sqlalchemy import text
 
-import httpx
+from core.http_gateway import GatewayClient, get_http_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -258,21 +266,167 @@ class TraditionalFinanceTracker:
 
     # Yahoo Finance API (через query1/query2)
     YAHOO_API_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+    YAHOO_SPARK_URL = "https://query1.finance.yahoo.com/v7/finance/spark"
+
+    # Лимит тикеров в одном spark-запросе
+    SPARK_BATCH_SIZE = 20
+    # Параллельные запросы при поштучной догрузке
+    FALLBACK_CONCURRENCY = 6
 
     def __init__(self):
         self._cache: dict[str, TraditionalAsset] = {}
         self._last_update: datetime | None = None
-        self._client: httpx.AsyncClient | None = None
+        self._client: GatewayClient | None = None
 
-    async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(
+    async def _get_client(self) -> GatewayClient:
+        """Get or create HTTP client (connection pool shared by all requests)."""
+        if self._client is None or self._client.is_closed:
+            self._client = get_http_gateway().client(
                 timeout=30.0,
                 headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
+                cache_ttl=60,
             )
         return self._client
 
+    def _parse_chart(self, asset_id: str, chart: dict) -> tuple[TraditionalAsset, list[dict]]:
+        """
+        Разобрать chart-результат Yahoo (формат chart и spark совпадает).
+
+        Returns:
+            (актив, дневные бары)
+        """
+        config = ASSETS_CONFIG[asset_id]
+        meta = chart.get("meta", {})
+        indicators = (chart.get("indicators", {}).get("quote") or [{}])[0]
+
+        # Текущая цена
+        price = meta.get("regularMarketPrice", 0)
+        prev_close = meta.get("previousClose") or meta.get("chartPreviousClose") or price
+
+        # Изменение
+        change = price - prev_close if prev_close else 0
+        change_pct = (change / prev_close * 100) if prev_close else 0
+
+        # High/Low (spark отдаёт только close - берём дневные значения из meta)
+        highs = [h for h in indicators.get("high") or [] if h]
+        lows = [l for l in indicators.get("low") or [] if l]
+        volumes = indicators.get("volume") or []
+
+        high_24h = max(highs) if highs else meta.get("regularMarketDayHigh") or price
+        low_24h = min(lows) if lows else meta.get("regularMarketDayLow") or price
+        volume = volumes[-1] if volumes else meta.get("regularMarketVolume", 0)
+
+        asset = TraditionalAsset(
+            symbol=asset_id.upper(),
+            name=config["name"],
+            name_ru=config["name_ru"],
+            asset_class=config["class"],
+            price=price,
+            change_24h=change,
+            change_percent=change_pct,
+            high_24h=high_24h,
+            low_24h=low_24h,
+            volume=volume or 0,
+            yahoo_ticker=config["yahoo"],
+            last_updated=datetime.now(UTC),
+        )
+        return asset, self._parse_bars(meta, chart.get("timestamp") or [], indicators)
+
+    @staticmethod
+    def _parse_bars(meta: dict, timestamps: list[int], indicators: dict) -> list[dict]:
+        """
+        Собрать дневные бары из ответа Yahoo.
+
+        Время бара приводится к полуночи биржевого часового пояса, как в
+        истории yfinance, чтобы бары совпадали с записями бэкфилла.
+        """
+        gmtoffset = meta.get("gmtoffset", 0)
+
+        def column(name: str) -> list:
+            values = indicators.get(name) or []
+            return values if len(values) == len(timestamps) else [None] * len(timestamps)
+
+        bars = []
+        for ts, open_, high, low, close, volume in zip(
+            timestamps, column("open"), column("high"), column("low"), column("close"), column("volume"), strict=True
+        ):
+            if close is None:
+                continue
+            day_start = (ts + gmtoffset) // 86400 * 86400 - gmtoffset
+            bars.append(
+                {
+                    "timestamp": day_start * 1000,
+                    "open": open_,
+                    "high": high,
+                    "low": low,
+                    "close": close,
+                    "volume": volume,
+                }
+            )
+
+        # Текущий бар из spark: дополняем high/low/volume из meta
+        if bars and bars[-1]["high"] is None:
+            bars[-1]["high"] = meta.get("regularMarketDayHigh")
+            bars[-1]["low"] = meta.get("regularMarketDayLow")
+            bars[-1]["volume"] = meta.get("regularMarketVolume")
+        return bars
+
+    async def _fetch_chart(self, asset_id: str) -> tuple[TraditionalAsset, list[dict]] | None:
+        """Запросить один актив через chart API."""
+        config = ASSETS_CONFIG[asset_id]
+        client = await self._get_client()
+
+        # Yahoo Finance API
+        url = self.YAHOO_API_URL.format(symbol=config["yahoo"])
+        params = {
+            "interval": "1d",
+            "range": "2d",
+        }
+
+        response = await client.get(url, params=params)
+
+        if response.status_code != 200:
+            logger.error(f"Yahoo API error for {asset_id}: {response.status_code}")
+            return None
+
+        # Парсим ответ Yahoo Finance
+        result = response.json().get("chart", {}).get("result", [])
+        if not result:
+            logger.warning(f"No data for {asset_id}")
+            return None
+
+        return self._parse_chart(asset_id, result[0])
+
+    async def _fetch_spark(self, asset_ids: list[str]) -> dict[str, tuple[TraditionalAsset, list[dict]]]:
+        """
+        Запросить пакет активов одним spark-запросом.
+
+        Returns:
+            {asset_id: (актив, бары)} для вернувшихся тикеров
+        """
+        by_ticker = {ASSETS_CONFIG[asset_id]["yahoo"]: asset_id for asset_id in asset_ids}
+        client = await self._get_client()
+
+        response = await client.get(
+            self.YAHOO_SPARK_URL,
+            params={"symbols": ",".join(by_ticker), "range": "2d", "interval": "1d"},
+        )
+        if response.status_code != 200:
+            logger.warning(f"Yahoo spark error: {response.status_code}")
+            return {}
+
+        parsed = {}
+        for item in response.json().get("spark", {}).get("result") or []:
+            asset_id = by_ticker.get(item.get("symbol"))
+            charts = item.get("response") or []
+            if asset_id is None or not charts:
+                continue
+            try:
+                parsed[asset_id] = self._parse_chart(asset_id, charts[0])
+            except Exception as e:
+                logger.debug(f"Bad spark entry for {asset_id}: {e}")
+        return parsed
+
     async def fetch_asset(self, asset_id: str) -> TraditionalAsset | None:
         """
         Получить данные по одному активу.
@@ -287,75 +441,126 @@ class TraditionalFinanceTracker:
             logger.warning(f"Unknown asset: {asset_id}")
             return None
 
-        config = ASSETS_CONFIG[asset_id]
-        yahoo_ticker = config["yahoo"]
-
         try:
-            client = await self._get_client()
-
-            # Yahoo Finance API
-            url = self.YAHOO_API_URL.format(symbol=yahoo_ticker)
-            params = {
-                "interval": "1d",
-                "range": "2d",
-            }
-
-            response = await client.get(url, params=params)
-
-            if response.status_code != 200:
-                logger.error(f"Yahoo API error for {asset_id}: {response.status_code}")
-                return None
-
-            data = response.json()
-
-            # Парсим ответ Yahoo Finance
-            result = data.get("chart", {}).get("result", [])
-            if not result:
-                logger.warning(f"No data for {asset_id}")
-                return None
-
-            quote = result[0]
-            meta = quote.get("meta", {})
-            indicators = quote.get("indicators", {}).get("quote", [{}])[0]
-
-            # Текущая цена
-            price = meta.get("regularMarketPrice", 0)
-            prev_close = meta.get("previousClose", price)
-
-            # Изменение
-            change = price - prev_close if prev_close else 0
-            change_pct = (change / prev_close * 100) if prev_close else 0
-
-            # High/Low
-            highs = indicators.get("high", [])
-            lows = indicators.get("low", [])
-            volumes = indicators.get("volume", [])
-
-            high_24h = max(highs) if highs else price
-            low_24h = min([l for l in lows if l]) if lows else price
-            volume = volumes[-1] if volumes else 0
-
-            asset = TraditionalAsset(
-                symbol=asset_id.upper(),
-                name=config["name"],
-                name_ru=config["name_ru"],
-                asset_class=config["class"],
-                price=price,
-                change_24h=change,
-                change_percent=change_pct,
-                high_24h=high_24h,
-                low_24h=low_24h,
-                volume=volume or 0,
-                yahoo_ticker=yahoo_ticker,
-                last_updated=datetime.now(UTC),
-            )
+            fetched = await self._fetch_chart(asset_id)
+        except Exception as e:
+            logger.error(f"Error fetching {asset_id}: {e}")
+            return self._cache.get(asset_id)
+
+        if fetched is None:
+            return None
+        asset, _ = fetched
+        self._cache[asset_id] = asset
+        return asset
+
+    async def fetch_many(self, asset_ids: list[str], store: bool = True) -> dict[str, TraditionalAsset | None]:
+        """
+        Получить данные по нескольким активам за минимум запросов.
+
+        Сначала пакетные spark-запросы, затем параллельная догрузка
+        недостающих тикеров через chart API.
+
+        Args:
+            asset_ids: ID активов
+            store: Сохранить полученные дневные бары в БД
 
+        Returns:
+            {asset_id: TraditionalAsset или None}
+        """
+        asset_ids = [asset_id for asset_id in asset_ids if asset_id in ASSETS_CONFIG]
+        fetched: dict[str, tuple[TraditionalAsset, list[dict]]] = {}
+
+        for i in range(0, len(asset_ids), self.SPARK_BATCH_SIZE):
+            try:
+                fetched.update(await self._fetch_spark(asset_ids[i : i + self.SPARK_BATCH_SIZE]))
+            except Exception as e:
+                logger.warning(f"Yahoo spark batch failed: {e}")
+
+        missing = [asset_id for asset_id in asset_ids if asset_id not in fetched]
+        if missing:
+            logger.debug(f"Fetching {len(missing)} assets individually: {', '.join(missing)}")
+            semaphore = asyncio.Semaphore(self.FALLBACK_CONCURRENCY)
+
+            async def fetch_one(asset_id: str) -> None:
+                async with semaphore:
+                    try:
+                        result = await self._fetch_chart(asset_id)
+                    except Exception as e:
+                        logger.error(f"Error fetching {asset_id}: {e}")
+                        return
+                if result is not None:
+                    fetched[asset_id] = result
+
+            await asyncio.gather(*(fetch_one(asset_id) for asset_id in missing))
+
+        for asset_id, (asset, _) in fetched.items():
             self._cache[asset_id] = asset
-            return asset
 
+        if store and fetched:
+            await self._store_bars({asset_id: bars for asset_id, (_, bars) in fetched.items()})
+
+        # При ошибке отдаём последнее известное значение
+        return {asset_id: self._cache.get(asset_id) for asset_id in asset_ids}
+
+    async def _store_bars(self, bars_by_asset: dict[str, list[dict]]) -> int:
+        """
+        Сохранить дневные бары в traditional_asset_records.
+
+        Пустые поля не затирают значения, уже загруженные бэкфиллом.
+
+        Returns:
+            Количество сохранённых баров
+        """
+        from models.writer import run_write
+        from service.backfill.traditional_backfill import TRADITIONAL_ASSETS
+
+        now = datetime.now(UTC)
+        rows: list[dict[str, Any]] = []
+        for asset_id, bars in bars_by_asset.items():
+            symbol = asset_id.upper()
+            if symbol not in TRADITIONAL_ASSETS:
+                continue
+            for bar in bars:
+                rows.append(
+                    {
+                        "asset_type": TRADITIONAL_ASSETS[symbol]["asset_type"],
+                        "symbol": symbol,
+                        "timestamp": bar["timestamp"],
+                        "open_price": bar["open"],
+                        "high_price": bar["high"],
+                        "low_price": bar["low"],
+                        "close_price": bar["close"],
+                        "volume": bar["volume"],
+                        "loaded_at": now,
+                    }
+                )
+
+        if not rows:
+            return 0
+
+        statement = text("""
+            INSERT INTO traditional_asset_records
+            (asset_type, symbol, timestamp, open_price, high_price,
+             low_price, close_price, volume, loaded_at)
+            VALUES (:asset_type, :symbol, :timestamp, :open_price,
+                    :high_price, :low_price, :close_price, :volume, :loaded_at)
+            ON CONFLICT (symbol, timestamp)
+            DO UPDATE SET
+                open_price = COALESCE(EXCLUDED.open_price, traditional_asset_records.open_price),
+                high_price = COALESCE(EXCLUDED.high_price, traditional_asset_records.high_price),
+                low_price = COALESCE(EXCLUDED.low_price, traditional_asset_records.low_price),
+                close_price = EXCLUDED.close_price,
+                volume = COALESCE(EXCLUDED.volume, traditional_asset_records.volume),
+                loaded_at = EXCLUDED.loaded_at
+        """)
+
+        try:
+            await run_write(lambda session: session.execute(statement, rows))
         except Exception as e:
-            logger.error(f"Error fetching {asset_id}: {e}")
-            return self._cache.get(asset_id)
+            logger.warning(f"Failed to store traditional bars: {e}")
+            return 0
+
+        return len(rows)
 
     async def fetch_all(self) -> TraditionalFinanceStatus:
         """
@@ -367,32 +572,9 @@ class TraditionalFinanceTracker:
         status = TraditionalFinanceStatus()
 
         try:
-            # Металлы
-            status.gold = await self.fetch_asset("gold")
-            status.silver = await self.fetch_asset("silver")
-            status.platinum = await self.fetch_asset("platinum")
-
-            # Индексы
-            status.sp500 = await self.fetch_asset("sp500")
-            status.nasdaq = await self.fetch_asset("nasdaq")
-            status.dji = await self.fetch_asset("dji")
-            status.dax = await self.fetch_asset("dax")
-            status.vix = await self.fetch_asset("vix")
-
-            # Форекс
-            status.eur_usd = await self.fetch_asset("eur_usd")
-            status.gbp_usd = await self.fetch_asset("gbp_usd")
-            status.usd_jpy = await self.fetch_asset("usd_jpy")
-            status.dxy = await self.fetch_asset("dxy")
-
-            # Commodities
-            status.oil_brent = await self.fetch_asset("oil_brent")
-            status.oil_wti = await self.fetch_asset("oil_wti")
-            status.natural_gas = await self.fetch_asset("natural_gas")
-
-            # Treasury Bonds
-            status.treasury_2y = await self.fetch_asset("treasury_2y")
-            status.treasury_10y = await self.fetch_asset("treasury_10y")
+            assets = await self.fetch_many(list(ASSETS_CONFIG))
+            for asset_id, asset in assets.items():
+                setattr(status, asset_id, asset)
 
             status.last_updated = datetime.now(UTC)
             status.status = "ok"
@@ -409,39 +591,23 @@ class TraditionalFinanceTracker:
 
     async def get_metals(self) -> dict:
         """Получить только металлы."""
-        result = {}
-        for asset_id in ["gold", "silver", "platinum"]:
-            asset = await self.fetch_asset(asset_id)
-            if asset:
-                result[asset_id] = asset.to_dict()
-        return result
+        assets = await self.fetch_many(["gold", "silver", "platinum"], store=False)
+        return {asset_id: asset.to_dict() for asset_id, asset in assets.items() if asset}
 
     async def get_indices(self) -> dict:
         """Получить только индексы."""
-        result = {}
-        for asset_id in ["sp500", "nasdaq", "dji", "dax", "vix"]:
-            asset = await self.fetch_asset(asset_id)
-            if asset:
-                result[asset_id] = asset.to_dict()
-        return result
+        assets = await self.fetch_many(["sp500", "nasdaq", "dji", "dax", "vix"], store=False)
+        return {asset_id: asset.to_dict() for asset_id, asset in assets.items() if asset}
 
     async def get_forex(self) -> dict:
         """Получить только форекс."""
-        result = {}
-        for asset_id in ["eur_usd", "gbp_usd", "usd_jpy", "dxy"]:
-            asset = await self.fetch_asset(asset_id)
-            if asset:
-                result[asset_id] = asset.to_dict()
-        return result
+        assets = await self.fetch_many(["eur_usd", "gbp_usd", "usd_jpy", "dxy"], store=False)
+        return {asset_id: asset.to_dict() for asset_id, asset in assets.items() if asset}
 
     async def get_commodities(self) -> dict:
         """Получить только commodities."""
-        result = {}
-        for asset_id in ["oil_brent", "oil_wti", "natural_gas"]:
-            asset = await self.fetch_asset(asset_id)
-            if asset:
-                result[asset_id] = asset.to_dict()
-        return result
+        assets = await self.fetch_many(["oil_brent", "oil_wti", "natural_gas"], store=False)
+        return {asset_id: asset.to_dict() for asset_id, asset in assets.items() if asset}
 
     def get_cached(self, asset_id: str) -> TraditionalAsset | None:
         """Получить закэшированные данные."""
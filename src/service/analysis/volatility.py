@@ -19,12 +19,11 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any
 
-import httpx
+from core.http_gateway import GatewayClient, get_http_gateway
+from service.analysis.coin_markets import get_coin_market_loader
 
 logger = logging.getLogger(__name__)
 
-COINGECKO_API = "https://api.coingecko.com/api/v3"
-
 # Кеш результатов волатильности
 _volatility_cache: dict[str, tuple[datetime, "VolatilityData"]] = {}
 CACHE_TTL_MINUTES = 30  # Кеш живёт 30 минут
@@ -130,14 +129,15 @@ class VolatilityTracker:
     }
 
     def __init__(self, timeout: float = 30.0):
-        self._client: httpx.AsyncClient | None = None
+        self._client: GatewayClient | None = None
         self._timeout = timeout
 
-    async def _get_client(self) -> httpx.AsyncClient:
+    async def _get_client(self) -> GatewayClient:
         if self._client is None:
-            self._client = httpx.AsyncClient(
+            self._client = get_http_gateway().client(
                 timeout=self._timeout,
                 headers={"Accept": "application/json"},
+                cache_ttl=900,
             )
         return self._client
 
@@ -164,10 +164,8 @@ class VolatilityTracker:
                 logger.debug(f"Volatility cache hit for {symbol}")
                 return cached_data
 
-        client = await self._get_client()
-
         # Пробуем получить данные из CoinGecko
-        prices = await self._fetch_prices(client, symbol, 90)
+        prices = await self._fetch_prices(symbol, 90)
 
         # Если CoinGecko не доступен, используем candlestick из БД
         if len(prices) < 7:
@@ -221,41 +219,18 @@ class VolatilityTracker:
         
         return result
 
-    async def _fetch_prices(self, client: httpx.AsyncClient, symbol: str, days: int) -> list[float]:
-        """Fetch daily closing prices from CoinGecko."""
-        from core.constants import COINGECKO_ID_MAP
-
-        cg_id = COINGECKO_ID_MAP.get(symbol.upper(), symbol.lower())
-
-        try:
-            url = f"{COINGECKO_API}/coins/{cg_id}/market_chart"
-            params = {"vs_currency": "usd", "days": days}
-
-            response = await client.get(url, params=params)
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                logger.warning(f"CoinGecko rate limited for {symbol}")
-                return []
-            
-            response.raise_for_status()
-            data = response.json()
-
-            prices = [p[1] for p in data.get("prices", [])]
-            return prices
-
-        except Exception as e:
-            logger.error(f"Failed to fetch prices for {symbol}: {e}")
-            return []
+    async def _fetch_prices(self, symbol: str, days: int) -> list[float]:
+        """Fetch daily closing prices from the shared CoinGecko history cache."""
+        return await get_coin_market_loader().get_history(symbol, days)
 
     async def _fetch_prices_from_db(self, symbol: str, days: int) -> list[float]:
         """Fallback: получить цены из локальной БД candlestick."""
         try:
-            from service.candlestick import fetch_candlesticks, CandleInterval
+            from service.candlestick import CandleInterval, read_candlesticks
             
             # Используем дневные свечи
             pair = f"{symbol}/USDT"
-            candles = await fetch_candlesticks(
+            candles = await read_candlesticks(
                 symbol=pair,
                 interval=CandleInterval.DAY_1,
                 limit=days,
@@ -395,6 +370,9 @@ class VolatilityTracker:
         if symbols is None:
             symbols = ["BTC", "ETH"]
 
+        # Uncached histories are fetched together
+        await get_coin_market_loader().get_histories(symbols, 90)
+
         result = {}
         for symbol in symbols:
             try:
@@ -18,7 +18,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 
-import httpx
+from core.http_gateway import GatewayClient, get_http_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -177,19 +177,20 @@ class WhaleTracker:
         min_value_usd: float = 1_000_000,
         timeout: float = 30.0,
     ):
-        self._client: httpx.AsyncClient | None = None
+        self._client: GatewayClient | None = None
         self._timeout = timeout
         self._whale_alert_key = whale_alert_api_key or os.environ.get("WHALE_ALERT_API_KEY")
         self._min_value = min_value_usd
         self._cached_txs: list[WhaleTransaction] = []
         self._cache_time: datetime | None = None
 
-    async def _get_client(self) -> httpx.AsyncClient:
+    async def _get_client(self) -> GatewayClient:
         """Get or create HTTP client."""
         if self._client is None:
-            self._client = httpx.AsyncClient(
+            self._client = get_http_gateway().client(
                 timeout=self._timeout,
                 headers={"Accept": "application/json"},
+                cache_ttl=60,
             )
         return self._client
 
@@ -227,7 +228,7 @@ class WhaleTracker:
         # Analyze transactions
         return self._analyze_transactions(transactions)
 
-    async def _fetch_whale_alert(self, client: httpx.AsyncClient) -> list[WhaleTransaction]:
+    async def _fetch_whale_alert(self, client: GatewayClient) -> list[WhaleTransaction]:
         """Fetch transactions from Whale Alert API."""
         now = datetime.now()
         start_time = int((now - timedelta(hours=24)).timestamp())
@@ -267,7 +268,7 @@ class WhaleTracker:
 
         return transactions
 
-    async def _fetch_simulated_whales(self, client: httpx.AsyncClient) -> list[WhaleTransaction]:
+    async def _fetch_simulated_whales(self, client: GatewayClient) -> list[WhaleTransaction]:
         """
         Generate simulated whale data from public APIs.
 
@@ -14,6 +14,7 @@ from datetime import UTC, datetime, timedelta
 from sqlalchemy import text
 
 from models.session import async_session_maker
+from models.writer import run_write
 from service.candlestick.fetcher import CandlestickFetcher
 from service.candlestick.models import CandleInterval
 
@@ -253,47 +254,46 @@ class CryptoBackfill:
         if not result.candlesticks:
             return 0
 
-        async with async_session_maker() as session:
-            for candle in result.candlesticks:
-                stmt = text("""
-                    INSERT INTO candlestick_records
-                    (exchange, symbol, interval, timestamp, open_price, high_price,
-                     low_price, close_price, volume, quote_volume, trades_count,
-                     fetch_time_ms, is_complete, loaded_at)
-                    VALUES (:exchange, :symbol, :interval, :timestamp, :open_price,
-                            :high_price, :low_price, :close_price, :volume,
-                            :quote_volume, :trades_count, :fetch_time_ms,
-                            :is_complete, :loaded_at)
-                    ON CONFLICT (exchange, symbol, interval, timestamp)
-                    DO UPDATE SET
-                        open_price = EXCLUDED.open_price,
-                        high_price = EXCLUDED.high_price,
-                        low_price = EXCLUDED.low_price,
-                        close_price = EXCLUDED.close_price,
-                        volume = EXCLUDED.volume,
-                        is_complete = EXCLUDED.is_complete,
-                        loaded_at = EXCLUDED.loaded_at
-                """)
-                await session.execute(
-                    stmt,
-                    {
-                        "exchange": result.exchange,
-                        "symbol": result.symbol,
-                        "interval": result.interval.value,
-                        "timestamp": candle.timestamp,
-                        "open_price": float(candle.open_price),
-                        "high_price": float(candle.high_price),
-                        "low_price": float(candle.low_price),
-                        "close_price": float(candle.close_price),
-                        "volume": float(candle.volume),
-                        "quote_volume": float(candle.quote_volume) if candle.quote_volume else None,
-                        "trades_count": candle.trades_count,
-                        "fetch_time_ms": result.fetch_time_ms,
-                        "is_complete": True,
-                        "loaded_at": datetime.now(UTC),
-                    },
-                )
-            await session.commit()
+        stmt = text("""
+            INSERT INTO candlestick_records
+            (exchange, symbol, interval, timestamp, open_price, high_price,
+             low_price, close_price, volume, quote_volume, trades_count,
+             fetch_time_ms, is_complete, loaded_at)
+            VALUES (:exchange, :symbol, :interval, :timestamp, :open_price,
+                    :high_price, :low_price, :close_price, :volume,
+                    :quote_volume, :trades_count, :fetch_time_ms,
+                    :is_complete, :loaded_at)
+            ON CONFLICT (exchange, symbol, interval, timestamp)
+            DO UPDATE SET
+                open_price = EXCLUDED.open_price,
+                high_price = EXCLUDED.high_price,
+                low_price = EXCLUDED.low_price,
+                close_price = EXCLUDED.close_price,
+                volume = EXCLUDED.volume,
+                is_complete = EXCLUDED.is_complete,
+                loaded_at = EXCLUDED.loaded_at
+        """)
+        loaded_at = datetime.now(UTC)
+        rows = [
+            {
+                "exchange": result.exchange,
+                "symbol": result.symbol,
+                "interval": result.interval.value,
+                "timestamp": candle.timestamp,
+                "open_price": float(candle.open_price),
+                "high_price": float(candle.high_price),
+                "low_price": float(candle.low_price),
+                "close_price": float(candle.close_price),
+                "volume": float(candle.volume),
+                "quote_volume": float(candle.quote_volume) if candle.quote_volume else None,
+                "trades_count": candle.trades_count,
+                "fetch_time_ms": result.fetch_time_ms,
+                "is_complete": True,
+                "loaded_at": loaded_at,
+            }
+            for candle in result.candlesticks
+        ]
+        await run_write(lambda session: session.execute(stmt, rows))
 
         return len(result.candlesticks)
 
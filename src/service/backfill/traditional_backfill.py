@@ -13,19 +13,25 @@ Data sources (with fallback):
 3. FRED (for some economic indicators)
 """
 
+from __future__ import annotations
+
 import asyncio
 import logging
 import random
 from datetime import UTC, datetime, timedelta
 
 import httpx
-import pandas as pd
 from sqlalchemy import text
 
+from core.lazy_import import lazy_import
 from models.session import async_session_maker
+from models.writer import run_write
 
 logger = logging.getLogger(__name__)
 
+# pandas is only needed when a backfill actually runs
+pd = lazy_import("pandas")
+
 # Yahoo Finance tickers for traditional assets
 # Format: symbol -> {yahoo, stooq, name, asset_type}
 TRADITIONAL_ASSETS = {
@@ -124,6 +130,34 @@ MAX_RETRIES = 3
 BASE_DELAY = 5.0
 MAX_DELAY = 60.0
 
+# Incremental backfill: a longer gap between daily bars means missing history
+MAX_BAR_GAP_DAYS = 5
+# Bars re-fetched before the resume point (completes partial live bars)
+RESUME_OVERLAP_DAYS = 3
+
+
+def resume_point(timestamps: list[int], start_ms: int) -> int | None:
+    """
+    Get the fetch start after the continuous part of stored daily bars.
+
+    Args:
+        timestamps: Stored bar timestamps (ms, ascending) from start_ms on
+        start_ms: Start of the requested period (ms)
+
+    Returns:
+        Timestamp (ms) to resume from, or None if the period start is missing
+    """
+    max_gap = MAX_BAR_GAP_DAYS * 86_400_000
+    if not timestamps or timestamps[0] - start_ms > max_gap:
+        return None
+
+    last = timestamps[0]
+    for ts in timestamps[1:]:
+        if ts - last > max_gap:
+            break
+        last = ts
+    return last - RESUME_OVERLAP_DAYS * 86_400_000
+
 
 class TraditionalBackfill:
     """
@@ -328,21 +362,53 @@ class TraditionalBackfill:
             )
             return result.scalar_one_or_none()
 
+    async def get_resume_timestamp(self, symbol: str, start_ms: int) -> int | None:
+        """
+        Find where stored history for a symbol stops being continuous.
+
+        Bars written by the live tracker and earlier backfills are not
+        fetched again; only the tail after the last continuous bar is.
+
+        Args:
+            symbol: Asset symbol
+            start_ms: Start of the requested period (ms)
+
+        Returns:
+            Timestamp (ms) to resume fetching from, or None if the period
+            start itself is missing
+        """
+        async with async_session_maker() as session:
+            result = await session.execute(
+                text("""
+                    SELECT timestamp FROM traditional_asset_records
+                    WHERE symbol = :symbol AND timestamp >= :start
+                    ORDER BY timestamp
+                """),
+                {"symbol": symbol, "start": start_ms},
+            )
+            timestamps = [row[0] for row in result.fetchall()]
+
+        return resume_point(timestamps, start_ms)
+
     async def backfill_asset(
         self,
         symbol: str,
         years: int = 1,
         progress_callback=None,
+        full: bool = False,
     ) -> int:
         """
         Backfill historical data for a traditional asset.
 
         Tries Yahoo Finance first, falls back to Stooq if needed.
+        Unless full is set, only bars after the stored continuous
+        history are fetched.
 
         Args:
             symbol: Asset symbol (e.g., GOLD, SP500)
             years: Years of history to fetch
             progress_callback: Optional callback(symbol, progress_pct, total_records)
+            full: Re-fetch the whole period even if it is already stored
 
         Returns:
             Total number of records saved
@@ -356,12 +422,23 @@ class TraditionalBackfill:
         stooq_symbol = config.get("stooq")
         asset_type = config["asset_type"]
 
-        logger.info(f"Starting backfill for {symbol} ({config['name']}) - {years} year(s)")
-
         # Calculate date range
         end_date = datetime.now(UTC)
         start_date = end_date - timedelta(days=years * 365)
 
+        if not full:
+            try:
+                resume_ms = await self.get_resume_timestamp(symbol, int(start_date.timestamp() * 1000))
+            except Exception as e:
+                logger.warning(f"Could not check stored history for {symbol}: {e}")
+                resume_ms = None
+            if resume_ms is not None:
+                start_date = max(start_date, datetime.fromtimestamp(resume_ms / 1000, tz=UTC))
+
+        logger.info(
+            f"Starting backfill for {symbol} ({config['name']}) from {start_date:%Y-%m-%d} - {years} year(s)"
+        )
+
         df = pd.DataFrame()
         data_source = None
 
@@ -397,50 +474,47 @@ class TraditionalBackfill:
         }
 
         # Save to database
-        total_records = 0
-        async with async_session_maker() as session:
-            for idx, row in df.iterrows():
-                timestamp = int(idx.timestamp() * 1000)
-
-                stmt = text("""
-                    INSERT INTO traditional_asset_records
-                    (asset_type, symbol, timestamp, open_price, high_price,
-                     low_price, close_price, volume, loaded_at)
-                    VALUES (:asset_type, :symbol, :timestamp, :open_price,
-                            :high_price, :low_price, :close_price, :volume, :loaded_at)
-                    ON CONFLICT (symbol, timestamp)
-                    DO UPDATE SET
-                        open_price = EXCLUDED.open_price,
-                        high_price = EXCLUDED.high_price,
-                        low_price = EXCLUDED.low_price,
-                        close_price = EXCLUDED.close_price,
-                        volume = EXCLUDED.volume,
-                        loaded_at = EXCLUDED.loaded_at
-                """)
-
-                open_col = "Open" if "Open" in row else "open"
-                high_col = "High" if "High" in row else "high"
-                low_col = "Low" if "Low" in row else "low"
-                close_col = "Close" if "Close" in row else "close"
-                vol_col = "Volume" if "Volume" in row else "volume"
-
-                await session.execute(
-                    stmt,
-                    {
-                        "asset_type": asset_type,
-                        "symbol": symbol,
-                        "timestamp": timestamp,
-                        "open_price": float(row.get(open_col, 0)) if row.get(open_col) else None,
-                        "high_price": float(row.get(high_col, 0)) if row.get(high_col) else None,
-                        "low_price": float(row.get(low_col, 0)) if row.get(low_col) else None,
-                        "close_price": float(row.get(close_col, 0)) if row.get(close_col) else None,
-                        "volume": float(row.get(vol_col, 0)) if row.get(vol_col) else None,
-                        "loaded_at": datetime.now(UTC),
-                    },
-                )
-                total_records += 1
+        stmt = text("""
+            INSERT INTO traditional_asset_records
+            (asset_type, symbol, timestamp, open_price, high_price,
+             low_price, close_price, volume, loaded_at)
+            VALUES (:asset_type, :symbol, :timestamp, :open_price,
+                    :high_price, :low_price, :close_price, :volume, :loaded_at)
+            ON CONFLICT (symbol, timestamp)
+            DO UPDATE SET
+                open_price = EXCLUDED.open_price,
+                high_price = EXCLUDED.high_price,
+                low_price = EXCLUDED.low_price,
+                close_price = EXCLUDED.close_price,
+                volume = EXCLUDED.volume,
+                loaded_at = EXCLUDED.loaded_at
+        """)
+        loaded_at = datetime.now(UTC)
+        rows = []
+        for idx, row in df.iterrows():
+            open_col = "Open" if "Open" in row else "open"
+            high_col = "High" if "High" in row else "high"
+            low_col = "Low" if "Low" in row else "low"
+            close_col = "Close" if "Close" in row else "close"
+            vol_col = "Volume" if "Volume" in row else "volume"
+
+            rows.append(
+                {
+                    "asset_type": asset_type,
+                    "symbol": symbol,
+                    "timestamp": int(idx.timestamp() * 1000),
+                    "open_price": float(row.get(open_col, 0)) if row.get(open_col) else None,
+                    "high_price": float(row.get(high_col, 0)) if row.get(high_col) else None,
+                    "low_price": float(row.get(low_col, 0)) if row.get(low_col) else None,
+                    "close_price": float(row.get(close_col, 0)) if row.get(close_col) else None,
+                    "volume": float(row.get(vol_col, 0)) if row.get(vol_col) else None,
+                    "loaded_at": loaded_at,
+                }
+            )
 
-            await session.commit()
+        if rows:
+            await run_write(lambda session: session.execute(stmt, rows))
+        total_records = len(rows)
 
         if progress_callback:
             progress_callback(symbol, 100, total_records)
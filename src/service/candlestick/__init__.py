@@ -16,11 +16,16 @@ Usage:
     )
 """
 
+from service.candlestick.archive import load_history, open_history
 from service.candlestick.fetcher import fetch_candlesticks
 from service.candlestick.models import CandleInterval, Candlestick, FetchResult
+from service.candlestick.store import read_candlesticks
 
 __all__ = [
     "fetch_candlesticks",
+    "read_candlesticks",
+    "open_history",
+    "load_history",
     "Candlestick",
     "CandleInterval",
     "FetchResult",
@@ -0,0 +1,543 @@
+"""
+Candle History Archive.
+
+Columnar on-disk archive of closed candle history, read through memory maps.
+
+candlestick_records is row-oriented: full-history reads (ML training,
+backtests) pull every row back through SQLAlchemy and convert it to floats
+one field at a time. The archive stores closed months once as flat column
+files, so a full history is a handful of mmap() calls and the arrays
+handed out are views over the page cache.
+
+Layout per series ({root}/{BTC-USDT}/{interval}/):
+
+- <column>.bin: raw little-endian column (int64 timestamps, float64 values)
+- manifest.json: archived months, row count and last timestamp
+
+Months are appended in order, one closed month at a time. The manifest is
+replaced atomically after the column files are written and is the only
+source of the row count, so readers never see a half-written month and
+trailing bytes from an interrupted append are truncated on the next one.
+
+Archived months still follow the database: rows written into the archived
+range after the last run (backfills, gap fills, corrected candles; found
+through the loaded_at index) make the next run rewrite the series from
+the earliest changed month, and load_history() merges them in until then.
+Rewritten months keep archived rows that retention already removed from
+the database.
+
+Apache Arrow/Parquet would need pyarrow, which is not a dependency; the
+files here are plain numpy arrays and need nothing beyond numpy.
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import DateTime, TextClause, bindparam, text
+
+from service.candlestick.maintenance import month_start, months_between, next_month
+from service.candlestick.rollup import CandleArrays, bucket_ends
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT_VERSION = 1
+
+# Column name -> on-disk dtype (names match CandleArrays)
+COLUMNS: dict[str, np.dtype] = {
+    "timestamps": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+    "quote_volume": np.dtype("<f8"),  # NaN where unknown
+    "trades": np.dtype("<f8"),  # -1 where unknown
+}
+
+MANIFEST = "manifest.json"
+
+
+@dataclass
+class CandleHistory:
+    """
+    Candle columns for one symbol and interval, sorted by time.
+
+    Arrays returned by open_history() are read-only views over memory-mapped
+    files; copy them before modifying.
+    """
+
+    symbol: str
+    interval: str
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    quote_volume: np.ndarray
+    trades: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def empty(cls, symbol: str, interval: str) -> "CandleHistory":
+        return cls(symbol, interval, **{name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()})
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Column arrays by name."""
+        return {name: getattr(self, name) for name in COLUMNS}
+
+    def slice(self, start: int | None = None, end: int | None = None) -> "CandleHistory":
+        """Rows with start <= timestamp <= end (views, no copy)."""
+        lo = int(np.searchsorted(self.timestamps, start, side="left")) if start is not None else 0
+        hi = int(np.searchsorted(self.timestamps, end, side="right")) if end is not None else len(self)
+        return CandleHistory(
+            self.symbol, self.interval, **{name: array[lo:hi] for name, array in self.columns().items()}
+        )
+
+    def merge(self, candles: "CandleArrays | CandleHistory") -> "CandleHistory":
+        """Insert or replace candles by timestamp (copies; the given candles win)."""
+        if not len(candles):
+            return self
+        columns = {
+            name: np.concatenate((getattr(candles, name).astype(dtype), getattr(self, name)))
+            for name, dtype in COLUMNS.items()
+        }
+        # unique() keeps the first occurrence, i.e. the given candle
+        _, first = np.unique(columns["timestamps"], return_index=True)
+        return CandleHistory(self.symbol, self.interval, **{name: array[first] for name, array in columns.items()})
+
+    def extend(self, candles: CandleArrays) -> "CandleHistory":
+        """Append newer candles (copies; rows not after the last timestamp are dropped)."""
+        if len(self):
+            keep = candles.timestamps > self.timestamps[-1]
+        else:
+            keep = np.ones(len(candles), dtype=bool)
+        if not keep.any():
+            return self
+        return CandleHistory(
+            self.symbol,
+            self.interval,
+            **{
+                name: np.concatenate((array, getattr(candles, name)[keep].astype(COLUMNS[name])))
+                for name, array in self.columns().items()
+            },
+        )
+
+
+@dataclass
+class ArchiveStats:
+    """Archive counters."""
+
+    months_written: int = 0
+    months_rewritten: int = 0
+    rows_written: int = 0
+    opens: int = 0
+    errors: int = 0
+    last_run: datetime | None = None
+    last_duration_ms: float | None = None
+    skipped: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "months_written": self.months_written,
+            "months_rewritten": self.months_rewritten,
+            "rows_written": self.rows_written,
+            "opens": self.opens,
+            "errors": self.errors,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_duration_ms": round(self.last_duration_ms, 1) if self.last_duration_ms is not None else None,
+            "skipped": list(self.skipped),
+        }
+
+
+def series_key(symbol: str) -> str:
+    """Directory name of a symbol (BTC/USDT -> BTC-USDT)."""
+    return symbol.replace("/", "-")
+
+
+def archived_at(manifest: dict) -> datetime | None:
+    """Start of the archive run that last wrote a series (None for older manifests)."""
+    value = manifest.get("archived_at")
+    return datetime.fromisoformat(value) if value else None
+
+
+def changed_rows_statement(columns: str, filters: list[str] | None = None, order: bool = False) -> TextClause:
+    """
+    Select rows of the archived range written after the last archive run.
+
+    Parameters: symbol, interval, until (last archived timestamp) and
+    archived_at; the loaded_at index keeps this proportional to recent writes.
+    """
+    where = " AND ".join(
+        [
+            "symbol = :symbol",
+            "interval = :interval",
+            "timestamp <= :until",
+            "loaded_at > :archived_at",
+            *(filters or []),
+        ]
+    )
+    statement = f"SELECT {columns} FROM candlestick_records WHERE {where}"
+    if order:
+        statement += " ORDER BY timestamp, exchange"
+    return text(statement).bindparams(bindparam("archived_at", type_=DateTime(timezone=True)))
+
+
+class CandleArchive:
+    """Append-only columnar archive of closed candle months."""
+
+    def __init__(self, root: str | Path):
+        """
+        Initialize archive.
+
+        Args:
+            root: Archive directory (created on first write)
+        """
+        self.root = Path(root)
+        self.stats = ArchiveStats()
+        # (symbol, interval) -> (rows, CandleHistory of memory maps)
+        self._maps: dict[tuple[str, str], tuple[int, CandleHistory]] = {}
+
+    def _series_dir(self, symbol: str, interval: str) -> Path:
+        return self.root / series_key(symbol) / interval
+
+    def manifest(self, symbol: str, interval: str) -> dict:
+        """Read the series manifest (empty manifest when nothing is archived)."""
+        path = self._series_dir(symbol, interval) / MANIFEST
+        try:
+            manifest = json.loads(path.read_text())
+        except FileNotFoundError:
+            return {"version": ARCHIVE_FORMAT_VERSION, "rows": 0, "months": [], "last_timestamp": None}
+        if manifest.get("version") != ARCHIVE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported candle archive version in {path}: {manifest.get('version')}")
+        return manifest
+
+    def _write_manifest(self, directory: Path, manifest: dict) -> None:
+        tmp = directory / f"{MANIFEST}.tmp"
+        tmp.write_text(json.dumps(manifest))
+        os.replace(tmp, directory / MANIFEST)
+
+    # === Reads ===
+
+    def open_history(
+        self, symbol: str, interval: str, start: int | None = None, end: int | None = None
+    ) -> CandleHistory:
+        """
+        Open archived candles without copying.
+
+        Args:
+            symbol: Trading pair (e.g. BTC/USDT)
+            interval: Candle interval (e.g. 1d)
+            start: First timestamp in ms (inclusive)
+            end: Last timestamp in ms (inclusive)
+
+        Returns:
+            CandleHistory of read-only memory-mapped views (empty if not archived)
+        """
+        rows = self.manifest(symbol, interval)["rows"]
+        if not rows:
+            return CandleHistory.empty(symbol, interval)
+
+        key = (symbol, interval)
+        cached = self._maps.get(key)
+        if cached is None or cached[0] != rows:
+            directory = self._series_dir(symbol, interval)
+            arrays = {
+                name: np.memmap(directory / f"{name}.bin", dtype=dtype, mode="r", shape=(rows,))
+                for name, dtype in COLUMNS.items()
+            }
+            cached = (rows, CandleHistory(symbol, interval, **arrays))
+            self._maps[key] = cached
+            self.stats.opens += 1
+
+        return cached[1].slice(start, end)
+
+    # === Writes ===
+
+    def append_month(self, symbol: str, interval: str, month: int, candles: CandleArrays) -> int:
+        """
+        Append one closed month to a series.
+
+        Args:
+            symbol: Trading pair
+            interval: Candle interval
+            month: Month start in ms
+            candles: Candles of that month, sorted by time
+
+        Returns:
+            Rows appended
+        """
+        manifest = self.manifest(symbol, interval)
+        if manifest["months"] and month <= manifest["months"][-1]:
+            raise ValueError(f"{symbol} {interval}: month {month} is not after the last archived month")
+        if manifest["last_timestamp"] is not None and len(candles):
+            if candles.timestamps[0] <= manifest["last_timestamp"]:
+                raise ValueError(f"{symbol} {interval}: candles overlap the archive")
+
+        directory = self._series_dir(symbol, interval)
+        directory.mkdir(parents=True, exist_ok=True)
+        rows = manifest["rows"]
+        for name, dtype in COLUMNS.items():
+            with open(directory / f"{name}.bin", "ab") as f:
+                # Drop bytes left behind by an append that never reached the manifest
+                f.truncate(rows * dtype.itemsize)
+                f.write(np.ascontiguousarray(getattr(candles, name), dtype=dtype).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+        manifest["rows"] = rows + len(candles)
+        manifest["months"].append(month)
+        if len(candles):
+            manifest["last_timestamp"] = int(candles.timestamps[-1])
+        self._write_manifest(directory, manifest)
+
+        self.stats.months_written += 1
+        self.stats.rows_written += len(candles)
+        return len(candles)
+
+    def _truncate(self, symbol: str, interval: str, month: int) -> CandleHistory:
+        """
+        Cut a series back to the months before the given month.
+
+        Returns:
+            Copy of the archived rows that were cut off
+        """
+        manifest = self.manifest(symbol, interval)
+        history = self.open_history(symbol, interval)
+        offset = int(np.searchsorted(history.timestamps, month, side="left"))
+        removed = CandleHistory(
+            symbol, interval, **{name: np.array(array[offset:]) for name, array in history.columns().items()}
+        )
+        last_timestamp = int(history.timestamps[offset - 1]) if offset else None
+        del history
+        self._maps.pop((symbol, interval), None)
+
+        months = [m for m in manifest["months"] if m < month]
+        self.stats.months_rewritten += len(manifest["months"]) - len(months)
+        manifest.update(rows=offset, months=months, last_timestamp=last_timestamp)
+        self._write_manifest(self._series_dir(symbol, interval), manifest)
+        return removed
+
+    async def archive_series(self, symbol: str, interval: str, oldest: int, now_ms: int | None = None) -> int:
+        """
+        Archive closed months of a series that are not archived yet.
+
+        A month is closed once the current month has started and every
+        candle starting in it has closed (a weekly candle may end in the
+        next month). If rows of the archived range were written since the
+        last run, the series is rewritten from the earliest changed month;
+        database rows replace archived rows with the same timestamp.
+
+        Args:
+            symbol: Trading pair
+            interval: Candle interval
+            oldest: Oldest stored timestamp of the series (from row counters)
+            now_ms: Current time in ms
+
+        Returns:
+            Months appended
+        """
+        from models.session import async_session_maker
+
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        started_at = datetime.now(UTC)
+        manifest = self.manifest(symbol, interval)
+        first = next_month(manifest["months"][-1]) if manifest["months"] else month_start(oldest)
+        current = month_start(now_ms)
+        kept = CandleHistory.empty(symbol, interval)
+
+        appended = 0
+        async with async_session_maker() as session:
+            since = archived_at(manifest)
+            if manifest["months"] and since is not None:
+                result = await session.execute(
+                    changed_rows_statement("MIN(timestamp)"),
+                    {"symbol": symbol, "interval": interval, "until": first - 1, "archived_at": since},
+                )
+                changed = result.scalar()
+                if changed is not None:
+                    first = month_start(int(changed))
+                    kept = self._truncate(symbol, interval, first)
+                    logger.info(f"Rewriting archived {symbol} {interval} from {first}: rows changed since last run")
+
+            for month in months_between(first, current - 1):
+                result = await session.execute(
+                    text("""
+                        SELECT timestamp, exchange, open_price, high_price, low_price, close_price,
+                               volume, quote_volume, trades_count
+                        FROM candlestick_records
+                        WHERE symbol = :symbol AND interval = :interval
+                          AND timestamp >= :start AND timestamp < :end
+                        ORDER BY timestamp, exchange
+                    """),
+                    {"symbol": symbol, "interval": interval, "start": month, "end": next_month(month)},
+                )
+                candles = CandleArrays.from_rows(result.fetchall())
+                if len(candles) and int(bucket_ends(candles.timestamps[-1:], interval)[0]) > now_ms:
+                    break
+                if len(kept):
+                    candles = kept.slice(month, next_month(month) - 1).merge(candles)
+                self.append_month(symbol, interval, month, candles)
+                appended += 1
+
+        manifest = self.manifest(symbol, interval)
+        if manifest["months"]:
+            manifest["archived_at"] = started_at.isoformat()
+            self._write_manifest(self._series_dir(symbol, interval), manifest)
+
+        if appended:
+            logger.info(f"Archived {appended} months of {symbol} {interval}")
+        return appended
+
+    async def archive_all(self, series: list[dict], now_ms: int | None = None) -> dict[str, int]:
+        """
+        Archive closed months of every series.
+
+        Args:
+            series: Dicts with symbol, interval and oldest (CandleStorageManager.series_counts())
+            now_ms: Current time in ms
+
+        Returns:
+            Months appended per "symbol interval"
+        """
+        started = time.perf_counter()
+        appended = {}
+        skipped = []
+        for item in series:
+            name = f"{item['symbol']} {item['interval']}"
+            if item.get("oldest") is None:
+                continue
+            try:
+                months = await self.archive_series(item["symbol"], item["interval"], int(item["oldest"]), now_ms)
+            except Exception as e:
+                logger.error(f"Failed to archive {name}: {e}")
+                self.stats.errors += 1
+                skipped.append(name)
+                continue
+            if months:
+                appended[name] = months
+
+        self.stats.skipped = skipped
+        self.stats.last_run = datetime.now(UTC)
+        self.stats.last_duration_ms = (time.perf_counter() - started) * 1000
+        return appended
+
+    def archived_until(self, symbol: str, interval: str) -> int | None:
+        """Last archived timestamp of a series, or None."""
+        return self.manifest(symbol, interval)["last_timestamp"]
+
+    def get_stats(self) -> dict:
+        """Get archive statistics."""
+        series = 0
+        size = 0
+        if self.root.exists():
+            for manifest in self.root.glob(f"*/*/{MANIFEST}"):
+                series += 1
+                size += sum(f.stat().st_size for f in manifest.parent.glob("*.bin"))
+        return {"root": str(self.root), "series": series, "bytes": size, **self.stats.to_dict()}
+
+
+# Global instance
+_archive: CandleArchive | None = None
+
+
+def get_candle_archive() -> CandleArchive:
+    """Get global candle archive instance."""
+    global _archive
+    if _archive is None:
+        from core.config import settings
+
+        _archive = CandleArchive(settings.CANDLE_ARCHIVE_DIR)
+    return _archive
+
+
+def open_history(symbol: str, interval: str, start: int | None = None, end: int | None = None) -> CandleHistory:
+    """
+    Open archived candle history as zero-copy arrays.
+
+    Only closed months are archived; use load_history() to include
+    candles written since the last archive run.
+    """
+    return get_candle_archive().open_history(symbol, interval, start, end)
+
+
+async def load_history(symbol: str, interval: str, start: int | None = None, end: int | None = None) -> CandleHistory:
+    """
+    Load full candle history: archived months plus newer rows from the database.
+
+    The archived part is memory-mapped; when newer rows exist the columns
+    are concatenated into fresh arrays. Rows of archived months written
+    since the last archive run (backfills, corrections) replace or extend
+    the archived rows.
+
+    Args:
+        symbol: Trading pair
+        interval: Candle interval
+        start: First timestamp in ms (inclusive)
+        end: Last timestamp in ms (inclusive)
+
+    Returns:
+        CandleHistory sorted by time (first exchange wins per timestamp)
+    """
+    from models.session import async_session_maker
+
+    archive = get_candle_archive()
+    try:
+        history = archive.open_history(symbol, interval, start, end)
+        manifest = archive.manifest(symbol, interval)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Candle archive unavailable for {symbol} {interval}, reading database: {e}")
+        archive.stats.errors += 1
+        history, manifest = CandleHistory.empty(symbol, interval), {"last_timestamp": None}
+    since = manifest["last_timestamp"]
+    changed_since = archived_at(manifest) if since is not None else None
+
+    columns = """timestamp, exchange, open_price, high_price, low_price, close_price,
+                 volume, quote_volume, trades_count"""
+    params: dict = {"symbol": symbol, "interval": interval}
+    range_filters = []
+    if start is not None:
+        range_filters.append("timestamp >= :start")
+        params["start"] = start
+    if end is not None:
+        range_filters.append("timestamp <= :end")
+        params["end"] = end
+
+    async with async_session_maker() as session:
+        if changed_since is not None:
+            # Archived range rows written after the last archive run
+            result = await session.execute(
+                changed_rows_statement(columns, range_filters, order=True),
+                {**params, "until": since, "archived_at": changed_since},
+            )
+            changed = CandleArrays.from_rows(result.fetchall())
+            if len(changed):
+                history = history.merge(changed)
+
+        if end is not None and since is not None and since >= end:
+            return history
+
+        filters = ["symbol = :symbol", "interval = :interval", *range_filters]
+        if since is not None:
+            filters.append("timestamp > :since")
+            params["since"] = since
+        result = await session.execute(
+            text(f"""
+                SELECT {columns}
+                FROM candlestick_records
+                WHERE {" AND ".join(filters)}
+                ORDER BY timestamp, exchange
+            """),
+            params,
+        )
+        recent = CandleArrays.from_rows(result.fetchall())
+
+    return history.extend(recent) if len(recent) else history
@@ -7,7 +7,6 @@ to avoid overloading the connection.
 
 import asyncio
 import logging
-from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from decimal import Decimal
@@ -146,7 +145,9 @@ class CandleBuffer:
     async def _write_to_db(self, candles: list[BufferedCandle]) -> int:
         """Write candles to database with retry logic."""
         # Import here to avoid circular imports
-        from models.session import async_session_maker
+        from sqlalchemy import text
+
+        from models.writer import run_write
 
         def to_float(val) -> float | None:
             """Convert Decimal to float for SQLite compatibility."""
@@ -156,90 +157,75 @@ class CandleBuffer:
                 return float(val)
             return val
 
-        # Group by symbol/interval/exchange for efficient upsert
-        grouped: dict[tuple, list] = defaultdict(list)
-        for bc in candles:
-            key = (bc.exchange, bc.symbol, bc.interval)
-            grouped[key].append(bc)
+        loaded_at = datetime.now(UTC)
+        records = [
+            {
+                "exchange": bc.exchange,
+                "symbol": bc.symbol,
+                "interval": bc.interval,
+                "timestamp": bc.candle.timestamp,
+                "open_price": to_float(bc.candle.open_price),
+                "high_price": to_float(bc.candle.high_price),
+                "low_price": to_float(bc.candle.low_price),
+                "close_price": to_float(bc.candle.close_price),
+                "volume": to_float(bc.candle.volume),
+                "quote_volume": to_float(bc.candle.quote_volume),
+                "trades_count": bc.candle.trades_count,
+                "fetch_time_ms": 0,
+                "is_complete": True,
+                "loaded_at": loaded_at,
+            }
+            for bc in candles
+        ]
+        if not records:
+            return 0
+
+        async def write(session) -> int:
+            # Detect dialect
+            dialect = session.bind.dialect.name if session.bind else "sqlite"
+            if dialect == "postgresql":
+                stmt = text("""
+                    INSERT INTO candlestick_records
+                    (exchange, symbol, interval, timestamp, open_price, high_price,
+                     low_price, close_price, volume, quote_volume, trades_count,
+                     fetch_time_ms, is_complete, loaded_at)
+                    VALUES (:exchange, :symbol, :interval, :timestamp, :open_price,
+                            :high_price, :low_price, :close_price, :volume,
+                            :quote_volume, :trades_count, :fetch_time_ms,
+                            :is_complete, :loaded_at)
+                    ON CONFLICT (exchange, symbol, interval, timestamp)
+                    DO UPDATE SET
+                        open_price = EXCLUDED.open_price,
+                        high_price = EXCLUDED.high_price,
+                        low_price = EXCLUDED.low_price,
+                        close_price = EXCLUDED.close_price,
+                        volume = EXCLUDED.volume,
+                        quote_volume = EXCLUDED.quote_volume,
+                        trades_count = EXCLUDED.trades_count,
+                        is_complete = EXCLUDED.is_complete,
+                        loaded_at = EXCLUDED.loaded_at
+                """)
+            else:
+                # SQLite
+                stmt = text("""
+                    INSERT OR REPLACE INTO candlestick_records
+                    (exchange, symbol, interval, timestamp, open_price, high_price,
+                     low_price, close_price, volume, quote_volume, trades_count,
+                     fetch_time_ms, is_complete, loaded_at)
+                    VALUES (:exchange, :symbol, :interval, :timestamp, :open_price,
+                            :high_price, :low_price, :close_price, :volume,
+                            :quote_volume, :trades_count, :fetch_time_ms,
+                            :is_complete, :loaded_at)
+                """)
+            # One executemany for the whole flush
+            await session.execute(stmt, records)
+            return len(records)
 
-        total_written = 0
         max_retries = self.config.max_retries
-        
         for attempt in range(max_retries):
             try:
-                async with async_session_maker() as session:
-                    for (exchange, symbol, interval), buffered_candles in grouped.items():
-                        records = []
-                        for bc in buffered_candles:
-                            c = bc.candle
-                            records.append(
-                                {
-                                    "exchange": exchange,
-                                    "symbol": symbol,
-                                    "interval": interval,
-                                    "timestamp": c.timestamp,
-                                    "open_price": to_float(c.open_price),
-                                    "high_price": to_float(c.high_price),
-                                    "low_price": to_float(c.low_price),
-                                    "close_price": to_float(c.close_price),
-                                    "volume": to_float(c.volume),
-                                    "quote_volume": to_float(c.quote_volume),
-                                    "trades_count": c.trades_count,
-                                    "fetch_time_ms": 0,
-                                    "is_complete": True,
-                                    "loaded_at": datetime.now(UTC),
-                                }
-                            )
-
-                        if records:
-                            # Use raw SQL for upsert to avoid model import issues
-                            from sqlalchemy import text
-
-                            # Detect dialect
-                            dialect = session.bind.dialect.name if session.bind else "sqlite"
-
-                            for record in records:
-                                if dialect == "postgresql":
-                                    stmt = text("""
-                                        INSERT INTO candlestick_records
-                                        (exchange, symbol, interval, timestamp, open_price, high_price,
-                                         low_price, close_price, volume, quote_volume, trades_count,
-                                         fetch_time_ms, is_complete, loaded_at)
-                                        VALUES (:exchange, :symbol, :interval, :timestamp, :open_price,
-                                                :high_price, :low_price, :close_price, :volume,
-                                                :quote_volume, :trades_count, :fetch_time_ms,
-                                                :is_complete, :loaded_at)
-                                        ON CONFLICT (exchange, symbol, interval, timestamp)
-                                        DO UPDATE SET
-                                            open_price = EXCLUDED.open_price,
-                                            high_price = EXCLUDED.high_price,
-                                            low_price = EXCLUDED.low_price,
-                                            close_price = EXCLUDED.close_price,
-                                            volume = EXCLUDED.volume,
-                                            quote_volume = EXCLUDED.quote_volume,
-                                            trades_count = EXCLUDED.trades_count,
-                                            is_complete = EXCLUDED.is_complete,
-                                            loaded_at = EXCLUDED.loaded_at
-                                    """)
-                                else:
-                                    # SQLite
-                                    stmt = text("""
-                                        INSERT OR REPLACE INTO candlestick_records
-                                        (exchange, symbol, interval, timestamp, open_price, high_price,
-                                         low_price, close_price, volume, quote_volume, trades_count,
-                                         fetch_time_ms, is_complete, loaded_at)
-                                        VALUES (:exchange, :symbol, :interval, :timestamp, :open_price,
-                                                :high_price, :low_price, :close_price, :volume,
-                                                :quote_volume, :trades_count, :fetch_time_ms,
-                                                :is_complete, :loaded_at)
-                                    """)
-
-                                await session.execute(stmt, record)
-                                total_written += 1
-
-                    await session.commit()
-                    return total_written
-                    
+                # SQLite: queued on the single writer, no lock contention with other writers
+                return await run_write(write)
             except Exception as e:
                 if attempt < max_retries - 1:
                     wait_time = (2 ** attempt) * 0.5  # Exponential backoff: 0.5s, 1s, 2s
@@ -249,7 +235,7 @@ class CandleBuffer:
                     logger.error(f"[Buffer] DB write failed after {max_retries} attempts: {e}")
                     raise
 
-        return total_written
+        return 0
 
     async def _periodic_flush(self) -> None:
         """Periodic flush task."""
@@ -0,0 +1,507 @@
+"""
+Candle Storage Maintenance.
+
+Keeps candlestick_records bounded and cheap to query as history grows:
+
+- Partitions: on PostgreSQL the table is range-partitioned by month
+  (candlestick_records_pYYYYMM); upcoming months are created ahead of time
+  and months emptied by retention are dropped.
+- Retention tiers: CANDLE_RETENTION_DAYS ("1m:30,5m:365") deletes old
+  candles per interval; intervals without a tier are kept forever.
+- Compaction: partitions touched by retention are vacuumed (SQLite: the
+  database file is vacuumed when enough pages are free).
+- Archive: closed months are copied to the columnar archive
+  (service.candlestick.archive) before retention removes them.
+- Row counters: candle_row_counts holds per (month, symbol, interval)
+  counts. Only months written since the last refresh are recounted, so
+  the candles_count sensor never scans the whole table.
+
+Deletes and counter upserts go through the single writer
+(models.writer.run_write). Two kinds of statements bypass it: partition
+DDL, which only runs on PostgreSQL where run_write would use a plain
+session anyway, and VACUUM, which cannot run inside a transaction and
+so cannot join a write batch.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+import numpy as np
+from sqlalchemy import text
+
+from service.candlestick.rollup import bucket_ends, bucket_starts
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "candlestick_records_p"
+DEFAULT_PARTITION = "candlestick_records_default"
+
+# Months created ahead of the current one
+PARTITION_MONTHS_AHEAD = 2
+
+# SQLite: VACUUM when at least this share of pages is free
+SQLITE_VACUUM_FREE_RATIO = 0.2
+
+
+def month_start(timestamp_ms: int) -> int:
+    """Get the first millisecond of the UTC month containing a timestamp."""
+    return int(bucket_starts(np.array([timestamp_ms], dtype=np.int64), "1M")[0])
+
+
+def next_month(month_ms: int) -> int:
+    """Get the start of the month after the given month start."""
+    return int(bucket_ends(np.array([month_ms], dtype=np.int64), "1M")[0])
+
+
+def months_between(first_ms: int, last_ms: int) -> list[int]:
+    """Month starts covering [first_ms, last_ms]."""
+    months = []
+    month = month_start(first_ms)
+    while month <= last_ms:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def partition_name(month_ms: int) -> str:
+    """Name of the monthly partition (e.g. candlestick_records_p202403)."""
+    month = datetime.fromtimestamp(month_ms / 1000, tz=UTC)
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def parse_retention(spec: str) -> dict[str, int]:
+    """
+    Parse retention tiers.
+
+    Args:
+        spec: Comma-separated "interval:days" pairs, e.g. "1m:30,5m:365"
+
+    Returns:
+        Mapping of interval to days kept
+    """
+    tiers = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        interval, _, days = item.partition(":")
+        try:
+            tiers[interval.strip()] = int(days)
+        except ValueError:
+            logger.warning(f"Ignoring invalid candle retention tier: {item!r}")
+    return {interval: days for interval, days in tiers.items() if days > 0}
+
+
+@dataclass
+class MaintenanceStats:
+    """Counters of the last maintenance runs."""
+
+    partitions_created: int = 0
+    partitions_dropped: int = 0
+    rows_deleted: int = 0
+    vacuumed: list[str] = field(default_factory=list)
+    months_recounted: int = 0
+    last_run: datetime | None = None
+    last_duration_ms: float | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "partitions_created": self.partitions_created,
+            "partitions_dropped": self.partitions_dropped,
+            "rows_deleted": self.rows_deleted,
+            "vacuumed": list(self.vacuumed),
+            "months_recounted": self.months_recounted,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_duration_ms": round(self.last_duration_ms, 1) if self.last_duration_ms is not None else None,
+        }
+
+
+class CandleStorageManager:
+    """Partitions, retention, compaction and row counters for candle storage."""
+
+    def __init__(self, retention: dict[str, int] | None = None):
+        """
+        Initialize manager.
+
+        Args:
+            retention: Interval -> days to keep (missing intervals are kept forever)
+        """
+        self.retention = retention or {}
+        self.stats = MaintenanceStats()
+        self._counted_until: datetime | None = None
+
+    @staticmethod
+    def _engine():
+        from models import session as db
+
+        return db.engine
+
+    async def _is_partitioned(self, conn) -> bool:
+        if conn.dialect.name != "postgresql":
+            return False
+        result = await conn.execute(
+            text("""
+                SELECT 1 FROM pg_partitioned_table p
+                JOIN pg_class c ON c.oid = p.partrelid
+                WHERE c.relname = 'candlestick_records'
+            """)
+        )
+        return result.scalar() is not None
+
+    # === Partitions ===
+
+    async def ensure_partitions(self, now_ms: int | None = None) -> list[str]:
+        """
+        Create monthly partitions for the current and upcoming months.
+
+        No-op when the table is not partitioned (SQLite or pre-migration).
+
+        Returns:
+            Names of created partitions
+        """
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        created = []
+        async with self._engine().begin() as conn:
+            if not await self._is_partitioned(conn):
+                return created
+            month = month_start(now_ms)
+            for _ in range(PARTITION_MONTHS_AHEAD + 1):
+                name = partition_name(month)
+                exists = await conn.execute(text("SELECT to_regclass(:name)"), {"name": name})
+                if exists.scalar() is None:
+                    await conn.execute(
+                        text(
+                            f"CREATE TABLE {name} PARTITION OF candlestick_records "
+                            f"FOR VALUES FROM ({month}) TO ({next_month(month)})"
+                        )
+                    )
+                    created.append(name)
+                month = next_month(month)
+
+        if created:
+            logger.info(f"Created candle partitions: {', '.join(created)}")
+        self.stats.partitions_created += len(created)
+        return created
+
+    async def _drop_empty_partitions(self, now_ms: int) -> list[str]:
+        """Drop past monthly partitions that retention left empty."""
+        dropped = []
+        current = month_start(now_ms)
+        async with self._engine().begin() as conn:
+            if not await self._is_partitioned(conn):
+                return dropped
+            result = await conn.execute(
+                text("""
+                    SELECT c.relname FROM pg_inherits i
+                    JOIN pg_class c ON c.oid = i.inhrelid
+                    JOIN pg_class p ON p.oid = i.inhparent
+                    WHERE p.relname = 'candlestick_records' AND c.relname LIKE :prefix
+                """),
+                {"prefix": f"{PARTITION_PREFIX}%"},
+            )
+            for name in sorted(row[0] for row in result.fetchall()):
+                month = int(datetime.strptime(name[len(PARTITION_PREFIX) :], "%Y%m").replace(tzinfo=UTC).timestamp())
+                if month * 1000 >= current:
+                    continue
+                has_rows = await conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})"))
+                if not has_rows.scalar():
+                    await conn.execute(text(f"DROP TABLE {name}"))
+                    dropped.append(name)
+
+        self.stats.partitions_dropped += len(dropped)
+        return dropped
+
+    # === Retention and compaction ===
+
+    async def apply_retention(self, now_ms: int | None = None) -> dict[str, int]:
+        """
+        Delete candles older than their interval's retention tier.
+
+        Deletes run one month at a time so each statement stays within a
+        single partition and transactions stay short.
+
+        Returns:
+            Rows deleted per interval
+        """
+        from models.session import async_session_maker
+        from models.writer import run_write
+
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        deleted: dict[str, int] = {}
+        touched_months: set[int] = set()
+        statement = text("""
+            DELETE FROM candlestick_records
+            WHERE interval = :interval AND timestamp >= :start AND timestamp < :end
+        """)
+
+        for interval, days in self.retention.items():
+            cutoff = now_ms - days * 86_400_000
+            async with async_session_maker() as session:
+                oldest = await session.execute(
+                    text("SELECT MIN(timestamp) FROM candlestick_records WHERE interval = :interval"),
+                    {"interval": interval},
+                )
+                first = oldest.scalar()
+            if first is None or first >= cutoff:
+                continue
+
+            for month in months_between(first, cutoff):
+                params = {"interval": interval, "start": month, "end": min(next_month(month), cutoff)}
+                result = await run_write(lambda session, params=params: session.execute(statement, params))
+                if result.rowcount:
+                    deleted[interval] = deleted.get(interval, 0) + result.rowcount
+                    touched_months.add(month)
+
+            if deleted.get(interval):
+                await self._recount(interval=interval, months=sorted(touched_months))
+
+        total = sum(deleted.values())
+        self.stats.rows_deleted += total
+        if total:
+            logger.info(f"Candle retention removed {total} rows: {deleted}")
+            await self.compact(sorted(touched_months))
+        return deleted
+
+    async def compact(self, months: list[int]) -> list[str]:
+        """
+        Reclaim space after deletes.
+
+        PostgreSQL: VACUUM (ANALYZE) the affected monthly partitions (they are
+        past months, so vacuum does not compete with live inserts).
+        SQLite: VACUUM the file when enough pages are free.
+
+        Returns:
+            Names of vacuumed relations
+        """
+        # VACUUM cannot run inside a transaction, so it bypasses the write
+        # queue and runs on its own autocommit connection
+        vacuumed = []
+        async with self._engine().connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            if conn.dialect.name == "postgresql":
+                if await self._is_partitioned(conn):
+                    targets = [partition_name(month) for month in months]
+                else:
+                    targets = ["candlestick_records"]
+                for name in targets:
+                    exists = await conn.execute(text("SELECT to_regclass(:name)"), {"name": name})
+                    if exists.scalar() is None:
+                        continue
+                    await conn.execute(text(f"VACUUM (ANALYZE) {name}"))
+                    vacuumed.append(name)
+            elif conn.dialect.name == "sqlite":
+                free = (await conn.execute(text("PRAGMA freelist_count"))).scalar() or 0
+                pages = (await conn.execute(text("PRAGMA page_count"))).scalar() or 0
+                if pages and free / pages >= SQLITE_VACUUM_FREE_RATIO:
+                    await conn.execute(text("VACUUM"))
+                    vacuumed.append("main")
+
+        self.stats.vacuumed = vacuumed
+        return vacuumed
+
+    # === Row counters ===
+
+    async def _recount(self, interval: str | None = None, months: list[int] | None = None, series=None) -> int:
+        """
+        Recount rows of the given months.
+
+        Args:
+            interval: Recount all symbols of this interval (with months)
+            months: Month starts to recount
+            series: Explicit (symbol, interval, month) triples
+
+        Returns:
+            Number of counter rows refreshed
+        """
+        from models.writer import run_write
+
+        counted_at = datetime.now(UTC)
+
+        async def recount(session) -> list:
+            targets = list(series or [])
+            if series is None:
+                symbols = await session.execute(
+                    text("SELECT DISTINCT symbol FROM candle_row_counts WHERE interval = :interval"),
+                    {"interval": interval},
+                )
+                for (symbol,) in symbols.fetchall():
+                    targets.extend((symbol, interval, month) for month in months or [])
+
+            for symbol, series_interval, month in targets:
+                result = await session.execute(
+                    text("""
+                        SELECT COUNT(*), MIN(timestamp), MAX(timestamp) FROM candlestick_records
+                        WHERE symbol = :symbol AND interval = :interval
+                          AND timestamp >= :start AND timestamp < :end
+                    """),
+                    {"symbol": symbol, "interval": series_interval, "start": month, "end": next_month(month)},
+                )
+                count, first, last = result.one()
+                params = {"month": month, "symbol": symbol, "interval": series_interval}
+                if not count:
+                    await session.execute(
+                        text("""
+                            DELETE FROM candle_row_counts
+                            WHERE month = :month AND symbol = :symbol AND interval = :interval
+                        """),
+                        params,
+                    )
+                    continue
+                await session.execute(
+                    text("""
+                        INSERT INTO candle_row_counts
+                        (month, symbol, interval, row_count, min_timestamp, max_timestamp, counted_at)
+                        VALUES (:month, :symbol, :interval, :count, :first, :last, :counted_at)
+                        ON CONFLICT (month, symbol, interval) DO UPDATE SET
+                            row_count = EXCLUDED.row_count,
+                            min_timestamp = EXCLUDED.min_timestamp,
+                            max_timestamp = EXCLUDED.max_timestamp,
+                            counted_at = EXCLUDED.counted_at
+                    """),
+                    {**params, "count": count, "first": first, "last": last, "counted_at": counted_at},
+                )
+            return targets
+
+        recounted = await run_write(recount)
+        self.stats.months_recounted += len(recounted)
+        return len(recounted)
+
+    async def refresh_counts(self) -> int:
+        """
+        Recount months that received writes since the last refresh.
+
+        Writes are found through the loaded_at index, so the cost follows
+        recent write volume rather than table size. The first refresh after
+        an empty counter table counts every month once.
+
+        Returns:
+            Number of (symbol, interval, month) counters refreshed
+        """
+        from models.session import async_session_maker
+
+        started = datetime.now(UTC)
+        async with async_session_maker() as session:
+            since = self._counted_until
+            if since is None:
+                last = await session.execute(text("SELECT MAX(counted_at) FROM candle_row_counts"))
+                since = last.scalar()
+                if isinstance(since, str):
+                    since = datetime.fromisoformat(since)
+
+            query = """
+                SELECT symbol, interval, MIN(timestamp), MAX(timestamp) FROM candlestick_records
+                {where} GROUP BY symbol, interval
+            """
+            if since is None:
+                result = await session.execute(text(query.format(where="")))
+            else:
+                result = await session.execute(text(query.format(where="WHERE loaded_at >= :since")), {"since": since})
+            touched = result.fetchall()
+
+        series = [
+            (symbol, interval, month)
+            for symbol, interval, first, last in touched
+            for month in months_between(int(first), int(last))
+        ]
+        refreshed = await self._recount(series=series) if series else 0
+        self._counted_until = started
+        return refreshed
+
+    async def total_rows(self, refresh: bool = True) -> int:
+        """Total stored candles from counters."""
+        from models.session import async_session_maker
+
+        if refresh:
+            await self.refresh_counts()
+        async with async_session_maker() as session:
+            result = await session.execute(text("SELECT COALESCE(SUM(row_count), 0) FROM candle_row_counts"))
+            return int(result.scalar() or 0)
+
+    async def series_counts(self, symbol: str | None = None, interval: str | None = None) -> list[dict]:
+        """
+        Per symbol/interval counts and time range from counters.
+
+        Returns:
+            List of dicts with symbol, interval, count, oldest, newest (ms)
+        """
+        from models.session import async_session_maker
+
+        filters = []
+        params = {}
+        if symbol:
+            filters.append("symbol = :symbol")
+            params["symbol"] = symbol
+        if interval:
+            filters.append("interval = :interval")
+            params["interval"] = interval
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+
+        async with async_session_maker() as session:
+            result = await session.execute(
+                text(f"""
+                    SELECT symbol, interval, SUM(row_count), MIN(min_timestamp), MAX(max_timestamp)
+                    FROM candle_row_counts {where}
+                    GROUP BY symbol, interval ORDER BY symbol, interval
+                """),
+                params,
+            )
+            return [
+                {"symbol": row[0], "interval": row[1], "count": int(row[2]), "oldest": row[3], "newest": row[4]}
+                for row in result.fetchall()
+            ]
+
+    # === Archive ===
+
+    async def archive(self, now_ms: int | None = None) -> dict[str, int]:
+        """
+        Copy closed months of every series into the columnar archive.
+
+        Returns:
+            Months archived per "symbol interval"
+        """
+        from service.candlestick.archive import get_candle_archive
+
+        try:
+            return await get_candle_archive().archive_all(await self.series_counts(), now_ms)
+        except Exception as e:
+            logger.error(f"Candle archive run failed: {e}")
+            return {}
+
+    # === Job entry point ===
+
+    async def run(self) -> dict:
+        """Run all maintenance steps (partitions, archive, retention, compaction, counters)."""
+        started = time.perf_counter()
+        now_ms = int(time.time() * 1000)
+
+        await self.ensure_partitions(now_ms)
+        await self.refresh_counts()
+        # Archive closed months before retention deletes them from the table
+        archived = await self.archive(now_ms)
+        deleted = await self.apply_retention(now_ms)
+        await self.refresh_counts()
+        dropped = await self._drop_empty_partitions(now_ms) if deleted else []
+
+        self.stats.last_run = datetime.now(UTC)
+        self.stats.last_duration_ms = (time.perf_counter() - started) * 1000
+        return {"archived": archived, "deleted": deleted, "dropped_partitions": dropped, **self.get_stats()}
+
+    def get_stats(self) -> dict:
+        """Get maintenance statistics."""
+        return {"retention_days": dict(self.retention), **self.stats.to_dict()}
+
+
+# Global instance
+_storage_manager: CandleStorageManager | None = None
+
+
+def get_candle_storage() -> CandleStorageManager:
+    """Get global candle storage manager instance."""
+    global _storage_manager
+    if _storage_manager is None:
+        from core.config import settings
+
+        _storage_manager = CandleStorageManager(retention=parse_retention(settings.CANDLE_RETENTION_DAYS))
+    return _storage_manager
@@ -0,0 +1,321 @@
+"""
+Live in-memory price book.
+
+Fed by every kline the stream manager receives (WebSocket or its REST
+fallback). For each symbol it keeps the last price and a rolling 24h
+window of candle buckets:
+
+- 24h high/low via monotonic deques (amortized O(1) per update)
+- 24h volume and the price 24h ago via a running sum over the window
+- Repeated updates of the still-open candle replace its bucket in place
+
+Readers get an immutable :class:`PriceQuote` in O(1). Updates replace
+the quote object in one assignment, so readers never see a half-written
+state and no lock is needed on the event loop. ``get()`` returns None
+once a symbol is older than its staleness limit, which is the consumer's
+cue to fall back to REST.
+
+Usage:
+    from service.candlestick.price_book import get_price_book
+
+    quote = get_price_book().get("BTC")  # or "BTC/USDT"
+    if quote is None:
+        ...  # stale or unknown: use REST
+"""
+
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from service.candlestick.models import Candlestick
+
+logger = logging.getLogger(__name__)
+
+DAY_MS = 24 * 3600 * 1000
+# Quotes older than this are treated as unavailable
+DEFAULT_MAX_AGE = 120.0
+DEFAULT_QUOTE = "USDT"
+
+
+def book_symbol(symbol: str) -> str:
+    """Normalize "btc" / "BTC/USDT" to the streaming pair format."""
+    symbol = symbol.upper()
+    return symbol if "/" in symbol else f"{symbol}/{DEFAULT_QUOTE}"
+
+
+@dataclass(frozen=True, slots=True)
+class PriceQuote:
+    """Immutable price book entry."""
+
+    symbol: str
+    price: float
+    high_24h: float
+    low_24h: float
+    volume_24h: float
+    open_24h: float  # Open of the oldest candle in the window
+    window_ms: int  # Time span covered by the window (DAY_MS when full)
+    candle_ts: int  # Open time of the latest candle
+    updated_at: float  # Wall clock of the last update
+    source: str = ""
+
+    @property
+    def change_24h_pct(self) -> float:
+        return (self.price - self.open_24h) / self.open_24h * 100 if self.open_24h else 0.0
+
+    @property
+    def is_full_day(self) -> bool:
+        """Whether the rolling stats cover a whole 24h."""
+        return self.window_ms >= DAY_MS
+
+    def age(self, now: float | None = None) -> float:
+        return (now if now is not None else time.time()) - self.updated_at
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "price": self.price,
+            "high_24h": self.high_24h,
+            "low_24h": self.low_24h,
+            "volume_24h": round(self.volume_24h, 4),
+            "change_24h_pct": round(self.change_24h_pct, 2),
+            "full_day": self.is_full_day,
+            "candle_ts": self.candle_ts,
+            "age_s": round(self.age(), 1),
+            "source": self.source,
+        }
+
+
+class _RollingWindow:
+    """Candle buckets of the last 24h with monotonic high/low deques."""
+
+    __slots__ = ("buckets", "highs", "lows", "volume", "interval_ms")
+
+    def __init__(self) -> None:
+        self.buckets: deque[tuple[int, float, float]] = deque()  # (ts, open, volume)
+        self.highs: deque[tuple[int, float]] = deque()  # decreasing highs
+        self.lows: deque[tuple[int, float]] = deque()  # increasing lows
+        self.volume = 0.0
+        self.interval_ms = 0
+
+    def add(self, ts: int, open_: float, high: float, low: float, volume: float) -> bool:
+        """
+        Add a candle bucket or update the latest one.
+
+        Returns:
+            False for candles older than the latest bucket (ignored)
+        """
+        if self.buckets:
+            last_ts = self.buckets[-1][0]
+            if ts < last_ts:
+                return False
+            if ts == last_ts:
+                # Open candle update: volume grows, high/low only widen
+                self.volume -= self.buckets.pop()[2]
+            elif not self.interval_ms or ts - last_ts < self.interval_ms:
+                # Smallest step seen: a stream gap (e.g. a reconnect) is not the candle interval
+                self.interval_ms = ts - last_ts
+        self.buckets.append((ts, open_, volume))
+        self.volume += volume
+
+        while self.highs and self.highs[-1][1] <= high:
+            self.highs.pop()
+        self.highs.append((ts, high))
+        while self.lows and self.lows[-1][1] >= low:
+            self.lows.pop()
+        self.lows.append((ts, low))
+
+        # Keep buckets that overlap the 24h ending at the latest candle's close
+        cutoff = ts + self.interval_ms - DAY_MS
+        while self.buckets[0][0] < cutoff:
+            self.volume -= self.buckets.popleft()[2]
+        while self.highs[0][0] < cutoff:
+            self.highs.popleft()
+        while self.lows[0][0] < cutoff:
+            self.lows.popleft()
+        return True
+
+    @property
+    def span_ms(self) -> int:
+        return self.buckets[-1][0] - self.buckets[0][0] + self.interval_ms
+
+
+@dataclass
+class PriceBookStats:
+    """Price book counters."""
+
+    updates: int = 0
+    out_of_order: int = 0
+    hits: int = 0
+    stale: int = 0
+    misses: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "updates": self.updates,
+            "out_of_order": self.out_of_order,
+            "hits": self.hits,
+            "stale": self.stale,
+            "misses": self.misses,
+        }
+
+
+class PriceBook:
+    """Last price and rolling 24h stats per symbol."""
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE, clock: Callable[[], float] = time.time):
+        """
+        Initialize price book.
+
+        Args:
+            max_age: Seconds after which a quote is considered stale
+            clock: Wall clock
+        """
+        self.max_age = max_age
+        self._clock = clock
+        self._windows: dict[str, _RollingWindow] = {}
+        self._quotes: dict[str, PriceQuote] = {}
+        self.stats = PriceBookStats()
+
+    def update(
+        self, symbol: str, candle: Candlestick, source: str = "", updated_at: float | None = None
+    ) -> PriceQuote | None:
+        """
+        Apply a kline (open or closed) to the book.
+
+        Args:
+            symbol: Trading pair ("BTC/USDT") or base ticker
+            candle: Kline as received from the stream
+            source: Stream source name
+            updated_at: Freshness timestamp (defaults to now)
+
+        Returns:
+            New quote, or None if the candle was older than the latest one
+        """
+        symbol = book_symbol(symbol)
+        window = self._windows.get(symbol)
+        if window is None:
+            window = self._windows[symbol] = _RollingWindow()
+
+        if not window.add(
+            candle.timestamp,
+            float(candle.open_price),
+            float(candle.high_price),
+            float(candle.low_price),
+            float(candle.volume),
+        ):
+            self.stats.out_of_order += 1
+            return None
+
+        self.stats.updates += 1
+        quote = PriceQuote(
+            symbol=symbol,
+            price=float(candle.close_price),
+            high_24h=window.highs[0][1],
+            low_24h=window.lows[0][1],
+            volume_24h=window.volume,
+            open_24h=window.buckets[0][1],
+            window_ms=window.span_ms,
+            candle_ts=candle.timestamp,
+            updated_at=self._clock() if updated_at is None else updated_at,
+            source=source,
+        )
+        self._quotes[symbol] = quote
+        return quote
+
+    def seed(self, symbol: str, candles: Iterable[Candlestick], source: str = "db") -> int:
+        """
+        Prefill the 24h window from stored candles (oldest first).
+
+        Seeded quotes are dated by their candle open time, so an old
+        stored candle never passes as a fresh price.
+        """
+        count = 0
+        for candle in candles:
+            if self.update(symbol, candle, source, updated_at=candle.timestamp / 1000) is not None:
+                count += 1
+        return count
+
+    def get(self, symbol: str, max_age: float | None = None) -> PriceQuote | None:
+        """
+        Get a fresh quote.
+
+        Args:
+            symbol: "BTC" or "BTC/USDT"
+            max_age: Override of the staleness limit in seconds
+
+        Returns:
+            Quote, or None if unknown or stale (fall back to REST)
+        """
+        quote = self._quotes.get(book_symbol(symbol))
+        if quote is None:
+            self.stats.misses += 1
+            return None
+        if quote.age(self._clock()) > (self.max_age if max_age is None else max_age):
+            self.stats.stale += 1
+            return None
+        self.stats.hits += 1
+        return quote
+
+    def get_price(self, symbol: str, max_age: float | None = None) -> float | None:
+        """Get a fresh last price."""
+        quote = self.get(symbol, max_age)
+        return quote.price if quote is not None else None
+
+    def get_many(self, symbols: Iterable[str], max_age: float | None = None) -> dict[str, PriceQuote]:
+        """Get fresh quotes keyed by the requested symbol; stale or unknown ones are left out."""
+        result = {}
+        for symbol in symbols:
+            quote = self.get(symbol, max_age)
+            if quote is not None:
+                result[symbol] = quote
+        return result
+
+    def snapshot(self) -> dict[str, PriceQuote]:
+        """All quotes including stale ones."""
+        return dict(self._quotes)
+
+    def get_stats(self) -> dict:
+        """Get book statistics."""
+        now = self._clock()
+        return {
+            "symbols": len(self._quotes),
+            "fresh": sum(1 for q in self._quotes.values() if q.age(now) <= self.max_age),
+            "max_age_s": self.max_age,
+            **self.stats.to_dict(),
+        }
+
+
+# Global instance
+_price_book: PriceBook | None = None
+
+
+def get_price_book() -> PriceBook:
+    """Get global price book instance."""
+    global _price_book
+    if _price_book is None:
+        _price_book = PriceBook()
+    return _price_book
+
+
+async def warm_up_price_book(symbols: list[str], interval: str = "1m") -> int:
+    """
+    Seed the 24h windows of streamed symbols from candlestick_records.
+
+    Without this the rolling stats only become complete after a day of
+    streaming. Best-effort: symbols without stored candles are skipped.
+
+    Returns:
+        Number of candles applied
+    """
+    from service.candlestick.rollup import INTERVAL_MS
+    from service.candlestick.store import get_candle_store
+
+    book = get_price_book()
+    limit = DAY_MS // INTERVAL_MS.get(interval, 60_000)
+    stored = await get_candle_store().latest(symbols, interval, limit)
+    total = sum(book.seed(symbol, candles) for symbol, candles in stored.items())
+    logger.info(f"Price book seeded with {total} candles for {len(symbols)} symbols")
+    return total
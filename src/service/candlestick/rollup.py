@@ -0,0 +1,477 @@
+"""
+Candlestick Rollups.
+
+Derives higher intervals from stored lower-interval candles instead of
+fetching every interval from exchanges:
+
+    1m -> 3m, 5m
+    5m -> 15m, 30m, 1h
+    1h -> 2h, 4h, 6h, 8h, 12h, 1d
+    1d -> 3d, 1w, 1M
+
+Only closed buckets with full source coverage are written. Derived rows
+are tagged with source_raw = "rollup:<source interval>" and never
+overwrite candles fetched from an exchange; occasional exchange fetches
+of a derived interval verify the rollups and replace them.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+import numpy as np
+from sqlalchemy import text
+
+from service.candlestick.models import CandleInterval, FetchResult
+
+logger = logging.getLogger(__name__)
+
+MINUTE_MS = 60_000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+
+# Fixed interval sizes (1M is calendar-based)
+INTERVAL_MS: dict[str, int] = {
+    "1m": MINUTE_MS,
+    "3m": 3 * MINUTE_MS,
+    "5m": 5 * MINUTE_MS,
+    "15m": 15 * MINUTE_MS,
+    "30m": 30 * MINUTE_MS,
+    "1h": HOUR_MS,
+    "2h": 2 * HOUR_MS,
+    "4h": 4 * HOUR_MS,
+    "6h": 6 * HOUR_MS,
+    "8h": 8 * HOUR_MS,
+    "12h": 12 * HOUR_MS,
+    "1d": DAY_MS,
+    "3d": 3 * DAY_MS,
+    "1w": 7 * DAY_MS,
+}
+
+# Derived interval -> interval it is aggregated from
+ROLLUP_SOURCES: dict[str, str] = {
+    "3m": "1m",
+    "5m": "1m",
+    "15m": "5m",
+    "30m": "5m",
+    "1h": "5m",
+    "2h": "1h",
+    "4h": "1h",
+    "6h": "1h",
+    "8h": "1h",
+    "12h": "1h",
+    "1d": "1h",
+    "3d": "1d",
+    "1w": "1d",
+    "1M": "1d",
+}
+
+# Exchange weeks start on Monday; the Unix epoch is a Thursday
+WEEK_OFFSET_MS = 4 * DAY_MS
+
+# Closed buckets re-derived on each run (covers missed cycles)
+ROLLUP_LOOKBACK_BUCKETS = 3
+
+# Relative price difference tolerated between rollup and exchange candle
+VERIFY_TOLERANCE = 0.001
+
+ROLLUP_TAG_PREFIX = "rollup:"
+
+
+def interval_order(interval: str) -> int:
+    """Sort key: shorter intervals first (sources before their rollups)."""
+    return INTERVAL_MS.get(interval, 31 * DAY_MS)
+
+
+def bucket_starts(timestamps: np.ndarray, interval: str) -> np.ndarray:
+    """Get bucket open time (ms) of each timestamp for an interval."""
+    if interval == "1M":
+        months = timestamps.astype("datetime64[ms]").astype("datetime64[M]")
+        return months.astype("datetime64[ms]").astype(np.int64)
+    size = INTERVAL_MS[interval]
+    offset = WEEK_OFFSET_MS if interval == "1w" else 0
+    return timestamps - (timestamps - offset) % size
+
+
+def bucket_ends(starts: np.ndarray, interval: str) -> np.ndarray:
+    """Get bucket close time (ms, exclusive) for bucket open times."""
+    if interval == "1M":
+        months = starts.astype("datetime64[ms]").astype("datetime64[M]")
+        return (months + 1).astype("datetime64[ms]").astype(np.int64)
+    return starts + INTERVAL_MS[interval]
+
+
+def _bucket_start(timestamp_ms: int, interval: str) -> int:
+    return int(bucket_starts(np.array([timestamp_ms], dtype=np.int64), interval)[0])
+
+
+def rollup_windows(intervals: list[str], now_ms: int) -> dict[str, int]:
+    """
+    Get the start time (ms) of the window to re-derive for each interval.
+
+    Each interval covers its latest closed buckets; a source interval that
+    is itself derived in the same run is widened to cover the windows of
+    the intervals built from it (e.g. the whole hour of 5m candles for 1h).
+
+    Args:
+        intervals: Intervals derived in this run
+        now_ms: Current time in ms
+
+    Returns:
+        Mapping of interval to window start
+    """
+    windows = {}
+    for interval in intervals:
+        since = _bucket_start(now_ms, interval)
+        for _ in range(ROLLUP_LOOKBACK_BUCKETS):
+            since = _bucket_start(since - 1, interval)
+        windows[interval] = since
+
+    for interval in sorted(windows, key=interval_order, reverse=True):
+        source = ROLLUP_SOURCES.get(interval)
+        if source in windows:
+            windows[source] = min(windows[source], windows[interval])
+    return windows
+
+
+@dataclass
+class CandleArrays:
+    """Column arrays of candles for one symbol and interval (sorted by time)."""
+
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    quote_volume: np.ndarray  # NaN where unknown
+    trades: np.ndarray  # -1 where unknown
+    exchanges: np.ndarray  # object array of exchange names
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_rows(cls, rows: list) -> "CandleArrays":
+        """
+        Build arrays from DB rows.
+
+        Rows: (timestamp, exchange, open, high, low, close, volume, quote_volume, trades_count),
+        ordered by timestamp then exchange; the first exchange per timestamp wins.
+        """
+        count = len(rows)
+        timestamps = np.fromiter((r[0] for r in rows), dtype=np.int64, count=count)
+        keep = np.ones(count, dtype=bool)
+        if count > 1:
+            keep[1:] = np.diff(timestamps) > 0
+
+        def column(index: int, default: float = np.nan) -> np.ndarray:
+            values = np.fromiter(
+                (float(r[index]) if r[index] is not None else default for r in rows), dtype=np.float64, count=count
+            )
+            return values[keep]
+
+        return cls(
+            timestamps=timestamps[keep],
+            open=column(2),
+            high=column(3),
+            low=column(4),
+            close=column(5),
+            volume=column(6, 0.0),
+            quote_volume=column(7),
+            trades=column(8, -1.0),
+            exchanges=np.array([r[1] for r in rows], dtype=object)[keep],
+        )
+
+
+def aggregate(source: CandleArrays, source_interval: str, interval: str, now_ms: int) -> CandleArrays:
+    """
+    Aggregate candles into a higher interval.
+
+    Only buckets that are closed at now_ms and contain every source
+    candle are returned.
+
+    Args:
+        source: Source candles sorted by time
+        source_interval: Interval of the source candles
+        interval: Target interval
+        now_ms: Current time in ms
+
+    Returns:
+        CandleArrays of complete target candles
+    """
+    if not len(source):
+        return CandleArrays(*(np.zeros(0) for _ in range(8)), exchanges=np.zeros(0, dtype=object))
+
+    starts = bucket_starts(source.timestamps, interval)
+    keys, first, counts = np.unique(starts, return_index=True, return_counts=True)
+    ends = bucket_ends(keys, interval)
+    expected = (ends - keys) // INTERVAL_MS[source_interval]
+
+    last = first + counts - 1
+    complete = (counts == expected) & (ends <= now_ms)
+
+    quote = source.quote_volume
+    trades = source.trades
+    quote_sum = np.add.reduceat(np.nan_to_num(quote), first)
+    quote_known = np.add.reduceat(np.isnan(quote).astype(np.int64), first) == 0
+    trades_sum = np.add.reduceat(np.maximum(trades, 0), first)
+    trades_known = np.add.reduceat((trades < 0).astype(np.int64), first) == 0
+
+    return CandleArrays(
+        timestamps=keys[complete],
+        open=source.open[first][complete],
+        high=np.maximum.reduceat(source.high, first)[complete],
+        low=np.minimum.reduceat(source.low, first)[complete],
+        close=source.close[last][complete],
+        volume=np.add.reduceat(source.volume, first)[complete],
+        quote_volume=np.where(quote_known, quote_sum, np.nan)[complete],
+        trades=np.where(trades_known, trades_sum, -1)[complete],
+        exchanges=source.exchanges[first][complete],
+    )
+
+
+@dataclass
+class RollupStats:
+    """Counters of the rollup engine."""
+
+    runs: int = 0
+    candles_written: int = 0
+    exchange_fetches_saved: int = 0
+    verifications: int = 0
+    mismatches: int = 0
+    last_run_ms: float | None = None
+    written_by_interval: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "runs": self.runs,
+            "candles_written": self.candles_written,
+            "exchange_fetches_saved": self.exchange_fetches_saved,
+            "verifications": self.verifications,
+            "mismatches": self.mismatches,
+            "last_run_ms": round(self.last_run_ms, 1) if self.last_run_ms is not None else None,
+            "written_by_interval": dict(self.written_by_interval),
+        }
+
+
+class CandleRollupEngine:
+    """Derives and verifies higher-interval candles from stored ones."""
+
+    def __init__(self, verify_every: int = 12):
+        """
+        Initialize engine.
+
+        Args:
+            verify_every: Verify one derived interval against the exchange
+                every N sync cycles (0 disables verification)
+        """
+        self.verify_every = verify_every
+        self._cycle = 0
+        self._verify_cursor = 0
+        self.stats = RollupStats()
+
+    async def _load(self, session, symbol: str, interval: str, since_ms: int) -> CandleArrays:
+        result = await session.execute(
+            text("""
+                SELECT timestamp, exchange, open_price, high_price, low_price, close_price,
+                       volume, quote_volume, trades_count
+                FROM candlestick_records
+                WHERE symbol = :symbol AND interval = :interval AND timestamp >= :since
+                ORDER BY timestamp, exchange
+            """),
+            {"symbol": symbol, "interval": interval, "since": since_ms},
+        )
+        return CandleArrays.from_rows(result.fetchall())
+
+    async def _save(self, session, symbol: str, interval: str, candles: CandleArrays) -> int:
+        """Write derived candles; rows fetched from an exchange are left untouched."""
+        if not len(candles):
+            return 0
+
+        loaded_at = datetime.now(UTC)
+        tag = f"{ROLLUP_TAG_PREFIX}{ROLLUP_SOURCES[interval]}"
+        rows = [
+            {
+                "exchange": candles.exchanges[i],
+                "symbol": symbol,
+                "interval": interval,
+                "timestamp": int(candles.timestamps[i]),
+                "open_price": float(candles.open[i]),
+                "high_price": float(candles.high[i]),
+                "low_price": float(candles.low[i]),
+                "close_price": float(candles.close[i]),
+                "volume": float(candles.volume[i]),
+                "quote_volume": None if np.isnan(candles.quote_volume[i]) else float(candles.quote_volume[i]),
+                "trades_count": None if candles.trades[i] < 0 else int(candles.trades[i]),
+                "source_raw": tag,
+                "loaded_at": loaded_at,
+            }
+            for i in range(len(candles))
+        ]
+        await session.execute(
+            text("""
+                INSERT INTO candlestick_records
+                (exchange, symbol, interval, timestamp, open_price, high_price,
+                 low_price, close_price, volume, quote_volume, trades_count,
+                 source_raw, is_complete, loaded_at)
+                VALUES (:exchange, :symbol, :interval, :timestamp, :open_price,
+                        :high_price, :low_price, :close_price, :volume,
+                        :quote_volume, :trades_count, :source_raw, TRUE, :loaded_at)
+                ON CONFLICT (exchange, symbol, interval, timestamp)
+                DO UPDATE SET
+                    open_price = EXCLUDED.open_price,
+                    high_price = EXCLUDED.high_price,
+                    low_price = EXCLUDED.low_price,
+                    close_price = EXCLUDED.close_price,
+                    volume = EXCLUDED.volume,
+                    quote_volume = EXCLUDED.quote_volume,
+                    trades_count = EXCLUDED.trades_count,
+                    loaded_at = EXCLUDED.loaded_at
+                WHERE candlestick_records.source_raw LIKE 'rollup:%'
+            """),
+            rows,
+        )
+        return len(rows)
+
+    async def rollup_symbol(self, symbol: str, intervals: list[str], now_ms: int | None = None) -> list[str]:
+        """
+        Derive closed candles of the given intervals for a symbol.
+
+        Intervals are processed shortest first, so e.g. a 5m rollup is
+        stored before the 1h rollup that reads it.
+
+        Args:
+            symbol: Trading pair (e.g. "BTC/USDT")
+            intervals: Intervals that closed in this cycle
+            now_ms: Current time in ms
+
+        Returns:
+            Intervals whose latest closed bucket could not be derived
+            (insufficient source candles) - fetch these from the exchange
+        """
+        from models.session import async_session_maker
+        from models.writer import run_write
+
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        started = time.perf_counter()
+        missing = []
+
+        ordered = sorted(intervals, key=interval_order)
+        windows = rollup_windows(ordered, now_ms)
+
+        for interval in ordered:
+            source_interval = ROLLUP_SOURCES.get(interval)
+            if source_interval is None:
+                missing.append(interval)
+                continue
+
+            current = _bucket_start(now_ms, interval)
+            async with async_session_maker() as session:
+                source = await self._load(session, symbol, source_interval, windows[interval])
+            derived = aggregate(source, source_interval, interval, now_ms)
+            # Awaited before the next interval reads it (e.g. 5m before 1h)
+            written = await run_write(
+                lambda session, interval=interval, derived=derived: self._save(session, symbol, interval, derived)
+            )
+
+            self.stats.candles_written += written
+            self.stats.written_by_interval[interval] = self.stats.written_by_interval.get(interval, 0) + written
+
+            latest_closed = _bucket_start(current - 1, interval)
+            if latest_closed in set(derived.timestamps.tolist()):
+                self.stats.exchange_fetches_saved += 1
+            else:
+                missing.append(interval)
+
+        self.stats.runs += 1
+        self.stats.last_run_ms = (time.perf_counter() - started) * 1000
+        return missing
+
+    def next_verification(self, derived_intervals: list[str]) -> str | None:
+        """
+        Pick a derived interval to verify against the exchange this cycle.
+
+        Called once per sync cycle; rotates through intervals.
+        """
+        self._cycle += 1
+        if not self.verify_every or not derived_intervals or self._cycle % self.verify_every:
+            return None
+        interval = derived_intervals[self._verify_cursor % len(derived_intervals)]
+        self._verify_cursor += 1
+        return interval
+
+    async def verify(self, result: FetchResult) -> int:
+        """
+        Compare exchange candles with stored rollups of the same exchange.
+
+        Args:
+            result: Fresh exchange fetch of a derived interval
+
+        Returns:
+            Number of candles whose prices differ beyond tolerance
+        """
+        from models.session import async_session_maker
+
+        if not result.candlesticks:
+            return 0
+
+        interval = result.interval.value
+        async with async_session_maker() as session:
+            rows = await session.execute(
+                text("""
+                    SELECT timestamp, high_price, low_price, close_price
+                    FROM candlestick_records
+                    WHERE exchange = :exchange AND symbol = :symbol AND interval = :interval
+                      AND timestamp >= :since AND source_raw LIKE 'rollup:%'
+                """),
+                {
+                    "exchange": result.exchange,
+                    "symbol": result.symbol,
+                    "interval": interval,
+                    "since": min(c.timestamp for c in result.candlesticks),
+                },
+            )
+            derived = {row[0]: row[1:] for row in rows.fetchall()}
+
+        mismatches = 0
+        for candle in result.candlesticks:
+            stored = derived.get(candle.timestamp)
+            if stored is None:
+                continue
+            expected = (float(candle.high_price), float(candle.low_price), float(candle.close_price))
+            if any(abs(float(s) - e) > VERIFY_TOLERANCE * abs(e) for s, e in zip(stored, expected, strict=True)):
+                mismatches += 1
+                logger.warning(
+                    f"Rollup mismatch {result.symbol} {interval} @ {candle.timestamp} ({result.exchange}): "
+                    f"derived HLC={tuple(float(s) for s in stored)}, exchange HLC={expected}"
+                )
+
+        self.stats.verifications += 1
+        self.stats.mismatches += mismatches
+        return mismatches
+
+    def get_stats(self) -> dict:
+        """Get rollup statistics."""
+        return {"verify_every": self.verify_every, **self.stats.to_dict()}
+
+
+# Global instance
+_rollup_engine: CandleRollupEngine | None = None
+
+
+def get_rollup_engine() -> CandleRollupEngine:
+    """Get global rollup engine instance."""
+    global _rollup_engine
+    if _rollup_engine is None:
+        from core.config import settings
+
+        _rollup_engine = CandleRollupEngine(verify_every=settings.CANDLE_ROLLUP_VERIFY_EVERY)
+    return _rollup_engine
+
+
+def is_derivable(interval: str | CandleInterval) -> bool:
+    """Check whether an interval can be derived from a lower one."""
+    value = interval.value if isinstance(interval, CandleInterval) else interval
+    return value in ROLLUP_SOURCES
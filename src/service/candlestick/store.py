@@ -0,0 +1,307 @@
+"""
+Candle Store Read-Through.
+
+Serves "latest N candles" reads from candlestick_records and only asks
+exchanges for what the database is missing:
+
+- stored window complete and the forming candle fresh -> DB only
+- stored window complete up to the last closed candle -> DB + tail fetch
+- window incomplete or gapped -> full exchange fetch (written back)
+
+The read uses the (symbol, interval, timestamp DESC, exchange) index so it
+is a single backward index scan regardless of table size.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import text
+
+from service.candlestick.models import CandleInterval, Candlestick, FetchResult
+from service.candlestick.rollup import INTERVAL_MS, bucket_ends, bucket_starts
+
+logger = logging.getLogger(__name__)
+
+# A stored forming candle younger than this is served as-is
+FORMING_MAX_AGE_MS = 5 * 60_000
+
+# Tails longer than this are fetched in full instead
+MAX_TAIL_CANDLES = 100
+
+# Skip the DB for this long after a connection error
+DB_RETRY_SECONDS = 60.0
+
+# Rows read per requested candle (several exchanges may store the same timestamp)
+ROWS_PER_CANDLE = 2
+
+
+def _to_candle(row) -> Candlestick:
+    """Build a Candlestick from a stored row without re-validating it."""
+
+    def dec(value) -> Decimal | None:
+        if value is None:
+            return None
+        return value if isinstance(value, Decimal) else Decimal(str(value))
+
+    return Candlestick.model_construct(
+        timestamp=int(row.timestamp),
+        open_price=dec(row.open_price),
+        high_price=dec(row.high_price),
+        low_price=dec(row.low_price),
+        close_price=dec(row.close_price),
+        volume=dec(row.volume),
+        quote_volume=dec(row.quote_volume),
+        trades_count=row.trades_count,
+    )
+
+
+def _next_bucket(timestamp: int, interval: str) -> int:
+    return int(bucket_ends(np.array([timestamp], dtype=np.int64), interval)[0])
+
+
+def count_buckets(first: int, last: int, interval: str) -> int:
+    """Number of buckets from first to last bucket open time, inclusive."""
+    if last < first:
+        return 0
+    if interval == "1M":
+        months = np.array([first, last], dtype="datetime64[ms]").astype("datetime64[M]").astype(np.int64)
+        return int(months[1] - months[0]) + 1
+    return (last - first) // INTERVAL_MS[interval] + 1
+
+
+def is_contiguous(timestamps: list[int], interval: str) -> bool:
+    """Check that ascending timestamps have no missing buckets."""
+    if len(timestamps) < 2:
+        return True
+    ts = np.asarray(timestamps, dtype=np.int64)
+    return bool(np.array_equal(bucket_ends(ts[:-1], interval), ts[1:]))
+
+
+@dataclass
+class CandleStoreStats:
+    """Read path counters."""
+
+    db_hits: int = 0
+    tail_fetches: int = 0
+    full_fetches: int = 0
+    passthrough: int = 0
+    db_errors: int = 0
+    written: int = 0
+
+    def to_dict(self) -> dict:
+        reads = self.db_hits + self.tail_fetches + self.full_fetches
+        return {
+            "db_hits": self.db_hits,
+            "tail_fetches": self.tail_fetches,
+            "full_fetches": self.full_fetches,
+            "passthrough": self.passthrough,
+            "db_errors": self.db_errors,
+            "written": self.written,
+            "db_served_pct": round((self.db_hits + self.tail_fetches) / reads * 100, 1) if reads else 0.0,
+        }
+
+
+class CandleStore:
+    """DB-first candle reader with exchange fallback."""
+
+    def __init__(self, timeout: float = 10.0):
+        """
+        Initialize store.
+
+        Args:
+            timeout: Exchange request timeout in seconds
+        """
+        self.timeout = timeout
+        self.stats = CandleStoreStats()
+        self._db_retry_at = 0.0
+
+    async def _load_latest(self, symbol: str, interval: str, limit: int) -> list:
+        """Latest rows for a symbol/interval, one per timestamp, ascending."""
+        from models.session import async_session_maker
+
+        async with async_session_maker() as session:
+            result = await session.execute(
+                text("""
+                    SELECT timestamp, exchange, open_price, high_price, low_price, close_price,
+                           volume, quote_volume, trades_count, loaded_at
+                    FROM candlestick_records
+                    WHERE symbol = :symbol AND interval = :interval
+                    ORDER BY timestamp DESC, exchange
+                    LIMIT :rows
+                """),
+                {"symbol": symbol, "interval": interval, "rows": limit * ROWS_PER_CANDLE},
+            )
+            rows = result.fetchall()
+
+        latest = []
+        seen = set()
+        for row in rows:
+            if row.timestamp in seen:
+                continue
+            seen.add(row.timestamp)
+            latest.append(row)
+            if len(latest) == limit:
+                break
+        latest.reverse()
+        return latest
+
+    async def latest(self, symbols: list[str], interval: str, limit: int) -> dict[str, list[Candlestick]]:
+        """
+        Get the latest stored candles of several symbols (no exchange fallback).
+
+        Args:
+            symbols: Trading pair symbols (e.g., "BTC/USDT")
+            interval: Interval value (e.g., "1m")
+            limit: Candles per symbol
+
+        Returns:
+            Candles sorted by timestamp ascending by symbol; symbols whose
+            read failed are left out
+        """
+        results = await asyncio.gather(
+            *(self._load_latest(symbol, interval, limit) for symbol in symbols), return_exceptions=True
+        )
+        candles = {}
+        for symbol, rows in zip(symbols, results, strict=True):
+            if isinstance(rows, Exception):
+                logger.warning(f"Failed to read stored {interval} candles for {symbol}: {rows}")
+                continue
+            candles[symbol] = [_to_candle(row) for row in rows]
+        return candles
+
+    async def _fetch(
+        self, symbol: str, interval: CandleInterval, limit: int, start_time: int | None = None
+    ) -> FetchResult:
+        from service.candlestick.fetcher import CandlestickFetcher
+
+        fetcher = CandlestickFetcher(timeout=self.timeout)
+        return await fetcher.fetch(symbol=symbol, interval=interval, limit=limit, start_time=start_time)
+
+    async def _write_back(self, result: FetchResult, now_ms: int) -> None:
+        """Store the closed candles of an exchange fetch."""
+        from models.repositories.candlestick import CandlestickRepository
+        from models.writer import run_write
+
+        interval = result.interval.value
+        closed = [c for c in result.candlesticks if _next_bucket(c.timestamp, interval) <= now_ms]
+        if not closed:
+            return
+        try:
+            self.stats.written += await run_write(
+                lambda session: CandlestickRepository(session).upsert_candlesticks(
+                    result.model_copy(update={"candlesticks": closed})
+                )
+            )
+        except Exception as e:
+            logger.debug(f"Candle write-back failed for {result.symbol} {interval}: {e}")
+
+    async def read(self, symbol: str, interval: CandleInterval, limit: int = 100) -> list[Candlestick]:
+        """
+        Get the latest candles, serving from the database when it covers them.
+
+        Args:
+            symbol: Trading pair symbol (e.g., "BTC/USDT")
+            interval: Candlestick interval
+            limit: Number of candles (the last one may still be forming)
+
+        Returns:
+            List of Candlestick objects sorted by timestamp ascending
+        """
+        value = interval.value
+        now_ms = int(time.time() * 1000)
+        current = int(bucket_starts(np.array([now_ms], dtype=np.int64), value)[0])
+
+        rows = []
+        if time.monotonic() >= self._db_retry_at:
+            try:
+                rows = await self._load_latest(symbol, value, limit)
+            except Exception as e:
+                self.stats.db_errors += 1
+                self._db_retry_at = time.monotonic() + DB_RETRY_SECONDS
+                logger.debug(f"Candle store unavailable, using exchanges: {e}")
+
+        if rows and rows[-1].timestamp == current:
+            loaded_at = rows[-1].loaded_at
+            if isinstance(loaded_at, str):
+                loaded_at = datetime.fromisoformat(loaded_at)
+            if loaded_at.tzinfo is None:
+                loaded_at = loaded_at.replace(tzinfo=UTC)
+            if now_ms - loaded_at.timestamp() * 1000 > FORMING_MAX_AGE_MS:
+                rows = rows[:-1]
+
+        timestamps = [int(r.timestamp) for r in rows]
+        if rows and is_contiguous(timestamps, value):
+            if timestamps[-1] == current and len(rows) == limit:
+                self.stats.db_hits += 1
+                return [_to_candle(r) for r in rows]
+
+            next_ts = _next_bucket(timestamps[-1], value)
+            missing = count_buckets(next_ts, current, value)
+            if 0 < missing <= MAX_TAIL_CANDLES and len(rows) + missing >= limit:
+                tail = await self._fetch(symbol, interval, missing, start_time=next_ts)
+                tail_candles = [c for c in tail.candlesticks if c.timestamp >= next_ts]
+                if tail_candles and tail_candles[0].timestamp == next_ts:
+                    self.stats.tail_fetches += 1
+                    await self._write_back(tail, now_ms)
+                    candles = [_to_candle(r) for r in rows] + tail_candles
+                    return candles[-limit:]
+
+        self.stats.full_fetches += 1
+        result = await self._fetch(symbol, interval, limit)
+        await self._write_back(result, now_ms)
+        return result.candlesticks
+
+    def get_stats(self) -> dict:
+        """Get read path statistics."""
+        return self.stats.to_dict()
+
+
+# Global instance
+_candle_store: CandleStore | None = None
+
+
+def get_candle_store() -> CandleStore:
+    """Get global candle store instance."""
+    global _candle_store
+    if _candle_store is None:
+        from core.config import settings
+
+        _candle_store = CandleStore(timeout=settings.CANDLESTICK_FETCH_TIMEOUT)
+    return _candle_store
+
+
+async def read_candlesticks(
+    symbol: str,
+    interval: CandleInterval,
+    limit: int = 100,
+    start_time: int | None = None,
+    end_time: int | None = None,
+) -> list[Candlestick]:
+    """
+    Get candlesticks, preferring stored data over exchange requests.
+
+    Drop-in replacement for fetch_candlesticks() for "latest N" reads;
+    explicit time ranges go straight to the exchanges.
+
+    Args:
+        symbol: Trading pair symbol.
+        interval: Candlestick interval.
+        limit: Number of candlesticks.
+        start_time: Start timestamp in milliseconds (bypasses the store).
+        end_time: End timestamp in milliseconds (bypasses the store).
+
+    Returns:
+        List of Candlestick objects sorted by timestamp ascending.
+    """
+    store = get_candle_store()
+    if start_time is not None or end_time is not None:
+        from service.candlestick.fetcher import fetch_candlesticks
+
+        store.stats.passthrough += 1
+        return await fetch_candlesticks(symbol, interval, limit, start_time, end_time, timeout=store.timeout)
+    return await store.read(symbol, interval, limit)
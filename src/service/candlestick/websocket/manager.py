@@ -13,6 +13,7 @@ from enum import Enum
 from typing import Any
 
 from service.candlestick.models import CandleInterval, Candlestick
+from service.candlestick.price_book import get_price_book
 from service.candlestick.websocket.base import (
     BaseWebSocketStream,
     ConnectionState,
@@ -106,6 +107,8 @@ class CandleStreamManager:
             state.last_candle_time = time.time()
             state.error_count = 0
 
+        get_price_book().update(symbol, candle, source.value)
+
         if self.config.on_candle:
             try:
                 result = self.config.on_candle(symbol, candle, is_closed, source.value)
@@ -185,15 +185,26 @@ class CurrencyListManager:
         """Update notification systems for currency list changes."""
         try:
             # Update Home Assistant notifications about currency changes
-            from service.ha_integration import notify
+            from service.alerts.notification_bus import publish_notification
+            from service.alerts.notification_manager import AlertCategory
 
             if added:
                 message = f"📈 New currencies added: {', '.join(sorted(added))}\nHistorical data loading initiated."
-                await notify(message=message, title="Currency List Updated", notification_id="currency_added")
+                await publish_notification(
+                    message=message,
+                    title="Currency List Updated",
+                    notification_id="currency_added",
+                    category=AlertCategory.SYSTEM,
+                )
 
             if removed:
                 message = f"📉 Currencies removed: {', '.join(sorted(removed))}\nAssociated data has been cleaned up."
-                await notify(message=message, title="Currency List Updated", notification_id="currency_removed")
+                await publish_notification(
+                    message=message,
+                    title="Currency List Updated",
+                    notification_id="currency_removed",
+                    category=AlertCategory.SYSTEM,
+                )
 
             logger.info("Notification systems updated for currency list changes")
 
@@ -10,6 +10,12 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, Any, Callable
 
+from .bridge import (
+    ESPHomeStateBridge,
+    get_state_bridge,
+    start_state_bridge,
+    stop_state_bridge,
+)
 from .discovery import (
     ESPHomeDiscovery,
     get_esphome_discovery,
@@ -35,6 +41,11 @@ __all__ = [
     "get_esphome_server",
     "start_esphome_server",
     "stop_esphome_server",
+    # State bridge
+    "ESPHomeStateBridge",
+    "get_state_bridge",
+    "start_state_bridge",
+    "stop_state_bridge",
     # Discovery
     "ESPHomeDiscovery",
     "get_esphome_discovery",
@@ -115,6 +126,7 @@ async def start_esphome_api() -> bool:
 
 async def stop_esphome_api() -> None:
     """Stop ESPHome API server and discovery."""
+    await stop_state_bridge()
     await stop_esphome_discovery()
     await stop_esphome_server()
     logger.info("ESPHome API: Stopped")
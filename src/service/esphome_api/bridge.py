@@ -0,0 +1,151 @@
+"""ESPHome state bridge.
+
+Feeds sensor changes published through HAIntegrationManager to ESPHome
+API clients. Changes are coalesced per tick: only keys whose encoded
+state differs from what was last pushed are sent, as one multi-message
+write per client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .server import ESPHomeAPIServer
+
+logger = logging.getLogger(__name__)
+
+# Default push interval in seconds
+DEFAULT_TICK_INTERVAL = 1.0
+
+
+class ESPHomeStateBridge:
+    """Coalesces sensor cache changes into batched state pushes."""
+
+    def __init__(
+        self,
+        server: ESPHomeAPIServer,
+        tick_interval: float = DEFAULT_TICK_INTERVAL,
+    ) -> None:
+        """Initialize bridge."""
+        self.server = server
+        self.tick_interval = tick_interval
+        # object_id -> latest value since last tick (coalesced)
+        self._pending: dict[str, Any] = {}
+        # object_id -> last encoded frame pushed to clients
+        self._last_sent: dict[str, bytes] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.ticks = 0
+        self.pushed_states = 0
+        self.skipped_unchanged = 0
+
+    def on_sensor_change(self, sensor_id: str, value: Any) -> None:
+        """State listener callback (sync, non-blocking)."""
+        if sensor_id in self.server.sensors or sensor_id in self.server.text_sensors:
+            self._pending[sensor_id] = value
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """Start push loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("ESPHome API: State bridge started (tick %.1fs)", self.tick_interval)
+
+    async def stop(self) -> None:
+        """Stop push loop."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Wait for changes, then flush at most once per tick."""
+        while True:
+            await self._wakeup.wait()
+            await asyncio.sleep(self.tick_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("ESPHome API: State bridge error: %s", e)
+
+    def flush(self) -> int:
+        """Push coalesced changes to clients.
+
+        Returns: number of changed states pushed.
+        """
+        self.ticks += 1
+        pending, self._pending = self._pending, {}
+
+        frames = []
+        for object_id, value in pending.items():
+            frame = self.server.encode_state(object_id, value)
+            if frame is None:
+                continue
+            if self._last_sent.get(object_id) == frame:
+                self.skipped_unchanged += 1
+                continue
+            self._last_sent[object_id] = frame
+            frames.append(frame)
+
+        delta = b"".join(frames)
+        snapshot: bytes | None = None
+        for client in self.server.clients:
+            if not client.subscribed:
+                continue
+            if client.needs_resync:
+                # Client dropped state frames earlier; deltas alone would leave it stale
+                if snapshot is None:
+                    snapshot = self.server.encode_full_state()
+                client.needs_resync = False
+                client.enqueue(snapshot)
+            elif delta:
+                client.enqueue(delta)
+
+        self.pushed_states += len(frames)
+        return len(frames)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get bridge statistics."""
+        return {
+            "ticks": self.ticks,
+            "pushed_states": self.pushed_states,
+            "skipped_unchanged": self.skipped_unchanged,
+            "pending": len(self._pending),
+            "tracked_keys": len(self._last_sent),
+        }
+
+
+# Global bridge instance
+_bridge: ESPHomeStateBridge | None = None
+
+
+def get_state_bridge() -> ESPHomeStateBridge | None:
+    """Get running state bridge (None if not started)."""
+    return _bridge
+
+
+async def start_state_bridge(
+    server: ESPHomeAPIServer,
+    tick_interval: float = DEFAULT_TICK_INTERVAL,
+) -> ESPHomeStateBridge:
+    """Create and start global state bridge."""
+    global _bridge
+    if _bridge is None:
+        _bridge = ESPHomeStateBridge(server, tick_interval)
+    await _bridge.start()
+    return _bridge
+
+
+async def stop_state_bridge() -> None:
+    """Stop global state bridge."""
+    global _bridge
+    if _bridge:
+        await _bridge.stop()
+        _bridge = None
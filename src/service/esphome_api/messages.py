@@ -6,8 +6,10 @@ Builds protobuf-compatible messages for ESPHome Native API.
 from __future__ import annotations
 
 import hashlib
+import struct
 from dataclasses import dataclass
 from enum import IntEnum
+from functools import lru_cache
 from typing import Any
 
 from .protocol import (
@@ -19,12 +21,27 @@ from .protocol import (
     MSG_PING_RESPONSE,
     MSG_SENSOR_STATE_RESPONSE,
     MSG_TEXT_SENSOR_STATE_RESPONSE,
+    SENSOR_STATE_TYPE,
+    SENSOR_STATE_VALUE_HEADER,
+    STATE_KEY_HEADER,
+    STATE_PRESENT_FIELD,
+    TEXT_SENSOR_STATE_TYPE,
+    TEXT_STATE_VALUE_HEADER,
     encode_bool,
     encode_fixed32,
     encode_float,
     encode_frame,
     encode_string,
     encode_uint32,
+    encode_varint,
+)
+
+_FLOAT = struct.Struct("<f")
+_FIXED32 = struct.Struct("<I")
+
+# SensorStateResponse payload is fixed-size: key(5) + state(5) + missing_state(2)
+_SENSOR_STATE_FRAME_PREFIX = (
+    b"\x00" + encode_varint(len(SENSOR_STATE_TYPE) + 12) + SENSOR_STATE_TYPE + STATE_KEY_HEADER
 )
 
 
@@ -201,22 +218,47 @@ def build_list_entities_done_response() -> bytes:
     return encode_frame(MSG_LIST_ENTITIES_DONE_RESPONSE, b"")
 
 
+@lru_cache(maxsize=4096)
+def _encoded_key(key: int) -> bytes:
+    """Encoded fixed32 entity key (cached per sensor)."""
+    return _FIXED32.pack(key)
+
+
 def build_sensor_state_response(key: int, state: float) -> bytes:
-    """Build SensorStateResponse message."""
-    payload = b""
-    payload += encode_fixed32(1, key)
-    payload += encode_float(2, state)
-    payload += encode_bool(3, False)  # missing_state
-    return encode_frame(MSG_SENSOR_STATE_RESPONSE, payload)
+    """Build SensorStateResponse message.
+
+    Uses precomputed frame prefix and field headers; the output is
+    byte-identical to encoding each field with encode_* helpers.
+    """
+    return b"".join(
+        (
+            _SENSOR_STATE_FRAME_PREFIX,
+            _encoded_key(key),
+            SENSOR_STATE_VALUE_HEADER,
+            _FLOAT.pack(state),
+            STATE_PRESENT_FIELD,
+        )
+    )
 
 
 def build_text_sensor_state_response(key: int, state: str) -> bytes:
     """Build TextSensorStateResponse message."""
-    payload = b""
-    payload += encode_fixed32(1, key)
-    payload += encode_string(2, state)
-    payload += encode_bool(3, False)  # missing_state
-    return encode_frame(MSG_TEXT_SENSOR_STATE_RESPONSE, payload)
+    encoded = state.encode("utf-8")
+    length = encode_varint(len(encoded))
+    size = len(TEXT_SENSOR_STATE_TYPE) + 5 + len(TEXT_STATE_VALUE_HEADER) + len(length) + len(encoded) + 2
+    return b"".join(
+        (
+            b"\x00",
+            encode_varint(size),
+            TEXT_SENSOR_STATE_TYPE,
+            STATE_KEY_HEADER,
+            _encoded_key(key),
+            TEXT_STATE_VALUE_HEADER,
+            length,
+            encoded,
+            STATE_PRESENT_FIELD,
+        )
+    )
 
 
 def build_sensor_state_missing(key: int) -> bytes:
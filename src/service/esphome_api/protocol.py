@@ -44,12 +44,14 @@ def encode_varint(value: int) -> bytes:
     return bytes(result)
 
 
-def decode_varint(data: bytes, offset: int = 0) -> tuple[int, int]:
+def decode_varint(data: bytes | bytearray | memoryview, offset: int = 0) -> tuple[int, int]:
     """Decode VarInt from bytes. Returns (value, bytes_consumed)."""
     result = 0
     shift = 0
     consumed = 0
-    for i, byte in enumerate(data[offset:]):
+    # Index in place instead of slicing data[offset:] (avoids copying the tail)
+    for i in range(offset, len(data)):
+        byte = data[i]
         consumed += 1
         result |= (byte & 0x7F) << shift
         if not (byte & 0x80):
@@ -60,6 +62,23 @@ def decode_varint(data: bytes, offset: int = 0) -> tuple[int, int]:
     return result, consumed
 
 
+def _read_varint(data: bytearray | memoryview, offset: int, end: int) -> tuple[int, int] | None:
+    """Read VarInt at offset. Returns (value, new_offset) or None if incomplete."""
+    result = 0
+    shift = 0
+    pos = offset
+    while pos < end:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not (byte & 0x80):
+            return result, pos
+        shift += 7
+        if shift > 35:
+            raise ValueError("VarInt too long")
+    return None
+
+
 def encode_frame(msg_type: int, payload: bytes) -> bytes:
     """Encode message as plaintext ESPHome frame.
 
@@ -104,6 +123,88 @@ def decode_frame(data: bytes) -> tuple[int, bytes, int] | None:
     return msg_type, payload, total_len
 
 
+class FrameDecoder:
+    """Incremental plaintext frame decoder.
+
+    Socket reads are appended to a single ``bytearray`` and frames are parsed
+    with an offset cursor, so bursts of small reads do not re-copy the whole
+    buffer on every frame. Consumed bytes are compacted lazily.
+    """
+
+    # Compact once this many consumed bytes accumulate at the buffer head
+    COMPACT_THRESHOLD = 64 * 1024
+
+    def __init__(self, max_frame_size: int = 1024 * 1024) -> None:
+        """Initialize decoder."""
+        self._buffer = bytearray()
+        self._offset = 0
+        self.max_frame_size = max_frame_size
+
+    def feed(self, data: bytes) -> None:
+        """Append received bytes."""
+        self._buffer += data
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered, not yet decoded bytes."""
+        return len(self._buffer) - self._offset
+
+    def next_frame(self) -> tuple[int, bytes] | None:
+        """Decode next complete frame.
+
+        Returns: (msg_type, payload) or None if more data is needed.
+        Raises: ValueError on a malformed frame.
+        """
+        buf = self._buffer
+        end = len(buf)
+        pos = self._offset
+        if end - pos < 3:
+            self._maybe_compact()
+            return None
+
+        if buf[pos] != 0x00:
+            raise ValueError(f"Invalid frame indicator: {buf[pos]:#x}")
+
+        size_result = _read_varint(buf, pos + 1, end)
+        if size_result is None:
+            return None
+        size, body_start = size_result
+        if size > self.max_frame_size:
+            raise ValueError(f"Frame too large: {size} bytes")
+
+        frame_end = body_start + size
+        if end < frame_end:
+            return None  # Incomplete frame
+
+        type_result = _read_varint(buf, body_start, frame_end)
+        if type_result is None:
+            raise ValueError("Truncated message type")
+        msg_type, payload_start = type_result
+
+        # Single copy of the payload out of the shared buffer
+        with memoryview(buf) as view:
+            payload = bytes(view[payload_start:frame_end])
+        self._offset = frame_end
+        self._maybe_compact()
+        return msg_type, payload
+
+    def frames(self) -> list[tuple[int, bytes]]:
+        """Decode all complete frames currently buffered."""
+        result = []
+        while (frame := self.next_frame()) is not None:
+            result.append(frame)
+        return result
+
+    def _maybe_compact(self) -> None:
+        """Drop consumed bytes from the buffer head."""
+        if self._offset == len(self._buffer):
+            self._buffer.clear()
+            self._offset = 0
+        elif self._offset >= self.COMPACT_THRESHOLD:
+            del self._buffer[: self._offset]
+            self._offset = 0
+
+
 # Simple protobuf field encoding/decoding
 def encode_string(field_num: int, value: str) -> bytes:
     """Encode string field (wire type 2)."""
@@ -136,6 +237,20 @@ def encode_fixed32(field_num: int, value: int) -> bytes:
     return encode_varint(tag) + struct.pack("<I", value)
 
 
+def field_header(field_num: int, wire_type: int) -> bytes:
+    """Encode protobuf field tag (field number + wire type)."""
+    return encode_varint((field_num << 3) | wire_type)
+
+
+# Precomputed field headers for state messages (hot path)
+STATE_KEY_HEADER = field_header(1, 5)  # fixed32 key
+SENSOR_STATE_VALUE_HEADER = field_header(2, 5)  # float state
+TEXT_STATE_VALUE_HEADER = field_header(2, 2)  # string state
+STATE_PRESENT_FIELD = field_header(3, 0) + b"\x00"  # missing_state = false
+SENSOR_STATE_TYPE = encode_varint(MSG_SENSOR_STATE_RESPONSE)
+TEXT_SENSOR_STATE_TYPE = encode_varint(MSG_TEXT_SENSOR_STATE_RESPONSE)
+
+
 @dataclass
 class ParsedField:
     """Parsed protobuf field."""
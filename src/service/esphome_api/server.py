@@ -7,6 +7,9 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from collections import deque
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Callable
 
 from .messages import (
@@ -29,7 +32,7 @@ from .protocol import (
     MSG_LIST_ENTITIES_REQUEST,
     MSG_PING_REQUEST,
     MSG_SUBSCRIBE_STATES_REQUEST,
-    decode_frame,
+    FrameDecoder,
     decode_protobuf_fields,
     get_string_field,
     get_uint_field,
@@ -43,29 +46,96 @@ logger = logging.getLogger(__name__)
 # ESPHome Native API port
 ESPHOME_API_PORT = 6053
 
+# Max queued state frames per client before the oldest are dropped
+DEFAULT_SEND_QUEUE_SIZE = 256
+
+
+@dataclass
+class ClientStats:
+    """Per-client send statistics."""
+
+    frames_sent: int = 0
+    bytes_sent: int = 0
+    frames_dropped: int = 0
+    writes: int = 0
+    last_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+    total_latency_ms: float = 0.0
+
+    def record_write(self, frames: int, size: int, latency_ms: float) -> None:
+        """Record a completed write (enqueue -> drain latency of oldest frame)."""
+        self.frames_sent += frames
+        self.bytes_sent += size
+        self.writes += 1
+        self.last_latency_ms = latency_ms
+        self.total_latency_ms += latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dict."""
+        return {
+            "frames_sent": self.frames_sent,
+            "bytes_sent": self.bytes_sent,
+            "frames_dropped": self.frames_dropped,
+            "writes": self.writes,
+            "last_latency_ms": round(self.last_latency_ms, 2),
+            "avg_latency_ms": round(self.total_latency_ms / self.writes, 2) if self.writes else 0.0,
+            "max_latency_ms": round(self.max_latency_ms, 2),
+        }
+
 
 class ESPHomeClient:
-    """Handles a single ESPHome API client connection."""
+    """Handles a single ESPHome API client connection.
+
+    Outgoing frames go through a bounded per-client queue drained by a
+    dedicated writer task, so a slow device never blocks the reader loop
+    or broadcasts to other clients. State frames are droppable (oldest
+    first when the queue is full); protocol responses are never dropped,
+    so a client whose full queue holds only those is disconnected.
+    """
 
     def __init__(
         self,
         reader: asyncio.StreamReader,
         writer: asyncio.StreamWriter,
         server: ESPHomeAPIServer,
+        max_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
     ) -> None:
         """Initialize client handler."""
         self.reader = reader
         self.writer = writer
         self.server = server
-        self.buffer = b""
+        self.decoder = FrameDecoder()
         self.subscribed = False
+        # Set when state frames were dropped; the next push sends a full snapshot
+        self.needs_resync = False
         self.client_info = ""
+        self.stats = ClientStats()
+        self.max_queue_size = max_queue_size
         self._running = True
+        # (frame, enqueued_at, droppable)
+        self._queue: deque[tuple[bytes, float, bool]] = deque()
+        self._queue_ready = asyncio.Event()
+        self._writer_task: asyncio.Task | None = None
+
+    @property
+    def peer(self) -> str:
+        """Remote address as string."""
+        addr = self.writer.get_extra_info("peername")
+        if isinstance(addr, tuple) and len(addr) >= 2:
+            return f"{addr[0]}:{addr[1]}"
+        return str(addr)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of frames waiting to be written."""
+        return len(self._queue)
 
     async def handle(self) -> None:
         """Handle client connection."""
         addr = self.writer.get_extra_info("peername")
         logger.info("ESPHome API: Client connected from %s", addr)
+        self._writer_task = asyncio.create_task(self._writer_loop())
 
         try:
             while self._running:
@@ -73,33 +143,43 @@ class ESPHomeClient:
                 if not data:
                     break
 
-                self.buffer += data
+                self.decoder.feed(data)
                 await self._process_buffer()
         except asyncio.CancelledError:
             pass
         except Exception as e:
             logger.error("ESPHome API: Client error: %s", e)
         finally:
+            self._running = False
+            self._queue_ready.set()
+            if self._writer_task:
+                self._writer_task.cancel()
+                try:
+                    await self._writer_task
+                except asyncio.CancelledError:
+                    pass
             self.writer.close()
-            await self.writer.wait_closed()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
             logger.info("ESPHome API: Client disconnected from %s", addr)
             self.server.remove_client(self)
 
     async def _process_buffer(self) -> None:
         """Process buffered data for complete frames."""
-        while self.buffer:
+        while self._running:
             try:
-                result = decode_frame(self.buffer)
-                if result is None:
-                    break  # Incomplete frame
-
-                msg_type, payload, consumed = result
-                self.buffer = self.buffer[consumed:]
-                await self._handle_message(msg_type, payload)
+                result = self.decoder.next_frame()
             except ValueError as e:
                 logger.error("ESPHome API: Frame error: %s", e)
                 self._running = False
                 break
+            if result is None:
+                break  # Incomplete frame
+
+            msg_type, payload = result
+            await self._handle_message(msg_type, payload)
 
     async def _handle_message(self, msg_type: int, payload: bytes) -> None:
         """Handle incoming message."""
@@ -162,18 +242,11 @@ class ESPHomeClient:
         self.subscribed = True
         logger.info("ESPHome API: Client subscribed to states")
 
-        # Send current states for all sensors
-        for object_id, sensor in self.server.sensors.items():
-            state = self.server.get_sensor_state(object_id)
-            if state is not None:
-                msg = build_sensor_state_response(sensor.key, state)
-                await self._send(msg)
-
-        for object_id, sensor in self.server.text_sensors.items():
-            state = self.server.get_text_sensor_state(object_id)
-            if state is not None:
-                msg = build_text_sensor_state_response(sensor.key, state)
-                await self._send(msg)
+        # Send current states for all sensors as one batch
+        self.needs_resync = False
+        snapshot = self.server.encode_full_state()
+        if snapshot:
+            self.enqueue(snapshot, droppable=False)
 
     async def send_state_update(
         self,
@@ -186,18 +259,76 @@ class ESPHomeClient:
             return
 
         if is_text:
-            await self._send(build_text_sensor_state_response(key, str(state)))
+            self.enqueue(build_text_sensor_state_response(key, str(state)))
         else:
-            await self._send(build_sensor_state_response(key, float(state)))
+            self.enqueue(build_sensor_state_response(key, float(state)))
+
+    def enqueue(self, frame: bytes, droppable: bool = True) -> None:
+        """Queue an encoded frame for sending (non-blocking).
+
+        When the queue is full, the oldest droppable frame is discarded;
+        if there is none, the client is disconnected.
+        """
+        if not self._running:
+            return
+        if len(self._queue) >= self.max_queue_size and not self._drop_oldest():
+            logger.warning("ESPHome API: Send queue of %s full of undroppable frames, disconnecting", self.peer)
+            self._disconnect()
+            return
+        self._queue.append((frame, time.monotonic(), droppable))
+        self._queue_ready.set()
+
+    def _drop_oldest(self) -> bool:
+        """Drop the oldest droppable frame from the queue; False if there is none."""
+        for i, (_, _, droppable) in enumerate(self._queue):
+            if droppable:
+                del self._queue[i]
+                self.stats.frames_dropped += 1
+                self.needs_resync = True
+                return True
+        return False
+
+    def _disconnect(self) -> None:
+        """Stop sending and close the connection; the reader loop then exits."""
+        self._running = False
+        self._queue.clear()
+        self._queue_ready.set()
+        self.writer.close()
 
     async def _send(self, data: bytes) -> None:
-        """Send data to client."""
-        try:
-            self.writer.write(data)
-            await self.writer.drain()
-        except Exception as e:
-            logger.error("ESPHome API: Send error: %s", e)
-            self._running = False
+        """Queue protocol response (never dropped)."""
+        self.enqueue(data, droppable=False)
+
+    async def _writer_loop(self) -> None:
+        """Drain the send queue, coalescing queued frames into one write."""
+        while self._running:
+            if not self._queue:
+                self._queue_ready.clear()
+                await self._queue_ready.wait()
+                continue
+
+            oldest_enqueued = self._queue[0][1]
+            batch = [frame for frame, _, _ in self._queue]
+            self._queue.clear()
+            try:
+                self.writer.writelines(batch)
+                await self.writer.drain()
+            except Exception as e:
+                logger.error("ESPHome API: Send error: %s", e)
+                self._running = False
+                break
+            latency_ms = (time.monotonic() - oldest_enqueued) * 1000
+            self.stats.record_write(len(batch), sum(len(f) for f in batch), latency_ms)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get client send statistics."""
+        return {
+            "peer": self.peer,
+            "client_info": self.client_info,
+            "subscribed": self.subscribed,
+            "queue_depth": self.queue_depth,
+            **self.stats.to_dict(),
+        }
 
 
 class ESPHomeAPIServer:
@@ -250,6 +381,41 @@ class ESPHomeAPIServer:
                 return str(value)
         return None
 
+    def encode_state(self, object_id: str, value: Any) -> bytes | None:
+        """Encode a state message for a sensor value (None if not applicable)."""
+        if value is None:
+            return None
+        sensor = self.sensors.get(object_id)
+        if sensor:
+            try:
+                return build_sensor_state_response(sensor.key, float(value))
+            except (TypeError, ValueError):
+                return None
+        text_sensor = self.text_sensors.get(object_id)
+        if text_sensor:
+            return build_text_sensor_state_response(text_sensor.key, str(value))
+        return None
+
+    def encode_full_state(self) -> bytes:
+        """Encode current states of all sensors as one multi-message buffer."""
+        frames = []
+        for object_id, sensor in self.sensors.items():
+            state = self.get_sensor_state(object_id)
+            if state is not None:
+                frames.append(build_sensor_state_response(sensor.key, state))
+
+        for object_id, sensor in self.text_sensors.items():
+            state = self.get_text_sensor_state(object_id)
+            if state is not None:
+                frames.append(build_text_sensor_state_response(sensor.key, state))
+
+        return b"".join(frames)
+
+    @property
+    def clients(self) -> list[ESPHomeClient]:
+        """Connected clients."""
+        return list(self._clients)
+
     async def start(self) -> bool:
         """Start the server."""
         try:
@@ -297,21 +463,30 @@ class ESPHomeAPIServer:
         object_id: str,
         state: float | str,
     ) -> None:
-        """Broadcast state update to all subscribed clients."""
-        # Find sensor
-        sensor = self.sensors.get(object_id)
-        text_sensor = self.text_sensors.get(object_id)
-
-        if sensor:
-            for client in self._clients:
-                await client.send_state_update(
-                    sensor.key, state, is_text=False
-                )
-        elif text_sensor:
-            for client in self._clients:
-                await client.send_state_update(
-                    text_sensor.key, state, is_text=True
-                )
+        """Broadcast state update to all subscribed clients.
+
+        The state message is encoded once and queued on every client;
+        each client's writer task sends it independently.
+        """
+        frame = self.encode_state(object_id, state)
+        if frame is not None:
+            self.broadcast_frame(frame)
+
+    def broadcast_frame(self, frame: bytes) -> int:
+        """Queue a pre-encoded frame on all subscribed clients.
+
+        Returns: number of clients the frame was queued for.
+        """
+        count = 0
+        for client in self._clients:
+            if client.subscribed:
+                client.enqueue(frame)
+                count += 1
+        return count
+
+    def get_client_stats(self) -> list[dict[str, Any]]:
+        """Get per-client send statistics."""
+        return [client.get_stats() for client in self._clients]
 
 
 # Global server instance
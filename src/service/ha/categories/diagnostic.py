@@ -135,6 +135,24 @@ class SchedulerStatusSensor(StatusSensor):
     )
 
 
+@register_sensor(category="diagnostic")
+class SchedulerLoopLagSensor(ScalarSensor):
+    """Max event-loop lag over the last minute."""
+
+    config = SensorConfig(
+        sensor_id="scheduler_loop_lag",
+        name="Scheduler Loop Lag",
+        name_ru="Задержка цикла событий",
+        icon="mdi:timer-alert-outline",
+        unit="ms",
+        entity_category="diagnostic",
+        description="Max event-loop lag in the last minute; attributes list slow and stalling jobs",
+        description_ru="Максимальная задержка цикла событий за минуту; в атрибутах медленные и блокирующие задачи",
+        value_type="float",
+        min_value=0,
+    )
+
+
 @register_sensor(category="diagnostic")
 class VersionSensor(StatusSensor):
     """System version."""
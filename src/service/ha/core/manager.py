@@ -6,6 +6,7 @@ with modular architecture and Pydantic validation.
 
 import logging
 import os
+from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from typing import Any
@@ -274,6 +275,7 @@ class HAIntegrationManager:
         self._highs: dict[str, str] = {}
         self._lows: dict[str, str] = {}
         self._cache: dict[str, Any] = {}
+        self._state_listeners: list[Callable[[str, Any], None]] = []
 
         # Ensure all sensors are registered
         SensorRegistry.ensure_initialized()
@@ -312,6 +314,9 @@ class HAIntegrationManager:
             logger.warning("Publisher not available, skipping registration")
             return 0
 
+        # Seed the entity mirror with what HA holds from previous runs
+        await self.publisher.reconcile()
+
         count = 0
         for sensor_id, sensor in self._sensors.items():
             try:
@@ -344,6 +349,35 @@ class HAIntegrationManager:
 
         return count
 
+    # === State Listeners ===
+
+    def add_state_listener(self, listener: Callable[[str, Any], None]) -> None:
+        """Subscribe to sensor cache changes.
+
+        Listeners are called synchronously with (sensor_id, value) on every
+        publish and must not block (e.g. just record the change).
+        """
+        if listener not in self._state_listeners:
+            self._state_listeners.append(listener)
+
+    def remove_state_listener(self, listener: Callable[[str, Any], None]) -> None:
+        """Unsubscribe from sensor cache changes."""
+        if listener in self._state_listeners:
+            self._state_listeners.remove(listener)
+
+    def get_sensor_value(self, sensor_id: str) -> Any:
+        """Get last published value of a sensor (None if never published)."""
+        return self._cache.get(sensor_id)
+
+    def _notify_state_listeners(self, sensor_id: str, value: Any) -> None:
+        """Notify listeners about a sensor cache change."""
+        # Copy: one-shot listeners may remove themselves
+        for listener in list(self._state_listeners):
+            try:
+                listener(sensor_id, value)
+            except Exception as e:
+                logger.debug(f"State listener error for {sensor_id}: {e}")
+
     # === Generic Publishing Methods ===
 
     async def publish_sensor(
@@ -364,6 +398,7 @@ class HAIntegrationManager:
         """
         # Update cache
         self._cache[sensor_id] = value
+        self._notify_state_listeners(sensor_id, value)
 
         if sensor_id not in self._sensors:
             logger.warning(f"Unknown sensor: {sensor_id}")
@@ -1,11 +1,17 @@
 """Publisher for Home Assistant Supervisor API.
 
 Wraps SupervisorAPIClient to provide sensor-specific publishing methods.
+
+HA replaces all attributes of an entity on every state POST, so the
+publisher keeps a local mirror of the last published state and attributes
+per entity. Attribute merges happen in memory and every update is a single
+POST; the mirror is reconciled with HA on startup and after failed writes.
 """
 
 import asyncio
 import json
 import logging
+from dataclasses import dataclass, field
 
 from core.constants import APP_VERSION
 from service.ha_integration import SupervisorAPIClient, get_supervisor_client
@@ -13,6 +19,14 @@ from service.ha_integration import SupervisorAPIClient, get_supervisor_client
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class EntityState:
+    """Last published state and attributes of an entity."""
+
+    state: str
+    attributes: dict = field(default_factory=dict)
+
+
 class SupervisorPublisher:
     """Publisher for HA sensors via Supervisor REST API.
 
@@ -35,6 +49,9 @@ class SupervisorPublisher:
                    If not provided, uses global singleton.
         """
         self._client = client or get_supervisor_client()
+        self._mirror: dict[str, EntityState] = {}
+        self._stale: set[str] = set()  # Entities whose HA state is unknown after a failed write
+        self._stats = {"posts": 0, "gets": 0, "reconciles": 0, "errors": 0}
 
     @property
     def is_available(self) -> bool:
@@ -87,15 +104,11 @@ class SupervisorPublisher:
         attributes = registration_data.copy()
         attributes["device"] = self.device_info
 
-        return await self._client.create_sensor(
-            sensor_id=sensor_id,
-            state=initial_state,
-            friendly_name=registration_data.get("friendly_name", sensor_id),
-            icon=registration_data.get("icon", "mdi:help-circle"),
-            unit=registration_data.get("unit_of_measurement"),
-            device_class=registration_data.get("device_class"),
-            attributes=attributes,
-        )
+        attributes.setdefault("friendly_name", sensor_id)
+        attributes.setdefault("unique_id", f"crypto_inspect_{sensor_id}")
+        attributes.setdefault("icon", "mdi:help-circle")
+
+        return await self._post_state(self._get_entity_id(sensor_id), initial_state, attributes)
 
     async def publish_sensor(
         self,
@@ -128,11 +141,15 @@ class SupervisorPublisher:
         else:
             state_str = str(state)
 
-        return await self._client.update_sensor(
-            sensor_id=sensor_id,
-            state=state_str,
-            attributes=attributes,
-        )
+        entity_id = self._get_entity_id(sensor_id)
+        if entity_id in self._stale:
+            await self._fetch_state(entity_id)
+        mirrored = self._mirror.get(entity_id)
+        merged = dict(mirrored.attributes) if mirrored else {}
+        if attributes:
+            merged.update(attributes)
+
+        return await self._post_state(entity_id, state_str, merged)
 
     async def _save_sensor_state(self, sensor_id: str, value: str | dict) -> None:
         """Save sensor state to database asynchronously.
@@ -143,12 +160,10 @@ class SupervisorPublisher:
         """
         try:
             from models.repositories.sensor_state import SensorStateRepository
-            from models.session import async_session_maker
+            from models.writer import run_write
 
             unique_id = f"crypto_inspect_{sensor_id}"
-            async with async_session_maker() as session:
-                repo = SensorStateRepository(session)
-                await repo.upsert(unique_id, sensor_id, value)
+            await run_write(lambda session: SensorStateRepository(session).upsert(unique_id, sensor_id, value))
         except Exception as e:
             logger.debug(f"Failed to save sensor state {sensor_id}: {e}")
 
@@ -171,31 +186,94 @@ class SupervisorPublisher:
 
         entity_id = self._get_entity_id(sensor_id)
 
-        # Get current state first
+        mirrored = self._mirror.get(entity_id)
+        if mirrored is None:
+            # Not published since startup or last failed write - ask HA once
+            mirrored = await self._fetch_state(entity_id)
+            if mirrored is None:
+                logger.warning(f"Could not get current state for {entity_id}")
+                return False
+
+        merged = dict(mirrored.attributes)
+        merged.update(attributes)
+        return await self._post_state(entity_id, mirrored.state, merged)
+
+    async def _post_state(self, entity_id: str, state: str, attributes: dict) -> bool:
+        """POST full state and attributes, keeping the mirror in sync.
+
+        Args:
+            entity_id: Full entity ID
+            state: State string
+            attributes: Complete attribute set
+
+        Returns:
+            True if HA accepted the state
+        """
+        self._stats["posts"] += 1
+        if await self._client.set_state(entity_id=entity_id, state=state, attributes=attributes):
+            self._mirror[entity_id] = EntityState(state, attributes)
+            return True
+
+        # Unknown what HA holds now - re-read before the next attribute merge
+        self._stats["errors"] += 1
+        self._mirror.pop(entity_id, None)
+        self._stale.add(entity_id)
+        return False
+
+    async def _fetch_state(self, entity_id: str) -> EntityState | None:
+        """Read one entity from HA into the mirror."""
+        self._stats["gets"] += 1
         try:
             client = await self._client._get_client()
             response = await client.get(f"/core/api/states/{entity_id}")
+            if response.status_code != 200:
+                return None
+            current = response.json()
+        except Exception as e:
+            logger.error(f"Failed to get state for {entity_id}: {e}")
+            return None
 
-            if response.status_code == 200:
-                current = response.json()
-                current_state = current.get("state", "unknown")
+        entity = EntityState(current.get("state", "unknown"), current.get("attributes", {}))
+        self._mirror[entity_id] = entity
+        self._stale.discard(entity_id)
+        return entity
 
-                # Merge attributes
-                current_attrs = current.get("attributes", {})
-                current_attrs.update(attributes)
+    async def reconcile(self) -> int:
+        """Load state and attributes of all own entities from HA into the mirror.
 
-                return await self._client.set_state(
-                    entity_id=entity_id,
-                    state=current_state,
-                    attributes=current_attrs,
-                )
-            else:
-                logger.warning(f"Could not get current state for {entity_id}")
-                return False
+        Returns:
+            Number of mirrored entities
+        """
+        if not self.is_available:
+            return 0
 
+        self._stats["gets"] += 1
+        try:
+            client = await self._client._get_client()
+            response = await client.get("/core/api/states")
+            response.raise_for_status()
+            mirror = {
+                item["entity_id"]: EntityState(item.get("state", "unknown"), item.get("attributes", {}))
+                for item in response.json()
+                if item.get("entity_id", "").startswith(self.ENTITY_PREFIX)
+            }
         except Exception as e:
-            logger.error(f"Failed to update attributes for {sensor_id}: {e}")
-            return False
+            logger.warning(f"Failed to reconcile entity mirror with HA: {e}")
+            return 0
+
+        self._stats["reconciles"] += 1
+        self._stale.clear()
+        self._mirror = mirror
+        logger.info(f"Reconciled {len(self._mirror)} entities with Home Assistant")
+        return len(self._mirror)
+
+    def get_mirrored_state(self, sensor_id: str) -> EntityState | None:
+        """Get last published state of a sensor, if known."""
+        return self._mirror.get(self._get_entity_id(sensor_id))
+
+    def get_stats(self) -> dict:
+        """Get publisher request counters."""
+        return {"entities": len(self._mirror), **self._stats}
 
     async def remove_sensor(self, sensor_id: str) -> bool:
         """Mark sensor as unavailable.
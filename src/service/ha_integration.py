@@ -323,47 +323,16 @@ async def notify(
     title: str = "Crypto Inspect",
     notification_id: str | None = None,
 ) -> bool:
-    """Send a persistent notification to Home Assistant."""
+    """
+    Send a persistent notification to Home Assistant.
+
+    Delivery primitive of the notification bus: callers publish through
+    service.alerts.notification_bus so dedup and rate limits apply.
+    """
     client = get_supervisor_client()
     return await client.send_persistent_notification(message, title, notification_id)
 
 
-async def notify_sync_complete(
-    success_count: int,
-    failure_count: int,
-    duration_seconds: float,
-) -> bool:
-    """Send notification about sync job completion."""
-    total = success_count + failure_count
-    status = "completed" if failure_count == 0 else "completed with errors"
-
-    message = (
-        f"Sync {status}\n"
-        f"✓ Success: {success_count}/{total}\n"
-        f"✗ Failed: {failure_count}\n"
-        f"⏱ Duration: {duration_seconds:.1f}s"
-    )
-
-    return await notify(
-        message=message,
-        title="Crypto Inspect - Sync",
-        notification_id="crypto_inspect_sync",
-    )
-
-
-async def notify_error(error_message: str, context: str = "") -> bool:
-    """Send error notification."""
-    message = f"❌ Error: {error_message}"
-    if context:
-        message += f"\n📍 Context: {context}"
-
-    return await notify(
-        message=message,
-        title="Crypto Inspect - Error",
-        notification_id="crypto_inspect_error",
-    )
-
-
 async def register_sensors() -> int:
     """
     Register all Crypto Inspect sensors in Home Assistant.
@@ -4,6 +4,7 @@ MCP Tools for Crypto Inspect.
 Exposes all data endpoints as MCP tools for AI agents.
 """
 
+import asyncio
 import logging
 import os
 from datetime import UTC, datetime, timedelta
@@ -52,29 +53,44 @@ async def get_crypto_prices() -> dict[str, Any]:
     - 24h volume
     """
     from models.session import async_session_maker
+    from service.candlestick.price_book import get_price_book
 
     symbols = get_currency_list()
     result = {}
 
+    # Live quotes first; only symbols without a fresh quote hit the database
+    for symbol, quote in get_price_book().get_many(symbols).items():
+        result[symbol] = {
+            "price": quote.price,
+            "timestamp": quote.candle_ts,
+            "change_24h_pct": round(quote.change_24h_pct, 2),
+            "high_24h": quote.high_24h,
+            "low_24h": quote.low_24h,
+            "volume_24h": quote.volume_24h,
+            "updated_at": datetime.fromtimestamp(quote.updated_at, UTC).isoformat(),
+        }
+
+    missing = [symbol for symbol in symbols if symbol not in result]
     try:
-        async with async_session_maker() as session:
-            for symbol in symbols:
-                query = text("""
-                    SELECT close_price, timestamp
-                    FROM candlestick_records
-                    WHERE symbol = :symbol AND interval = '1m'
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                """)
-                res = await session.execute(query, {"symbol": symbol})
-                row = res.fetchone()
-
-                if row:
-                    result[symbol] = {
-                        "price": float(row[0]),
-                        "timestamp": row[1],
-                        "updated_at": datetime.now(UTC).isoformat(),
-                    }
+        if missing:
+            async with async_session_maker() as session:
+                for symbol in missing:
+                    query = text("""
+                        SELECT close_price, timestamp
+                        FROM candlestick_records
+                        WHERE symbol = :symbol AND interval = '1m'
+                        ORDER BY timestamp DESC
+                        LIMIT 1
+                    """)
+                    res = await session.execute(query, {"symbol": symbol})
+                    row = res.fetchone()
+
+                    if row:
+                        result[symbol] = {
+                            "price": float(row[0]),
+                            "timestamp": row[1],
+                            "updated_at": datetime.now(UTC).isoformat(),
+                        }
     except Exception as e:
         logger.error(f"Error getting crypto prices: {e}")
         result["error"] = str(e)
@@ -188,19 +204,19 @@ async def get_market_summary() -> dict[str, Any]:
     - Altseason status
     - Market phase
     """
-    from service.analysis import OnChainAnalyzer
     from service.analysis.altseason import get_altseason_tracker
+    from service.analysis.market_facts import get_btc_dominance as get_cached_btc_dominance
+    from service.analysis.market_facts import get_fear_greed
 
     try:
-        onchain = OnChainAnalyzer()
         altseason = get_altseason_tracker()
 
-        fear_greed = await onchain.get_fear_greed_index()
-        btc_dom = await onchain.get_btc_dominance()
+        fear_greed = await get_fear_greed()
+        btc_dom = await get_cached_btc_dominance()
         alt_status = await altseason.get_status()
 
         return {
-            "fear_greed": fear_greed,
+            "fear_greed": fear_greed.to_dict() if fear_greed else None,
             "btc_dominance": btc_dom,
             "altseason": alt_status.to_dict() if alt_status else None,
             "timestamp": datetime.now(UTC).isoformat(),
@@ -222,12 +238,13 @@ async def get_fear_greed_index() -> dict[str, Any]:
         - 55-75: Greed
         - 75-100: Extreme Greed
     """
-    from service.analysis import OnChainAnalyzer
+    from service.analysis.market_facts import get_fear_greed
 
     try:
-        onchain = OnChainAnalyzer()
-        result = await onchain.get_fear_greed_index()
-        return result
+        result = await get_fear_greed()
+        if result is None:
+            return {"error": "Fear & Greed Index unavailable"}
+        return result.to_dict()
     except Exception as e:
         logger.error(f"Error getting fear/greed: {e}")
         return {"error": str(e)}
@@ -240,11 +257,10 @@ async def get_btc_dominance() -> dict[str, Any]:
     Returns:
         BTC market cap as percentage of total crypto market cap
     """
-    from service.analysis import OnChainAnalyzer
+    from service.analysis.market_facts import get_btc_dominance as get_cached_btc_dominance
 
     try:
-        onchain = OnChainAnalyzer()
-        result = await onchain.get_btc_dominance()
+        result = await get_cached_btc_dominance()
         return {"btc_dominance": result}
     except Exception as e:
         logger.error(f"Error getting BTC dominance: {e}")
@@ -360,12 +376,20 @@ async def get_funding_rates() -> dict[str, Any]:
         - Interpretation (bullish/bearish)
         - Historical average
     """
-    from service.analysis import DerivativesAnalyzer
+    from service.analysis.derivatives import DerivativesAnalyzer
+    from service.analysis.market_facts import get_derivatives
 
     try:
-        analyzer = DerivativesAnalyzer()
-        result = await analyzer.get_funding_rates()
-        return result
+        symbols = list(DerivativesAnalyzer.SYMBOL_MAP)
+        results = await asyncio.gather(*(get_derivatives(s) for s in symbols))
+        return {
+            "funding_rates": {
+                symbol: metrics.funding.to_dict()
+                for symbol, metrics in zip(symbols, results, strict=True)
+                if metrics and metrics.funding
+            },
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
     except Exception as e:
         logger.error(f"Error getting funding rates: {e}")
         return {"error": str(e)}
@@ -579,7 +603,7 @@ async def get_signals(hours: int = 24) -> dict[str, Any]:
     try:
         manager = get_signal_manager()
         since = datetime.now(UTC) - timedelta(hours=hours)
-        signals = manager.get_signals(since=since, limit=100)
+        signals = await manager.get_signals(since=since, limit=100)
 
         return {
             "signals": [s.to_dict() for s in signals],
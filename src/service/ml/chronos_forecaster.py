@@ -5,20 +5,19 @@ Chronos Bolt Forecaster - Amazon's lightweight transformer model for time series
 import logging
 from datetime import datetime
 
-try:
-    import torch
-    from chronos import ChronosPipeline
-
-    CHRONOS_AVAILABLE = True
-except ImportError:
-    CHRONOS_AVAILABLE = False
-
 from core.constants import MLDefaults
+from core.lazy_import import lazy_import, module_available
 from service.ml.base import BaseForecaster
 from service.ml.models import ForecastResult
 
 logger = logging.getLogger(__name__)
 
+# torch alone takes seconds to import; defer until a model is loaded
+torch = lazy_import("torch")
+chronos = lazy_import("chronos")
+
+CHRONOS_AVAILABLE = module_available("torch", "chronos")
+
 
 class ChronosBoltForecaster(BaseForecaster):
     """Price forecaster using Amazon Chronos-T5 model."""
@@ -41,7 +40,7 @@ class ChronosBoltForecaster(BaseForecaster):
         """Load Chronos pipeline."""
         try:
             logger.info(f"Loading Chronos model: {self.model_name}")
-            self.pipeline = ChronosPipeline.from_pretrained(
+            self.pipeline = chronos.ChronosPipeline.from_pretrained(
                 self.model_name,
                 device_map="cpu",  # CPU-optimized
                 dtype=torch.float32,  # Updated parameter name
@@ -66,8 +65,6 @@ class ChronosBoltForecaster(BaseForecaster):
 
         try:
             # Prepare data - Chronos expects tensor
-            import torch
-
             context_length = min(len(prices), MLDefaults.CONTEXT_LENGTH)
             recent_prices = prices[-context_length:]
 
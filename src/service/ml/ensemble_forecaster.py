@@ -9,6 +9,7 @@ from datetime import datetime
 from core.constants import MLModels
 from service.ml.base import BaseForecaster
 from service.ml.chronos_forecaster import ChronosBoltForecaster
+from service.ml.forecast_cache import get_forecast_cache
 from service.ml.models import ForecastResult
 from service.ml.neural_forecaster import NeuralProphetForecaster
 from service.ml.stats_forecaster import StatsForecastForecaster
@@ -80,13 +81,16 @@ class EnsembleForecaster(BaseForecaster):
         if not self.models:
             raise RuntimeError("No models available for ensemble forecasting")
 
-        # Get predictions from all models concurrently
+        # Get predictions from all models concurrently, reusing cached single-model forecasts
+        cache = get_forecast_cache()
         tasks = []
         active_models = []
 
         for model_name, model in self.models.items():
             if self.weights[model_name] > 0:
-                task = asyncio.create_task(model.predict(prices, horizon))
+                task = asyncio.create_task(
+                    cache.get_or_compute(model_name, horizon, prices, lambda m=model: m.predict(prices, horizon))
+                )
                 tasks.append(task)
                 active_models.append(model_name)
 
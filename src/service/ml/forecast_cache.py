@@ -0,0 +1,327 @@
+"""
+Forecast Cache.
+
+Forecasts depend only on the model, the horizon and the closes the model
+actually reads (the last ``MLDefaults.CONTEXT_LENGTH`` prices), so the
+trend analyzer, the investor advisor, the ML prediction job, the AI job
+and the API/MCP routes asking for the same latest candles share one
+computation:
+
+- Key: (model, horizon, fingerprint of the last N closes). A new or
+  updated candle changes the fingerprint, so entries never go stale in
+  content; the TTL only bounds how long unused entries are kept
+- Per-interval TTL (one candle length)
+- Single-flight: concurrent identical requests await one model run
+- LRU bound on the number of entries
+- Optional on-disk persistence (JSON), loaded lazily and saved on shutdown
+
+Cached results are copied on the way in and out, so callers may fill in
+symbol/interval or mutate the lists freely.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from core.constants import MLDefaults
+from service.ml.models import ForecastResult
+
+logger = logging.getLogger(__name__)
+
+# Seconds an entry is kept per candle interval
+FORECAST_TTL: dict[str, float] = {
+    "15m": 15 * 60,
+    "1h": 3600,
+    "4h": 4 * 3600,
+    "1d": 24 * 3600,
+}
+# Used when the caller does not know the interval (ensemble sub-models)
+DEFAULT_TTL = min(FORECAST_TTL.values())
+MAX_ENTRIES = 512
+
+CacheKey = tuple[str, int, str]
+
+
+def fingerprint(prices: list[float], length: int = MLDefaults.CONTEXT_LENGTH) -> str:
+    """Hash of the last ``length`` closes as float64."""
+    tail = np.asarray(prices[-length:], dtype=np.float64)
+    return hashlib.blake2b(tail.tobytes(), digest_size=16).hexdigest()
+
+
+def _copy_result(result: ForecastResult) -> ForecastResult:
+    return replace(
+        result,
+        predictions=list(result.predictions),
+        confidence_low=list(result.confidence_low),
+        confidence_high=list(result.confidence_high),
+    )
+
+
+def _result_to_json(result: ForecastResult) -> dict[str, Any]:
+    return {
+        "model": result.model,
+        "predictions": [float(p) for p in result.predictions],
+        "confidence_low": [float(p) for p in result.confidence_low],
+        "confidence_high": [float(p) for p in result.confidence_high],
+        "direction": result.direction,
+        "confidence_pct": float(result.confidence_pct),
+        "timestamp": result.timestamp.isoformat(),
+        "horizon": result.horizon,
+    }
+
+
+def _result_from_json(data: dict[str, Any]) -> ForecastResult:
+    return ForecastResult(
+        symbol="",
+        interval="",
+        model=data["model"],
+        predictions=data["predictions"],
+        confidence_low=data["confidence_low"],
+        confidence_high=data["confidence_high"],
+        direction=data["direction"],
+        confidence_pct=data["confidence_pct"],
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+        horizon=data["horizon"],
+    )
+
+
+@dataclass
+class ForecastCacheEntry:
+    """Cached forecast."""
+
+    result: ForecastResult
+    expires_at: float
+
+
+@dataclass
+class ForecastCacheStats:
+    """Forecast cache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    shared: int = 0  # Requests that awaited an identical in-flight run
+    errors: int = 0
+    evictions: int = 0
+    compute_seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        total = self.hits + self.shared + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "errors": self.errors,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.shared) / total, 3) if total else None,
+            "avg_compute_ms": round(self.compute_seconds / self.misses * 1000, 1) if self.misses else None,
+        }
+
+
+class ForecastCache:
+    """TTL + LRU cache of forecasts keyed by model, horizon and data fingerprint."""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_entries: int = MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            path: JSON file for persistence (None disables it)
+            max_entries: Entries kept at most (least recently used are evicted)
+            clock: Wall clock; persisted expiry times must survive restarts
+        """
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[CacheKey, ForecastCacheEntry] = OrderedDict()
+        self._inflight: dict[CacheKey, asyncio.Future] = {}
+        self._loaded = self.path is None
+        self.stats = ForecastCacheStats()
+
+    @staticmethod
+    def make_key(model: str, horizon: int, prices: list[float]) -> CacheKey:
+        """Build the cache key of a forecast request."""
+        return (model, horizon, fingerprint(prices))
+
+    def get(self, key: CacheKey) -> ForecastResult | None:
+        """Get a fresh cached forecast (copy) or None."""
+        self._ensure_loaded()
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._clock() >= entry.expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return _copy_result(entry.result)
+
+    def put(self, key: CacheKey, result: ForecastResult, interval: str | None = None) -> None:
+        """Store a forecast for one candle length of ``interval``."""
+        ttl = FORECAST_TTL.get(interval or "", DEFAULT_TTL)
+        self._entries[key] = ForecastCacheEntry(_copy_result(result), self._clock() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def get_or_compute(
+        self,
+        model: str,
+        horizon: int,
+        prices: list[float],
+        compute: Callable[[], Awaitable[ForecastResult]],
+        interval: str | None = None,
+    ) -> ForecastResult:
+        """
+        Get a cached forecast or compute it once for all concurrent callers.
+
+        Args:
+            model: Model identifier
+            horizon: Candles predicted
+            prices: Closes passed to the model
+            compute: Coroutine function running the model
+            interval: Candle interval (selects the TTL)
+
+        Returns:
+            ForecastResult copy owned by the caller
+
+        Raises:
+            Whatever compute raised (failures are never cached)
+        """
+        key = self.make_key(model, horizon, prices)
+        cached = self.get(key)
+        if cached is not None:
+            self.stats.hits += 1
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats.shared += 1
+            return _copy_result(await asyncio.shield(inflight))
+
+        self.stats.misses += 1
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        started = time.perf_counter()
+        try:
+            result = await compute()
+        except BaseException as e:
+            self._inflight.pop(key, None)
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                self.stats.errors += 1
+                future.set_exception(e)
+                # Waiters re-raise it; keep asyncio from warning when there are none
+                future.exception()
+            raise
+        finally:
+            self.stats.compute_seconds += time.perf_counter() - started
+
+        self._inflight.pop(key, None)
+        self.put(key, result, interval)
+        future.set_result(result)
+        return _copy_result(result)
+
+    def invalidate(self, model: str | None = None) -> int:
+        """Drop cached forecasts of a model (or all)."""
+        keys = [k for k in self._entries if model is None or k[0] == model]
+        for k in keys:
+            del self._entries[k]
+        return len(keys)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            if self.path is None or not self.path.exists():
+                return
+            now = self._clock()
+            data = json.loads(self.path.read_text())
+            for item in data.get("entries", []):
+                if item["expires_at"] <= now:
+                    continue
+                key = (item["model"], item["horizon"], item["fingerprint"])
+                self._entries[key] = ForecastCacheEntry(_result_from_json(item["result"]), item["expires_at"])
+            logger.info(f"Loaded {len(self._entries)} cached forecasts from {self.path}")
+        except Exception as e:
+            logger.warning(f"Failed to load forecast cache {self.path}: {e}")
+
+    def save(self) -> int:
+        """
+        Persist unexpired entries (no-op without a path).
+
+        Returns:
+            Number of entries written
+        """
+        if self.path is None or not self._loaded:
+            return 0
+        now = self._clock()
+        entries = [
+            {
+                "model": model,
+                "horizon": horizon,
+                "fingerprint": digest,
+                "expires_at": entry.expires_at,
+                "result": _result_to_json(entry.result),
+            }
+            for (model, horizon, digest), entry in self._entries.items()
+            if entry.expires_at > now
+        ]
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"entries": entries}))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save forecast cache {self.path}: {e}")
+            return 0
+        return len(entries)
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "max_entries": self.max_entries,
+            "persistent": self.path is not None,
+            **self.stats.to_dict(),
+        }
+
+
+# Global instance
+_forecast_cache: ForecastCache | None = None
+
+
+def get_forecast_cache() -> ForecastCache:
+    """Get global forecast cache instance."""
+    global _forecast_cache
+    if _forecast_cache is None:
+        from core.config import settings
+
+        _forecast_cache = ForecastCache(settings.ML_FORECAST_CACHE_PATH or None)
+    return _forecast_cache
+
+
+def close_forecast_cache() -> None:
+    """Persist the global forecast cache (application shutdown)."""
+    if _forecast_cache is not None:
+        saved = _forecast_cache.save()
+        if saved:
+            logger.info(f"Saved {saved} cached forecasts")
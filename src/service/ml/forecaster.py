@@ -8,6 +8,7 @@ from core.constants import MLDefaults, MLModels
 from service.ml.base import BaseForecaster
 from service.ml.chronos_forecaster import ChronosBoltForecaster
 from service.ml.ensemble_forecaster import EnsembleForecaster
+from service.ml.forecast_cache import get_forecast_cache
 from service.ml.models import ForecastResult
 from service.ml.neural_forecaster import NeuralProphetForecaster
 from service.ml.stats_forecaster import StatsForecastForecaster
@@ -117,9 +118,11 @@ class PriceForecaster:
         if model not in MLModels.ALL + [MLModels.ENSEMBLE]:
             raise ValueError(f"Unknown model: {model}")
 
-        # Get model and generate forecast
+        # Get model and generate forecast (shared with identical recent requests)
         forecaster = self._get_model(model)
-        result = await forecaster.predict(prices, horizon)
+        result = await get_forecast_cache().get_or_compute(
+            model, horizon, prices, lambda: forecaster.predict(prices, horizon), interval
+        )
 
         # Fill metadata
         result.symbol = symbol
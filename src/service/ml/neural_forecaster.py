@@ -5,21 +5,19 @@ NeuralProphet Forecaster - Facebook's neural forecasting model.
 import logging
 from datetime import datetime
 
-try:
-    import numpy as np
-    import pandas as pd
-    from neuralprophet import NeuralProphet
-
-    NEURALPROPHET_AVAILABLE = True
-except ImportError:
-    NEURALPROPHET_AVAILABLE = False
-
 from core.constants import MLDefaults
+from core.lazy_import import lazy_import, module_available
 from service.ml.base import BaseForecaster
 from service.ml.models import ForecastResult
 
 logger = logging.getLogger(__name__)
 
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+neuralprophet = lazy_import("neuralprophet")
+
+NEURALPROPHET_AVAILABLE = module_available("numpy", "pandas", "neuralprophet")
+
 
 class NeuralProphetForecaster(BaseForecaster):
     """Price forecaster using NeuralProphet model."""
@@ -53,7 +51,7 @@ class NeuralProphetForecaster(BaseForecaster):
 
         try:
             # Create fresh model for each prediction to avoid "already fitted" errors
-            self.model = NeuralProphet(
+            self.model = neuralprophet.NeuralProphet(
                 growth="linear",
                 yearly_seasonality=False,
                 weekly_seasonality=True,
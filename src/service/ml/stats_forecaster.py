@@ -5,22 +5,20 @@ StatsForecast Forecaster - Statistical models like AutoARIMA.
 import logging
 from datetime import datetime
 
-try:
-    import numpy as np
-    import pandas as pd
-    from statsforecast import StatsForecast
-    from statsforecast.models import AutoARIMA
-
-    STATSFORCEAST_AVAILABLE = True
-except ImportError:
-    STATSFORCEAST_AVAILABLE = False
-
 from core.constants import MLDefaults
+from core.lazy_import import lazy_import, module_available
 from service.ml.base import BaseForecaster
 from service.ml.models import ForecastResult
 
 logger = logging.getLogger(__name__)
 
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+statsforecast = lazy_import("statsforecast")
+statsforecast_models = lazy_import("statsforecast.models")
+
+STATSFORCEAST_AVAILABLE = module_available("numpy", "pandas", "statsforecast")
+
 
 class StatsForecastForecaster(BaseForecaster):
     """Price forecaster using StatsForecast AutoARIMA model."""
@@ -36,8 +34,8 @@ class StatsForecastForecaster(BaseForecaster):
     def _initialize_model(self) -> None:
         """Initialize the forecasting model."""
         try:
-            self.model = StatsForecast(
-                models=[AutoARIMA(season_length=24)],  # Daily seasonality for hourly data
+            self.model = statsforecast.StatsForecast(
+                models=[statsforecast_models.AutoARIMA(season_length=24)],  # Daily seasonality for hourly data
                 freq=1,  # Frequency of observations
             )
             logger.info("StatsForecast AutoARIMA initialized")
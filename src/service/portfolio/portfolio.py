@@ -20,12 +20,11 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
-import httpx
+from service.analysis.coin_markets import get_coin_market_loader
+from service.candlestick.price_book import get_price_book
 
 logger = logging.getLogger(__name__)
 
-COINGECKO_API = "https://api.coingecko.com/api/v3"
-
 
 class PerformanceStatus(Enum):
     """Portfolio performance status."""
@@ -175,7 +174,6 @@ class PortfolioManager:
     """
 
     def __init__(self, timeout: float = 30.0):
-        self._client: httpx.AsyncClient | None = None
         self._timeout = timeout
         self._holdings: dict[str, Holding] = {}
         self._load_from_env()
@@ -216,20 +214,8 @@ class PortfolioManager:
                 except Exception as e:
                     logger.warning(f"Failed to parse {key}: {e}")
 
-    async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(
-                timeout=self._timeout,
-                headers={"Accept": "application/json"},
-            )
-        return self._client
-
     async def close(self) -> None:
-        """Close HTTP client."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """Release resources (prices come from the shared market snapshot)."""
 
     def add_holding(self, symbol: str, amount: float, avg_price: float) -> Holding:
         """Add or update a holding."""
@@ -270,10 +256,8 @@ class PortfolioManager:
         if not self._holdings:
             return self._create_empty_result()
 
-        client = await self._get_client()
-
         # Fetch current prices
-        prices = await self._fetch_prices(client, list(self._holdings.keys()))
+        prices = await self._fetch_prices(list(self._holdings.keys()))
 
         # Update holdings with current prices
         total_value = 0
@@ -321,56 +305,28 @@ class PortfolioManager:
             worst_performer=worst,
         )
 
-    async def _fetch_prices(self, client: httpx.AsyncClient, symbols: list[str]) -> dict[str, dict]:
-        """Fetch current prices from CoinGecko."""
-        # Map symbols to CoinGecko IDs
-        symbol_to_id = {
-            "BTC": "bitcoin",
-            "ETH": "ethereum",
-            "SOL": "solana",
-            "XRP": "ripple",
-            "ADA": "cardano",
-            "DOGE": "dogecoin",
-            "DOT": "polkadot",
-            "LINK": "chainlink",
-            "AVAX": "avalanche-2",
-            "MATIC": "polygon",
-            "UNI": "uniswap",
-            "ATOM": "cosmos",
-            "LTC": "litecoin",
-            "TON": "the-open-network",
-            "AR": "arweave",
-        }
+    async def _fetch_prices(self, symbols: list[str]) -> dict[str, dict]:
+        """
+        Fetch current prices.
 
-        ids = [symbol_to_id.get(s, s.lower()) for s in symbols]
-        ids_str = ",".join(ids)
-
-        try:
-            url = f"{COINGECKO_API}/simple/price"
-            params = {
-                "ids": ids_str,
-                "vs_currencies": "usd",
-                "include_24hr_change": "true",
-            }
-
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            result = {}
-            for symbol in symbols:
-                cg_id = symbol_to_id.get(symbol, symbol.lower())
-                if cg_id in data:
-                    result[symbol] = {
-                        "price": data[cg_id].get("usd", 0),
-                        "change_24h": data[cg_id].get("usd_24h_change", 0),
-                    }
-
-            return result
-
-        except Exception as e:
-            logger.warning(f"Failed to fetch prices: {e}")
-            return {}
+        Streamed symbols are read from the live price book; the CoinGecko
+        snapshot covers the rest and the 24h change while the book's window
+        is still shorter than a day.
+        """
+        quotes = get_price_book().get_many(symbols)
+        pending = [s for s in symbols if s not in quotes or not quotes[s].is_full_day]
+        markets = await get_coin_market_loader().get_markets(pending) if pending else {}
+
+        prices = {}
+        for symbol in symbols:
+            quote = quotes.get(symbol)
+            market = markets.get(symbol)
+            if quote is not None:
+                change = quote.change_24h_pct if quote.is_full_day or market is None else market.change_24h_pct
+                prices[symbol] = {"price": quote.price, "change_24h": change}
+            elif market is not None and market.price > 0:
+                prices[symbol] = {"price": market.price, "change_24h": market.change_24h_pct}
+        return prices
 
     def _calculate_status(self, pnl_pct: float) -> tuple[PerformanceStatus, str]:
         """Calculate performance status."""
@@ -20,7 +20,7 @@ import numpy as np
 from scipy import stats
 
 from core.constants import DEFAULT_SYMBOLS
-from service.candlestick import CandleInterval, fetch_candlesticks
+from service.candlestick import CandleInterval, read_candlesticks
 from service.ha_integration import get_supervisor_client
 
 logger = logging.getLogger(__name__)
@@ -248,7 +248,7 @@ class SmartCorrelationEngine:
             # Добавляем /USDT если не указана пара
             pair = symbol if "/" in symbol else f"{symbol}/USDT"
             
-            candles = await fetch_candlesticks(symbol=pair, interval=CandleInterval(timeframe), limit=limit)
+            candles = await read_candlesticks(symbol=pair, interval=CandleInterval(timeframe), limit=limit)
 
             if len(candles) < 20:  # Minimum data requirement
                 return None
@@ -17,7 +17,7 @@ from scipy import stats
 from service.analysis.technical import TechnicalAnalyzer
 
 from core.constants import DEFAULT_SYMBOLS
-from service.candlestick import CandleInterval, fetch_candlesticks
+from service.candlestick import CandleInterval, read_candlesticks
 from service.ml.forecaster import PriceForecaster
 from service.ml.models import ForecastResult
 
@@ -163,7 +163,7 @@ class AITrendAnalyzer:
 
         try:
             # Fetch historical data
-            candles = await fetch_candlesticks(
+            candles = await read_candlesticks(
                 symbol=symbol,
                 interval=CandleInterval(interval),
                 limit=min(lookback_days * 24, 1000),  # Cap at 1000 candles
@@ -822,58 +822,6 @@ class TestHelperFunctionsИнтеграция:
             assert result is True
             mock_client.send_persistent_notification.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_notify_sync_complete_без_ошибок(self):
-        """notify_sync_complete форматирует сообщение об успешной синхронизации."""
-        from service.ha_integration import notify_sync_complete
-
-        with patch("service.ha_integration.notify", new_callable=AsyncMock, return_value=True) as mock_notify:
-            result = await notify_sync_complete(
-                success_count=100,
-                failure_count=0,
-                duration_seconds=45.5,
-            )
-
-            assert result is True
-            call_args = mock_notify.call_args
-            message = call_args.kwargs["message"]
-            assert "completed" in message
-            assert "100/100" in message
-
-    @pytest.mark.asyncio
-    async def test_notify_sync_complete_с_ошибками(self):
-        """notify_sync_complete корректно отображает ошибки."""
-        from service.ha_integration import notify_sync_complete
-
-        with patch("service.ha_integration.notify", new_callable=AsyncMock, return_value=True) as mock_notify:
-            result = await notify_sync_complete(
-                success_count=95,
-                failure_count=5,
-                duration_seconds=60.0,
-            )
-
-            assert result is True
-            message = mock_notify.call_args.kwargs["message"]
-            assert "with errors" in message
-            assert "95/100" in message
-            assert "5" in message
-
-    @pytest.mark.asyncio
-    async def test_notify_error_с_контекстом(self):
-        """notify_error включает контекст в сообщение."""
-        from service.ha_integration import notify_error
-
-        with patch("service.ha_integration.notify", new_callable=AsyncMock, return_value=True) as mock_notify:
-            result = await notify_error(
-                error_message="Connection timeout",
-                context="Binance API fetch",
-            )
-
-            assert result is True
-            message = mock_notify.call_args.kwargs["message"]
-            assert "Connection timeout" in message
-            assert "Binance API fetch" in message
-
 
 # =============================================================================
 # Тесты глобального состояния и синглтонов
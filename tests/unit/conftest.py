@@ -276,6 +276,62 @@ def signal_model_factory(faker: Faker):
     return _create
 
 
+# =============================================================================
+# IN-MEMORY DATABASE & CLOCK
+# =============================================================================
+
+@pytest.fixture
+async def sqlite_db(monkeypatch):
+    """
+    Фабрика in-memory SQLite БД с таблицами заданных моделей.
+
+    БД подменяет engine и async_session_maker в models.session, записи
+    run_write идут напрямую, без очереди писателя.
+
+    Usage:
+        maker = await sqlite_db(CandlestickRecord, CandleRowCount)
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from models import session as db
+    from models import writer
+    from models.base import Base
+
+    engines = []
+
+    async def create(*models):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        engines.append(engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[model.__table__ for model in models])
+
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(db, "engine", engine)
+        monkeypatch.setattr(db, "async_session_maker", maker)
+        monkeypatch.setattr(writer, "get_write_queue", lambda: None)
+        return maker
+
+    yield create
+    for engine in engines:
+        await engine.dispose()
+
+
+class FakeClock:
+    """Управляемые часы: clock() возвращает clock.now."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Управляемые часы для тестов TTL, лимитов и кэшей."""
+    return FakeClock()
+
+
 # =============================================================================
 # VALIDATION HELPERS
 # =============================================================================
@@ -0,0 +1,283 @@
+"""
+AI Service Tests - Тесты AI-сервиса.
+
+Тестирует:
+- Кэширование доступности провайдера и circuit breaker
+- Кэш ответов: повторный промпт не тарифицируется
+- Потоковую генерацию с ранним обновлением сенсора
+- Ограничение параллельных запросов
+- ai_analysis_job на общем сервисе и его закрытие
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+def make_provider(name: str = "fake", available: bool = True, fail: bool = False, delay: float = 0.0):
+    from service.ai.providers import AIProvider, AIResponse
+
+    class FakeProvider(AIProvider):
+        def __init__(self):
+            self.available = available
+            self.fail = fail
+            self.probes = 0
+            self.calls = 0
+            self.active = 0
+            self.peak = 0
+
+        @property
+        def name(self) -> str:
+            return name
+
+        async def is_available(self) -> bool:
+            self.probes += 1
+            return self.available
+
+        async def generate(self, prompt, system=None, temperature=0.7, max_tokens=2000):
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                await asyncio.sleep(delay)
+                if self.fail:
+                    raise httpx.ConnectError("connection refused")
+                return AIResponse(content=f"{name}: {prompt}", model="m", provider=name, tokens_used=10)
+            finally:
+                self.active -= 1
+
+    return FakeProvider()
+
+
+class TestProviderHealth:
+    """Кэш доступности и circuit breaker."""
+
+    async def test_probe_is_cached_for_health_ttl(self, clock):
+        """Успешная проверка доверяется HEALTH_TTL, затем провайдер проверяется снова."""
+        from service.ai.providers import HEALTH_TTL, AIService
+
+        provider = make_provider()
+        service = AIService([provider], clock=clock)
+
+        for i in range(3):
+            assert await service.generate(f"q{i}", use_cache=False)
+        assert provider.probes == 1 and provider.calls == 3
+
+        clock.now += HEALTH_TTL + 1
+        await service.generate("q", use_cache=False)
+        assert provider.probes == 2
+
+    async def test_circuit_opens_and_falls_back(self, clock):
+        """Ошибка открывает цепь с растущей паузой, запросы уходят на резервный провайдер."""
+        from service.ai.providers import BREAKER_BASE_COOLDOWN, AIService
+
+        primary = make_provider("primary", fail=True)
+        backup = make_provider("backup")
+        service = AIService([primary, backup], clock=clock)
+
+        response = await service.generate("q1", use_cache=False)
+        assert response.provider == "backup" and primary.calls == 1
+
+        # Пока цепь открыта, основной провайдер не проверяется и не вызывается
+        await service.generate("q2", use_cache=False)
+        assert primary.calls == 1 and primary.probes == 1
+        assert service.get_stats()["providers"][0]["state"] == "open"
+
+        # Полуоткрытое состояние: одна проверка, повторная ошибка удваивает паузу
+        clock.now += BREAKER_BASE_COOLDOWN + 1
+        await service.generate("q3", use_cache=False)
+        assert primary.probes == 2 and primary.calls == 2
+        assert service.get_stats()["providers"][0]["retry_in_s"] == pytest.approx(2 * BREAKER_BASE_COOLDOWN)
+
+        # После восстановления цепь закрывается
+        primary.fail = False
+        clock.now += 2 * BREAKER_BASE_COOLDOWN + 1
+        assert (await service.generate("q4", use_cache=False)).provider == "primary"
+        assert service.get_stats()["providers"][0]["state"] == "healthy"
+
+    async def test_unavailable_provider_is_not_reprobed(self, clock):
+        """Недоступный провайдер не проверяется на каждом запросе."""
+        from service.ai.providers import AIService
+
+        provider = make_provider(available=False)
+        service = AIService([provider], clock=clock)
+
+        assert not await service.is_available()
+        assert await service.generate("q") is None
+        assert provider.probes == 1 and service.stats.skipped_open == 1
+
+
+class TestResponseCache:
+    """Кэш ответов."""
+
+    async def test_identical_prompt_is_served_from_cache(self, clock):
+        """Тот же промпт с теми же параметрами не вызывает провайдера повторно."""
+        from service.ai.providers import RESPONSE_CACHE_TTL, AIService
+
+        provider = make_provider()
+        service = AIService([provider], clock=clock)
+
+        first = await service.generate("ctx", system="s", max_tokens=500)
+        second = await service.generate("ctx", system="s", max_tokens=500)
+        assert provider.calls == 1
+        assert second.content == first.content and second.cached and not first.cached
+
+        await service.generate("ctx", system="s", max_tokens=200)
+        await service.generate("ctx", system="s", max_tokens=500, use_cache=False)
+        assert provider.calls == 3
+
+        clock.now += RESPONSE_CACHE_TTL + 1
+        await service.generate("ctx", system="s", max_tokens=200)
+        assert provider.calls == 4
+        assert service.get_stats()["cache_hits"] == 1
+
+
+class TestStreaming:
+    """Потоковая генерация."""
+
+    async def test_partial_text_reported_once(self):
+        """Колбэк получает текст, как только набралось STREAM_PARTIAL_CHARS символов."""
+        from service.ai.providers import STREAM_PARTIAL_CHARS, AIService, OllamaProvider
+
+        lines = [f'{{"response": "{"x" * 50}", "done": false}}' for _ in range(10)]
+        lines.append('{"response": "", "done": true, "eval_count": 42}')
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/api/generate"
+            return httpx.Response(200, text="\n".join(lines))
+
+        provider = OllamaProvider(host="http://ollama")
+        provider._client = httpx.AsyncClient(base_url="http://ollama", transport=httpx.MockTransport(handler))
+        service = AIService([provider])
+        service._record_success(provider)
+
+        partials = []
+
+        async def on_partial(text):
+            partials.append(text)
+
+        response = await service.generate("q", on_partial=on_partial)
+        await service.close()
+
+        assert [len(p) for p in partials] == [(STREAM_PARTIAL_CHARS // 50 + 1) * 50]
+        assert response.content == "x" * 500 and response.tokens_used == 42
+
+    async def test_openai_sse_stream(self):
+        """OpenAI: события SSE собираются в ответ, usage берётся из последнего чанка."""
+        from service.ai.providers import OpenAIProvider
+
+        events = [
+            'data: {"choices": [{"delta": {"content": "Hel"}}]}',
+            "",
+            'data: {"choices": [{"delta": {"content": "lo"}, "finish_reason": "stop"}]}',
+            'data: {"choices": [], "usage": {"prompt_tokens": 5, "total_tokens": 7}}',
+            "data: [DONE]",
+        ]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, text="\n".join(events))
+
+        provider = OpenAIProvider(api_key="k")
+        provider._client = httpx.AsyncClient(base_url="http://openai", transport=httpx.MockTransport(handler))
+
+        final = {}
+        chunks = [chunk async for chunk in provider.stream("q", final=final)]
+        await provider.close()
+
+        assert chunks == ["Hel", "lo"]
+        assert final == {"finish_reason": "stop", "tokens_used": 7, "prompt_tokens": 5}
+
+
+class TestConcurrency:
+    """Ограничение параллельных запросов."""
+
+    async def test_semaphore_bounds_provider_calls(self):
+        """Одновременно к провайдеру уходит не больше max_concurrency запросов."""
+        from service.ai.providers import AIService
+
+        provider = make_provider(delay=0.01)
+        service = AIService([provider], max_concurrency=2)
+
+        responses = await asyncio.gather(*(service.generate(f"q{i}") for i in range(6)))
+
+        assert all(responses)
+        assert provider.calls == 6 and provider.peak == 2
+
+
+class TestAIAnalysisJob:
+    """ai_analysis_job на общем сервисе."""
+
+    async def test_job_streams_summary_and_runs_prompts_concurrently(self, monkeypatch):
+        """Сводка публикуется частично и целиком, сентимент берётся из отдельного промпта."""
+        from core.config import settings
+        from core.scheduler import jobs
+        from service.ai import analyzer as analyzer_module
+        from service.ai import providers
+        from service.ai.providers import AIProvider, AIService
+
+        class StreamingProvider(AIProvider):
+            name = "fake"
+            model = "m"
+
+            async def is_available(self):
+                return True
+
+            async def generate(self, prompt, system=None, temperature=0.7, max_tokens=2000):
+                raise AssertionError("sentiment only")
+
+            async def stream(self, prompt, system=None, temperature=0.7, max_tokens=2000, final=None):
+                for _ in range(6):
+                    yield "Bitcoin holds support. " * 3
+                yield "Recommendation: BUY"
+
+        class SentimentProvider(StreamingProvider):
+            async def generate(self, prompt, system=None, temperature=0.7, max_tokens=2000):
+                from service.ai.providers import AIResponse
+
+                return AIResponse(content="Sentiment: Bearish", model="m", provider="fake")
+
+        service = AIService([SentimentProvider()])
+        monkeypatch.setattr(providers, "_ai_service", service)
+        monkeypatch.setattr(analyzer_module, "_market_analyzer", analyzer_module.MarketAnalyzer(service))
+        monkeypatch.setattr(settings, "AI_ENABLED", True)
+
+        sensors = MagicMock()
+        sensors.publish_sensor = AsyncMock()
+        sensors.update_ai_trend_sensors = AsyncMock()
+
+        with (
+            patch("core.scheduler.jobs.get_currency_list_async", new_callable=AsyncMock, return_value=[]),
+            patch("service.analysis.market_facts.get_fear_greed", new_callable=AsyncMock, return_value=None),
+            patch(
+                "service.analysis.market_facts.get_derivatives", new_callable=AsyncMock, side_effect=ConnectionError()
+            ),
+            patch("service.ha.get_sensors_manager", return_value=sensors),
+            patch("service.ha_integration.notify", new_callable=AsyncMock),
+        ):
+            await jobs.ai_analysis_job()
+
+        summaries = [c.args[1] for c in sensors.publish_sensor.call_args_list if c.args[0] == "ai_daily_summary"]
+        published = {c.args[0]: c.args[1] for c in sensors.publish_sensor.call_args_list}
+
+        assert len(summaries) == 2 and "Recommendation" not in summaries[0]
+        assert published["ai_market_sentiment"] == "Bearish"
+        assert published["ai_provider"] == "fake/m"
+        assert service.stats.streamed == 1 and service.stats.provider_calls == 2
+
+    async def test_shared_service_closed_on_shutdown(self, monkeypatch):
+        """close_ai_service закрывает провайдеры общего сервиса и сбрасывает его."""
+        from service.ai import providers
+        from service.ai.providers import AIService, close_ai_service
+
+        provider = make_provider()
+        provider.close = AsyncMock()
+        monkeypatch.setattr(providers, "_ai_service", AIService([provider]))
+
+        await close_ai_service()
+
+        provider.close.assert_awaited_once()
+        assert providers._ai_service is None
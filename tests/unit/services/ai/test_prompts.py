@@ -0,0 +1,140 @@
+"""
+AI Prompt Tests - Тесты сжатия контекста промптов.
+
+Тестирует:
+- Оценку числа токенов
+- Плотный контекст и отбрасывание малозначимых полей по бюджету
+- Общий системный префикс для всех типов промптов
+- Статистику токенов и задержки по каждому промпту
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+def make_market_data(**overrides):
+    from service.ai.prompts import MarketData
+
+    values = dict(
+        btc_price=97500.0,
+        eth_price=3400.0,
+        btc_change_24h=1.25,
+        eth_change_24h=-0.5,
+        fear_greed=25,
+        fear_greed_label="Extreme Fear",
+        btc_dominance=54.1,
+        altseason_index=30,
+        btc_rsi=45.2,
+        eth_rsi=50.1,
+        btc_trend="uptrend",
+        btc_support=95000.0,
+        btc_resistance=100000.0,
+        volatility_30d=3.1,
+        volatility_status="normal",
+        exchange_flow="Bullish",
+        whale_activity="accumulating",
+        next_macro_event="CPI in 2 days",
+        days_to_fomc=10,
+        portfolio_value=12345.67,
+        portfolio_pnl_24h=1.2,
+    )
+    values.update(overrides)
+    return MarketData(**values)
+
+
+class TestContextCompaction:
+    """Плотный контекст под бюджет токенов."""
+
+    def test_estimate_tokens(self):
+        """ASCII ~4 символа на токен, кириллица ~2."""
+        from service.ai.prompts import estimate_tokens
+
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("a" * 40) == 10
+        assert estimate_tokens("б" * 40) == 20
+
+    def test_compact_context_is_smaller_and_complete(self):
+        """При большом бюджете все поля попадают в контекст, который короче прежнего."""
+        from service.ai.prompts import build_context, estimate_tokens
+
+        data = make_market_data()
+        context = build_context(data, budget=1000)
+
+        assert context.dropped == []
+        assert context.tokens < estimate_tokens(data.to_context()) / 2
+        for text in ("BTC 97500 +1.25%", "F&G 25 Extreme Fear", "S/R 95000/100000", "whales accumulating"):
+            assert text in context.text
+
+    def test_budget_drops_least_salient_fields(self):
+        """Под бюджетом отбрасываются наименее значимые поля, цены и F&G остаются всегда."""
+        from service.ai.prompts import build_context
+
+        data = make_market_data()
+        context = build_context(data, budget=40)
+
+        assert context.tokens <= 40
+        assert context.dropped[:3] == ["whales", "eth_rsi", "altseason"]
+        assert "RSI BTC 45.2" in context.text
+
+        minimal = build_context(data, budget=1)
+        assert minimal.text == "MARKET BTC 97500 +1.25% | F&G 25 Extreme Fear | ETH 3400 -0.50%"
+        assert minimal.tokens > minimal.budget
+
+
+class TestSharedPrefix:
+    """Общий системный префикс."""
+
+    async def test_all_prompts_share_system_prompt(self):
+        """Все типы промптов отправляют одинаковый системный промпт с контекстом."""
+        from service.ai.analyzer import MarketAnalyzer
+        from service.ai.providers import AIProvider, AIResponse, AIService
+
+        class RecordingProvider(AIProvider):
+            name = "fake"
+
+            def __init__(self):
+                self.requests = []
+
+            async def is_available(self):
+                return True
+
+            async def generate(self, prompt, system=None, temperature=0.7, max_tokens=2000):
+                self.requests.append((system, prompt))
+                return AIResponse(content="Neutral, hold", model="m", provider="fake", tokens_used=20)
+
+        provider = RecordingProvider()
+        service = AIService([provider])
+        analyzer = MarketAnalyzer(service, context_budget=60)
+        data = make_market_data()
+
+        await analyzer.generate_daily_summary(data)
+        await analyzer.generate_weekly_report(data)
+        await analyzer.analyze_opportunity("ETH", data)
+        await analyzer.get_dca_recommendation(data, base_amount=50)
+        await analyzer.assess_risk(data, {"BTC": 60.0})
+        await analyzer.get_sentiment(data, language="ru")
+
+        systems = {system for system, _ in provider.requests}
+        assert len(provider.requests) == 6 and len(systems) == 1
+        assert analyzer.last_context.text in systems.pop()
+        assert all("MARKET" not in prompt for _, prompt in provider.requests)
+
+        stats = service.get_stats()["prompts"]
+        assert set(stats) == {
+            "daily_summary",
+            "weekly_report",
+            "opportunity",
+            "dca_recommendation",
+            "risk_assessment",
+            "sentiment",
+        }
+        daily = stats["daily_summary"]
+        assert daily["calls"] == 1 and daily["avg_tokens_used"] == 20
+        assert daily["avg_prompt_tokens"] > analyzer.last_context.tokens
+        assert daily["last_latency_s"] is not None
+
+        # Повтор из кэша учитывается отдельно и не меняет средние
+        await analyzer.generate_daily_summary(data)
+        assert service.get_stats()["prompts"]["daily_summary"]["cache_hits"] == 1
+        assert service.get_stats()["prompts"]["daily_summary"]["calls"] == 1
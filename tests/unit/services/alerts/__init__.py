@@ -0,0 +1 @@
+"""Unit tests for alert and notification services."""
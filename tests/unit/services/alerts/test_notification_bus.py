@@ -0,0 +1,199 @@
+"""
+Notification Bus Tests - Тесты шины уведомлений.
+
+Тестирует:
+- Окно дедупликации по категории
+- Лимит частоты по категории (критические не ограничиваются)
+- Объединение алертов в дайджест и немедленную доставку критических
+- publish_error: формат ошибки и дедупликация повторов (ежеминутная синхронизация)
+- AdaptiveNotificationsManager: одна пакетная загрузка свечей и публикация в шину
+"""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+class Sender:
+    """Записывает отправленные уведомления."""
+
+    def __init__(self, ok: bool = True):
+        self.ok = ok
+        self.sent: list[tuple[str, str, str | None]] = []
+
+    async def __call__(self, message: str, title: str, notification_id: str | None) -> bool:
+        self.sent.append((message, title, notification_id))
+        return self.ok
+
+
+def make_bus(clock, sender=None, digest_seconds: float = 0.05, policies=None):
+    from service.alerts.notification_bus import NotificationBus
+
+    return NotificationBus(
+        sender=sender or Sender(),
+        digest_seconds=digest_seconds,
+        policies=policies,
+        clock=clock,
+    )
+
+
+class TestAdmission:
+    """Дедупликация и лимиты."""
+
+    async def test_dedup_window_per_category(self, clock):
+        """Повтор темы в окне отбрасывается, после окна и в другой категории - принимается."""
+        from service.alerts.notification_bus import CategoryPolicy
+        from service.alerts.notification_manager import AlertCategory
+
+        bus = make_bus(clock, policies={AlertCategory.WHALE: CategoryPolicy(dedup_seconds=600, max_per_hour=10)})
+
+        assert await bus.publish("a", "Whales", "whale_high_activity", AlertCategory.WHALE)
+        assert not await bus.publish("b", "Whales", "whale_high_activity", AlertCategory.WHALE)
+        assert await bus.publish("b", "Whales", "whale_high_activity", AlertCategory.RISK)
+        # Без id ключ - заголовок и текст
+        assert await bus.publish("same", "T", None, AlertCategory.WHALE)
+        assert not await bus.publish("same", "T", None, AlertCategory.WHALE)
+
+        clock.now += 601
+        assert await bus.publish("c", "Whales", "whale_high_activity", AlertCategory.WHALE)
+        assert bus.stats.deduplicated == 2 and bus.stats.published == 4
+        await bus.close()
+
+    async def test_rate_limit_exempts_critical(self, clock):
+        """Сверх лимита категория молчит, критические проходят, через час лимит сбрасывается."""
+        from service.alerts.notification_bus import CategoryPolicy
+        from service.alerts.notification_manager import AlertCategory, AlertPriority
+
+        bus = make_bus(clock, policies={AlertCategory.PRICE: CategoryPolicy(dedup_seconds=0, max_per_hour=2)})
+
+        results = [await bus.publish(f"m{i}", "Price", f"p{i}", AlertCategory.PRICE) for i in range(4)]
+        assert results == [True, True, False, False]
+        assert await bus.publish("crash", "Price", "crash", AlertCategory.PRICE, AlertPriority.CRITICAL)
+
+        clock.now += 3600
+        assert await bus.publish("m9", "Price", "p9", AlertCategory.PRICE)
+        assert bus.stats.rate_limited == 2
+        await bus.close()
+
+
+class TestDelivery:
+    """Пакетная доставка одним воркером."""
+
+    async def test_batch_becomes_one_digest(self, clock):
+        """Алерты в окне уходят одним уведомлением, сгруппированным по категориям."""
+        from service.alerts.notification_manager import AlertCategory
+
+        sender = Sender()
+        bus = make_bus(clock, sender=sender)
+        await bus.publish("Whales buying", "🐋 Whales", "whale", AlertCategory.WHALE)
+        await bus.publish("Arb 1.2%", "💰 Arbitrage", "arb", AlertCategory.OPPORTUNITY)
+        await bus.publish("Flags", "🚨 Risk", "risk", AlertCategory.RISK)
+        await bus.drain()
+
+        assert len(sender.sent) == 1
+        message, title, notification_id = sender.sent[0]
+        assert title.endswith("(3)") and notification_id.startswith("crypto_inspect_digest")
+        assert message.index("Risk Alert") < message.index("Opportunity") < message.index("Whale Activity")
+        assert "Arb 1.2%" in message
+        assert bus.stats.deliveries == 1 and bus.stats.delivered == 3 and bus.stats.digests == 1
+        await bus.close()
+
+    async def test_single_alert_and_critical_sent_as_is(self, clock):
+        """Одиночный алерт уходит как есть; критический - сразу, не дожидаясь окна."""
+        from service.alerts.notification_manager import AlertCategory, AlertPriority
+
+        sender = Sender()
+        bus = make_bus(clock, sender=sender, digest_seconds=0.2)
+        await bus.publish("Slow", "Info", "fomc_reminder", AlertCategory.INFO)
+        await bus.publish("Now", "Crash", "crash", AlertCategory.RISK, AlertPriority.CRITICAL)
+        await bus.drain()
+
+        assert sender.sent == [("Now", "Crash", "crash"), ("Slow", "Info", "fomc_reminder")]
+        await bus.close()
+
+    async def test_failed_delivery_counted(self, clock):
+        """Неудачная отправка учитывается и не останавливает воркер."""
+        from service.alerts.notification_manager import AlertCategory
+
+        bus = make_bus(clock, sender=Sender(ok=False))
+        await bus.publish("x", "X", "x", AlertCategory.SYSTEM)
+        await bus.drain()
+        await bus.publish("y", "Y", "y", AlertCategory.SYSTEM)
+        await bus.drain()
+
+        assert bus.stats.failed == 2 and bus.stats.deliveries == 0
+        await bus.close()
+
+    async def test_publish_error_deduplicates_repeats(self, clock, monkeypatch):
+        """Повторная ошибка с тем же id в окне SYSTEM не доставляется второй раз."""
+        from service.alerts import notification_bus
+        from service.alerts.notification_bus import publish_error
+
+        sender = Sender()
+        bus = make_bus(clock, sender=sender)
+        monkeypatch.setattr(notification_bus, "_notification_bus", bus)
+
+        assert await publish_error("2 fetch operations failed", "Sync job", notification_id="sync_error")
+        assert not await publish_error("3 fetch operations failed", "Sync job", notification_id="sync_error")
+        assert await publish_error("Connection failed")
+        await bus.drain()
+
+        messages = sorted(m for m, _, _ in sender.sent)
+        assert len(messages) == 1  # оба алерта ушли одним дайджестом
+        assert "❌ Error: 2 fetch operations failed\n📍 Context: Sync job" in messages[0]
+        assert "❌ Error: Connection failed" in messages[0]
+        assert bus.stats.deduplicated == 1
+        await bus.close()
+
+
+def make_candles(closes: list[float]):
+    from service.candlestick.models import Candlestick
+
+    return [
+        Candlestick(
+            timestamp=1_700_000_000_000 + i * 3_600_000,
+            open_price=Decimal(str(c)),
+            high_price=Decimal(str(c * 1.01)),
+            low_price=Decimal(str(c * 0.99)),
+            close_price=Decimal(str(c)),
+            volume=Decimal("10"),
+        )
+        for i, c in enumerate(closes)
+    ]
+
+
+class TestAdaptiveNotifications:
+    """Адаптивные уведомления поверх шины."""
+
+    async def test_profiles_read_once_per_symbol_and_published(self):
+        """Свечи каждого символа читаются один раз, сработавшие правила публикуются в шину."""
+        from service import adaptive_notifications as module
+
+        manager = module.AdaptiveNotificationsManager()
+        await manager.initialize_default_rules()
+
+        series = {
+            "BTC/USDT": [100.0] * 47 + [110.0],  # +10% за час
+            "ETH/USDT": [100.0] * 48,
+        }
+        reads = []
+
+        async def read(symbol, interval, limit):
+            reads.append((symbol, interval.value, limit))
+            return make_candles(series[symbol])
+
+        with (
+            patch.object(module, "read_candlesticks", side_effect=read),
+            patch.object(module, "publish_notification", new_callable=AsyncMock, return_value=True) as publish,
+        ):
+            sent = await manager.check_and_send_notifications()
+
+        assert sorted(reads) == [("BTC/USDT", "1h", 48), ("ETH/USDT", "1h", 48)]
+        assert manager.volatility_profiles["BTC/USDT"].price_change_1h == pytest.approx(10.0)
+        assert {n["rule_name"] for n in sent} == {"significant_price_jump", "major_price_move"}
+
+        priorities = {c.kwargs["notification_id"]: c.kwargs["priority"].value for c in publish.call_args_list}
+        assert priorities == {"adaptive_significant_price_jump": "important", "adaptive_major_price_move": "critical"}
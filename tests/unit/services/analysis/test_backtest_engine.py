@@ -0,0 +1,253 @@
+"""
+Backtest Engine Tests - Тесты векторизованного движка бэктестов.
+
+Тестирует:
+- Совпадение векторных результатов с пошаговой симуляцией
+- Smart DCA с историей Fear & Greed
+- Сетку параметров (sweep)
+- Кэширование по версии данных
+"""
+
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+def make_candles(days: int = 800, seed: int = 7) -> list[dict]:
+    """Синтетические дневные свечи (полдень UTC), от старых к новым."""
+    import random
+
+    rng = random.Random(seed)
+    today = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+    price = 20000.0
+    candles = []
+    for i in range(days):
+        price *= 1 + rng.uniform(-0.04, 0.045)
+        date = today - timedelta(days=days - 1 - i)
+        candles.append({"timestamp": int(date.timestamp() * 1000), "close": price})
+    return candles
+
+
+def reference_dca(candles: list[dict], amount: float, interval: int, years: int, multiplier=None) -> dict:
+    """Пошаговая симуляция DCA (прежняя реализация) для сверки."""
+    start = datetime.now() - timedelta(days=years * 365)
+    filtered = [c for c in candles if datetime.fromtimestamp(c["timestamp"] / 1000) >= start]
+
+    invested = coins = 0.0
+    buys = 0
+    values = []
+    for i, candle in enumerate(filtered):
+        if i % interval == 0:
+            buys += 1
+            spend = amount * (multiplier(candle) if multiplier else 1.0)
+            coins += spend / candle["close"]
+            invested += spend
+        values.append(coins * candle["close"])
+
+    peak, max_dd = values[0], 0.0
+    for value in values:
+        peak = max(peak, value)
+        if peak > 0:
+            max_dd = max(max_dd, (peak - value) / peak * 100)
+
+    returns = [(values[i] - values[i - 1]) / values[i - 1] for i in range(1, len(values)) if values[i - 1] > 0]
+    mean = sum(returns) / len(returns)
+    std = (sum((r - mean) ** 2 for r in returns) / len(returns)) ** 0.5
+    sharpe = (mean - 0.04 / 365) / std * math.sqrt(365)
+
+    value = coins * filtered[-1]["close"]
+    return {
+        "invested": invested,
+        "coins": coins,
+        "value": value,
+        "return": (value - invested) / invested * 100,
+        "max_dd": max_dd,
+        "sharpe": sharpe,
+        "buys": buys,
+    }
+
+
+class TestVectorizedStrategies:
+    """Сверка векторных стратегий с пошаговой симуляцией."""
+
+    @pytest.mark.parametrize("frequency,interval", [("daily", 1), ("weekly", 7), ("monthly", 30)])
+    async def test_fixed_dca_matches_reference(self, frequency, interval):
+        """Fixed DCA совпадает с пошаговым расчётом."""
+        from service.analysis.backtest import DCABacktester
+
+        candles = make_candles()
+        result = await DCABacktester().backtest_fixed_dca("BTC/USDT", candles, 100.0, frequency, years=2)
+        ref = reference_dca(candles, 100.0, interval, years=2)
+
+        assert result.total_invested == pytest.approx(ref["invested"])
+        assert result.total_coins == pytest.approx(ref["coins"])
+        assert result.current_value == pytest.approx(ref["value"])
+        assert result.total_return_pct == pytest.approx(ref["return"])
+        assert result.max_drawdown == pytest.approx(ref["max_dd"])
+        assert result.sharpe_ratio == pytest.approx(ref["sharpe"])
+        # 730 или 731 свеча в окне - зависит от времени суток относительно полудня
+        assert result.buy_count == ref["buys"] >= math.ceil(730 / interval)
+        assert len(result.trades) == min(10, result.buy_count)
+
+    async def test_smart_dca_uses_fear_greed_history(self):
+        """Smart DCA применяет множитель F&G дня покупки."""
+        from service.analysis.backtest import DCABacktester
+
+        candles = make_candles()
+        history = []
+        for i, candle in enumerate(candles):
+            date = datetime.fromtimestamp(candle["timestamp"] / 1000)
+            history.append({"date": date, "value": (i * 13) % 100})
+        fg_by_day = {h["date"].date(): h["value"] for h in history}
+
+        backtester = DCABacktester()
+        backtester.set_fear_greed_history(history)
+        result = await backtester.backtest_smart_dca("BTC/USDT", candles, 100.0, years=2)
+
+        def multiplier(candle):
+            day = datetime.fromtimestamp(candle["timestamp"] / 1000).date()
+            return backtester._get_fg_multiplier(fg_by_day[day])
+
+        ref = reference_dca(candles, 100.0, 7, years=2, multiplier=multiplier)
+        assert result.total_invested == pytest.approx(ref["invested"])
+        assert result.total_return_pct == pytest.approx(ref["return"])
+        assert result.max_drawdown == pytest.approx(ref["max_dd"])
+
+        last = result.trades[-1]
+        assert last["multiplier"] == backtester._get_fg_multiplier(last["fear_greed"])
+        assert last["amount"] == pytest.approx(100.0 * last["multiplier"])
+
+    async def test_smart_dca_without_history_equals_fixed(self):
+        """Без истории F&G (нейтрально) Smart DCA совпадает с Fixed DCA."""
+        from service.analysis.backtest import DCABacktester
+
+        candles = make_candles()
+        backtester = DCABacktester()
+        fixed = await backtester.backtest_fixed_dca("BTC/USDT", candles, 100.0, "weekly", years=2)
+        smart = await backtester.backtest_smart_dca("BTC/USDT", candles, 100.0, years=2)
+
+        assert smart.total_return_pct == pytest.approx(fixed.total_return_pct)
+        assert smart.best_month == fixed.best_month
+
+    async def test_lump_sum(self):
+        """Lump Sum покупает всё в первый день периода."""
+        from service.analysis.backtest import DCABacktester
+
+        candles = make_candles()
+        result = await DCABacktester().backtest_lump_sum("BTC/USDT", candles, 10000.0, years=1)
+
+        first = next(c for c in candles if c["timestamp"] >= (datetime.now() - timedelta(days=365)).timestamp() * 1000)
+        assert result.avg_buy_price == pytest.approx(first["close"])
+        assert result.current_value == pytest.approx(10000.0 / first["close"] * candles[-1]["close"])
+        assert result.buy_count == 1
+
+    async def test_compare_strategies_single_pass(self):
+        """Сравнение возвращает все три стратегии и лучшую из них."""
+        from service.analysis.backtest import DCABacktester
+
+        backtester = DCABacktester()
+        comparison = await backtester.compare_strategies("BTC/USDT", make_candles(), 100.0, years=2)
+
+        strategies = comparison["strategies"]
+        assert set(strategies) == {"fixed_dca", "smart_dca", "lump_sum"}
+        best = max(strategies, key=lambda name: strategies[name]["total_return_pct"])
+        assert comparison["best_strategy"] == best
+        assert strategies["lump_sum"]["total_invested"] == pytest.approx(100.0 * 52 * 2)
+        assert backtester.get_cached_result("BTC/USDT") is not None
+
+    async def test_empty_candles_raise(self):
+        """Пустые данные вызывают ValueError."""
+        from service.analysis.backtest import DCABacktester
+
+        with pytest.raises(ValueError):
+            await DCABacktester().backtest_fixed_dca("BTC/USDT", [], 100.0)
+
+
+class TestSweep:
+    """Тесты сетки параметров."""
+
+    async def test_sweep_matches_single_backtests(self):
+        """Строки сетки совпадают с отдельными бэктестами."""
+        from service.analysis.backtest import DCABacktester
+        from service.analysis.backtest_engine import PriceSeries
+
+        candles = make_candles()
+        backtester = DCABacktester()
+        start_ms = int((datetime.now() - timedelta(days=730)).timestamp() * 1000)
+        series = PriceSeries.from_candles("BTC/USDT", candles).since(start_ms)
+
+        sweep = backtester.sweep(series, [50.0, 200.0], ["daily", "weekly"], ["none", "standard"], years=2)
+        assert sweep["scenarios"] == 8
+        returns = [row["total_return_pct"] for row in sweep["results"]]
+        assert returns == sorted(returns, reverse=True)
+
+        fixed = await backtester.backtest_fixed_dca("BTC/USDT", candles, 200.0, "weekly", years=2)
+        row = next(
+            r for r in sweep["results"] if (r["amount"], r["frequency"], r["fg_scheme"]) == (200.0, "weekly", "none")
+        )
+        assert row["total_invested"] == pytest.approx(fixed.total_invested, abs=0.01)
+        assert row["total_return_pct"] == pytest.approx(fixed.total_return_pct, abs=0.01)
+        assert row["max_drawdown"] == pytest.approx(fixed.max_drawdown, abs=0.01)
+
+    def test_sweep_rejects_unknown_scheme(self):
+        """Неизвестная схема множителей вызывает ValueError."""
+        from service.analysis.backtest import DCABacktester
+        from service.analysis.backtest_engine import PriceSeries
+
+        series = PriceSeries.from_candles("BTC/USDT", make_candles(60))
+        with pytest.raises(ValueError):
+            DCABacktester().sweep(series, [100.0], ["weekly"], ["yolo"])
+
+
+class TestBacktestEngineCache:
+    """Тесты кэширования по версии данных."""
+
+    async def test_series_and_results_cached_by_version(self, monkeypatch):
+        """Серия и результаты перечитываются только при смене версии данных."""
+        from service.analysis import backtest_engine
+        from service.analysis.backtest import DCABacktester
+        from service.analysis.backtest_engine import BacktestEngine, PriceSeries
+
+        candles = make_candles()
+        state = {"version": "v1", "loads": 0}
+
+        async def fake_version(symbol):
+            return state["version"]
+
+        async def fake_load(symbol, version=""):
+            state["loads"] += 1
+            return PriceSeries.from_candles(symbol, candles, version)
+
+        engine = BacktestEngine()
+        monkeypatch.setattr(backtest_engine, "get_data_version", fake_version)
+        monkeypatch.setattr(backtest_engine, "load_daily_closes", fake_load)
+        monkeypatch.setattr("service.analysis.backtest.get_backtest_engine", lambda: engine)
+
+        backtester = DCABacktester()
+        first = await backtester.compare_stored("BTC/USDT", 100.0, 2)
+        second = await backtester.compare_stored("BTC/USDT", 100.0, 2)
+        assert first == second
+        assert state["loads"] == 1
+        assert engine.get_stats()["hits"] == 1
+
+        state["version"] = "v2"
+        await backtester.compare_stored("BTC/USDT", 100.0, 2)
+        assert state["loads"] == 2
+        assert engine.get_stats()["misses"] == 2
+
+    async def test_no_stored_data(self, monkeypatch):
+        """Без сохранённых свечей возвращается None."""
+        from service.analysis import backtest_engine
+        from service.analysis.backtest import DCABacktester
+        from service.analysis.backtest_engine import BacktestEngine
+
+        async def fake_version(symbol):
+            return None
+
+        monkeypatch.setattr(backtest_engine, "get_data_version", fake_version)
+        monkeypatch.setattr("service.analysis.backtest.get_backtest_engine", lambda: BacktestEngine())
+
+        assert await DCABacktester().compare_stored("BTC/USDT") is None
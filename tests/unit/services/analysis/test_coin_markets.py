@@ -0,0 +1,137 @@
+"""
+Coin Markets Tests - Тесты пакетной загрузки рыночных данных CoinGecko.
+
+Тестирует:
+- Один запрос /coins/markets на все отслеживаемые монеты
+- Чтение DCA, profit taking и портфеля из общего снимка
+- Кэш истории market_chart
+- Сохранение уже загруженных страниц при 429
+"""
+
+import httpx
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+def market_row(coin_id: str, price: float) -> dict:
+    return {
+        "id": coin_id,
+        "current_price": price,
+        "high_24h": price * 1.1,
+        "low_24h": price * 0.9,
+        "price_change_percentage_24h": 2.5,
+        "ath": price * 2,
+        "market_cap": price * 1000,
+        "total_volume": price * 10,
+    }
+
+
+PRICES = {"bitcoin": 60000.0, "ethereum": 3000.0, "solana": 150.0, "ripple": 0.5}
+
+
+@pytest.fixture
+def requests_log(monkeypatch):
+    """Глобальный загрузчик поверх шлюза с MockTransport."""
+    from core.http_gateway import HttpGateway
+    from service.analysis import coin_markets
+
+    log = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        log.append(request.url)
+        if request.url.path.endswith("/coins/markets"):
+            ids = request.url.params["ids"].split(",")
+            return httpx.Response(200, json=[market_row(i, PRICES[i]) for i in ids if i in PRICES])
+        return httpx.Response(200, json={"prices": [[0, 1.0], [1, 2.0], [2, 3.0]]})
+
+    gateway = HttpGateway()
+    transport = httpx.MockTransport(handler)
+    gateway._pool = lambda host: httpx.AsyncClient(transport=transport)
+
+    loader = coin_markets.CoinMarketLoader()
+    loader._client = gateway.client()
+    monkeypatch.setattr(coin_markets, "_coin_market_loader", loader)
+    return log
+
+
+class TestCoinMarketLoader:
+    """Тесты загрузчика."""
+
+    async def test_multi_symbol_single_request(self, requests_log):
+        """Анализ нескольких символов делает один запрос /coins/markets."""
+        from service.analysis.dca import DCACalculator
+        from service.analysis.profit_taking import ProfitTakingAdvisor
+
+        dca = await DCACalculator().get_multi_symbol(["BTC", "ETH", "SOL", "XRP"])
+        profit = await ProfitTakingAdvisor().get_multi_symbol(["BTC", "ETH"])
+
+        assert len(requests_log) == 1
+        assert set(requests_log[0].params["ids"].split(",")) == set(PRICES)
+        assert dca["ETH"].current_price == 3000.0
+        assert profit["BTC"].current_price == 60000.0
+        assert profit["BTC"].swing_high == pytest.approx(66000.0)
+
+    async def test_portfolio_reads_snapshot(self, requests_log):
+        """Портфель получает цены и изменение за 24ч из снимка."""
+        from service.portfolio.portfolio import PortfolioManager
+
+        manager = PortfolioManager()
+        manager._holdings.clear()
+        manager.add_holding("BTC", 0.5, 50000.0)
+        manager.add_holding("UNKNOWN", 1.0, 10.0)
+        data = await manager.calculate()
+
+        holdings = {h.symbol: h for h in data.holdings}
+        assert holdings["BTC"].current_price == 60000.0
+        assert holdings["BTC"].change_24h_pct == 2.5
+        assert holdings["UNKNOWN"].current_price == 10.0  # нет данных - цена покупки
+        assert len(requests_log) == 1
+
+        # Отсутствующая у CoinGecko монета не вызывает повторных запросов
+        await manager.calculate()
+        assert len(requests_log) == 1
+
+    async def test_history_cached(self, requests_log):
+        """История market_chart запрашивается один раз на монету."""
+        from service.analysis.coin_markets import get_coin_market_loader
+
+        loader = get_coin_market_loader()
+        first = await loader.get_histories(["BTC", "ETH"], 90)
+        second = await loader.get_histories(["BTC", "bitcoin", "ETH"], 90)
+
+        assert first["BTC"] == [1.0, 2.0, 3.0]
+        assert second["bitcoin"] == [1.0, 2.0, 3.0]
+        assert len(requests_log) == 2
+        assert loader.get_stats()["history_hits"] == 3
+
+    async def test_rate_limited_page_keeps_fetched_pages(self, monkeypatch):
+        """429 на второй странице не выбрасывает первую и не сбрасывает таймстамп снимка."""
+        from core.http_gateway import HttpGateway
+        from service.analysis import coin_markets
+
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url)
+            if len(calls) > 1:
+                return httpx.Response(429)
+            ids = request.url.params["ids"].split(",")
+            return httpx.Response(200, json=[market_row(i, PRICES[i]) for i in ids])
+
+        gateway = HttpGateway()
+        transport = httpx.MockTransport(handler)
+        gateway._pool = lambda host: httpx.AsyncClient(transport=transport)
+        monkeypatch.setattr(coin_markets, "PAGE_SIZE", 2)
+
+        loader = coin_markets.CoinMarketLoader()
+        loader._client = gateway.client()
+        loader.track(["bitcoin", "ethereum", "ripple", "solana"])
+
+        assert await loader.refresh() == 2
+        assert len(calls) == 2
+        assert loader.stats.errors == 1 and loader.stats.missing == []
+
+        markets = await loader.get_markets(["bitcoin", "ethereum"])
+        assert markets["ethereum"].price == 3000.0
+        assert len(calls) == 2  # снимок свежий - повторного запроса нет
@@ -0,0 +1,146 @@
+"""
+Market Fact Store Tests - Тесты общего TTL-кэша рыночных данных.
+
+Тестирует:
+- TTL и попадания в кэш
+- Single-flight для конкурентных запросов и отмену ведущего
+- Stale-while-revalidate
+- Счётчики hit/miss
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+@pytest.fixture
+def store(clock):
+    from service.analysis.market_facts import MarketFactStore
+
+    return MarketFactStore(clock=clock)
+
+
+class TestMarketFactStore:
+    """Тесты для MarketFactStore."""
+
+    async def test_hit_within_ttl(self, store):
+        """Повторный запрос в пределах TTL не вызывает загрузчик."""
+        from service.analysis.market_facts import FactSpec
+
+        loader = AsyncMock(return_value=42)
+        store.register(FactSpec("fg", loader, ttl=60))
+
+        assert await store.get("fg") == 42
+        assert await store.get("fg") == 42
+        assert loader.await_count == 1
+
+        stats = store.get_stats()["fg"]
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    async def test_refresh_after_ttl(self, store, clock):
+        """После истечения TTL без stale-окна данные загружаются заново."""
+        from service.analysis.market_facts import FactSpec
+
+        loader = AsyncMock(side_effect=[1, 2])
+        store.register(FactSpec("fg", loader, ttl=60))
+
+        assert await store.get("fg") == 1
+        clock.now += 61
+        assert await store.get("fg") == 2
+
+    async def test_single_flight(self, store):
+        """Конкурентные запросы разделяют одну загрузку."""
+        from service.analysis.market_facts import FactSpec
+
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        store.register(FactSpec("fg", loader, ttl=60))
+        results = await asyncio.gather(*(store.get("fg") for _ in range(10)))
+
+        assert results == ["value"] * 10
+        assert calls == 1
+
+    async def test_cancelled_leader_does_not_cancel_waiters(self, store):
+        """Отмена ведущего запроса не отменяет ожидающих: один из них загружает заново."""
+        from service.analysis.market_facts import FactSpec
+
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return calls
+
+        store.register(FactSpec("fg", loader, ttl=60))
+        leader = asyncio.create_task(store.get("fg"))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(store.get("fg")) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await asyncio.gather(*waiters) == [2, 2, 2]
+        assert leader.cancelled()
+
+    async def test_stale_while_revalidate(self, store, clock):
+        """Устаревшее значение отдаётся сразу, обновление идёт в фоне."""
+        from service.analysis.market_facts import FactSpec
+
+        loader = AsyncMock(side_effect=["old", "new"])
+        store.register(FactSpec("fg", loader, ttl=60, max_stale=300))
+
+        assert await store.get("fg") == "old"
+        clock.now += 120
+        assert await store.get("fg") == "old"
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert await store.get("fg") == "new"
+        assert store.get_stats()["fg"]["stale_hits"] == 1
+
+    async def test_none_not_cached(self, store):
+        """Неудачная загрузка (None) не кэшируется."""
+        from service.analysis.market_facts import FactSpec
+
+        loader = AsyncMock(side_effect=[None, 7])
+        store.register(FactSpec("fg", loader, ttl=60))
+
+        assert await store.get("fg") is None
+        assert await store.get("fg") == 7
+
+    async def test_loader_error_counted(self, store):
+        """Исключение загрузчика учитывается и возвращает None."""
+        from service.analysis.market_facts import FactSpec
+
+        loader = AsyncMock(side_effect=RuntimeError("boom"))
+        store.register(FactSpec("fg", loader, ttl=60))
+
+        assert await store.get("fg") is None
+        assert store.get_stats()["fg"]["errors"] == 1
+
+    async def test_keyed_facts(self, store):
+        """Факты с ключом (символом) кэшируются раздельно."""
+        from service.analysis.market_facts import FactSpec
+
+        async def loader(symbol: str):
+            return f"deriv:{symbol}"
+
+        store.register(FactSpec("derivatives", loader, ttl=60))
+
+        assert await store.get("derivatives", "BTC") == "deriv:BTC"
+        assert await store.get("derivatives", "ETH") == "deriv:ETH"
+        assert store.get_stats()["derivatives"]["cached_keys"] == 2
+
+    async def test_unknown_fact(self, store):
+        """Незарегистрированный факт вызывает KeyError."""
+        with pytest.raises(KeyError):
+            await store.get("missing")
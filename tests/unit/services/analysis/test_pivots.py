@@ -0,0 +1,240 @@
+"""
+Pivot Index Tests - Тесты общего индекса точек разворота.
+
+Тестирует:
+- Линейный поиск пивотов против полного перебора (строгий и нестрогий)
+- Инкрементальное обновление = полной перестройке, замену формирующейся свечи
+- Обновление общего индекса из нескольких потоков (уровни, паттерны, дивергенции)
+- Поиск пар пивотов на близком уровне
+- Поведение потребителей: паттерны, уровни поддержки/сопротивления, дивергенции
+"""
+
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+HOUR_4 = 4 * 3600 * 1000
+
+
+def brute_pivots(data: list[float], window: int, kind: str, strict: bool) -> list[tuple[int, float]]:
+    """Прямой перебор окна вокруг каждого бара."""
+    result = []
+    for i in range(window, len(data) - window):
+        others = [data[j] for j in range(i - window, i + window + 1) if j != i]
+        if kind == "high":
+            ok = all(data[i] > o for o in others) if strict else all(data[i] >= o for o in others)
+        else:
+            ok = all(data[i] < o for o in others) if strict else all(data[i] <= o for o in others)
+        if ok:
+            result.append((i, data[i]))
+    return result
+
+
+def make_candles(count: int, seed: int = 1, start: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    candles = []
+    price = 100.0
+    for i in range(count):
+        price = max(1.0, price + rng.choice([-2, -1, 0, 1, 2]))
+        candles.append(
+            {
+                "timestamp": start + i * HOUR_4,
+                "open": price,
+                "high": price + rng.choice([0, 1, 2]),
+                "low": price - rng.choice([0, 1, 2]),
+                "close": price,
+                "volume": 1.0,
+            }
+        )
+    return candles
+
+
+class TestFindPivots:
+    """Тесты линейного примитива."""
+
+    @pytest.mark.parametrize("strict", [True, False])
+    @pytest.mark.parametrize("window", [1, 2, 5])
+    def test_matches_brute_force(self, strict, window):
+        """Результат на монотонной деке совпадает с перебором, включая равные значения."""
+        from service.analysis.pivots import find_pivots
+
+        rng = random.Random(window)
+        for _ in range(50):
+            data = [float(rng.randint(0, 6)) for _ in range(rng.randint(0, 60))]
+            for kind in ("high", "low"):
+                assert find_pivots(data, window, kind, strict) == brute_pivots(data, window, kind, strict)
+
+
+class TestPivotIndex:
+    """Тесты инкрементального индекса."""
+
+    def test_incremental_update_equals_rebuild(self):
+        """Скользящее окно свечей с перерисовкой последней даёт те же пивоты, что и полный расчёт."""
+        from service.analysis.pivots import PivotIndex
+
+        candles = make_candles(300)
+        index = PivotIndex(max_bars=120)
+        for end in range(100, 301):
+            window = [dict(c) for c in candles[end - 100 : end]]
+            # Последняя свеча ещё формируется: сначала приходит промежуточное значение
+            forming = dict(window[-1], high=window[-1]["high"] - 1)
+            index.update(window[:-1] + [forming])
+            assert index.update(window) == 1
+
+            start = len(index) - len(window)
+            highs = [c["high"] for c in window]
+            lows = [c["low"] for c in window]
+            assert [(i - start, v) for i, v in index.peaks(start)] == brute_pivots(highs, 2, "high", True)
+            assert [(i - start, v) for i, v in index.troughs(start)] == brute_pivots(lows, 2, "low", True)
+
+        assert index.rebuilds == 0
+        assert len(index) <= 240
+
+    def test_gap_and_missing_timestamps_rebuild(self):
+        """Несовпадающая история или свечи без времени перестраивают индекс."""
+        from service.analysis.pivots import PivotIndex
+
+        index = PivotIndex()
+        index.update(make_candles(50))
+        index.update(make_candles(50, start=10_000 * HOUR_4))
+        assert index.rebuilds == 1 and len(index) == 50
+
+        bare = [{"high": c["high"], "low": c["low"]} for c in make_candles(40)]
+        index.update(bare)
+        assert index.rebuilds == 2 and len(index) == 40
+
+    def test_concurrent_updates_from_threads(self):
+        """Параллельные обновления одного индекса из потоков дают те же пивоты, что и один поток."""
+        from service.analysis.pivots import PivotIndex
+
+        candles = make_candles(400)
+        shared = PivotIndex()
+
+        def scan(end: int) -> None:
+            with shared.lock:
+                shared.update(candles[end - 200 : end])
+                shared.peaks()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(scan, [end for end in range(200, 401) for _ in range(3)]))
+        shared.update(candles[200:])
+
+        start = len(shared) - 200
+        expected = PivotIndex.from_candles(candles[200:])
+        assert shared.peaks(start) == [(i + start, v) for i, v in expected.peaks()]
+        assert shared.troughs(start) == [(i + start, v) for i, v in expected.troughs()]
+
+    def test_similar_pairs_match_pairwise_check(self):
+        """Поиск пар по отсортированным значениям совпадает с попарной проверкой."""
+        from service.analysis.pivots import PivotIndex
+
+        for seed in range(20):
+            index = PivotIndex.from_candles(make_candles(200, seed=seed))
+            peaks = index.peaks()
+            expected = [
+                (a, b)
+                for k, a in enumerate(peaks)
+                for b in peaks[k + 1 :]
+                if abs(a[1] - b[1]) / a[1] < 0.02 and b[0] - a[0] >= 5
+            ]
+            assert index.similar_pairs("high", 0.02, 5) == expected
+            assert index.find_similar("high", 0.02, 5) == (expected[0] if expected else None)
+
+
+class TestConsumers:
+    """Потребители общего индекса."""
+
+    def test_double_pattern_and_levels_use_shared_index(self, monkeypatch):
+        """Двойная вершина и уровни совпадают с расчётом по одному окну."""
+        from service.analysis import patterns, pivots
+        from service.analysis.patterns import PatternDetector, PatternType
+        from service.analysis.technical import TechnicalAnalyzer
+
+        store = pivots.PivotStore()
+        monkeypatch.setattr(pivots, "_pivot_store", store)
+
+        candles = make_candles(60)
+        for i, high in ((40, 150.0), (50, 150.5)):
+            candles[i]["high"] = high
+
+        detector = PatternDetector()
+        found = [p.pattern_type for p in detector.detect_all("BTC", candles, "4h")]
+        assert PatternType.DOUBLE_TOP in found
+        assert detector._detect_double_pattern(candles[-30:]) == PatternType.DOUBLE_TOP
+
+        index = store.get("BTC", "4h")
+        assert len(index) == 60
+        assert patterns.get_pivot_store() is store
+
+        shared = TechnicalAnalyzer.find_support_resistance(candles, pivots=index)
+        local = TechnicalAnalyzer.find_support_resistance(candles)
+        assert shared == local
+        assert shared.resistance[0]["level"] == 150.25
+
+    def test_divergence_with_timestamps_matches_plain(self, monkeypatch):
+        """Дивергенции по общему индексу совпадают с расчётом по срезу цен."""
+        from service.analysis import pivots
+        from service.analysis.divergences import DivergenceDetector
+
+        monkeypatch.setattr(pivots, "_pivot_store", pivots.PivotStore())
+
+        rng = random.Random(3)
+        detector = DivergenceDetector()
+        candles = make_candles(200, seed=3)
+        indicator = [rng.uniform(20, 80) for _ in candles]
+
+        for end in range(60, 201, 7):
+            prices = [c["close"] for c in candles[end - 60 : end]]
+            timestamps = [c["timestamp"] for c in candles[end - 60 : end]]
+            values = indicator[end - 60 : end]
+
+            plain = detector.detect("ETH", prices, rsi_values=values, timeframe="4h")
+            shared = detector.detect("ETH", prices, rsi_values=values, timeframe="4h", timestamps=timestamps)
+            key = [(d.div_type, d.price_point1, d.price_point2, d.bars_apart) for d in plain]
+            assert [(d.div_type, d.price_point1, d.price_point2, d.bars_apart) for d in shared] == key
+
+    def test_patterns_and_divergences_from_threads(self, monkeypatch):
+        """Паттерны и дивергенции из параллельных потоков совпадают с расчётом без общего индекса."""
+        from service.analysis import pivots
+        from service.analysis.divergences import DivergenceDetector
+        from service.analysis.patterns import PatternDetector, PatternType
+
+        monkeypatch.setattr(pivots, "_pivot_store", pivots.PivotStore())
+        # Частое переключение потоков, чтобы пересечения сканов реально случались
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+        rng = random.Random(5)
+        candles = make_candles(300, seed=5)
+        indicator = [rng.uniform(20, 80) for _ in candles]
+
+        def divergence_key(divs):
+            return [(d.div_type, d.price_point1, d.price_point2, d.bars_apart) for d in divs]
+
+        def scan(end: int) -> None:
+            window = candles[end - 80 : end]
+            prices = [c["close"] for c in window]
+            values = indicator[end - 80 : end]
+            detector = DivergenceDetector()
+            shared = detector.detect(
+                "SOL", prices, rsi_values=values, timeframe="4h", timestamps=[c["timestamp"] for c in window]
+            )
+            plain = detector.detect("SOL", prices, rsi_values=values, timeframe="4h")
+            assert divergence_key(shared) == divergence_key(plain)
+
+            pattern = PatternDetector()
+            found = {p.pattern_type for p in pattern.detect_all("SOL", window, "4h")}
+            expected = pattern._detect_double_pattern(window[-30:])
+            doubles = found & {PatternType.DOUBLE_TOP, PatternType.DOUBLE_BOTTOM}
+            assert doubles == ({expected} if expected else set())
+
+        try:
+            ends = [rng.randint(80, 300) for _ in range(200)]
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(scan, ends))
+        finally:
+            sys.setswitchinterval(interval)
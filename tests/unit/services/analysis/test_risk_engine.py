@@ -0,0 +1,154 @@
+"""
+Risk Engine Tests - Тесты Monte Carlo движка рисков.
+
+Тестирует:
+- Просадку и время восстановления по путям
+- VaR/CVaR бутстрэпа и ковариационного метода
+- Учёт корреляции активов
+- Кэш результатов по версии данных
+- Сохранение дневных снимков портфеля
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+DAY_MS = 86_400_000
+
+
+def make_series(symbol: str, closes: np.ndarray, version: str = "v1"):
+    from service.analysis.backtest_engine import PriceSeries
+
+    timestamps = np.arange(len(closes), dtype=np.int64) * DAY_MS
+    return PriceSeries(symbol, timestamps, np.asarray(closes, dtype=np.float64), version)
+
+
+def random_closes(seed: int, days: int = 400, vol: float = 0.03) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.cumprod(1 + rng.normal(0.001, vol, days))
+
+
+@pytest.fixture
+async def session_maker(sqlite_db):
+    """In-memory SQLite с таблицей снимков портфеля."""
+    from models.portfolio_snapshot import PortfolioSnapshot
+
+    return await sqlite_db(PortfolioSnapshot)
+
+
+class TestSimulation:
+    """Тесты векторных примитивов."""
+
+    def test_drawdown_and_recovery(self):
+        """Максимальная просадка и дни до возврата к пику считаются по каждому пути."""
+        from service.analysis.risk_engine import path_statistics
+
+        daily = np.array(
+            [
+                [0.10, -0.20, 0.0, 0.25, 0.0],  # пик 1.1 -> 0.88, возврат на 3-й день после дна
+                [-0.50, 0.0, 0.0, 0.0, 0.0],  # не восстановился
+            ]
+        )
+        stats = path_statistics(daily)
+
+        assert stats["max_drawdown"] == pytest.approx([0.2, 0.5])
+        assert stats["recovery_days"].tolist() == [2, -1]
+        assert stats["terminal"] == pytest.approx([1.1 * 0.8 * 1.25 - 1, -0.5])
+
+    def test_var_matches_normal_and_methods_agree(self):
+        """Однодневный VaR совпадает с нормальным квантилем, методы согласованы."""
+        from service.analysis.risk_engine import SimulationMethod, run_simulation
+
+        rng = np.random.default_rng(3)
+        returns = rng.normal(0.0, 0.02, (5000, 2))
+        weights = np.array([0.5, 0.5])
+        sigma = float(np.sqrt(weights @ np.cov(returns, rowvar=False) @ weights))
+
+        cov = run_simulation(returns, weights, SimulationMethod.COVARIANCE, 100_000, 1, seed=1)
+        boot = run_simulation(returns, weights, SimulationMethod.BOOTSTRAP, 100_000, 1, seed=1)
+
+        assert cov["var_pct"]["95"] == pytest.approx(1.645 * sigma * 100, rel=0.03)
+        assert cov["cvar_pct"]["95"] == pytest.approx(2.063 * sigma * 100, rel=0.03)
+        assert boot["var_pct"]["95"] == pytest.approx(cov["var_pct"]["95"], rel=0.05)
+        assert cov["cvar_pct"]["99"] > cov["var_pct"]["99"] > cov["var_pct"]["95"]
+
+    def test_correlation_diversifies(self):
+        """Бутстрэп сохраняет корреляцию: противоположные активы гасят риск."""
+        from service.analysis.risk_engine import SimulationMethod, align_returns, run_simulation
+
+        base = np.random.default_rng(5).normal(0, 0.03, 300)
+        a = make_series("A/USDT", 100 * np.cumprod(1 + base))
+        b = make_series("B/USDT", 100 * np.cumprod(1 - base))
+        returns = align_returns([a, b])
+
+        hedged = run_simulation(returns, np.array([0.5, 0.5]), SimulationMethod.BOOTSTRAP, 10_000, 30)
+        single = run_simulation(returns, np.array([1.0, 0.0]), SimulationMethod.BOOTSTRAP, 10_000, 30)
+
+        assert hedged["var_pct"]["99"] < 0.5
+        assert single["var_pct"]["99"] > 10
+        assert single["drawdown_pct"]["p95"] > hedged["drawdown_pct"]["p95"]
+
+
+class TestRiskEngine:
+    """Тесты движка с кэшем и снимками."""
+
+    async def test_cached_until_data_version_changes(self, monkeypatch):
+        """Результат переиспользуется, пока не изменилась версия дневных свечей."""
+        from service.analysis import risk_engine
+
+        series = {
+            "BTC/USDT": make_series("BTC/USDT", random_closes(1)),
+            "ETH/USDT": make_series("ETH/USDT", random_closes(2)),
+        }
+
+        class Engine:
+            async def get_series(self, symbol):
+                return series.get(symbol)
+
+        monkeypatch.setattr(risk_engine, "get_backtest_engine", lambda: Engine())
+        engine = risk_engine.RiskEngine()
+        holdings = {"BTC": 6000.0, "ETH": 3000.0, "USDT": 1000.0, "NEW": 500.0}
+
+        first = await engine.simulate(holdings, horizon_days=30, paths=20_000)
+        assert first.weights == pytest.approx({"BTC": 2 / 3, "ETH": 1 / 3})
+        assert first.excluded == ["NEW", "USDT"]
+        assert first.history_days == 365
+        cached = await engine.simulate(holdings, horizon_days=30, paths=20_000)
+        assert cached.var_pct == first.var_pct and cached.calculated_at == first.calculated_at
+
+        # Same weights, doubled value: cached percentages, current USD figures
+        doubled = await engine.simulate({s: v * 2 for s, v in holdings.items()}, horizon_days=30, paths=20_000)
+        assert doubled.var_pct == first.var_pct
+        assert doubled.to_dict()["var_usd"]["95"] == pytest.approx(first.to_dict()["var_usd"]["95"] * 2, abs=0.02)
+
+        series["BTC/USDT"] = make_series("BTC/USDT", random_closes(1), version="v2")
+        second = await engine.simulate(holdings, horizon_days=30, paths=20_000)
+        assert second is not first
+        assert engine.get_stats()["hits"] == 2 and engine.get_stats()["misses"] == 2
+
+    async def test_snapshots_persist_daily_value(self, session_maker, monkeypatch):
+        """Снимки хранятся по дню (последнее значение дня) и подгружаются после рестарта."""
+        from models import session as db
+        from service.analysis.risk import RiskAnalyzer
+        from service.analysis.risk_engine import load_snapshots, save_snapshot
+
+        start = datetime.now(UTC) - timedelta(days=10)
+        async with session_maker() as session:
+            for day in range(10):
+                await save_snapshot(session, 1000.0 + day, {"BTC": 1000.0 + day}, start + timedelta(days=day))
+            # Повторная запись за тот же день заменяет значение
+            await save_snapshot(session, 2000.0, {"BTC": 2000.0}, start + timedelta(days=9, seconds=1))
+            snapshots = await load_snapshots(session)
+
+        assert len(snapshots) == 10
+        assert snapshots[-1]["value"] == 2000.0
+
+        monkeypatch.setattr(db, "async_session_maker", session_maker)
+        analyzer = RiskAnalyzer()
+        metrics = await analyzer.calculate_risk_metrics()
+
+        assert metrics.risk_status != "Unknown"
+        assert metrics.portfolio_value == 2000.0
@@ -0,0 +1,139 @@
+"""
+Scan Engine Tests - Тесты мультитаймфреймового сканера.
+
+Тестирует:
+- Один результат на каждую пару (символ, таймфрейм) и тайминги этапов
+- Совпадение дивергенций с прежним расчётом по префиксам
+- Ошибки чтения свечей не ломают остальные серии
+- Публикацию сенсоров divergence_job из отчёта сканера
+"""
+
+import random
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+def make_candles(interval: str, count: int = 201, seed: int = 0):
+    from service.candlestick.models import Candlestick
+    from service.candlestick.rollup import INTERVAL_MS
+
+    step = INTERVAL_MS[interval]
+    rng = random.Random(f"{seed}:{interval}")
+    candles = []
+    close = 100.0
+    for i in range(count):
+        # Случайное блуждание даёт свинги, дивергенции и паттерны
+        close *= 1 + rng.gauss(0, 0.02)
+        candles.append(
+            Candlestick(
+                timestamp=i * step,
+                open_price=Decimal(str(round(close - 0.5, 4))),
+                high_price=Decimal(str(round(close + 1, 4))),
+                low_price=Decimal(str(round(close - 1, 4))),
+                close_price=Decimal(str(round(close, 4))),
+                volume=Decimal("10"),
+            )
+        )
+    return candles
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Сканер на синтетических свечах и чистом хранилище пивотов."""
+    from service.analysis import pivots
+    from service.analysis.scanner import ScanEngine
+
+    monkeypatch.setattr(pivots, "_pivot_store", pivots.PivotStore())
+
+    async def read_candlesticks(symbol, interval, limit):
+        if symbol == "BAD/USDT" and interval.value == "1h":
+            raise ConnectionError("exchange down")
+        if symbol == "NEW/USDT":
+            return make_candles(interval.value, count=20)
+        return make_candles(interval.value, limit, seed=len(symbol.split("/")[0]))[-limit:]
+
+    monkeypatch.setattr("service.candlestick.read_candlesticks", read_candlesticks)
+    return ScanEngine(workers=2)
+
+
+class TestScanEngine:
+    """Тесты сканера."""
+
+    async def test_scans_every_symbol_and_timeframe(self, engine):
+        """Отчёт содержит все серии, тайминги этапов и ошибки отдельных серий."""
+        report = await engine.scan(["BTC", "ETH/USDT", "BAD", "NEW"])
+
+        assert len(report.results) == 12
+        assert report.timeframes == ["1h", "4h", "1d"]
+        assert set(report.by_timeframe("4h")) == {"BTC", "ETH", "BAD", "NEW"}
+        assert report.failed == ["BAD:1h", "NEW:1h", "NEW:4h", "NEW:1d"]
+        assert report.get("BAD", "1h").error == "exchange down"
+        assert report.get("NEW", "4h").error == "Insufficient data"
+
+        btc = report.get("BTC", "4h")
+        assert btc.ok and btc.candles == 201
+        assert btc.rsi is not None and btc.support is not None
+        assert set(btc.stage_seconds) == {"indicators", "divergences", "patterns", "levels"}
+
+        data = report.to_dict(include_results=False)
+        assert data["series"] == 12 and "results" not in data
+        assert set(data["timings_ms"]["stages"]) == {"indicators", "divergences", "patterns", "levels"}
+        assert engine.get_stats()["last"]["failed"] == report.failed
+
+    async def test_divergences_match_prefix_calculation(self, engine):
+        """Дивергенции сканера совпадают с прежним расчётом RSI/MACD по каждому префиксу."""
+        from service.analysis.divergences import DivergenceDetector
+        from service.analysis.technical import TechnicalAnalyzer
+
+        report = await engine.scan(["BTC"])
+
+        ta = TechnicalAnalyzer()
+        for timeframe in report.timeframes:
+            closes = [float(c.close_price) for c in make_candles(timeframe, seed=3)]
+            rsi = [ta.calc_rsi(closes[: i + 1]) for i in range(14, len(closes))]
+            macd = [ta.calc_macd(closes[: i + 1])[2] for i in range(35, len(closes))]
+            n = min(len(closes) - 35, len(rsi), len(macd))
+            expected = DivergenceDetector().detect("BTC", closes[-n:], rsi[-n:], macd[-n:], timeframe)
+
+            found = report.get("BTC", timeframe).divergences
+            key = [(d.indicator, d.div_type, d.price_point1, d.price_point2) for d in expected]
+            assert [(d.indicator, d.div_type, d.price_point1, d.price_point2) for d in found] == key
+
+        assert report.divergences
+
+
+class TestDivergenceJob:
+    """divergence_job на отчёте сканера."""
+
+    async def test_job_publishes_scan_results(self, engine, monkeypatch):
+        """Индикаторы берутся из 4h, MTF-тренды и дивергенции - со всех таймфреймов."""
+        from core.scheduler import jobs
+        from service.analysis import scanner
+
+        monkeypatch.setattr(scanner, "_scan_engine", engine)
+        sensors = MagicMock()
+        sensors.publish_sensor = AsyncMock()
+
+        with (
+            patch(
+                "core.scheduler.jobs.get_currency_list_async",
+                new_callable=AsyncMock,
+                return_value=["BTC/USDT", "NEW/USDT"],
+            ),
+            patch("service.ha.get_sensors_manager", return_value=sensors),
+            patch("service.ha_integration.notify", new_callable=AsyncMock),
+        ):
+            await jobs.divergence_job()
+
+        published = {call.args[0]: call.args[1] for call in sensors.publish_sensor.call_args_list}
+        btc = engine.last_report.get("BTC", "4h")
+
+        assert published["prices"] == {"BTC": btc.price}
+        assert published["ta_support"] == {"BTC": btc.support, "NEW": None}
+        assert published["ta_rsi"]["BTC"] == round(btc.rsi, 1)
+        assert set(published["ta_trend_mtf"]["BTC"]) == {"1h", "4h", "1d"}
+        assert published["divergences_active"] == len(engine.last_report.divergences)
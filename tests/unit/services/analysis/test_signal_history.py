@@ -0,0 +1,186 @@
+"""
+Signal History Tests - Тесты хранилища сигналов.
+
+Тестирует:
+- Сохранение сигналов в БД и чтение после перезапуска
+- Массовое разрешение исходов по свечам и по текущим ценам
+- Инкрементальную статистику против полного пересчёта
+"""
+
+import random
+import time
+from datetime import UTC, datetime
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+HOUR = 3_600_000
+DAY = 24 * HOUR
+
+
+@pytest.fixture
+async def session_maker(sqlite_db):
+    """In-memory SQLite с таблицами сигналов и свечей."""
+    from models.candlestick import CandlestickRecord
+    from models.signal import SignalRecord, SignalStatsRecord
+
+    return await sqlite_db(CandlestickRecord, SignalRecord, SignalStatsRecord)
+
+
+async def insert_candles(maker, symbol: str, closes: dict[int, float]) -> None:
+    from sqlalchemy import text
+
+    async with maker() as session:
+        await session.execute(
+            text("""
+                INSERT INTO candlestick_records
+                (exchange, symbol, interval, timestamp, open_price, high_price, low_price,
+                 close_price, volume, is_complete, loaded_at)
+                VALUES ('binance', :symbol, '1h', :ts, :close, :close, :close, :close, 1, 1, :loaded_at)
+            """),
+            [
+                {"symbol": f"{symbol}/USDT", "ts": ts, "close": close, "loaded_at": datetime.now(UTC)}
+                for ts, close in closes.items()
+            ],
+        )
+        await session.commit()
+
+
+async def add_signal(maker, symbol: str, signal_type: str, created_at: int, price: float, source: str = "pattern"):
+    from models.repositories.signals import SignalRepository
+
+    async with maker() as session:
+        return await SignalRepository(session).add(symbol, signal_type, source, created_at, price, 50, "", "")
+
+
+def recompute(records) -> dict:
+    """Полный пересчёт статистики по всем записям (прежний алгоритм)."""
+    done_24h = [r for r in records if r.outcome_24h != "pending"]
+    done_7d = [r for r in records if r.outcome_7d != "pending"]
+    by_source = {}
+    for source in {r.source for r in done_24h}:
+        group = [r for r in done_24h if r.source == source]
+        wins = sum(r.outcome_24h == "win" for r in group)
+        by_source[source] = {"count": len(group), "win_rate": round(wins / len(group) * 100, 1)}
+    return {
+        "total": len(records),
+        "win_rate_24h": sum(r.outcome_24h == "win" for r in done_24h) / len(done_24h) * 100 if done_24h else 0,
+        "win_rate_7d": sum(r.outcome_7d == "win" for r in done_7d) / len(done_7d) * 100 if done_7d else 0,
+        "avg_pnl_24h": sum(r.pnl_24h_pct for r in done_24h) / len(done_24h) if done_24h else 0,
+        "avg_pnl_7d": sum(r.pnl_7d_pct for r in done_7d) / len(done_7d) if done_7d else 0,
+        "best": max((r.pnl_7d_pct if r.pnl_7d_pct is not None else r.pnl_24h_pct) for r in done_24h + done_7d),
+        "by_source": by_source,
+    }
+
+
+class TestSignalStore:
+    """Сохранение и чтение сигналов."""
+
+    async def test_signals_survive_restart(self, session_maker):
+        """Сигналы читаются новым менеджером, фильтры и id работают."""
+        from service.analysis.signal_history import SignalHistoryManager, SignalOutcome, SignalSource
+
+        manager = SignalHistoryManager()
+        first = await manager.record_signal("btc", "buy", "divergence", 100.0, confidence=70)
+        await manager.record_signal("ETH/USDT", "sell", "pattern", 3000.0)
+        await manager.record_signal("BTC", "strong_buy", "pattern", 101.0)
+
+        restarted = SignalHistoryManager()
+        assert first.id == "sig_000001" and first.symbol == "BTC"
+        loaded = await restarted.get_signal("sig_000001")
+        assert loaded.confidence == 70 and loaded.outcome_24h == SignalOutcome.PENDING
+        assert await restarted.get_signal("bogus") is None
+
+        btc = await restarted.get_signals(symbol="btc/usdt")
+        assert [s.price_at_signal for s in btc] == [101.0, 100.0]
+        assert [s.symbol for s in await restarted.get_signals(source=SignalSource.PATTERN)] == ["BTC", "ETH"]
+
+        stats = await restarted.get_stats()
+        assert stats.total_signals == 3 and stats.signals_24h == 3
+        assert stats.win_rate_24h == 0 and stats.best_signal is None
+
+
+class TestOutcomeResolution:
+    """Массовое разрешение исходов."""
+
+    async def test_candles_and_price_fallback(self, session_maker):
+        """Цена через 24ч/7д берётся из свечи, без свечей - текущая цена только что истёкших горизонтов."""
+        from sqlalchemy import select
+
+        from models.repositories.signals import SignalRepository
+        from models.signal import SignalRecord
+
+        now = (int(time.time() * 1000) // HOUR) * HOUR
+        t0 = now - 8 * DAY
+        await insert_candles(session_maker, "BTC", {t0 + DAY: 103.0, t0 + 7 * DAY: 90.0})
+
+        buy = await add_signal(session_maker, "BTC", "buy", t0 + 1000, 100.0)
+        sell = await add_signal(session_maker, "BTC", "sell", t0 + 1000, 100.0)
+        fresh = await add_signal(session_maker, "BTC", "buy", now - 2 * HOUR, 100.0)
+        gap = await add_signal(session_maker, "BTC", "buy", now - DAY - 90 * 60 * 1000, 100.0)
+        untracked = await add_signal(session_maker, "DOGE", "buy", now - DAY - 90 * 60 * 1000, 0.1)
+        stale = await add_signal(session_maker, "DOGE", "buy", now - 2 * DAY, 0.1)
+
+        async with session_maker() as session:
+            repository = SignalRepository(session)
+            assert await repository.resolve_from_candles(now) == 4
+            assert await repository.resolve_from_prices({"doge": 0.099, "BTC": 500.0}, now) == 1
+            assert await repository.resolve_from_prices({"doge": 0.099}, now + HOUR) == 0
+            assert await repository.resolve_from_candles(now) == 0
+
+        async with session_maker() as session:
+            rows = {r.id: r for r in (await session.execute(select(SignalRecord))).scalars()}
+
+        assert (rows[buy.id].outcome_24h, rows[buy.id].outcome_7d) == ("win", "loss")
+        assert rows[buy.id].pnl_24h_pct == pytest.approx(3.0)
+        assert rows[buy.id].effective_pnl == pytest.approx(-10.0)
+        assert (rows[sell.id].outcome_24h, rows[sell.id].outcome_7d) == ("loss", "win")
+        assert rows[fresh.id].outcome_24h == "pending"
+        assert (rows[untracked.id].outcome_24h, rows[untracked.id].outcome_7d) == ("neutral", "pending")
+        assert rows[untracked.id].pnl_24h_pct == pytest.approx(-1.0)
+        assert rows[gap.id].outcome_24h == "pending"
+        assert rows[stale.id].outcome_24h == "pending"
+
+    async def test_incremental_stats_match_recompute(self, session_maker):
+        """Статистика из агрегатов совпадает с полным пересчётом по записям."""
+        from sqlalchemy import select
+
+        from models.signal import SignalRecord
+        from service.analysis.signal_history import SignalHistoryManager
+
+        rng = random.Random(5)
+        now = (int(time.time() * 1000) // HOUR) * HOUR
+        start = now - 20 * DAY
+        closes = {start + h * HOUR: 100 * (1 + rng.uniform(-0.1, 0.1)) for h in range(20 * 24)}
+        await insert_candles(session_maker, "BTC", closes)
+
+        manager = SignalHistoryManager()
+        for step in range(60):
+            created = start + rng.randrange(19 * 24) * HOUR + rng.randrange(HOUR)
+            await add_signal(
+                session_maker,
+                "BTC",
+                rng.choice(["buy", "sell", "strong_buy", "neutral"]),
+                created,
+                100.0,
+                source=rng.choice(["pattern", "divergence"]),
+            )
+            if step % 15 == 14:
+                await manager.update_outcomes()
+
+        await manager.update_outcomes()
+        stats = await manager.get_stats()
+
+        async with session_maker() as session:
+            records = list((await session.execute(select(SignalRecord))).scalars())
+        expected = recompute(records)
+
+        assert stats.total_signals == expected["total"] == 60
+        assert stats.win_rate_24h == pytest.approx(expected["win_rate_24h"])
+        assert stats.win_rate_7d == pytest.approx(expected["win_rate_7d"])
+        assert stats.avg_pnl_24h == pytest.approx(expected["avg_pnl_24h"])
+        assert stats.avg_pnl_7d == pytest.approx(expected["avg_pnl_7d"])
+        assert stats.by_source == expected["by_source"]
+        assert (stats.best_signal.pnl_7d_pct or stats.best_signal.pnl_24h_pct) == pytest.approx(expected["best"])
+        assert stats.win_rate_7d > 0
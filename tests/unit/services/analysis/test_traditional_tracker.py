@@ -0,0 +1,163 @@
+"""
+Traditional Finance Tracker Tests - Тесты пакетной загрузки традиционных активов.
+
+Тестирует:
+- Один spark-запрос на все активы
+- Параллельную догрузку недостающих тикеров
+- Сохранение дневных баров
+- Инкрементальный бэкфилл
+"""
+
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+DAY = 86400
+# 2024-03-05 14:30 UTC, биржа Нью-Йорка (UTC-5)
+BAR_TS = 1709649000
+GMT_OFFSET = -18000
+
+
+def chart_payload(price: float, with_ohlc: bool = True) -> dict:
+    """Chart-результат Yahoo в формате chart/spark."""
+    quote = {"close": [price - 1, price]}
+    if with_ohlc:
+        quote.update({"open": [price - 2, price - 1], "high": [price, price + 1], "low": [price - 3, price - 2]})
+        quote["volume"] = [100, 200]
+    return {
+        "meta": {
+            "regularMarketPrice": price,
+            "previousClose": price - 1,
+            "regularMarketDayHigh": price + 5,
+            "regularMarketDayLow": price - 5,
+            "gmtoffset": GMT_OFFSET,
+        },
+        "timestamp": [BAR_TS - DAY, BAR_TS],
+        "indicators": {"quote": [quote]},
+    }
+
+
+def make_tracker(handler):
+    from service.analysis.traditional import TraditionalFinanceTracker
+
+    tracker = TraditionalFinanceTracker()
+    tracker._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    tracker._store_bars = AsyncMock(return_value=0)
+    return tracker
+
+
+class TestBatchFetch:
+    """Тесты пакетной загрузки."""
+
+    async def test_fetch_all_single_spark_request(self):
+        """Все активы загружаются одним spark-запросом."""
+        from service.analysis.traditional import ASSETS_CONFIG
+
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            tickers = request.url.params["symbols"].split(",")
+            result = [{"symbol": t, "response": [chart_payload(100.0, with_ohlc=False)]} for t in tickers]
+            return httpx.Response(200, json={"spark": {"result": result}})
+
+        tracker = make_tracker(handler)
+        status = await tracker.fetch_all()
+
+        assert len(requests) == 1
+        assert "/v7/finance/spark" in str(requests[0].url)
+        assert status.status == "ok"
+        assert status.gold.price == 100.0
+        assert status.gold.change_percent == pytest.approx(1.0101, rel=1e-3)
+        # spark отдаёт только close - high/low берутся из meta
+        assert status.gold.high_24h == 105.0
+        assert all(getattr(status, asset_id) is not None for asset_id in ASSETS_CONFIG)
+
+        stored = tracker._store_bars.await_args.args[0]
+        assert set(stored) == set(ASSETS_CONFIG)
+        await tracker.close()
+
+    async def test_missing_tickers_fetched_individually(self):
+        """Тикеры, не вернувшиеся в пакете, догружаются через chart API."""
+        chart_calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if "spark" in str(request.url):
+                tickers = [t for t in request.url.params["symbols"].split(",") if t not in ("GC=F", "^VIX")]
+                result = [{"symbol": t, "response": [chart_payload(50.0)]} for t in tickers]
+                return httpx.Response(200, json={"spark": {"result": result}})
+            chart_calls.append(request.url.path)
+            return httpx.Response(200, json={"chart": {"result": [chart_payload(2400.0)]}})
+
+        tracker = make_tracker(handler)
+        status = await tracker.fetch_all()
+
+        assert len(chart_calls) == 2
+        assert status.gold.price == 2400.0
+        assert status.vix.price == 2400.0
+        assert status.silver.price == 50.0
+        await tracker.close()
+
+    async def test_spark_failure_falls_back_to_chart(self):
+        """При ошибке spark все активы загружаются поштучно."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if "spark" in str(request.url):
+                return httpx.Response(500)
+            return httpx.Response(200, json={"chart": {"result": [chart_payload(10.0)]}})
+
+        tracker = make_tracker(handler)
+        metals = await tracker.get_metals()
+
+        assert set(metals) == {"gold", "silver", "platinum"}
+        tracker._store_bars.assert_not_called()
+        await tracker.close()
+
+    def test_bars_aligned_to_exchange_midnight(self):
+        """Время бара приводится к полуночи биржевого часового пояса."""
+        from service.analysis.traditional import TraditionalFinanceTracker
+
+        _, bars = TraditionalFinanceTracker()._parse_chart("gold", chart_payload(100.0))
+
+        assert len(bars) == 2
+        # 2024-03-05 00:00 America/New_York = 05:00 UTC
+        assert bars[-1]["timestamp"] == 1709614800 * 1000
+        assert bars[-1]["timestamp"] - bars[0]["timestamp"] == DAY * 1000
+        assert bars[-1]["open"] == 99.0
+
+
+class TestIncrementalBackfill:
+    """Тесты точки возобновления бэкфилла."""
+
+    def test_resume_after_continuous_history(self):
+        """Непрерывная история - догружается только хвост."""
+        from service.backfill.traditional_backfill import RESUME_OVERLAP_DAYS, resume_point
+
+        day = DAY * 1000
+        start = 1_700_000_000_000
+        timestamps = [start + i * day for i in range(0, 30) if (i % 7) not in (5, 6)]
+
+        assert resume_point(timestamps, start) == timestamps[-1] - RESUME_OVERLAP_DAYS * day
+
+    def test_resume_before_gap(self):
+        """При разрыве истории загрузка начинается с места разрыва."""
+        from service.backfill.traditional_backfill import RESUME_OVERLAP_DAYS, resume_point
+
+        day = DAY * 1000
+        start = 1_700_000_000_000
+        timestamps = [start + i * day for i in range(10)] + [start + 40 * day, start + 41 * day]
+
+        assert resume_point(timestamps, start) == start + 9 * day - RESUME_OVERLAP_DAYS * day
+
+    def test_full_fetch_when_start_missing(self):
+        """Если начала периода нет в БД, нужна полная загрузка."""
+        from service.backfill.traditional_backfill import resume_point
+
+        day = DAY * 1000
+        start = 1_700_000_000_000
+
+        assert resume_point([], start) is None
+        assert resume_point([start + 30 * day], start) is None
@@ -0,0 +1,193 @@
+"""
+Candle Archive Tests - Тесты колоночного архива истории свечей.
+
+Тестирует:
+- Архивирование только закрытых месяцев
+- Чтение через memory map без копирования
+- Объединение архива и свежих строк из БД
+- Восстановление после прерванной записи
+- Перезапись архивных месяцев, изменённых в БД (бэкфилл, исправления)
+"""
+
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+DAY = 86_400_000
+JAN = int(datetime(2024, 1, 1, tzinfo=UTC).timestamp() * 1000)
+APR = int(datetime(2024, 4, 1, tzinfo=UTC).timestamp() * 1000)
+NOW = APR + 10 * DAY + 3_600_000
+
+
+@pytest.fixture
+async def session_maker(sqlite_db):
+    """In-memory SQLite с таблицей свечей."""
+    from models.candlestick import CandlestickRecord
+
+    return await sqlite_db(CandlestickRecord)
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    """Архив во временном каталоге как глобальный экземпляр."""
+    from service.candlestick import archive as archive_module
+
+    instance = archive_module.CandleArchive(tmp_path / "archive")
+    monkeypatch.setattr(archive_module, "_archive", instance)
+    return instance
+
+
+async def insert_days(maker, timestamps: list[int], exchange: str = "binance") -> None:
+    from sqlalchemy import text
+
+    async with maker() as session:
+        await session.execute(
+            text("""
+                INSERT INTO candlestick_records
+                (exchange, symbol, interval, timestamp, open_price, high_price, low_price,
+                 close_price, volume, is_complete, loaded_at)
+                VALUES (:exchange, 'BTC/USDT', '1d', :ts, :price, :price, :price, :price, 1, 1, :loaded_at)
+            """),
+            [
+                {"exchange": exchange, "ts": ts, "price": 100 + (ts - JAN) / DAY, "loaded_at": datetime.now(UTC)}
+                for ts in timestamps
+            ],
+        )
+        await session.commit()
+
+
+class TestArchive:
+    """Тесты записи и чтения архива."""
+
+    async def test_only_closed_months_archived(self, session_maker, archive):
+        """В архив попадают только завершённые месяцы, повторный запуск ничего не добавляет."""
+        days = list(range(JAN, NOW - DAY, DAY))
+        await insert_days(session_maker, days)
+        await insert_days(session_maker, days[:5], exchange="okx")
+
+        months = await archive.archive_series("BTC/USDT", "1d", oldest=JAN, now_ms=NOW)
+
+        assert months == 3  # январь - март
+        manifest = archive.manifest("BTC/USDT", "1d")
+        assert manifest["rows"] == 91  # 31 + 29 + 31, дубликаты бирж отброшены
+        assert manifest["last_timestamp"] == APR - DAY
+        assert await archive.archive_series("BTC/USDT", "1d", oldest=JAN, now_ms=NOW) == 0
+
+    async def test_open_history_is_memory_mapped(self, session_maker, archive):
+        """Чтение возвращает представления над memory map, диапазон включает границы."""
+        await insert_days(session_maker, list(range(JAN, APR, DAY)))
+        await archive.archive_series("BTC/USDT", "1d", oldest=JAN, now_ms=NOW)
+
+        history = archive.open_history("BTC/USDT", "1d", start=JAN + 10 * DAY, end=JAN + 19 * DAY)
+
+        assert len(history) == 10
+        assert history.timestamps[0] == JAN + 10 * DAY
+        assert history.close[-1] == pytest.approx(119.0)
+        assert isinstance(history.close.base, np.memmap) or isinstance(history.close, np.memmap)
+        assert not history.close.flags.writeable
+        # Повторное открытие не создаёт новые отображения
+        archive.open_history("BTC/USDT", "1d")
+        assert archive.stats.opens == 1
+
+    async def test_load_history_appends_recent_rows(self, session_maker, archive):
+        """load_history объединяет архив и строки БД после последнего архивного дня."""
+        from service.candlestick.archive import load_history
+
+        await insert_days(session_maker, list(range(JAN, NOW - DAY, DAY)))
+        await archive.archive_series("BTC/USDT", "1d", oldest=JAN, now_ms=NOW)
+
+        history = await load_history("BTC/USDT", "1d")
+
+        assert len(history) == 91 + 10
+        assert np.all(np.diff(history.timestamps) == DAY)
+        window = await load_history("BTC/USDT", "1d", start=APR - 2 * DAY, end=APR + DAY)
+        assert window.timestamps.tolist() == [APR - 2 * DAY, APR - DAY, APR, APR + DAY]
+
+    async def test_changed_months_rearchived(self, session_maker, archive):
+        """Бэкфилл и исправления в архивных месяцах переписывают архив, удалённое ретеншеном сохраняется."""
+        from sqlalchemy import text
+
+        await insert_days(session_maker, list(range(JAN, APR, DAY)))
+        await archive.archive_series("BTC/USDT", "1d", oldest=JAN, now_ms=NOW)
+        assert await archive.archive_series("BTC/USDT", "1d", oldest=JAN, now_ms=NOW) == 0
+
+        dec = int(datetime(2023, 12, 1, tzinfo=UTC).timestamp() * 1000)
+        async with session_maker() as session:
+            # Ретеншен удалил январь, февральская свеча исправлена
+            await session.execute(
+                text("DELETE FROM candlestick_records WHERE timestamp < :feb"), {"feb": JAN + 31 * DAY}
+            )
+            await session.execute(
+                text("UPDATE candlestick_records SET close_price = 1.0, loaded_at = :now WHERE timestamp = :ts"),
+                {"ts": JAN + 40 * DAY, "now": datetime.now(UTC)},
+            )
+            await session.commit()
+        await insert_days(session_maker, [dec, dec + DAY])
+
+        months = await archive.archive_series("BTC/USDT", "1d", oldest=dec, now_ms=NOW)
+
+        history = archive.open_history("BTC/USDT", "1d")
+        assert months == 4  # декабрь - март
+        assert archive.stats.months_rewritten == 3
+        assert len(history) == 2 + 91
+        assert history.timestamps[:3].tolist() == [dec, dec + DAY, JAN]
+        assert history.close[history.timestamps == JAN + 40 * DAY].tolist() == [1.0]
+        assert await archive.archive_series("BTC/USDT", "1d", oldest=dec, now_ms=NOW) == 0
+
+    async def test_load_history_merges_changed_rows(self, session_maker, archive):
+        """До следующего архивирования load_history берёт исправленные строки из БД."""
+        from sqlalchemy import text
+
+        from service.analysis.backtest_engine import load_daily_closes
+
+        await insert_days(session_maker, list(range(JAN, APR, DAY)))
+        await archive.archive_series("BTC/USDT", "1d", oldest=JAN, now_ms=NOW)
+        async with session_maker() as session:
+            await session.execute(
+                text("UPDATE candlestick_records SET close_price = 1.0, loaded_at = :now WHERE timestamp = :ts"),
+                {"ts": JAN + 5 * DAY, "now": datetime.now(UTC)},
+            )
+            await session.commit()
+
+        series = await load_daily_closes("BTC/USDT")
+
+        assert len(series.closes) == 91
+        assert series.closes[5] == 1.0 and series.closes[6] == 106.0
+
+    def test_interrupted_append_truncated(self, archive):
+        """Байты, не попавшие в манифест, отбрасываются при следующей записи."""
+        from service.candlestick.archive import COLUMNS
+        from service.candlestick.rollup import CandleArrays
+
+        def month(timestamps):
+            ts = np.array(timestamps, dtype=np.int64)
+            values = ts.astype(np.float64)
+            return CandleArrays(ts, values, values, values, values, values, values, values, None)
+
+        archive.append_month("BTC/USDT", "1d", JAN, month([JAN, JAN + DAY]))
+        directory = archive.root / "BTC-USDT" / "1d"
+        for name in COLUMNS:
+            with open(directory / f"{name}.bin", "ab") as f:
+                f.write(b"\x00" * 8)
+
+        archive.append_month("BTC/USDT", "1d", APR, month([APR]))
+
+        history = archive.open_history("BTC/USDT", "1d")
+        assert history.timestamps.tolist() == [JAN, JAN + DAY, APR]
+        with pytest.raises(ValueError):
+            archive.append_month("BTC/USDT", "1d", JAN, month([JAN]))
+
+    async def test_missing_archive_reads_database(self, session_maker, archive):
+        """Без архива история целиком читается из БД."""
+        from service.analysis.backtest_engine import load_daily_closes
+
+        await insert_days(session_maker, [JAN, JAN + DAY])
+        await insert_days(session_maker, [JAN], exchange="okx")
+
+        series = await load_daily_closes("BTC/USDT")
+
+        assert series.timestamps.tolist() == [JAN, JAN + DAY]
+        assert series.closes.tolist() == [100.0, 101.0]
@@ -0,0 +1,134 @@
+"""
+Candle Maintenance Tests - Тесты обслуживания хранилища свечей.
+
+Тестирует:
+- Разбор уровней хранения
+- Удаление устаревших свечей по уровням
+- Счётчики строк без полного COUNT
+- Календарные границы партиций
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+DAY = 86_400_000
+NOW = int(datetime(2024, 6, 15, 12, tzinfo=UTC).timestamp() * 1000)
+
+
+@pytest.fixture
+async def session_maker(sqlite_db):
+    """In-memory SQLite с таблицами свечей и счётчиков."""
+    from models.candlestick import CandleRowCount, CandlestickRecord
+
+    return await sqlite_db(CandlestickRecord, CandleRowCount)
+
+
+async def insert(maker, interval: str, timestamps: list[int], symbol: str = "BTC/USDT", loaded_at=None) -> None:
+    from sqlalchemy import text
+
+    async with maker() as session:
+        await session.execute(
+            text("""
+                INSERT INTO candlestick_records
+                (exchange, symbol, interval, timestamp, open_price, high_price, low_price,
+                 close_price, volume, is_complete, loaded_at)
+                VALUES ('binance', :symbol, :interval, :ts, 1, 1, 1, 1, 1, 1, :loaded_at)
+            """),
+            [
+                {"symbol": symbol, "interval": interval, "ts": ts, "loaded_at": loaded_at or datetime.now(UTC)}
+                for ts in timestamps
+            ],
+        )
+        await session.commit()
+
+
+async def count_rows(maker, interval: str) -> int:
+    from sqlalchemy import text
+
+    async with maker() as session:
+        result = await session.execute(
+            text("SELECT COUNT(*) FROM candlestick_records WHERE interval = :interval"), {"interval": interval}
+        )
+        return result.scalar()
+
+
+class TestHelpers:
+    """Тесты вспомогательных функций."""
+
+    def test_parse_retention(self):
+        """Уровни хранения разбираются, некорректные пропускаются."""
+        from service.candlestick.maintenance import parse_retention
+
+        assert parse_retention("1m:30, 5m:365,bad,15m:x,1h:0") == {"1m": 30, "5m": 365}
+        assert parse_retention("") == {}
+
+    def test_month_boundaries(self):
+        """Границы месяцев и имена партиций."""
+        from service.candlestick.maintenance import months_between, next_month, partition_name
+
+        jan = int(datetime(2024, 1, 1, tzinfo=UTC).timestamp() * 1000)
+        feb = int(datetime(2024, 2, 1, tzinfo=UTC).timestamp() * 1000)
+        mar = int(datetime(2024, 3, 1, tzinfo=UTC).timestamp() * 1000)
+
+        assert next_month(jan) == feb
+        assert months_between(jan + 5 * DAY, mar + DAY) == [jan, feb, mar]
+        assert partition_name(feb) == "candlestick_records_p202402"
+
+
+class TestRetention:
+    """Тесты уровней хранения."""
+
+    async def test_old_minute_candles_removed(self, session_maker):
+        """1m старше срока удаляются, остальные интервалы не трогаются."""
+        from service.candlestick.maintenance import CandleStorageManager
+
+        old = [NOW - d * DAY for d in (90, 60, 45, 31)]
+        recent = [NOW - d * DAY for d in (10, 1)]
+        await insert(session_maker, "1m", old + recent)
+        await insert(session_maker, "1d", old + recent)
+
+        manager = CandleStorageManager(retention={"1m": 30})
+        await manager.refresh_counts()
+        deleted = await manager.apply_retention(now_ms=NOW)
+
+        assert deleted == {"1m": 4}
+        assert await count_rows(session_maker, "1m") == 2
+        assert await count_rows(session_maker, "1d") == 6
+        assert await manager.total_rows(refresh=False) == 8
+
+    async def test_ensure_partitions_noop_on_sqlite(self, session_maker):
+        """Без секционирования (SQLite) партиции не создаются."""
+        from service.candlestick.maintenance import CandleStorageManager
+
+        assert await CandleStorageManager().ensure_partitions(now_ms=NOW) == []
+
+
+class TestRowCounters:
+    """Тесты счётчиков строк."""
+
+    async def test_only_touched_months_recounted(self, session_maker):
+        """Повторный пересчёт затрагивает только месяцы с новыми записями."""
+        from service.candlestick.maintenance import CandleStorageManager
+
+        past = datetime.now(UTC) - timedelta(hours=1)
+        may = int(datetime(2024, 5, 10, tzinfo=UTC).timestamp() * 1000)
+        await insert(session_maker, "1h", [NOW - d * DAY for d in range(100)], loaded_at=past)
+
+        manager = CandleStorageManager()
+        assert await manager.total_rows() == 100
+        first_pass = manager.stats.months_recounted
+        assert first_pass == 4  # март - июнь 2024
+
+        await insert(session_maker, "1h", [may + 3_600_000 * k for k in range(1, 4)])
+        await insert(session_maker, "1d", [may], symbol="ETH/USDT")
+
+        assert await manager.total_rows() == 104
+        assert manager.stats.months_recounted - first_pass == 2
+
+        series = await manager.series_counts(symbol="BTC/USDT")
+        assert series == [
+            {"symbol": "BTC/USDT", "interval": "1h", "count": 103, "oldest": NOW - 99 * DAY, "newest": NOW}
+        ]
@@ -0,0 +1,202 @@
+"""
+Candle Store Tests - Тесты чтения свечей из БД с догрузкой хвоста.
+
+Тестирует:
+- Чтение полностью из БД
+- Догрузку недостающего хвоста с биржи
+- Полную загрузку при разрывах и недоступной БД
+"""
+
+import time
+from datetime import UTC, datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+HOUR = 3_600_000
+
+
+def current_hour() -> int:
+    now = int(time.time() * 1000)
+    return now - now % HOUR
+
+
+def make_candle(ts: int, price: float = 100.0):
+    from service.candlestick.models import Candlestick
+
+    return Candlestick(
+        timestamp=ts,
+        open_price=Decimal(str(price)),
+        high_price=Decimal(str(price + 1)),
+        low_price=Decimal(str(price - 1)),
+        close_price=Decimal(str(price)),
+        volume=Decimal("5"),
+    )
+
+
+def make_result(timestamps: list[int]):
+    from service.candlestick.models import CandleInterval, FetchResult
+
+    return FetchResult(
+        candlesticks=[make_candle(ts, 200.0) for ts in timestamps],
+        exchange="okx",
+        symbol="BTC/USDT",
+        interval=CandleInterval.HOUR_1,
+        fetch_time_ms=12.0,
+    )
+
+
+@pytest.fixture
+async def session_maker(sqlite_db):
+    """In-memory SQLite с таблицей candlestick_records."""
+    from models.candlestick import CandlestickRecord
+
+    return await sqlite_db(CandlestickRecord)
+
+
+async def insert_hours(maker, timestamps: list[int], exchange: str = "binance") -> None:
+    from models.repositories.candlestick import CandlestickRepository
+    from service.candlestick.models import CandleInterval, FetchResult
+
+    result = FetchResult(
+        candlesticks=[make_candle(ts) for ts in timestamps],
+        exchange=exchange,
+        symbol="BTC/USDT",
+        interval=CandleInterval.HOUR_1,
+        fetch_time_ms=1.0,
+    )
+    async with maker() as session:
+        await CandlestickRepository(session).upsert_candlesticks(result)
+
+
+class TestCandleStore:
+    """Тесты пути чтения."""
+
+    async def test_served_from_db(self, session_maker):
+        """Полное и свежее окно читается из БД без запросов к бирже."""
+        from service.candlestick.models import CandleInterval
+        from service.candlestick.store import CandleStore
+
+        now = current_hour()
+        await insert_hours(session_maker, [now - i * HOUR for i in range(10)])
+        await insert_hours(session_maker, [now - i * HOUR for i in range(3)], exchange="okx")
+
+        store = CandleStore()
+        store._fetch = AsyncMock()
+        candles = await store.read("BTC/USDT", CandleInterval.HOUR_1, limit=10)
+
+        store._fetch.assert_not_called()
+        assert [c.timestamp for c in candles] == [now - i * HOUR for i in range(9, -1, -1)]
+        assert candles[-1].close_price == Decimal("100")
+        assert store.get_stats()["db_hits"] == 1
+
+    async def test_missing_tail_fetched(self, session_maker):
+        """С биржи догружается только хвост, закрытые свечи сохраняются."""
+        from service.candlestick.models import CandleInterval
+        from service.candlestick.store import CandleStore
+
+        now = current_hour()
+        await insert_hours(session_maker, [now - i * HOUR for i in range(3, 20)])
+
+        store = CandleStore()
+        store._fetch = AsyncMock(return_value=make_result([now - 2 * HOUR, now - HOUR, now]))
+        candles = await store.read("BTC/USDT", CandleInterval.HOUR_1, limit=10)
+
+        store._fetch.assert_awaited_once_with("BTC/USDT", CandleInterval.HOUR_1, 3, start_time=now - 2 * HOUR)
+        assert len(candles) == 10
+        assert candles[-1].timestamp == now
+        assert candles[-1].close_price == Decimal("200.0")
+        # Текущая (незакрытая) свеча не сохраняется
+        assert store.get_stats()["written"] == 2
+
+        # Закрытые свечи хвоста уже в БД - повторно запрашивается только текущая
+        store._fetch = AsyncMock(return_value=make_result([now]))
+        await store.read("BTC/USDT", CandleInterval.HOUR_1, limit=5)
+        store._fetch.assert_awaited_once_with("BTC/USDT", CandleInterval.HOUR_1, 1, start_time=now)
+
+    async def test_gap_triggers_full_fetch(self, session_maker):
+        """Разрыв в истории - полная загрузка с биржи."""
+        from service.candlestick.models import CandleInterval
+        from service.candlestick.store import CandleStore
+
+        now = current_hour()
+        await insert_hours(session_maker, [now - i * HOUR for i in range(10) if i != 4])
+
+        store = CandleStore()
+        expected = make_result([now - i * HOUR for i in range(9, -1, -1)])
+        store._fetch = AsyncMock(return_value=expected)
+        candles = await store.read("BTC/USDT", CandleInterval.HOUR_1, limit=10)
+
+        store._fetch.assert_awaited_once_with("BTC/USDT", CandleInterval.HOUR_1, 10)
+        assert candles == expected.candlesticks
+        assert store.get_stats()["full_fetches"] == 1
+
+    async def test_stale_forming_candle_refetched(self, session_maker):
+        """Устаревшая текущая свеча из БД заменяется свежей с биржи."""
+        from sqlalchemy import text
+
+        from service.candlestick.models import CandleInterval
+        from service.candlestick.store import CandleStore
+
+        now = current_hour()
+        await insert_hours(session_maker, [now - i * HOUR for i in range(10)])
+        async with session_maker() as session:
+            await session.execute(
+                text("UPDATE candlestick_records SET loaded_at = :old WHERE timestamp = :ts"),
+                {"old": datetime(2020, 1, 1, tzinfo=UTC), "ts": now},
+            )
+            await session.commit()
+
+        store = CandleStore()
+        store._fetch = AsyncMock(return_value=make_result([now]))
+        candles = await store.read("BTC/USDT", CandleInterval.HOUR_1, limit=10)
+
+        assert store._fetch.await_args.kwargs["start_time"] == now
+        assert candles[-1].close_price == Decimal("200.0")
+
+    async def test_db_unavailable_falls_back(self):
+        """При недоступной БД данные берутся с биржи, БД временно не опрашивается."""
+        from service.candlestick.models import CandleInterval
+        from service.candlestick.store import CandleStore
+
+        store = CandleStore()
+        store._load_latest = AsyncMock(side_effect=ConnectionError("db down"))
+        store._write_back = AsyncMock()
+        store._fetch = AsyncMock(return_value=make_result([current_hour()]))
+
+        await store.read("BTC/USDT", CandleInterval.HOUR_1, limit=1)
+        await store.read("BTC/USDT", CandleInterval.HOUR_1, limit=1)
+
+        assert store._load_latest.await_count == 1
+        assert store.get_stats()["db_errors"] == 1
+        assert store.get_stats()["full_fetches"] == 2
+
+    async def test_latest_stored_candles(self, session_maker):
+        """latest() отдаёт только сохранённые свечи по нескольким символам без запросов к бирже."""
+        from service.candlestick.store import CandleStore
+
+        now = current_hour()
+        await insert_hours(session_maker, [now - i * HOUR for i in range(5)])
+        await insert_hours(session_maker, [now - i * HOUR for i in range(2)], exchange="okx")
+
+        store = CandleStore()
+        store._fetch = AsyncMock()
+        latest = await store.latest(["BTC/USDT", "ETH/USDT"], "1h", limit=3)
+
+        store._fetch.assert_not_called()
+        assert [c.timestamp for c in latest["BTC/USDT"]] == [now - 2 * HOUR, now - HOUR, now]
+        assert latest["ETH/USDT"] == []
+
+    def test_count_buckets(self):
+        """Подсчёт корзин для фиксированных и календарных интервалов."""
+        from service.candlestick.store import count_buckets
+
+        jan = int(datetime(2024, 1, 1, tzinfo=UTC).timestamp() * 1000)
+        apr = int(datetime(2024, 4, 1, tzinfo=UTC).timestamp() * 1000)
+
+        assert count_buckets(jan, jan + 5 * HOUR, "1h") == 6
+        assert count_buckets(jan, apr, "1M") == 4
+        assert count_buckets(apr, jan, "1M") == 0
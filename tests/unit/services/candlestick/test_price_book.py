@@ -0,0 +1,147 @@
+"""
+Price Book Tests - Тесты живой книги цен.
+
+Тестирует:
+- Скользящие 24ч high/low/volume на монотонных деках
+- Обновления формирующейся свечи и свечи не по порядку
+- Разрыв потока не меняет интервал свечи и окно 24ч
+- Политику устаревания (None -> запасной REST)
+- Подачу свечей из менеджера потоков и чтение потребителями
+"""
+
+import random
+from decimal import Decimal
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+MINUTE = 60_000
+DAY = 24 * 60 * MINUTE
+
+
+def make_candle(ts: int, high: float, low: float, close: float | None = None, volume: float = 1.0):
+    from service.candlestick.models import Candlestick
+
+    close = close if close is not None else (high + low) / 2
+    return Candlestick(
+        timestamp=ts,
+        open_price=Decimal(str(close)),
+        high_price=Decimal(str(high)),
+        low_price=Decimal(str(low)),
+        close_price=Decimal(str(close)),
+        volume=Decimal(str(volume)),
+    )
+
+
+class TestPriceBook:
+    """Тесты книги цен."""
+
+    def test_rolling_window_matches_brute_force(self, clock):
+        """Инкрементальные 24ч статистики совпадают с полным пересчётом."""
+        from service.candlestick.price_book import PriceBook
+
+        rng = random.Random(7)
+        book = PriceBook(clock=clock)
+        candles = []
+        for i in range(3000):
+            low = rng.uniform(50, 150)
+            candle = make_candle(i * MINUTE, low + rng.uniform(0, 5), low, volume=rng.uniform(0, 3))
+            candles.append(candle)
+            quote = book.update("BTC/USDT", candle)
+
+            window = [c for c in candles if c.timestamp > candle.timestamp + MINUTE - DAY - 1]
+            assert quote.high_24h == max(float(c.high_price) for c in window)
+            assert quote.low_24h == min(float(c.low_price) for c in window)
+            assert quote.volume_24h == pytest.approx(sum(float(c.volume) for c in window))
+
+        assert len(window) == 1440
+        assert quote.is_full_day
+        assert quote.open_24h == float(window[0].open_price)
+
+    def test_forming_candle_and_out_of_order(self, clock):
+        """Повторные обновления открытой свечи заменяют её, старые свечи игнорируются."""
+        from service.candlestick.price_book import PriceBook
+
+        book = PriceBook(clock=clock)
+        book.update("ETH/USDT", make_candle(0, 101, 99, volume=10))
+        book.update("ETH/USDT", make_candle(MINUTE, 102, 100, volume=1))
+        quote = book.update("ETH/USDT", make_candle(MINUTE, 105, 100, close=104, volume=3))
+
+        assert quote.price == 104
+        assert quote.high_24h == 105 and quote.low_24h == 99
+        assert quote.volume_24h == pytest.approx(13)
+        assert not quote.is_full_day
+
+        assert book.update("ETH/USDT", make_candle(0, 200, 1)) is None
+        assert book.get("ETH").high_24h == 105
+        assert book.stats.out_of_order == 1
+
+    def test_stream_gap_keeps_candle_interval(self, clock):
+        """После разрыва потока окно по-прежнему 24ч от закрытия последней минутной свечи."""
+        from service.candlestick.price_book import PriceBook
+
+        book = PriceBook(clock=clock)
+        for i in range(10):
+            book.update("BTC/USDT", make_candle(i * MINUTE, 200, 190, volume=5))
+        # Переподключение через 20ч: старые свечи ещё в окне, интервал остаётся 1м
+        resumed = 10 * MINUTE + 20 * 60 * MINUTE
+        book.update("BTC/USDT", make_candle(resumed, 110, 100, volume=1))
+        # Через 4ч после старта окно уже не покрывает первые свечи
+        quote = book.update("BTC/USDT", make_candle(DAY + 5 * MINUTE, 120, 100, volume=1))
+
+        assert quote.volume_24h == pytest.approx(5 * 4 + 1 + 1)
+        assert quote.high_24h == 200
+        assert quote.window_ms == DAY
+
+    def test_staleness(self, clock):
+        """Устаревшая котировка не отдаётся - потребитель идёт в REST."""
+        from service.candlestick.price_book import PriceBook
+
+        book = PriceBook(max_age=60, clock=clock)
+        book.update("SOL/USDT", make_candle(0, 151, 149, close=150))
+
+        assert book.get_price("sol") == 150
+        clock.now += 61
+        assert book.get("SOL") is None
+        assert book.get("SOL", max_age=120) is not None
+        assert book.get("DOGE") is None
+        assert book.get_stats()["fresh"] == 0
+
+        # Засеянные из БД свечи датируются временем свечи, а не загрузки
+        book.seed("ETH/USDT", [make_candle(0, 11, 9)])
+        assert book.get("ETH") is None
+
+    async def test_stream_manager_feeds_consumers(self, monkeypatch):
+        """Свечи менеджера потоков попадают в книгу и читаются портфелем и DCA."""
+        from service.analysis import coin_markets
+        from service.analysis.dca import DCACalculator
+        from service.candlestick import price_book
+        from service.candlestick.websocket.manager import CandleStreamManager, ManagerConfig, StreamSource
+        from service.portfolio.portfolio import PortfolioManager
+
+        book = price_book.PriceBook()
+        monkeypatch.setattr(price_book, "_price_book", book)
+
+        class Loader:
+            async def get_markets(self, symbols):
+                return {}
+
+            async def get_market(self, symbol):
+                return None
+
+        monkeypatch.setattr(coin_markets, "_coin_market_loader", Loader())
+
+        manager = CandleStreamManager(ManagerConfig(symbols=["BTC/USDT"]))
+        await manager._handle_candle("BTC/USDT", make_candle(0, 61000, 59000, close=60500), False, StreamSource.BYBIT)
+
+        assert book.get("BTC").source == "bybit"
+
+        portfolio = PortfolioManager()
+        portfolio._holdings.clear()
+        portfolio.add_holding("BTC", 0.5, 50000.0)
+        data = await portfolio.calculate()
+        assert data.holdings[0].current_price == 60500
+
+        prices = await DCACalculator()._fetch_price_data(None, "BTC")
+        assert prices["current_price"] == 60500
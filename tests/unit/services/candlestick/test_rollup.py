@@ -0,0 +1,248 @@
+"""
+Candlestick Rollup Tests - Тесты построения старших интервалов из 1m свечей.
+
+Тестирует:
+- Агрегацию OHLCV по корзинам
+- Выравнивание недель и месяцев
+- Пропуск незакрытых и неполных корзин
+- Запись в БД без перезаписи биржевых данных
+- Сверку с биржей
+"""
+
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+MINUTE = 60_000
+# 2024-03-04 00:00 UTC (понедельник)
+T0 = int(datetime(2024, 3, 4, tzinfo=UTC).timestamp() * 1000)
+
+
+def minute_rows(count: int, start: int = T0, exchange: str = "binance") -> list[tuple]:
+    """Строки 1m свечей в формате выборки из БД."""
+    rows = []
+    for i in range(count):
+        price = 100.0 + i
+        rows.append((start + i * MINUTE, exchange, price, price + 2, price - 1, price + 1, 10.0, 1000.0, 5))
+    return rows
+
+
+@pytest.fixture
+async def session_maker(sqlite_db):
+    """In-memory SQLite с таблицей candlestick_records."""
+    from models.candlestick import CandlestickRecord
+
+    return await sqlite_db(CandlestickRecord)
+
+
+async def insert_minutes(maker, rows: list[tuple], symbol: str = "BTC/USDT") -> None:
+    from sqlalchemy import text
+
+    async with maker() as session:
+        await session.execute(
+            text("""
+                INSERT INTO candlestick_records
+                (exchange, symbol, interval, timestamp, open_price, high_price, low_price,
+                 close_price, volume, quote_volume, trades_count, is_complete, loaded_at)
+                VALUES (:exchange, :symbol, '1m', :timestamp, :o, :h, :l, :c, :v, :qv, :n, 1, :loaded_at)
+            """),
+            [
+                {
+                    "exchange": r[1],
+                    "symbol": symbol,
+                    "timestamp": r[0],
+                    "o": r[2],
+                    "h": r[3],
+                    "l": r[4],
+                    "c": r[5],
+                    "v": r[6],
+                    "qv": r[7],
+                    "n": r[8],
+                    "loaded_at": datetime.now(UTC),
+                }
+                for r in rows
+            ],
+        )
+        await session.commit()
+
+
+async def stored(maker, interval: str) -> list[tuple]:
+    from sqlalchemy import text
+
+    async with maker() as session:
+        result = await session.execute(
+            text("""
+                SELECT timestamp, open_price, high_price, low_price, close_price, volume, source_raw
+                FROM candlestick_records WHERE interval = :interval ORDER BY timestamp
+            """),
+            {"interval": interval},
+        )
+        return result.fetchall()
+
+
+class TestAggregate:
+    """Тесты векторной агрегации."""
+
+    def test_five_minute_buckets(self):
+        """OHLCV 5m корзины считаются из 1m свечей."""
+        from service.candlestick.rollup import CandleArrays, aggregate
+
+        source = CandleArrays.from_rows(minute_rows(10))
+        result = aggregate(source, "1m", "5m", now_ms=T0 + 10 * MINUTE)
+
+        assert result.timestamps.tolist() == [T0, T0 + 5 * MINUTE]
+        assert result.open.tolist() == [100.0, 105.0]
+        assert result.high.tolist() == [106.0, 111.0]
+        assert result.low.tolist() == [99.0, 104.0]
+        assert result.close.tolist() == [105.0, 110.0]
+        assert result.volume.tolist() == [50.0, 50.0]
+        assert result.quote_volume.tolist() == [5000.0, 5000.0]
+        assert result.trades.tolist() == [25, 25]
+
+    def test_open_and_incomplete_buckets_skipped(self):
+        """Незакрытая корзина и корзина с пропуском не выдаются."""
+        from service.candlestick.rollup import CandleArrays, aggregate
+
+        rows = minute_rows(15)
+        del rows[7]  # пропуск во второй корзине
+        source = CandleArrays.from_rows(rows)
+        result = aggregate(source, "1m", "5m", now_ms=T0 + 14 * MINUTE)
+
+        assert result.timestamps.tolist() == [T0]
+
+    def test_duplicate_exchanges_deduplicated(self):
+        """Для каждого времени берётся одна свеча (первая биржа)."""
+        from service.candlestick.rollup import CandleArrays, aggregate
+
+        rows = sorted(minute_rows(5, exchange="binance") + minute_rows(5, exchange="okx"), key=lambda r: (r[0], r[1]))
+        source = CandleArrays.from_rows(rows)
+        result = aggregate(source, "1m", "5m", now_ms=T0 + 5 * MINUTE)
+
+        assert len(source) == 5
+        assert result.volume.tolist() == [50.0]
+        assert result.exchanges.tolist() == ["binance"]
+
+    def test_unknown_quote_volume_propagates(self):
+        """Неизвестный quote_volume в корзине даёт NaN, а не заниженную сумму."""
+        from service.candlestick.rollup import CandleArrays, aggregate
+
+        rows = minute_rows(5)
+        rows[2] = rows[2][:7] + (None, None)
+        result = aggregate(CandleArrays.from_rows(rows), "1m", "5m", now_ms=T0 + 5 * MINUTE)
+
+        assert np.isnan(result.quote_volume[0])
+        assert result.trades[0] == -1
+
+    def test_week_and_month_alignment(self):
+        """Недели начинаются с понедельника, месяцы - с 1-го числа."""
+        from service.candlestick.rollup import bucket_ends, bucket_starts
+
+        # 2024-03-07 (четверг) 15:00 UTC
+        ts = np.array([T0 + 3 * 86_400_000 + 15 * 3_600_000], dtype=np.int64)
+
+        assert bucket_starts(ts, "1w").tolist() == [T0]
+        month = int(datetime(2024, 3, 1, tzinfo=UTC).timestamp() * 1000)
+        april = int(datetime(2024, 4, 1, tzinfo=UTC).timestamp() * 1000)
+        assert bucket_starts(ts, "1M").tolist() == [month]
+        assert bucket_ends(np.array([month]), "1M").tolist() == [april]
+
+
+class TestRollupEngine:
+    """Тесты движка с БД."""
+
+    async def test_rollup_writes_derived_candles(self, session_maker):
+        """Старшие интервалы строятся каскадом и помечаются источником."""
+        from service.candlestick.rollup import CandleRollupEngine
+
+        await insert_minutes(session_maker, minute_rows(60))
+        engine = CandleRollupEngine()
+
+        missing = await engine.rollup_symbol("BTC/USDT", ["1h", "5m", "15m"], now_ms=T0 + 60 * MINUTE)
+
+        assert missing == []
+        five = await stored(session_maker, "5m")
+        hour = await stored(session_maker, "1h")
+        assert len(five) == 12
+        assert len(await stored(session_maker, "15m")) == 3  # ROLLUP_LOOKBACK_BUCKETS
+        assert len(hour) == 1
+        assert hour[0][1:6] == (100.0, 161.0, 99.0, 160.0, 600.0)
+        assert hour[0][6] == "rollup:5m"
+        assert engine.get_stats()["exchange_fetches_saved"] == 3
+
+    async def test_missing_source_reported(self, session_maker):
+        """Интервал без исходных свечей возвращается для загрузки с биржи."""
+        from service.candlestick.rollup import CandleRollupEngine
+
+        await insert_minutes(session_maker, minute_rows(3))
+        missing = await CandleRollupEngine().rollup_symbol("BTC/USDT", ["5m", "4h"], now_ms=T0 + 5 * MINUTE)
+
+        assert missing == ["5m", "4h"]
+
+    async def test_exchange_rows_not_overwritten(self, session_maker):
+        """Свечи с биржи имеют приоритет над производными."""
+        from sqlalchemy import text
+
+        from service.candlestick.rollup import CandleRollupEngine
+
+        await insert_minutes(session_maker, minute_rows(5))
+        async with session_maker() as session:
+            await session.execute(
+                text("""
+                    INSERT INTO candlestick_records
+                    (exchange, symbol, interval, timestamp, open_price, high_price, low_price,
+                     close_price, volume, is_complete, loaded_at)
+                    VALUES ('binance', 'BTC/USDT', '5m', :ts, 1, 2, 0.5, 1.5, 7, 1, :now)
+                """),
+                {"ts": T0, "now": datetime.now(UTC)},
+            )
+            await session.commit()
+
+        await CandleRollupEngine().rollup_symbol("BTC/USDT", ["5m"], now_ms=T0 + 5 * MINUTE)
+
+        rows = await stored(session_maker, "5m")
+        assert rows[0][1:] == (1.0, 2.0, 0.5, 1.5, 7.0, None)
+
+    async def test_verify_counts_mismatches(self, session_maker):
+        """Сверка с биржей считает расхождения сверх допуска."""
+        from service.candlestick.models import CandleInterval, Candlestick, FetchResult
+        from service.candlestick.rollup import CandleRollupEngine
+
+        await insert_minutes(session_maker, minute_rows(10))
+        engine = CandleRollupEngine()
+        await engine.rollup_symbol("BTC/USDT", ["5m"], now_ms=T0 + 10 * MINUTE)
+
+        def candle(ts, high, low, close):
+            return Candlestick(
+                timestamp=ts,
+                open_price=Decimal("100"),
+                high_price=Decimal(str(high)),
+                low_price=Decimal(str(low)),
+                close_price=Decimal(str(close)),
+                volume=Decimal("50"),
+            )
+
+        result = FetchResult(
+            candlesticks=[candle(T0, 106, 99, 105), candle(T0 + 5 * MINUTE, 111, 104, 120)],
+            exchange="binance",
+            symbol="BTC/USDT",
+            interval=CandleInterval.MINUTE_5,
+            fetch_time_ms=10.0,
+        )
+
+        assert await engine.verify(result) == 1
+        stats = engine.get_stats()
+        assert stats["verifications"] == 1
+        assert stats["mismatches"] == 1
+
+    def test_verification_rotates(self):
+        """Проверка запускается раз в N циклов по очереди для интервалов."""
+        from service.candlestick.rollup import CandleRollupEngine
+
+        engine = CandleRollupEngine(verify_every=2)
+        picks = [engine.next_verification(["5m", "15m"]) for _ in range(6)]
+
+        assert picks == [None, "5m", None, "15m", None, "5m"]
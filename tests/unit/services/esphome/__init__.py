@@ -0,0 +1 @@
+"""Unit tests for ESPHome Native API."""
@@ -0,0 +1,305 @@
+"""
+ESPHome API Tests - Тесты ESPHome Native API сервера.
+
+Тестирует:
+- FrameDecoder (инкрементальный разбор фреймов)
+- Очередь отправки клиента (drop-oldest, отключение при переполнении)
+- Broadcast с однократным кодированием
+- ESPHomeStateBridge (пакетная отправка изменений)
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+def make_writer() -> MagicMock:
+    """Мок StreamWriter, записывающий отправленные данные."""
+    writer = MagicMock()
+    writer.sent = []
+    writer.writelines = MagicMock(side_effect=lambda chunks: writer.sent.extend(chunks))
+
+    async def drain():
+        return None
+
+    writer.drain = drain
+    writer.get_extra_info = MagicMock(return_value=("127.0.0.1", 50000))
+    return writer
+
+
+class TestFrameDecoder:
+    """Тесты для FrameDecoder."""
+
+    def test_single_frame(self):
+        """Разбор одного полного фрейма."""
+        from service.esphome_api.protocol import FrameDecoder, encode_frame
+
+        decoder = FrameDecoder()
+        decoder.feed(encode_frame(7, b"abc"))
+
+        assert decoder.next_frame() == (7, b"abc")
+        assert decoder.next_frame() is None
+        assert decoder.pending == 0
+
+    def test_split_reads(self):
+        """Фрейм, пришедший по одному байту, собирается корректно."""
+        from service.esphome_api.protocol import FrameDecoder, encode_frame
+
+        frame = encode_frame(25, b"x" * 300)
+        decoder = FrameDecoder()
+        for i in range(len(frame) - 1):
+            decoder.feed(frame[i : i + 1])
+            assert decoder.next_frame() is None
+        decoder.feed(frame[-1:])
+
+        assert decoder.next_frame() == (25, b"x" * 300)
+
+    def test_multiple_frames_in_one_read(self):
+        """Несколько фреймов в одном чтении."""
+        from service.esphome_api.protocol import FrameDecoder, encode_frame
+
+        decoder = FrameDecoder()
+        decoder.feed(encode_frame(1, b"a") + encode_frame(7, b"") + encode_frame(20, b"bb"))
+
+        assert decoder.frames() == [(1, b"a"), (7, b""), (20, b"bb")]
+
+    def test_matches_decode_frame(self):
+        """Результат совпадает с decode_frame."""
+        from service.esphome_api.protocol import FrameDecoder, decode_frame, encode_frame
+
+        frame = encode_frame(10, bytes(range(200)))
+        msg_type, payload, consumed = decode_frame(frame)
+        decoder = FrameDecoder()
+        decoder.feed(frame)
+
+        assert decoder.next_frame() == (msg_type, payload)
+        assert consumed == len(frame)
+
+    def test_invalid_indicator(self):
+        """Неверный индикатор фрейма вызывает ValueError."""
+        from service.esphome_api.protocol import FrameDecoder
+
+        decoder = FrameDecoder()
+        decoder.feed(b"\x01\x02\x03")
+        with pytest.raises(ValueError):
+            decoder.next_frame()
+
+    def test_compaction(self):
+        """Буфер сжимается после потребления данных."""
+        from service.esphome_api.protocol import FrameDecoder, encode_frame
+
+        decoder = FrameDecoder()
+        decoder.COMPACT_THRESHOLD = 16
+        frame = encode_frame(7, b"y" * 10)
+        for _ in range(10):
+            decoder.feed(frame)
+        decoder.feed(frame[:3])
+
+        assert len(decoder.frames()) == 10
+        assert decoder.pending == 3
+        assert len(decoder._buffer) < len(frame) * 2
+
+
+class TestClientSendQueue:
+    """Тесты очереди отправки ESPHomeClient."""
+
+    def test_drop_oldest_state_frames(self):
+        """При переполнении удаляются самые старые state-фреймы."""
+        from service.esphome_api.server import ESPHomeAPIServer, ESPHomeClient
+
+        client = ESPHomeClient(MagicMock(), make_writer(), ESPHomeAPIServer(), max_queue_size=3)
+        client.enqueue(b"control", droppable=False)
+        for i in range(5):
+            client.enqueue(bytes([i]))
+
+        frames = [f for f, _, _ in client._queue]
+        assert frames == [b"control", b"\x03", b"\x04"]
+        assert client.stats.frames_dropped == 3
+
+    def test_disconnect_when_nothing_droppable(self):
+        """Очередь из одних неудаляемых фреймов не растёт: клиент отключается."""
+        from service.esphome_api.server import ESPHomeAPIServer, ESPHomeClient
+
+        writer = make_writer()
+        client = ESPHomeClient(MagicMock(), writer, ESPHomeAPIServer(), max_queue_size=2)
+        for _ in range(3):
+            client.enqueue(b"control", droppable=False)
+
+        assert client.queue_depth == 0
+        writer.close.assert_called_once()
+        client.enqueue(b"state")
+        assert client.queue_depth == 0
+
+    async def test_writer_loop_coalesces(self):
+        """Writer отправляет накопленные фреймы одной записью и считает латентность."""
+        from service.esphome_api.server import ESPHomeAPIServer, ESPHomeClient
+
+        writer = make_writer()
+        client = ESPHomeClient(MagicMock(), writer, ESPHomeAPIServer())
+        client.enqueue(b"a")
+        client.enqueue(b"b")
+
+        task = asyncio.create_task(client._writer_loop())
+        await asyncio.sleep(0.01)
+        client._running = False
+        client._queue_ready.set()
+        await task
+
+        assert writer.sent == [b"a", b"b"]
+        assert writer.writelines.call_count == 1
+        assert client.stats.frames_sent == 2
+        assert client.get_stats()["writes"] == 1
+
+
+class TestBroadcast:
+    """Тесты broadcast_state."""
+
+    async def test_broadcast_encodes_once(self):
+        """Сообщение кодируется один раз и ставится в очередь подписанным клиентам."""
+        from service.esphome_api.messages import SensorInfo
+        from service.esphome_api.server import ESPHomeAPIServer, ESPHomeClient
+
+        server = ESPHomeAPIServer()
+        server.register_sensor(SensorInfo.from_dict({"name": "BTC"}, "btc_price"))
+        subscribed = [ESPHomeClient(MagicMock(), make_writer(), server) for _ in range(3)]
+        for client in subscribed:
+            client.subscribed = True
+        idle = ESPHomeClient(MagicMock(), make_writer(), server)
+        server._clients.extend([*subscribed, idle])
+
+        await server.broadcast_state("btc_price", 50000.0)
+
+        frames = [client._queue[0][0] for client in subscribed]
+        assert all(frame is frames[0] for frame in frames)
+        assert idle.queue_depth == 0
+
+
+class TestStateEncoding:
+    """Тесты кодирования state-сообщений с предвычисленными заголовками."""
+
+    @pytest.mark.parametrize("key", [0, 1, 123456, 2**32 - 1])
+    def test_sensor_state_matches_generic_encoding(self, key):
+        """Быстрое кодирование совпадает с побайтовым через encode_*."""
+        from service.esphome_api.messages import build_sensor_state_response
+        from service.esphome_api.protocol import (
+            MSG_SENSOR_STATE_RESPONSE,
+            encode_bool,
+            encode_fixed32,
+            encode_float,
+            encode_frame,
+        )
+
+        for value in (0.0, 1.5, -3e10):
+            expected = encode_frame(
+                MSG_SENSOR_STATE_RESPONSE,
+                encode_fixed32(1, key) + encode_float(2, value) + encode_bool(3, False),
+            )
+            assert build_sensor_state_response(key, value) == expected
+
+    @pytest.mark.parametrize("text", ["", "abc", "ы" * 200, "x" * 20000])
+    def test_text_state_matches_generic_encoding(self, text):
+        """Текстовый state совпадает с побайтовым кодированием."""
+        from service.esphome_api.messages import build_text_sensor_state_response
+        from service.esphome_api.protocol import (
+            MSG_TEXT_SENSOR_STATE_RESPONSE,
+            encode_bool,
+            encode_fixed32,
+            encode_frame,
+            encode_string,
+        )
+
+        expected = encode_frame(
+            MSG_TEXT_SENSOR_STATE_RESPONSE,
+            encode_fixed32(1, 42) + encode_string(2, text) + encode_bool(3, False),
+        )
+        assert build_text_sensor_state_response(42, text) == expected
+
+
+class TestStateBridge:
+    """Тесты ESPHomeStateBridge."""
+
+    @pytest.fixture
+    def server(self):
+        from service.esphome_api.messages import SensorInfo, TextSensorInfo
+        from service.esphome_api.server import ESPHomeAPIServer
+
+        server = ESPHomeAPIServer()
+        server.register_sensor(SensorInfo.from_dict({"name": "BTC"}, "btc_price"))
+        server.register_text_sensor(TextSensorInfo.from_dict({"name": "Phase"}, "market_phase"))
+        return server
+
+    def _client(self, server):
+        from service.esphome_api.server import ESPHomeClient
+
+        client = ESPHomeClient(MagicMock(), make_writer(), server)
+        client.subscribed = True
+        server._clients.append(client)
+        return client
+
+    def test_coalesces_changes_per_tick(self, server):
+        """Несколько изменений одного ключа за тик отправляются одним значением."""
+        from service.esphome_api.bridge import ESPHomeStateBridge
+        from service.esphome_api.protocol import FrameDecoder
+
+        client = self._client(server)
+        bridge = ESPHomeStateBridge(server)
+        for price in (1.0, 2.0, 3.0):
+            bridge.on_sensor_change("btc_price", price)
+        bridge.on_sensor_change("market_phase", "accumulation")
+        bridge.on_sensor_change("unknown_sensor", 1)
+
+        assert bridge.flush() == 2
+        assert client.queue_depth == 1  # One multi-message write
+
+        decoder = FrameDecoder()
+        decoder.feed(client._queue[0][0])
+        assert len(decoder.frames()) == 2
+
+    def test_skips_unchanged(self, server):
+        """Неизменившиеся значения не отправляются повторно."""
+        from service.esphome_api.bridge import ESPHomeStateBridge
+
+        client = self._client(server)
+        bridge = ESPHomeStateBridge(server)
+        bridge.on_sensor_change("btc_price", 1.0)
+        bridge.flush()
+        bridge.on_sensor_change("btc_price", 1.0)
+
+        assert bridge.flush() == 0
+        assert client.queue_depth == 1
+        assert bridge.get_stats()["skipped_unchanged"] == 1
+
+    def test_resync_after_drop(self, server):
+        """Клиент, потерявший фреймы, получает полный снимок состояния."""
+        from service.esphome_api.bridge import ESPHomeStateBridge
+
+        values = {"btc_price": 5.0, "market_phase": "bull"}
+        server.set_state_getter(values.get)
+        client = self._client(server)
+        client.needs_resync = True
+        bridge = ESPHomeStateBridge(server)
+
+        bridge.flush()
+
+        assert client._queue[0][0] == server.encode_full_state()
+        assert client.needs_resync is False
+
+    async def test_manager_listener(self):
+        """HAIntegrationManager уведомляет слушателей при публикации."""
+        from unittest.mock import AsyncMock
+
+        from service.ha.core.manager import HAIntegrationManager
+
+        publisher = MagicMock()
+        publisher.publish_sensor = AsyncMock(return_value=True)
+        manager = HAIntegrationManager(publisher=publisher)
+        seen = []
+        manager.add_state_listener(lambda sid, value: seen.append((sid, value)))
+
+        await manager.publish_sensor("not_registered_sensor", 7)
+
+        assert seen == [("not_registered_sensor", 7)]
+        assert manager.get_sensor_value("not_registered_sensor") == 7
@@ -0,0 +1,125 @@
+"""
+Forecast Cache Tests - Тесты кэша ML прогнозов.
+
+Тестирует:
+- Ключ по отпечатку последних N цен закрытия
+- TTL по интервалу
+- Single-flight для одинаковых параллельных запросов
+- Сохранение на диск и загрузку после перезапуска
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+def forecast(price: float = 101.0):
+    from service.ml.models import ForecastResult
+
+    return ForecastResult(
+        symbol="",
+        interval="",
+        model="test",
+        predictions=[price],
+        confidence_low=[price - 1],
+        confidence_high=[price + 1],
+        direction="up",
+        confidence_pct=60.0,
+        timestamp=datetime(2024, 3, 1, 12, 0),
+        horizon=1,
+    )
+
+
+class TestForecastCache:
+    """Тесты кэша прогнозов."""
+
+    async def test_fingerprint_uses_model_context(self):
+        """Отпечаток зависит только от последних CONTEXT_LENGTH цен."""
+        from core.constants import MLDefaults
+        from service.ml.forecast_cache import fingerprint
+
+        prices = [100.0 + i for i in range(MLDefaults.CONTEXT_LENGTH + 20)]
+
+        assert fingerprint([1.0] + prices) == fingerprint(prices)
+        assert fingerprint(prices[:-1] + [999.0]) != fingerprint(prices)
+
+    async def test_hit_returns_copy_until_ttl(self, clock):
+        """Повторный запрос берётся из кэша до истечения TTL интервала."""
+        from service.ml.forecast_cache import ForecastCache
+
+        cache = ForecastCache(clock=clock)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            return forecast()
+
+        prices = [100.0] * 60
+        first = await cache.get_or_compute("m", 1, prices, compute, "1h")
+        first.symbol = "BTC/USDT"
+        first.predictions.append(0.0)
+        second = await cache.get_or_compute("m", 1, prices, compute, "1h")
+
+        assert calls == 1
+        assert second.symbol == "" and second.predictions == [101.0]
+
+        clock.now += 3600
+        await cache.get_or_compute("m", 1, prices, compute, "1h")
+        assert calls == 2
+        await cache.get_or_compute("m", 2, prices, compute, "1h")
+        assert calls == 3
+
+    async def test_single_flight(self):
+        """Параллельные одинаковые запросы выполняют модель один раз, ошибки не кэшируются."""
+        from service.ml.forecast_cache import ForecastCache
+
+        cache = ForecastCache()
+        calls = 0
+        fail = True
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            if fail:
+                raise RuntimeError("model failed")
+            return forecast()
+
+        prices = [100.0] * 60
+        results = await asyncio.gather(
+            *(cache.get_or_compute("m", 1, prices, compute) for _ in range(5)), return_exceptions=True
+        )
+        assert calls == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        fail = False
+        results = await asyncio.gather(*(cache.get_or_compute("m", 1, prices, compute) for _ in range(5)))
+        assert calls == 2
+        assert [r.predictions for r in results] == [[101.0]] * 5
+        assert cache.get_stats()["shared"] == 8
+
+    async def test_persistence(self, tmp_path, clock):
+        """Неистёкшие записи переживают перезапуск."""
+        from service.ml.forecast_cache import ForecastCache
+
+        path = tmp_path / "forecast_cache.json"
+        cache = ForecastCache(path, clock=clock)
+        prices = [100.0] * 60
+
+        async def compute():
+            return forecast()
+
+        await cache.get_or_compute("m", 1, prices, compute, "1h")
+        await cache.get_or_compute("m", 2, prices, compute, "15m")
+        clock.now += 1800
+        assert cache.save() == 1
+
+        restored = ForecastCache(path, clock=clock)
+        result = restored.get(restored.make_key("m", 1, prices))
+        assert result is not None
+        assert result.predictions == [101.0]
+        assert result.timestamp == datetime(2024, 3, 1, 12, 0)
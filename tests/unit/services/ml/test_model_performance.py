@@ -0,0 +1,137 @@
+"""
+Model Performance Tests - Тесты инкрементальной оценки ML прогнозов.
+
+Тестирует:
+- Разрешение наступивших прогнозов одним UPDATE по свечам
+- Инкрементальные агрегаты производительности модели
+- Совпадение с полным пересчётом
+"""
+
+from datetime import UTC, datetime
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+HOUR = 3_600_000
+T0 = int(datetime(2024, 3, 1, tzinfo=UTC).timestamp() * 1000)
+
+
+@pytest.fixture
+async def session_maker(sqlite_db):
+    """In-memory SQLite с таблицами прогнозов и свечей."""
+    from models.candlestick import CandlestickRecord
+    from models.ml_predictions import MLModelPerformance, MLPredictionRecord
+
+    return await sqlite_db(CandlestickRecord, MLPredictionRecord, MLModelPerformance)
+
+
+def forecast(price: float, confidence: float = 60.0):
+    from service.ml.models import ForecastResult
+
+    return ForecastResult(
+        symbol="BTC/USDT",
+        interval="1h",
+        model="test",
+        predictions=[price],
+        confidence_low=[price - 1],
+        confidence_high=[price + 1],
+        direction="up",
+        confidence_pct=confidence,
+        timestamp=datetime.now(UTC),
+        horizon=2,
+    )
+
+
+async def insert_candles(maker, closes: dict[int, float], exchange: str = "binance") -> None:
+    from sqlalchemy import text
+
+    async with maker() as session:
+        await session.execute(
+            text("""
+                INSERT INTO candlestick_records
+                (exchange, symbol, interval, timestamp, open_price, high_price, low_price,
+                 close_price, volume, is_complete, loaded_at)
+                VALUES (:exchange, 'BTC/USDT', '1h', :ts, :close, :close, :close, :close, 1, 1, :loaded_at)
+            """),
+            [
+                {"exchange": exchange, "ts": ts, "close": close, "loaded_at": datetime.now(UTC)}
+                for ts, close in closes.items()
+            ],
+        )
+        await session.commit()
+
+
+async def save(maker, model: str, made_at: int, predicted: float, last_close: float = 100.0, confidence=60.0):
+    from models.repositories.ml_predictions import MLPredictionRepository
+
+    async with maker() as session:
+        await MLPredictionRepository(session).save_prediction(
+            symbol="BTC/USDT",
+            interval="1h",
+            model_name=model,
+            forecast=forecast(predicted, confidence),
+            context_prices=[99.0, last_close],
+            prediction_timestamp=made_at,
+            prediction_horizon=2,
+        )
+
+
+class TestResolution:
+    """Тесты разрешения прогнозов."""
+
+    async def test_due_predictions_resolved_from_candles(self, session_maker):
+        """Наступившие прогнозы получают цену закрытия целевой свечи, остальные ждут."""
+        from models.ml_predictions import MLModelPerformance, MLPredictionRecord
+        from models.repositories.ml_predictions import MLPredictionRepository
+
+        await insert_candles(session_maker, {T0 + 2 * HOUR: 110.0, T0 + 3 * HOUR: 90.0})
+        await insert_candles(session_maker, {T0 + 2 * HOUR: 999.0}, exchange="okx")
+        await save(session_maker, "a", T0, predicted=105.0)  # верное направление
+        await save(session_maker, "b", T0, predicted=95.0)  # неверное направление
+        await save(session_maker, "a", T0 + HOUR, predicted=95.0)  # цель T0+3h: свеча ещё не закрыта
+        await save(session_maker, "a", T0 + 5 * HOUR, predicted=100.0)  # нет свечи
+
+        async with session_maker() as session:
+            resolved = await MLPredictionRepository(session).resolve_due_predictions(now_ms=T0 + 3 * HOUR + 1)
+
+        assert resolved == 2
+        async with session_maker() as session:
+            record = await session.get(MLPredictionRecord, 1)
+            assert float(record.actual_price) == 110.0
+            assert record.actual_timestamp == T0 + 2 * HOUR
+            assert float(record.absolute_error) == pytest.approx(5.0)
+            assert record.direction_correct is True
+            assert (await session.get(MLPredictionRecord, 2)).direction_correct is False
+            assert (await session.get(MLPredictionRecord, 3)).actual_price is None
+
+            perf = await session.get(MLModelPerformance, ("BTC/USDT", "a", "1h"))
+            assert perf.total_predictions == 3
+            assert perf.evaluated_predictions == 1
+            assert float(perf.mean_absolute_error) == pytest.approx(5.0)
+            assert float(perf.direction_accuracy) == pytest.approx(100.0)
+
+    async def test_incremental_matches_rebuild(self, session_maker):
+        """Инкрементальные агрегаты совпадают с полным пересчётом."""
+        from models.repositories.ml_predictions import MLPredictionRepository
+
+        await insert_candles(session_maker, {T0 + (k + 2) * HOUR: 100.0 + k for k in range(6)})
+        for k, predicted in enumerate([101.0, 99.0, 104.0, 102.5, 98.0]):
+            await save(session_maker, "a", T0 + k * HOUR, predicted=predicted, confidence=50.0 + k)
+
+        async with session_maker() as session:
+            repo = MLPredictionRepository(session)
+            await repo.resolve_due_predictions(now_ms=T0 + 4 * HOUR + 1)
+            await repo.update_actual_price(4, 103.0, T0 + 5 * HOUR)
+            await repo.update_actual_price(4, 50.0, T0 + 5 * HOUR)  # повторное разрешение игнорируется
+            await repo.resolve_predictions("BTC/USDT", "1h", T0 + 4 * HOUR, 104.0, T0 + 6 * HOUR)
+            incremental = (await repo.get_model_rankings("BTC/USDT", "1h"))[0]
+
+            perf = await repo.calculate_model_performance("BTC/USDT", "1h", "a")
+            rebuilt = (await repo.get_model_rankings("BTC/USDT", "1h"))[0]
+
+        assert perf.total_predictions == 5
+        assert perf.evaluated_predictions == 4  # прогноз T0+2h ещё не наступил
+        assert perf.direction_count == 4
+        for key in ("confidence_coefficient", "mean_absolute_error", "direction_accuracy", "evaluated_predictions"):
+            assert incremental[key] == pytest.approx(rebuilt[key])
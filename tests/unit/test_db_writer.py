@@ -0,0 +1,108 @@
+"""
+DB Writer Tests - Тесты очереди единственного писателя SQLite.
+
+Тестирует:
+- Прагмы профиля SQLite (WAL, synchronous=NORMAL)
+- Объединение записей в одну транзакцию
+- Изоляцию ошибочной записи от остальных в пакете
+- Прямую запись без очереди для PostgreSQL
+"""
+
+import asyncio
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+@pytest.fixture
+async def write_engine(tmp_path):
+    """Файловая SQLite с профилем писателя и таблицей kv."""
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from models.session import configure_sqlite_engine
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'writer.db'}", pool_size=1, max_overflow=0)
+    configure_sqlite_engine(engine, begin="BEGIN IMMEDIATE")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE kv (key INTEGER PRIMARY KEY, value TEXT)"))
+    yield engine
+    await engine.dispose()
+
+
+def insert(key: int, commit: bool = True):
+    from sqlalchemy import text
+
+    async def write(session):
+        await session.execute(text("INSERT INTO kv (key, value) VALUES (:key, 'v')"), {"key": key})
+        if commit:
+            await session.commit()
+        return key
+
+    return write
+
+
+async def count_rows(engine) -> int:
+    from sqlalchemy import text
+
+    async with engine.connect() as conn:
+        return (await conn.execute(text("SELECT COUNT(*) FROM kv"))).scalar()
+
+
+class TestWriteQueue:
+    """Тесты очереди записи."""
+
+    async def test_pragmas_applied(self, write_engine):
+        """Соединения открываются в режиме WAL с synchronous=NORMAL."""
+        from sqlalchemy import text
+
+        async with write_engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+
+    async def test_concurrent_writes_batched(self, write_engine):
+        """Параллельные записи объединяются в пакеты, commit репозитория не ломает пакет."""
+        from models.writer import WriteQueue
+
+        queue = WriteQueue(write_engine)
+        results = await asyncio.gather(*(queue.submit(insert(k, commit=k % 2 == 0)) for k in range(50)))
+
+        assert results == list(range(50))
+        assert await count_rows(write_engine) == 50
+        stats = queue.get_stats()
+        assert stats["batches"] < 50
+        assert stats["largest_batch"] > 1
+        await queue.close()
+
+    async def test_failed_write_isolated(self, write_engine):
+        """Ошибка одной записи не откатывает остальные записи пакета."""
+        from sqlalchemy.exc import IntegrityError
+
+        from models.writer import WriteQueue
+
+        queue = WriteQueue(write_engine)
+        results = await asyncio.gather(*(queue.submit(insert(k)) for k in (1, 2, 2, 3)), return_exceptions=True)
+
+        assert results[0] == 1 and results[1] == 2 and results[3] == 3
+        assert isinstance(results[2], IntegrityError)
+        assert await count_rows(write_engine) == 3
+        assert queue.get_stats()["failed"] == 1
+        await queue.close()
+
+    async def test_run_write_without_sqlite(self, monkeypatch):
+        """Вне SQLite запись выполняется сразу в собственной сессии."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        from models import writer
+
+        session = MagicMock()
+        session.commit = AsyncMock()
+        maker = MagicMock()
+        maker.return_value.__aenter__ = AsyncMock(return_value=session)
+        maker.return_value.__aexit__ = AsyncMock(return_value=False)
+        monkeypatch.setattr("models.session.async_session_maker", maker)
+        monkeypatch.setattr(writer, "get_write_queue", lambda: None)
+
+        assert await writer.run_write(AsyncMock(return_value=7)) == 7
+        session.commit.assert_awaited_once()
@@ -12,8 +12,6 @@ from service.ha_integration import (
     SupervisorAPIClient,
     get_supervisor_client,
     notify,
-    notify_error,
-    notify_sync_complete,
 )
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -327,81 +325,6 @@ class TestGlobalFunctions:
         # Cleanup
         ha_int._supervisor_client = None
 
-    @pytest.mark.asyncio
-    async def test_notify_sync_complete_all_success(self):
-        import service.ha_integration as ha_int
-
-        ha_int._supervisor_client = None
-
-        with patch("service.ha_integration.notify", new_callable=AsyncMock, return_value=True) as mock_notify:
-            result = await notify_sync_complete(success_count=10, failure_count=0, duration_seconds=5.5)
-
-            assert result is True
-            call_args = mock_notify.call_args
-            message = call_args.kwargs["message"]
-            assert "completed" in message
-            assert "Success: 10/10" in message
-            assert "Failed: 0" in message
-            assert "5.5s" in message
-
-        # Cleanup
-        ha_int._supervisor_client = None
-
-    @pytest.mark.asyncio
-    async def test_notify_sync_complete_with_errors(self):
-        import service.ha_integration as ha_int
-
-        ha_int._supervisor_client = None
-
-        with patch("service.ha_integration.notify", new_callable=AsyncMock, return_value=True) as mock_notify:
-            result = await notify_sync_complete(success_count=8, failure_count=2, duration_seconds=10.0)
-
-            assert result is True
-            call_args = mock_notify.call_args
-            message = call_args.kwargs["message"]
-            assert "completed with errors" in message
-            assert "Success: 8/10" in message
-            assert "Failed: 2" in message
-
-        # Cleanup
-        ha_int._supervisor_client = None
-
-    @pytest.mark.asyncio
-    async def test_notify_error_basic(self):
-        import service.ha_integration as ha_int
-
-        ha_int._supervisor_client = None
-
-        with patch("service.ha_integration.notify", new_callable=AsyncMock, return_value=True) as mock_notify:
-            result = await notify_error("Connection failed")
-
-            assert result is True
-            call_args = mock_notify.call_args
-            message = call_args.kwargs["message"]
-            assert "Error: Connection failed" in message
-            assert "Context" not in message
-
-        # Cleanup
-        ha_int._supervisor_client = None
-
-    @pytest.mark.asyncio
-    async def test_notify_error_with_context(self):
-        import service.ha_integration as ha_int
-
-        ha_int._supervisor_client = None
-
-        with patch("service.ha_integration.notify", new_callable=AsyncMock, return_value=True) as mock_notify:
-            result = await notify_error("API error", context="Binance fetch")
-
-            assert result is True
-            call_args = mock_notify.call_args
-            message = call_args.kwargs["message"]
-            assert "Error: API error" in message
-            assert "Context: Binance fetch" in message
-
-        # Cleanup
-        ha_int._supervisor_client = None
-
 
 # ═══════════════════════════════════════════════════════════════════════════
 #                      Constants Tests
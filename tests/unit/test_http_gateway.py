@@ -0,0 +1,154 @@
+"""
+HTTP Gateway Tests - Тесты общего HTTP шлюза.
+
+Тестирует:
+- Single-flight для одинаковых GET-запросов и отмену ведущего запроса
+- Ограниченный LRU/TTL кэш и ревалидацию по ETag
+- Токен-бакет и паузу хоста после 429
+- Перевод анализаторов на шлюз
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+def make_gateway(handler, clock=None):
+    """Шлюз с MockTransport вместо сети."""
+    from core.http_gateway import HttpGateway
+
+    gateway = HttpGateway(clock=clock) if clock else HttpGateway()
+    transport = httpx.MockTransport(handler)
+    gateway._pool = lambda host: httpx.AsyncClient(transport=transport)
+    return gateway
+
+
+class TestHttpGateway:
+    """Тесты шлюза."""
+
+    async def test_identical_gets_share_one_request(self):
+        """Параллельные одинаковые GET выполняются одним запросом."""
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(str(request.url))
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"n": len(calls)})
+
+        gateway = make_gateway(handler)
+        client = gateway.client()
+        responses = await asyncio.gather(
+            *(client.get("https://api.example.com/data", params={"a": 1}) for _ in range(5))
+        )
+
+        assert len(calls) == 1
+        assert [r.json() for r in responses] == [{"n": 1}] * 5
+        assert gateway.get_stats()["hosts"]["api.example.com"]["shared"] == 4
+
+    async def test_cancelled_leader_does_not_cancel_waiters(self):
+        """Отмена ведущего запроса не отменяет присоединившихся: один из них повторяет запрос."""
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(str(request.url))
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"n": len(calls)})
+
+        gateway = make_gateway(handler)
+        client = gateway.client()
+        url = "https://api.example.com/data"
+
+        leader = asyncio.create_task(client.get(url))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(client.get(url)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        responses = await asyncio.gather(*waiters)
+        assert leader.cancelled()
+        assert len(calls) == 2
+        assert [r.json() for r in responses] == [{"n": 2}] * 3
+        assert gateway.get_stats()["hosts"]["api.example.com"]["shared"] == 2
+
+    async def test_cache_ttl_and_etag_revalidation(self, clock):
+        """Свежий ответ берётся из кэша, устаревший ревалидируется по ETag."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"v": 1}, headers={"ETag": '"v1"'})
+
+        gateway = make_gateway(handler, clock)
+        client = gateway.client(cache_ttl=60)
+        url = "https://api.example.com/v"
+
+        assert (await client.get(url)).json() == {"v": 1}
+        assert (await client.get(url)).json() == {"v": 1}
+        assert seen == [None]
+
+        clock.now += 61
+        response = await client.get(url)
+        assert response.status_code == 200 and response.json() == {"v": 1}
+        assert seen == [None, '"v1"']
+        host = gateway.get_stats()["hosts"]["api.example.com"]
+        assert host["cache_hits"] == 1 and host["revalidated"] == 1
+
+    def test_cache_bounded(self):
+        """Кэш вытесняет старые записи по числу и объёму."""
+        from core.http_gateway import CachedResponse, ResponseCache
+
+        cache = ResponseCache(max_entries=3, max_bytes=250)
+        for i in range(5):
+            cache.put(f"k{i}", CachedResponse(f"https://h/{i}", 200, [], b"x" * 100, expires_at=1e12))
+
+        assert len(cache) == 2
+        assert cache.size_bytes == 200
+        assert cache.get("k4")[0] is not None and cache.get("k0")[0] is None
+        assert cache.evictions == 3
+
+    async def test_token_bucket_and_retry_after(self, monkeypatch, clock):
+        """Бакет ограничивает частоту, 429 с Retry-After приостанавливает хост."""
+        from core.http_gateway import TokenBucket
+
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+            clock.now += delay
+
+        monkeypatch.setattr("core.http_gateway.asyncio.sleep", fake_sleep)
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+
+        assert [await bucket.acquire() for _ in range(3)] == [0.0, 0.0, pytest.approx(0.5)]
+        bucket.pause(10)
+        waited = await bucket.acquire()
+
+        assert waited >= 10
+        assert sum(sleeps) == pytest.approx(0.5 + waited)
+
+    async def test_analyzers_use_gateway(self):
+        """Анализаторы получают клиент шлюза вместо собственного httpx.AsyncClient."""
+        from core.http_gateway import GatewayClient
+        from service.analysis.derivatives import DerivativesAnalyzer
+        from service.analysis.gas import GasTracker
+        from service.analysis.whales import WhaleTracker
+
+        for analyzer in (DerivativesAnalyzer(), GasTracker(), WhaleTracker()):
+            assert isinstance(await analyzer._get_client(), GatewayClient)
+            await analyzer.close()
+
+    def test_client_keeps_declared_host_limits(self):
+        """Создание клиента не переопределяет лимит хоста из HOST_LIMITS."""
+        from core.http_client import CoinGeckoClient
+        from core.http_gateway import HOST_LIMITS, get_http_gateway
+
+        CoinGeckoClient()
+        CoinGeckoClient()
+
+        host = "api.coingecko.com"
+        assert get_http_gateway()._limits[host] == HOST_LIMITS[host]
@@ -0,0 +1,132 @@
+"""
+Publisher Mirror Tests - Тесты локального зеркала состояний сущностей HA.
+
+Тестирует:
+- Один POST на обновление атрибутов (без GET)
+- Слияние атрибутов в памяти
+- Сверку с HA при старте и после ошибки записи
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+def make_client(states=None, set_state_ok=True):
+    """Мок SupervisorAPIClient с HTTP-клиентом для GET."""
+    client = MagicMock()
+    client.is_available = True
+    client.set_state = AsyncMock(return_value=set_state_ok)
+
+    response = MagicMock()
+    response.status_code = 200
+    response.raise_for_status = MagicMock()
+    response.json = MagicMock(return_value=states if states is not None else [])
+
+    http = MagicMock()
+    http.get = AsyncMock(return_value=response)
+    client._get_client = AsyncMock(return_value=http)
+    client.http = http
+    return client
+
+
+@pytest.fixture(autouse=True)
+def no_db(monkeypatch):
+    """Отключаем сохранение состояний в БД."""
+    from service.ha.core.publisher import SupervisorPublisher
+
+    monkeypatch.setattr(SupervisorPublisher, "_save_sensor_state", AsyncMock())
+
+
+class TestEntityMirror:
+    """Тесты зеркала состояний."""
+
+    async def test_publish_then_attributes_single_post_each(self):
+        """Атрибуты сливаются в памяти: без GET, по одному POST."""
+        from service.ha.core.publisher import SupervisorPublisher
+
+        client = make_client()
+        publisher = SupervisorPublisher(client=client)
+
+        await publisher.create_sensor("gold_price", {"friendly_name": "Gold", "icon": "mdi:gold"}, "0")
+        await publisher.publish_sensor("gold_price", "2400.5", {"change_24h": 1.2})
+        assert await publisher.update_attributes("gold_price", {"high": 2410})
+
+        client.http.get.assert_not_called()
+        assert client.set_state.await_count == 3
+
+        last = client.set_state.await_args.kwargs
+        assert last["entity_id"] == "sensor.crypto_inspect_gold_price"
+        assert last["state"] == "2400.5"
+        assert last["attributes"]["friendly_name"] == "Gold"
+        assert last["attributes"]["change_24h"] == 1.2
+        assert last["attributes"]["high"] == 2410
+
+    async def test_publish_keeps_registration_attributes(self):
+        """Публикация состояния не теряет атрибуты регистрации."""
+        from service.ha.core.publisher import SupervisorPublisher
+
+        client = make_client()
+        publisher = SupervisorPublisher(client=client)
+
+        await publisher.create_sensor("vix_index", {"friendly_name": "VIX", "unit_of_measurement": "pts"})
+        await publisher.publish_sensor("vix_index", "18.2")
+
+        attrs = client.set_state.await_args.kwargs["attributes"]
+        assert attrs["friendly_name"] == "VIX"
+        assert attrs["unit_of_measurement"] == "pts"
+        assert publisher.get_mirrored_state("vix_index").state == "18.2"
+
+    async def test_reconcile_seeds_mirror(self):
+        """Сверка при старте загружает только свои сущности одним GET."""
+        from service.ha.core.publisher import SupervisorPublisher
+
+        client = make_client(
+            states=[
+                {"entity_id": "sensor.crypto_inspect_dxy_index", "state": "104", "attributes": {"a": 1}},
+                {"entity_id": "sensor.other", "state": "x", "attributes": {}},
+            ]
+        )
+        publisher = SupervisorPublisher(client=client)
+
+        assert await publisher.reconcile() == 1
+        assert await publisher.update_attributes("dxy_index", {"change_24h": -0.3})
+
+        assert client.http.get.await_count == 1
+        kwargs = client.set_state.await_args.kwargs
+        assert kwargs["state"] == "104"
+        assert kwargs["attributes"] == {"a": 1, "change_24h": -0.3}
+
+    async def test_unknown_entity_fetched_once(self):
+        """Неизвестная сущность читается из HA один раз."""
+        from service.ha.core.publisher import SupervisorPublisher
+
+        client = make_client(states={"state": "5", "attributes": {"friendly_name": "X"}})
+        publisher = SupervisorPublisher(client=client)
+
+        await publisher.update_attributes("eur_usd", {"change_24h": 0.1})
+        await publisher.update_attributes("eur_usd", {"change_24h": 0.2})
+
+        assert client.http.get.await_count == 1
+        assert client.set_state.await_args.kwargs["attributes"] == {"friendly_name": "X", "change_24h": 0.2}
+
+    async def test_failed_write_triggers_reread(self):
+        """После ошибки записи состояние перечитывается из HA."""
+        from service.ha.core.publisher import SupervisorPublisher
+
+        client = make_client(states={"state": "1", "attributes": {"friendly_name": "Oil"}})
+        publisher = SupervisorPublisher(client=client)
+
+        await publisher.create_sensor("oil_wti", {"friendly_name": "Oil"})
+        client.set_state.return_value = False
+        assert not await publisher.publish_sensor("oil_wti", "80")
+        assert publisher.get_mirrored_state("oil_wti") is None
+
+        client.set_state.return_value = True
+        assert await publisher.publish_sensor("oil_wti", "81", {"change_24h": 1.0})
+
+        assert client.http.get.await_count == 1
+        assert client.set_state.await_args.kwargs["attributes"] == {"friendly_name": "Oil", "change_24h": 1.0}
+        assert publisher.get_stats()["errors"] == 1
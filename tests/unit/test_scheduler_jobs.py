@@ -229,8 +229,8 @@ class TestCandlestickSyncJob:
             patch("core.scheduler.jobs.get_currency_list_async", new_callable=AsyncMock, return_value=["BTC/USDT", "ETH/USDT"]),
             patch("core.scheduler.jobs.get_intervals_to_fetch", return_value=["1m"]),
             patch("core.scheduler.jobs.fetch_and_save_candlesticks", new_callable=AsyncMock) as mock_fetch,
-            patch("service.ha_integration.notify_error", new_callable=AsyncMock),
-            patch("service.ha_integration.notify_sync_complete", new_callable=AsyncMock),
+            patch("service.alerts.notification_bus.publish_error", new_callable=AsyncMock),
+            patch("service.alerts.notification_bus.publish_notification", new_callable=AsyncMock),
         ):
             mock_fetch.return_value = True
             await candlestick_sync_job()
@@ -248,12 +248,13 @@ class TestCandlestickSyncJob:
             patch("core.scheduler.jobs.get_symbols", return_value=["BTC/USDT"]),
             patch("core.scheduler.jobs.get_intervals_to_fetch", return_value=["1m"]),
             patch("core.scheduler.jobs.fetch_and_save_candlesticks", new_callable=AsyncMock) as mock_fetch,
-            patch("service.ha_integration.notify_error", new_callable=AsyncMock) as mock_notify,
-            patch("service.ha_integration.notify_sync_complete", new_callable=AsyncMock),
+            patch("service.alerts.notification_bus.publish_error", new_callable=AsyncMock) as mock_notify,
+            patch("service.alerts.notification_bus.publish_notification", new_callable=AsyncMock),
         ):
             mock_fetch.return_value = False
             await candlestick_sync_job()
             mock_notify.assert_called_once()
+            assert mock_notify.call_args.kwargs["notification_id"] == "crypto_inspect_sync_error"
 
 
 class TestMarketAnalysisJob:
@@ -264,15 +265,8 @@ class TestMarketAnalysisJob:
         """Should analyze all configured symbols."""
         from core.scheduler.jobs import market_analysis_job
 
-        mock_onchain = MagicMock()
-        mock_onchain.analyze = AsyncMock(
-            return_value=MagicMock(fear_greed=MagicMock(value=50, classification="Neutral"))
-        )
-        mock_onchain.close = AsyncMock()
-
-        mock_deriv = MagicMock()
-        mock_deriv.analyze = AsyncMock(return_value=MagicMock(funding=None, long_short=None))
-        mock_deriv.close = AsyncMock()
+        mock_onchain = AsyncMock(return_value=MagicMock(fear_greed=MagicMock(value=50, classification="Neutral")))
+        mock_deriv = AsyncMock(return_value=MagicMock(funding=None, long_short=None))
 
         mock_score = MagicMock()
         mock_score.calculate = MagicMock(
@@ -287,8 +281,8 @@ class TestMarketAnalysisJob:
 
         with (
             patch("core.scheduler.jobs.get_symbols", return_value=["BTC/USDT"]),
-            patch("service.analysis.OnChainAnalyzer", return_value=mock_onchain),
-            patch("service.analysis.DerivativesAnalyzer", return_value=mock_deriv),
+            patch("service.analysis.market_facts.get_onchain_metrics", mock_onchain),
+            patch("service.analysis.market_facts.get_derivatives", mock_deriv),
             patch("service.analysis.ScoringEngine", return_value=mock_score),
             patch("service.analysis.CycleDetector"),
             patch("service.ha_integration.notify", new_callable=AsyncMock),
@@ -316,13 +310,8 @@ class TestInvestorAnalysisJob:
         mock_analyzer.analyze = AsyncMock(return_value=mock_status)
         mock_analyzer.get_alert_if_needed = MagicMock(return_value=None)
 
-        mock_onchain = MagicMock()
-        mock_onchain.analyze = AsyncMock(return_value=MagicMock(fear_greed=MagicMock(value=50)))
-        mock_onchain.close = AsyncMock()
-
-        mock_deriv = MagicMock()
-        mock_deriv.analyze = AsyncMock(return_value=MagicMock(funding=None, long_short=None))
-        mock_deriv.close = AsyncMock()
+        mock_fear_greed = AsyncMock(return_value=MagicMock(value=50, classification="Neutral"))
+        mock_deriv = AsyncMock(return_value=MagicMock(funding=None, long_short=None))
 
         mock_sensors = MagicMock()
         mock_sensors.update_investor_status = AsyncMock()
@@ -330,8 +319,9 @@ class TestInvestorAnalysisJob:
 
         with (
             patch("service.analysis.get_investor_analyzer", return_value=mock_analyzer),
-            patch("service.analysis.OnChainAnalyzer", return_value=mock_onchain),
-            patch("service.analysis.DerivativesAnalyzer", return_value=mock_deriv),
+            patch("service.analysis.market_facts.get_fear_greed", mock_fear_greed),
+            patch("service.analysis.market_facts.get_btc_dominance", AsyncMock(return_value=55.0)),
+            patch("service.analysis.market_facts.get_derivatives", mock_deriv),
             patch("service.analysis.CycleDetector"),
             patch("service.ha.get_sensors_manager", return_value=mock_sensors),
             patch("service.ha_integration.notify", new_callable=AsyncMock),
@@ -605,7 +595,8 @@ class TestPriceAlertsJob:
         with (
             patch("service.alerts.get_alert_manager", return_value=mock_alerts_manager),
             patch("service.ha.get_sensors_manager", return_value=mock_sensors),
-            patch("service.ha_integration.notify", new_callable=AsyncMock) as mock_notify,
+            patch("service.alerts.notification_bus.publish_notification", new_callable=AsyncMock) as mock_publish,
         ):
             await price_alerts_job()
-            mock_notify.assert_called_once()
+            mock_publish.assert_called_once()
+            assert mock_publish.call_args.kwargs["category"].value == "price"
@@ -0,0 +1,244 @@
+"""
+Scheduler Telemetry Tests - Тесты телеметрии планировщика.
+
+Тестирует:
+- Гистограммы длительности и счётчики запусков
+- Учёт HTTP-запросов и SQL-запросов на запуск задачи, включая записи через очередь писателя
+- Пропуски (overlap/missed)
+- Монитор задержки цикла событий
+- Экспорт в формате Prometheus
+"""
+
+import asyncio
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+@pytest.fixture
+def telemetry():
+    from core.scheduler.telemetry import SchedulerTelemetry
+
+    return SchedulerTelemetry(lag_interval=0.01, stall_threshold=0.05)
+
+
+class TestJobInstrumentation:
+    """Тесты обёртки задач."""
+
+    async def test_run_counts_and_duration(self, telemetry):
+        """Успешные и неудачные запуски учитываются с длительностью."""
+
+        async def ok_job():
+            await asyncio.sleep(0)
+
+        async def bad_job():
+            raise RuntimeError("boom")
+
+        await telemetry.wrap("ok_job", ok_job)()
+        await telemetry.wrap("ok_job", ok_job)()
+        with pytest.raises(RuntimeError):
+            await telemetry.wrap("bad_job", bad_job)()
+
+        ok = telemetry.jobs["ok_job"]
+        assert ok.runs_ok == 2
+        assert ok.durations.count == 2
+        assert ok.running == 0
+        assert telemetry.jobs["bad_job"].runs_error == 1
+
+    async def test_http_and_db_attributed_to_job(self, telemetry):
+        """HTTP и SQL запросы относятся к выполняющейся задаче."""
+
+        async def child():
+            telemetry.record_db_statement()
+
+        async def job():
+            telemetry.record_http_request()
+            telemetry.record_http_request()
+            # Child tasks inherit the job context
+            await asyncio.create_task(child())
+
+        await telemetry.wrap("job", job)()
+        telemetry.record_http_request()
+
+        metrics = telemetry.jobs["job"]
+        assert metrics.last_http_requests == 2
+        assert metrics.last_db_statements == 1
+        assert telemetry.http_requests_untracked == 1
+
+    async def test_swallowed_failure_recorded(self, telemetry):
+        """Задача, перехватившая ошибку, отмечает запуск как неудачный."""
+        from core.scheduler.telemetry import record_job_failure
+
+        async def job():
+            try:
+                raise ValueError("no data")
+            except Exception as e:
+                record_job_failure(e)
+
+        await telemetry.wrap("job", job)()
+        record_job_failure("outside a run")
+
+        metrics = telemetry.jobs["job"]
+        assert (metrics.runs_ok, metrics.runs_error) == (0, 1)
+        assert metrics.last_error == "no data"
+
+    async def test_http_hook_counts_gateway_requests(self, telemetry):
+        """HTTP-запросы через шлюз считаются event hook'ом, httpx не патчится."""
+        import httpx
+
+        from core.http_gateway import HttpGateway
+
+        send = httpx.AsyncClient.send
+        gateway = HttpGateway(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+        telemetry.install_http_hook(gateway)
+        telemetry.install_http_hook(gateway)
+
+        async def job():
+            client = gateway.client()
+            await client.get("https://api.example.com/a")
+            await client.get("https://api.example.com/b")
+
+        await telemetry.wrap("http_job", job)()
+        await gateway.close()
+
+        assert telemetry.jobs["http_job"].last_http_requests == 2
+        assert httpx.AsyncClient.send is send
+
+    async def test_db_hook_counts_statements(self, telemetry, sqlite_db):
+        """Хук SQLAlchemy считает выполненные запросы."""
+        from sqlalchemy import text
+
+        from models import session as db
+
+        maker = await sqlite_db()
+        telemetry.install_db_hook(db.engine)
+
+        async def job():
+            async with maker() as session:
+                await session.execute(text("SELECT 1"))
+                await session.execute(text("SELECT 2"))
+
+        await telemetry.wrap("db_job", job)()
+
+        assert telemetry.jobs["db_job"].db_statements == 2
+
+    async def test_queued_writes_attributed_to_submitting_job(self, telemetry, tmp_path):
+        """Записи через очередь писателя считаются в задаче, которая их отправила."""
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        from models.session import configure_sqlite_engine
+        from models.writer import WriteQueue
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'writer.db'}", pool_size=1, max_overflow=0)
+        configure_sqlite_engine(engine, begin="BEGIN IMMEDIATE")
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE kv (key INTEGER PRIMARY KEY)"))
+        telemetry.install_db_hook(engine)
+        queue = WriteQueue(engine)
+
+        def insert(key: int):
+            return lambda session: session.execute(text("INSERT INTO kv (key) VALUES (:key)"), {"key": key})
+
+        async def many():
+            await asyncio.gather(*(queue.submit(insert(k)) for k in range(3)))
+
+        async def one():
+            await queue.submit(insert(10))
+
+        # Обе задачи пишут одновременно: записи попадают в общий пакет
+        await asyncio.gather(telemetry.wrap("many_job", many)(), telemetry.wrap("one_job", one)())
+        await queue.close()
+        await engine.dispose()
+
+        assert telemetry.jobs["many_job"].db_statements == 3
+        assert telemetry.jobs["one_job"].db_statements == 1
+        assert queue.get_stats()["largest_batch"] > 1
+
+    def test_scheduler_events(self, telemetry):
+        """События max_instances и missed учитываются как пропуски."""
+        from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, JobEvent
+
+        telemetry._on_scheduler_event(JobEvent(EVENT_JOB_MAX_INSTANCES, "slow_job", "default"))
+        telemetry._on_scheduler_event(JobEvent(EVENT_JOB_MISSED, "slow_job", "default"))
+
+        assert telemetry.jobs["slow_job"].skipped_overlap == 1
+        assert telemetry.jobs["slow_job"].missed == 1
+
+    def test_attach_wraps_registered_jobs(self, telemetry):
+        """attach оборачивает задачи планировщика."""
+        from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+        async def job():
+            pass
+
+        sched = AsyncIOScheduler()
+        sched.add_job(job, "interval", seconds=60, id="job")
+        telemetry.attach(sched)
+
+        assert sched.get_job("job").func.__telemetry_job_id__ == "job"
+        assert "job" in telemetry.jobs
+
+
+class TestLoopLagMonitor:
+    """Тесты монитора задержки цикла событий."""
+
+    async def test_blocking_call_detected(self, telemetry):
+        """Блокирующий вызов фиксируется как stall и относится к задаче."""
+        import time
+
+        async def blocking_job():
+            await asyncio.sleep(0.02)
+            time.sleep(0.1)  # Blocks the loop
+            await asyncio.sleep(0.02)
+
+        telemetry.loop_monitor.start()
+        await telemetry.wrap("blocking_job", blocking_job)()
+        await telemetry.stop()
+
+        assert telemetry.loop_monitor.stalls >= 1
+        assert telemetry.jobs["blocking_job"].loop_stalls >= 1
+        assert telemetry.loop_monitor.max_lag >= 0.05
+
+    def test_window_max_resets(self, telemetry):
+        """Окно максимума сбрасывается после чтения."""
+        monitor = telemetry.loop_monitor
+        monitor.record(0.03)
+        monitor.record(0.01)
+
+        assert monitor.take_window_max() == 0.03
+        assert monitor.take_window_max() == 0.0
+        assert monitor.max_lag == 0.03
+
+
+class TestExport:
+    """Тесты экспорта метрик."""
+
+    async def test_prometheus_format(self, telemetry):
+        """Метрики рендерятся в текстовом формате Prometheus."""
+
+        async def job():
+            pass
+
+        await telemetry.wrap("gas_tracker_job", job)()
+        telemetry.loop_monitor.record(0.002)
+        text = telemetry.render_prometheus()
+
+        assert "# TYPE crypto_inspect_job_duration_seconds histogram" in text
+        assert 'crypto_inspect_job_duration_seconds_bucket{job="gas_tracker_job",le="+Inf"} 1' in text
+        assert 'crypto_inspect_job_runs_total{job="gas_tracker_job",status="ok"} 1' in text
+        assert 'crypto_inspect_event_loop_lag_seconds_bucket{le="0.005"} 1' in text
+        assert "crypto_inspect_event_loop_lag_seconds_count 1" in text
+        assert text.endswith("\n")
+
+    async def test_sensor_payload(self, telemetry):
+        """Данные диагностического сенсора."""
+        telemetry.loop_monitor.record(0.3)
+        telemetry._metrics("slow_job").max_duration = 12.5
+
+        lag_ms, attributes = telemetry.get_sensor_payload()
+
+        assert lag_ms == 300.0
+        assert attributes["slowest_jobs"] == {"slow_job": 12.5}
+        assert attributes["loop_stalls"] == 1
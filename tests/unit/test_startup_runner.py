@@ -0,0 +1,212 @@
+"""
+Startup Tests - Тесты ускоренного запуска.
+
+Тестирует:
+- StartupJobRunner (параллельный запуск с зависимостями)
+- LazyModule (отложенный импорт)
+- BootTimeline (время до первого сенсора)
+"""
+
+import asyncio
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+
+class TestStartupJobRunner:
+    """Тесты для StartupJobRunner."""
+
+    async def test_independent_jobs_run_concurrently(self):
+        """Независимые задачи выполняются параллельно."""
+        from core.scheduler.startup import StartupJob, StartupJobRunner
+
+        running = 0
+        peak = 0
+
+        async def job():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        runner = StartupJobRunner([StartupJob(f"job{i}", job) for i in range(6)], concurrency=3)
+        report = await runner.run()
+
+        assert peak == 3
+        assert len(report.results) == 6
+        assert report.failed == []
+
+    async def test_dependencies_respected(self):
+        """Зависимая задача запускается после завершения зависимостей."""
+        from core.scheduler.startup import StartupJob, StartupJobRunner
+
+        order = []
+
+        def make(name, delay):
+            async def job():
+                await asyncio.sleep(delay)
+                order.append(name)
+
+            return job
+
+        runner = StartupJobRunner(
+            [
+                StartupJob("briefing", make("briefing", 0), depends_on=("facts",)),
+                StartupJob("facts", make("facts", 0.02)),
+                StartupJob("gas", make("gas", 0)),
+            ]
+        )
+        await runner.run()
+
+        assert order.index("facts") < order.index("briefing")
+        assert order[0] == "gas"
+
+    async def test_failed_dependency_does_not_block(self):
+        """Ошибка зависимости не отменяет зависимые задачи."""
+        from core.scheduler.startup import StartupJob, StartupJobRunner
+
+        ran = []
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        async def dependent():
+            ran.append("dependent")
+
+        runner = StartupJobRunner([StartupJob("a", failing), StartupJob("b", dependent, depends_on=("a",))])
+        report = await runner.run()
+
+        assert ran == ["dependent"]
+        assert report.failed == ["a"]
+        assert report.to_dict()["jobs"] == 2
+
+    def test_cycle_rejected(self):
+        """Циклические зависимости отклоняются."""
+        from core.scheduler.startup import StartupJob, StartupJobRunner
+
+        async def job():
+            pass
+
+        with pytest.raises(ValueError):
+            StartupJobRunner([StartupJob("a", job, ("b",)), StartupJob("b", job, ("a",))])
+        with pytest.raises(ValueError):
+            StartupJobRunner([StartupJob("a", job, ("missing",))])
+
+    def test_heavy_jobs_depend_on_light(self):
+        """ML и бэктест ждут завершения лёгких задач."""
+        from unittest.mock import MagicMock
+
+        from core.scheduler import _build_startup_jobs
+
+        settings = MagicMock()
+        settings.has_bybit_credentials.return_value = False
+        settings.AI_ENABLED = True
+        jobs = {job.name: job for job in _build_startup_jobs(settings)}
+
+        assert "bybit_sync" not in jobs
+        assert jobs["ai_analysis"].depends_on == ("investor_analysis",)
+        assert "currency_list_monitor" in jobs["ml_prediction"].depends_on
+        assert "ml_prediction" not in jobs["backtest"].depends_on
+
+    async def test_startup_report_stored(self, monkeypatch):
+        """Отчёт фонового запуска доступен через get_startup_report(), запуски попадают в телеметрию."""
+        from unittest.mock import MagicMock
+
+        import core.scheduler as scheduler
+        from core.scheduler import telemetry
+        from core.scheduler.startup import StartupJob
+
+        async def job():
+            pass
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        async def no_sleep(_):
+            pass
+
+        monkeypatch.setattr(scheduler, "_startup_report", None)
+        monkeypatch.setattr(telemetry, "_telemetry", telemetry.SchedulerTelemetry())
+        monkeypatch.setattr(
+            scheduler, "_build_startup_jobs", lambda settings: [StartupJob("ok", job), StartupJob("bad", failing)]
+        )
+        monkeypatch.setattr(asyncio, "sleep", no_sleep)
+        monkeypatch.setattr("service.ha.get_ha_manager", lambda: MagicMock())
+
+        await scheduler._run_critical_startup_jobs()
+
+        report = scheduler.get_startup_report()
+        assert report is not None
+        assert {r.name for r in report.results} == {"ok", "bad"}
+        assert report.failed == ["bad"]
+
+        jobs = telemetry.get_scheduler_telemetry().jobs
+        assert jobs["startup:ok"].runs_ok == 1
+        assert jobs["startup:bad"].runs_error == 1
+
+
+class TestLazyImport:
+    """Тесты для lazy_import."""
+
+    def test_import_deferred_until_access(self):
+        """Модуль импортируется только при обращении к атрибуту."""
+        import sys
+
+        from core.lazy_import import get_import_timings, lazy_import
+
+        sys.modules.pop("colorsys", None)
+        module = lazy_import("colorsys")
+
+        assert not module.is_loaded
+        assert "colorsys" not in sys.modules
+        assert module.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1)
+        assert module.is_loaded
+        assert "colorsys" in get_import_timings()
+
+    def test_module_available(self):
+        """Проверка наличия модуля без импорта."""
+        from core.lazy_import import module_available
+
+        assert module_available("json", "asyncio")
+        assert not module_available("json", "definitely_not_installed_pkg")
+
+    def test_missing_module_raises_on_access(self):
+        """Отсутствующий модуль вызывает ImportError при обращении."""
+        from core.lazy_import import lazy_import
+
+        module = lazy_import("definitely_not_installed_pkg")
+        with pytest.raises(ImportError):
+            module.anything
+
+
+class TestBootTimeline:
+    """Тесты для BootTimeline."""
+
+    def test_stages_and_first_sensor(self):
+        """Этапы запуска и первый сенсор фиксируются один раз."""
+        from core.boot import BootTimeline
+
+        timeline = BootTimeline()
+        with timeline.stage("ha_connect"):
+            pass
+        timeline.mark_first_sensor("fear_greed")
+        timeline.mark_first_sensor("prices")
+
+        data = timeline.to_dict()
+        assert data["stages"][0]["name"] == "ha_connect"
+        assert data["stages"][0]["duration_ms"] is not None
+        assert data["first_sensor"] == "fear_greed"
+        assert data["time_to_first_sensor_s"] is not None
+
+    def test_stage_error_recorded(self):
+        """Ошибка этапа сохраняется и пробрасывается."""
+        from core.boot import BootTimeline
+
+        timeline = BootTimeline()
+        with pytest.raises(RuntimeError):
+            with timeline.stage("services"):
+                raise RuntimeError("port busy")
+
+        assert timeline.stages[0].error == "port busy"
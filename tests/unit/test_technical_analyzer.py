@@ -149,6 +149,19 @@ class TestMACDCalculation:
         assert signal_line is None
         assert histogram is None
 
+    def test_rsi_and_macd_series_match_prefix_calls(self):
+        """One-pass RSI/MACD series should equal the per-prefix values."""
+        analyzer = TechnicalAnalyzer()
+        prices = [100 + (i % 7) * 1.5 - (i % 11) + i * 0.2 for i in range(120)]
+
+        rsi_series = analyzer.calc_rsi_series(prices)
+        assert rsi_series == [analyzer.calc_rsi(prices[: i + 1]) for i in range(14, len(prices))]
+
+        hist_series = analyzer.calc_macd_histogram_series(prices)
+        expected = [analyzer.calc_macd(prices[: i + 1])[2] or 0.0 for i in range(34, len(prices))]
+        assert hist_series == expected
+        assert analyzer.calc_macd_histogram_series(prices[:30]) == []
+
 
 class TestBollingerBands:
     """Tests for Bollinger Bands calculation."""